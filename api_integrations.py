@@ -6,13 +6,10 @@ from datetime import datetime, timedelta, UTC
 import json
 
 from flask import current_app
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
 from logging_config import get_logger
+from utils.lazy_imports import lazy_module
 
 logger = get_logger(__name__)
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 import requests
 from services.contact_service_refactored import ContactService
 from urllib3.exceptions import InsecureRequestWarning
@@ -25,6 +22,15 @@ SCOPES = [
 ]
 TOKEN_FILE = 'token.pickle'
 
+# The Google client libraries are imported on first use, not when routes load
+google_auth_requests = lazy_module('google.auth.transport.requests')
+oauth_flow = lazy_module('google_auth_oauthlib.flow')
+discovery = lazy_module('googleapiclient.discovery')
+
+def build(*args, **kwargs):
+    """Build a Google API client (googleapiclient.discovery.build)"""
+    return discovery.build(*args, **kwargs)
+
 def get_google_creds():
     creds = None
     if os.path.exists(TOKEN_FILE):
@@ -34,7 +40,7 @@ def get_google_creds():
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
             try:
-                creds.refresh(Request())
+                creds.refresh(google_auth_requests.Request())
             except Exception as e:
                 logger.error("Error refreshing Google token", error=str(e))
                 logger.error("Please delete token.pickle and re-run the application.")
@@ -62,7 +68,7 @@ def get_google_creds():
                         "redirect_uris": ["http://localhost:8989/"] 
                     }
                 }
-                flow = InstalledAppFlow.from_client_config(client_config, SCOPES)
+                flow = oauth_flow.InstalledAppFlow.from_client_config(client_config, SCOPES)
                 creds = flow.run_local_server(port=8989) 
             except Exception as e:
                 logger.critical("FATAL: Could not get new Google credentials", error=str(e))
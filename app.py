@@ -1,11 +1,11 @@
 # app.py
 
 from flask import Flask, g, request
-from flask_migrate import Migrate
-from config import get_config
+from config import configure_database_engines, get_config
 from extensions import db, login_manager, bcrypt
 from datetime import datetime
 import os
+import sys
 import uuid
 from werkzeug.middleware.proxy_fix import ProxyFix
 from logging_config import setup_logging, get_logger
@@ -42,8 +42,25 @@ def init_sentry():
 
 init_sentry()
 
-def create_app(config_name=None, test_config=None):
-    """Create and configure an instance of the Flask application."""
+def _init_migrations(app):
+    """Register Flask-Migrate when migrations can run in this process.
+    
+    Importing alembic is about half of app import time, and gunicorn and
+    Celery never run migrations. The `flask db` CLI (FLASK_RUN_FROM_CLI) and
+    scripts that import flask_migrate themselves still get it.
+    """
+    if not (app.config.get('MIGRATIONS_ENABLED') or os.environ.get('FLASK_RUN_FROM_CLI')
+            or 'flask_migrate' in sys.modules):
+        return
+    from flask_migrate import Migrate
+    Migrate(app, db)
+
+def create_app(config_name=None, test_config=None, process_type=None):
+    """Create and configure an instance of the Flask application.
+    
+    process_type ('web' or 'worker') selects the connection pool settings;
+    it defaults to the PROCESS_TYPE environment variable.
+    """
     app = Flask(__name__)
     
     config_class = get_config(config_name)
@@ -57,11 +74,16 @@ def create_app(config_name=None, test_config=None):
 
     app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=1)
 
+    configure_database_engines(app, process_type)
     db.init_app(app)
-    migrate = Migrate(app, db)
+    _init_migrations(app)
+    
+    # Per-request query counts, DB time and N+1 detection
+    from utils import query_instrumentation
+    query_instrumentation.init_app(app)
     
     # Initialize Enhanced Service Registry with Lazy Loading
-    from services.service_registry_enhanced import create_enhanced_registry, ServiceLifecycle
+    from services.service_registry_enhanced import create_enhanced_registry, ServiceLifecycle, HOT_PATH_TAG
     registry = create_enhanced_registry()
     
     # Register base services (no dependencies)
@@ -99,8 +121,8 @@ def create_app(config_name=None, test_config=None):
     
     registry.register_factory(
         'activity_repository',
-        lambda db_session: _create_activity_repository(db_session),
-        dependencies=['db_session']
+        lambda db_session, partition_archive_repository: _create_activity_repository(db_session, partition_archive_repository),
+        dependencies=['db_session', 'partition_archive_repository']
     )
     
     registry.register_factory(
@@ -129,8 +151,8 @@ def create_app(config_name=None, test_config=None):
     
     registry.register_factory(
         'webhook_event_repository',
-        lambda db_session: _create_webhook_event_repository(db_session),
-        dependencies=['db_session']
+        lambda db_session, partition_archive_repository: _create_webhook_event_repository(db_session, partition_archive_repository),
+        dependencies=['db_session', 'partition_archive_repository']
     )
     
     registry.register_factory(
@@ -206,23 +228,51 @@ def create_app(config_name=None, test_config=None):
         dependencies=['db_session']
     )
     
+    registry.register_factory(
+        'campaign_attribution_repository',
+        lambda db_session: _create_campaign_attribution_repository(db_session),
+        dependencies=['db_session']
+    )
+    
     registry.register_factory(
         'roi_repository',
         lambda db_session: _create_roi_repository(db_session),
         dependencies=['db_session']
     )
     
+    registry.register_factory(
+        'partition_archive_repository',
+        lambda db_session: _create_partition_archive_repository(db_session),
+        dependencies=['db_session']
+    )
+    
+    registry.register_factory(
+        'export_job_repository',
+        lambda db_session: _create_export_job_repository(db_session),
+        dependencies=['db_session']
+    )
+    
+    registry.register_factory(
+        'sentiment_classification_repository',
+        lambda db_session: _create_sentiment_classification_repository(db_session),
+        dependencies=['db_session']
+    )
+    
     # Analytics and ML services
-    registry.register_singleton(
+    registry.register_factory(
         'sentiment_analysis',
-        lambda: _create_sentiment_analysis_service()
+        lambda sentiment_classification_repository: _create_sentiment_analysis_service(sentiment_classification_repository),
+        dependencies=['sentiment_classification_repository']
     )
     
-    registry.register_singleton(
-        'cache',
-        lambda: _create_cache_service()
+    registry.register_factory(
+        'campaign_reply_sentiment',
+        lambda sentiment_classification_repository: _create_campaign_reply_sentiment_service(sentiment_classification_repository),
+        dependencies=['sentiment_classification_repository']
     )
     
+    registry.register_lazy('cache', 'services.cache_service:CacheService')
+    
     registry.register_factory(
         'response_analytics',
         lambda campaign_response_repository, campaign_repository, activity_repository, contact_repository, sentiment_analysis, cache: _create_response_analytics_service(
@@ -264,7 +314,7 @@ def create_app(config_name=None, test_config=None):
         lambda todo_repository: _create_todo_service(todo_repository),
         dependencies=['todo_repository']
     )
-    registry.register_singleton('auth', lambda: _create_auth_service(db.session))
+    registry.register_singleton('auth', lambda: _create_auth_service(db.session), tags={HOT_PATH_TAG})
     registry.register_factory(
         'product', 
         lambda db_session: _create_product_service(db_session),
@@ -309,7 +359,7 @@ def create_app(config_name=None, test_config=None):
     registry.register_singleton(
         'openphone',
         lambda: _create_openphone_service(),
-        tags={'external', 'api', 'sms'}
+        tags={'external', 'api', 'sms', HOT_PATH_TAG}
     )
     
     registry.register_singleton(
@@ -324,9 +374,9 @@ def create_app(config_name=None, test_config=None):
         tags={'external', 'smtp'}
     )
     
-    registry.register_singleton(
+    registry.register_lazy(
         'ai',
-        lambda: _create_ai_service(),
+        'services.ai_service:AIService',
         tags={'external', 'api', 'ai'}
     )
     
@@ -339,8 +389,8 @@ def create_app(config_name=None, test_config=None):
     # Services with single dependencies
     registry.register_factory(
         'campaign_list',
-        lambda db_session: _create_campaign_list_service(db_session),
-        dependencies=['db_session']
+        lambda db_session, cache: _create_campaign_list_service(db_session, cache),
+        dependencies=['db_session', 'cache']
     )
     
     # Phone validation service
@@ -372,10 +422,11 @@ def create_app(config_name=None, test_config=None):
     
     registry.register_factory(
         'openphone_webhook',
-        lambda activity_repository, conversation_repository, webhook_event_repository, campaign_membership_repository, contact, sms_metrics, opt_out: _create_openphone_webhook_service(
-            activity_repository, conversation_repository, webhook_event_repository, campaign_membership_repository, contact, sms_metrics, opt_out
+        lambda activity_repository, conversation_repository, webhook_event_repository, campaign_membership_repository, contact, sms_metrics, opt_out, dashboard_snapshot, campaign_reply_sentiment: _create_openphone_webhook_service(
+            activity_repository, conversation_repository, webhook_event_repository, campaign_membership_repository, contact, sms_metrics, opt_out, dashboard_snapshot, campaign_reply_sentiment
         ),
-        dependencies=['activity_repository', 'conversation_repository', 'webhook_event_repository', 'campaign_membership_repository', 'contact', 'sms_metrics', 'opt_out']
+        dependencies=['activity_repository', 'conversation_repository', 'webhook_event_repository', 'campaign_membership_repository', 'contact', 'sms_metrics', 'opt_out', 'dashboard_snapshot', 'campaign_reply_sentiment'],
+        tags={HOT_PATH_TAG}
     )
     
     # Register alias for webhook tests - returns openphone_webhook and ensures error recovery is connected
@@ -405,7 +456,8 @@ def create_app(config_name=None, test_config=None):
         lambda failed_webhook_queue_repository, openphone_webhook, webhook_event_repository: _create_webhook_error_recovery_service(
             failed_webhook_queue_repository, openphone_webhook, webhook_event_repository
         ),
-        dependencies=['failed_webhook_queue_repository', 'openphone_webhook', 'webhook_event_repository']
+        dependencies=['failed_webhook_queue_repository', 'openphone_webhook', 'webhook_event_repository'],
+        tags={HOT_PATH_TAG}
     )
     
     registry.register_factory(
@@ -416,6 +468,13 @@ def create_app(config_name=None, test_config=None):
         dependencies=['contact_repository', 'campaign_repository', 'activity_repository', 'conversation_repository', 'sms_metrics']
     )
     
+    registry.register_singleton(
+        'dashboard_snapshot',
+        lambda dashboard: _create_dashboard_snapshot_service(dashboard),
+        dependencies=['dashboard'],
+        tags={'dashboard', 'cache', 'redis'}
+    )
+    
     registry.register_factory(
         'campaign_template',
         lambda campaign_template_repository, contact_repository: _create_campaign_template_service(
@@ -488,7 +547,8 @@ def create_app(config_name=None, test_config=None):
     # PropertyRadar Import Service for enhanced CSV imports
     registry.register_factory(
         'propertyradar_import',
-        lambda: _create_propertyradar_import_service(db.session),
+        lambda dashboard_snapshot: _create_propertyradar_import_service(db.session, dashboard_snapshot),
+        dependencies=['dashboard_snapshot'],
         tags={'import', 'csv', 'propertyradar', 'real_estate'}
     )
     
@@ -505,10 +565,10 @@ def create_app(config_name=None, test_config=None):
     # Phase 4: Conversion Tracking Service
     registry.register_factory(
         'conversion_tracking',
-        lambda conversion_repository, campaign_response_repository, campaign_repository, contact_repository: _create_conversion_tracking_service(
-            conversion_repository, campaign_response_repository, campaign_repository, contact_repository
+        lambda conversion_repository, campaign_response_repository, campaign_repository, contact_repository, campaign_attribution_repository: _create_conversion_tracking_service(
+            conversion_repository, campaign_response_repository, campaign_repository, contact_repository, campaign_attribution_repository
         ),
-        dependencies=['conversion_repository', 'campaign_response_repository', 'campaign_repository', 'contact_repository'],
+        dependencies=['conversion_repository', 'campaign_response_repository', 'campaign_repository', 'contact_repository', 'campaign_attribution_repository'],
         tags={'analytics', 'conversion', 'roi'}
     )
     
@@ -522,10 +582,30 @@ def create_app(config_name=None, test_config=None):
         tags={'analytics', 'roi', 'optimization'}
     )
     
+    # Monthly partitions of activity and webhook_event, and their archive
+    registry.register_factory(
+        'partition_maintenance',
+        lambda db_session, partition_archive_repository: _create_partition_maintenance_service(
+            db_session, partition_archive_repository
+        ),
+        dependencies=['db_session', 'partition_archive_repository'],
+        tags={'maintenance', 'partitioning'}
+    )
+    
+    # Streaming analytics exports and resumable export jobs
+    registry.register_factory(
+        'export',
+        lambda roi_repository, conversion_repository, campaign_response_repository, export_job_repository: _create_export_service(
+            roi_repository, conversion_repository, campaign_response_repository, export_job_repository
+        ),
+        dependencies=['roi_repository', 'conversion_repository', 'campaign_response_repository', 'export_job_repository'],
+        tags={'analytics', 'export'}
+    )
+    
     registry.register_factory(
         'csv_import',
-        lambda contact, db_session: _create_csv_import_service(contact, db_session),
-        dependencies=['contact', 'db_session']
+        lambda contact, db_session, dashboard_snapshot: _create_csv_import_service(contact, db_session, dashboard_snapshot),
+        dependencies=['contact', 'db_session', 'dashboard_snapshot']
     )
     
     registry.register_factory(
@@ -569,11 +649,13 @@ def create_app(config_name=None, test_config=None):
             logger.error(f"Circular dependency detected: {e}")
             raise
     
-    # Warmup critical services in production
-    if app.config.get('FLASK_ENV') == 'production':
-        critical_services = ['db_session', 'openphone', 'auth']
-        logger.info(f"Warming up critical services: {critical_services}")
-        registry.warmup(critical_services)
+    # Everything else is built on first use; SERVICE_WARMUP pre-builds the hot path
+    # (or every singleton) so the first requests don't pay for it
+    warmup = app.config.get('SERVICE_WARMUP', 'none')
+    if warmup in ('hot', 'all'):
+        with app.app_context():
+            timings = registry.warmup(tags={HOT_PATH_TAG} if warmup == 'hot' else None)
+        logger.info(f"Warmed up {len(timings)} services in {sum(timings.values()):.1f} ms")
     
     # Attach registry to app
     app.services = registry
@@ -881,8 +963,9 @@ def _create_openphone_service():
         return None
     return OpenPhoneService()  # Uses env vars internally
 
-def _create_openphone_webhook_service(activity_repository, conversation_repository, webhook_event_repository, campaign_membership_repository, contact_service, sms_metrics_service, opt_out_service=None):
+def _create_openphone_webhook_service(activity_repository, conversation_repository, webhook_event_repository, campaign_membership_repository, contact_service, sms_metrics_service, opt_out_service=None, dashboard_snapshot_service=None, sentiment_service=None):
     """Create OpenPhoneWebhookServiceRefactored instance with all dependencies"""
+    from flask import current_app
     from services.openphone_webhook_service_refactored import OpenPhoneWebhookServiceRefactored
     logger.info("Initializing OpenPhoneWebhookServiceRefactored")
     webhook_service = OpenPhoneWebhookServiceRefactored(
@@ -893,6 +976,9 @@ def _create_openphone_webhook_service(activity_repository, conversation_reposito
         contact_service=contact_service,
         sms_metrics_service=sms_metrics_service,
         opt_out_service=opt_out_service,
+        dashboard_snapshot_service=dashboard_snapshot_service,
+        sentiment_service=sentiment_service,
+        classify_replies_async=current_app.config.get('SENTIMENT_ASYNC_CLASSIFICATION', True),
         error_recovery_service=None  # Will be set after creation to avoid circular dependency
     )
     
@@ -955,12 +1041,6 @@ def _create_email_service():
     mail = None  # Would get from Flask-Mail if needed
     return EmailService(mail=mail, config=config)
 
-def _create_ai_service():
-    """Create AIService instance"""
-    from services.ai_service import AIService
-    logger.info("Initializing AIService")
-    return AIService()
-
 def _create_campaign_scheduling_service(campaign_repository, activity_repository):
     """Create CampaignSchedulingService instance with dependencies"""
     from services.campaign_scheduling_service import CampaignSchedulingService
@@ -993,8 +1073,9 @@ def _create_quickbooks_service():
         sync_repository=sync_repo
     )
 
-def _create_campaign_list_service(db_session):
+def _create_campaign_list_service(db_session, cache):
     """Create CampaignListServiceRefactored with repository dependencies"""
+    from flask import current_app
     from services.campaign_list_service_refactored import CampaignListServiceRefactored
     from repositories.campaign_list_repository import CampaignListRepository
     from repositories.campaign_list_member_repository import CampaignListMemberRepository
@@ -1005,7 +1086,9 @@ def _create_campaign_list_service(db_session):
     return CampaignListServiceRefactored(
         campaign_list_repository=CampaignListRepository(db_session),
         member_repository=CampaignListMemberRepository(db_session),
-        contact_repository=ContactRepository(db_session)
+        contact_repository=ContactRepository(db_session),
+        cache_service=cache,
+        stats_cache_ttl=current_app.config.get('LIST_STATS_CACHE_TTL', 300)
     )
 
 def _create_dashboard_service(db_session):
@@ -1026,6 +1109,31 @@ def _create_dashboard_service_with_repositories(contact_repository, campaign_rep
         sms_metrics_service=sms_metrics_service
     )
 
+def _create_dashboard_snapshot_service(dashboard):
+    """Create DashboardSnapshotService backed by Redis when enabled"""
+    from flask import current_app
+    from services.dashboard_snapshot_service import DashboardSnapshotService
+    
+    logger.info("Initializing DashboardSnapshotService")
+    
+    redis_client = None
+    if current_app.config.get('DASHBOARD_SNAPSHOT_ENABLED'):
+        redis_url = os.environ.get('REDIS_URL') or current_app.config.get('CELERY_BROKER_URL')
+        if redis_url:
+            import redis
+            if redis_url.startswith('rediss://'):
+                redis_client = redis.from_url(redis_url, ssl_cert_reqs=None, decode_responses=True)
+            else:
+                redis_client = redis.from_url(redis_url, decode_responses=True)
+        else:
+            logger.warning("Dashboard snapshot enabled but no Redis URL configured - using live queries")
+    
+    return DashboardSnapshotService(
+        dashboard_service=dashboard,
+        redis_client=redis_client,
+        stale_after_seconds=current_app.config.get('DASHBOARD_SNAPSHOT_STALE_SECONDS', 1800)
+    )
+
 # Repository creation functions
 def _create_contact_repository(db_session):
     """Create ContactRepository instance"""
@@ -1088,11 +1196,40 @@ def _create_conversion_repository(db_session):
     from repositories.conversion_repository import ConversionRepository
     return ConversionRepository(session=db_session)
 
+def _create_campaign_attribution_repository(db_session):
+    """Create CampaignAttributionRepository instance"""
+    from repositories.campaign_attribution_repository import CampaignAttributionRepository
+    return CampaignAttributionRepository(session=db_session)
+
 def _create_roi_repository(db_session):
     """Create ROIRepository instance"""
     from repositories.roi_repository import ROIRepository
     return ROIRepository(session=db_session)
 
+def _create_partition_archive_repository(db_session):
+    """Create PartitionArchiveRepository instance"""
+    from repositories.partition_archive_repository import PartitionArchiveRepository
+    return PartitionArchiveRepository(session=db_session)
+
+def _create_partition_maintenance_service(db_session, partition_archive_repository):
+    """Create PartitionMaintenanceService with retention from config"""
+    from flask import current_app
+    from services.partition_maintenance_service import PartitionMaintenanceService
+    return PartitionMaintenanceService(
+        session=db_session,
+        archive_repository=partition_archive_repository,
+        retention_months={
+            'activity': current_app.config.get('ACTIVITY_RETENTION_MONTHS', 24),
+            'webhook_event': current_app.config.get('WEBHOOK_EVENT_RETENTION_MONTHS', 6),
+        },
+        premake_months=current_app.config.get('PARTITION_PREMAKE_MONTHS', 3)
+    )
+
+def _create_export_job_repository(db_session):
+    """Create ExportJobRepository instance"""
+    from repositories.export_job_repository import ExportJobRepository
+    return ExportJobRepository(session=db_session)
+
 def _create_engagement_scoring_service(engagement_event_repository, engagement_score_repository):
     """Create EngagementScoringService with repository dependencies"""
     from services.engagement_scoring_service import EngagementScoringService
@@ -1104,7 +1241,7 @@ def _create_engagement_scoring_service(engagement_event_repository, engagement_s
         score_repository=engagement_score_repository
     )
 
-def _create_conversion_tracking_service(conversion_repository, campaign_response_repository, campaign_repository, contact_repository):
+def _create_conversion_tracking_service(conversion_repository, campaign_response_repository, campaign_repository, contact_repository, campaign_attribution_repository):
     """Create ConversionTrackingService with repository dependencies"""
     from services.conversion_tracking_service import ConversionTrackingService
     
@@ -1114,7 +1251,8 @@ def _create_conversion_tracking_service(conversion_repository, campaign_response
         conversion_repository=conversion_repository,
         response_repository=campaign_response_repository,  # Note: parameter name is response_repository
         campaign_repository=campaign_repository,
-        contact_repository=contact_repository
+        contact_repository=contact_repository,
+        attribution_repository=campaign_attribution_repository
     )
 
 def _create_roi_calculation_service(roi_repository, conversion_repository, campaign_repository, contact_repository, cache):
@@ -1131,6 +1269,22 @@ def _create_roi_calculation_service(roi_repository, conversion_repository, campa
         cache_service=cache
     )
 
+def _create_export_service(roi_repository, conversion_repository, campaign_response_repository, export_job_repository):
+    """Create ExportService with repository dependencies"""
+    from flask import current_app
+    from services.export_service import ExportService
+    
+    logger.info("Initializing ExportService with repositories")
+    
+    return ExportService(
+        roi_repository=roi_repository,
+        conversion_repository=conversion_repository,
+        campaign_response_repository=campaign_response_repository,
+        export_job_repository=export_job_repository,
+        export_dir=current_app.config.get('EXPORT_DIR'),
+        batch_size=current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+    )
+
 def _create_campaign_template_service(campaign_template_repository, contact_repository):
     """Create CampaignTemplateService with repository dependencies"""
     from services.campaign_template_service import CampaignTemplateService
@@ -1167,10 +1321,10 @@ def _create_ab_testing_service(campaign_repository, contact_repository, ab_resul
         ab_result_repository=ab_result_repository
     )
 
-def _create_activity_repository(db_session):
+def _create_activity_repository(db_session, partition_archive_repository=None):
     """Create ActivityRepository instance"""
     from repositories.activity_repository import ActivityRepository
-    return ActivityRepository(session=db_session)
+    return ActivityRepository(session=db_session, archive_repository=partition_archive_repository)
 
 def _create_conversation_repository(db_session):
     """Create ConversationRepository instance"""
@@ -1192,10 +1346,10 @@ def _create_appointment_repository(db_session):
     from repositories.appointment_repository import AppointmentRepository
     return AppointmentRepository(session=db_session)
 
-def _create_webhook_event_repository(db_session):
+def _create_webhook_event_repository(db_session, partition_archive_repository=None):
     """Create WebhookEventRepository instance"""
     from repositories.webhook_event_repository import WebhookEventRepository
-    return WebhookEventRepository(session=db_session)
+    return WebhookEventRepository(session=db_session, archive_repository=partition_archive_repository)
 
 def _create_invoice_repository(db_session):
     """Create InvoiceRepository instance"""
@@ -1222,15 +1376,23 @@ def _create_campaign_response_repository(db_session):
     from repositories.campaign_response_repository import CampaignResponseRepository
     return CampaignResponseRepository(session=db_session)
 
-def _create_sentiment_analysis_service():
-    """Create SentimentAnalysisService instance"""
+def _create_sentiment_classification_repository(db_session):
+    """Create SentimentClassificationRepository instance"""
+    from repositories.sentiment_classification_repository import SentimentClassificationRepository
+    return SentimentClassificationRepository(session=db_session)
+
+def _create_sentiment_analysis_service(sentiment_classification_repository):
+    """Create SentimentAnalysisService backed by the persistent classification cache"""
     from services.sentiment_analysis_service import SentimentAnalysisService
-    return SentimentAnalysisService()
+    return SentimentAnalysisService(classification_repository=sentiment_classification_repository)
 
-def _create_cache_service():
-    """Create CacheService instance"""
-    from services.cache_service import CacheService
-    return CacheService()
+def _create_campaign_reply_sentiment_service(sentiment_classification_repository):
+    """Create SentimentAnalysisService using the webhook's campaign reply rules"""
+    from services.sentiment_analysis_service import SentimentAnalysisService, CampaignReplySentimentModel
+    return SentimentAnalysisService(
+        classification_repository=sentiment_classification_repository,
+        model=CampaignReplySentimentModel()
+    )
 
 def _create_response_analytics_service(response_repository, campaign_repository, activity_repository, contact_repository, sentiment_service, cache_service):
     """Create ResponseAnalyticsService with dependencies"""
@@ -1312,7 +1474,7 @@ def _create_campaign_service(openphone, campaign_list, campaign_repository, cont
         list_service=campaign_list
     )
 
-def _create_csv_import_service(contact, db_session):
+def _create_csv_import_service(contact, db_session, dashboard_snapshot=None):
     """Create CSVImportService with repository dependencies"""
     from services.csv_import_service import CSVImportService
     from repositories.csv_import_repository import CSVImportRepository
@@ -1337,10 +1499,11 @@ def _create_csv_import_service(contact, db_session):
         campaign_list_repository=campaign_list_repo,
         campaign_list_member_repository=campaign_list_member_repo,
         contact_repository=contact_repo,
-        contact_service=contact
+        contact_service=contact,
+        dashboard_snapshot_service=dashboard_snapshot
     )
 
-def _create_propertyradar_import_service(db_session):
+def _create_propertyradar_import_service(db_session, dashboard_snapshot=None):
     """Create PropertyRadarImportService with repository dependencies"""
     from services.propertyradar_import_service import PropertyRadarImportService
     from repositories.property_repository import PropertyRepository
@@ -1364,7 +1527,9 @@ def _create_propertyradar_import_service(db_session):
         csv_import_repository=csv_import_repo,
         campaign_list_repository=campaign_list_repo,
         campaign_list_member_repository=campaign_list_member_repo,
-        session=db_session
+        session=db_session,
+        dashboard_snapshot_service=dashboard_snapshot,
+        set_based_batches=True
     )
 
 def _create_openphone_sync_service(openphone, db_session):
@@ -1421,7 +1586,8 @@ def _create_quickbooks_sync_service(quickbooks, db_session):
         property_repository=property_repo,
         quickbooks_sync_repository=quickbooks_sync_repo,
         quote_line_item_repository=quote_line_item_repo,
-        invoice_line_item_repository=invoice_line_item_repo
+        invoice_line_item_repository=invoice_line_item_repo,
+        quickbooks_service=quickbooks
     )
 
 def _create_appointment_service(google_calendar, db_session):
@@ -1479,6 +1645,7 @@ def _create_scheduler_service(openphone, invoice, db_session):
     from repositories.job_repository import JobRepository
     from repositories.quote_repository import QuoteRepository
     from repositories.appointment_repository import AppointmentRepository
+    from repositories.scheduled_notification_repository import ScheduledNotificationRepository
     from crm_database import Setting, Job, Quote, Appointment
     
     logger.info("Initializing SchedulerService with repositories")
@@ -1488,12 +1655,14 @@ def _create_scheduler_service(openphone, invoice, db_session):
     job_repo = JobRepository(session=db_session)
     quote_repo = QuoteRepository(session=db_session)
     appointment_repo = AppointmentRepository(session=db_session)
+    notification_repo = ScheduledNotificationRepository(session=db_session)
     
     return SchedulerService(
         setting_repository=setting_repo,
         job_repository=job_repo,
         quote_repository=quote_repo,
         appointment_repository=appointment_repo,
+        scheduled_notification_repository=notification_repo,
         openphone_service=openphone,
         invoice_service=invoice
     )
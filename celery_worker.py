@@ -1,18 +1,41 @@
 # celery_worker.py
 import os
+import threading
 from app import create_app
+from celery.signals import worker_init
 from celery_config import create_celery_app
+from utils.query_instrumentation import task_scope
 
 # Create Celery instance with shared configuration
 celery = create_celery_app(__name__)
 
-# Create the Flask app instance. This is still needed to provide context for tasks when they run.
-flask_app = create_app()
+# The Flask app that provides context for tasks when they run. It is built on first use
+# rather than at import, so web processes that import a task module to enqueue it (and
+# celery beat) never build a second app; workers build it at startup instead.
+# Workers use the worker connection pool settings (smaller pool, longer statement timeout).
+flask_app = None
+_flask_app_lock = threading.Lock()
+
+def get_flask_app():
+    """Return the worker Flask app, creating it on first call"""
+    global flask_app
+    if flask_app is None:
+        with _flask_app_lock:
+            if flask_app is None:
+                flask_app = create_app(process_type='worker')
+    return flask_app
+
+@worker_init.connect
+def _create_worker_app(**kwargs):
+    # Build the app (and warm its hot-path services) before the pool forks,
+    # so the first task doesn't pay for it
+    get_flask_app()
 
 # Set the custom Task class to ensure tasks run within the Flask app context.
+# Each task's queries are counted and checked for N+1 patterns like a request's.
 class ContextTask(celery.Task):
     def __call__(self, *args, **kwargs):
-        with flask_app.app_context():
+        with get_flask_app().app_context(), task_scope(self.name):
             return self.run(*args, **kwargs)
 
 celery.Task = ContextTask
@@ -104,23 +127,48 @@ celery.conf.beat_schedule = {
         'schedule': crontab(hour=5, minute=0, day_of_week=0),
         'kwargs': {'days_old': 90}
     },
+    'reconcile-dashboard-snapshot': {
+        'task': 'tasks.dashboard_tasks.reconcile_dashboard_snapshot',
+        # Executes every 10 minutes to correct drift in the dashboard counters
+        'schedule': 600.0,  # 10 minutes
+    },
+    'maintain-partitions': {
+        'task': 'tasks.partition_tasks.maintain_partitions',
+        # Executes daily at 0:30 AM UTC to create upcoming partitions and archive expired months
+        'schedule': crontab(hour=0, minute=30),
+    },
+    'refresh-dynamic-lists': {
+        'task': 'tasks.campaign_list_tasks.refresh_dynamic_lists',
+        # Executes hourly at :15 and queues one refresh task per dynamic list
+        'schedule': crontab(minute=15),
+    },
+    'refresh-campaign-attribution': {
+        'task': 'tasks.attribution_tasks.refresh_campaign_attribution',
+        # Executes hourly at :45 to rebuild the materialized campaign attribution
+        'schedule': crontab(minute=45),
+    },
 }
 celery.conf.timezone = 'UTC'
 
 # Import tasks to ensure they're registered with Celery
-# This must be done after the Flask app is created
+# Task modules only define tasks, so they don't need the Flask app to import
 try:
-    with flask_app.app_context():
-        import services.scheduler_service
-        import tasks.campaign_tasks
-        import tasks.sync_tasks
-        import tasks.webhook_health_tasks
-        import tasks.webhook_retry_tasks
-        import tasks.reconciliation_tasks
-        import tasks.campaign_scheduling_tasks
-        import tasks.csv_import_tasks
-        print("Successfully imported tasks")
-        print(f"Registered tasks: {list(celery.tasks.keys())}")
+    import services.scheduler_service
+    import tasks.campaign_tasks
+    import tasks.sync_tasks
+    import tasks.webhook_health_tasks
+    import tasks.webhook_retry_tasks
+    import tasks.reconciliation_tasks
+    import tasks.campaign_scheduling_tasks
+    import tasks.csv_import_tasks
+    import tasks.dashboard_tasks
+    import tasks.export_tasks
+    import tasks.sentiment_tasks
+    import tasks.partition_tasks
+    import tasks.campaign_list_tasks
+    import tasks.attribution_tasks
+    print("Successfully imported tasks")
+    print(f"Registered tasks: {list(celery.tasks.keys())}")
 except Exception as e:
     print(f"Error importing tasks: {e}")
     import traceback
@@ -88,6 +88,51 @@ class Config:
     CELERY_BROKER_URL = os.environ.get('REDIS_URL') or 'redis://redis:6379/0'
     CELERY_RESULT_BACKEND = os.environ.get('REDIS_URL') or 'redis://redis:6379/0'
     
+    # Dashboard snapshot - precomputed dashboard counters kept in Redis
+    DASHBOARD_SNAPSHOT_ENABLED = os.environ.get('DASHBOARD_SNAPSHOT_ENABLED', 'true').lower() == 'true'
+    DASHBOARD_SNAPSHOT_STALE_SECONDS = int(os.environ.get('DASHBOARD_SNAPSHOT_STALE_SECONDS', '1800'))
+    
+    # Classify campaign reply sentiment in a Celery task instead of the webhook request
+    SENTIMENT_ASYNC_CLASSIFICATION = os.environ.get('SENTIMENT_ASYNC_CLASSIFICATION', 'true').lower() == 'true'
+    
+    # Streaming analytics exports - background export files and cursor batch size
+    EXPORT_DIR = os.environ.get('EXPORT_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'exports')
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '1000'))
+    
+    # SQL instrumentation - query count, DB time and N+1 detection per request and task
+    QUERY_INSTRUMENTATION_ENABLED = os.environ.get('QUERY_INSTRUMENTATION_ENABLED', 'true').lower() == 'true'
+    QUERY_N_PLUS_ONE_THRESHOLD = int(os.environ.get('QUERY_N_PLUS_ONE_THRESHOLD', '10'))
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '100'))
+    
+    # Connection pooling - web processes serve short requests, workers run long tasks
+    DB_PROCESS_TYPE = os.environ.get('PROCESS_TYPE', 'web')
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', '10'))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', '30'))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', '1800'))
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', '30000'))
+    WORKER_DB_POOL_SIZE = int(os.environ.get('WORKER_DB_POOL_SIZE', '2'))
+    WORKER_DB_MAX_OVERFLOW = int(os.environ.get('WORKER_DB_MAX_OVERFLOW', '3'))
+    WORKER_DB_POOL_TIMEOUT = int(os.environ.get('WORKER_DB_POOL_TIMEOUT', '60'))
+    WORKER_DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('WORKER_DB_STATEMENT_TIMEOUT_MS', '600000'))
+    
+    # Read replica for analytics reads (read_only repository methods); unset keeps everything on the primary
+    DATABASE_READ_REPLICA_URL = os.environ.get('DATABASE_READ_REPLICA_URL')
+    
+    # Table partitioning - months of activity and webhook_event kept live before archiving (0 keeps all)
+    PARTITION_PREMAKE_MONTHS = int(os.environ.get('PARTITION_PREMAKE_MONTHS', '3'))
+    ACTIVITY_RETENTION_MONTHS = int(os.environ.get('ACTIVITY_RETENTION_MONTHS', '24'))
+    WEBHOOK_EVENT_RETENTION_MONTHS = int(os.environ.get('WEBHOOK_EVENT_RETENTION_MONTHS', '6'))
+    
+    # Campaign list statistics - seconds cached; writes through the list service invalidate sooner
+    LIST_STATS_CACHE_TTL = int(os.environ.get('LIST_STATS_CACHE_TTL', '300'))
+    
+    # Startup - services are resolved on first use; SERVICE_WARMUP builds singletons at startup:
+    # 'hot' (services tagged hot_path), 'all' or 'none'
+    SERVICE_WARMUP = os.environ.get('SERVICE_WARMUP', 'none')
+    # Flask-Migrate (alembic) loads only for the `flask db` CLI unless this is set
+    MIGRATIONS_ENABLED = os.environ.get('MIGRATIONS_ENABLED', 'false').lower() == 'true'
+    
     # Mail settings
     MAIL_SERVER = os.environ.get('MAIL_SERVER')
     MAIL_PORT = int(os.environ.get('MAIL_PORT') or 587)  # Handle empty string
@@ -218,6 +263,12 @@ class TestingConfig(Config):
     CELERY_BROKER_URL = 'redis://localhost:6379/1'
     CELERY_RESULT_BACKEND = 'redis://localhost:6379/1'
     
+    # Serve dashboard stats from live queries in tests (no Redis)
+    DASHBOARD_SNAPSHOT_ENABLED = False
+    
+    # Classify reply sentiment inline in tests (no Celery broker)
+    SENTIMENT_ASYNC_CLASSIFICATION = False
+    
     # Fast bcrypt rounds for testing
     BCRYPT_LOG_ROUNDS = 4
     
@@ -277,6 +328,9 @@ class ProductionConfig(Config):
     # Secure bcrypt rounds for production
     BCRYPT_LOG_ROUNDS = 14
     
+    # Build the webhook and auth path before the first request arrives
+    SERVICE_WARMUP = os.environ.get('SERVICE_WARMUP', 'hot')
+    
     # Production Redis - set immediately for Flask-Session
     REDIS_URL = os.environ.get('REDIS_URL', '')
     CELERY_BROKER_URL = os.environ.get('REDIS_URL', '')
@@ -326,6 +380,70 @@ class ProductionConfig(Config):
         app.logger.addHandler(syslog_handler)
 
 
+def build_engine_options(app_config, database_uri: str, process_type: str = 'web',
+                         read_only: bool = False) -> dict:
+    """
+    SQLAlchemy engine options for a database URI and process type.
+    
+    Args:
+        app_config: Flask config holding the DB_* and WORKER_DB_* settings
+        database_uri: URI the engine connects to
+        process_type: 'web' or 'worker'; workers get a smaller pool and a longer statement timeout
+        read_only: Open connections as read-only transactions (read replica)
+        
+    Returns:
+        Keyword arguments for create_engine; empty for SQLite, which keeps its default pool
+    """
+    if database_uri.startswith('sqlite'):
+        return {}
+    
+    from utils.database import InstrumentedQueuePool
+    
+    prefix = 'WORKER_DB_' if process_type == 'worker' else 'DB_'
+    
+    def setting(name):
+        return app_config.get(prefix + name, app_config.get('DB_' + name))
+    
+    options = {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': setting('POOL_SIZE'),
+        'max_overflow': setting('MAX_OVERFLOW'),
+        'pool_timeout': setting('POOL_TIMEOUT'),
+        'pool_recycle': app_config.get('DB_POOL_RECYCLE'),
+        'pool_pre_ping': True
+    }
+    if database_uri.startswith('postgres'):
+        server_options = f"-c statement_timeout={setting('STATEMENT_TIMEOUT_MS')}"
+        if read_only:
+            server_options += ' -c default_transaction_read_only=on'
+        options['connect_args'] = {'options': server_options}
+    return options
+
+
+def configure_database_engines(app, process_type: Optional[str] = None) -> None:
+    """
+    Set SQLALCHEMY_ENGINE_OPTIONS and the read replica bind before db.init_app.
+    
+    Engine options already present in the config (e.g. from test_config) are kept.
+    """
+    from utils.database import REPLICA_BIND
+    
+    process_type = process_type or app.config.get('DB_PROCESS_TYPE', 'web')
+    if not app.config.get('SQLALCHEMY_ENGINE_OPTIONS'):
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = build_engine_options(
+            app.config, app.config['SQLALCHEMY_DATABASE_URI'], process_type
+        )
+    
+    replica_url = app.config.get('DATABASE_READ_REPLICA_URL')
+    if replica_url:
+        binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+        binds.setdefault(REPLICA_BIND, {
+            'url': replica_url,
+            **build_engine_options(app.config, replica_url, process_type, read_only=True)
+        })
+        app.config['SQLALCHEMY_BINDS'] = binds
+
+
 # Configuration dictionary
 config = {
     'development': DevelopmentConfig,
@@ -2,7 +2,10 @@
 
 from extensions import db
 from datetime import datetime, time, date, timedelta
-from utils.datetime_utils import utc_now
+from utils.datetime_utils import utc_now, ensure_utc
+from utils.geo import geohash_for
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.orm import Session
 from enum import Enum
 import json
 from decimal import Decimal
@@ -75,7 +78,83 @@ class Conversation(db.Model):
     last_activity_type = db.Column(db.String(20), nullable=True)  # 'message' or 'call'
     last_activity_id = db.Column(db.String(100), nullable=True)  # OpenPhone activity ID
     
+    # Inbox summary (maintained on every Activity write, see _maintain_conversation_summaries)
+    last_message_preview = db.Column(db.String(160), nullable=True)
+    last_direction = db.Column(db.String(10), nullable=True)  # 'incoming', 'outgoing'
+    unread_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    has_attachments = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+    has_ai_summary = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+    activity_count = db.Column(db.Integer, nullable=False, default=0, server_default='0', index=True)
+    
     activities = db.relationship('Activity', backref='conversation', lazy=True, cascade="all, delete-orphan")
+    
+    PREVIEW_LENGTH = 160
+    
+    @staticmethod
+    def build_activity_preview(activity) -> str:
+        """Build the one-line inbox preview for an activity"""
+        if activity.activity_type == 'call':
+            preview = 'Outgoing call' if activity.direction == 'outgoing' else 'Incoming call'
+            if activity.duration_seconds:
+                preview += f" ({activity.duration_seconds // 60}m)"
+            return preview
+        if activity.activity_type == 'voicemail':
+            return 'Voicemail received'
+        body = (activity.body or '').strip()
+        if not body:
+            return 'Message (no content)'
+        return body[:Conversation.PREVIEW_LENGTH]
+    
+    def apply_activity(self, activity) -> None:
+        """
+        Fold a newly written activity into the inbox summary.
+        
+        Activities older than the current last activity (e.g. history
+        imported by sync) only update counts and flags, not the preview.
+        """
+        # Conversations are often created with last_activity_at = now just
+        # before their first activity is written, so the first one always wins
+        is_first = not self.activity_count
+        self.activity_count = (self.activity_count or 0) + 1
+        if _has_media(activity.media_urls):
+            self.has_attachments = True
+        if activity.ai_summary:
+            self.has_ai_summary = True
+        
+        activity_time = ensure_utc(activity.created_at or utc_now())
+        if not is_first and self.last_activity_at is not None \
+                and activity_time < ensure_utc(self.last_activity_at):
+            return
+        
+        self.last_activity_at = activity.created_at or utc_now()
+        self.last_activity_type = activity.activity_type
+        if activity.openphone_id:
+            self.last_activity_id = activity.openphone_id
+        self.last_direction = activity.direction
+        self.last_message_preview = self.build_activity_preview(activity)
+        if activity.direction == 'incoming':
+            self.unread_count = (self.unread_count or 0) + 1
+        elif activity.direction == 'outgoing':
+            self.unread_count = 0
+    
+    def apply_activity_update(self, activity) -> None:
+        """Update summary flags for content added to an existing activity"""
+        if _has_media(activity.media_urls):
+            self.has_attachments = True
+        if activity.ai_summary:
+            self.has_ai_summary = True
+
+
+def _has_media(media_urls) -> bool:
+    """True when media_urls holds at least one URL (not null or an empty array)"""
+    if not media_urls:
+        return False
+    if isinstance(media_urls, str):
+        try:
+            media_urls = json.loads(media_urls)
+        except ValueError:
+            return False
+    return bool(media_urls)
 
 class Contact(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -166,6 +245,9 @@ class Property(db.Model):
     # Geographic coordinates
     longitude = db.Column(db.Numeric(10, 7), nullable=True)
     latitude = db.Column(db.Numeric(10, 7), nullable=True)
+    # Geohash of (latitude, longitude) for indexed radius/bounding-box search,
+    # kept in step by _maintain_property_geohashes and the bulk import paths
+    geohash = db.Column(db.String(12), nullable=True, index=True)
     
     # Property identifiers
     apn = db.Column(db.String(100), nullable=True, unique=True)  # Assessor Parcel Number
@@ -412,6 +494,33 @@ class Appointment(db.Model):
     job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=True) # Made nullable as not all appts might have a job
     job = db.relationship('Job', backref='appointments_rel') # Define relationship
 
+
+class ScheduledNotification(db.Model):
+    """Appointment reminder or review request queued by the daily scheduler"""
+    __tablename__ = 'scheduled_notifications'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(30), nullable=False)  # 'appointment_reminder', 'review_request'
+    target_id = db.Column(db.Integer, nullable=False)  # Appointment ID or Job ID, depending on kind
+    scheduled_for = db.Column(db.Date, nullable=False)  # Appointment date or job completion date
+    contact_id = db.Column(db.Integer, db.ForeignKey('contact.id', ondelete='SET NULL'), nullable=True)
+    phone = db.Column(db.String(20), nullable=False)
+    message = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending', index=True)  # 'pending', 'sending', 'sent', 'failed'
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    error_message = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=utc_now)
+    sent_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utc_now, onupdate=utc_now)
+    
+    # One notification per target and day, so scheduler re-runs never queue a second send
+    __table_args__ = (
+        db.UniqueConstraint('kind', 'target_id', 'scheduled_for', name='uq_scheduled_notification_target_day'),
+    )
+    
+    def __repr__(self):
+        return f'<ScheduledNotification {self.id}: {self.kind} {self.target_id} on {self.scheduled_for} ({self.status})>'
+
 class Product(db.Model):
     __tablename__ = 'product'
     id = db.Column(db.Integer, primary_key=True)
@@ -595,12 +704,68 @@ class Activity(db.Model):
     campaign_id = db.Column(db.Integer, db.ForeignKey('campaign.id', ondelete='SET NULL'), nullable=True, index=True)
     
     # Timestamps
-    created_at = db.Column(db.DateTime)
+    # created_at is the monthly partition key on PostgreSQL, so every row needs one
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     media_attachments = db.relationship('MediaAttachment', backref='activity', lazy=True, cascade="all, delete-orphan")
     campaign = db.relationship('Campaign', backref=db.backref('activities', lazy='dynamic'))
+    
+    # Attribution reads a contact's touchpoints within a time window
+    __table_args__ = (
+        db.Index('ix_activity_contact_created_at', 'contact_id', 'created_at'),
+    )
+
+@event.listens_for(Session, 'before_flush')
+def _maintain_conversation_summaries(session, flush_context, instances):
+    """
+    Keep Conversation inbox summaries in step with Activity writes.
+    
+    Runs for every session so that webhook, sync, reconciliation and send
+    paths all update the summary without loading activity collections.
+    """
+    for obj in list(session.new):
+        if isinstance(obj, Activity):
+            conversation = _summary_conversation(session, obj)
+            if conversation is not None:
+                conversation.apply_activity(obj)
+    
+    for obj in list(session.dirty):
+        if not isinstance(obj, Activity):
+            continue
+        state = sa_inspect(obj)
+        if not (state.attrs.media_urls.history.has_changes() or state.attrs.ai_summary.history.has_changes()):
+            continue
+        conversation = _summary_conversation(session, obj)
+        if conversation is not None:
+            conversation.apply_activity_update(obj)
+
+
+def _summary_conversation(session, activity) -> Optional['Conversation']:
+    """Resolve the conversation of an activity without triggering a flush"""
+    conversation = activity.__dict__.get('conversation')
+    if conversation is not None:
+        return conversation
+    if activity.conversation_id is None:
+        return None
+    with session.no_autoflush:
+        return session.get(Conversation, activity.conversation_id)
+
+
+@event.listens_for(Session, 'before_flush')
+def _maintain_property_geohashes(session, flush_context, instances):
+    """Recompute Property.geohash for new properties and moved coordinates"""
+    for obj in list(session.new):
+        if isinstance(obj, Property):
+            obj.geohash = geohash_for(obj.latitude, obj.longitude)
+    
+    for obj in list(session.dirty):
+        if not isinstance(obj, Property):
+            continue
+        state = sa_inspect(obj)
+        if state.attrs.latitude.history.has_changes() or state.attrs.longitude.history.has_changes():
+            obj.geohash = geohash_for(obj.latitude, obj.longitude)
 
 class MediaAttachment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -625,7 +790,27 @@ class WebhookEvent(db.Model):
     processed = db.Column(db.Boolean, default=False)
     processed_at = db.Column(db.DateTime, nullable=True)
     error_message = db.Column(db.Text, nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)  # Monthly partition key on PostgreSQL
+
+class ArchivedPartition(db.Model):
+    """A chunk of one month of rows moved out of a partitioned table into compressed cold storage"""
+    __tablename__ = 'archived_partitions'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(64), nullable=False)  # 'activity', 'webhook_event'
+    period_start = db.Column(db.Date, nullable=False)  # First day of the month
+    period_end = db.Column(db.Date, nullable=False)  # First day of the next month (exclusive)
+    chunk_index = db.Column(db.Integer, nullable=False, default=0)
+    row_count = db.Column(db.Integer, nullable=False, default=0)
+    payload = db.Column(db.LargeBinary, nullable=False)  # gzip-compressed JSON lines, one row per line
+    archived_at = db.Column(db.DateTime, nullable=False, default=utc_now)
+    
+    __table_args__ = (
+        db.UniqueConstraint('table_name', 'period_start', 'chunk_index', name='uq_archived_partition_chunk'),
+    )
+    
+    def __repr__(self):
+        return f'<ArchivedPartition {self.table_name} {self.period_start} #{self.chunk_index} ({self.row_count} rows)>'
 
 # --- NEW: Campaign Model (Enhanced) ---
 class Campaign(db.Model):
@@ -697,6 +882,11 @@ class CampaignMembership(db.Model):
     contact = db.relationship('Contact', backref='campaign_memberships')
     sent_activity = db.relationship('Activity', foreign_keys=[sent_activity_id], backref='sent_campaign_memberships')
     reply_activity = db.relationship('Activity', foreign_keys=[reply_activity_id], backref='reply_campaign_memberships')
+    
+    # Enrollment inserts rely on this for ON CONFLICT DO NOTHING
+    __table_args__ = (
+        db.UniqueConstraint('campaign_id', 'contact_id', name='uq_campaign_membership_campaign_contact'),
+    )
 
 # --- NEW: ContactFlag Model (for opt-outs and compliance) ---
 class ContactFlag(db.Model):
@@ -800,6 +990,16 @@ class QuickBooksSync(db.Model):
     )
 
 
+class QuickBooksSyncWatermark(db.Model):
+    """Change-data-capture position of the QuickBooks sync, one row per entity type"""
+    __tablename__ = 'quickbooks_sync_watermark'
+    id = db.Column(db.Integer, primary_key=True)
+    entity_type = db.Column(db.String(50), unique=True, nullable=False)  # 'customer', 'item', 'estimate', 'invoice'
+    # Latest MetaData.LastUpdatedTime applied locally; the next sync asks for changes since then
+    last_updated_time = db.Column(db.DateTime, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class Todo(db.Model):
     """Todo items for task management"""
     __tablename__ = 'todos'
@@ -1523,6 +1723,41 @@ class ConversionEvent(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+
+
+class CampaignAttribution(db.Model):
+    """Materialized multi-touch attribution per campaign and model, rebuilt by the attribution refresh task"""
+    __tablename__ = 'campaign_attribution'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    campaign_id = db.Column(db.Integer, db.ForeignKey('campaign.id', ondelete='CASCADE'), nullable=False)
+    attribution_model = db.Column(db.String(20), nullable=False)  # 'first_touch', 'last_touch', 'linear', 'time_decay'
+    conversion_count = db.Column(db.Integer, nullable=False, default=0)
+    total_conversion_value = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    attributed_value = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    average_touchpoints = db.Column(db.Float, nullable=False, default=0.0)
+    calculated_at = db.Column(db.DateTime, nullable=False, default=utc_now)
+    
+    __table_args__ = (
+        db.UniqueConstraint('campaign_id', 'attribution_model', name='uq_campaign_attribution_campaign_model'),
+    )
+    
+    def __repr__(self):
+        return f'<CampaignAttribution {self.campaign_id} {self.attribution_model}: ${self.attributed_value}>'
+    
+    def to_dict(self) -> dict:
+        """Convert attribution to dictionary for API responses"""
+        return {
+            'campaign_id': self.campaign_id,
+            'attribution_model': self.attribution_model,
+            'conversion_count': self.conversion_count,
+            'total_conversion_value': float(self.total_conversion_value) if self.total_conversion_value is not None else 0.0,
+            'attributed_value': float(self.attributed_value) if self.attributed_value is not None else 0.0,
+            'average_touchpoints': self.average_touchpoints,
+            'calculated_at': self.calculated_at.isoformat() if self.calculated_at else None
+        }
+
+
 # --- P4-04: Advanced ROI Calculation System Models ---
 class CampaignCost(db.Model):
     """Track all campaign expenses for ROI calculation"""
@@ -1850,3 +2085,104 @@ class ROIAnalysis(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+
+
+class ExportJob(db.Model):
+    """Background analytics export written incrementally to a file"""
+    __tablename__ = 'export_jobs'
+    
+    # Primary key
+    id = db.Column(db.Integer, primary_key=True)
+    
+    # Export definition
+    dataset = db.Column(db.String(50), nullable=False)  # 'customer_ltv', 'campaign_costs', 'conversions', 'responses'
+    format = db.Column(db.String(10), nullable=False, default='csv')  # 'csv', 'ndjson'
+    filters = db.Column(db.JSON, nullable=True)  # campaign_id, start_date, end_date
+    status = db.Column(db.String(20), nullable=False, default='pending', index=True)  # 'pending', 'running', 'completed', 'failed'
+    
+    # Output file and resume checkpoint
+    file_path = db.Column(db.String(500), nullable=True)
+    total_rows = db.Column(db.Integer, nullable=True)
+    rows_exported = db.Column(db.Integer, nullable=False, default=0)
+    bytes_written = db.Column(db.BigInteger, nullable=False, default=0)
+    last_row_id = db.Column(db.Integer, nullable=False, default=0)  # Keyset position of the last checkpoint
+    
+    # Execution tracking
+    celery_task_id = db.Column(db.String(255), nullable=True)
+    error_message = db.Column(db.Text, nullable=True)
+    created_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    
+    # Timestamps
+    created_at = db.Column(db.DateTime, nullable=False, default=utc_now)
+    started_at = db.Column(db.DateTime, nullable=True)
+    completed_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utc_now, onupdate=utc_now)
+    
+    def __repr__(self):
+        return f'<ExportJob {self.id}: {self.dataset}.{self.format} ({self.status})>'
+    
+    @property
+    def progress_percent(self) -> float:
+        """Percentage of rows written so far"""
+        if self.status == 'completed':
+            return 100.0
+        if not self.total_rows:
+            return 0.0
+        return round(min(self.rows_exported / self.total_rows, 1.0) * 100, 1)
+    
+    def to_dict(self) -> dict:
+        """Convert export job to dictionary for API responses"""
+        return {
+            'id': self.id,
+            'dataset': self.dataset,
+            'format': self.format,
+            'filters': self.filters,
+            'status': self.status,
+            'total_rows': self.total_rows,
+            'rows_exported': self.rows_exported,
+            'bytes_written': self.bytes_written,
+            'progress_percent': self.progress_percent,
+            'error_message': self.error_message,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None
+        }
+
+
+class SentimentClassification(db.Model):
+    """Cached sentiment/intent classification keyed by normalized text hash"""
+    __tablename__ = 'sentiment_classifications'
+    
+    # Primary key
+    id = db.Column(db.Integer, primary_key=True)
+    
+    # Cache key - SHA-256 of the normalized text and the model that classified it
+    text_hash = db.Column(db.String(64), nullable=False)
+    model_version = db.Column(db.String(50), nullable=False)
+    
+    # Classification results
+    sentiment = db.Column(db.String(20), nullable=False)  # positive, negative, neutral
+    intent = db.Column(db.String(50), nullable=True)
+    confidence = db.Column(db.Float, nullable=True)
+    urgency = db.Column(db.String(10), nullable=True)  # low, medium, high
+    keywords = db.Column(db.JSON, nullable=True)
+    
+    # Timestamps
+    created_at = db.Column(db.DateTime, nullable=False, default=utc_now)
+    
+    __table_args__ = (
+        db.UniqueConstraint('text_hash', 'model_version', name='uq_sentiment_classifications_hash_model'),
+    )
+    
+    def __repr__(self):
+        return f'<SentimentClassification {self.text_hash[:12]}: {self.sentiment}/{self.intent}>'
+    
+    def to_dict(self) -> dict:
+        """Convert classification to the analysis result shape"""
+        return {
+            'sentiment': self.sentiment,
+            'intent': self.intent,
+            'confidence': self.confidence,
+            'keywords': self.keywords or [],
+            'urgency': self.urgency
+        }
@@ -4,9 +4,12 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_bcrypt import Bcrypt
 
+from utils.database import RoutingSession
+
 # This is now the single source of truth for the db object.
 # It's initialized here, but not yet connected to a Flask app.
-db = SQLAlchemy()
+# RoutingSession sends read_only repository reads to the read replica bind when configured.
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # Authentication extensions
 login_manager = LoginManager()
@@ -136,6 +136,19 @@ class PerformanceLogger:
             record_count=record_count,
             event_type="db_query"
         )
+    
+    def log_query_stats(self, summary: Dict[str, Any]):
+        """Log the queries of one request or task; warns on probable N+1 patterns"""
+        log = self.logger.warning if summary.get('n_plus_one') else self.logger.info
+        log(
+            "Query statistics",
+            scope=summary['label'],
+            query_count=summary['query_count'],
+            db_time_ms=summary['db_time_ms'],
+            slowest=summary['slowest'],
+            n_plus_one=summary['n_plus_one'],
+            event_type="query_stats"
+        )
 
 
 # Global logger instances
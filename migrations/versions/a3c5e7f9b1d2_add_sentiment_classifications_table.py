@@ -0,0 +1,38 @@
+"""Add sentiment_classifications cache table
+
+Revision ID: a3c5e7f9b1d2
+Revises: e4b8f2a6c1d9
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c5e7f9b1d2'
+down_revision = 'e4b8f2a6c1d9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create sentiment_classifications table"""
+    op.create_table('sentiment_classifications',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('text_hash', sa.String(length=64), nullable=False),
+        sa.Column('model_version', sa.String(length=50), nullable=False),
+        sa.Column('sentiment', sa.String(length=20), nullable=False),
+        sa.Column('intent', sa.String(length=50), nullable=True),
+        sa.Column('confidence', sa.Float(), nullable=True),
+        sa.Column('urgency', sa.String(length=10), nullable=True),
+        sa.Column('keywords', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('text_hash', 'model_version', name='uq_sentiment_classifications_hash_model')
+    )
+
+
+def downgrade():
+    """Drop sentiment_classifications table"""
+    op.drop_table('sentiment_classifications')
@@ -0,0 +1,183 @@
+"""Partition activity and webhook_event by month, add archived_partitions
+
+Revision ID: a7d3f9b1c5e8
+Revises: f2c6a8e0b4d3
+Create Date: 2026-10-19 12:00:00.000000
+
+On PostgreSQL, activity and webhook_event become tables partitioned by
+RANGE (created_at) with one partition per month, plus a DEFAULT partition
+for anything outside the pre-created months. Existing rows are copied into
+the partitions. PostgreSQL requires every unique constraint of a partitioned
+table to include the partition key, so the rebuilt tables use these keys:
+
+- the primary keys become (id, created_at);
+- activity.openphone_id is unique with created_at;
+- webhook_event.event_id is unique with created_at.
+
+The application still looks rows up by openphone_id or event_id before
+inserting. Foreign keys that point at activity.id cannot reference a
+partitioned table by id alone, so they are dropped; the ORM relationships
+keep those links. Other dialects only get the archived_partitions table.
+
+PartitionMaintenanceService creates future partitions and archives old ones.
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3f9b1c5e8'
+down_revision = 'f2c6a8e0b4d3'
+branch_labels = None
+depends_on = None
+
+# Table -> columns that were unique on their own and become unique with created_at
+PARTITIONED_TABLES = {
+    'activity': ['openphone_id'],
+    'webhook_event': ['event_id'],
+}
+PREMAKE_MONTHS = 3
+
+# Foreign keys to activity.id, dropped on upgrade and restored on downgrade
+ACTIVITY_REFERENCES = [
+    ('ab_test_result', 'sent_activity_id'),
+    ('ab_test_result', 'response_activity_id'),
+    ('campaign_membership', 'sent_activity_id'),
+    ('campaign_membership', 'reply_activity_id'),
+    ('conversion_events', 'source_activity_id'),
+    ('engagement_events', 'activity_id'),
+    ('media_attachment', 'activity_id'),
+]
+
+
+def _month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def _next_month(day):
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def _indexes(inspector, table):
+    return [index for index in inspector.get_indexes(table) if not index.get('unique')]
+
+
+def _incoming_foreign_keys(inspector, referred_table):
+    foreign_keys = []
+    for table in inspector.get_table_names():
+        for foreign_key in inspector.get_foreign_keys(table):
+            if foreign_key['referred_table'] == referred_table and foreign_key.get('name'):
+                foreign_keys.append((table, foreign_key))
+    return foreign_keys
+
+
+def _partition_table(bind, table, unique_columns):
+    inspector = sa.inspect(bind)
+    indexes = _indexes(inspector, table)
+    outgoing_foreign_keys = inspector.get_foreign_keys(table)
+    old = f'{table}_unpartitioned'
+
+    for referencing_table, foreign_key in _incoming_foreign_keys(inspector, table):
+        op.drop_constraint(foreign_key['name'], referencing_table, type_='foreignkey')
+
+    op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    op.execute(f'UPDATE {old} SET created_at = NOW() WHERE created_at IS NULL')
+    op.execute(
+        f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING STORAGE) '
+        f'PARTITION BY RANGE (created_at)'
+    )
+    op.execute(f'ALTER TABLE {table} ALTER COLUMN created_at SET NOT NULL')
+
+    oldest = bind.execute(sa.text(f'SELECT MIN(created_at) FROM {old}')).scalar()
+    month = _month_start(oldest.date() if oldest else date.today())
+    last = _month_start(date.today())
+    for _ in range(PREMAKE_MONTHS):
+        last = _next_month(last)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_next_month(month).isoformat()}')"
+        )
+        month = _next_month(month)
+    op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+    op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+    op.execute(f'ALTER SEQUENCE IF EXISTS {table}_id_seq OWNED BY {table}.id')
+    op.execute(f'DROP TABLE {old}')
+
+    op.create_primary_key(f'{table}_pkey', table, ['id', 'created_at'])
+    for column in unique_columns:
+        op.create_unique_constraint(f'uq_{table}_{column}_created_at', table, [column, 'created_at'])
+    for index in indexes:
+        op.create_index(index['name'], table, index['column_names'])
+    for foreign_key in outgoing_foreign_keys:
+        op.create_foreign_key(
+            foreign_key.get('name'), table, foreign_key['referred_table'],
+            foreign_key['constrained_columns'], foreign_key['referred_columns'],
+            ondelete=foreign_key.get('options', {}).get('ondelete')
+        )
+
+
+def _unpartition_table(bind, table, unique_columns):
+    inspector = sa.inspect(bind)
+    indexes = _indexes(inspector, table)
+    outgoing_foreign_keys = inspector.get_foreign_keys(table)
+    old = f'{table}_partitioned'
+
+    op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING STORAGE)')
+    op.execute(f'ALTER TABLE {table} ALTER COLUMN created_at DROP NOT NULL')
+    op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+    op.execute(f'ALTER SEQUENCE IF EXISTS {table}_id_seq OWNED BY {table}.id')
+    op.execute(f'DROP TABLE {old} CASCADE')
+
+    op.create_primary_key(f'{table}_pkey', table, ['id'])
+    for column in unique_columns:
+        op.create_unique_constraint(f'{table}_{column}_key', table, [column])
+    for index in indexes:
+        op.create_index(index['name'], table, index['column_names'])
+    for foreign_key in outgoing_foreign_keys:
+        op.create_foreign_key(
+            foreign_key.get('name'), table, foreign_key['referred_table'],
+            foreign_key['constrained_columns'], foreign_key['referred_columns'],
+            ondelete=foreign_key.get('options', {}).get('ondelete')
+        )
+
+
+def upgrade():
+    """Create archived_partitions and partition activity and webhook_event by month"""
+    op.create_table('archived_partitions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('table_name', sa.String(length=64), nullable=False),
+        sa.Column('period_start', sa.Date(), nullable=False),
+        sa.Column('period_end', sa.Date(), nullable=False),
+        sa.Column('chunk_index', sa.Integer(), nullable=False),
+        sa.Column('row_count', sa.Integer(), nullable=False),
+        sa.Column('payload', sa.LargeBinary(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('table_name', 'period_start', 'chunk_index', name='uq_archived_partition_chunk')
+    )
+
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    # The payload is already gzip-compressed; don't let TOAST try again
+    op.execute('ALTER TABLE archived_partitions ALTER COLUMN payload SET STORAGE EXTERNAL')
+    for table, unique_columns in PARTITIONED_TABLES.items():
+        _partition_table(bind, table, unique_columns)
+
+
+def downgrade():
+    """Merge the monthly partitions back into plain tables and drop archived_partitions"""
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        for table, unique_columns in PARTITIONED_TABLES.items():
+            _unpartition_table(bind, table, unique_columns)
+        for table, column in ACTIVITY_REFERENCES:
+            op.create_foreign_key(f'{table}_{column}_fkey', table, 'activity', [column], ['id'])
+
+    op.drop_table('archived_partitions')
@@ -0,0 +1,60 @@
+"""Add indexed geohash column to property
+
+Revision ID: b7d2f4a6c8e1
+Revises: a3c5e7f9b1d2
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from utils.geo import geohash_for
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2f4a6c8e1'
+down_revision = 'a3c5e7f9b1d2'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade():
+    """Add property.geohash and backfill it from existing coordinates.
+
+    Radius, bounding-box and nearest-neighbour searches filter on geohash
+    prefix ranges, which the B-tree index serves directly. New writes keep
+    the column current through the before_flush hook in crm_database and the
+    PropertyRepository bulk paths.
+    """
+    with op.batch_alter_table('property') as batch_op:
+        batch_op.add_column(sa.Column('geohash', sa.String(length=12), nullable=True))
+        batch_op.create_index('ix_property_geohash', ['geohash'])
+
+    connection = op.get_bind()
+    update = sa.text("UPDATE property SET geohash = :geohash WHERE id = :id")
+    last_id = 0
+    while True:
+        rows = connection.execute(sa.text("""
+            SELECT id, latitude, longitude FROM property
+            WHERE id > :last_id AND latitude IS NOT NULL AND longitude IS NOT NULL
+            ORDER BY id
+            LIMIT :batch_size
+        """), {'last_id': last_id, 'batch_size': BACKFILL_BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+
+        updates = [
+            {'id': row.id, 'geohash': geohash_for(row.latitude, row.longitude)}
+            for row in rows
+        ]
+        connection.execute(update, updates)
+        last_id = rows[-1].id
+
+
+def downgrade():
+    """Remove property.geohash"""
+    with op.batch_alter_table('property') as batch_op:
+        batch_op.drop_index('ix_property_geohash')
+        batch_op.drop_column('geohash')
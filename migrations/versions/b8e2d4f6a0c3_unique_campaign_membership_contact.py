@@ -0,0 +1,60 @@
+"""Make campaign_membership unique per campaign and contact
+
+Revision ID: b8e2d4f6a0c3
+Revises: a7d3f9b1c5e8
+Create Date: 2026-10-19 14:00:00.000000
+
+Campaign enrollment inserts memberships with INSERT ... SELECT ... ON
+CONFLICT DO NOTHING, which needs a unique constraint on (campaign_id,
+contact_id). Existing duplicates are merged into the lowest membership id
+first, and references from campaign_responses and conversion_events are
+moved to the kept row.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e2d4f6a0c3'
+down_revision = 'a7d3f9b1c5e8'
+branch_labels = None
+depends_on = None
+
+# (table, column) pairs that reference campaign_membership.id
+MEMBERSHIP_REFERENCES = [
+    ('campaign_responses', 'campaign_membership_id'),
+    ('conversion_events', 'source_campaign_membership_id'),
+]
+
+DUPLICATE_KEEPER = """
+    SELECT duplicate.id AS duplicate_id, keeper.keeper_id
+    FROM campaign_membership duplicate
+    JOIN (
+        SELECT campaign_id, contact_id, MIN(id) AS keeper_id
+        FROM campaign_membership
+        GROUP BY campaign_id, contact_id
+        HAVING COUNT(*) > 1
+    ) keeper ON keeper.campaign_id = duplicate.campaign_id
+        AND keeper.contact_id = duplicate.contact_id
+    WHERE duplicate.id <> keeper.keeper_id
+"""
+
+
+def upgrade():
+    """Merge duplicate memberships and add the unique constraint"""
+    for table, column in MEMBERSHIP_REFERENCES:
+        op.execute(
+            f"UPDATE {table} SET {column} = ("
+            f"SELECT keeper_id FROM ({DUPLICATE_KEEPER}) merged WHERE merged.duplicate_id = {table}.{column}"
+            f") WHERE {column} IN (SELECT duplicate_id FROM ({DUPLICATE_KEEPER}) merged)"
+        )
+    op.execute(f"DELETE FROM campaign_membership WHERE id IN (SELECT duplicate_id FROM ({DUPLICATE_KEEPER}) merged)")
+
+    with op.batch_alter_table('campaign_membership') as batch_op:
+        batch_op.create_unique_constraint('uq_campaign_membership_campaign_contact', ['campaign_id', 'contact_id'])
+
+
+def downgrade():
+    """Drop the unique constraint (merged duplicates are not restored)"""
+    with op.batch_alter_table('campaign_membership') as batch_op:
+        batch_op.drop_constraint('uq_campaign_membership_campaign_contact', type_='unique')
@@ -0,0 +1,43 @@
+"""Add campaign_attribution table
+
+Revision ID: c4f8a2d6e1b7
+Revises: b8e2d4f6a0c3
+Create Date: 2026-10-19 16:00:00.000000
+
+Holds per-campaign multi-touch attribution for each attribution model,
+rebuilt in batch by the attribution refresh task.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f8a2d6e1b7'
+down_revision = 'b8e2d4f6a0c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create campaign_attribution table"""
+    op.create_table('campaign_attribution',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('campaign_id', sa.Integer(), nullable=False),
+        sa.Column('attribution_model', sa.String(length=20), nullable=False),
+        sa.Column('conversion_count', sa.Integer(), nullable=False),
+        sa.Column('total_conversion_value', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column('attributed_value', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column('average_touchpoints', sa.Float(), nullable=False),
+        sa.Column('calculated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['campaign_id'], ['campaign.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('campaign_id', 'attribution_model', name='uq_campaign_attribution_campaign_model')
+    )
+    # Touchpoint lookups go by contact and time window
+    op.create_index('ix_activity_contact_created_at', 'activity', ['contact_id', 'created_at'])
+
+
+def downgrade():
+    """Drop campaign_attribution table"""
+    op.drop_index('ix_activity_contact_created_at', table_name='activity')
+    op.drop_table('campaign_attribution')
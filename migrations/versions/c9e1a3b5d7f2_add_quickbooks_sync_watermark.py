@@ -0,0 +1,33 @@
+"""Add quickbooks_sync_watermark table
+
+Revision ID: c9e1a3b5d7f2
+Revises: b7d2f4a6c8e1
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9e1a3b5d7f2'
+down_revision = 'b7d2f4a6c8e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create quickbooks_sync_watermark table"""
+    op.create_table('quickbooks_sync_watermark',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('entity_type', sa.String(length=50), nullable=False),
+        sa.Column('last_updated_time', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('entity_type')
+    )
+
+
+def downgrade():
+    """Drop quickbooks_sync_watermark table"""
+    op.drop_table('quickbooks_sync_watermark')
@@ -0,0 +1,112 @@
+"""Add denormalized inbox summary columns to conversation
+
+Revision ID: d1a7c3e9b2f4
+Revises: 54cef61514fb
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd1a7c3e9b2f4'
+down_revision = '54cef61514fb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add inbox summary columns and backfill them from existing activities.
+
+    The inbox and dashboard timeline read these columns instead of loading
+    every activity of every conversation. New activities keep them current
+    through the before_flush hook in crm_database.
+    """
+    with op.batch_alter_table('conversation') as batch_op:
+        batch_op.add_column(sa.Column('last_message_preview', sa.String(length=160), nullable=True))
+        batch_op.add_column(sa.Column('last_direction', sa.String(length=10), nullable=True))
+        batch_op.add_column(sa.Column('unread_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('has_attachments', sa.Boolean(), nullable=False, server_default=sa.false()))
+        batch_op.add_column(sa.Column('has_ai_summary', sa.Boolean(), nullable=False, server_default=sa.false()))
+        batch_op.add_column(sa.Column('activity_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.create_index('ix_conversation_activity_count', ['activity_count'])
+
+    # Backfill counts and flags
+    op.execute("""
+        UPDATE conversation SET
+            activity_count = (
+                SELECT COUNT(*) FROM activity a WHERE a.conversation_id = conversation.id
+            ),
+            has_attachments = EXISTS (
+                SELECT 1 FROM activity a
+                WHERE a.conversation_id = conversation.id
+                    AND a.media_urls IS NOT NULL
+                    AND CAST(a.media_urls AS TEXT) NOT IN ('null', '[]')
+            ),
+            has_ai_summary = EXISTS (
+                SELECT 1 FROM activity a
+                WHERE a.conversation_id = conversation.id
+                    AND a.ai_summary IS NOT NULL
+                    AND a.ai_summary <> ''
+            )
+    """)
+
+    # Backfill last direction and preview from the latest activity, using the
+    # same wording as Conversation.build_activity_preview
+    op.execute("""
+        UPDATE conversation SET
+            last_direction = (
+                SELECT a.direction FROM activity a
+                WHERE a.conversation_id = conversation.id
+                ORDER BY a.created_at DESC, a.id DESC
+                LIMIT 1
+            ),
+            last_message_preview = (
+                SELECT CASE
+                    WHEN a.activity_type = 'call' THEN
+                        CASE WHEN a.direction = 'outgoing' THEN 'Outgoing call' ELSE 'Incoming call' END
+                        || CASE
+                            WHEN a.duration_seconds > 0
+                                THEN ' (' || CAST(a.duration_seconds / 60 AS TEXT) || 'm)'
+                            ELSE ''
+                        END
+                    WHEN a.activity_type = 'voicemail' THEN 'Voicemail received'
+                    WHEN a.body IS NULL OR TRIM(a.body) = '' THEN 'Message (no content)'
+                    ELSE SUBSTR(TRIM(a.body), 1, 160)
+                END
+                FROM activity a
+                WHERE a.conversation_id = conversation.id
+                ORDER BY a.created_at DESC, a.id DESC
+                LIMIT 1
+            )
+        WHERE activity_count > 0
+    """)
+
+    # Unread = incoming activities after the latest outgoing one
+    op.execute("""
+        UPDATE conversation SET
+            unread_count = (
+                SELECT COUNT(*) FROM activity a
+                WHERE a.conversation_id = conversation.id
+                    AND a.direction = 'incoming'
+                    AND a.created_at > COALESCE((
+                        SELECT MAX(o.created_at) FROM activity o
+                        WHERE o.conversation_id = conversation.id
+                            AND o.direction = 'outgoing'
+                    ), '1900-01-01')
+            )
+        WHERE activity_count > 0
+    """)
+
+
+def downgrade():
+    """Remove inbox summary columns"""
+    with op.batch_alter_table('conversation') as batch_op:
+        batch_op.drop_index('ix_conversation_activity_count')
+        batch_op.drop_column('activity_count')
+        batch_op.drop_column('has_ai_summary')
+        batch_op.drop_column('has_attachments')
+        batch_op.drop_column('unread_count')
+        batch_op.drop_column('last_direction')
+        batch_op.drop_column('last_message_preview')
@@ -0,0 +1,48 @@
+"""Add export_jobs table for resumable background exports
+
+Revision ID: e4b8f2a6c1d9
+Revises: d1a7c3e9b2f4
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b8f2a6c1d9'
+down_revision = 'd1a7c3e9b2f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create export_jobs table"""
+    op.create_table('export_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('dataset', sa.String(length=50), nullable=False),
+        sa.Column('format', sa.String(length=10), nullable=False),
+        sa.Column('filters', sa.JSON(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('file_path', sa.String(length=500), nullable=True),
+        sa.Column('total_rows', sa.Integer(), nullable=True),
+        sa.Column('rows_exported', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('bytes_written', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('last_row_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('celery_task_id', sa.String(length=255), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['created_by'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_export_jobs_status', 'export_jobs', ['status'], unique=False)
+
+
+def downgrade():
+    """Drop export_jobs table"""
+    op.drop_index('ix_export_jobs_status', table_name='export_jobs')
+    op.drop_table('export_jobs')
@@ -0,0 +1,45 @@
+"""Add scheduled_notifications table
+
+Revision ID: f2c6a8e0b4d3
+Revises: c9e1a3b5d7f2
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c6a8e0b4d3'
+down_revision = 'c9e1a3b5d7f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create scheduled_notifications table"""
+    op.create_table('scheduled_notifications',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=30), nullable=False),
+        sa.Column('target_id', sa.Integer(), nullable=False),
+        sa.Column('scheduled_for', sa.Date(), nullable=False),
+        sa.Column('contact_id', sa.Integer(), nullable=True),
+        sa.Column('phone', sa.String(length=20), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['contact_id'], ['contact.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('kind', 'target_id', 'scheduled_for', name='uq_scheduled_notification_target_day')
+    )
+    op.create_index('ix_scheduled_notifications_status', 'scheduled_notifications', ['status'])
+
+
+def downgrade():
+    """Drop scheduled_notifications table"""
+    op.drop_index('ix_scheduled_notifications_status', table_name='scheduled_notifications')
+    op.drop_table('scheduled_notifications')
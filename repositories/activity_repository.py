@@ -3,19 +3,57 @@ ActivityRepository - Data access layer for Activity model
 """
 
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
+from utils.database import read_only
 from utils.datetime_utils import utc_now
-from sqlalchemy import desc, func
+from sqlalchemy import case, desc, func
 from repositories.base_repository import BaseRepository, PaginatedResult
+from repositories.partition_archive_repository import PartitionArchiveRepository
 from crm_database import Activity
 
 
 class ActivityRepository(BaseRepository):
     """Repository for Activity data access"""
     
-    def __init__(self, session):
-        """Initialize repository with database session"""
+    def __init__(self, session, archive_repository: Optional[PartitionArchiveRepository] = None):
+        """
+        Initialize repository with database session.
+        
+        Args:
+            session: Database session
+            archive_repository: Cold storage for months archived out of the table
+        """
         super().__init__(session, Activity)
+        self.archive_repository = archive_repository or PartitionArchiveRepository(session)
+    
+    def find_by_date_range(self, start: datetime, end: Optional[datetime] = None,
+                           include_archived: bool = False, **filters) -> List:
+        """
+        Find activities created in [start, end), optionally including archived months.
+        
+        Archived activities are returned as transient Activity objects that are not
+        attached to the session.
+        
+        Args:
+            start: Earliest created_at
+            end: created_at upper bound, exclusive (None for no upper bound)
+            include_archived: Also read months moved to the archive
+            **filters: Column values to match, e.g. contact_id=1
+            
+        Returns:
+            List of Activity objects ordered by created_at
+        """
+        query = self.session.query(self.model_class).filter(self.model_class.created_at >= start)
+        if end is not None:
+            query = query.filter(self.model_class.created_at < end)
+        if filters:
+            query = query.filter_by(**filters)
+        results = query.order_by(self.model_class.created_at).all()
+        
+        if include_archived:
+            archived = self.archive_repository.find_archived(self.model_class, start, end, **filters)
+            results = sorted(archived + results, key=lambda row: row.created_at)
+        return results
     
     def find_by_conversation_id(self, conversation_id: int) -> List:
         """
@@ -234,29 +272,39 @@ class ActivityRepository(BaseRepository):
     
     # Dashboard-specific methods
     
+    @read_only
     def get_message_volume_data(self, days: int = 7) -> List[Dict[str, Any]]:
         """
         Get message volume data for the last N days.
         
+        One grouped query over a created_at range, so the index on
+        created_at (and partition pruning) applies.
+        
         Args:
             days: Number of days to look back
             
         Returns:
             List of dictionaries with date and count for each day
         """
-        from datetime import datetime, timedelta
+        today = utc_now().date()
+        first_day = today - timedelta(days=days - 1)
+        message_day = func.date(self.model_class.created_at)
         
-        message_volume_data = []
-        for i in range(days):
-            day = utc_now().date() - timedelta(days=days-1-i)
-            count = self.session.query(self.model_class).filter(
-                self.model_class.activity_type == 'message',
-                func.date(self.model_class.created_at) == day
-            ).count()
-            message_volume_data.append({'date': day, 'count': count})
-            
-        return message_volume_data
+        rows = self.session.query(message_day, func.count(self.model_class.id)).filter(
+            self.model_class.activity_type == 'message',
+            self.model_class.created_at >= datetime.combine(first_day, time.min),
+            self.model_class.created_at < datetime.combine(today + timedelta(days=1), time.min)
+        ).group_by(message_day).all()
+        
+        # SQLite returns the day as text, PostgreSQL as a date
+        counts = {str(day)[:10]: count for day, count in rows}
+        
+        return [
+            {'date': day, 'count': counts.get(day.isoformat(), 0)}
+            for day in (first_day + timedelta(days=i) for i in range(days))
+        ]
     
+    @read_only
     def get_messages_sent_today_count(self) -> int:
         """
         Get count of outgoing messages sent today.
@@ -277,6 +325,7 @@ class ActivityRepository(BaseRepository):
             self.model_class.created_at <= today_end
         ).count()
     
+    @read_only
     def calculate_overall_response_rate(self) -> float:
         """
         Calculate overall response rate (incoming vs outgoing messages).
@@ -298,7 +347,28 @@ class ActivityRepository(BaseRepository):
         ).count()
         
         return round((total_incoming / total_outgoing) * 100, 1)
-    
+
+    @read_only
+    def get_message_direction_counts(self) -> Dict[str, int]:
+        """
+        Get total message counts per direction in a single grouped query.
+
+        Returns:
+            Dict with 'outgoing' and 'incoming' message counts
+        """
+        rows = self.session.query(
+            self.model_class.direction,
+            func.count(self.model_class.id)
+        ).filter(
+            self.model_class.activity_type == 'message',
+            self.model_class.direction.in_(['outgoing', 'incoming'])
+        ).group_by(self.model_class.direction).all()
+
+        counts = {'outgoing': 0, 'incoming': 0}
+        for direction, count in rows:
+            counts[direction] = count
+        return counts
+
     def get_distinct_contacts_with_recent_activity(self, days: int = 7) -> int:
         """
         Get count of distinct contacts with activity in the last N days.
@@ -439,36 +509,46 @@ class ActivityRepository(BaseRepository):
             self.model_class.activity_metadata.contains('bounce_type')
         ).all()
     
+    @read_only
     def get_daily_message_stats(self, days: int = 7) -> List[dict]:
         """
         Get daily message statistics for the last N days.
         
+        Counts are aggregated in one grouped query instead of loading every
+        message of the window.
+        
         Args:
             days: Number of days to analyze
             
         Returns:
-            List of daily statistics dictionaries
+            List of daily statistics dictionaries, oldest day first
         """
-        stats = []
+        today = utc_now().date()
+        first_day = today - timedelta(days=days - 1)
+        message_day = func.date(self.model_class.created_at)
+        
+        rows = self.session.query(
+            message_day,
+            func.sum(case((self.model_class.direction == 'outgoing', 1), else_=0)),
+            func.sum(case((self.model_class.status.in_(['failed', 'undelivered', 'rejected', 'blocked']), 1), else_=0))
+        ).filter(
+            self.model_class.activity_type == 'message',
+            self.model_class.created_at >= datetime.combine(first_day, time.min),
+            self.model_class.created_at < datetime.combine(today + timedelta(days=1), time.min)
+        ).group_by(message_day).all()
         
+        # SQLite returns the day as text, PostgreSQL as a date
+        counts = {str(day)[:10]: (int(sent or 0), int(bounced or 0)) for day, sent, bounced in rows}
+        
+        stats = []
         for i in range(days):
-            day = utc_now().date() - timedelta(days=days-1-i)
-            
-            # Count messages for this day
-            day_messages = self.session.query(self.model_class).filter(
-                self.model_class.activity_type == 'message',
-                func.date(self.model_class.created_at) == day
-            ).all()
-            
-            sent = sum(1 for m in day_messages if m.direction == 'outgoing')
-            bounced = sum(1 for m in day_messages if m.status in ['failed', 'undelivered', 'rejected', 'blocked'])
-            bounce_rate = (bounced / sent * 100) if sent > 0 else 0
-            
+            day = first_day + timedelta(days=i)
+            sent, bounced = counts.get(day.isoformat(), (0, 0))
             stats.append({
                 'date': day,
                 'sent': sent,
                 'bounced': bounced,
-                'bounce_rate': bounce_rate
+                'bounce_rate': (bounced / sent * 100) if sent > 0 else 0
             })
         
         return stats
@@ -5,6 +5,7 @@ AppointmentRepository - Data access layer for Appointment model
 from typing import List, Optional
 from datetime import date, datetime
 from sqlalchemy import desc, asc, or_, and_
+from sqlalchemy.orm import joinedload
 from repositories.base_repository import BaseRepository, PaginatedResult
 from crm_database import Appointment
 
@@ -46,6 +47,22 @@ class AppointmentRepository(BaseRepository):
             .order_by(asc(self.model_class.time))\
             .all()
     
+    def find_by_date_with_contacts(self, appointment_date: date) -> List:
+        """
+        Find all appointments on a specific date with their contacts loaded.
+        
+        Args:
+            appointment_date: Date to search for
+            
+        Returns:
+            List of Appointment objects ordered by time, contact eager-loaded
+        """
+        return self.session.query(self.model_class)\
+            .options(joinedload(self.model_class.contact))\
+            .filter_by(date=appointment_date)\
+            .order_by(asc(self.model_class.time), asc(self.model_class.id))\
+            .all()
+    
     def find_by_date_range(self, start_date: date, end_date: date) -> List:
         """
         Find appointments within a date range.
@@ -4,10 +4,12 @@ Implements common database operations following the Repository Pattern
 """
 
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic, List, Optional, Dict, Any, Tuple, Type
+from typing import TypeVar, Generic, List, Optional, Dict, Any, Tuple, Type, Iterator, Iterable
 from sqlalchemy.orm import Session, Query
 from sqlalchemy.exc import SQLAlchemyError, DisconnectionError, InvalidRequestError
-from sqlalchemy import and_, or_, desc, asc
+from sqlalchemy import and_, or_, desc, asc, func, select, insert, update
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import Select
 from dataclasses import dataclass
 from enum import Enum
 import logging
@@ -359,6 +361,113 @@ class BaseRepository(ABC, Generic[T]):
             logger.error(f"Error counting {self.model_class.__name__}: {e}")
             return 0
     
+    # STREAMING Operations
+    
+    def stream_batches(self, statement: Select, batch_size: int = 1000) -> Iterator[List[Row]]:
+        """
+        Stream the rows of a select statement in fixed-size batches.
+        
+        Uses yield_per, so PostgreSQL reads through a server-side cursor and
+        only one batch is held in memory at a time. The session must not be
+        committed while the iterator is open, as that closes the cursor.
+        
+        Args:
+            statement: Column select to execute
+            batch_size: Number of rows fetched per batch
+            
+        Returns:
+            Iterator of row batches
+        """
+        result = self.session.execute(statement.execution_options(yield_per=batch_size))
+        try:
+            for batch in result.partitions():
+                yield batch
+        finally:
+            result.close()
+    
+    def count_statement(self, statement: Select) -> int:
+        """
+        Count the rows a select statement would return.
+        
+        Args:
+            statement: Select statement to count
+            
+        Returns:
+            Number of matching rows
+        """
+        count_query = select(func.count()).select_from(statement.order_by(None).subquery())
+        return self.session.execute(count_query).scalar() or 0
+    
+    # BULK Operations
+    
+    # Keep IN lists and multi-row statements well below database parameter limits
+    LOOKUP_CHUNK_SIZE = 500
+    
+    def find_by_values(self, field: str, values: Iterable[Any]) -> Dict[Any, T]:
+        """
+        Find entities whose field matches any of the given values, with chunked IN queries.
+        
+        Args:
+            field: Model attribute to match on, e.g. 'quickbooks_customer_id'
+            values: Values to look up; None and duplicates are ignored
+            
+        Returns:
+            Dictionary mapping each found value to its entity
+        """
+        column = getattr(self.model_class, field)
+        unique_values = list(dict.fromkeys(value for value in values if value is not None))
+        found = {}
+        
+        for start in range(0, len(unique_values), self.LOOKUP_CHUNK_SIZE):
+            chunk = unique_values[start:start + self.LOOKUP_CHUNK_SIZE]
+            for entity in self.session.query(self.model_class).filter(column.in_(chunk)):
+                found[getattr(entity, field)] = entity
+        
+        return found
+    
+    def bulk_insert(self, rows: List[Dict[str, Any]], key_field: Optional[str] = None) -> Dict[Any, int]:
+        """
+        Insert rows with multi-row INSERT statements, bypassing the unit of work.
+        
+        Column defaults apply, but ORM events and relationships do not.
+        
+        Args:
+            rows: Column-value dictionaries to insert
+            key_field: Optional column to key the returned IDs by
+            
+        Returns:
+            Dictionary mapping each row's key_field value to its new ID
+            (empty when no key_field is given)
+        """
+        ids = {}
+        for start in range(0, len(rows), self.LOOKUP_CHUNK_SIZE):
+            chunk = rows[start:start + self.LOOKUP_CHUNK_SIZE]
+            if key_field is None:
+                self.session.execute(insert(self.model_class), chunk)
+                continue
+            statement = insert(self.model_class).returning(
+                self.model_class.id, getattr(self.model_class, key_field)
+            )
+            for entity_id, key in self.session.execute(statement, chunk):
+                ids[key] = entity_id
+        return ids
+    
+    def bulk_update(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Update rows by primary key with executemany UPDATE statements.
+        
+        Entities already loaded in the session are not refreshed.
+        
+        Args:
+            rows: Column-value dictionaries, each including 'id'
+            
+        Returns:
+            Number of rows submitted
+        """
+        for start in range(0, len(rows), self.LOOKUP_CHUNK_SIZE):
+            self.session.execute(update(self.model_class), rows[start:start + self.LOOKUP_CHUNK_SIZE])
+        return len(rows)
+    
     # UPDATE Operations
     
     def update(self, entity: T, **updates) -> T:
@@ -0,0 +1,73 @@
+"""
+CampaignAttributionRepository - Data access layer for CampaignAttribution model
+Stores the materialized per-campaign multi-touch attribution
+"""
+
+from typing import List, Optional, Dict, Any
+from sqlalchemy import delete
+from repositories.base_repository import BaseRepository
+from crm_database import CampaignAttribution
+from utils.database import read_only
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CampaignAttributionRepository(BaseRepository[CampaignAttribution]):
+    """Repository for CampaignAttribution data access"""
+    
+    def __init__(self, session):
+        """Initialize repository with database session"""
+        super().__init__(session, CampaignAttribution)
+    
+    def search(self, query: str, fields: Optional[List[str]] = None) -> List[CampaignAttribution]:
+        """
+        Search attribution rows by attribution model.
+        
+        Args:
+            query: Search query string
+            fields: Not used
+            
+        Returns:
+            List of matching attribution rows
+        """
+        if not query:
+            return []
+        return self.session.query(CampaignAttribution)\
+            .filter(CampaignAttribution.attribution_model.ilike(f'%{query}%'))\
+            .order_by(CampaignAttribution.campaign_id)\
+            .all()
+    
+    @read_only
+    def get_for_campaign(self, campaign_id: int) -> Dict[str, CampaignAttribution]:
+        """
+        Get the materialized attribution of a campaign.
+        
+        Args:
+            campaign_id: Campaign ID
+            
+        Returns:
+            Dictionary mapping attribution model to its row
+        """
+        rows = self.session.query(CampaignAttribution)\
+            .filter(CampaignAttribution.campaign_id == campaign_id)\
+            .all()
+        return {row.attribution_model: row for row in rows}
+    
+    def replace_all(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Replace the materialized attribution with freshly calculated rows.
+        
+        The old rows are deleted and the new ones inserted in the same
+        transaction, so readers see either the previous or the new
+        attribution. Not committed.
+        
+        Args:
+            rows: Column dictionaries of the new attribution rows
+            
+        Returns:
+            Number of rows inserted
+        """
+        self.session.execute(delete(CampaignAttribution))
+        self.bulk_insert(rows)
+        return len(rows)
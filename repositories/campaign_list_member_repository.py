@@ -6,10 +6,10 @@ Isolates all database queries related to campaign list members
 from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from utils.datetime_utils import utc_now
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy import and_, or_, func, desc, exists, select, update, literal, true, DateTime, Select
 from sqlalchemy.orm import Query, joinedload
 from repositories.base_repository import BaseRepository
-from crm_database import CampaignListMember, Contact
+from crm_database import CampaignList, CampaignListMember, Contact
 import logging
 
 logger = logging.getLogger(__name__)
@@ -217,6 +217,76 @@ class CampaignListMemberRepository(BaseRepository[CampaignListMember]):
             updates={'status': 'removed'}
         )
     
+    def sync_members(self, list_id: int, contact_ids: Select, added_by: str = 'system_dynamic') -> Dict[str, int]:
+        """
+        Make a list's active members match a contact-id query with two set-based statements.
+        
+        Matching contacts that are not members are inserted and matching
+        removed members are reactivated in one upsert; active members that no
+        longer match are marked removed in one UPDATE. Suppressed members are
+        left alone. The work done depends on how many members change, not on
+        the list size. Not committed.
+        
+        Args:
+            list_id: Campaign list ID
+            contact_ids: Select statement whose first column is the contact id
+            added_by: Recorded on inserted and reactivated members
+            
+        Returns:
+            Dictionary with added and removed counts
+        """
+        source = contact_ids.order_by(None).subquery()
+        contact_id = list(source.c)[0]
+        now = utc_now()
+        columns = ['list_id', 'contact_id', 'status', 'added_by', 'added_at']
+        rows = select(
+            literal(list_id), contact_id, literal('active'), literal(added_by), literal(now, DateTime())
+        ).select_from(source)
+        
+        dialect = self.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            insert = None
+        
+        if insert is None:
+            from sqlalchemy import insert as plain_insert
+            added = self.session.execute(
+                update(CampaignListMember).where(
+                    CampaignListMember.list_id == list_id,
+                    CampaignListMember.status == 'removed',
+                    CampaignListMember.contact_id.in_(select(contact_id))
+                ).values(status='active', added_by=added_by, added_at=now)
+            ).rowcount or 0
+            existing = select(CampaignListMember.id).where(
+                CampaignListMember.list_id == list_id,
+                CampaignListMember.contact_id == contact_id
+            )
+            added += self.session.execute(
+                plain_insert(CampaignListMember).from_select(columns, rows.where(~existing.exists()))
+            ).rowcount or 0
+        else:
+            # The WHERE keeps SQLite from reading ON CONFLICT as a join constraint
+            statement = insert(CampaignListMember).from_select(columns, rows.where(true()))
+            statement = statement.on_conflict_do_update(
+                index_elements=['list_id', 'contact_id'],
+                set_={'status': 'active', 'added_by': added_by, 'added_at': now},
+                where=CampaignListMember.status == 'removed'
+            )
+            added = self.session.execute(statement).rowcount or 0
+        
+        removed = self.session.execute(
+            update(CampaignListMember).where(
+                CampaignListMember.list_id == list_id,
+                CampaignListMember.status == 'active',
+                ~exists().where(contact_id == CampaignListMember.contact_id)
+            ).values(status='removed')
+        ).rowcount or 0
+        
+        return {'added': added, 'removed': removed}
+    
     def reactivate_member(self, list_id: int, contact_id: int, added_by: str = None) -> bool:
         """
         Reactivate a removed member.
@@ -260,6 +330,43 @@ class CampaignListMemberRepository(BaseRepository[CampaignListMember]):
             'removed': removed
         }
     
+    def get_stats_by_list(self) -> Dict[int, Dict[str, int]]:
+        """
+        Get membership statistics for every campaign list in one grouped query.
+        
+        Counts use aggregate FILTER clauses over campaign_list LEFT JOIN
+        members LEFT JOIN contact, so no members or contacts are loaded and
+        lists without members are included with zero counts.
+        
+        Returns:
+            Dictionary mapping list ID to total, active, removed, with_email and
+            with_phone counts (the contact counts cover active members only)
+        """
+        active = CampaignListMember.status == 'active'
+        rows = self.session.query(
+            CampaignList.id,
+            func.count(CampaignListMember.id),
+            func.count(CampaignListMember.id).filter(active),
+            func.count(CampaignListMember.id).filter(CampaignListMember.status == 'removed'),
+            func.count(CampaignListMember.id).filter(active, Contact.email.isnot(None), Contact.email != ''),
+            func.count(CampaignListMember.id).filter(active, Contact.phone.isnot(None), Contact.phone != '')
+        ).outerjoin(
+            CampaignListMember, CampaignListMember.list_id == CampaignList.id
+        ).outerjoin(
+            Contact, Contact.id == CampaignListMember.contact_id
+        ).group_by(CampaignList.id).all()
+        
+        return {
+            list_id: {
+                'total': total,
+                'active': active_count,
+                'removed': removed,
+                'with_email': with_email,
+                'with_phone': with_phone
+            }
+            for list_id, total, active_count, removed, with_email, with_phone in rows
+        }
+    
     def get_members_added_by(self, added_by: str) -> List[CampaignListMember]:
         """
         Get all members added by a specific user.
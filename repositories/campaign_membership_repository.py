@@ -139,18 +139,46 @@ class CampaignMembershipRepository(BaseRepository):
         if membership:
             membership.reply_activity_id = reply_activity_id
             membership.response_sentiment = sentiment
-            
-            # Update status based on sentiment
-            if sentiment == 'positive':
-                membership.status = 'replied_positive'
-            elif sentiment == 'negative':
-                membership.status = 'replied_negative'
-            else:
-                membership.status = 'replied'
-            
+            membership.status = self._replied_status(sentiment)
             self.session.commit()
         return membership
     
+    def record_reply_sentiment(self, membership_id: int, reply_activity_id: int,
+                               sentiment: Optional[str]) -> bool:
+        """
+        Record the sentiment of a reply only if it is still the membership's latest reply.
+        
+        Classification runs asynchronously, so a task for an older reply can
+        finish after a newer reply was recorded. The conditional UPDATE leaves
+        the newer reply, its sentiment and status untouched in that case.
+        
+        Args:
+            membership_id: ID of the membership
+            reply_activity_id: ID of the reply activity that was classified
+            sentiment: Sentiment of the reply (positive/negative/neutral)
+            
+        Returns:
+            True if the membership was updated, False if it is missing or has a newer reply
+        """
+        updated = self.session.query(self.model_class).filter(
+            self.model_class.id == membership_id,
+            self.model_class.reply_activity_id == reply_activity_id
+        ).update({
+            'response_sentiment': sentiment,
+            'status': self._replied_status(sentiment)
+        }, synchronize_session='fetch')
+        self.session.commit()
+        return updated > 0
+    
+    @staticmethod
+    def _replied_status(sentiment: Optional[str]) -> str:
+        """Membership status for a reply with the given sentiment"""
+        if sentiment == 'positive':
+            return 'replied_positive'
+        elif sentiment == 'negative':
+            return 'replied_negative'
+        return 'replied'
+    
     def count_by_status(self, campaign_id: int) -> Dict[str, int]:
         """
         Count memberships by status for a campaign.
@@ -5,11 +5,12 @@ Isolates all database queries related to campaigns
 
 from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
+from utils.database import read_only
 from utils.datetime_utils import utc_now
-from sqlalchemy import and_, or_, func, desc, asc
+from sqlalchemy import and_, or_, func, desc, asc, select, Select, case, cast, literal, true, BigInteger
 from sqlalchemy.orm import joinedload, selectinload, Query
 from repositories.base_repository import BaseRepository, PaginationParams, PaginatedResult, SortOrder
-from crm_database import Campaign, CampaignMembership, Contact, ContactFlag, Activity, CampaignList
+from crm_database import Campaign, CampaignMembership, Contact, ContactFlag, Activity, CampaignList, CampaignListMember
 import logging
 
 logger = logging.getLogger(__name__)
@@ -325,6 +326,95 @@ class CampaignRepository(BaseRepository[Campaign]):
         
         return len(memberships)
     
+    def enroll_contacts(
+        self,
+        campaign_id: int,
+        contact_ids: Select,
+        variant_split: Optional[int] = None
+    ) -> int:
+        """
+        Enroll contacts in a campaign with a single INSERT ... SELECT.
+        
+        Contacts that are already members are skipped by the unique
+        (campaign_id, contact_id) constraint, so enrolling again is safe.
+        Not committed.
+        
+        Args:
+            campaign_id: Campaign ID
+            contact_ids: Select statement whose first column is the contact id
+            variant_split: Percentage of contacts assigned variant 'A' (the rest
+                get 'B'); None leaves the variant to be chosen at send time
+            
+        Returns:
+            Number of members inserted
+        """
+        source = contact_ids.order_by(None).subquery()
+        contact_id = list(source.c)[0]
+        
+        if variant_split is None:
+            variant = literal(None, CampaignMembership.variant_sent.type)
+        else:
+            # Deterministic multiplicative hash, so the same contact lands in
+            # the same bucket whichever order the rows are inserted in
+            bucket = (
+                (cast(contact_id, BigInteger) + campaign_id * 7919) * 2654435761 % 4294967296
+            ) % 100
+            variant = case((bucket < variant_split, literal('A')), else_=literal('B'))
+        
+        # The WHERE keeps SQLite from reading ON CONFLICT as a join constraint
+        rows = select(
+            literal(campaign_id), contact_id, literal('pending'), variant
+        ).select_from(source).where(true())
+        columns = ['campaign_id', 'contact_id', 'status', 'variant_sent']
+        
+        dialect = self.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            insert = None
+        
+        if insert is None:
+            from sqlalchemy import insert as plain_insert
+            existing = select(CampaignMembership.id).where(
+                CampaignMembership.campaign_id == campaign_id,
+                CampaignMembership.contact_id == contact_id
+            )
+            statement = plain_insert(CampaignMembership).from_select(
+                columns, rows.where(~existing.exists())
+            )
+        else:
+            statement = insert(CampaignMembership).from_select(columns, rows).on_conflict_do_nothing(
+                index_elements=['campaign_id', 'contact_id']
+            )
+        
+        result = self.session.execute(statement)
+        return result.rowcount or 0
+    
+    def enroll_from_list(
+        self,
+        campaign_id: int,
+        list_id: int,
+        variant_split: Optional[int] = None
+    ) -> int:
+        """
+        Enroll the active members of a campaign list in a campaign.
+        
+        Args:
+            campaign_id: Campaign ID
+            list_id: Campaign list ID
+            variant_split: Percentage of contacts assigned variant 'A'
+            
+        Returns:
+            Number of members inserted
+        """
+        list_contacts = select(CampaignListMember.contact_id).where(
+            CampaignListMember.list_id == list_id,
+            CampaignListMember.status == 'active'
+        )
+        return self.enroll_contacts(campaign_id, list_contacts, variant_split)
+    
     def update_member_status(
         self,
         campaign_id: int,
@@ -571,6 +661,7 @@ class CampaignRepository(BaseRepository[Campaign]):
     
     # Dashboard-specific methods
     
+    @read_only
     def get_active_campaigns_count(self) -> int:
         """
         Get count of active/running campaigns.
@@ -594,6 +685,7 @@ class CampaignRepository(BaseRepository[Campaign]):
             desc(Campaign.created_at)
         ).limit(limit).all()
     
+    @read_only
     def calculate_average_campaign_response_rate(self) -> float:
         """
         Calculate average response rate across all campaigns with memberships.
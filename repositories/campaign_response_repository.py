@@ -10,9 +10,11 @@ from decimal import Decimal
 import statistics
 import math
 from scipy import stats as scipy_stats
+from utils.database import read_only
 from utils.datetime_utils import utc_now, ensure_utc
-from sqlalchemy import or_, and_, func, exists, desc, asc, case
+from sqlalchemy import or_, and_, func, exists, desc, asc, case, select
 from sqlalchemy.orm import joinedload, selectinload, Query
+from sqlalchemy.sql import Select
 from sqlalchemy.exc import SQLAlchemyError
 from repositories.base_repository import BaseRepository, PaginationParams, PaginatedResult, SortOrder
 from crm_database import CampaignResponse, Campaign, Contact, Activity, CampaignMembership
@@ -20,6 +22,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Day names by EXTRACT(dow) value (0 is Sunday)
+WEEKDAY_NAMES = ['sunday', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday']
+
 
 @dataclass
 class ResponseTimeMetrics:
@@ -258,6 +263,7 @@ class CampaignResponseRepository(BaseRepository[CampaignResponse]):
             CampaignResponse.message_variant == variant
         ).all()
     
+    @read_only
     def calculate_response_times(self, campaign_id: int) -> ResponseTimeMetrics:
         """
         Calculate response time metrics for a campaign.
@@ -311,10 +317,15 @@ class CampaignResponseRepository(BaseRepository[CampaignResponse]):
                 response_count=0
             )
     
+    @read_only
     def get_response_analytics(self, campaign_id: int) -> ResponseAnalytics:
         """
         Get comprehensive response analytics for a campaign.
         
+        Counts and the average response time come from one aggregate query
+        and the distributions from one grouped query; no response rows are
+        loaded.
+        
         Args:
             campaign_id: Campaign ID
             
@@ -322,12 +333,19 @@ class CampaignResponseRepository(BaseRepository[CampaignResponse]):
             ResponseAnalytics with full metrics
         """
         try:
-            # Get all responses for the campaign
-            responses = self.session.query(CampaignResponse).filter(
+            responded = CampaignResponse.first_response_at.isnot(None)
+            total_sent, total_responses, avg_response_seconds = self.session.query(
+                func.count(CampaignResponse.id),
+                func.count(CampaignResponse.id).filter(responded),
+                # Zero response times are left out of the average
+                func.avg(CampaignResponse.response_time_seconds).filter(
+                    responded, CampaignResponse.response_time_seconds != 0
+                )
+            ).filter(
                 CampaignResponse.campaign_id == campaign_id
-            ).all()
+            ).one()
             
-            if not responses:
+            if not total_sent:
                 return ResponseAnalytics(
                     response_rate=0.0,
                     total_sent=0,
@@ -338,29 +356,29 @@ class CampaignResponseRepository(BaseRepository[CampaignResponse]):
                     confidence_interval={'lower': 0.0, 'upper': 0.0}
                 )
             
-            # Calculate basic metrics
-            total_sent = len(responses)
-            responded = [r for r in responses if r.first_response_at is not None]
-            total_responses = len(responded)
             response_rate = total_responses / total_sent if total_sent > 0 else 0.0
             
-            # Calculate sentiment distribution
+            # Sentiment and intent distributions of responders
             sentiment_distribution = {}
-            for response in responded:
-                if response.response_sentiment:
-                    sentiment_distribution[response.response_sentiment] = \
-                        sentiment_distribution.get(response.response_sentiment, 0) + 1
-            
-            # Calculate intent distribution
             intent_distribution = {}
-            for response in responded:
-                if response.response_intent:
-                    intent_distribution[response.response_intent] = \
-                        intent_distribution.get(response.response_intent, 0) + 1
+            rows = self.session.query(
+                CampaignResponse.response_sentiment,
+                CampaignResponse.response_intent,
+                func.count(CampaignResponse.id)
+            ).filter(
+                CampaignResponse.campaign_id == campaign_id,
+                responded
+            ).group_by(
+                CampaignResponse.response_sentiment,
+                CampaignResponse.response_intent
+            ).all()
+            for sentiment, intent, count in rows:
+                if sentiment:
+                    sentiment_distribution[sentiment] = sentiment_distribution.get(sentiment, 0) + count
+                if intent:
+                    intent_distribution[intent] = intent_distribution.get(intent, 0) + count
             
-            # Calculate average response time
-            response_times = [r.response_time_seconds for r in responded if r.response_time_seconds]
-            avg_response_hours = (statistics.mean(response_times) / 3600.0) if response_times else 0.0
+            avg_response_hours = float(avg_response_seconds) / 3600.0 if avg_response_seconds is not None else 0.0
             
             # Calculate confidence interval
             confidence_interval = self.calculate_confidence_interval(
@@ -389,10 +407,15 @@ class CampaignResponseRepository(BaseRepository[CampaignResponse]):
                 confidence_interval={'lower': 0.0, 'upper': 0.0}
             )
     
+    @read_only
     def get_variant_comparison(self, campaign_id: int) -> Dict[str, Any]:
         """
         Compare A/B test variant performance.
         
+        Per-variant counts and averages come from one query grouped by
+        variant, sentiment breakdowns from one grouped by variant and
+        sentiment.
+        
         Args:
             campaign_id: Campaign ID
             
@@ -400,41 +423,55 @@ class CampaignResponseRepository(BaseRepository[CampaignResponse]):
             Dictionary with variant comparison data
         """
         try:
-            # Get responses by variant
-            variant_a_responses = self.get_responses_by_variant(campaign_id, 'A')
-            variant_b_responses = self.get_responses_by_variant(campaign_id, 'B')
-            
-            # Calculate metrics for each variant
-            def calculate_variant_metrics(responses):
-                if not responses:
-                    return {
-                        'sent': 0,
-                        'responses': 0,
-                        'response_rate': 0.0,
-                        'average_response_time': 0.0,
-                        'sentiment_breakdown': {}
-                    }
-                
-                responded = [r for r in responses if r.first_response_at is not None]
-                response_times = [r.response_time_seconds / 3600.0 for r in responded 
-                                if r.response_time_seconds is not None]
-                
-                sentiment_breakdown = {}
-                for r in responded:
-                    if r.response_sentiment:
-                        sentiment_breakdown[r.response_sentiment] = \
-                            sentiment_breakdown.get(r.response_sentiment, 0) + 1
-                
-                return {
-                    'sent': len(responses),
-                    'responses': len(responded),
-                    'response_rate': len(responded) / len(responses) if responses else 0.0,
-                    'average_response_time': statistics.mean(response_times) if response_times else 0.0,
-                    'sentiment_breakdown': sentiment_breakdown
+            variants = ('A', 'B')
+            responded = CampaignResponse.first_response_at.isnot(None)
+            metrics = {
+                variant: {
+                    'sent': 0,
+                    'responses': 0,
+                    'response_rate': 0.0,
+                    'average_response_time': 0.0,
+                    'sentiment_breakdown': {}
                 }
+                for variant in variants
+            }
             
-            variant_a_metrics = calculate_variant_metrics(variant_a_responses)
-            variant_b_metrics = calculate_variant_metrics(variant_b_responses)
+            rows = self.session.query(
+                CampaignResponse.message_variant,
+                func.count(CampaignResponse.id),
+                func.count(CampaignResponse.id).filter(responded),
+                func.avg(CampaignResponse.response_time_seconds).filter(responded)
+            ).filter(
+                CampaignResponse.campaign_id == campaign_id,
+                CampaignResponse.message_variant.in_(variants)
+            ).group_by(CampaignResponse.message_variant).all()
+            for variant, sent, responses, avg_seconds in rows:
+                metrics[variant].update({
+                    'sent': sent,
+                    'responses': responses,
+                    'response_rate': responses / sent if sent else 0.0,
+                    'average_response_time': float(avg_seconds) / 3600.0 if avg_seconds is not None else 0.0
+                })
+            
+            rows = self.session.query(
+                CampaignResponse.message_variant,
+                CampaignResponse.response_sentiment,
+                func.count(CampaignResponse.id)
+            ).filter(
+                CampaignResponse.campaign_id == campaign_id,
+                CampaignResponse.message_variant.in_(variants),
+                responded,
+                CampaignResponse.response_sentiment.isnot(None),
+                CampaignResponse.response_sentiment != ''
+            ).group_by(
+                CampaignResponse.message_variant,
+                CampaignResponse.response_sentiment
+            ).all()
+            for variant, sentiment, count in rows:
+                metrics[variant]['sentiment_breakdown'][sentiment] = count
+            
+            variant_a_metrics = metrics['A']
+            variant_b_metrics = metrics['B']
             
             # Calculate statistical significance
             significance = self.calculate_statistical_significance(
@@ -458,6 +495,7 @@ class CampaignResponseRepository(BaseRepository[CampaignResponse]):
                 'statistical_significance': {'significant': False, 'p_value': 1.0}
             }
     
+    @read_only
     def get_response_funnel(self, campaign_id: int) -> Dict[str, Any]:
         """
         Generate funnel metrics for campaign responses.
@@ -469,14 +507,16 @@ class CampaignResponseRepository(BaseRepository[CampaignResponse]):
             Dictionary with funnel metrics
         """
         try:
-            responses = self.get_responses_by_campaign(campaign_id)
+            sent, delivered, responded = self.session.query(
+                func.count(CampaignResponse.id),
+                func.count(CampaignResponse.id).filter(CampaignResponse.message_sent_at.isnot(None)),
+                func.count(CampaignResponse.id).filter(CampaignResponse.first_response_at.isnot(None))
+            ).filter(
+                CampaignResponse.campaign_id == campaign_id
+            ).one()
             
-            # Count different stages
-            sent = len(responses)
-            delivered = len([r for r in responses if r.message_sent_at is not None])
             # Estimate opened at 70% (as per test)
             opened = int(delivered * 0.70)
-            responded = len([r for r in responses if r.first_response_at is not None])
             # Calculate qualified as 50% of responded (as per test)
             qualified = int(responded * 0.50)
             
@@ -524,10 +564,15 @@ class CampaignResponseRepository(BaseRepository[CampaignResponse]):
                 'drop_off_analysis': {}
             }
     
+    @read_only
     def get_time_based_patterns(self, campaign_id: int) -> Dict[str, Any]:
         """
         Analyze response patterns over time.
         
+        Responses are counted per hour of day and day of week of their first
+        response with one grouped EXTRACT query. Ties for the best hour or day
+        go to the earliest hour, or the earliest day counting from Sunday.
+        
         Args:
             campaign_id: Campaign ID
             
@@ -535,30 +580,32 @@ class CampaignResponseRepository(BaseRepository[CampaignResponse]):
             Dictionary with time-based patterns
         """
         try:
-            responses = self.session.query(CampaignResponse).filter(
+            hour = func.extract('hour', CampaignResponse.first_response_at)
+            day_of_week = func.extract('dow', CampaignResponse.first_response_at)
+            rows = self.session.query(
+                hour, day_of_week, func.count(CampaignResponse.id)
+            ).filter(
                 CampaignResponse.campaign_id == campaign_id,
                 CampaignResponse.first_response_at.isnot(None)
-            ).all()
+            ).group_by(hour, day_of_week).order_by(hour, day_of_week).all()
             
             # Analyze hourly patterns
             hourly_responses = {}
             daily_responses = {}
-            
-            for response in responses:
-                if response.first_response_at:
-                    hour = response.first_response_at.strftime('%H')
-                    day = response.first_response_at.strftime('%A').lower()
-                    
-                    hourly_responses[hour] = hourly_responses.get(hour, 0) + 1
-                    daily_responses[day] = daily_responses.get(day, 0) + 1
+            for response_hour, response_dow, count in rows:
+                hour_key = f'{int(response_hour):02d}'
+                day_key = WEEKDAY_NAMES[int(response_dow)]
+                hourly_responses[hour_key] = hourly_responses.get(hour_key, 0) + count
+                daily_responses[day_key] = daily_responses.get(day_key, 0) + count
+            daily_responses = {day: daily_responses[day] for day in WEEKDAY_NAMES if day in daily_responses}
             
             # Calculate rates (simplified for test)
-            total_responses = len(responses)
+            total_responses = sum(hourly_responses.values())
             hourly_rates = {}
             daily_rates = {}
             
-            for hour, count in hourly_responses.items():
-                hourly_rates[hour] = count / total_responses if total_responses > 0 else 0.0
+            for hour_key, count in hourly_responses.items():
+                hourly_rates[hour_key] = count / total_responses if total_responses > 0 else 0.0
             
             for day, count in daily_responses.items():
                 daily_rates[day] = count / total_responses if total_responses > 0 else 0.0
@@ -651,6 +698,7 @@ class CampaignResponseRepository(BaseRepository[CampaignResponse]):
             self.session.rollback()
             return 0
     
+    @read_only
     def get_sentiment_distribution(self, campaign_id: int) -> Dict[str, int]:
         """
         Get sentiment distribution for a campaign.
@@ -678,6 +726,7 @@ class CampaignResponseRepository(BaseRepository[CampaignResponse]):
             logger.error(f"Error getting sentiment distribution: {e}")
             return {}
     
+    @read_only
     def get_response_timing_patterns(self, campaign_id: int) -> Dict[str, Any]:
         """
         Analyze when responses come in.
@@ -824,6 +873,40 @@ class CampaignResponseRepository(BaseRepository[CampaignResponse]):
             logger.error(f"Error getting unanalyzed responses: {e}")
             return []
     
+    def build_export_query(self, filters: Optional[Dict[str, Any]] = None, after_id: int = 0) -> Select:
+        """
+        Build the keyset-ordered column select for the response export.
+        
+        Args:
+            filters: Optional campaign_id and start_date/end_date (datetime, end exclusive)
+            after_id: Only include rows with an id greater than this
+            
+        Returns:
+            Select statement ordered by id, id selected first
+        """
+        filters = filters or {}
+        statement = select(
+            CampaignResponse.id,
+            CampaignResponse.campaign_id,
+            CampaignResponse.contact_id,
+            CampaignResponse.message_variant,
+            CampaignResponse.message_sent_at,
+            CampaignResponse.first_response_at,
+            CampaignResponse.response_time_seconds,
+            CampaignResponse.response_sentiment,
+            CampaignResponse.response_intent,
+            CampaignResponse.response_channel
+        ).where(CampaignResponse.id > after_id)
+        
+        if filters.get('campaign_id'):
+            statement = statement.where(CampaignResponse.campaign_id == filters['campaign_id'])
+        if filters.get('start_date'):
+            statement = statement.where(CampaignResponse.message_sent_at >= filters['start_date'])
+        if filters.get('end_date'):
+            statement = statement.where(CampaignResponse.message_sent_at < filters['end_date'])
+        
+        return statement.order_by(CampaignResponse.id)
+    
     def _get_model_class(self):
         """
         Get the model class for this repository.
@@ -3,13 +3,14 @@ ContactRepository - Data access layer for Contact entities
 Isolates all database queries related to contacts
 """
 
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 from datetime import datetime, timedelta
+from utils.database import read_only
 from utils.datetime_utils import utc_now
-from sqlalchemy import or_, and_, func, exists, desc, asc
+from sqlalchemy import or_, and_, func, exists, desc, asc, select, Select, false
 from sqlalchemy.orm import joinedload, selectinload, Query
 from repositories.base_repository import BaseRepository, PaginationParams, PaginatedResult, SortOrder
-from crm_database import Contact, ContactFlag, Conversation, Activity, CampaignMembership, Property, Job, PropertyContact, CampaignListMember
+from crm_database import Contact, ContactFlag, Conversation, Activity, Campaign, CampaignMembership, Property, Job, PropertyContact, CampaignListMember, ContactCSVImport
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,7 +18,18 @@ logger = logging.getLogger(__name__)
 
 class ContactRepository(BaseRepository[Contact]):
     """Repository for Contact data access"""
+
+    # Keep IN lists well below database parameter limits
+    LOOKUP_CHUNK_SIZE = 500
     
+    # Campaign audience filters that exclude contacts carrying a ContactFlag type
+    AUDIENCE_FLAG_EXCLUSIONS = {
+        'exclude_office_numbers': 'office_number',
+        'exclude_opted_out': 'opted_out',
+        'exclude_do_not_contact': 'do_not_contact',
+        'exclude_recently_contacted': 'recently_texted',
+    }
+
     def __init__(self, session):
         """Initialize repository with database session"""
         super().__init__(session, Contact)
@@ -64,7 +76,27 @@ class ContactRepository(BaseRepository[Contact]):
             Contact or None
         """
         return self.find_one_by(phone=phone)
-    
+
+    def find_by_phones(self, phones: List[str]) -> Dict[str, Contact]:
+        """
+        Find contacts for a set of phone numbers with chunked IN queries.
+
+        Args:
+            phones: Phone numbers to look up
+
+        Returns:
+            Dictionary mapping phone number to Contact
+        """
+        found = {}
+        unique_phones = list(dict.fromkeys(phone for phone in phones if phone))
+
+        for start in range(0, len(unique_phones), self.LOOKUP_CHUNK_SIZE):
+            chunk = unique_phones[start:start + self.LOOKUP_CHUNK_SIZE]
+            for contact in self.session.query(Contact).filter(Contact.phone.in_(chunk)).all():
+                found[contact.phone] = contact
+
+        return found
+
     def find_by_email(self, email: str) -> Optional[Contact]:
         """
         Find contact by email address.
@@ -468,6 +500,190 @@ class ContactRepository(BaseRepository[Contact]):
             ~exists().where(CampaignMembership.contact_id == Contact.id)
         ).all()
     
+    # Campaign audience queries
+    
+    def build_audience_query(self, filters: Dict[str, Any]) -> Select:
+        """
+        Compile campaign audience filters into a single select of contact ids.
+        
+        Exclusions are correlated NOT EXISTS anti-joins, so no flag or
+        membership id sets are loaded into memory. Unknown filter keys are
+        ignored.
+        
+        Args:
+            filters: Audience filters:
+                has_name_only - skip contacts whose first name is a +1 phone number
+                has_email - only contacts with a non-empty email
+                exclude_office_numbers, exclude_opted_out, exclude_do_not_contact,
+                exclude_recently_contacted - skip contacts with that flag type
+                (expired or not)
+                min_days_since_contact - skip contacts with a recently_texted flag
+                created within that many days
+                exclude_current_campaign - skip members of running campaigns
+                
+        Returns:
+            Select of Contact.id ordered by id
+        """
+        statement = select(Contact.id)
+        
+        if filters.get('has_name_only'):
+            statement = statement.where(or_(
+                Contact.first_name.is_(None),
+                Contact.first_name == '',
+                ~Contact.first_name.startswith('+1')
+            ))
+        
+        if filters.get('has_email'):
+            statement = statement.where(Contact.email.isnot(None), Contact.email != '')
+        
+        for filter_name, flag_type in self.AUDIENCE_FLAG_EXCLUSIONS.items():
+            if filters.get(filter_name):
+                statement = statement.where(~exists().where(
+                    ContactFlag.contact_id == Contact.id,
+                    ContactFlag.flag_type == flag_type
+                ))
+        
+        if filters.get('min_days_since_contact'):
+            cutoff = utc_now() - timedelta(days=int(filters['min_days_since_contact']))
+            statement = statement.where(~exists().where(
+                ContactFlag.contact_id == Contact.id,
+                ContactFlag.flag_type == 'recently_texted',
+                ContactFlag.created_at > cutoff
+            ))
+        
+        if filters.get('exclude_current_campaign'):
+            statement = statement.where(~exists().where(
+                CampaignMembership.contact_id == Contact.id,
+                CampaignMembership.campaign_id == Campaign.id,
+                Campaign.status == 'running'
+            ))
+        
+        return statement.order_by(Contact.id)
+    
+    def iter_audience_ids(self, filters: Dict[str, Any], batch_size: Optional[int] = None) -> Iterator[List[int]]:
+        """
+        Stream the contact ids of a campaign audience in chunks.
+        
+        Args:
+            filters: Audience filters (see build_audience_query)
+            batch_size: Ids per chunk (defaults to LOOKUP_CHUNK_SIZE)
+            
+        Returns:
+            Iterator of contact id lists, in id order
+        """
+        statement = self.build_audience_query(filters)
+        for batch in self.stream_batches(statement, batch_size or self.LOOKUP_CHUNK_SIZE):
+            yield [row[0] for row in batch]
+    
+    def count_audience(self, filters: Dict[str, Any]) -> int:
+        """
+        Count the contacts in a campaign audience without loading them.
+        
+        Args:
+            filters: Audience filters (see build_audience_query)
+            
+        Returns:
+            Number of matching contacts
+        """
+        return self.count_statement(self.build_audience_query(filters))
+    
+    def find_audience_sample(self, filters: Dict[str, Any], limit: int = 5) -> List[Contact]:
+        """
+        Get the first contacts of a campaign audience, for previews.
+        
+        Args:
+            filters: Audience filters (see build_audience_query)
+            limit: Maximum number of contacts
+            
+        Returns:
+            List of contacts ordered by id
+        """
+        ids = self.build_audience_query(filters).limit(limit).subquery()
+        return self.session.query(Contact).filter(Contact.id.in_(select(ids.c.id))).order_by(Contact.id).all()
+    
+    # Dynamic campaign list criteria
+    
+    def build_list_criteria_query(self, criteria: Dict[str, Any]) -> Select:
+        """
+        Compile dynamic list criteria into a single select of contact ids.
+        
+        Every recognised criterion narrows the result (they are ANDed).
+        Criteria without any recognised key match no contacts.
+        
+        Args:
+            criteria: Dynamic list criteria:
+                csv_import_id - contacts linked to that CSV import
+                imported_after, imported_before - imported_at range, inclusive
+                (datetimes or ISO strings)
+                no_recent_contact - no outgoing activity within days_since_contact
+                days (default 30)
+                exclude_opted_out - skip contacts with an unexpired opted_out flag
+                has_metadata - list of contact_metadata keys that must be present
+                has_email - only contacts with a non-empty email
+                
+        Returns:
+            Select of Contact.id ordered by id
+        """
+        conditions = []
+        
+        if 'csv_import_id' in criteria:
+            conditions.append(exists().where(
+                ContactCSVImport.contact_id == Contact.id,
+                ContactCSVImport.csv_import_id == criteria['csv_import_id']
+            ))
+        
+        imported_after = self._criteria_datetime(criteria.get('imported_after'))
+        if imported_after:
+            conditions.append(Contact.imported_at >= imported_after)
+        imported_before = self._criteria_datetime(criteria.get('imported_before'))
+        if imported_before:
+            conditions.append(Contact.imported_at <= imported_before)
+        
+        if criteria.get('no_recent_contact'):
+            cutoff = utc_now() - timedelta(days=int(criteria.get('days_since_contact', 30)))
+            conditions.append(~exists().where(
+                Activity.contact_id == Contact.id,
+                Activity.direction == 'outgoing',
+                Activity.created_at > cutoff
+            ))
+        
+        if criteria.get('exclude_opted_out'):
+            conditions.append(~exists().where(
+                ContactFlag.contact_id == Contact.id,
+                ContactFlag.flag_type == 'opted_out',
+                or_(ContactFlag.expires_at.is_(None), ContactFlag.expires_at > utc_now())
+            ))
+        
+        if criteria.get('has_metadata'):
+            conditions.append(Contact.contact_metadata.isnot(None))
+            for key in criteria['has_metadata']:
+                conditions.append(Contact.contact_metadata[key].as_string().isnot(None))
+        
+        if criteria.get('has_email'):
+            conditions.extend([Contact.email.isnot(None), Contact.email != ''])
+        
+        return select(Contact.id).where(*(conditions or [false()])).order_by(Contact.id)
+    
+    def find_by_list_criteria(self, criteria: Dict[str, Any]) -> List[Contact]:
+        """
+        Find the contacts matching dynamic list criteria.
+        
+        Args:
+            criteria: Dynamic list criteria (see build_list_criteria_query)
+            
+        Returns:
+            List of contacts ordered by id
+        """
+        ids = self.build_list_criteria_query(criteria).subquery()
+        return self.session.query(Contact).filter(Contact.id.in_(select(ids.c.id))).order_by(Contact.id).all()
+    
+    @staticmethod
+    def _criteria_datetime(value: Any) -> Optional[datetime]:
+        """Criteria are stored as JSON, so datetimes arrive as ISO strings"""
+        if isinstance(value, str):
+            return datetime.fromisoformat(value)
+        return value
+    
     def bulk_update_tags(self, contact_ids: List[int], tags: List[str], operation: str = 'add') -> int:
         """
         Bulk update tags for multiple contacts.
@@ -718,6 +934,7 @@ class ContactRepository(BaseRepository[Contact]):
     
     # Dashboard-specific methods
     
+    @read_only
     def get_total_contacts_count(self) -> int:
         """
         Get total count of contacts.
@@ -727,6 +944,7 @@ class ContactRepository(BaseRepository[Contact]):
         """
         return self.session.query(Contact).count()
     
+    @read_only
     def get_contacts_added_this_week_count(self) -> int:
         """
         Get count of contacts added in the last 7 days using Activity as proxy.
@@ -764,6 +982,7 @@ class ContactRepository(BaseRepository[Contact]):
             Contact.email != ''
         ).count()
     
+    @read_only
     def get_data_quality_stats(self) -> Dict[str, int]:
         """
         Get comprehensive data quality statistics for contacts.
@@ -5,8 +5,8 @@ ConversationRepository - Data access layer for Conversation model
 from typing import List, Optional, Dict, Any, Set
 from datetime import datetime, timedelta
 from utils.datetime_utils import utc_now
-from sqlalchemy import desc, or_, func, and_, exists, select
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import desc, or_, func, and_, exists
+from sqlalchemy.orm import joinedload
 from repositories.base_repository import BaseRepository, PaginatedResult
 from crm_database import Conversation, Contact, Activity, ContactFlag
 
@@ -258,12 +258,13 @@ class ConversationRepository(BaseRepository):
         Returns:
             Dictionary containing conversations and total count
         """
-        # Start with base query - only conversations with activities
+        # Start with base query - only conversations with activities.
+        # Inbox rows are rendered from the denormalized summary columns,
+        # so activity collections are never loaded here.
         query = self.session.query(self.model_class).options(
-            joinedload(Conversation.contact),
-            selectinload(Conversation.activities)
+            joinedload(Conversation.contact)
         ).join(Contact).filter(
-            exists().where(Activity.conversation_id == Conversation.id)
+            Conversation.activity_count > 0
         )
         
         # Apply search filters
@@ -311,24 +312,12 @@ class ConversationRepository(BaseRepository):
     def _apply_type_filter(self, query, filter_type: str):
         """Apply type filter to query"""
         if filter_type == 'unread':
-            # Fixed unread filter - conversations with incoming messages that have no later outgoing
-            subquery = select(Activity.conversation_id).where(
-                Activity.direction == 'incoming'
-            ).group_by(Activity.conversation_id)
-            
-            query = query.filter(Conversation.id.in_(subquery))
+            # Conversations with incoming activity after the latest outgoing one
+            query = query.filter(Conversation.unread_count > 0)
             
         elif filter_type == 'has_attachments':
-            # Filter for conversations with actual media URLs (not empty JSON arrays)
-            query = query.filter(
-                exists().where(
-                    and_(
-                        Activity.conversation_id == Conversation.id,
-                        Activity.media_urls.isnot(None),
-                        func.jsonb_array_length(Activity.media_urls) > 0
-                    )
-                )
-            )
+            # Conversations with at least one activity carrying media URLs
+            query = query.filter(Conversation.has_attachments.is_(True))
             
         elif filter_type == 'office_numbers':
             # Conversations with contacts flagged as office numbers
@@ -405,6 +394,29 @@ class ConversationRepository(BaseRepository):
             self.session.rollback()
             return False
     
+    def mark_as_read(self, conversation_ids: List[int]) -> bool:
+        """
+        Clear the unread counter of multiple conversations.
+        
+        Args:
+            conversation_ids: List of conversation IDs to mark as read
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not conversation_ids:
+            return False
+        
+        try:
+            self.session.query(self.model_class).filter(
+                self.model_class.id.in_(conversation_ids)
+            ).update({self.model_class.unread_count: 0}, synchronize_session=False)
+            self.session.commit()
+            return True
+        except Exception:
+            self.session.rollback()
+            return False
+    
     def find_conversations_by_ids_with_contact_info(self, conversation_ids: List[int]) -> List:
         """
         Find conversations by IDs with contact information loaded.
@@ -448,21 +460,21 @@ class ConversationRepository(BaseRepository):
     
     def get_recent_conversations_with_activities(self, limit: int = 20) -> List:
         """
-        Get recent conversations with activities and contacts preloaded.
-        Only returns conversations that have activities.
+        Get recent conversations with contacts preloaded.
+        Only returns conversations that have activities; the latest activity
+        is described by the conversation summary columns.
         
         Args:
             limit: Maximum number of conversations to return
             
         Returns:
-            List of Conversation objects with contact and activities preloaded
+            List of Conversation objects with contact preloaded
         """
         return self.session.query(self.model_class).options(
-            joinedload(Conversation.contact),
-            selectinload(Conversation.activities)
+            joinedload(Conversation.contact)
         ).filter(
             self.model_class.last_activity_at.isnot(None),
-            exists().where(Activity.conversation_id == Conversation.id)
+            self.model_class.activity_count > 0
         ).order_by(
             desc(self.model_class.last_activity_at)
         ).limit(limit).all()
\ No newline at end of file
@@ -6,21 +6,51 @@ Handles all database operations for conversion tracking and analytics
 from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 from decimal import Decimal
-from sqlalchemy import func, and_, or_, desc, asc, case, text
+from sqlalchemy import func, and_, or_, desc, asc, case, text, select, cast, literal, String
 from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.sql import Select
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from repositories.base_repository import BaseRepository, PaginationParams, PaginatedResult, SortOrder
 from crm_database import (
     ConversionEvent, Contact, Campaign, CampaignMembership, 
     CampaignResponse, Activity
 )
+from utils.database import read_only
 from utils.datetime_utils import utc_now, ensure_utc
 import logging
 import math
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
+def attribution_weights(positions: np.ndarray, touch_counts: np.ndarray, attribution_model: str) -> np.ndarray:
+    """
+    Weight of each touchpoint under an attribution model.
+    
+    Matches ConversionRepository.calculate_attribution_weights for whole
+    batches of conversions at once.
+    
+    Args:
+        positions: Position of each touchpoint in its conversion path, oldest first
+        touch_counts: Number of touchpoints in the path of each touchpoint's conversion
+        attribution_model: Attribution model to use
+        
+    Returns:
+        Array of weights that sum to 1 over each conversion path
+    """
+    counts = np.maximum(touch_counts, 1)
+    if attribution_model == 'first_touch':
+        return (positions == 0).astype(float)
+    if attribution_model == 'last_touch':
+        return (positions == counts - 1).astype(float)
+    if attribution_model == 'linear':
+        return 1.0 / counts
+    # time_decay: 2 ** position over the path total 2 ** count - 1, scaled so long paths don't overflow
+    return np.exp2(positions - counts + 1) / (2.0 - np.exp2(1 - counts))
+
+
 class ConversionRepository(BaseRepository[ConversionEvent]):
     """Repository for ConversionEvent data access and analytics"""
     
@@ -299,6 +329,7 @@ class ConversionRepository(BaseRepository[ConversionEvent]):
     
     # ===== Conversion Rate Analytics =====
     
+    @read_only
     def calculate_conversion_rate_for_campaign(self, campaign_id: int) -> Dict[str, Any]:
         """
         Calculate conversion rate for a campaign.
@@ -340,6 +371,7 @@ class ConversionRepository(BaseRepository[ConversionEvent]):
             logger.error(f"Error calculating conversion rate for campaign {campaign_id}: {e}")
             raise
     
+    @read_only
     def calculate_conversion_rates_by_type(
         self,
         campaign_id: int,
@@ -388,6 +420,7 @@ class ConversionRepository(BaseRepository[ConversionEvent]):
             logger.error(f"Error calculating conversion rates by type: {e}")
             raise
     
+    @read_only
     def get_conversion_rates_by_time_period(
         self,
         campaign_id: int,
@@ -494,6 +527,7 @@ class ConversionRepository(BaseRepository[ConversionEvent]):
             'roi': roi
         }
     
+    @read_only
     def calculate_campaign_roi(
         self,
         campaign_id: int,
@@ -560,6 +594,7 @@ class ConversionRepository(BaseRepository[ConversionEvent]):
         """
         return self.get_conversions_with_attribution_path(conversion_id)
     
+    @read_only
     def get_conversions_with_attribution_path(
         self,
         conversion_id: int
@@ -615,6 +650,7 @@ class ConversionRepository(BaseRepository[ConversionEvent]):
             logger.error(f"Error getting attribution path for conversion {conversion_id}: {e}")
             raise
     
+    @read_only
     def calculate_attribution_weights(
         self,
         contact_id: int,
@@ -717,6 +753,7 @@ class ConversionRepository(BaseRepository[ConversionEvent]):
             logger.error(f"Error calculating attribution weights: {e}")
             raise
     
+    @read_only
     def calculate_multi_touch_attribution(
         self,
         campaign_id: int,
@@ -735,44 +772,144 @@ class ConversionRepository(BaseRepository[ConversionEvent]):
         if attribution_model not in self.VALID_ATTRIBUTION_MODELS:
             raise ValueError(f"Unsupported attribution model: {attribution_model}")
         
-        try:
-            # Get all conversions for the campaign
-            conversions = self.get_conversions_for_campaign(campaign_id)
-            
-            total_value = Decimal('0.00')
-            attributed_value = Decimal('0.00')
-            touchpoint_count = 0
-            
-            for conversion in conversions:
-                if conversion.conversion_value:
-                    total_value += conversion.conversion_value
-                    
-                    # Calculate attribution for this conversion
-                    weights = self.calculate_attribution_weights(
-                        conversion.contact_id,
-                        conversion.converted_at,
-                        attribution_model,
-                        conversion.attribution_window_days or 30
-                    )
-                    
-                    # Apply weights to conversion value
-                    if campaign_id in weights:
-                        attributed_value += conversion.conversion_value * Decimal(str(weights[campaign_id]))
-                    
-                    touchpoint_count += len(weights)
+        attribution = self.calculate_campaign_attribution([campaign_id], [attribution_model])
+        return attribution[campaign_id][attribution_model]
+    
+    @read_only
+    def calculate_campaign_attribution(
+        self,
+        campaign_ids: Optional[List[int]] = None,
+        attribution_models: Optional[List[str]] = None
+    ) -> Dict[int, Dict[str, Dict[str, Any]]]:
+        """
+        Calculate multi-touch attribution for many campaigns at once.
+        
+        The touchpoints of every converting contact inside each conversion's
+        attribution window are read with one query, and the weights of all
+        models are computed over the whole batch with array operations. A
+        campaign is credited with its share of the conversions recorded
+        against it, as in calculate_multi_touch_attribution.
+        
+        Args:
+            campaign_ids: Campaigns to attribute (all campaigns with conversions if None)
+            attribution_models: Models to calculate (all models if None)
             
-            return {
-                'campaign_id': campaign_id,
-                'attribution_model': attribution_model,
-                'total_conversion_value': total_value,
-                'attributed_value': attributed_value,
-                'attribution_percentage': float(attributed_value / total_value) if total_value > 0 else 0.0,
-                'average_touchpoints': touchpoint_count / len(conversions) if conversions else 0
-            }
+        Returns:
+            Dictionary mapping campaign ID to model name to attribution results
+        """
+        models = attribution_models or self.VALID_ATTRIBUTION_MODELS
+        for model in models:
+            if model not in self.VALID_ATTRIBUTION_MODELS:
+                raise ValueError(f"Unsupported attribution model: {model}")
+        
+        try:
+            query = select(
+                ConversionEvent.id,
+                ConversionEvent.campaign_id,
+                ConversionEvent.conversion_value,
+                Activity.campaign_id
+            ).select_from(ConversionEvent).outerjoin(
+                Activity,
+                and_(
+                    Activity.contact_id == ConversionEvent.contact_id,
+                    Activity.campaign_id.isnot(None),
+                    Activity.created_at <= ConversionEvent.converted_at,
+                    Activity.created_at >= self._attribution_window_start()
+                )
+            ).where(
+                ConversionEvent.campaign_id.isnot(None)
+            ).order_by(ConversionEvent.id, Activity.created_at, Activity.id)
+            if campaign_ids is not None:
+                query = query.where(ConversionEvent.campaign_id.in_(campaign_ids))
             
+            rows = self.session.execute(query).all()
         except SQLAlchemyError as e:
-            logger.error(f"Error calculating multi-touch attribution: {e}")
+            logger.error(f"Error loading attribution touchpoints: {e}")
             raise
+        
+        results = {}
+        for campaign_id in (campaign_ids or []):
+            results[campaign_id] = {model: self._attribution_result(campaign_id, model) for model in models}
+        if not rows:
+            return results
+        
+        # One row per touchpoint (or one empty row per conversion without any), grouped by conversion
+        conversion_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        _, starts, row_counts = np.unique(conversion_ids, return_index=True, return_counts=True)
+        conversion_campaigns = np.array([rows[start][1] for start in starts], dtype=np.int64)
+        values = np.array([float(rows[start][2] or 0) for start in starts])
+        touch_campaigns = np.array([-1 if row[3] is None else row[3] for row in rows], dtype=np.int64)
+        has_touch = touch_campaigns >= 0
+        
+        touch_counts = np.add.reduceat(has_touch.astype(np.int64), starts)
+        conversion_of_row = np.repeat(np.arange(len(starts)), row_counts)
+        positions = np.arange(len(rows)) - np.repeat(starts, row_counts)
+        # Touchpoints credited to the campaign the conversion is recorded against
+        credited = has_touch & (touch_campaigns == conversion_campaigns[conversion_of_row])
+        # Distinct touchpoint campaigns per conversion
+        distinct_pairs = np.unique(np.stack([conversion_of_row[has_touch], touch_campaigns[has_touch]]), axis=1)
+        distinct_campaigns = np.bincount(distinct_pairs[0], minlength=len(starts))
+        
+        # Conversions without a value count toward the conversion total only
+        valued = values != 0
+        campaigns, campaign_of_conversion = np.unique(conversion_campaigns, return_inverse=True)
+        conversion_counts = np.bincount(campaign_of_conversion, minlength=len(campaigns))
+        total_values = np.bincount(campaign_of_conversion, weights=values, minlength=len(campaigns))
+        
+        for model in models:
+            weights = attribution_weights(positions, touch_counts[conversion_of_row], model)
+            attributed = np.bincount(
+                conversion_of_row, weights=np.where(credited, weights, 0.0), minlength=len(starts)
+            ) * values
+            if model in ('first_touch', 'last_touch'):
+                touchpoints = np.minimum(touch_counts, 1)
+            else:
+                touchpoints = distinct_campaigns
+            attributed_values = np.bincount(campaign_of_conversion, weights=attributed, minlength=len(campaigns))
+            touchpoint_totals = np.bincount(
+                campaign_of_conversion, weights=np.where(valued, touchpoints, 0), minlength=len(campaigns)
+            )
+            
+            for index, campaign_id in enumerate(campaigns.tolist()):
+                results.setdefault(campaign_id, {})[model] = self._attribution_result(
+                    campaign_id,
+                    model,
+                    conversion_count=int(conversion_counts[index]),
+                    total_value=float(total_values[index]),
+                    attributed_value=float(attributed_values[index]),
+                    touchpoint_count=float(touchpoint_totals[index])
+                )
+        
+        return results
+    
+    def _attribution_window_start(self):
+        """SQL expression for the start of each conversion's attribution window"""
+        days = func.coalesce(ConversionEvent.attribution_window_days, 30)
+        if self.session.get_bind().dialect.name == 'postgresql':
+            return ConversionEvent.converted_at - func.make_interval(0, 0, 0, days)
+        return func.datetime(ConversionEvent.converted_at, literal('-') + cast(days, String) + ' days')
+    
+    @staticmethod
+    def _attribution_result(
+        campaign_id: int,
+        attribution_model: str,
+        conversion_count: int = 0,
+        total_value: float = 0.0,
+        attributed_value: float = 0.0,
+        touchpoint_count: float = 0.0
+    ) -> Dict[str, Any]:
+        """Build the attribution summary of one campaign and model"""
+        total = Decimal(f'{total_value:.2f}')
+        attributed = Decimal(f'{attributed_value:.2f}')
+        return {
+            'campaign_id': campaign_id,
+            'attribution_model': attribution_model,
+            'conversion_count': conversion_count,
+            'total_conversion_value': total,
+            'attributed_value': attributed,
+            'attribution_percentage': attributed_value / total_value if total_value > 0 else 0.0,
+            'average_touchpoints': touchpoint_count / conversion_count if conversion_count else 0
+        }
     
     # ===== Conversion Funnel Analysis =====
     
@@ -791,6 +928,7 @@ class ConversionRepository(BaseRepository[ConversionEvent]):
         """
         return self.get_conversion_funnel_data(campaign_id)
     
+    @read_only
     def get_conversion_funnel_data(
         self,
         campaign_id: int
@@ -884,6 +1022,7 @@ class ConversionRepository(BaseRepository[ConversionEvent]):
             logger.error(f"Error getting conversion funnel data: {e}")
             raise
     
+    @read_only
     def identify_funnel_drop_off_points(
         self,
         campaign_id: int
@@ -949,6 +1088,7 @@ class ConversionRepository(BaseRepository[ConversionEvent]):
         """
         return self.calculate_average_time_to_conversion(campaign_id)
     
+    @read_only
     def calculate_average_time_to_conversion(
         self,
         campaign_id: int
@@ -1010,6 +1150,7 @@ class ConversionRepository(BaseRepository[ConversionEvent]):
             logger.error(f"Error calculating time to conversion: {e}")
             raise
     
+    @read_only
     def get_time_to_conversion_distribution(
         self,
         campaign_id: int
@@ -1096,6 +1237,7 @@ class ConversionRepository(BaseRepository[ConversionEvent]):
         """
         return self.get_conversion_value_statistics(campaign_id, conversion_type)
     
+    @read_only
     def get_conversion_value_statistics(
         self,
         campaign_id: int,
@@ -1285,6 +1427,7 @@ class ConversionRepository(BaseRepository[ConversionEvent]):
             self.session.rollback()
             raise
     
+    @read_only
     def get_contact_conversion_values(self, campaign_id: int) -> List[Dict[str, Any]]:
         """
         Get total conversion values for each contact in a campaign.
@@ -1322,6 +1465,42 @@ class ConversionRepository(BaseRepository[ConversionEvent]):
             logger.error(f"Error getting contact conversion values: {e}")
             raise
     
+    # ===== Export Queries =====
+    
+    def build_export_query(self, filters: Optional[Dict[str, Any]] = None, after_id: int = 0) -> Select:
+        """
+        Build the keyset-ordered column select for the conversion export.
+        
+        Args:
+            filters: Optional campaign_id and start_date/end_date (datetime, end exclusive)
+            after_id: Only include rows with an id greater than this
+            
+        Returns:
+            Select statement ordered by id, id selected first
+        """
+        filters = filters or {}
+        statement = select(
+            ConversionEvent.id,
+            ConversionEvent.contact_id,
+            ConversionEvent.campaign_id,
+            ConversionEvent.conversion_type,
+            ConversionEvent.conversion_value,
+            ConversionEvent.currency,
+            ConversionEvent.attribution_model,
+            ConversionEvent.converted_at,
+            ConversionEvent.customer_journey_stage,
+            ConversionEvent.data_source
+        ).where(ConversionEvent.id > after_id)
+        
+        if filters.get('campaign_id'):
+            statement = statement.where(ConversionEvent.campaign_id == filters['campaign_id'])
+        if filters.get('start_date'):
+            statement = statement.where(ConversionEvent.converted_at >= filters['start_date'])
+        if filters.get('end_date'):
+            statement = statement.where(ConversionEvent.converted_at < filters['end_date'])
+        
+        return statement.order_by(ConversionEvent.id)
+    
     # ===== Helper Methods =====
     
     def _validate_conversion_type(self, conversion_type: str) -> None:
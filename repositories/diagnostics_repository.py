@@ -10,8 +10,9 @@ import logging
 from typing import Dict, Any, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import text
+from sqlalchemy import select, text
 from datetime import datetime
+from utils.database import pool_stats, replica_reads
 from utils.datetime_utils import utc_now
 
 from crm_database import Contact, Conversation, Activity, Campaign, Todo
@@ -228,19 +229,20 @@ class DiagnosticsRepository:
         Get database connection pool statistics.
         
         Returns:
-            Dictionary with connection pool stats
+            Dictionary with connection pool stats; QueuePool engines add
+            max_overflow, utilization and checkout wait times, and a configured
+            read replica is reported under 'replica'
         """
         try:
             engine = self.session.get_bind()
-            pool = engine.pool
+            stats = pool_stats(engine.pool)
             
-            return {
-                'pool_size': pool.size(),
-                'checked_in': pool.checked_in(),
-                'checked_out': pool.checked_out(),
-                'overflow': pool.overflow(),
-                'invalid': getattr(pool, 'invalid', lambda: 0)()
-            }
+            with replica_reads():
+                replica = self.session.get_bind(clause=select(1))
+            if replica is not engine:
+                stats['replica'] = pool_stats(replica.pool)
+            
+            return stats
         except (AttributeError, SQLAlchemyError) as e:
             logger.error(f"Error getting connection pool stats: {e}")
             return {}
@@ -6,17 +6,40 @@ Handles all database operations for engagement scoring and analytics
 from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 from decimal import Decimal
-from sqlalchemy import func, and_, or_, desc, asc, String, case
+from sqlalchemy import func, and_, or_, desc, asc, String, case, select, update
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from repositories.base_repository import BaseRepository, PaginationParams, PaginatedResult, SortOrder
 from crm_database import EngagementScore, Contact, Campaign
 from utils.datetime_utils import utc_now, ensure_utc
 import logging
-import statistics
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Engagement scores are on a 0-100 scale
+SCORE_RANGE = (0, 100)
+
+
+def percent_ranks(values) -> np.ndarray:
+    """
+    PERCENT_RANK() of each value, for databases where it is computed in Python.
+    
+    The rank is the number of smaller values divided by count - 1, so tied
+    values share the lowest rank and a single value ranks 0, as in SQL.
+    
+    Args:
+        values: Sequence of numeric values
+    
+    Returns:
+        Array of ranks between 0 and 1, in the order of values
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) < 2:
+        return np.zeros(len(values))
+    return np.searchsorted(np.sort(values), values, side='left') / (len(values) - 1)
+
 
 class EngagementScoreRepository(BaseRepository[EngagementScore]):
     """Repository for EngagementScore data access"""
@@ -188,43 +211,87 @@ class EngagementScoreRepository(BaseRepository[EngagementScore]):
         """
         Calculate percentile rankings for all contacts in a campaign.
         
+        Ranks are computed in the database with PERCENT_RANK() and NTILE(4)
+        window functions, so tied scores share a percentile.
+        
         Args:
             campaign_id: Campaign ID
         
         Returns:
-            Dictionary mapping contact_id to their percentile ranks
+            Dictionary mapping contact_id to their score, percentile (0-100)
+            and quartile (1 lowest to 4 highest)
         """
         try:
-            # Get all scores for the campaign
+            ordering = EngagementScore.overall_score
             scores = self.session.query(
                 EngagementScore.contact_id,
-                EngagementScore.overall_score
+                EngagementScore.overall_score,
+                func.percent_rank().over(order_by=ordering).label('percentile'),
+                func.ntile(4).over(order_by=ordering).label('quartile')
             ).filter(
                 EngagementScore.campaign_id == campaign_id
             ).all()
             
-            if not scores:
-                return {}
-            
-            # Sort scores
-            sorted_scores = sorted(scores, key=lambda x: x.overall_score)
-            total_count = len(sorted_scores)
-            
-            # Calculate percentiles
-            percentiles = {}
-            for index, (contact_id, score) in enumerate(sorted_scores):
-                # Calculate percentile (0-100)
-                percentile = ((index + 1) / total_count) * 100
-                percentiles[contact_id] = {
+            return {
+                contact_id: {
                     'overall_score': float(score),
-                    'percentile': percentile
+                    'percentile': float(percentile) * 100,
+                    'quartile': quartile
                 }
-            
-            return percentiles
+                for contact_id, score, percentile, quartile in scores
+            }
         except SQLAlchemyError as e:
             logger.error(f"Error calculating percentile ranks for campaign {campaign_id}: {e}")
             return {}
     
+    def update_percentile_ranks(self, campaign_id: int) -> int:
+        """
+        Store the overall, recency, frequency and monetary percentiles of a campaign's scores.
+        
+        On PostgreSQL this is one UPDATE ... FROM over a PERCENT_RANK()
+        subquery. Other databases read the scores and rank them with NumPy.
+        Not committed.
+        
+        Args:
+            campaign_id: Campaign ID
+        
+        Returns:
+            Number of scores updated
+        """
+        components = {
+            'overall_percentile': EngagementScore.overall_score,
+            'recency_percentile': EngagementScore.recency_score,
+            'frequency_percentile': EngagementScore.frequency_score,
+            'monetary_percentile': EngagementScore.monetary_score,
+        }
+        
+        if self.session.get_bind().dialect.name == 'postgresql':
+            ranked = select(
+                EngagementScore.id,
+                *[(func.percent_rank().over(order_by=score) * 100).label(name) for name, score in components.items()]
+            ).where(
+                EngagementScore.campaign_id == campaign_id
+            ).subquery()
+            result = self.session.execute(
+                update(EngagementScore)
+                .where(EngagementScore.id == ranked.c.id)
+                .values({name: ranked.c[name] for name in components})
+            )
+            return result.rowcount or 0
+        
+        rows = self.session.query(EngagementScore.id, *components.values()).filter(
+            EngagementScore.campaign_id == campaign_id
+        ).all()
+        if not rows:
+            return 0
+        
+        updates = [{'id': row[0]} for row in rows]
+        for index, name in enumerate(components, start=1):
+            ranks = np.round(percent_ranks([float(row[index] or 0) for row in rows]) * 100, 2)
+            for values, rank in zip(updates, ranks.tolist()):
+                values[name] = rank
+        return self.bulk_update(updates)
+    
     def get_top_scored_contacts(self, campaign_id: int, limit: int = 10) -> List[EngagementScore]:
         """
         Get the top-scored contacts for a campaign.
@@ -244,42 +311,82 @@ class EngagementScoreRepository(BaseRepository[EngagementScore]):
             logger.error(f"Error getting top scored contacts for campaign {campaign_id}: {e}")
             return []
     
-    def get_score_distribution(self, campaign_id: int) -> Dict[str, float]:
+    def get_score_distribution(self, campaign_id: int, buckets: int = 10) -> Dict[str, Any]:
         """
         Get statistical distribution of scores for a campaign.
         
+        On PostgreSQL the statistics are one aggregate query and the
+        histogram one width_bucket() query. Other databases read the scores
+        and summarise them with NumPy.
+        
         Args:
             campaign_id: Campaign ID
+            buckets: Number of equal-width histogram buckets over 0-100
         
         Returns:
-            Dictionary with min, max, mean, median, std_dev, and count
+            Dictionary with min, max, mean, median, std_dev, count and histogram
         """
         try:
-            # Get all scores
-            scores_query = self.session.query(EngagementScore.overall_score).filter(
-                EngagementScore.campaign_id == campaign_id
-            )
+            score = EngagementScore.overall_score
+            low, high = SCORE_RANGE
+            
+            if self.session.get_bind().dialect.name == 'postgresql':
+                minimum, maximum, mean, median, std_dev, count = self.session.query(
+                    func.min(score),
+                    func.max(score),
+                    func.avg(score),
+                    func.percentile_cont(0.5).within_group(score),
+                    func.stddev_samp(score),
+                    func.count(EngagementScore.id)
+                ).filter(
+                    EngagementScore.campaign_id == campaign_id
+                ).one()
+                
+                # A score of exactly 100 falls in the top bucket rather than an overflow bucket
+                bucket = func.greatest(func.least(func.width_bucket(score, low, high, buckets), buckets), 1)
+                bucket_counts = dict(
+                    self.session.query(bucket, func.count(EngagementScore.id)).filter(
+                        EngagementScore.campaign_id == campaign_id
+                    ).group_by(bucket).all()
+                )
+            else:
+                scores = np.array([
+                    float(row[0]) for row in self.session.query(score).filter(
+                        EngagementScore.campaign_id == campaign_id
+                    ).all()
+                ])
+                count = len(scores)
+                minimum = scores.min() if count else None
+                maximum = scores.max() if count else None
+                mean = scores.mean() if count else None
+                median = np.median(scores) if count else None
+                std_dev = scores.std(ddof=1) if count > 1 else None
+                
+                width = (high - low) / buckets
+                bucket_ids = np.clip(np.floor((scores - low) / width).astype(int) + 1, 1, buckets)
+                bucket_counts = dict(zip(*np.unique(bucket_ids, return_counts=True)))
             
-            scores = [float(score[0]) for score in scores_query.all()]
+            histogram = self._score_histogram(bucket_counts, buckets)
             
-            if not scores:
+            if not count:
                 return {
                     'min': 0,
                     'max': 0,
                     'mean': 0,
                     'median': 0,
                     'std_dev': 0,
-                    'count': 0
+                    'count': 0,
+                    'histogram': histogram
                 }
             
-            # Calculate statistics
             return {
-                'min': min(scores),
-                'max': max(scores),
-                'mean': statistics.mean(scores),
-                'median': statistics.median(scores),
-                'std_dev': statistics.stdev(scores) if len(scores) > 1 else 0,
-                'count': len(scores)
+                'min': float(minimum),
+                'max': float(maximum),
+                'mean': float(mean),
+                'median': float(median),
+                'std_dev': float(std_dev) if std_dev is not None else 0,
+                'count': int(count),
+                'histogram': histogram
             }
         except Exception as e:
             logger.error(f"Error calculating score distribution for campaign {campaign_id}: {e}")
@@ -289,8 +396,24 @@ class EngagementScoreRepository(BaseRepository[EngagementScore]):
                 'mean': 0,
                 'median': 0,
                 'std_dev': 0,
-                'count': 0
+                'count': 0,
+                'histogram': []
+            }
+    
+    @staticmethod
+    def _score_histogram(bucket_counts: Dict[int, int], buckets: int) -> List[Dict[str, Any]]:
+        """Build histogram rows for buckets numbered 1 to buckets over the score range"""
+        low, high = SCORE_RANGE
+        width = (high - low) / buckets
+        return [
+            {
+                'bucket': bucket,
+                'range_start': low + (bucket - 1) * width,
+                'range_end': low + bucket * width,
+                'count': int(bucket_counts.get(bucket, 0))
             }
+            for bucket in range(1, buckets + 1)
+        ]
     
     def get_scores_needing_update(self, max_age_hours: int = 48) -> List[EngagementScore]:
         """
@@ -409,8 +532,9 @@ class EngagementScoreRepository(BaseRepository[EngagementScore]):
         """
         try:
             # Join with Contact table to access metadata
+            segment = Contact.contact_metadata[segment_field].as_string()
             results = self.session.query(
-                func.json_extract(Contact.contact_metadata, f'$.{segment_field}').label('segment'),
+                segment.label('segment'),
                 func.avg(EngagementScore.overall_score).label('avg_overall'),
                 func.avg(EngagementScore.recency_score).label('avg_recency'),
                 func.avg(EngagementScore.frequency_score).label('avg_frequency'),
@@ -420,7 +544,7 @@ class EngagementScoreRepository(BaseRepository[EngagementScore]):
                 Contact, EngagementScore.contact_id == Contact.id
             ).filter(
                 EngagementScore.campaign_id == campaign_id
-            ).group_by('segment').all()
+            ).group_by(segment).all()
             
             # Format results
             segment_averages = {}
@@ -0,0 +1,153 @@
+"""
+ExportJobRepository - Data access layer for ExportJob model
+Tracks resumable background exports and their checkpoints
+"""
+
+from datetime import datetime
+from typing import List, Optional
+from utils.datetime_utils import utc_now
+from sqlalchemy import and_, or_
+from repositories.base_repository import BaseRepository
+from crm_database import ExportJob
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ExportJobRepository(BaseRepository[ExportJob]):
+    """Repository for ExportJob data access"""
+    
+    def __init__(self, session):
+        """Initialize repository with database session"""
+        super().__init__(session, ExportJob)
+    
+    def search(self, query: str, fields: Optional[List[str]] = None) -> List[ExportJob]:
+        """
+        Search export jobs by dataset name.
+        
+        Args:
+            query: Search query string
+            fields: Not used
+            
+        Returns:
+            List of matching export jobs
+        """
+        if not query:
+            return []
+        return self.session.query(ExportJob)\
+            .filter(ExportJob.dataset.ilike(f'%{query}%'))\
+            .order_by(ExportJob.created_at.desc())\
+            .all()
+    
+    def find_incomplete_jobs(self) -> List[ExportJob]:
+        """
+        Find jobs that have not finished and can be resumed.
+        
+        Returns:
+            List of pending, running or failed export jobs
+        """
+        return self.session.query(ExportJob)\
+            .filter(ExportJob.status.in_(['pending', 'running', 'failed']))\
+            .order_by(ExportJob.id)\
+            .all()
+    
+    def record_progress(self, job: ExportJob, rows_exported: int, bytes_written: int, last_row_id: int) -> ExportJob:
+        """
+        Commit a resume checkpoint for a running job.
+        
+        Only call this after the file has been flushed up to bytes_written,
+        so that a resumed job can truncate the file to the checkpoint.
+        
+        Args:
+            job: Export job being written
+            rows_exported: Total rows written so far
+            bytes_written: Total bytes flushed to the file
+            last_row_id: Id of the last exported row
+            
+        Returns:
+            Updated export job
+        """
+        job.rows_exported = rows_exported
+        job.bytes_written = bytes_written
+        job.last_row_id = last_row_id
+        self.session.commit()
+        return job
+    
+    def claim(self, job_id: int, stale_before: datetime) -> bool:
+        """
+        Atomically take ownership of a job for one worker.
+        
+        Pending and failed jobs can be claimed. A running job can only be
+        claimed once its heartbeat (updated_at, bumped by every checkpoint)
+        is older than stale_before, i.e. its worker has died. The status
+        check and the update are one conditional UPDATE, so two workers
+        racing for the same job cannot both win.
+        
+        Args:
+            job_id: Export job id
+            stale_before: Running jobs last updated before this are abandoned
+            
+        Returns:
+            True if this caller now owns the job
+        """
+        claimed = self.session.query(ExportJob).filter(
+            ExportJob.id == job_id,
+            or_(
+                ExportJob.status.in_(['pending', 'failed']),
+                and_(ExportJob.status == 'running', ExportJob.updated_at < stale_before)
+            )
+        ).update({'status': 'running', 'updated_at': utc_now()}, synchronize_session='fetch')
+        self.session.commit()
+        return claimed > 0
+    
+    def mark_running(self, job: ExportJob, file_path: str, total_rows: int) -> ExportJob:
+        """
+        Mark a job as running.
+        
+        Args:
+            job: Export job to start
+            file_path: Output file for the job
+            total_rows: Number of rows the export will contain
+            
+        Returns:
+            Updated export job
+        """
+        job.status = 'running'
+        job.file_path = file_path
+        job.total_rows = total_rows
+        job.error_message = None
+        if not job.started_at:
+            job.started_at = utc_now()
+        self.session.commit()
+        return job
+    
+    def mark_completed(self, job: ExportJob) -> ExportJob:
+        """
+        Mark a job as completed.
+        
+        Args:
+            job: Finished export job
+            
+        Returns:
+            Updated export job
+        """
+        job.status = 'completed'
+        job.completed_at = utc_now()
+        self.session.commit()
+        return job
+    
+    def mark_failed(self, job: ExportJob, error_message: str) -> ExportJob:
+        """
+        Mark a job as failed, keeping its last checkpoint for resume.
+        
+        Args:
+            job: Failed export job
+            error_message: Reason for the failure
+            
+        Returns:
+            Updated export job
+        """
+        job.status = 'failed'
+        job.error_message = error_message
+        self.session.commit()
+        return job
@@ -177,6 +177,26 @@ class InvoiceLineItemRepository(BaseRepository[InvoiceLineItem]):
         self.session.flush()
         return deleted_count
     
+    def delete_by_invoice_ids(self, invoice_ids: List[int]) -> int:
+        """
+        Delete all line items for several invoices with chunked bulk deletes.
+        
+        Args:
+            invoice_ids: IDs of the invoices
+            
+        Returns:
+            Number of line items deleted
+        """
+        unique_ids = list(dict.fromkeys(invoice_ids))
+        deleted_count = 0
+        for start in range(0, len(unique_ids), self.LOOKUP_CHUNK_SIZE):
+            chunk = unique_ids[start:start + self.LOOKUP_CHUNK_SIZE]
+            deleted_count += self.session.query(InvoiceLineItem).filter(
+                InvoiceLineItem.invoice_id.in_(chunk)
+            ).delete(synchronize_session=False)
+        self.session.flush()
+        return deleted_count
+    
     def bulk_create_line_items(self, line_items_data: List[Dict[str, Any]]) -> List[InvoiceLineItem]:
         """
         Bulk create line items.
@@ -2,11 +2,11 @@
 JobRepository - Data access layer for Job model
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import date, datetime
 from repositories.base_repository import BaseRepository
-from sqlalchemy import desc, asc, or_, and_, func
-from crm_database import Job
+from sqlalchemy import desc, asc, or_, and_, func, case
+from crm_database import Job, Contact, PropertyContact
 
 
 class JobRepository(BaseRepository):
@@ -37,6 +37,36 @@ class JobRepository(BaseRepository):
             )\
             .all()
     
+    def find_completed_jobs_with_contacts(self, completion_date: date) -> List[Tuple[Job, Optional[Contact]]]:
+        """
+        Find jobs completed on a date together with each property's contact, in one query.
+        
+        The contact is chosen the way Property.contact does: the primary
+        property contact, otherwise the first one linked.
+        
+        Args:
+            completion_date: Date to filter completed jobs by
+            
+        Returns:
+            List of (job, contact) tuples ordered by job ID; contact is None
+            when the property has no contacts
+        """
+        primary_first = case((PropertyContact.is_primary.is_(True), 0), else_=1)
+        rows = self.session.query(Job, Contact)\
+            .outerjoin(PropertyContact, PropertyContact.property_id == Job.property_id)\
+            .outerjoin(Contact, Contact.id == PropertyContact.contact_id)\
+            .filter(
+                Job.status == 'Completed',
+                func.date(Job.completed_at) == completion_date
+            )\
+            .order_by(asc(Job.id), primary_first, asc(PropertyContact.id))\
+            .all()
+        
+        jobs = {}
+        for job, contact in rows:
+            jobs.setdefault(job.id, (job, contact))
+        return list(jobs.values())
+    
     def search(self, query: str, fields: Optional[List[str]] = None) -> List:
         """
         Search jobs by description.
@@ -0,0 +1,358 @@
+"""
+PartitionArchiveRepository - Data access layer for ArchivedPartition model
+Compressed cold storage for months moved out of the partitioned tables
+"""
+
+import gzip
+import json
+import logging
+import re
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Type
+
+from sqlalchemy import Date, DateTime, Numeric, Table, Time, delete, func, select, text
+
+from crm_database import Activity, ArchivedPartition, WebhookEvent
+from repositories.base_repository import BaseRepository
+
+logger = logging.getLogger(__name__)
+
+PARTITION_NAME = re.compile(r'^(?P<table>\w+)_p(?P<year>\d{4})(?P<month>\d{2})$')
+
+
+def month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot archive value of type {type(value).__name__}")
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Stored timestamps are naive UTC; compare like with like"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class PartitionArchiveRepository(BaseRepository[ArchivedPartition]):
+    """Repository for archived months of partitioned tables and their live partitions"""
+
+    # Tables partitioned by month on created_at (see migration a7d3f9b1c5e8)
+    PARTITIONED_TABLES = {
+        'activity': Activity.__table__,
+        'webhook_event': WebhookEvent.__table__,
+    }
+
+    # Rows per compressed chunk, so no single payload grows without bound
+    ROWS_PER_CHUNK = 50000
+    # Rows read per round trip while streaming a month into the archive
+    STREAM_BATCH_SIZE = 5000
+
+    def __init__(self, session):
+        """Initialize repository with database session"""
+        super().__init__(session, ArchivedPartition)
+
+    def search(self, query: str, fields: Optional[List[str]] = None) -> List[ArchivedPartition]:
+        """
+        Search archive chunks by table name.
+
+        Args:
+            query: Text to search for
+            fields: Not used
+
+        Returns:
+            List of matching archive chunks, without loading their payloads' rows
+        """
+        if not query:
+            return []
+        return self.session.query(ArchivedPartition).filter(
+            ArchivedPartition.table_name.ilike(f"%{query}%")
+        ).order_by(ArchivedPartition.table_name, ArchivedPartition.period_start).all()
+
+    def archive_rows(self, table: Table, period_start: date, period_end: date,
+                     batches: Iterable[Iterable[Any]]) -> int:
+        """
+        Compress a month of rows into archive chunks.
+
+        Chunks are flushed but not committed, so the caller can remove the
+        source rows in the same transaction. Archiving a month again (rows
+        that arrived late) adds chunks after the existing ones.
+
+        Args:
+            table: Table the rows come from
+            period_start: First day of the month
+            period_end: First day of the next month
+            batches: Batches of rows (Row objects or mappings) with all table columns
+
+        Returns:
+            Number of rows archived
+        """
+        chunk_index = self.session.query(
+            func.coalesce(func.max(ArchivedPartition.chunk_index) + 1, 0)
+        ).filter_by(table_name=table.name, period_start=period_start).scalar()
+
+        columns = [column.name for column in table.columns]
+        lines: List[str] = []
+        total = 0
+
+        def write_chunk():
+            nonlocal chunk_index
+            payload = gzip.compress('\n'.join(lines).encode('utf-8'))
+            self.session.add(ArchivedPartition(
+                table_name=table.name,
+                period_start=period_start,
+                period_end=period_end,
+                chunk_index=chunk_index,
+                row_count=len(lines),
+                payload=payload
+            ))
+            chunk_index += 1
+            lines.clear()
+
+        for batch in batches:
+            for row in batch:
+                mapping = getattr(row, '_mapping', row)
+                lines.append(json.dumps({name: mapping[name] for name in columns}, default=_json_default))
+                total += 1
+                if len(lines) >= self.ROWS_PER_CHUNK:
+                    write_chunk()
+        if lines:
+            write_chunk()
+
+        self.session.flush()
+        return total
+
+    def is_partitioned(self, table_name: str) -> bool:
+        """Whether the table is a partitioned table (always False outside PostgreSQL)"""
+        if self.session.get_bind().dialect.name != 'postgresql':
+            return False
+        return self.session.execute(
+            text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table_name)"),
+            {'table_name': table_name}
+        ).first() is not None
+
+    def list_partitions(self, table_name: str) -> Dict[date, str]:
+        """
+        Monthly partitions of a table.
+
+        Args:
+            table_name: Partitioned table name
+
+        Returns:
+            Partition name by first day of its month (the default partition is not included)
+        """
+        if not self.is_partitioned(table_name):
+            return {}
+        names = self.session.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(:table_name)"
+        ), {'table_name': table_name}).scalars()
+
+        partitions = {}
+        for name in names:
+            match = PARTITION_NAME.match(name)
+            if match and match.group('table') == table_name:
+                partitions[date(int(match.group('year')), int(match.group('month')), 1)] = name
+        return partitions
+
+    def create_partition(self, table_name: str, period_start: date) -> str:
+        """
+        Create and attach the partition for one month (PostgreSQL only).
+
+        Rows of that month already in the default partition are moved into the
+        new partition before it is attached. Not committed.
+
+        Args:
+            table_name: Partitioned table name
+            period_start: First day of the month
+
+        Returns:
+            Name of the new partition
+        """
+        period_end = add_months(period_start, 1)
+        partition = f'{table_name}_p{period_start:%Y%m}'
+
+        self.session.execute(text(
+            f'CREATE TABLE {partition} (LIKE {table_name} INCLUDING DEFAULTS INCLUDING STORAGE)'
+        ))
+        self.session.execute(text(
+            f'WITH moved AS (DELETE FROM {table_name}_default '
+            f'WHERE created_at >= :start AND created_at < :end RETURNING *) '
+            f'INSERT INTO {partition} SELECT * FROM moved'
+        ), {'start': datetime.combine(period_start, time.min), 'end': datetime.combine(period_end, time.min)})
+        # Partition bounds are DDL and cannot be bind parameters; both are generated dates
+        self.session.execute(text(
+            f"ALTER TABLE {table_name} ATTACH PARTITION {partition} "
+            f"FOR VALUES FROM ('{period_start.isoformat()}') TO ('{period_end.isoformat()}')"
+        ))
+        return partition
+
+    def months_before(self, table_name: str, cutoff: date) -> List[date]:
+        """
+        Months of a table that hold live rows (or have a partition) before a cutoff.
+
+        Args:
+            table_name: Partitioned table name
+            cutoff: First day of the first month to keep
+
+        Returns:
+            First days of the months before the cutoff, oldest first
+        """
+        table = self.PARTITIONED_TABLES[table_name]
+        months = {start for start in self.list_partitions(table_name) if start < cutoff}
+
+        oldest = self.session.execute(
+            select(func.min(table.c.created_at)).where(table.c.created_at < datetime.combine(cutoff, time.min))
+        ).scalar()
+        if oldest is not None:
+            start = month_start(oldest.date())
+            while start < cutoff:
+                months.add(start)
+                start = add_months(start, 1)
+        return sorted(months)
+
+    def archive_month(self, table_name: str, period_start: date) -> int:
+        """
+        Move one month of a table into the archive.
+
+        The rows are compressed into archive chunks, then the month's partition
+        is detached and dropped; without a partition the rows are removed with
+        a range DELETE. Not committed, so the caller commits both together.
+
+        Args:
+            table_name: Partitioned table name
+            period_start: First day of the month
+
+        Returns:
+            Number of rows archived
+        """
+        period_end = add_months(period_start, 1)
+        table = self.PARTITIONED_TABLES[table_name]
+        in_month = (
+            table.c.created_at >= datetime.combine(period_start, time.min),
+            table.c.created_at < datetime.combine(period_end, time.min),
+        )
+        # Look the partition up before the stream opens its server-side cursor
+        partition = self.list_partitions(table_name).get(period_start)
+
+        row_count = self.archive_rows(
+            table, period_start, period_end,
+            self.stream_batches(select(table).where(*in_month).order_by(table.c.id), self.STREAM_BATCH_SIZE)
+        )
+
+        if partition:
+            self.session.execute(text(f'ALTER TABLE {table_name} DETACH PARTITION {partition}'))
+            self.session.execute(text(f'DROP TABLE {partition}'))
+        else:
+            self.session.execute(delete(table).where(*in_month))
+        return row_count
+
+    def archived_periods(self, table_name: str) -> List[Dict[str, Any]]:
+        """
+        List the archived months of a table.
+
+        Args:
+            table_name: Partitioned table name
+
+        Returns:
+            One dictionary per month with period_start, period_end, row_count and chunks
+        """
+        rows = self.session.query(
+            ArchivedPartition.period_start,
+            ArchivedPartition.period_end,
+            func.sum(ArchivedPartition.row_count),
+            func.count(ArchivedPartition.id)
+        ).filter(
+            ArchivedPartition.table_name == table_name
+        ).group_by(
+            ArchivedPartition.period_start, ArchivedPartition.period_end
+        ).order_by(ArchivedPartition.period_start).all()
+
+        return [
+            {'period_start': start, 'period_end': end, 'row_count': int(row_count or 0), 'chunks': chunks}
+            for start, end, row_count, chunks in rows
+        ]
+
+    def iter_rows(self, table: Table, start: Optional[datetime] = None,
+                  end: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream archived rows of a table whose created_at is in [start, end).
+
+        Only the chunks of overlapping months are read, one payload at a time.
+
+        Args:
+            table: Partitioned table
+            start: Earliest created_at (None for no lower bound)
+            end: created_at upper bound, exclusive (None for no upper bound)
+
+        Returns:
+            Iterator of column dictionaries with their original Python types
+        """
+        start, end = _naive_utc(start), _naive_utc(end)
+        chunk_query = self.session.query(ArchivedPartition.id).filter(ArchivedPartition.table_name == table.name)
+        if start is not None:
+            chunk_query = chunk_query.filter(ArchivedPartition.period_end > start.date())
+        if end is not None:
+            chunk_query = chunk_query.filter(ArchivedPartition.period_start <= end.date())
+        chunk_ids = [chunk_id for (chunk_id,) in chunk_query.order_by(
+            ArchivedPartition.period_start, ArchivedPartition.chunk_index
+        )]
+
+        for chunk_id in chunk_ids:
+            payload = self.session.query(ArchivedPartition.payload).filter_by(id=chunk_id).scalar()
+            for line in gzip.decompress(payload).decode('utf-8').splitlines():
+                row = self._decode_row(table, json.loads(line))
+                created_at = row.get('created_at')
+                if start is not None and (created_at is None or created_at < start):
+                    continue
+                if end is not None and (created_at is None or created_at >= end):
+                    continue
+                yield row
+
+    def find_archived(self, model_class: Type, start: Optional[datetime] = None,
+                      end: Optional[datetime] = None, **filters) -> List[Any]:
+        """
+        Find archived rows of a model as transient (unsaved) model instances.
+
+        Args:
+            model_class: Model of a partitioned table, e.g. Activity
+            start: Earliest created_at
+            end: created_at upper bound, exclusive
+            **filters: Column values the rows must equal
+
+        Returns:
+            List of model instances, oldest month first
+        """
+        return [
+            model_class(**row)
+            for row in self.iter_rows(model_class.__table__, start, end)
+            if all(row.get(column) == value for column, value in filters.items())
+        ]
+
+    @staticmethod
+    def _decode_row(table: Table, data: Dict[str, Any]) -> Dict[str, Any]:
+        for column in table.columns:
+            value = data.get(column.name)
+            if value is None:
+                continue
+            if isinstance(column.type, DateTime):
+                data[column.name] = datetime.fromisoformat(value)
+            elif isinstance(column.type, Date):
+                data[column.name] = date.fromisoformat(value)
+            elif isinstance(column.type, Time):
+                data[column.name] = time.fromisoformat(value)
+            elif isinstance(column.type, Numeric) and column.type.asdecimal:
+                data[column.name] = Decimal(value)
+        return data
@@ -13,9 +13,14 @@ from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from sqlalchemy.dialects.postgresql import insert
 from datetime import datetime
 
+import numpy as np
+
 from crm_database import Property, Job, Contact, PropertyContact, db
 from repositories.base_repository import BaseRepository, PaginationParams, PaginatedResult
 from services.common.result import Result
+from utils.geo import (
+    BoundingBox, PREFIX_RANGE_END, clamp_bbox, covering_cells, geohash_for, haversine_miles, radius_bbox
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -31,6 +36,11 @@ class PropertyRepository(BaseRepository[Property]):
     - Business logic operations (properties with jobs, type counts)
     """
 
+    # Keep IN lists well below database parameter limits
+    LOOKUP_CHUNK_SIZE = 500
+    # First radius tried by find_nearest before widening
+    NEAREST_INITIAL_MILES = 0.25
+
     def __init__(self, session: Session):
         """Initialize PropertyRepository with database session
         
@@ -351,6 +361,17 @@ class PropertyRepository(BaseRepository[Property]):
     
     # ====== BULK OPERATIONS FOR PROPERTYRADAR IMPORTS ======
     
+    @staticmethod
+    def _set_geohashes(properties_data: List[Dict[str, Any]]) -> None:
+        """Fill geohash on mappings that carry coordinates.
+        
+        Bulk mappings bypass the before_flush hook that maintains
+        Property.geohash for ORM writes.
+        """
+        for data in properties_data:
+            if 'latitude' in data and 'longitude' in data:
+                data['geohash'] = geohash_for(data['latitude'], data['longitude'])
+    
     def bulk_create_properties(self, properties_data: List[Dict[str, Any]]) -> Result[int]:
         """Bulk create properties for large PropertyRadar imports.
         
@@ -366,6 +387,8 @@ class PropertyRepository(BaseRepository[Property]):
             
             logger.info(f"Bulk creating {len(properties_data)} properties")
             
+            self._set_geohashes(properties_data)
+            
             # Use bulk_insert_mappings for optimal performance
             self.session.bulk_insert_mappings(Property, properties_data)
             self.session.flush()
@@ -416,6 +439,8 @@ class PropertyRepository(BaseRepository[Property]):
             
             logger.info(f"Bulk updating {len(properties_data)} properties")
             
+            self._set_geohashes(properties_data)
+            
             # Use bulk_update_mappings for optimal performance
             self.session.bulk_update_mappings(Property, properties_data)
             self.session.flush()
@@ -457,6 +482,7 @@ class PropertyRepository(BaseRepository[Property]):
             # Process in batches
             for i in range(0, len(properties_data), batch_size):
                 batch = properties_data[i:i + batch_size]
+                self._set_geohashes(batch)
                 logger.debug(f"Processing batch {i // batch_size + 1}, records {i} to {i + len(batch)}")
                 
                 # Separate into insert and update based on APN
@@ -551,10 +577,32 @@ class PropertyRepository(BaseRepository[Property]):
         """
         return self.session.query(Property).filter_by(apn=apn).first()
     
+    @staticmethod
+    def duplicate_key(apn: Optional[str], address: Optional[str], zip_code: Optional[str]) -> Optional[str]:
+        """Build the key used to detect duplicate properties.
+        
+        APN is the primary identifier; address+zip is only used without an APN.
+        
+        Args:
+            apn: Assessor Parcel Number
+            address: Property address
+            zip_code: Zip code
+            
+        Returns:
+            Duplicate key, or None if the property cannot be matched
+        """
+        if apn:
+            return f"apn:{apn}"
+        if address and zip_code:
+            return f"address:{address.lower()}:{zip_code}"
+        return None
+    
     def find_duplicates_in_batch(self, properties_data: List[Dict[str, Any]]) -> Dict[str, Property]:
         """Find existing properties that would be duplicates in a batch.
         
         Uses APN as primary duplicate identifier, falls back to address+zip.
+        Lookups are chunked IN queries; when several rows share a key the
+        oldest property wins, matching the single-row finders.
         
         Args:
             properties_data: List of property dictionaries to check
@@ -565,38 +613,37 @@ class PropertyRepository(BaseRepository[Property]):
         duplicates = {}
         
         # Check by APN first (most reliable)
-        apns = [prop.get('apn') for prop in properties_data if prop.get('apn')]
-        if apns:
+        apns = list(dict.fromkeys(prop.get('apn') for prop in properties_data if prop.get('apn')))
+        for start in range(0, len(apns), self.LOOKUP_CHUNK_SIZE):
+            chunk = apns[start:start + self.LOOKUP_CHUNK_SIZE]
             existing_by_apn = self.session.query(Property).filter(
-                Property.apn.in_(apns)
-            ).all()
+                Property.apn.in_(chunk)
+            ).order_by(Property.id).all()
             for prop in existing_by_apn:
-                duplicates[f"apn:{prop.apn}"] = prop
+                duplicates.setdefault(self.duplicate_key(prop.apn, None, None), prop)
         
         # Check by address+zip for properties without APN
-        address_zip_pairs = [
-            (prop.get('address'), prop.get('zip_code'))
-            for prop in properties_data
+        address_rows = [
+            prop for prop in properties_data
             if not prop.get('apn') and prop.get('address') and prop.get('zip_code')
         ]
+        address_keys = {
+            self.duplicate_key(None, prop['address'], prop['zip_code']) for prop in address_rows
+        }
+        addresses = list({prop['address'].lower() for prop in address_rows})
+        zip_codes = list({prop['zip_code'] for prop in address_rows})
         
-        if address_zip_pairs:
-            # Build OR conditions for all address+zip pairs
-            conditions = [
-                and_(
-                    func.lower(Property.address) == func.lower(addr),
-                    Property.zip_code == zip_code
-                )
-                for addr, zip_code in address_zip_pairs
-            ]
-            
+        for start in range(0, len(addresses), self.LOOKUP_CHUNK_SIZE):
+            chunk = addresses[start:start + self.LOOKUP_CHUNK_SIZE]
             existing_by_address = self.session.query(Property).filter(
-                or_(*conditions)
-            ).all()
+                func.lower(Property.address).in_(chunk),
+                Property.zip_code.in_(zip_codes)
+            ).order_by(Property.id).all()
             
             for prop in existing_by_address:
-                key = f"address:{prop.address.lower()}:{prop.zip_code}"
-                duplicates[key] = prop
+                key = self.duplicate_key(None, prop.address, prop.zip_code)
+                if key in address_keys:
+                    duplicates.setdefault(key, prop)
         
         return duplicates
     
@@ -674,6 +721,66 @@ class PropertyRepository(BaseRepository[Property]):
                 code="DATABASE_ERROR"
             )
     
+    def find_property_ids_for_contacts(self, contact_ids: List[int]) -> Dict[int, int]:
+        """Get one property per contact, preferring the primary association, with chunked IN queries.
+
+        Args:
+            contact_ids: Contact IDs
+
+        Returns:
+            Dictionary mapping contact ID to property ID for contacts that have a property
+        """
+        found = {}
+        unique_ids = list(dict.fromkeys(contact_ids))
+
+        for start in range(0, len(unique_ids), self.LOOKUP_CHUNK_SIZE):
+            chunk = unique_ids[start:start + self.LOOKUP_CHUNK_SIZE]
+            rows = self.session.query(PropertyContact.contact_id, PropertyContact.property_id).filter(
+                PropertyContact.contact_id.in_(chunk)
+            ).order_by(func.coalesce(PropertyContact.is_primary, False).desc(), PropertyContact.id).all()
+            for contact_id, property_id in rows:
+                found.setdefault(contact_id, property_id)
+
+        return found
+
+    def find_associations_for_properties(self, property_ids: List[int]) -> List[PropertyContact]:
+        """Get the contact associations of several properties with chunked IN queries.
+
+        Args:
+            property_ids: Property IDs
+
+        Returns:
+            List of PropertyContact associations ordered by ID
+        """
+        associations = []
+        unique_ids = list(dict.fromkeys(property_ids))
+
+        for start in range(0, len(unique_ids), self.LOOKUP_CHUNK_SIZE):
+            chunk = unique_ids[start:start + self.LOOKUP_CHUNK_SIZE]
+            associations.extend(
+                self.session.query(PropertyContact).filter(
+                    PropertyContact.property_id.in_(chunk)
+                ).order_by(PropertyContact.id).all()
+            )
+
+        return associations
+
+    def create_associations(self, associations_data: List[Dict[str, Any]]) -> List[PropertyContact]:
+        """Create many property-contact associations in one flush.
+
+        Args:
+            associations_data: List of PropertyContact attribute dictionaries
+
+        Returns:
+            List of created PropertyContact associations
+        """
+        associations = [PropertyContact(**data) for data in associations_data]
+        self.session.add_all(associations)
+        self.session.flush()
+
+        logger.debug(f"Created {len(associations)} property-contact associations")
+        return associations
+
     def get_property_contacts(self, property_id: int) -> List[Contact]:
         """Get all contacts associated with a property.
         
@@ -842,3 +949,129 @@ class PropertyRepository(BaseRepository[Property]):
             relationship_type=db_relationship_type,
             is_primary=is_primary
         )
+    
+    # ====== SPATIAL SEARCH ======
+    
+    def _geohash_filter(self, bbox: BoundingBox):
+        """Coarse filter: geohash prefix ranges covering the box, then the box itself"""
+        min_lat, min_lng, max_lat, max_lng = bbox
+        cell_ranges = [
+            and_(Property.geohash >= cell, Property.geohash < cell + PREFIX_RANGE_END)
+            for cell in covering_cells(bbox)
+        ]
+        return and_(
+            or_(*cell_ranges),
+            Property.latitude.between(min_lat, max_lat),
+            Property.longitude.between(min_lng, max_lng)
+        )
+    
+    def _distances_within(self, latitude: float, longitude: float, miles: float) -> Tuple[np.ndarray, np.ndarray]:
+        """IDs and distances of properties within a radius, nearest first
+        
+        Only (id, latitude, longitude) is read for the candidates; exact
+        distances are computed in one vectorized pass.
+        """
+        bbox = radius_bbox(latitude, longitude, miles)
+        if not covering_cells(bbox):
+            return np.array([], dtype=int), np.array([], dtype=float)
+        
+        rows = self.session.query(Property.id, Property.latitude, Property.longitude).filter(
+            self._geohash_filter(bbox)
+        ).all()
+        if not rows:
+            return np.array([], dtype=int), np.array([], dtype=float)
+        
+        ids = np.array([row[0] for row in rows], dtype=int)
+        distances = haversine_miles(
+            latitude, longitude,
+            np.array([row[1] for row in rows], dtype=float),
+            np.array([row[2] for row in rows], dtype=float)
+        )
+        inside = distances <= miles
+        ids, distances = ids[inside], distances[inside]
+        order = np.argsort(distances, kind='stable')
+        return ids[order], distances[order]
+    
+    def _load_with_distances(self, ids: np.ndarray, distances: np.ndarray) -> List[Tuple[Property, float]]:
+        """Load properties for ranked IDs in chunks, keeping the ranking"""
+        id_list = ids.tolist()
+        by_id = {}
+        for i in range(0, len(id_list), self.LOOKUP_CHUNK_SIZE):
+            chunk = id_list[i:i + self.LOOKUP_CHUNK_SIZE]
+            for property_obj in self.session.query(Property).filter(Property.id.in_(chunk)):
+                by_id[property_obj.id] = property_obj
+        return [(by_id[property_id], float(distance))
+                for property_id, distance in zip(id_list, distances.tolist()) if property_id in by_id]
+    
+    def find_in_bbox(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float,
+                     limit: Optional[int] = None) -> List[Property]:
+        """Find properties inside a bounding box.
+        
+        Args:
+            min_lat: Southern edge in degrees
+            min_lng: Western edge in degrees
+            max_lat: Northern edge in degrees
+            max_lng: Eastern edge in degrees
+            limit: Maximum number of properties (optional)
+            
+        Returns:
+            List of Property instances inside the box, ordered by ID
+        """
+        bbox = clamp_bbox((min_lat, min_lng, max_lat, max_lng))
+        if not covering_cells(bbox):
+            return []
+        
+        query = self.session.query(Property).filter(self._geohash_filter(bbox)).order_by(Property.id)
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+    
+    def find_within_radius(self, latitude: float, longitude: float, miles: float,
+                           limit: Optional[int] = None) -> List[Tuple[Property, float]]:
+        """Find properties within a radius of a point.
+        
+        Args:
+            latitude: Center latitude in degrees
+            longitude: Center longitude in degrees
+            miles: Search radius in miles
+            limit: Maximum number of properties, nearest first (optional)
+            
+        Returns:
+            List of (Property, distance in miles) tuples, nearest first
+        """
+        if miles <= 0:
+            return []
+        
+        ids, distances = self._distances_within(latitude, longitude, miles)
+        if limit:
+            ids, distances = ids[:limit], distances[:limit]
+        return self._load_with_distances(ids, distances)
+    
+    def find_nearest(self, latitude: float, longitude: float, k: int = 10,
+                     max_miles: float = 50.0) -> List[Tuple[Property, float]]:
+        """Find the k properties nearest to a point.
+        
+        Searches a small radius first and widens it until k properties are
+        inside. Once they are, nothing outside the radius can be closer, so
+        the result is exact.
+        
+        Args:
+            latitude: Center latitude in degrees
+            longitude: Center longitude in degrees
+            k: Number of neighbours
+            max_miles: Largest radius to search
+            
+        Returns:
+            Up to k (Property, distance in miles) tuples, nearest first
+        """
+        if k <= 0 or max_miles <= 0:
+            return []
+        
+        radius = min(self.NEAREST_INITIAL_MILES, max_miles)
+        while True:
+            ids, distances = self._distances_within(latitude, longitude, radius)
+            if len(ids) >= k or radius >= max_miles:
+                break
+            radius = min(radius * 4, max_miles)
+        
+        return self._load_with_distances(ids[:k], distances[:k])
@@ -4,7 +4,7 @@ QuickBooksAuthRepository - Data access layer for QuickBooksAuth model
 
 from typing import Optional, Dict, Any, List
 from datetime import datetime
-from utils.datetime_utils import utc_now
+from utils.datetime_utils import utc_now, ensure_utc
 from sqlalchemy import or_
 from repositories.base_repository import BaseRepository
 from crm_database import QuickBooksAuth
@@ -111,7 +111,8 @@ class QuickBooksAuthRepository(BaseRepository):
         if not auth:
             return True  # Treat missing record as expired
         
-        return utc_now() >= auth.expires_at
+        # expires_at is stored naive UTC
+        return utc_now() >= ensure_utc(auth.expires_at)
     
     def delete_auth(self, auth_id: int) -> bool:
         """
@@ -2,12 +2,12 @@
 QuickBooksSyncRepository - Data access layer for QuickBooksSync model
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
-from utils.datetime_utils import utc_now
+from utils.datetime_utils import utc_now, ensure_utc
 from sqlalchemy import desc, or_, and_
 from repositories.base_repository import BaseRepository, PaginatedResult
-from crm_database import QuickBooksSync
+from crm_database import QuickBooksSync, QuickBooksSyncWatermark
 
 
 class QuickBooksSyncRepository(BaseRepository):
@@ -133,6 +133,87 @@ class QuickBooksSyncRepository(BaseRepository):
             self.session.commit()
         return sync_record
     
+    def record_syncs(self, entity_type: str, local_table: str,
+                     records: List[Tuple[str, int, Optional[str]]]) -> int:
+        """
+        Upsert sync records for a page of synced entities.
+        
+        Args:
+            entity_type: Type of entity (customer, item, invoice, estimate)
+            local_table: Local table the entities were written to
+            records: (QuickBooks entity ID, local ID, SyncToken) tuples
+            
+        Returns:
+            Number of sync records written
+        """
+        if not records:
+            return 0
+        
+        now = utc_now()
+        existing = {}
+        entity_ids = list(dict.fromkeys(entity_id for entity_id, _, _ in records))
+        for start in range(0, len(entity_ids), self.LOOKUP_CHUNK_SIZE):
+            chunk = entity_ids[start:start + self.LOOKUP_CHUNK_SIZE]
+            rows = self.session.query(self.model_class.entity_id, self.model_class.id)\
+                .filter(self.model_class.entity_type == entity_type, self.model_class.entity_id.in_(chunk))\
+                .all()
+            existing.update({row.entity_id: row.id for row in rows})
+        
+        latest = {entity_id: (local_id, sync_version) for entity_id, local_id, sync_version in records}
+        to_update = []
+        to_insert = []
+        for entity_id, (local_id, sync_version) in latest.items():
+            row = {
+                'local_id': local_id,
+                'local_table': local_table,
+                'sync_version': sync_version,
+                'last_synced': now,
+                'sync_status': 'synced',
+                'error_message': None
+            }
+            if entity_id in existing:
+                to_update.append({'id': existing[entity_id], **row})
+            else:
+                to_insert.append({'entity_type': entity_type, 'entity_id': entity_id, **row})
+        
+        self.bulk_update(to_update)
+        self.bulk_insert(to_insert)
+        return len(latest)
+    
+    def get_watermark(self, entity_type: str) -> Optional[datetime]:
+        """
+        Get the change-data-capture watermark for an entity type.
+        
+        Args:
+            entity_type: Type of entity (customer, item, invoice, estimate)
+            
+        Returns:
+            UTC datetime of the latest change already synced, or None before the first sync
+        """
+        watermark = self.session.query(QuickBooksSyncWatermark)\
+            .filter_by(entity_type=entity_type)\
+            .first()
+        return ensure_utc(watermark.last_updated_time) if watermark else None
+    
+    def set_watermark(self, entity_type: str, last_updated_time: datetime) -> None:
+        """
+        Store the change-data-capture watermark for an entity type.
+        
+        Args:
+            entity_type: Type of entity (customer, item, invoice, estimate)
+            last_updated_time: Latest MetaData.LastUpdatedTime that has been synced
+        """
+        # Stored as naive UTC like the other DateTime columns
+        value = ensure_utc(last_updated_time).replace(tzinfo=None)
+        watermark = self.session.query(QuickBooksSyncWatermark)\
+            .filter_by(entity_type=entity_type)\
+            .first()
+        if watermark:
+            watermark.last_updated_time = value
+        else:
+            self.session.add(QuickBooksSyncWatermark(entity_type=entity_type, last_updated_time=value))
+        self.session.flush()
+    
     def search(self, query: str) -> List:
         """
         Search sync records by entity ID or type.
@@ -60,6 +60,26 @@ class QuoteLineItemRepository(BaseRepository):
         
         return count
     
+    def delete_by_quote_ids(self, quote_ids: List[int]) -> int:
+        """
+        Delete all line items for several quotes with chunked bulk deletes.
+        
+        Args:
+            quote_ids: IDs of the quotes
+            
+        Returns:
+            Number of items deleted
+        """
+        unique_ids = list(dict.fromkeys(quote_ids))
+        count = 0
+        for start in range(0, len(unique_ids), self.LOOKUP_CHUNK_SIZE):
+            chunk = unique_ids[start:start + self.LOOKUP_CHUNK_SIZE]
+            count += self.session.query(QuoteLineItem)\
+                .filter(QuoteLineItem.quote_id.in_(chunk))\
+                .delete(synchronize_session=False)
+        self.session.flush()
+        return count
+    
     def calculate_line_total(self, line_item_data: Dict[str, Any]) -> float:
         """
         Calculate the total for a line item.
@@ -7,8 +7,9 @@ from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta, date
 from decimal import Decimal, InvalidOperation
 import decimal
-from sqlalchemy import func, and_, or_, desc, asc, case, text, extract
+from sqlalchemy import func, and_, or_, desc, asc, case, text, extract, bindparam, select
 from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.sql import Select
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from repositories.base_repository import BaseRepository, PaginationParams, PaginatedResult, SortOrder
 from crm_database import (
@@ -16,6 +17,7 @@ from crm_database import (
     Campaign, Contact, CampaignMembership, CampaignResponse,
     Activity, Invoice, Quote, ConversionEvent
 )
+from utils.database import read_only
 from utils.datetime_utils import utc_now, ensure_utc
 import logging
 import math
@@ -257,6 +259,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
     
     # ===== Customer Acquisition Cost (CAC) Calculations =====
     
+    @read_only
     def calculate_cac(self, campaign_id: int) -> Dict[str, Any]:
         """
         Calculate Customer Acquisition Cost for a campaign.
@@ -302,6 +305,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
             # Re-raise the exception for proper error handling in tests
             raise
     
+    @read_only
     def calculate_cac_by_channel(self, campaign_id: int) -> Dict[str, Dict[str, Any]]:
         """
         Calculate CAC by marketing channel.
@@ -346,6 +350,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
             logger.error(f"Error calculating CAC by channel: {e}")
             return {}
     
+    @read_only
     def get_cac_trends(self, campaign_id: int, period_days: int = 30) -> List[Dict[str, Any]]:
         """
         Get CAC trends over time.
@@ -396,6 +401,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
     
     # ===== Lifetime Value (LTV) Calculations =====
     
+    @read_only
     def calculate_ltv(self, contact_id: int) -> Dict[str, Any]:
         """
         Calculate Lifetime Value for a contact.
@@ -461,6 +467,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
         """
         return self.calculate_predicted_ltv(contact_id, prediction_days)
     
+    @read_only
     def calculate_predicted_ltv(self, contact_id: int, prediction_days: int = 365) -> Dict[str, Any]:
         """
         Calculate predicted LTV based on historical patterns.
@@ -544,6 +551,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
         """
         return self.calculate_ltv_cohort_analysis(cohort_month)
     
+    @read_only
     def calculate_ltv_cohort_analysis(self, cohort_month: str) -> List[Dict[str, Any]]:
         """
         Analyze LTV by customer cohorts.
@@ -597,6 +605,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
     
     # ===== Advanced ROI Metrics =====
     
+    @read_only
     def calculate_roi(self, campaign_id: int) -> Dict[str, Any]:
         """
         Calculate ROI for a campaign.
@@ -661,6 +670,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
                 'roi_percentage': 0.0
             }
     
+    @read_only
     def calculate_roas(self, campaign_id: int) -> Dict[str, Any]:
         """
         Calculate Return on Ad Spend (ROAS).
@@ -726,6 +736,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
                 'roas_percentage': 0.0
             }
     
+    @read_only
     def calculate_ltv_cac_ratio(self, campaign_id: int) -> Dict[str, Any]:
         """
         Calculate LTV:CAC ratio for a campaign.
@@ -803,6 +814,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
                 'ratio_quality': 'unknown'
             }
     
+    @read_only
     def calculate_payback_period(self, campaign_id: int) -> Dict[str, Any]:
         """
         Calculate payback period for a campaign.
@@ -870,6 +882,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
                 'break_even_achieved': False
             }
     
+    @read_only
     def calculate_break_even_analysis(self, campaign_id: int) -> Dict[str, Any]:
         """
         Perform break-even analysis for a campaign.
@@ -929,6 +942,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
                 'is_profitable': False
             }
     
+    @read_only
     def calculate_profit_margin_analysis(self, campaign_id: int) -> Dict[str, Any]:
         """
         Analyze profit margins for a campaign.
@@ -1007,6 +1021,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
         """
         return self.calculate_roi_forecast(campaign_id, forecast_days)
     
+    @read_only
     def calculate_roi_forecast(self, campaign_id: int, forecast_days: int = 30) -> Dict[str, Any]:
         """
         Calculate ROI forecast based on historical data.
@@ -1111,6 +1126,118 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
                 'trend_direction': 'stable'
             }
     
+    @read_only
+    def get_daily_revenue_cost_matrix(self, campaign_ids: List[int], since: date) -> List[Tuple[int, Any, Any, Any]]:
+        """
+        Get daily revenue and cost for many campaigns in a single query.
+        Feeds ROIForecastingService, which pivots the rows into a campaigns x days matrix.
+
+        Args:
+            campaign_ids: Campaign IDs to include
+            since: First day of the history window
+
+        Returns:
+            List of (campaign_id, date, daily_revenue, daily_cost) rows
+
+        Raises:
+            SQLAlchemyError: Query errors propagate so forecasts fail instead of reading as zero
+        """
+        if not campaign_ids:
+            return []
+
+        statement = text("""
+            SELECT campaign_id, day, SUM(daily_revenue), SUM(daily_cost)
+            FROM (
+                SELECT
+                    cm.campaign_id AS campaign_id,
+                    DATE(i.created_at) AS day,
+                    SUM(i.total_amount) AS daily_revenue,
+                    0 AS daily_cost
+                FROM campaign_membership cm
+                JOIN property_contact pc ON pc.contact_id = cm.contact_id AND pc.is_primary = :is_primary
+                JOIN job j ON j.property_id = pc.property_id
+                JOIN invoice i ON i.job_id = j.id
+                WHERE cm.campaign_id IN :campaign_ids
+                    AND i.created_at >= :since
+                GROUP BY cm.campaign_id, DATE(i.created_at)
+                UNION ALL
+                SELECT
+                    cc.campaign_id AS campaign_id,
+                    DATE(cc.cost_date) AS day,
+                    0 AS daily_revenue,
+                    SUM(cc.amount) AS daily_cost
+                FROM campaign_costs cc
+                WHERE cc.campaign_id IN :campaign_ids
+                    AND cc.cost_date >= :since
+                GROUP BY cc.campaign_id, DATE(cc.cost_date)
+            ) daily
+            GROUP BY campaign_id, day
+            ORDER BY campaign_id, day
+        """).bindparams(bindparam('campaign_ids', expanding=True))
+
+        return self.session.execute(
+            statement,
+            {'campaign_ids': list(campaign_ids), 'since': since, 'is_primary': True}
+        ).fetchall()
+
+    @read_only
+    def get_scenario_baselines(self, campaign_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get what-if baselines (budget, conversion rate, ROI) for many campaigns at once.
+
+        Args:
+            campaign_ids: Campaign IDs to include
+
+        Returns:
+            Dictionary keyed by campaign ID with current_budget, current_conversion_rate and current_roi
+
+        Raises:
+            SQLAlchemyError: Query errors propagate so what-if results fail instead of coming back empty
+        """
+        if not campaign_ids:
+            return {}
+
+        statement = text("""
+            SELECT
+                c.id,
+                COALESCE(costs.total_cost, 0) AS current_budget,
+                COALESCE(revenue.total_revenue, 0) AS total_revenue
+            FROM campaign c
+            LEFT JOIN (
+                SELECT campaign_id, SUM(amount) AS total_cost
+                FROM campaign_costs
+                WHERE campaign_id IN :campaign_ids
+                GROUP BY campaign_id
+            ) costs ON costs.campaign_id = c.id
+            LEFT JOIN (
+                SELECT cm.campaign_id, SUM(i.total_amount) AS total_revenue
+                FROM campaign_membership cm
+                JOIN property_contact pc ON pc.contact_id = cm.contact_id AND pc.is_primary = :is_primary
+                JOIN job j ON j.property_id = pc.property_id
+                JOIN invoice i ON i.job_id = j.id
+                WHERE cm.campaign_id IN :campaign_ids
+                GROUP BY cm.campaign_id
+            ) revenue ON revenue.campaign_id = c.id
+            WHERE c.id IN :campaign_ids
+        """).bindparams(bindparam('campaign_ids', expanding=True))
+
+        rows = self.session.execute(
+            statement,
+            {'campaign_ids': list(campaign_ids), 'is_primary': True}
+        ).fetchall()
+
+        baselines = {}
+        for campaign_id, budget, revenue in rows:
+            budget = Decimal(str(budget or 0))
+            revenue = Decimal(str(revenue or 0))
+            baselines[campaign_id] = {
+                'current_budget': budget,
+                'current_conversion_rate': 0.05,  # Same default estimate as what_if_scenario_analysis
+                'current_roi': (revenue - budget) / budget if budget > 0 else Decimal('0.00')
+            }
+        return baselines
+
+    @read_only
     def calculate_seasonal_adjustments(self, campaign_id: int, target_month: int = None) -> Dict[str, Any]:
         """
         Calculate seasonal ROI adjustments.
@@ -1176,6 +1303,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
                 'historical_monthly_factors': {}
             }
     
+    @read_only
     def calculate_confidence_intervals(self, campaign_id: int, confidence_level: float = 0.95) -> Dict[str, Any]:
         """
         Calculate confidence intervals for ROI predictions.
@@ -1249,6 +1377,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
                 'margin_of_error': Decimal('0.00')
             }
     
+    @read_only
     def what_if_scenario_analysis(self, campaign_id: int, scenarios: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
         """
         Perform what-if scenario analysis for ROI.
@@ -1337,6 +1466,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
     
     # ===== Comparative Analysis =====
     
+    @read_only
     def compare_campaign_roi(self, campaign_ids: List[int]) -> List[Dict[str, Any]]:
         """
         Compare ROI across multiple campaigns.
@@ -1368,6 +1498,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
         """
         return self.compare_roi_by_customer_segment(campaign_id)
     
+    @read_only
     def compare_roi_by_campaign_type(self) -> List[Dict[str, Any]]:
         """
         Compare ROI by campaign type.
@@ -1421,6 +1552,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
             logger.error(f"Error comparing ROI by campaign type: {e}")
             return []
     
+    @read_only
     def compare_roi_by_customer_segment(self, campaign_id: int) -> List[Dict[str, Any]]:
         """
         Compare ROI by customer segments for a campaign.
@@ -1477,6 +1609,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
             logger.error(f"Error comparing ROI by segment: {e}")
             return []
     
+    @read_only
     def compare_roi_by_channel(self, date_from: datetime = None, date_to: datetime = None) -> List[Dict[str, Any]]:
         """
         Compare ROI by marketing channel.
@@ -1537,6 +1670,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
             logger.error(f"Error comparing ROI by channel: {e}")
             return []
     
+    @read_only
     def ab_test_roi_comparison(self, campaign_id: int) -> Dict[str, Any]:
         """
         Compare ROI between A/B test variants.
@@ -1617,6 +1751,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
                 'statistical_significance': False
             }
     
+    @read_only
     def time_based_roi_comparison(self, campaign_id: int, time_grouping: str = 'week',
                                  date_from: datetime = None, date_to: datetime = None) -> Dict[str, Any]:
         """
@@ -1715,6 +1850,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
     
     # ===== ROI Optimization =====
     
+    @read_only
     def identify_underperforming_campaigns(self, roi_threshold: Decimal = Decimal('3.0')) -> List[Dict[str, Any]]:
         """
         Identify campaigns with ROI below threshold.
@@ -1794,6 +1930,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
         """
         return self.budget_allocation_recommendations(total_budget, campaign_ids)
     
+    @read_only
     def budget_allocation_recommendations(self, total_budget: Decimal, 
                                          campaign_ids: List[int] = None) -> Dict[str, Any]:
         """
@@ -1902,6 +2039,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
                 'expected_roi_improvement': Decimal('0.00')
             }
     
+    @read_only
     def suggest_optimization_strategies(self, campaign_id: int) -> Dict[str, Any]:
         """
         Suggest optimization strategies for a campaign.
@@ -2014,6 +2152,7 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
                 'optimization_strategies': []
             }
     
+    @read_only
     def performance_threshold_alerts(self, thresholds: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
         """
         Check campaigns against performance thresholds and generate alerts.
@@ -2106,4 +2245,71 @@ class ROIRepository(BaseRepository[ROIAnalysis]):
             
         except SQLAlchemyError as e:
             logger.error(f"Error checking performance thresholds: {e}")
-            return {'alerts': []}
\ No newline at end of file
+            return {'alerts': []}
+    
+    # ===== Export Queries =====
+    
+    def build_ltv_export_query(self, filters: Optional[Dict[str, Any]] = None, after_id: int = 0) -> Select:
+        """
+        Build the keyset-ordered column select for the customer LTV export.
+        
+        Args:
+            filters: Optional start_date/end_date (datetime, end exclusive)
+            after_id: Only include rows with an id greater than this
+            
+        Returns:
+            Select statement ordered by id, id selected first
+        """
+        filters = filters or {}
+        statement = select(
+            CustomerLifetimeValue.id,
+            CustomerLifetimeValue.contact_id,
+            CustomerLifetimeValue.calculation_date,
+            CustomerLifetimeValue.total_revenue,
+            CustomerLifetimeValue.total_purchases,
+            CustomerLifetimeValue.average_order_value,
+            CustomerLifetimeValue.predicted_ltv,
+            CustomerLifetimeValue.confidence_score,
+            CustomerLifetimeValue.cohort_month,
+            CustomerLifetimeValue.value_tier,
+            CustomerLifetimeValue.churn_probability
+        ).where(CustomerLifetimeValue.id > after_id)
+        
+        if filters.get('start_date'):
+            statement = statement.where(CustomerLifetimeValue.calculation_date >= filters['start_date'].date())
+        if filters.get('end_date'):
+            statement = statement.where(CustomerLifetimeValue.calculation_date < filters['end_date'].date())
+        
+        return statement.order_by(CustomerLifetimeValue.id)
+    
+    def build_cost_export_query(self, filters: Optional[Dict[str, Any]] = None, after_id: int = 0) -> Select:
+        """
+        Build the keyset-ordered column select for the campaign cost export.
+        
+        Args:
+            filters: Optional campaign_id and start_date/end_date (datetime, end exclusive)
+            after_id: Only include rows with an id greater than this
+            
+        Returns:
+            Select statement ordered by id, id selected first
+        """
+        filters = filters or {}
+        statement = select(
+            CampaignCost.id,
+            CampaignCost.campaign_id,
+            CampaignCost.cost_type,
+            CampaignCost.amount,
+            CampaignCost.currency,
+            CampaignCost.cost_date,
+            CampaignCost.is_shared,
+            CampaignCost.description
+        ).where(CampaignCost.id > after_id)
+        
+        if filters.get('campaign_id'):
+            statement = statement.where(CampaignCost.campaign_id == filters['campaign_id'])
+        if filters.get('start_date'):
+            statement = statement.where(CampaignCost.cost_date >= filters['start_date'].date())
+        if filters.get('end_date'):
+            statement = statement.where(CampaignCost.cost_date < filters['end_date'].date())
+        
+        return statement.order_by(CampaignCost.id)
@@ -0,0 +1,153 @@
+"""
+ScheduledNotificationRepository - Data access layer for ScheduledNotification model
+Idempotent queue of appointment reminders and review requests, one row per target and day
+"""
+
+from datetime import date
+from typing import List, Optional, Dict, Any
+from sqlalchemy import or_, update
+from repositories.base_repository import BaseRepository
+from crm_database import ScheduledNotification
+from utils.datetime_utils import utc_now
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledNotificationRepository(BaseRepository[ScheduledNotification]):
+    """Repository for ScheduledNotification data access"""
+
+    # Statuses a send task may still claim; 'sending' and 'sent' are never sent again
+    CLAIMABLE_STATUSES = ('pending', 'failed')
+
+    def __init__(self, session):
+        """Initialize repository with database session"""
+        super().__init__(session, ScheduledNotification)
+
+    def search(self, query: str, fields: Optional[List[str]] = None) -> List[ScheduledNotification]:
+        """
+        Search notifications by phone number or message text.
+
+        Args:
+            query: Text to search for
+            fields: Not used
+
+        Returns:
+            List of matching notifications
+        """
+        if not query:
+            return []
+        pattern = f"%{query}%"
+        return self.session.query(ScheduledNotification).filter(
+            or_(ScheduledNotification.phone.ilike(pattern), ScheduledNotification.message.ilike(pattern))
+        ).all()
+
+    def create_pending(self, kind: str, scheduled_for: date, rows: List[Dict[str, Any]]) -> List[int]:
+        """
+        Record notifications for a day, ignoring targets already recorded.
+
+        Args:
+            kind: 'appointment_reminder' or 'review_request'
+            scheduled_for: Day the notifications belong to
+            rows: Dictionaries with target_id, contact_id, phone and message
+
+        Returns:
+            IDs of the day's notifications for these targets that still need
+            sending, including ones recorded by an earlier run that never went out
+        """
+        if not rows:
+            return []
+
+        records = [{'kind': kind, 'scheduled_for': scheduled_for, 'status': 'pending', **row} for row in rows]
+
+        dialect = self.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            insert = None
+
+        target_ids = [row['target_id'] for row in rows]
+        for start in range(0, len(records), self.LOOKUP_CHUNK_SIZE):
+            chunk = records[start:start + self.LOOKUP_CHUNK_SIZE]
+            if insert is None:
+                self._insert_missing(kind, scheduled_for, chunk)
+                continue
+            statement = insert(ScheduledNotification).values(chunk).on_conflict_do_nothing(
+                index_elements=['kind', 'target_id', 'scheduled_for']
+            )
+            self.session.execute(statement)
+        self.session.commit()
+
+        ids = []
+        for start in range(0, len(target_ids), self.LOOKUP_CHUNK_SIZE):
+            chunk = target_ids[start:start + self.LOOKUP_CHUNK_SIZE]
+            ids.extend(
+                notification_id for (notification_id,) in self.session.query(ScheduledNotification.id).filter(
+                    ScheduledNotification.kind == kind,
+                    ScheduledNotification.scheduled_for == scheduled_for,
+                    ScheduledNotification.target_id.in_(chunk),
+                    ScheduledNotification.status.in_(self.CLAIMABLE_STATUSES)
+                ).order_by(ScheduledNotification.id)
+            )
+        return ids
+
+    def _insert_missing(self, kind: str, scheduled_for: date, records: List[Dict[str, Any]]) -> None:
+        """Insert records whose target is not yet recorded, for dialects without ON CONFLICT"""
+        existing = {
+            target_id for (target_id,) in self.session.query(ScheduledNotification.target_id).filter(
+                ScheduledNotification.kind == kind,
+                ScheduledNotification.scheduled_for == scheduled_for,
+                ScheduledNotification.target_id.in_([record['target_id'] for record in records])
+            )
+        }
+        missing = [record for record in records if record['target_id'] not in existing]
+        if missing:
+            self.session.bulk_insert_mappings(ScheduledNotification, missing)
+
+    def claim(self, notification_id: int) -> Optional[ScheduledNotification]:
+        """
+        Atomically mark a notification as being sent.
+
+        Only one caller can claim a notification, so duplicate send tasks for
+        the same target never both send.
+
+        Args:
+            notification_id: Notification to claim
+
+        Returns:
+            The claimed notification, or None if it was already sent or is being sent
+        """
+        result = self.session.execute(
+            update(ScheduledNotification)
+            .where(
+                ScheduledNotification.id == notification_id,
+                ScheduledNotification.status.in_(self.CLAIMABLE_STATUSES)
+            )
+            .values(status='sending', attempts=ScheduledNotification.attempts + 1, updated_at=utc_now())
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+        if result.rowcount != 1:
+            return None
+        notification = self.session.get(ScheduledNotification, notification_id)
+        self.session.refresh(notification)
+        return notification
+
+    def mark_sent(self, notification_id: int) -> None:
+        """Record that a claimed notification was sent"""
+        self._finish(notification_id, status='sent', sent_at=utc_now(), error_message=None)
+
+    def mark_failed(self, notification_id: int, error: str) -> None:
+        """Record that sending a claimed notification failed, so a retry can claim it again"""
+        self._finish(notification_id, status='failed', error_message=error)
+
+    def _finish(self, notification_id: int, **values) -> None:
+        self.session.execute(
+            update(ScheduledNotification)
+            .where(ScheduledNotification.id == notification_id)
+            .values(updated_at=utc_now(), **values)
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
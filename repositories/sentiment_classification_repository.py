@@ -0,0 +1,112 @@
+"""
+SentimentClassificationRepository - Data access layer for SentimentClassification model
+Persistent cache of sentiment/intent results keyed by normalized text hash
+"""
+
+from typing import List, Optional, Dict, Any
+from repositories.base_repository import BaseRepository
+from crm_database import SentimentClassification
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SentimentClassificationRepository(BaseRepository[SentimentClassification]):
+    """Repository for SentimentClassification data access"""
+
+    # Keep IN lists well below database parameter limits
+    LOOKUP_CHUNK_SIZE = 500
+
+    def __init__(self, session):
+        """Initialize repository with database session"""
+        super().__init__(session, SentimentClassification)
+
+    def search(self, query: str, fields: Optional[List[str]] = None) -> List[SentimentClassification]:
+        """
+        Search cached classifications by sentiment or intent.
+
+        Args:
+            query: Sentiment or intent value
+            fields: Not used
+
+        Returns:
+            List of matching classifications
+        """
+        if not query:
+            return []
+        return self.session.query(SentimentClassification).filter(
+            (SentimentClassification.sentiment == query) | (SentimentClassification.intent == query)
+        ).all()
+
+    def find_by_hashes(self, text_hashes: List[str], model_version: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up cached classifications for a set of text hashes.
+
+        Args:
+            text_hashes: SHA-256 hashes of normalized texts
+            model_version: Version of the model the results must come from
+
+        Returns:
+            Dictionary mapping text hash to classification dict
+        """
+        found = {}
+        unique_hashes = list(dict.fromkeys(text_hashes))
+
+        for start in range(0, len(unique_hashes), self.LOOKUP_CHUNK_SIZE):
+            chunk = unique_hashes[start:start + self.LOOKUP_CHUNK_SIZE]
+            rows = self.session.query(SentimentClassification).filter(
+                SentimentClassification.model_version == model_version,
+                SentimentClassification.text_hash.in_(chunk)
+            ).all()
+            for row in rows:
+                found[row.text_hash] = row.to_dict()
+
+        return found
+
+    def save_classifications(self, classifications: Dict[str, Dict[str, Any]], model_version: str) -> int:
+        """
+        Store classifications, ignoring hashes another worker stored first.
+
+        Args:
+            classifications: Dictionary mapping text hash to classification dict
+            model_version: Version of the model that produced the results
+
+        Returns:
+            Number of classifications submitted
+        """
+        if not classifications:
+            return 0
+
+        rows = [
+            {
+                'text_hash': text_hash,
+                'model_version': model_version,
+                'sentiment': data['sentiment'],
+                'intent': data.get('intent'),
+                'confidence': data.get('confidence'),
+                'urgency': data.get('urgency'),
+                'keywords': data.get('keywords')
+            }
+            for text_hash, data in classifications.items()
+        ]
+
+        dialect = self.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            insert = None
+
+        for start in range(0, len(rows), self.LOOKUP_CHUNK_SIZE):
+            chunk = rows[start:start + self.LOOKUP_CHUNK_SIZE]
+            if insert is None:
+                self.session.bulk_insert_mappings(SentimentClassification, chunk)
+                continue
+            statement = insert(SentimentClassification).values(chunk).on_conflict_do_nothing(
+                index_elements=['text_hash', 'model_version']
+            )
+            self.session.execute(statement)
+
+        self.session.commit()
+        return len(rows)
@@ -7,15 +7,52 @@ from datetime import datetime
 from utils.datetime_utils import utc_now
 from sqlalchemy import desc, or_, and_
 from repositories.base_repository import BaseRepository, PaginatedResult
+from repositories.partition_archive_repository import PartitionArchiveRepository
 from crm_database import WebhookEvent
 
 
 class WebhookEventRepository(BaseRepository):
     """Repository for WebhookEvent data access"""
     
-    def __init__(self, session):
-        """Initialize repository with database session"""
+    def __init__(self, session, archive_repository: Optional[PartitionArchiveRepository] = None):
+        """
+        Initialize repository with database session.
+        
+        Args:
+            session: Database session
+            archive_repository: Cold storage for months archived out of the table
+        """
         super().__init__(session, WebhookEvent)
+        self.archive_repository = archive_repository or PartitionArchiveRepository(session)
+    
+    def find_by_date_range(self, start: datetime, end: Optional[datetime] = None,
+                           include_archived: bool = False, **filters) -> List:
+        """
+        Find webhook events created in [start, end), optionally including archived months.
+        
+        Archived webhook events are returned as transient WebhookEvent objects that are not
+        attached to the session.
+        
+        Args:
+            start: Earliest created_at
+            end: created_at upper bound, exclusive (None for no upper bound)
+            include_archived: Also read months moved to the archive
+            **filters: Column values to match, e.g. contact_id=1
+            
+        Returns:
+            List of WebhookEvent objects ordered by created_at
+        """
+        query = self.session.query(self.model_class).filter(self.model_class.created_at >= start)
+        if end is not None:
+            query = query.filter(self.model_class.created_at < end)
+        if filters:
+            query = query.filter_by(**filters)
+        results = query.order_by(self.model_class.created_at).all()
+        
+        if include_archived:
+            archived = self.archive_repository.find_archived(self.model_class, start, end, **filters)
+            results = sorted(archived + results, key=lambda row: row.created_at)
+        return results
     
     def find_by_event_id(self, event_id: str) -> Optional:
         """
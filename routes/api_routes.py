@@ -3,7 +3,7 @@ import hashlib
 import base64
 import os
 from functools import wraps
-from flask import Blueprint, jsonify, request, current_app, abort
+from flask import Blueprint, jsonify, request, current_app, abort, Response, send_file, stream_with_context
 from auth_utils import login_required
 
 api_bp = Blueprint('api', __name__)
@@ -42,6 +42,14 @@ def redis_health():
     return jsonify(diagnostics), status_code
 
 
+@api_bp.route('/health/queries')
+@login_required
+def query_statistics():
+    """SQL query counts, DB time and probable N+1 queries per endpoint and task"""
+    diagnostics_service = current_app.services.get('diagnostics')
+    return jsonify(diagnostics_service.get_query_statistics())
+
+
 def verify_openphone_signature(f):
     """Decorator to verify webhook signature."""
     @wraps(f)
@@ -185,6 +193,78 @@ def task_status(task_id):
             'error': str(e)
         }), 500
 
+@api_bp.route('/exports/<dataset>.<fmt>')
+@login_required
+def stream_export(dataset, fmt):
+    """Stream an analytics export as CSV or NDJSON without buffering it in memory"""
+    export_service = current_app.services.get('export')
+    filters = {key: request.args.get(key) for key in ('campaign_id', 'start_date', 'end_date')}
+    
+    result = export_service.stream_export(dataset, fmt, filters)
+    if result.is_failure:
+        return jsonify({'error': result.error}), 400
+    
+    response = Response(stream_with_context(result.data), mimetype=export_service.FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename={dataset}.{fmt}'
+    return response
+
+@api_bp.route('/exports/jobs', methods=['POST'])
+@login_required
+def create_export_job():
+    """Create and queue a background export job"""
+    from auth_utils import current_user
+    export_service = current_app.services.get('export')
+    data = request.get_json() or {}
+    
+    result = export_service.create_export_job(
+        data.get('dataset'),
+        data.get('format', 'csv'),
+        data.get('filters'),
+        created_by=current_user.id if current_user.is_authenticated else None
+    )
+    if result.is_failure:
+        return jsonify({'error': result.error}), 400
+    
+    queued = export_service.queue_export_job(result.data['id'])
+    if queued.is_failure:
+        return jsonify({'error': queued.error, 'job': result.data}), 500
+    return jsonify(queued.data), 202
+
+@api_bp.route('/exports/jobs/<int:job_id>')
+@login_required
+def export_job_status(job_id):
+    """Get progress of a background export job"""
+    export_service = current_app.services.get('export')
+    result = export_service.get_export_job(job_id)
+    if result.is_failure:
+        return jsonify({'error': result.error}), 404
+    return jsonify(result.data)
+
+@api_bp.route('/exports/jobs/<int:job_id>/resume', methods=['POST'])
+@login_required
+def resume_export_job(job_id):
+    """Re-queue an interrupted export job from its last checkpoint"""
+    export_service = current_app.services.get('export')
+    result = export_service.queue_export_job(job_id)
+    if result.is_failure:
+        status = {'EXPORT_JOB_NOT_FOUND': 404, 'EXPORT_JOB_RUNNING': 409}.get(result.error_code, 500)
+        return jsonify({'error': result.error}), status
+    return jsonify(result.data), 202
+
+@api_bp.route('/exports/jobs/<int:job_id>/download')
+@login_required
+def download_export_job(job_id):
+    """Download the file of a completed export job"""
+    export_service = current_app.services.get('export')
+    result = export_service.get_export_file(job_id)
+    if result.is_failure:
+        status = 404 if result.error_code == 'EXPORT_JOB_NOT_FOUND' else 409
+        return jsonify({'error': result.error}), status
+    
+    file_path, mimetype = result.data
+    return send_file(file_path, mimetype=mimetype, as_attachment=True,
+                     download_name=os.path.basename(file_path))
+
 @api_bp.route('/webhooks/openphone', methods=['POST'])
 @verify_openphone_signature
 def openphone_webhook():
@@ -43,13 +43,11 @@ def new_campaign():
     campaign_lists = []
     lists_result = list_service.get_all_lists()
     if lists_result.is_success and lists_result.data:
+        stats_result = list_service.get_all_list_stats()
+        all_stats = stats_result.data if stats_result.is_success else {}
         for lst in lists_result.data:
-            stats_result = list_service.get_list_stats(lst.id)
-            if stats_result.is_success:
-                # Add active members count as a property for the template
-                lst.active_members_count = stats_result.data.get('active_members', 0)
-            else:
-                lst.active_members_count = 0
+            # Add active members count as a property for the template
+            lst.active_members_count = all_stats.get(lst.id, {}).get('active_members', 0)
             campaign_lists.append(lst)
     
     return render_template('campaigns/new.html', 
@@ -281,17 +279,15 @@ def campaign_lists():
     else:
         lists = lists_result.data if lists_result.data else []
     
-    # Get stats for each list
+    # Get stats for all lists in one query
+    stats_result = list_service.get_all_list_stats()
+    all_stats = stats_result.data if stats_result.is_success else {}
+    empty_stats = {'active_members': 0, 'removed_members': 0, 'total_members': 0}
     list_data = []
     for lst in lists:
-        stats_result = list_service.get_list_stats(lst.id)
-        if stats_result.is_success:
-            stats = stats_result.data
-        else:
-            stats = {'active_members': 0, 'removed_members': 0, 'total_members': 0}
         list_data.append({
             "list": lst,
-            "stats": stats
+            "stats": all_stats.get(lst.id, empty_stats)
         })
     
     # Get recent imports if csv_service is available
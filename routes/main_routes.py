@@ -30,12 +30,13 @@ def dashboard():
     
     # Get services from registry
     dashboard_service = current_app.services.get('dashboard')
+    dashboard_snapshot_service = current_app.services.get('dashboard_snapshot')
     appointment_service = current_app.services.get('appointment')
     campaign_service = current_app.services.get('campaign')
     todo_service = current_app.services.get('todo')
     
-    # Get all dashboard statistics from service
-    stats = dashboard_service.get_dashboard_stats()
+    # Get all dashboard statistics from the precomputed snapshot
+    stats = dashboard_snapshot_service.get_snapshot()
     
     # Get activity timeline from service
     timeline_items = dashboard_service.get_activity_timeline(limit=20)
@@ -117,7 +117,7 @@ def quickbooks_sync():
             flash(f'Sync completed: {results}', 'success')
         elif sync_type == 'customers':
             results = sync_service.sync_customers()
-            flash(f'Customer sync completed: {results["updated"]} updated, {results["errors"]} errors', 'success')
+            flash(f'Customer sync completed: {results["created"]} created, {results["updated"]} updated, {results["errors"]} errors', 'success')
         elif sync_type == 'items':
             results = sync_service.sync_items()
             flash(f'Item sync completed: {results["created"]} created, {results["updated"]} updated', 'success')
@@ -16,7 +16,7 @@ import re
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from collections import defaultdict
 
 
@@ -126,6 +126,16 @@ class UniversalCSVEnricher:
         }
     }
     
+    # Enrichment fields merged into contact_metadata
+    METADATA_FIELDS = ['company', 'title', 'location', 'city',
+                       'property_address', 'property_city', 'property_zip',
+                       'mail_address', 'mail_city', 'mail_state', 'mail_zip',
+                       'est_value', 'est_equity', 'owner_occupied', 'role']
+    
+    # Phones and emails per IN query, and contacts per UPDATE batch
+    LOOKUP_CHUNK_SIZE = 500
+    UPDATE_BATCH_SIZE = 1000
+    
     def __init__(self):
         self.enrichment_data = defaultdict(dict)
         self.stats = {
@@ -338,118 +348,237 @@ class UniversalCSVEnricher:
         
         logger.info(f"Saved enrichment data to {output_file}")
     
-    def apply_enrichment_to_database(self, dry_run: bool = True):
-        """Apply enrichment data to existing contacts in the database"""
+    def apply_enrichment_to_database(self, dry_run: bool = True, session=None):
+        """
+        Apply enrichment data to existing contacts in the database.
+        
+        Contacts and conflicting emails are loaded with chunked IN queries,
+        updates are computed in memory and written in bulk batches.
+        
+        Args:
+            dry_run: Only count what would change
+            session: Session to use; by default an app is created and db.session is used
+            
+        Returns:
+            Dictionary of enrichment statistics
+        """
+        if session is not None:
+            return self._apply_enrichment(session, dry_run)
+        
         from app import create_app
-        from crm_database import Contact
         from extensions import db
         
         app = create_app()
         
         with app.app_context():
-            logger.info(f"\n=== Applying Enrichment to Database ===")
-            logger.info(f"Mode: {'DRY RUN' if dry_run else 'LIVE UPDATE'}")
+            return self._apply_enrichment(db.session, dry_run)
+    
+    def _apply_enrichment(self, session, dry_run: bool) -> Dict[str, int]:
+        logger.info(f"\n=== Applying Enrichment to Database ===")
+        logger.info(f"Mode: {'DRY RUN' if dry_run else 'LIVE UPDATE'}")
+        
+        contacts = self._load_contacts_by_phone(session, list(self.enrichment_data))
+        candidate_emails = [
+            enrichment['email'] for phone, enrichment in self.enrichment_data.items()
+            if enrichment.get('email') and phone in contacts and not contacts[phone]['email']
+        ]
+        taken_emails = self._load_taken_emails(session, candidate_emails)
+        
+        # A live run's own email assignments block later duplicates, as they did when each
+        # assignment was flushed before the next duplicate check; a dry run assigns nothing
+        updates, stats = self.compute_enrichment_updates(contacts, taken_emails, claim_emails=not dry_run)
+        
+        if not dry_run:
+            for start in range(0, len(updates), self.UPDATE_BATCH_SIZE):
+                self._write_updates(session, updates[start:start + self.UPDATE_BATCH_SIZE])
+                session.commit()
+                logger.info(f"Committed {min(start + self.UPDATE_BATCH_SIZE, len(updates))} updates...")
+        
+        logger.info(f"\n=== Enrichment Results ===")
+        logger.info(f"Contacts found in database: {stats['contacts_found']}")
+        logger.info(f"Contacts updated: {stats['contacts_updated']}")
+        logger.info(f"First names updated: {stats['first_names_updated']}")
+        logger.info(f"Last names updated: {stats['last_names_updated']}")
+        logger.info(f"Emails added: {stats['emails_updated']}")
+        logger.info(f"Metadata updated: {stats['metadata_updated']}")
+        
+        # Show sample of what would be updated
+        if dry_run and stats['contacts_updated'] > 0:
+            logger.info(f"\n=== Sample Updates (First 5) ===")
+            count = 0
+            for phone, enrichment in self.enrichment_data.items():
+                if count >= 5:
+                    break
+                contact = contacts.get(phone)
+                if contact and (not contact['first_name'] or '+1' in contact['first_name']):
+                    logger.info(f"Phone: {phone}")
+                    logger.info(f"  Current: {contact['first_name']} {contact['last_name']}")
+                    logger.info(f"  Would update to: {enrichment.get('first_name', '')} {enrichment.get('last_name', '')}")
+                    if enrichment.get('company'):
+                        logger.info(f"  Company: {enrichment['company']}")
+                    count += 1
+        
+        return stats
+    
+    def compute_enrichment_updates(self, contacts: Dict[str, Dict], taken_emails: Set[str],
+                                   claim_emails: bool = True) -> Tuple[List[Dict], Dict[str, int]]:
+        """
+        Work out field updates for matched contacts, only filling in missing data.
+        
+        First names are replaced when missing or holding a phone number, last
+        names and emails only when missing, and emails only when no other
+        contact uses them. Metadata fields are merged into contact_metadata.
+        
+        Args:
+            contacts: Contact rows (id, names, email, contact_metadata) keyed by phone
+            taken_emails: Emails already used by contacts; updated in place when claim_emails
+            claim_emails: Treat emails assigned here as taken for later contacts
             
-            stats = {
-                'contacts_found': 0,
-                'contacts_updated': 0,
-                'first_names_updated': 0,
-                'last_names_updated': 0,
-                'emails_updated': 0,
-                'metadata_updated': 0
-            }
+        Returns:
+            Tuple of (update rows with 'id' and changed fields, statistics); an
+            update's contact_metadata holds only the keys to merge
+        """
+        stats = {
+            'contacts_found': 0,
+            'contacts_updated': 0,
+            'first_names_updated': 0,
+            'last_names_updated': 0,
+            'emails_updated': 0,
+            'metadata_updated': 0
+        }
+        updates = []
+        
+        for phone, enrichment in self.enrichment_data.items():
+            contact = contacts.get(phone)
+            if not contact:
+                continue
+            stats['contacts_found'] += 1
+            update = {}
             
-            # Process each phone number in enrichment data
-            for phone, enrichment in self.enrichment_data.items():
-                # Find contact by phone
-                contact = Contact.query.filter_by(phone=phone).first()
-                
-                if contact:
-                    stats['contacts_found'] += 1
-                    updated = False
-                    
-                    # Update first name if missing or is phone number
-                    if enrichment.get('first_name'):
-                        if not contact.first_name or '+1' in contact.first_name:
-                            if not dry_run:
-                                contact.first_name = enrichment['first_name'][:50]
-                            stats['first_names_updated'] += 1
-                            updated = True
-                    
-                    # Update last name if missing
-                    if enrichment.get('last_name'):
-                        if not contact.last_name:
-                            if not dry_run:
-                                contact.last_name = enrichment['last_name'][:50]
-                            stats['last_names_updated'] += 1
-                            updated = True
-                    
-                    # Update email if missing
-                    if enrichment.get('email'):
-                        if not contact.email:
-                            # Check for duplicate email
-                            existing = Contact.query.filter_by(email=enrichment['email']).first()
-                            if not existing:
-                                if not dry_run:
-                                    contact.email = enrichment['email']
-                                stats['emails_updated'] += 1
-                                updated = True
-                    
-                    # Add metadata
-                    metadata_fields = ['company', 'title', 'location', 'city', 
-                                     'property_address', 'property_city', 'property_zip',
-                                     'mail_address', 'mail_city', 'mail_state', 'mail_zip',
-                                     'est_value', 'est_equity', 'owner_occupied', 'role']
-                    
-                    metadata_to_add = {}
-                    for field in metadata_fields:
-                        if field in enrichment:
-                            metadata_to_add[field] = enrichment[field]
-                    
-                    if metadata_to_add:
-                        if not dry_run:
-                            if contact.contact_metadata:
-                                contact.contact_metadata.update(metadata_to_add)
-                            else:
-                                contact.contact_metadata = metadata_to_add
-                        stats['metadata_updated'] += 1
-                        updated = True
-                    
-                    if updated:
-                        stats['contacts_updated'] += 1
-                        
-                        if not dry_run and stats['contacts_updated'] % 100 == 0:
-                            db.session.commit()
-                            logger.info(f"Committed {stats['contacts_updated']} updates...")
+            # Update first name if missing or is phone number
+            if enrichment.get('first_name'):
+                if not contact['first_name'] or '+1' in contact['first_name']:
+                    update['first_name'] = enrichment['first_name'][:50]
+                    stats['first_names_updated'] += 1
             
-            if not dry_run:
-                db.session.commit()
+            # Update last name if missing
+            if enrichment.get('last_name') and not contact['last_name']:
+                update['last_name'] = enrichment['last_name'][:50]
+                stats['last_names_updated'] += 1
             
-            logger.info(f"\n=== Enrichment Results ===")
-            logger.info(f"Contacts found in database: {stats['contacts_found']}")
-            logger.info(f"Contacts updated: {stats['contacts_updated']}")
-            logger.info(f"First names updated: {stats['first_names_updated']}")
-            logger.info(f"Last names updated: {stats['last_names_updated']}")
-            logger.info(f"Emails added: {stats['emails_updated']}")
-            logger.info(f"Metadata updated: {stats['metadata_updated']}")
+            # Update email if missing and not used by another contact
+            email = enrichment.get('email')
+            if email and not contact['email'] and email not in taken_emails:
+                update['email'] = email
+                stats['emails_updated'] += 1
+                if claim_emails:
+                    taken_emails.add(email)
             
-            # Show sample of what would be updated
-            if dry_run and stats['contacts_updated'] > 0:
-                logger.info(f"\n=== Sample Updates (First 5) ===")
-                count = 0
-                for phone, enrichment in self.enrichment_data.items():
-                    if count >= 5:
-                        break
-                    contact = Contact.query.filter_by(phone=phone).first()
-                    if contact and (not contact.first_name or '+1' in contact.first_name):
-                        logger.info(f"Phone: {phone}")
-                        logger.info(f"  Current: {contact.first_name} {contact.last_name}")
-                        logger.info(f"  Would update to: {enrichment.get('first_name', '')} {enrichment.get('last_name', '')}")
-                        if enrichment.get('company'):
-                            logger.info(f"  Company: {enrichment['company']}")
-                        count += 1
+            metadata_to_add = {field: enrichment[field] for field in self.METADATA_FIELDS if field in enrichment}
+            if metadata_to_add:
+                update['contact_metadata'] = metadata_to_add
+                stats['metadata_updated'] += 1
             
-            return stats
+            if update:
+                stats['contacts_updated'] += 1
+                updates.append({'id': contact['id'], **update})
+        
+        return updates, stats
+    
+    def _load_contacts_by_phone(self, session, phones: List[str]) -> Dict[str, Dict]:
+        """Load the columns enrichment reads for contacts with these phones"""
+        from sqlalchemy import select
+        from crm_database import Contact
+        
+        contacts = {}
+        for start in range(0, len(phones), self.LOOKUP_CHUNK_SIZE):
+            chunk = phones[start:start + self.LOOKUP_CHUNK_SIZE]
+            rows = session.execute(
+                select(Contact.id, Contact.phone, Contact.first_name, Contact.last_name,
+                       Contact.email, Contact.contact_metadata)
+                .where(Contact.phone.in_(chunk))
+            ).mappings()
+            for row in rows:
+                contacts[row['phone']] = dict(row)
+        return contacts
+    
+    def _load_taken_emails(self, session, emails: List[str]) -> Set[str]:
+        """Emails from the list that some contact already uses"""
+        from sqlalchemy import select
+        from crm_database import Contact
+        
+        unique_emails = list(dict.fromkeys(emails))
+        taken = set()
+        for start in range(0, len(unique_emails), self.LOOKUP_CHUNK_SIZE):
+            chunk = unique_emails[start:start + self.LOOKUP_CHUNK_SIZE]
+            taken.update(session.execute(select(Contact.email).where(Contact.email.in_(chunk))).scalars())
+        return taken
+    
+    def _write_updates(self, session, updates: List[Dict]) -> None:
+        """
+        Write one batch of updates.
+        
+        PostgreSQL gets a single UPDATE ... FROM (VALUES ...) that merges
+        metadata in the database; other databases get bulk_update_mappings with
+        metadata merged against the values loaded for the run.
+        """
+        from crm_database import Contact
+        
+        if session.get_bind().dialect.name == 'postgresql':
+            self._write_updates_from_values(session, updates)
+            return
+        
+        current_metadata = self._current_metadata(session, [update['id'] for update in updates])
+        mappings = []
+        for update in updates:
+            mapping = dict(update)
+            if 'contact_metadata' in mapping:
+                existing = current_metadata.get(update['id'])
+                mapping['contact_metadata'] = {**(existing if isinstance(existing, dict) else {}),
+                                               **mapping['contact_metadata']}
+            mappings.append(mapping)
+        session.bulk_update_mappings(Contact, mappings)
+    
+    def _current_metadata(self, session, contact_ids: List[int]) -> Dict[int, Optional[Dict]]:
+        from sqlalchemy import select
+        from crm_database import Contact
+        
+        return dict(session.execute(
+            select(Contact.id, Contact.contact_metadata).where(Contact.id.in_(contact_ids))
+        ).all())
+    
+    def _write_updates_from_values(self, session, updates: List[Dict]) -> None:
+        from sqlalchemy import Integer, JSON, String, Text, case, cast, column, func, literal, update, values
+        from sqlalchemy.dialects.postgresql import JSONB
+        from crm_database import Contact
+        
+        enrichment = values(
+            column('id', Integer), column('first_name', String), column('last_name', String),
+            column('email', String), column('metadata', Text),
+            name='enrichment'
+        ).data([
+            (
+                row['id'], row.get('first_name'), row.get('last_name'), row.get('email'),
+                json.dumps(row['contact_metadata']) if 'contact_metadata' in row else None
+            )
+            for row in updates
+        ])
+        
+        existing = cast(Contact.contact_metadata, JSONB)
+        existing_object = case((func.jsonb_typeof(existing) == 'object', existing), else_=cast(literal('{}'), JSONB))
+        merged = cast(existing_object.op('||')(cast(enrichment.c.metadata, JSONB)), JSON)
+        
+        session.execute(
+            update(Contact)
+            .where(Contact.id == enrichment.c.id)
+            .values(
+                first_name=func.coalesce(enrichment.c.first_name, Contact.first_name),
+                last_name=func.coalesce(enrichment.c.last_name, Contact.last_name),
+                email=func.coalesce(enrichment.c.email, Contact.email),
+                contact_metadata=case((enrichment.c.metadata.is_(None), Contact.contact_metadata), else_=merged)
+            )
+            .execution_options(synchronize_session=False)
+        )
 
 
 def main():
@@ -0,0 +1,138 @@
+"""
+Benchmark the memoized import normalizers over a synthetic PropertyRadar export.
+
+Times the per-row service calls an import makes with cold and warm caches and
+the normalize_column batch API, then prints per-normalizer cache statistics.
+To compare against an older implementation, run the same script from a
+checkout of that revision.
+
+Runs on generated data, no database required:
+
+    python scripts/dev_tools/benchmark_normalization.py --rows 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from utils import normalization  # noqa: E402
+
+FIRST_NAMES = [
+    'JOHN', 'MARY', 'JAMES', 'PATRICIA', 'ROBERT', 'JENNIFER', 'MICHAEL', 'LINDA', 'WILLIAM', 'ELIZABETH',
+    'DAVID', 'BARBARA', 'RICHARD', 'SUSAN', 'JOSEPH', 'JESSICA', 'THOMAS', 'SARAH', 'MARY JANE', 'JEAN-PAUL',
+    'Anne', 'michael', 'J', "D'ANGELO", 'JO ANN',
+]
+LAST_NAMES = [
+    'SMITH', 'JOHNSON', 'WILLIAMS', 'BROWN', 'JONES', 'GARCIA', 'MILLER', 'DAVIS', 'RODRIGUEZ', 'MARTINEZ',
+    "O'BRIEN", 'MCDONALD', 'MACARTHUR', 'MACK', 'SMITH-JONES', "O'NEIL-KELLY", 'VAN DER BERG', 'McCain',
+]
+NAME_SUFFIXES = ['', '', '', '', 'JR', 'SR.', 'III', 'IV', 'Jr.']
+DIRECTIONALS = ['', '', '', 'N', 'NORTH', 'SOUTHWEST', 'E', 'nw']
+STREET_NAMES = [
+    'MAIN', 'OAK', 'PINE', 'MAPLE', 'CEDAR', 'ELM', 'WASHINGTON', 'LAKE', 'HILL', 'PARK',
+    'MIDDLE', 'SUMMER', 'HIGHLAND', 'CHURCH', 'MILL', 'PLEASANT', 'SCHOOL', 'WINTER', 'FRANKLIN', 'HANCOCK',
+]
+STREET_SUFFIXES = ['ST', 'STREET', 'AVE', 'AVENUE', 'RD', 'ROAD', 'DR', 'LN', 'BLVD', 'CIR', 'CT', 'PL', 'WAY', 'TER']
+UNITS = ['', '', '', '', 'APT 4B', '#12', 'UNIT 3', 'SUITE 100', 'APARTMENT 2']
+CITIES = [
+    'BRAINTREE', 'QUINCY', 'WEYMOUTH', 'BOSTON', 'MILTON', 'HINGHAM', 'RANDOLPH', 'HOLBROOK', 'NORWOOD',
+    'WEST ROXBURY', 'SOUTH BOSTON', 'EAST BRIDGEWATER', 'WINSTON-SALEM', 'st. louis', 'San Francisco',
+    'new york', 'MANCHESTER-BY-THE-SEA', 'NORTH  ATTLEBOROUGH', '',
+]
+PHONE_FORMATS = [
+    '{a}-{b}-{c}', '({a}) {b}-{c}', '{a}.{b}.{c}', '1-{a}-{b}-{c}', '+1 {a} {b} {c}', '{a}{b}{c}',
+    '{b}-{c}', '', 'INVALID_PHONE', '000-000-0000', '111-111-1111', '+44 20 7946 0958',
+]
+
+
+def _name(rng):
+    parts = [rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(NAME_SUFFIXES)]
+    spacing = rng.choice([' ', ' ', '  '])
+    return spacing.join(part for part in parts if part)
+
+
+def _phone(rng):
+    return rng.choice(PHONE_FORMATS).format(
+        a=rng.randint(200, 999), b=f'{rng.randint(0, 999):03d}', c=f'{rng.randint(0, 9999):04d}'
+    )
+
+
+def _address(rng):
+    if rng.random() < 0.02:
+        return rng.choice(['PO BOX {n}', 'P.O. BOX {n}', 'POST OFFICE BOX {n}']).format(n=rng.randint(1, 9999))
+    parts = [str(rng.randint(1, 9999)), rng.choice(DIRECTIONALS), rng.choice(STREET_NAMES),
+             rng.choice(STREET_SUFFIXES), rng.choice(UNITS)]
+    return ' '.join(part for part in parts if part)
+
+
+def generate_propertyradar_rows(count, seed=42):
+    """Synthetic PropertyRadar rows with the repetition of a real export"""
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        rows.append({
+            'Address': _address(rng),
+            'City': rng.choice(CITIES),
+            'Primary Name': _name(rng),
+            'Primary Mobile Phone1': _phone(rng),
+            'Secondary Name': _name(rng) if rng.random() < 0.6 else '',
+            'Secondary Mobile Phone1': _phone(rng),
+        })
+    return rows
+
+
+def _per_row(service, rows):
+    for row in rows:
+        service.normalize_address(row['Address'])
+        service.normalize_city(row['City'])
+        for column in ('Primary Name', 'Secondary Name'):
+            service.parse_name(service.normalize_name(row[column]))
+        for column in ('Primary Mobile Phone1', 'Secondary Mobile Phone1'):
+            service.normalize_phone(row[column])
+
+
+def _by_column(rows):
+    normalization.normalize_column([row['Address'] for row in rows], normalization.normalize_address)
+    normalization.normalize_column([row['City'] for row in rows], normalization.normalize_city)
+    for column in ('Primary Name', 'Secondary Name'):
+        names = normalization.normalize_column([row[column] for row in rows], normalization.normalize_name)
+        normalization.normalize_column(names, normalization.parse_name)
+    for column in ('Primary Mobile Phone1', 'Secondary Mobile Phone1'):
+        normalization.normalize_column([row[column] for row in rows], normalization.normalize_propertyradar_phone)
+
+
+def _timed(label, func, *args):
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36}{elapsed * 1000:9.1f} ms")
+
+
+def run(row_count):
+    # Imported lazily so the generator above stays usable without the app
+    from services.propertyradar_import_service import PropertyRadarImportService
+
+    rows = generate_propertyradar_rows(row_count)
+    service = PropertyRadarImportService(None, None, None)
+    print(f"rows={row_count}")
+
+    normalization.clear_caches()
+    _timed('per-row service calls, cold caches', _per_row, service, rows)
+    _timed('per-row service calls, warm caches', _per_row, service, rows)
+
+    normalization.clear_caches()
+    _timed('normalize_column, cold caches', _by_column, rows)
+
+    for name, info in normalization.cache_info().items():
+        print(f"  {name:<30} hits={info.hits:<8} misses={info.misses:<8} size={info.currsize}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+    run(args.rows)
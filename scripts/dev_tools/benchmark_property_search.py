@@ -0,0 +1,126 @@
+"""
+Benchmark geohash-indexed property search against a brute-force scan.
+
+Seeds properties scattered over a metro area, then for a set of random
+centers times:
+
+- brute force: read every property's coordinates and compute the haversine
+  distance per row, the way Property.distance_to does
+- PropertyRepository.find_within_radius and find_nearest, which filter on
+  geohash prefix ranges and refine the candidates with NumPy
+
+Results of both are compared so a speedup never hides a wrong answer.
+
+    python scripts/dev_tools/benchmark_property_search.py --properties 200000 --miles 1
+    python scripts/dev_tools/benchmark_property_search.py --database-url postgresql://...
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from math import atan2, cos, radians, sin, sqrt
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sqlalchemy import insert  # noqa: E402
+
+from app import create_app  # noqa: E402
+from crm_database import Property, db  # noqa: E402
+from repositories.property_repository import PropertyRepository  # noqa: E402
+from utils.geo import EARTH_RADIUS_MILES, geohash_for  # noqa: E402
+
+# Greater Boston, roughly 60 x 60 miles
+CENTER_LAT, CENTER_LNG = 42.36, -71.06
+SPREAD_DEGREES = 0.45
+SEED_BATCH_SIZE = 10000
+
+
+def seed(count, seed_value=42):
+    rng = random.Random(seed_value)
+    for start in range(0, count, SEED_BATCH_SIZE):
+        rows = []
+        for index in range(start, min(start + SEED_BATCH_SIZE, count)):
+            latitude = round(CENTER_LAT + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES), 7)
+            longitude = round(CENTER_LNG + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES), 7)
+            rows.append({
+                'address': f'{index} Benchmark St',
+                'latitude': latitude,
+                'longitude': longitude,
+                'geohash': geohash_for(latitude, longitude),
+            })
+        db.session.execute(insert(Property), rows)
+    db.session.commit()
+
+
+def _distance(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = radians(lat1), radians(lng1), radians(lat2), radians(lng2)
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lng2 - lng1) / 2) ** 2
+    return EARTH_RADIUS_MILES * 2 * atan2(sqrt(a), sqrt(1 - a))
+
+
+def brute_force(latitude, longitude, miles):
+    """IDs within the radius, nearest first, from a full scan"""
+    rows = db.session.query(Property.id, Property.latitude, Property.longitude).filter(
+        Property.latitude.isnot(None), Property.longitude.isnot(None)
+    ).all()
+    distances = [(row[0], _distance(latitude, longitude, float(row[1]), float(row[2]))) for row in rows]
+    return [property_id for property_id, distance in sorted(distances, key=lambda pair: pair[1])
+            if distance <= miles]
+
+
+def _timed(label, func, centers):
+    start = time.perf_counter()
+    results = [func(latitude, longitude) for latitude, longitude in centers]
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28}{elapsed * 1000 / len(centers):9.1f} ms/query")
+    return results
+
+
+def run(database_url, property_count, query_count, miles, k):
+    app = create_app('testing', test_config={'SQLALCHEMY_DATABASE_URI': database_url})
+
+    with app.app_context():
+        db.create_all()
+        start = time.perf_counter()
+        seed(property_count)
+        print(f"seeded {property_count} properties in {time.perf_counter() - start:.1f}s ({db.engine.dialect.name})")
+
+        repository = PropertyRepository(db.session)
+        rng = random.Random(7)
+        centers = [(CENTER_LAT + rng.uniform(-0.3, 0.3), CENTER_LNG + rng.uniform(-0.3, 0.3))
+                   for _ in range(query_count)]
+
+        print(f"radius={miles} miles k={k} queries={query_count}")
+        expected = _timed('brute-force scan', lambda lat, lng: brute_force(lat, lng, miles), centers)
+        radius = _timed('find_within_radius', lambda lat, lng: [
+            prop.id for prop, _ in repository.find_within_radius(lat, lng, miles)
+        ], centers)
+        nearest = _timed('find_nearest', lambda lat, lng: [
+            prop.id for prop, _ in repository.find_nearest(lat, lng, k=k)
+        ], centers)
+        db.session.expunge_all()
+
+        radius_matches = sum(1 for got, want in zip(radius, expected) if got == want)
+        nearest_matches = sum(1 for got, want in zip(nearest, expected) if len(want) < k or got == want[:k])
+        print(f"radius results matching brute force : {radius_matches}/{query_count}")
+        print(f"nearest results matching brute force: {nearest_matches}/{query_count}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--properties', type=int, default=200000)
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--miles', type=float, default=1.0)
+    parser.add_argument('-k', type=int, default=10)
+    parser.add_argument('--database-url', help='Database to seed (default: a temporary SQLite file)')
+    args = parser.parse_args()
+
+    if args.database_url:
+        run(args.database_url, args.properties, args.queries, args.miles, args.k)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            url = f"sqlite:///{os.path.join(directory, 'property_search_benchmark.db')}"
+            run(url, args.properties, args.queries, args.miles, args.k)
@@ -0,0 +1,189 @@
+"""
+Benchmark ROICalculationService.generate_portfolio_forecast against the
+per-campaign generate_roi_forecast loop on a seeded database.
+
+Seeds campaigns with members, primary properties, jobs, invoices and daily
+campaign costs over the forecast history window, then times:
+
+- the existing loop: generate_roi_forecast once per campaign, which runs one
+  ROIRepository.calculate_roi_forecast query per campaign
+- generate_portfolio_forecast for all campaigns at once
+
+and reports wall time and SQL statement count for each.
+
+calculate_roi_forecast is written for PostgreSQL (CURRENT_DATE - INTERVAL);
+on SQLite the benchmark rewrites that one expression to DATE('now', ...) so
+the per-campaign queries actually execute instead of failing fast.
+
+    python scripts/dev_tools/benchmark_roi_forecast.py --campaigns 200 --members 10
+    python scripts/dev_tools/benchmark_roi_forecast.py --database-url postgresql://...
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sqlalchemy import event, insert  # noqa: E402
+
+from app import create_app  # noqa: E402
+from crm_database import (  # noqa: E402
+    Campaign, CampaignCost, CampaignMembership, Contact, Invoice, Job, Property, PropertyContact, db
+)
+
+POSTGRES_INTERVAL = "CURRENT_DATE - INTERVAL '90 days'"
+SQLITE_INTERVAL = "DATE('now', '-90 days')"
+
+
+class StatementCounter:
+    """Counts statements sent to the database; rewrites the forecast interval on SQLite"""
+
+    def __init__(self, engine):
+        self.count = 0
+        self.rewrite_interval = engine.dialect.name == 'sqlite'
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute, retval=True)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        if self.rewrite_interval and POSTGRES_INTERVAL in statement:
+            statement = statement.replace(POSTGRES_INTERVAL, SQLITE_INTERVAL)
+        return statement, parameters
+
+
+def _bulk_insert(model, rows):
+    if rows:
+        db.session.execute(insert(model), rows)
+
+
+def seed(campaign_count, members_per_campaign, history_days, seed_value=42):
+    """Seed campaigns with revenue and cost history; returns the campaign IDs"""
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+
+    campaigns = [Campaign(name=f'Benchmark {index}', campaign_type='blast', template_a='Hi', status='running')
+                 for index in range(campaign_count)]
+    db.session.add_all(campaigns)
+    db.session.flush()
+    campaign_ids = [campaign.id for campaign in campaigns]
+
+    contact_count = campaign_count * members_per_campaign
+    first_contact_id = (db.session.query(db.func.max(Contact.id)).scalar() or 0) + 1
+    first_property_id = (db.session.query(db.func.max(Property.id)).scalar() or 0) + 1
+    first_job_id = (db.session.query(db.func.max(Job.id)).scalar() or 0) + 1
+    contact_ids = range(first_contact_id, first_contact_id + contact_count)
+    property_ids = range(first_property_id, first_property_id + contact_count)
+    job_ids = range(first_job_id, first_job_id + contact_count)
+
+    _bulk_insert(Contact, [
+        {'id': contact_id, 'first_name': 'Bench', 'last_name': str(contact_id), 'phone': f'+1999{contact_id:07d}'}
+        for contact_id in contact_ids
+    ])
+    _bulk_insert(Property, [
+        {'id': property_id, 'address': f'{property_id} Benchmark St', 'created_at': now}
+        for property_id in property_ids
+    ])
+    _bulk_insert(PropertyContact, [
+        {'property_id': property_id, 'contact_id': contact_id, 'is_primary': True, 'created_at': now}
+        for contact_id, property_id in zip(contact_ids, property_ids)
+    ])
+    _bulk_insert(Job, [
+        {'id': job_id, 'description': 'Benchmark job', 'property_id': property_id, 'status': 'Completed'}
+        for job_id, property_id in zip(job_ids, property_ids)
+    ])
+    _bulk_insert(CampaignMembership, [
+        {'campaign_id': campaign_ids[index // members_per_campaign], 'contact_id': contact_id, 'status': 'sent'}
+        for index, contact_id in enumerate(contact_ids)
+    ])
+
+    invoices = []
+    for job_id in job_ids:
+        for _ in range(rng.randint(1, 4)):
+            created_at = now - timedelta(days=rng.randint(0, history_days - 1), hours=rng.randint(0, 12))
+            invoices.append({
+                'job_id': job_id,
+                'total_amount': round(rng.gammavariate(4.0, 250.0), 2),
+                'invoice_date': created_at.date(),
+                'due_date': (created_at + timedelta(days=30)).date(),
+                'created_at': created_at,
+            })
+    _bulk_insert(Invoice, invoices)
+
+    _bulk_insert(CampaignCost, [
+        {
+            'campaign_id': campaign_id,
+            'cost_type': 'sms',
+            'amount': round(rng.gammavariate(4.0, 15.0), 2),
+            'currency': 'USD',
+            'cost_date': (now - timedelta(days=day)).date(),
+            'created_at': now,
+            'updated_at': now,
+        }
+        for campaign_id in campaign_ids
+        for day in range(history_days)
+    ])
+
+    db.session.commit()
+    return campaign_ids
+
+
+def _timed(counter, func):
+    counter.count = 0
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start, counter.count
+
+
+def run(database_url, campaign_count, members_per_campaign, forecast_days):
+    app = create_app('testing', test_config={'SQLALCHEMY_DATABASE_URI': database_url})
+
+    with app.app_context():
+        db.create_all()
+        roi_service = app.services.get('roi_calculation')
+        history_days = roi_service.FORECAST_HISTORY_DAYS
+
+        start = time.perf_counter()
+        campaign_ids = seed(campaign_count, members_per_campaign, history_days)
+        print(f"seeded {campaign_count} campaigns x {members_per_campaign} members "
+              f"over {history_days} days in {time.perf_counter() - start:.1f}s ({db.engine.dialect.name})")
+
+        counter = StatementCounter(db.engine)
+
+        def per_campaign():
+            return [roi_service.generate_roi_forecast(campaign_id, forecast_days) for campaign_id in campaign_ids]
+
+        def portfolio():
+            return roi_service.generate_portfolio_forecast(campaign_ids, forecast_days)
+
+        loop_results, loop_seconds, loop_statements = _timed(counter, per_campaign)
+        portfolio_result, portfolio_seconds, portfolio_statements = _timed(counter, portfolio)
+
+        failures = sum(1 for result in loop_results if result.is_failure)
+        if failures or portfolio_result.is_failure:
+            print(f"warning: {failures} per-campaign failures, portfolio failure: {portfolio_result.error}")
+
+        print(f"per-campaign loop   : {loop_seconds * 1000:9.1f} ms {loop_statements:6d} statements")
+        print(f"portfolio forecast  : {portfolio_seconds * 1000:9.1f} ms {portfolio_statements:6d} statements "
+              f"(includes bootstrap CIs and seasonality)")
+        if portfolio_seconds > 0:
+            print(f"speedup             : {loop_seconds / portfolio_seconds:9.1f}x")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--campaigns', type=int, default=200)
+    parser.add_argument('--members', type=int, default=10, help='Members per campaign')
+    parser.add_argument('--forecast-days', type=int, default=30)
+    parser.add_argument('--database-url', help='Database to seed (default: a temporary SQLite file)')
+    args = parser.parse_args()
+
+    if args.database_url:
+        run(args.database_url, args.campaigns, args.members, args.forecast_days)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            url = f"sqlite:///{os.path.join(directory, 'roi_benchmark.db')}"
+            run(url, args.campaigns, args.members, args.forecast_days)
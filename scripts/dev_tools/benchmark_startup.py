@@ -0,0 +1,193 @@
+"""
+Benchmark web and worker startup and fail if import time regresses.
+
+Starts a fresh interpreter per scenario with -X importtime, parses the
+per-module self and cumulative import times it prints, and reports the
+slowest modules along with total import time and wall-clock startup:
+
+- web: import app and create_app('testing'), as gunicorn does
+- worker: import celery_worker and build the worker app, as celery worker does
+
+Each scenario is checked against scripts/dev_tools/startup_budget.json: the
+import time must stay within max_import_ms plus the budget's tolerance, and
+none of the forbidden_modules (heavy SDKs that should load on first use) may
+be imported. The script exits with status 1 on any regression, so it can run
+in CI. After an intentional change, refresh the budget with --update-budget.
+
+    python scripts/dev_tools/benchmark_startup.py
+    python scripts/dev_tools/benchmark_startup.py --scenario web --top 30 --repeat 5
+    python scripts/dev_tools/benchmark_startup.py --update-budget
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DEFAULT_BUDGET = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'startup_budget.json')
+
+# Code run in the child interpreter; it prints its own wall-clock startup in ms
+SCENARIOS = {
+    'web': "import app; app.create_app('testing')",
+    'worker': "import celery_worker; celery_worker.get_flask_app()",
+}
+TIMER = "import time; _started = time.perf_counter()\n{code}\nprint(round((time.perf_counter() - _started) * 1000, 1))"
+
+# Headroom written by --update-budget above the measured import time
+UPDATE_HEADROOM = 1.2
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$')
+
+
+@dataclass
+class ImportRecord:
+    """One module from -X importtime output"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class StartupProfile:
+    """Import times and wall-clock startup of one scenario run"""
+    scenario: str
+    imports: List[ImportRecord]
+    startup_ms: float
+
+    @property
+    def import_ms(self) -> float:
+        """Total import time: the cumulative time of the top-level imports"""
+        return round(sum(record.cumulative_us for record in self.imports if record.depth == 0) / 1000, 1)
+
+    @property
+    def modules(self) -> set:
+        return {record.module for record in self.imports}
+
+    def slowest(self, count: int, key: str = 'self_us') -> List[ImportRecord]:
+        return sorted(self.imports, key=lambda record: getattr(record, key), reverse=True)[:count]
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """
+    Parse the stderr of `python -X importtime`.
+
+    Args:
+        output: Text containing 'import time: self | cumulative | package' lines
+
+    Returns:
+        One record per imported module, in import-completion order; depth is
+        0 for modules imported directly by the script
+    """
+    records = []
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append(ImportRecord(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def profile_startup(scenario: str, python: str = sys.executable) -> StartupProfile:
+    """Run a scenario in a fresh interpreter and parse its import times"""
+    env = dict(os.environ, FLASK_ENV='testing')
+    completed = subprocess.run(
+        [python, '-X', 'importtime', '-c', TIMER.format(code=SCENARIOS[scenario])],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"{scenario} startup failed:\n{completed.stderr[-2000:]}")
+    startup_ms = float(completed.stdout.strip().splitlines()[-1])
+    return StartupProfile(scenario, parse_importtime(completed.stderr), startup_ms)
+
+
+def check_budget(profile: StartupProfile, budget: Dict, tolerance: float) -> List[str]:
+    """
+    Compare a profile with its scenario's budget.
+
+    Args:
+        profile: Measured startup
+        budget: {'max_import_ms': float, 'forbidden_modules': [...]}
+        tolerance: Allowed fraction above max_import_ms
+
+    Returns:
+        Regression messages (empty if within budget)
+    """
+    problems = []
+    max_import_ms = budget.get('max_import_ms')
+    if max_import_ms is not None and profile.import_ms > max_import_ms * (1 + tolerance):
+        problems.append(f"{profile.scenario}: import time {profile.import_ms} ms exceeds budget "
+                        f"{max_import_ms} ms (+{tolerance:.0%})")
+
+    imported = profile.modules
+    for module in budget.get('forbidden_modules', []):
+        if module in imported:
+            problems.append(f"{profile.scenario}: {module} is imported at startup")
+    return problems
+
+
+def load_budget(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {'tolerance': 0.25, 'scenarios': {}}
+    with open(path) as budget_file:
+        return json.load(budget_file)
+
+
+def _best_of(scenario: str, repeat: int) -> StartupProfile:
+    # Import times are noisy; the fastest run is the least disturbed one
+    return min((profile_startup(scenario) for _ in range(repeat)), key=lambda profile: profile.import_ms)
+
+
+def _report(profile: StartupProfile, top: int) -> None:
+    print(f"\n== {profile.scenario}: {profile.import_ms:.1f} ms importing, "
+          f"{profile.startup_ms:.1f} ms startup, {len(profile.imports)} modules")
+    print(f"{'self ms':>9} {'cumul ms':>9}  module")
+    for record in profile.slowest(top):
+        print(f"{record.self_us / 1000:9.1f} {record.cumulative_us / 1000:9.1f}  {record.module}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), action='append',
+                        help='Scenario to run (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per scenario; the fastest is kept')
+    parser.add_argument('--top', type=int, default=15, help='Slowest modules to list')
+    parser.add_argument('--budget', default=DEFAULT_BUDGET, help='Budget JSON file')
+    parser.add_argument('--update-budget', action='store_true',
+                        help='Write the measured import times (with headroom) to the budget file')
+    args = parser.parse_args(argv)
+
+    budget = load_budget(args.budget)
+    tolerance = budget.get('tolerance', 0.25)
+    problems = []
+
+    for scenario in args.scenario or sorted(SCENARIOS):
+        profile = _best_of(scenario, max(args.repeat, 1))
+        _report(profile, args.top)
+        scenario_budget = budget['scenarios'].setdefault(scenario, {'forbidden_modules': []})
+        if args.update_budget:
+            scenario_budget['max_import_ms'] = round(profile.import_ms * UPDATE_HEADROOM)
+        problems.extend(check_budget(profile, scenario_budget, tolerance))
+
+    if args.update_budget:
+        with open(args.budget, 'w') as budget_file:
+            json.dump(budget, budget_file, indent=2)
+            budget_file.write('\n')
+        print(f"\nbudget written to {args.budget}")
+
+    if problems:
+        print('\nstartup regressions:')
+        for problem in problems:
+            print(f"  {problem}")
+        return 1
+    print('\nstartup within budget')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
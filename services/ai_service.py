@@ -1,10 +1,13 @@
-import google.generativeai as genai
 from flask import current_app
 import json
 from logging_config import get_logger
+from utils.lazy_imports import lazy_module
 
 logger = get_logger(__name__)
 
+# The Gemini SDK is imported when the model is first configured
+genai = lazy_module('google.generativeai')
+
 class AIService:
     def __init__(self):
         """
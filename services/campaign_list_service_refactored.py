@@ -10,6 +10,7 @@ from services.common.result import Result
 from repositories.campaign_list_repository import CampaignListRepository
 from repositories.campaign_list_member_repository import CampaignListMemberRepository
 from repositories.contact_repository import ContactRepository
+from services.cache_service import CacheService
 # Model imports removed - using repositories only
 import logging
 
@@ -24,9 +25,14 @@ class CampaignListServiceRefactored:
     All database operations are delegated to specialized repositories.
     """
     
+    # Cache key for the statistics of all lists
+    STATS_CACHE_KEY = 'campaign_list_stats'
+    
     def __init__(self, campaign_list_repository: CampaignListRepository,
                  member_repository: CampaignListMemberRepository,
-                 contact_repository: ContactRepository):
+                 contact_repository: ContactRepository,
+                 cache_service: Optional[CacheService] = None,
+                 stats_cache_ttl: int = 300):
         """
         Initialize service with repository dependencies.
         
@@ -34,10 +40,15 @@ class CampaignListServiceRefactored:
             campaign_list_repository: Repository for campaign list operations
             member_repository: Repository for campaign list member operations
             contact_repository: Repository for contact operations
+            cache_service: Optional cache for list statistics
+            stats_cache_ttl: Seconds cached statistics are kept; bounds staleness
+                after membership changes made outside this service
         """
         self.campaign_list_repository = campaign_list_repository
         self.member_repository = member_repository
         self.contact_repository = contact_repository
+        self.cache_service = cache_service
+        self.stats_cache_ttl = stats_cache_ttl
     
     def create_list(self, name: str, description: str = None, 
                    filter_criteria: Dict = None, is_dynamic: bool = False,
@@ -77,6 +88,7 @@ class CampaignListServiceRefactored:
             )
             
             self.campaign_list_repository.commit()
+            self._invalidate_stats()
             
             # If dynamic, populate it based on criteria
             if is_dynamic and filter_criteria:
@@ -140,6 +152,7 @@ class CampaignListServiceRefactored:
                     results['errors'] += 1
             
             self.member_repository.commit()
+            self._invalidate_stats()
             return Result.success(results)
             
         except Exception as e:
@@ -161,6 +174,7 @@ class CampaignListServiceRefactored:
         try:
             count = self.member_repository.remove_contacts_from_list(list_id, contact_ids)
             self.member_repository.commit()
+            self._invalidate_stats()
             return Result.success(count)
             
         except Exception as e:
@@ -207,41 +221,77 @@ class CampaignListServiceRefactored:
             Result[Dict]: Success with statistics or failure
         """
         try:
-            # Get membership stats
-            member_stats = self.member_repository.get_membership_stats(list_id)
+            all_stats = self._load_stats()
+            if list_id not in all_stats and self.cache_service is not None:
+                # The list may be newer than the cached statistics
+                self._invalidate_stats()
+                all_stats = self._load_stats()
             
             # Check if list exists
-            if member_stats is None:
+            if list_id not in all_stats:
                 return Result.failure(f"List with ID {list_id} not found")
             
-            # Get contact stats
-            contacts_result = self.get_list_contacts(list_id)
-            if contacts_result.is_failure:
-                return contacts_result
-            
-            contacts = contacts_result.data
-            
-            stats = {
-                'total': member_stats['total'],
-                'active': member_stats['active'],
-                'removed': member_stats['removed'],
-                'active_members': member_stats['active'],
-                'removed_members': member_stats['removed'],
-                'total_members': member_stats['total'],
-                'with_email': sum(1 for c in contacts if c.email),
-                'with_phone': sum(1 for c in contacts if c.phone)
-            }
-            
-            return Result.success(stats)
+            return Result.success(self._format_stats(all_stats[list_id]))
             
         except Exception as e:
             logger.error(f"Failed to get stats for list {list_id}: {e}")
             return Result.failure(f"Failed to get list statistics: {str(e)}")
     
+    def get_all_list_stats(self) -> Result[Dict[int, Dict[str, int]]]:
+        """
+        Get statistics for every campaign list.
+        
+        All lists are counted by one grouped query and the result is cached,
+        so list pages use a constant number of queries.
+        
+        Returns:
+            Result[Dict]: Success with statistics by list ID or failure
+        """
+        try:
+            return Result.success({
+                list_id: self._format_stats(stats) for list_id, stats in self._load_stats().items()
+            })
+            
+        except Exception as e:
+            logger.error(f"Failed to get campaign list statistics: {e}")
+            return Result.failure(f"Failed to get list statistics: {str(e)}")
+    
+    def _load_stats(self) -> Dict[int, Dict[str, int]]:
+        """Membership counts of all lists, from the cache when available"""
+        if self.cache_service is not None:
+            cached = self.cache_service.get(self.STATS_CACHE_KEY)
+            if cached is not None:
+                return cached
+        
+        stats = self.member_repository.get_stats_by_list()
+        if self.cache_service is not None:
+            self.cache_service.set(self.STATS_CACHE_KEY, stats, ttl=self.stats_cache_ttl)
+        return stats
+    
+    def _invalidate_stats(self) -> None:
+        """Drop cached statistics after membership changes"""
+        if self.cache_service is not None:
+            self.cache_service.delete(self.STATS_CACHE_KEY)
+    
+    @staticmethod
+    def _format_stats(stats: Dict[str, int]) -> Dict[str, int]:
+        return {
+            'total': stats['total'],
+            'active': stats['active'],
+            'removed': stats['removed'],
+            'active_members': stats['active'],
+            'removed_members': stats['removed'],
+            'total_members': stats['total'],
+            'with_email': stats['with_email'],
+            'with_phone': stats['with_phone']
+        }
+    
     def find_contacts_by_criteria(self, criteria: Dict) -> Result[List[Dict[str, Any]]]:
         """
         Find contacts based on filter criteria.
         
+        All criteria are combined (see ContactRepository.build_list_criteria_query).
+        
         Args:
             criteria: Filter criteria dictionary
             
@@ -249,59 +299,8 @@ class CampaignListServiceRefactored:
             Result[List[Contact]]: Success with matching contacts or failure
         """
         try:
-            # CSV Import filter
-            if 'csv_import_id' in criteria:
-                contacts = self.contact_repository.find_by_csv_import(criteria['csv_import_id'])
-                return Result.success(contacts)
-            
-            # Date range filters
-            if 'imported_after' in criteria or 'imported_before' in criteria:
-                imported_after = None
-                imported_before = None
-                
-                if 'imported_after' in criteria:
-                    date_value = criteria['imported_after']
-                    if isinstance(date_value, str):
-                        imported_after = datetime.fromisoformat(date_value)
-                    else:
-                        imported_after = date_value
-                
-                if 'imported_before' in criteria:
-                    date_value = criteria['imported_before']
-                    if isinstance(date_value, str):
-                        imported_before = datetime.fromisoformat(date_value)
-                    else:
-                        imported_before = date_value
-                
-                contacts = self.contact_repository.find_by_date_range(
-                    imported_after=imported_after,
-                    imported_before=imported_before
-                )
-                return Result.success(contacts)
-            
-            # No recent contact filter
-            if 'no_recent_contact' in criteria:
-                days = criteria.get('days_since_contact', 30)
-                contacts = self.contact_repository.find_without_recent_activity(days)
-                return Result.success(contacts)
-            
-            # Exclude opted out filter
-            if 'exclude_opted_out' in criteria and criteria['exclude_opted_out']:
-                contacts = self.contact_repository.find_not_opted_out()
-                return Result.success(contacts)
-            
-            # Metadata filters
-            if 'has_metadata' in criteria:
-                contacts = self.contact_repository.find_by_metadata_keys(criteria['has_metadata'])
-                return Result.success(contacts)
-            
-            # Has email filter
-            if 'has_email' in criteria and criteria['has_email']:
-                contacts = self.contact_repository.find_with_email()
-                return Result.success(contacts)
-            
-            # If no specific criteria, return empty list
-            return Result.success([])
+            contacts = self.contact_repository.find_by_list_criteria(criteria)
+            return Result.success(contacts)
             
         except Exception as e:
             logger.error(f"Failed to find contacts by criteria: {e}")
@@ -311,6 +310,10 @@ class CampaignListServiceRefactored:
         """
         Refresh a dynamic list based on its filter criteria.
         
+        The criteria are compiled to one query and the membership is brought
+        in line with it by set-based statements, so only changed members are
+        written.
+        
         Args:
             list_id: Campaign list ID
             
@@ -326,41 +329,18 @@ class CampaignListServiceRefactored:
             if not campaign_list.is_dynamic:
                 return Result.failure("Campaign list is not dynamic")
             
-            # Get current members
-            current_contact_ids = set(
-                self.member_repository.get_contact_ids_in_list(list_id, include_removed=False)
-            )
-            
-            # Find contacts matching criteria
-            matching_result = self.find_contacts_by_criteria(campaign_list.filter_criteria or {})
-            if matching_result.is_failure:
-                return matching_result
-            
-            matching_contacts = matching_result.data
-            matching_ids = set(c.id for c in matching_contacts)
-            
-            # Add new matches
-            to_add = matching_ids - current_contact_ids
-            for contact_id in to_add:
-                self.member_repository.create(
-                    list_id=list_id,
-                    contact_id=contact_id,
-                    added_by='system_dynamic'
-                )
-            
-            # Remove non-matches
-            to_remove = current_contact_ids - matching_ids
-            if to_remove:
-                self.member_repository.remove_contacts_from_list(list_id, list(to_remove))
+            matching = self.contact_repository.build_list_criteria_query(campaign_list.filter_criteria or {})
+            changes = self.member_repository.sync_members(list_id, matching, added_by='system_dynamic')
             
             # Update list timestamp
             self.campaign_list_repository.update(campaign_list, updated_at=utc_now())
             self.campaign_list_repository.commit()
+            self._invalidate_stats()
             
             stats = {
-                'added': len(to_add),
-                'removed': len(to_remove),
-                'total': len(matching_ids)
+                'added': changes['added'],
+                'removed': changes['removed'],
+                'total': self.member_repository.count(list_id=list_id, status='active')
             }
             
             return Result.success(stats)
@@ -370,6 +350,19 @@ class CampaignListServiceRefactored:
             self.campaign_list_repository.rollback()
             return Result.failure(f"Failed to refresh dynamic list: {str(e)}")
     
+    def get_dynamic_list_ids(self) -> Result[List[int]]:
+        """
+        Get the ids of all dynamic lists, for scheduled refreshes.
+        
+        Returns:
+            Result[List[int]]: Success with list ids or failure
+        """
+        try:
+            return Result.success([campaign_list.id for campaign_list in self.campaign_list_repository.find_dynamic_lists()])
+        except Exception as e:
+            logger.error(f"Failed to get dynamic lists: {e}")
+            return Result.failure(f"Failed to get dynamic lists: {str(e)}")
+    
     def get_all_lists(self) -> Result[List[Dict[str, Any]]]:
         """
         Get all campaign lists.
@@ -437,6 +430,7 @@ class CampaignListServiceRefactored:
                 )
             
             self.campaign_list_repository.commit()
+            self._invalidate_stats()
             return Result.success(new_list)
             
         except Exception as e:
@@ -142,38 +142,35 @@ class CampaignService:
             logger.error(f"Failed to create campaign: {str(e)}")
             return Result.failure(f"Failed to create campaign: {str(e)}", code="CREATE_ERROR")
     
-    def add_recipients_from_list(self, campaign_id: int, list_id: int) -> 'Result[int]':
+    def add_recipients_from_list(self, campaign_id: int, list_id: int,
+                                 assign_variants: bool = False) -> 'Result[int]':
         """
         Add recipients from a campaign list.
         
+        The active list members are enrolled with one INSERT ... SELECT in the
+        database; contacts already in the campaign are skipped.
+        
         Args:
             campaign_id: Campaign ID
             list_id: List ID
+            assign_variants: For A/B campaigns, assign each member's variant now
+                (by ab_config current_split) instead of at send time
             
         Returns:
             Result[int]: Success with number of recipients added or failure with error
         """
         try:
-            if not self.list_service:
-                return Result.failure("CampaignListService not provided")
-            
-            # Get all active contacts from the list
-            contacts_result = self.list_service.get_list_contacts(list_id)
-            if contacts_result.is_failure:
-                return Result.failure(f"Failed to get list contacts: {contacts_result.error}")
-            
-            contacts = contacts_result.data
-            contact_ids = [c.get('id') if isinstance(c, dict) else c.id for c in contacts]
+            campaign = self.campaign_repository.get_by_id(campaign_id)
             
             # Add all contacts to campaign (filtering happens during processing)
-            logger.info(f"Adding {len(contact_ids)} contacts to campaign {campaign_id} from list {list_id}")
-            added = self.campaign_repository.add_members_bulk(campaign_id, contact_ids)
+            added = self.campaign_repository.enroll_from_list(
+                campaign_id, list_id, self._variant_split(campaign, assign_variants)
+            )
             
             # Update campaign list reference
-            campaign = self.campaign_repository.get_by_id(campaign_id)
             if campaign:
                 campaign.list_id = list_id
-                self.campaign_repository.commit()
+            self.campaign_repository.commit()
             
             logger.info(f"Added {added} recipients to campaign {campaign_id} from list {list_id}")
             return Result.success(added)
@@ -182,13 +179,18 @@ class CampaignService:
             logger.error(f"Failed to add recipients from list {list_id} to campaign {campaign_id}: {e}")
             return Result.failure(f"Failed to add recipients from list: {str(e)}")
     
-    def add_recipients(self, campaign_id: int, contact_filters: Dict) -> int:
+    def add_recipients(self, campaign_id: int, contact_filters: Dict,
+                       assign_variants: bool = False) -> int:
         """
         Add recipients to campaign based on filters.
         
+        The audience query is enrolled with one INSERT ... SELECT, so contact
+        ids never leave the database.
+        
         Args:
             campaign_id: Campaign ID
-            contact_filters: Dictionary of filters
+            contact_filters: Dictionary of filters (see ContactRepository.build_audience_query)
+            assign_variants: For A/B campaigns, assign each member's variant now
             
         Returns:
             Number of recipients added
@@ -197,90 +199,67 @@ class CampaignService:
         if not campaign:
             raise ValueError(f"Campaign {campaign_id} not found")
         
-        # Get contacts based on filters
-        contacts = self._get_filtered_contacts(contact_filters)
-        contact_ids = [c.id if hasattr(c, 'id') else c.get('id') for c in contacts]
-        
-        # Add to campaign
-        added = self.campaign_repository.add_members_bulk(campaign_id, contact_ids)
+        added = self.campaign_repository.enroll_contacts(
+            campaign_id,
+            self.contact_repository.build_audience_query(contact_filters),
+            self._variant_split(campaign, assign_variants)
+        )
         self.campaign_repository.commit()
         
         logger.info(f"Added {added} recipients to campaign {campaign_id}")
         return added
     
-    def get_eligible_contacts(self, filters: Dict) -> List[Dict[str, Any]]:
-        """Public interface for getting eligible contacts with filters"""
-        return self._get_filtered_contacts(filters)
+    def _variant_split(self, campaign, assign_variants: bool) -> Optional[int]:
+        """Percentage of new members to assign variant A, or None to defer to send time"""
+        if not assign_variants or campaign is None or campaign.campaign_type != 'ab_test':
+            return None
+        return (campaign.ab_config or {}).get('current_split', 50)
     
-    def _get_filtered_contacts(self, filters: Dict) -> List[Dict[str, Any]]:
+    def get_eligible_contacts(self, filters: Dict) -> List[Dict[str, Any]]:
         """
-        Get contacts based on filters.
+        Get the contacts matching campaign audience filters.
         
         Args:
-            filters: Dictionary of filters
+            filters: Dictionary of filters (see ContactRepository.build_audience_query)
             
         Returns:
-            List of filtered contacts
+            List of contact dictionaries ordered by id
         """
-        # Start with all contacts or use repository filtering
-        if filters.get('has_name_only'):
-            # Get all contacts and filter in memory for complex logic
-            contacts = self.contact_repository.get_all()
-            # Only contacts with real names (not phone numbers)
-            contacts = [c for c in contacts if not (hasattr(c, 'first_name') and c.first_name and c.first_name.startswith('+1'))]
-        else:
-            contacts = self.contact_repository.get_all()
-        
-        if filters.get('has_email'):
-            contacts = [c for c in contacts if hasattr(c, 'email') and c.email]
-        
-        if filters.get('exclude_office_numbers'):
-            # Exclude contacts flagged as office numbers
-            office_ids = self.contact_flag_repository.get_contact_ids_with_flag_type('office_number')
-            contacts = [c for c in contacts if hasattr(c, 'id') and c.id not in office_ids]
-        
-        if filters.get('exclude_opted_out'):
-            opted_out_ids = self.contact_flag_repository.get_contact_ids_with_flag_type('opted_out')
-            contacts = [c for c in contacts if hasattr(c, 'id') and c.id not in opted_out_ids]
-        
-        if filters.get('exclude_do_not_contact'):
-            # Exclude contacts flagged as do not contact
-            do_not_contact_ids = self.contact_flag_repository.get_contact_ids_with_flag_type('do_not_contact')
-            contacts = [c for c in contacts if hasattr(c, 'id') and c.id not in do_not_contact_ids]
-        
-        if filters.get('exclude_recently_contacted'):
-            # Exclude contacts that were recently texted
-            recently_contacted_ids = self.contact_flag_repository.get_contact_ids_with_flag_type('recently_texted')
-            contacts = [c for c in contacts if hasattr(c, 'id') and c.id not in recently_contacted_ids]
-        
-        if filters.get('min_days_since_contact'):
-            # Filter contacts based on minimum days since last contact
-            min_days = filters['min_days_since_contact']
-            cutoff_date = utc_now() - timedelta(days=min_days)
-            
-            # Get all 'recently_texted' flags
-            recently_texted_flags = self.contact_flag_repository.find_by_flag_type('recently_texted')
-            
-            # Build set of contact IDs that were contacted within the cutoff period
-            recently_contacted_within_period = set()
-            for flag in recently_texted_flags:
-                # Check if flag was created within the cutoff period
-                if flag.created_at and flag.created_at > cutoff_date:
-                    recently_contacted_within_period.add(flag.contact_id)
-            
-            # Exclude contacts that have been contacted within the specified days
-            contacts = [c for c in contacts if hasattr(c, 'id') and c.id not in recently_contacted_within_period]
-        
-        if filters.get('exclude_current_campaign'):
-            # Exclude contacts already in any active campaign
-            active_campaigns = self.campaign_repository.get_active_campaigns()
-            for active_campaign in active_campaigns:
-                members = self.campaign_repository.get_campaign_members(active_campaign.id)
-                member_ids = {m.contact_id for m in members.items}
-                contacts = [c for c in contacts if hasattr(c, 'id') and c.id not in member_ids]
-        
+        contacts = []
+        for contact_ids in self.contact_repository.iter_audience_ids(filters):
+            chunk = sorted(self.contact_repository.get_by_ids(contact_ids), key=lambda contact: contact.id)
+            contacts.extend(self._audience_contact_to_dict(contact) for contact in chunk)
         return contacts
     
+    def preview_audience(self, filters: Dict, sample_size: int = 5) -> Dict[str, Any]:
+        """
+        Preview the size of a campaign audience without building it.
+        
+        Args:
+            filters: Dictionary of filters (see ContactRepository.build_audience_query)
+            sample_size: Number of sample contacts to include
+            
+        Returns:
+            Dictionary with total_count and sample_contacts
+        """
+        filters = filters or {}
+        return {
+            'total_count': self.contact_repository.count_audience(filters),
+            'sample_contacts': [
+                self._audience_contact_to_dict(contact)
+                for contact in self.contact_repository.find_audience_sample(filters, limit=sample_size)
+            ]
+        }
+    
+    def _audience_contact_to_dict(self, contact) -> Dict[str, Any]:
+        return {
+            'id': contact.id,
+            'first_name': contact.first_name,
+            'last_name': contact.last_name,
+            'phone': contact.phone,
+            'email': contact.email
+        }
+    
     def get_by_id(self, campaign_id: int):
         """
         Get campaign by ID.
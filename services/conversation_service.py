@@ -90,61 +90,21 @@ class ConversationService:
         # Use repository for batch office flag lookup
         office_flags = self.conversation_repository.get_office_flags_batch(contact_ids)
         
-        # Enhance each conversation
+        # Enhance each conversation from its denormalized inbox summary
         enhanced = []
         for conv in conversations:
-            # Process pre-loaded activities
-            activities = conv.activities  # Already loaded via selectinload
-            
-            # Get latest activity
-            latest_activity = max(activities, key=lambda a: a.created_at) if activities else None
-            
-            # Check for unread status - simplified logic
-            incoming_activities = [a for a in activities if a.direction == 'incoming']
-            outgoing_activities = [a for a in activities if a.direction == 'outgoing']
-            
-            is_unread = False
-            if incoming_activities and outgoing_activities:
-                latest_incoming = max(incoming_activities, key=lambda a: a.created_at)
-                latest_outgoing = max(outgoing_activities, key=lambda a: a.created_at)
-                is_unread = latest_incoming.created_at > latest_outgoing.created_at
-            elif incoming_activities and not outgoing_activities:
-                is_unread = True
-            
-            # Check for real attachments (not empty arrays)
-            has_attachments = False
-            for activity in activities:
-                if activity.media_urls:
-                    try:
-                        # Check if it's a non-empty array
-                        import json
-                        if isinstance(activity.media_urls, str):
-                            urls = json.loads(activity.media_urls)
-                        else:
-                            urls = activity.media_urls
-                        if urls and len(urls) > 0:
-                            has_attachments = True
-                            break
-                    except:
-                        pass
-            
-            # Check for AI content
-            has_ai_summary = any(a.ai_summary for a in activities)
-            
-            # Check if office number
-            is_office_number = conv.contact_id in office_flags
-            
-            # Message count
-            message_count = len(activities)
-            
+            unread_count = conv.unread_count or 0
             enhanced.append({
                 'conversation': conv,
-                'latest_activity': latest_activity,
-                'is_unread': is_unread,
-                'has_attachments': has_attachments,
-                'has_ai_summary': has_ai_summary,
-                'is_office_number': is_office_number,
-                'message_count': message_count
+                'last_message_preview': conv.last_message_preview,
+                'last_direction': conv.last_direction,
+                'last_activity_type': conv.last_activity_type,
+                'unread_count': unread_count,
+                'is_unread': unread_count > 0,
+                'has_attachments': bool(conv.has_attachments),
+                'has_ai_summary': bool(conv.has_ai_summary),
+                'is_office_number': conv.contact_id in office_flags,
+                'message_count': conv.activity_count or 0
             })
         
         return enhanced
@@ -154,13 +114,11 @@ class ConversationService:
         return self.campaign_repository.find_by_statuses(['draft', 'running'])
     
     def mark_conversations_read(self, conversation_ids: List[int]) -> Tuple[bool, str]:
-        """Mark conversations as read by updating last activity"""
+        """Mark conversations as read by clearing their unread counters"""
         if not conversation_ids:
             return False, "No conversations selected"
         
-        success = self.conversation_repository.bulk_update_last_activity(
-            conversation_ids, utc_now()
-        )
+        success = self.conversation_repository.mark_as_read(conversation_ids)
         
         if success:
             return True, f'Marked {len(conversation_ids)} conversations as read'
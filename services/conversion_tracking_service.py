@@ -16,6 +16,7 @@ from repositories.conversion_repository import ConversionRepository
 from repositories.campaign_repository import CampaignRepository
 from repositories.contact_repository import ContactRepository
 from repositories.campaign_response_repository import CampaignResponseRepository
+from repositories.campaign_attribution_repository import CampaignAttributionRepository
 from services.common.result import Result, Success, Failure
 from utils.datetime_utils import utc_now, ensure_utc
 
@@ -43,7 +44,8 @@ class ConversionTrackingService:
                  conversion_repository: ConversionRepository,
                  campaign_repository: CampaignRepository,
                  contact_repository: ContactRepository,
-                 response_repository: CampaignResponseRepository):
+                 response_repository: CampaignResponseRepository,
+                 attribution_repository: Optional[CampaignAttributionRepository] = None):
         """
         Initialize the conversion tracking service.
         
@@ -52,11 +54,13 @@ class ConversionTrackingService:
             campaign_repository: Repository for campaigns
             contact_repository: Repository for contacts
             response_repository: Repository for campaign responses
+            attribution_repository: Repository for materialized campaign attribution
         """
         self.conversion_repository = conversion_repository
         self.campaign_repository = campaign_repository
         self.contact_repository = contact_repository
         self.response_repository = response_repository
+        self.attribution_repository = attribution_repository
     
     def _serialize_decimals(self, obj):
         """Convert Decimal objects to strings for JSON serialization."""
@@ -520,6 +524,106 @@ class ConversionTrackingService:
             logger.error(f"Error calculating attribution weights: {e}")
             return Failure(f"Error: {str(e)}", code="ATTRIBUTION_ERROR")
     
+    def calculate_campaign_attribution(self,
+                                       campaign_ids: Optional[List[int]] = None,
+                                       attribution_model: Optional[str] = None) -> Result[Dict[int, Any]]:
+        """
+        Calculate multi-touch attribution for many campaigns in one batch.
+        
+        Args:
+            campaign_ids: Campaigns to attribute (all campaigns with conversions if None)
+            attribution_model: Model to calculate (all models if None)
+            
+        Returns:
+            Result mapping campaign ID to its attribution, keyed by model when
+            no model is given
+        """
+        try:
+            if attribution_model and attribution_model not in self.VALID_ATTRIBUTION_MODELS:
+                return Failure(
+                    f"Unsupported attribution model: {attribution_model}",
+                    code="INVALID_MODEL"
+                )
+            
+            attribution = self.conversion_repository.calculate_campaign_attribution(
+                campaign_ids=campaign_ids,
+                attribution_models=[attribution_model] if attribution_model else None
+            )
+            if attribution_model:
+                attribution = {
+                    campaign_id: models[attribution_model] for campaign_id, models in attribution.items()
+                }
+            
+            return Success(attribution)
+            
+        except Exception as e:
+            logger.error(f"Error calculating campaign attribution: {e}")
+            return Failure(f"Error: {str(e)}", code="ATTRIBUTION_ERROR")
+    
+    def refresh_campaign_attribution(self) -> Result[Dict[str, Any]]:
+        """
+        Rebuild the materialized attribution of every campaign and model.
+        
+        Returns:
+            Result with the number of campaigns and rows written
+        """
+        if not self.attribution_repository:
+            return Failure("Attribution repository not configured", code="NOT_CONFIGURED")
+        
+        try:
+            attribution = self.conversion_repository.calculate_campaign_attribution()
+            calculated_at = utc_now()
+            rows = [
+                {
+                    'campaign_id': campaign_id,
+                    'attribution_model': model,
+                    'conversion_count': summary['conversion_count'],
+                    'total_conversion_value': summary['total_conversion_value'],
+                    'attributed_value': summary['attributed_value'],
+                    'average_touchpoints': float(summary['average_touchpoints']),
+                    'calculated_at': calculated_at
+                }
+                for campaign_id, models in attribution.items()
+                for model, summary in models.items()
+            ]
+            
+            self.attribution_repository.replace_all(rows)
+            self.attribution_repository.commit()
+            
+            logger.info(f"Refreshed attribution for {len(attribution)} campaigns")
+            return Success({
+                'campaigns': len(attribution),
+                'rows': len(rows),
+                'calculated_at': calculated_at
+            })
+            
+        except Exception as e:
+            self.attribution_repository.rollback()
+            logger.error(f"Error refreshing campaign attribution: {e}")
+            return Failure(f"Error: {str(e)}", code="ATTRIBUTION_ERROR")
+    
+    def get_campaign_attribution(self, campaign_id: int) -> Result[Dict[str, Any]]:
+        """
+        Get the materialized attribution of a campaign.
+        
+        Args:
+            campaign_id: ID of the campaign
+            
+        Returns:
+            Result mapping attribution model to its attribution, empty until
+            the first refresh that includes the campaign
+        """
+        if not self.attribution_repository:
+            return Failure("Attribution repository not configured", code="NOT_CONFIGURED")
+        
+        try:
+            rows = self.attribution_repository.get_for_campaign(campaign_id)
+            return Success({model: row.to_dict() for model, row in rows.items()})
+            
+        except Exception as e:
+            logger.error(f"Error getting attribution for campaign {campaign_id}: {e}")
+            return Failure(f"Error: {str(e)}", code="ATTRIBUTION_ERROR")
+    
     # ===== Funnel Analysis =====
     
     def analyze_conversion_funnel(self, campaign_id: int) -> Result[Dict[str, Any]]:
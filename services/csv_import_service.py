@@ -4,10 +4,10 @@ CSV Import Service - Enhanced CSV import with smart column detection and list ma
 
 import csv
 import os
-import re
 import logging
 from datetime import datetime
 from utils.datetime_utils import utc_now
+from utils import normalization
 from typing import List, Dict, Optional, Tuple, Any
 from werkzeug.datastructures import FileStorage
 
@@ -137,7 +137,8 @@ class CSVImportService:
                  campaign_list_repository: CampaignListRepository,
                  campaign_list_member_repository: CampaignListMemberRepository,
                  contact_repository: ContactRepository,
-                 contact_service: ContactService):
+                 contact_service: ContactService,
+                 dashboard_snapshot_service=None):
         """
         Initialize CSV Import Service with repository dependencies.
         
@@ -148,6 +149,7 @@ class CSVImportService:
             campaign_list_member_repository: Repository for campaign list members
             contact_repository: Repository for contacts
             contact_service: Contact service for business logic
+            dashboard_snapshot_service: Service keeping dashboard counters current (optional)
         """
         self.csv_import_repository = csv_import_repository
         self.contact_csv_import_repository = contact_csv_import_repository
@@ -155,6 +157,7 @@ class CSVImportService:
         self.campaign_list_member_repository = campaign_list_member_repository
         self.contact_repository = contact_repository
         self.contact_service = contact_service
+        self.dashboard_snapshot_service = dashboard_snapshot_service
     
     def detect_format(self, headers: List[str], filename: str) -> Optional[str]:
         """Detect CSV format based on headers and filename"""
@@ -213,34 +216,7 @@ class CSVImportService:
     
     def normalize_phone(self, phone: str) -> Optional[str]:
         """Normalize phone number to a consistent format"""
-        if not phone:
-            return None
-        
-        # Remove all non-digit characters
-        digits = re.sub(r'\D', '', str(phone))
-        
-        # Validate meaningful digits in the original phone number part
-        if len(digits) >= 10:
-            # Check the main 10-digit phone number part (excluding country code)
-            phone_part = digits[-10:] if len(digits) == 11 else digits
-            if phone_part == '0' * 10:  # Reject all zeros
-                return None
-            if len(set(phone_part)) <= 1:  # Reject all same digit
-                return None
-        
-        # Handle different lengths
-        if len(digits) == 10:
-            # Add US country code
-            digits = '1' + digits
-        elif len(digits) == 11 and digits[0] == '1':
-            # Already has country code
-            pass
-        else:
-            # Invalid length
-            return None
-        
-        # Format as +1XXXXXXXXXX
-        return f"+{digits}"
+        return normalization.normalize_us_phone(phone, reject_repeated_digits=True)
 
     def import_contacts(self, file: FileStorage, 
                        list_name: Optional[str] = None,
@@ -565,6 +541,9 @@ class CSVImportService:
         results['import_id'] = csv_import.id if csv_import else None
         results['list_id'] = campaign_list.id if campaign_list else None
         
+        if self.dashboard_snapshot_service:
+            self.dashboard_snapshot_service.record_contacts_created(len(results['contacts_created']))
+        
         logger.info(f"CSV import completed: import_id={results['import_id']}, list_id={results['list_id']}")
         
         return results
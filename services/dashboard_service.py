@@ -5,7 +5,7 @@ Refactored to use Repository Pattern
 """
 
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from flask import current_app
 
 
@@ -59,6 +59,58 @@ class DashboardService:
         Get all dashboard statistics using repositories
         Returns dict with all stats for dashboard cards
         """
+        stats = self._get_base_stats()
+        
+        # Messaging metrics using repository methods
+        activity_repo = self._get_activity_repository()
+        stats['overall_response_rate'] = activity_repo.calculate_overall_response_rate()
+        
+        # SMS bounce metrics (30 day)
+        metrics_service = self._get_sms_metrics_service()
+        sms_metrics = metrics_service.get_global_metrics(days=30)
+        self._apply_sms_metrics(stats, sms_metrics)
+        
+        return stats
+
+    def get_dashboard_stats_with_counters(self, days: int = 30) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Get dashboard statistics together with the raw message counters.
+        Used as the reconciliation source for DashboardSnapshotService.
+        
+        The message tables are scanned once: the direction counts give the
+        response rate and the outgoing/incoming counters, and the daily stats
+        give both the daily buckets and the bounce/delivery metrics.
+
+        Args:
+            days: Number of days of daily sent/bounced buckets and bounce metrics
+
+        Returns:
+            Tuple of (stats with the keys of get_dashboard_stats, counters with
+            outgoing_messages, incoming_messages and daily stats)
+        """
+        from services.sms_metrics_service import SMSMetricsService
+        
+        stats = self._get_base_stats()
+        activity_repo = self._get_activity_repository()
+        
+        direction_counts = activity_repo.get_message_direction_counts()
+        outgoing = direction_counts.get('outgoing', 0)
+        incoming = direction_counts.get('incoming', 0)
+        # Same rounding as ActivityRepository.calculate_overall_response_rate
+        stats['overall_response_rate'] = round((incoming / outgoing) * 100, 1) if outgoing else 0
+        
+        daily = activity_repo.get_daily_message_stats(days=days)
+        self._apply_sms_metrics(stats, SMSMetricsService.summarize_daily_stats(daily, days))
+        
+        counters = {
+            'outgoing_messages': outgoing,
+            'incoming_messages': incoming,
+            'daily': daily
+        }
+        return stats, counters
+
+    def _get_base_stats(self) -> Dict[str, Any]:
+        """Contact, campaign and today's message counts shared by all stats views"""
         stats = {}
         
         # Get repositories
@@ -78,41 +130,28 @@ class DashboardService:
         stats['monthly_revenue'] = 12500  # TODO: Implement actual revenue tracking
         stats['revenue_growth'] = 8.5  # TODO: Calculate actual growth
         
-        # Messaging metrics using repository methods
         stats['messages_today'] = activity_repo.get_messages_sent_today_count()
-        stats['overall_response_rate'] = activity_repo.calculate_overall_response_rate()
-        
-        # SMS bounce metrics (30 day)
-        metrics_service = self._get_sms_metrics_service()
-        sms_metrics = metrics_service.get_global_metrics(days=30)
+        return stats
+
+    @staticmethod
+    def _apply_sms_metrics(stats: Dict[str, Any], sms_metrics: Dict[str, Any]) -> None:
+        """Copy the 30 day SMS bounce metrics onto the dashboard stats"""
         stats['bounce_rate'] = sms_metrics.get('bounce_rate', 0)
         stats['delivery_rate'] = sms_metrics.get('delivery_rate', 0)
         stats['total_messages_30d'] = sms_metrics.get('total_sent', 0)
         stats['bounced_messages_30d'] = sms_metrics.get('bounced', 0)
-        
-        return stats
-    
+
     def get_activity_timeline(self, limit: int = 20) -> List[Dict[str, Any]]:
         """
         Get recent activity for the dashboard timeline using repository
-        Returns list of formatted activity items
+        Returns list of formatted activity items built from conversation summaries
         """
-        # Get conversations with recent activity using repository
+        # Conversations are already ordered by last activity and carry a
+        # summary of their latest activity, so no activities are loaded
         conversation_repo = self._get_conversation_repository()
         conversations = conversation_repo.get_recent_conversations_with_activities(limit=limit)
         
-        timeline_items = []
-        for conv in conversations:
-            # Get the most recent activity from pre-loaded activities
-            last_activity = max(conv.activities, key=lambda act: act.created_at) if conv.activities else None
-            if last_activity:
-                item = self._format_activity_item(conv, last_activity)
-                timeline_items.append(item)
-        
-        # Sort by most recent activity timestamp descending
-        timeline_items.sort(key=lambda x: x['activity_timestamp'], reverse=True)
-        
-        return timeline_items
+        return [self._format_activity_item(conv) for conv in conversations]
     
     def get_recent_campaigns(self, limit: int = 3):
         """Get recently created campaigns using repository"""
@@ -138,29 +177,27 @@ class DashboardService:
     # Private helper methods
     # All database queries now use repository pattern
     
-    def _format_activity_item(self, conversation, activity) -> Dict[str, Any]:
-        """Format an activity for the timeline"""
+    def _format_activity_item(self, conversation) -> Dict[str, Any]:
+        """Format a conversation's latest activity summary for the timeline"""
+        activity_type = conversation.last_activity_type
+        preview = conversation.last_message_preview
+        
         # Determine content based on activity type
-        if activity.activity_type == 'call':
-            if activity.direction == 'incoming':
-                content = "📞 Incoming call"
-            else:
-                content = "📞 Outgoing call"
-            if activity.duration_seconds:
-                duration_min = activity.duration_seconds // 60
-                content += f" ({duration_min}m)"
-        elif activity.activity_type == 'voicemail':
+        if activity_type == 'call':
+            content = f"📞 {preview or 'Call'}"
+        elif activity_type == 'voicemail':
             content = "🎤 Voicemail received"
         else:
             # Message type
-            content = activity.body or "📱 Message (no content)"
+            content = preview or "📱 Message (no content)"
         
+        last_activity_at = conversation.last_activity_at
         return {
             'contact_id': conversation.contact.id,
             'contact_name': conversation.contact.first_name or conversation.contact.phone,
             'contact_number': conversation.contact.phone,
             'latest_message_body': content,
-            'timestamp': activity.created_at.strftime('%H:%M') if activity.created_at else 'Just now',
-            'activity_timestamp': activity.created_at,
-            'activity_type': activity.activity_type
-        }
\ No newline at end of file
+            'timestamp': last_activity_at.strftime('%H:%M') if last_activity_at else 'Just now',
+            'activity_timestamp': last_activity_at,
+            'activity_type': activity_type
+        }
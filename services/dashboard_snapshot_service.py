@@ -0,0 +1,313 @@
+"""
+Dashboard Snapshot Service
+Serves dashboard statistics from a precomputed Redis snapshot
+
+The snapshot is seeded by a periodic reconciliation that runs the original
+DashboardService aggregate queries, and kept current in between by cheap
+incremental counter updates emitted from the webhook, send and import paths.
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from utils.datetime_utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+
+class DashboardSnapshotService:
+    """Redis-backed dashboard snapshot with incremental counters"""
+
+    SNAPSHOT_KEY = 'dashboard:snapshot'
+    DAILY_SENT_KEY = 'dashboard:messages_sent:{day}'
+    DAILY_BOUNCED_KEY = 'dashboard:messages_bounced:{day}'
+
+    # Rolling window used for the SMS delivery metrics (matches get_global_metrics(days=30))
+    METRICS_WINDOW_DAYS = 30
+    # Daily buckets outlive the window so a late reconciliation never reads expired keys
+    DAILY_KEY_TTL_SECONDS = 86400 * (METRICS_WINDOW_DAYS + 5)
+
+    # Activity types and statuses counted by ActivityRepository's dashboard queries
+    MESSAGE_ACTIVITY_TYPES = ('message',)
+    BOUNCED_STATUSES = ('failed', 'undelivered', 'rejected', 'blocked')
+
+    # Snapshot fields that are only refreshed by reconciliation
+    RECONCILED_FIELDS = (
+        'contacts_added_this_week',
+        'active_campaigns',
+        'campaign_response_rate',
+        'monthly_revenue',
+        'revenue_growth',
+    )
+
+    def __init__(self, dashboard_service, redis_client=None, stale_after_seconds: int = 1800):
+        """
+        Initialize with injected dependencies.
+
+        Args:
+            dashboard_service: DashboardService whose aggregate queries are the reconciliation source
+            redis_client: Redis client holding the snapshot (None disables the snapshot)
+            stale_after_seconds: Age after which a snapshot is reported as stale
+        """
+        self.dashboard_service = dashboard_service
+        self.redis_client = redis_client
+        self.stale_after_seconds = stale_after_seconds
+
+    @property
+    def is_enabled(self) -> bool:
+        """Whether a Redis backend is configured for the snapshot"""
+        return self.redis_client is not None
+
+    # Read path
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """
+        Get dashboard statistics from the snapshot in a single Redis round trip.
+
+        Falls back to the live aggregate queries when Redis is not configured or
+        unavailable, and seeds the snapshot on first read.
+
+        Returns:
+            Dict with the same keys as DashboardService.get_dashboard_stats plus
+            snapshot_at, snapshot_age_seconds, is_stale and snapshot_source
+        """
+        if not self.is_enabled:
+            return self._live_stats()
+
+        try:
+            today = utc_now().date()
+            days = self._window_days(today)
+
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.hgetall(self.SNAPSHOT_KEY)
+            pipe.mget([self.DAILY_SENT_KEY.format(day=day.isoformat()) for day in days])
+            pipe.mget([self.DAILY_BOUNCED_KEY.format(day=day.isoformat()) for day in days])
+            snapshot, daily_sent, daily_bounced = pipe.execute()
+        except Exception as e:
+            logger.warning(f"Dashboard snapshot unavailable, using live queries: {e}")
+            return self._live_stats()
+
+        snapshot = self._decode_hash(snapshot)
+        if 'reconciled_at' not in snapshot:
+            logger.info("Dashboard snapshot not seeded yet, reconciling")
+            return self.reconcile()
+
+        return self._build_stats(
+            snapshot,
+            [self._to_int(value) for value in daily_sent],
+            [self._to_int(value) for value in daily_bounced]
+        )
+
+    # Reconciliation
+
+    def reconcile(self) -> Dict[str, Any]:
+        """
+        Rebuild the snapshot from the original aggregate queries, correcting any drift.
+
+        Returns:
+            The reconciled dashboard statistics
+        """
+        stats, counters = self.dashboard_service.get_dashboard_stats_with_counters(days=self.METRICS_WINDOW_DAYS)
+        reconciled_at = utc_now()
+
+        if not self.is_enabled:
+            return self._with_staleness(stats, reconciled_at, source='live')
+
+        snapshot = {field: stats.get(field, 0) for field in self.RECONCILED_FIELDS}
+        snapshot.update({
+            'contact_count': stats.get('contact_count', 0),
+            'outgoing_messages': counters['outgoing_messages'],
+            'incoming_messages': counters['incoming_messages'],
+            'reconciled_at': reconciled_at.isoformat(),
+            'updated_at': reconciled_at.isoformat()
+        })
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=True)
+            pipe.delete(self.SNAPSHOT_KEY)
+            pipe.hset(self.SNAPSHOT_KEY, mapping=snapshot)
+            for day_stats in counters['daily']:
+                day = day_stats['date'].isoformat()
+                pipe.set(self.DAILY_SENT_KEY.format(day=day), day_stats['sent'],
+                         ex=self.DAILY_KEY_TTL_SECONDS)
+                pipe.set(self.DAILY_BOUNCED_KEY.format(day=day), day_stats['bounced'],
+                         ex=self.DAILY_KEY_TTL_SECONDS)
+            pipe.execute()
+            logger.info("Dashboard snapshot reconciled", extra={'reconciled_at': snapshot['reconciled_at']})
+        except Exception as e:
+            logger.error(f"Failed to write dashboard snapshot: {e}")
+
+        return self._with_staleness(stats, reconciled_at, source='reconciled')
+
+    # Incremental updates
+
+    def record_contacts_created(self, count: int = 1) -> None:
+        """
+        Record newly created contacts (webhook auto-creation, CSV and PropertyRadar imports).
+
+        Args:
+            count: Number of contacts created
+        """
+        if count <= 0:
+            return
+        self._apply(lambda pipe: pipe.hincrby(self.SNAPSHOT_KEY, 'contact_count', count))
+
+    def record_activity(self, activity_type: str, direction: str,
+                        status: Optional[str] = None,
+                        created_at: Optional[datetime] = None) -> None:
+        """
+        Record a newly written activity.
+
+        Only activities counted by the reconciliation queries update the
+        counters, so the snapshot converges to the same numbers.
+
+        Args:
+            activity_type: Activity type ('message', 'call', ...)
+            direction: 'incoming' or 'outgoing'
+            status: Delivery status of the message
+            created_at: Activity timestamp (defaults to now)
+        """
+        if activity_type not in self.MESSAGE_ACTIVITY_TYPES:
+            return
+
+        day = self._bucket_day(created_at)
+
+        def update(pipe):
+            if direction == 'outgoing':
+                pipe.hincrby(self.SNAPSHOT_KEY, 'outgoing_messages', 1)
+                self._incr_daily(pipe, self.DAILY_SENT_KEY, day)
+            elif direction == 'incoming':
+                pipe.hincrby(self.SNAPSHOT_KEY, 'incoming_messages', 1)
+            if status in self.BOUNCED_STATUSES:
+                self._incr_daily(pipe, self.DAILY_BOUNCED_KEY, day)
+
+        self._apply(update)
+
+    def record_status_change(self, activity_type: str, old_status: Optional[str],
+                             new_status: Optional[str],
+                             created_at: Optional[datetime] = None) -> None:
+        """
+        Record a delivery status change on an existing activity.
+
+        Args:
+            activity_type: Activity type of the updated activity
+            old_status: Previous delivery status
+            new_status: New delivery status
+            created_at: Original activity timestamp (selects the daily bucket)
+        """
+        if activity_type not in self.MESSAGE_ACTIVITY_TYPES:
+            return
+
+        was_bounced = old_status in self.BOUNCED_STATUSES
+        is_bounced = new_status in self.BOUNCED_STATUSES
+        if was_bounced == is_bounced:
+            return
+
+        day = self._bucket_day(created_at)
+        delta = 1 if is_bounced else -1
+        self._apply(lambda pipe: self._incr_daily(pipe, self.DAILY_BOUNCED_KEY, day, delta))
+
+    # Private helpers
+
+    def _apply(self, update) -> None:
+        """Apply an incremental update in one pipeline, never failing the caller"""
+        if not self.is_enabled:
+            return
+        try:
+            pipe = self.redis_client.pipeline(transaction=True)
+            update(pipe)
+            pipe.hset(self.SNAPSHOT_KEY, 'updated_at', utc_now().isoformat())
+            pipe.execute()
+        except Exception as e:
+            # Drift is corrected by the next reconciliation
+            logger.warning(f"Failed to update dashboard snapshot counters: {e}")
+
+    def _incr_daily(self, pipe, key_template: str, day: date, amount: int = 1) -> None:
+        """Increment a daily bucket and refresh its expiry"""
+        key = key_template.format(day=day.isoformat())
+        pipe.incrby(key, amount)
+        pipe.expire(key, self.DAILY_KEY_TTL_SECONDS)
+
+    def _bucket_day(self, created_at: Optional[datetime]) -> date:
+        """Daily bucket for an activity timestamp"""
+        return (created_at or utc_now()).date()
+
+    def _window_days(self, today: date) -> List[date]:
+        """Days in the metrics window, oldest first, ending today"""
+        return [today - timedelta(days=self.METRICS_WINDOW_DAYS - 1 - i)
+                for i in range(self.METRICS_WINDOW_DAYS)]
+
+    def _build_stats(self, snapshot: Dict[str, str], daily_sent: List[int],
+                     daily_bounced: List[int]) -> Dict[str, Any]:
+        """Derive dashboard statistics from raw snapshot counters"""
+        outgoing = self._to_int(snapshot.get('outgoing_messages'))
+        incoming = self._to_int(snapshot.get('incoming_messages'))
+        total_sent = sum(daily_sent)
+        total_bounced = sum(daily_bounced)
+
+        stats = {
+            'contact_count': self._to_int(snapshot.get('contact_count')),
+            'contacts_added_this_week': self._to_int(snapshot.get('contacts_added_this_week')),
+            'active_campaigns': self._to_int(snapshot.get('active_campaigns')),
+            'campaign_response_rate': self._to_number(snapshot.get('campaign_response_rate')),
+            'monthly_revenue': self._to_number(snapshot.get('monthly_revenue')),
+            'revenue_growth': self._to_number(snapshot.get('revenue_growth')),
+            'messages_today': daily_sent[-1] if daily_sent else 0,
+            'overall_response_rate': round((incoming / outgoing) * 100, 1) if outgoing else 0,
+            'bounce_rate': (total_bounced / total_sent * 100) if total_sent > 0 else 0.0,
+            'delivery_rate': ((total_sent - total_bounced) / total_sent * 100) if total_sent > 0 else 0.0,
+            'total_messages_30d': total_sent,
+            'bounced_messages_30d': total_bounced
+        }
+
+        reconciled_at = datetime.fromisoformat(snapshot['reconciled_at'])
+        return self._with_staleness(stats, reconciled_at, source='snapshot')
+
+    def _with_staleness(self, stats: Dict[str, Any], reconciled_at: datetime,
+                        source: str) -> Dict[str, Any]:
+        """Attach staleness information to a stats dict"""
+        age_seconds = max(0, int((utc_now() - reconciled_at).total_seconds()))
+        stats = dict(stats)
+        stats['snapshot_at'] = reconciled_at
+        stats['snapshot_age_seconds'] = age_seconds
+        stats['is_stale'] = age_seconds > self.stale_after_seconds
+        stats['snapshot_source'] = source
+        return stats
+
+    def _live_stats(self) -> Dict[str, Any]:
+        """Compute statistics directly with the original aggregate queries"""
+        return self._with_staleness(self.dashboard_service.get_dashboard_stats(), utc_now(), source='live')
+
+    @staticmethod
+    def _decode_hash(raw: Dict) -> Dict[str, str]:
+        """Decode a Redis hash that may contain bytes keys/values"""
+        decoded = {}
+        for key, value in (raw or {}).items():
+            if isinstance(key, bytes):
+                key = key.decode('utf-8')
+            if isinstance(value, bytes):
+                value = value.decode('utf-8')
+            decoded[key] = value
+        return decoded
+
+    @staticmethod
+    def _to_int(value) -> int:
+        """Convert a Redis value to int, treating missing keys as zero"""
+        if value is None:
+            return 0
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return 0
+
+    @staticmethod
+    def _to_number(value):
+        """Convert a Redis value to an int or float, treating missing keys as zero"""
+        if value is None:
+            return 0
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return 0
+        return int(number) if number.is_integer() else number
@@ -10,6 +10,7 @@ from typing import Dict, Any, Tuple
 from urllib.parse import urlparse
 
 from repositories.diagnostics_repository import DiagnosticsRepository
+from utils import query_instrumentation
 
 
 class DiagnosticsService:
@@ -265,4 +266,21 @@ class DiagnosticsService:
         except Exception as e:
             metrics['memory'] = {'error': str(e)}
         
-        return metrics
\ No newline at end of file
+        metrics['queries'] = self.get_query_statistics()
+        
+        return metrics
+    
+    def get_query_statistics(self) -> Dict[str, Any]:
+        """
+        Get SQL query statistics per request endpoint and Celery task.
+        
+        Returns:
+            Dictionary with instrumentation settings, per-scope totals
+            (heaviest database time first) and recent probable N+1 queries
+        """
+        return {
+            'enabled': query_instrumentation.settings['enabled'],
+            'n_plus_one_threshold': query_instrumentation.settings['n_plus_one_threshold'],
+            'slow_query_ms': query_instrumentation.settings['slow_query_ms'],
+            **query_instrumentation.aggregates.snapshot()
+        }
\ No newline at end of file
@@ -12,7 +12,7 @@ from dataclasses import dataclass
 from functools import lru_cache
 
 from repositories.engagement_event_repository import EngagementEventRepository
-from repositories.engagement_score_repository import EngagementScoreRepository
+from repositories.engagement_score_repository import EngagementScoreRepository, percent_ranks
 from repositories.contact_repository import ContactRepository
 from services.common.result import Result
 from crm_database import EngagementEvent, EngagementScore, Contact
@@ -374,17 +374,8 @@ class EngagementScoringService:
         if len(raw_scores) == 1:
             return [50.0]  # Single score gets median percentile
         
-        # Sort scores for percentile calculation
-        sorted_scores = sorted(raw_scores)
-        score_to_percentile = {}
-        
-        for i, score in enumerate(sorted_scores):
-            # Calculate percentile (0-100)
-            percentile = (i / (len(sorted_scores) - 1)) * 100.0
-            score_to_percentile[score] = percentile
-        
-        # Map original scores to percentiles
-        return [score_to_percentile[score] for score in raw_scores]
+        # Same PERCENT_RANK() ranking the repository stores for a campaign
+        return [rank * 100.0 for rank in percent_ranks(raw_scores).tolist()]
     
     def calculate_engagement_score(self, contact_id: int, campaign_id: int) -> EngagementScore:
         """
@@ -479,6 +470,11 @@ class EngagementScoringService:
                     logger.error(f"Error calculating score for contact {contact.id}: {e}")
                     # Continue with other contacts
             
+            # Rank the campaign's scores once the batch is stored
+            if results:
+                self.score_repository.update_percentile_ranks(campaign_id)
+                self.score_repository.commit()
+            
             return results
             
         except Exception as e:
@@ -0,0 +1,359 @@
+"""
+ExportService - Streaming, chunked analytics exports
+Writes CSV/NDJSON incrementally from server-side cursors, either to a Flask
+streaming response or to a file for resumable background export jobs
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from utils.datetime_utils import utc_now, ensure_utc
+
+from repositories.roi_repository import ROIRepository
+from repositories.conversion_repository import ConversionRepository
+from repositories.campaign_response_repository import CampaignResponseRepository
+from repositories.export_job_repository import ExportJobRepository
+from services.common.result import Result, Success, Failure
+
+logger = logging.getLogger(__name__)
+
+
+class ExportService:
+    """Service for streaming analytics exports and background export jobs"""
+
+    # Dataset name -> (repository attribute, statement builder)
+    DATASETS = {
+        'customer_ltv': ('roi_repository', 'build_ltv_export_query'),
+        'campaign_costs': ('roi_repository', 'build_cost_export_query'),
+        'conversions': ('conversion_repository', 'build_export_query'),
+        'responses': ('campaign_response_repository', 'build_export_query'),
+    }
+
+    # Format -> response mimetype
+    FORMATS = {
+        'csv': 'text/csv',
+        'ndjson': 'application/x-ndjson',
+    }
+
+    DEFAULT_BATCH_SIZE = 1000
+    PAGES_PER_CHECKPOINT = 10
+    # A running job whose last checkpoint is older than this has lost its worker
+    LEASE_TIMEOUT = timedelta(minutes=10)
+
+    def __init__(self,
+                 roi_repository: ROIRepository,
+                 conversion_repository: ConversionRepository,
+                 campaign_response_repository: CampaignResponseRepository,
+                 export_job_repository: ExportJobRepository,
+                 export_dir: Optional[str] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Initialize service with repository dependencies.
+
+        Args:
+            roi_repository: Source of LTV and campaign cost rows
+            conversion_repository: Source of conversion event rows
+            campaign_response_repository: Source of campaign response rows
+            export_job_repository: Repository for export job checkpoints
+            export_dir: Directory background exports are written to
+            batch_size: Rows fetched per cursor batch
+        """
+        self.roi_repository = roi_repository
+        self.conversion_repository = conversion_repository
+        self.campaign_response_repository = campaign_response_repository
+        self.export_job_repository = export_job_repository
+        self.export_dir = export_dir or os.path.join(os.getcwd(), 'exports')
+        self.batch_size = batch_size
+
+    # ===== Streaming Exports =====
+
+    def stream_export(self, dataset: str, fmt: str,
+                      filters: Optional[Dict[str, Any]] = None) -> Result[Iterator[str]]:
+        """
+        Stream an export as text chunks, one chunk per cursor batch.
+
+        The returned iterator holds a single batch in memory at a time and is
+        meant to be passed to a Flask streaming response.
+
+        Args:
+            dataset: Dataset name from DATASETS
+            fmt: Output format ('csv' or 'ndjson')
+            filters: Optional campaign_id, start_date and end_date (ISO dates)
+
+        Returns:
+            Result containing an iterator of text chunks
+        """
+        validation = self._validate(dataset, fmt, filters)
+        if validation.is_failure:
+            return validation
+
+        repository, statement = self._build_statement(dataset, validation.data)
+        return Success(self._iter_chunks(repository, statement, fmt))
+
+    def _iter_chunks(self, repository, statement, fmt: str) -> Iterator[str]:
+        """Yield the header (CSV only) and then one encoded chunk per batch"""
+        columns = list(statement.selected_columns.keys())
+        if fmt == 'csv':
+            yield self._encode_rows([columns], columns, 'csv')
+
+        for batch in repository.stream_batches(statement, self.batch_size):
+            yield self._encode_rows(batch, columns, fmt)
+
+    # ===== Background Export Jobs =====
+
+    def create_export_job(self, dataset: str, fmt: str,
+                          filters: Optional[Dict[str, Any]] = None,
+                          created_by: Optional[int] = None) -> Result[Dict[str, Any]]:
+        """
+        Create a pending background export job.
+
+        Args:
+            dataset: Dataset name from DATASETS
+            fmt: Output format ('csv' or 'ndjson')
+            filters: Optional campaign_id, start_date and end_date (ISO dates)
+            created_by: Id of the requesting user
+
+        Returns:
+            Result containing the job dictionary
+        """
+        validation = self._validate(dataset, fmt, filters)
+        if validation.is_failure:
+            return validation
+
+        try:
+            job = self.export_job_repository.create(
+                dataset=dataset,
+                format=fmt,
+                filters=self._clean_filters(filters),
+                status='pending',
+                created_by=created_by
+            )
+            self.export_job_repository.commit()
+            return Success(job.to_dict())
+        except Exception as e:
+            logger.error(f"Error creating export job for {dataset}: {e}")
+            self.export_job_repository.rollback()
+            return Failure(f"Failed to create export job: {str(e)}", code="EXPORT_JOB_CREATE_FAILED")
+
+    def queue_export_job(self, job_id: int) -> Result[Dict[str, Any]]:
+        """
+        Queue an export job, or resume an interrupted one, on Celery.
+
+        Args:
+            job_id: Export job id
+
+        Returns:
+            Result containing the job dictionary
+        """
+        job = self.export_job_repository.get_by_id(job_id)
+        if not job:
+            return Failure(f"Export job {job_id} not found", code="EXPORT_JOB_NOT_FOUND")
+        if job.status == 'completed':
+            return Success(job.to_dict())
+        if job.status == 'running':
+            if not self._lease_expired(job):
+                return Failure(f"Export job {job_id} is already running", code="EXPORT_JOB_RUNNING")
+            # Its worker died; committing the task id refreshes updated_at,
+            # so hand the job back as pending for the new task to claim
+            job.status = 'pending'
+
+        try:
+            from tasks.export_tasks import run_export_job
+
+            task = run_export_job.delay(job.id)
+            job.celery_task_id = task.id
+            self.export_job_repository.commit()
+            return Success(job.to_dict())
+        except Exception as e:
+            logger.error(f"Error queueing export job {job_id}: {e}")
+            return Failure(f"Failed to queue export job: {str(e)}", code="EXPORT_JOB_QUEUE_FAILED")
+
+    def run_export_job(self, job_id: int) -> Result[Dict[str, Any]]:
+        """
+        Write an export job to its file, resuming from the last checkpoint.
+
+        Rows are read in keyset pages of PAGES_PER_CHECKPOINT batches. After
+        each page the file is flushed and the row count, byte offset and last
+        row id are committed, so a resumed run truncates the file to the last
+        checkpoint and continues after the last row id.
+
+        Args:
+            job_id: Export job id
+
+        Returns:
+            Result containing the job dictionary
+        """
+        job = self.export_job_repository.get_by_id(job_id)
+        if not job:
+            return Failure(f"Export job {job_id} not found", code="EXPORT_JOB_NOT_FOUND")
+        if job.status == 'completed':
+            return Success(job.to_dict())
+        if not self.export_job_repository.claim(job.id, utc_now() - self.LEASE_TIMEOUT):
+            # Another worker holds the job; writing too would corrupt its file
+            return Failure(f"Export job {job_id} is already running", code="EXPORT_JOB_RUNNING")
+
+        try:
+            filters = self._parse_filters(job.filters)
+            repository, statement = self._build_statement(job.dataset, filters)
+            columns = list(statement.selected_columns.keys())
+            total_rows = job.total_rows
+            if total_rows is None:
+                total_rows = repository.count_statement(statement)
+
+            os.makedirs(self.export_dir, exist_ok=True)
+            file_path = job.file_path or os.path.join(self.export_dir, f'export_{job.id}.{job.format}')
+            self.export_job_repository.mark_running(job, file_path, total_rows)
+
+            rows_exported = job.rows_exported or 0
+            bytes_written = job.bytes_written or 0
+            last_row_id = job.last_row_id or 0
+            page_size = self.batch_size * self.PAGES_PER_CHECKPOINT
+
+            with open(file_path, 'r+b' if os.path.exists(file_path) else 'wb') as handle:
+                # Drop anything written after the last committed checkpoint
+                handle.truncate(bytes_written)
+                handle.seek(bytes_written)
+
+                if bytes_written == 0 and job.format == 'csv':
+                    bytes_written += handle.write(self._encode_rows([columns], columns, 'csv').encode('utf-8'))
+
+                while True:
+                    _, page = self._build_statement(job.dataset, filters, after_id=last_row_id)
+                    page_rows = 0
+                    for batch in repository.stream_batches(page.limit(page_size), self.batch_size):
+                        bytes_written += handle.write(self._encode_rows(batch, columns, job.format).encode('utf-8'))
+                        page_rows += len(batch)
+                        last_row_id = batch[-1][0]
+
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                    rows_exported += page_rows
+                    self.export_job_repository.record_progress(job, rows_exported, bytes_written, last_row_id)
+
+                    if page_rows < page_size:
+                        break
+
+            self.export_job_repository.mark_completed(job)
+            logger.info(f"Export job {job.id} completed: {rows_exported} rows, {bytes_written} bytes")
+            return Success(job.to_dict())
+
+        except Exception as e:
+            logger.error(f"Export job {job_id} failed: {e}")
+            try:
+                if isinstance(e, SQLAlchemyError):
+                    self.export_job_repository.rollback()
+                self.export_job_repository.mark_failed(job, str(e))
+            except Exception as mark_error:
+                logger.error(f"Could not mark export job {job_id} as failed: {mark_error}")
+            return Failure(f"Export job failed: {str(e)}", code="EXPORT_JOB_FAILED")
+
+    def get_export_job(self, job_id: int) -> Result[Dict[str, Any]]:
+        """
+        Get export job status and progress.
+
+        Args:
+            job_id: Export job id
+
+        Returns:
+            Result containing the job dictionary
+        """
+        job = self.export_job_repository.get_by_id(job_id)
+        if not job:
+            return Failure(f"Export job {job_id} not found", code="EXPORT_JOB_NOT_FOUND")
+        return Success(job.to_dict())
+
+    def get_export_file(self, job_id: int) -> Result[Tuple[str, str]]:
+        """
+        Get the file of a completed export job.
+
+        Args:
+            job_id: Export job id
+
+        Returns:
+            Result containing (file path, mimetype)
+        """
+        job = self.export_job_repository.get_by_id(job_id)
+        if not job:
+            return Failure(f"Export job {job_id} not found", code="EXPORT_JOB_NOT_FOUND")
+        if job.status != 'completed' or not job.file_path or not os.path.exists(job.file_path):
+            return Failure(f"Export job {job_id} is not ready for download", code="EXPORT_NOT_READY")
+        return Success((job.file_path, self.FORMATS[job.format]))
+
+    # ===== Helper Methods =====
+
+    def _lease_expired(self, job) -> bool:
+        """Whether a running job has gone without a checkpoint for LEASE_TIMEOUT"""
+        if not job.updated_at:
+            return True
+        return ensure_utc(job.updated_at) < utc_now() - self.LEASE_TIMEOUT
+
+    def _validate(self, dataset: str, fmt: str,
+                  filters: Optional[Dict[str, Any]]) -> Result[Dict[str, Any]]:
+        """Validate the export request and return parsed filters"""
+        if dataset not in self.DATASETS:
+            return Failure(f"Unknown export dataset: {dataset}", code="INVALID_DATASET")
+        if fmt not in self.FORMATS:
+            return Failure(f"Unsupported export format: {fmt}", code="INVALID_FORMAT")
+        try:
+            return Success(self._parse_filters(filters))
+        except (TypeError, ValueError) as e:
+            return Failure(f"Invalid export filters: {str(e)}", code="INVALID_FILTERS")
+
+    def _build_statement(self, dataset: str, filters: Dict[str, Any], after_id: int = 0):
+        """Return (repository, keyset-ordered select) for a dataset"""
+        repository_attr, builder = self.DATASETS[dataset]
+        repository = getattr(self, repository_attr)
+        return repository, getattr(repository, builder)(filters, after_id=after_id)
+
+    @staticmethod
+    def _clean_filters(filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Keep only the supported, non-empty filters for storage on the job"""
+        return {
+            key: value for key, value in (filters or {}).items()
+            if key in ('campaign_id', 'start_date', 'end_date') and value not in (None, '')
+        }
+
+    @classmethod
+    def _parse_filters(cls, filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Convert request filters to repository filters (end date is inclusive)"""
+        cleaned = cls._clean_filters(filters)
+        parsed = {}
+        if 'campaign_id' in cleaned:
+            parsed['campaign_id'] = int(cleaned['campaign_id'])
+        if 'start_date' in cleaned:
+            parsed['start_date'] = datetime.combine(date.fromisoformat(str(cleaned['start_date'])[:10]), datetime.min.time())
+        if 'end_date' in cleaned:
+            end_day = date.fromisoformat(str(cleaned['end_date'])[:10]) + timedelta(days=1)
+            parsed['end_date'] = datetime.combine(end_day, datetime.min.time())
+        return parsed
+
+    @classmethod
+    def _encode_rows(cls, rows: List[Any], columns: List[str], fmt: str) -> str:
+        """Encode a batch of rows as CSV lines or NDJSON lines"""
+        if fmt == 'csv':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerows([cls._format_value(value, fmt) for value in row] for row in rows)
+            return buffer.getvalue()
+
+        return ''.join(
+            json.dumps(dict(zip(columns, (cls._format_value(value, fmt) for value in row)))) + '\n'
+            for row in rows
+        )
+
+    @staticmethod
+    def _format_value(value: Any, fmt: str) -> Any:
+        """Convert database values to CSV/JSON friendly values"""
+        if isinstance(value, Decimal):
+            return str(value) if fmt == 'csv' else float(value)
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return value
@@ -3,21 +3,31 @@ GoogleCalendarService - Extracted from api_integrations.py
 Handles all Google Calendar API interactions with proper dependency injection
 """
 
-from typing import Optional, List, Dict, Any
+from typing import TYPE_CHECKING, Optional, List, Dict, Any
 from datetime import datetime
 from utils.datetime_utils import utc_now
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+from utils.lazy_imports import lazy_module
 from logging_config import get_logger
 
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+
 logger = get_logger(__name__)
 
+# The Google API client is imported when the calendar service is first built
+discovery = lazy_module('googleapiclient.discovery')
+api_errors = lazy_module('googleapiclient.errors')
+
+
+def build(*args, **kwargs):
+    """Build a Google API client (googleapiclient.discovery.build)"""
+    return discovery.build(*args, **kwargs)
+
 
 class GoogleCalendarService:
     """Service for interacting with Google Calendar API"""
     
-    def __init__(self, credentials: Optional[Credentials] = None):
+    def __init__(self, credentials: Optional['Credentials'] = None):
         """
         Initialize Google Calendar Service with credentials
         
@@ -37,7 +47,7 @@ class GoogleCalendarService:
                 return None
         return self._service
     
-    def set_credentials(self, credentials: Credentials):
+    def set_credentials(self, credentials: 'Credentials'):
         """
         Update credentials (useful when tokens are refreshed)
         
@@ -80,7 +90,7 @@ class GoogleCalendarService:
             logger.info(f"Retrieved {len(events)} upcoming events")
             return events
             
-        except HttpError as e:
+        except api_errors.HttpError as e:
             logger.error(f"Google Calendar API error: {e}")
             return []
         except Exception as e:
@@ -152,7 +162,7 @@ class GoogleCalendarService:
             )
             return created_event
             
-        except HttpError as e:
+        except api_errors.HttpError as e:
             logger.error(f"Google Calendar API error creating event: {e}")
             return None
         except Exception as e:
@@ -202,7 +212,7 @@ class GoogleCalendarService:
             logger.info("Google Calendar event updated", event_id=event_id)
             return updated_event
             
-        except HttpError as e:
+        except api_errors.HttpError as e:
             logger.error(f"Google Calendar API error updating event: {e}")
             return None
         except Exception as e:
@@ -237,7 +247,7 @@ class GoogleCalendarService:
             logger.info("Successfully deleted Google Calendar event", event_id=event_id)
             return True
             
-        except HttpError as e:
+        except api_errors.HttpError as e:
             if e.resp.status == 404:
                 logger.warning(f"Event {event_id} not found, may already be deleted")
                 return True  # Consider it successful if already deleted
@@ -274,7 +284,7 @@ class GoogleCalendarService:
             
             return event
             
-        except HttpError as e:
+        except api_errors.HttpError as e:
             if e.resp.status == 404:
                 logger.warning(f"Event {event_id} not found")
             else:
@@ -305,7 +315,7 @@ class GoogleCalendarService:
             logger.info(f"Retrieved {len(calendars)} calendars")
             return calendars
             
-        except HttpError as e:
+        except api_errors.HttpError as e:
             logger.error(f"Google Calendar API error listing calendars: {e}")
             return []
         except Exception as e:
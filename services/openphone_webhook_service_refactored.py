@@ -30,6 +30,8 @@ from services.opt_out_service import OptOutService
 
 if TYPE_CHECKING:
     from services.webhook_error_recovery_service import WebhookErrorRecoveryService
+    from services.dashboard_snapshot_service import DashboardSnapshotService
+    from services.sentiment_analysis_service import SentimentAnalysisService
 
 logger = logging.getLogger(__name__)
 
@@ -45,7 +47,10 @@ class OpenPhoneWebhookServiceRefactored:
                  contact_service: ContactService,
                  sms_metrics_service: SMSMetricsService,
                  opt_out_service: Optional['OptOutService'] = None,
-                 error_recovery_service: Optional['WebhookErrorRecoveryService'] = None):
+                 error_recovery_service: Optional['WebhookErrorRecoveryService'] = None,
+                 dashboard_snapshot_service: Optional['DashboardSnapshotService'] = None,
+                 sentiment_service: Optional['SentimentAnalysisService'] = None,
+                 classify_replies_async: bool = True):
         """
         Initialize with injected dependencies.
         
@@ -58,6 +63,10 @@ class OpenPhoneWebhookServiceRefactored:
             sms_metrics_service: Service for SMS metrics tracking
             opt_out_service: Service for opt-out processing (optional)
             error_recovery_service: Service for webhook error recovery (optional)
+            dashboard_snapshot_service: Service keeping dashboard counters current (optional)
+            sentiment_service: Cached sentiment classifier for campaign replies (optional)
+            classify_replies_async: Classify uncached replies in a Celery task
+                instead of during the webhook request
         """
         self.activity_repository = activity_repository
         self.conversation_repository = conversation_repository
@@ -67,6 +76,9 @@ class OpenPhoneWebhookServiceRefactored:
         self.sms_metrics_service = sms_metrics_service
         self.opt_out_service = opt_out_service
         self.error_recovery_service = error_recovery_service
+        self.dashboard_snapshot_service = dashboard_snapshot_service
+        self.sentiment_service = sentiment_service
+        self.classify_replies_async = classify_replies_async
     
     def validate_webhook_signature(self, payload_string: str, headers: Dict[str, str]) -> bool:
         """
@@ -296,6 +308,14 @@ class OpenPhoneWebhookServiceRefactored:
                     updated_at=utc_now()
                 )
                 
+                if self.dashboard_snapshot_service:
+                    self.dashboard_snapshot_service.record_status_change(
+                        existing_activity.activity_type,
+                        old_status,
+                        status,
+                        existing_activity.created_at
+                    )
+                
                 # Track metrics for outgoing messages
                 if existing_activity.direction == 'outgoing':
                     # Track delivery status changes
@@ -378,6 +398,11 @@ class OpenPhoneWebhookServiceRefactored:
                 created_at or utc_now()
             )
             
+            if self.dashboard_snapshot_service:
+                self.dashboard_snapshot_service.record_activity(
+                    'message', db_direction, status, activity_data['created_at']
+                )
+            
             # Track initial status for outgoing messages
             if db_direction == 'outgoing':
                 if status in ['failed', 'undelivered', 'rejected', 'blocked']:
@@ -720,6 +745,8 @@ class OpenPhoneWebhookServiceRefactored:
         )
         
         if create_result.is_success:
+            if self.dashboard_snapshot_service:
+                self.dashboard_snapshot_service.record_contacts_created(1)
             return create_result
         else:
             return Result.failure(create_result.error, code="CONTACT_ERROR")
@@ -809,9 +836,8 @@ class OpenPhoneWebhookServiceRefactored:
             # Find the most recent campaign membership to update
             latest_membership = active_memberships[0]
             
-            # Analyze sentiment of the message (simple keyword analysis)
-            message_body = reply_activity.body.lower() if reply_activity.body else ''
-            sentiment = self._analyze_message_sentiment(message_body)
+            # Cached sentiment; uncached replies are classified by a Celery task
+            sentiment = self._get_reply_sentiment(reply_activity.body)
             
             # Update the campaign membership with reply information
             updated_membership = self.campaign_membership_repository.mark_as_replied(
@@ -823,10 +849,15 @@ class OpenPhoneWebhookServiceRefactored:
             if updated_membership:
                 logger.info(f"Updated campaign membership {latest_membership.id} with reply activity {reply_activity.id}, sentiment: {sentiment}")
                 
+                classification_queued = False
+                if sentiment is None and reply_activity.body:
+                    classification_queued = self._queue_reply_classification(latest_membership.id, reply_activity.id)
+                
                 return {
                     'membership_id': latest_membership.id,
                     'campaign_id': latest_membership.campaign_id,
                     'sentiment': sentiment,
+                    'classification_queued': classification_queued,
                     'status_updated': updated_membership.status
                 }
             else:
@@ -886,38 +917,100 @@ class OpenPhoneWebhookServiceRefactored:
             logger.error(f"Error in campaign response tracking: {e}", exc_info=True)
             return None
     
-    def _analyze_message_sentiment(self, message_body: str) -> str:
+    def classify_campaign_reply(self, membership_id: int, reply_activity_id: int) -> Result[Dict[str, Any]]:
         """
-        Simple sentiment analysis based on keywords.
+        Classify a campaign reply and record the sentiment on its membership.
+        
+        Runs from the classify_campaign_reply Celery task, off the webhook
+        request path.
         
         Args:
-            message_body: Message text to analyze (lowercase)
+            membership_id: Campaign membership that received the reply
+            reply_activity_id: Activity holding the reply text
             
         Returns:
-            'positive', 'negative', or 'neutral'
-        """
-        positive_keywords = [
-            'yes', 'interested', 'great', 'sounds good', 'perfect', 'awesome',
-            'thank you', 'thanks', 'please call', 'call me', 'contact me',
-            'when can', 'schedule', 'appointment', 'meeting', 'available'
-        ]
-        
-        negative_keywords = [
-            'no', 'not interested', 'stop', 'remove', 'unsubscribe', 'never',
-            'don\'t', 'can\'t', 'won\'t', 'not now', 'maybe later', 'busy',
-            'already have', 'satisfied', 'too expensive', 'cost too much'
-        ]
-        
-        # Count positive and negative indicators
-        positive_score = sum(1 for keyword in positive_keywords if keyword in message_body)
-        negative_score = sum(1 for keyword in negative_keywords if keyword in message_body)
-        
-        if positive_score > negative_score:
-            return 'positive'
-        elif negative_score > positive_score:
-            return 'negative'
-        else:
-            return 'neutral'
+            Result with the membership id and sentiment
+        """
+        if not self.sentiment_service:
+            return Result.failure("Sentiment service not configured", code="SENTIMENT_UNAVAILABLE")
+        
+        reply_activity = self.activity_repository.get_by_id(reply_activity_id)
+        if not reply_activity or not reply_activity.body:
+            return Result.failure(f"Reply activity {reply_activity_id} has no text", code="NOT_FOUND")
+        
+        analysis = self.sentiment_service.analyze_response(reply_activity.body)
+        if analysis.is_failure:
+            return Result.failure(analysis.error, code="SENTIMENT_FAILED")
+        
+        sentiment = analysis.data['sentiment']
+        # Only applies while this reply is still the membership's latest one
+        updated = self.campaign_membership_repository.record_reply_sentiment(
+            membership_id=membership_id,
+            reply_activity_id=reply_activity_id,
+            sentiment=sentiment
+        )
+        membership = self.campaign_membership_repository.get_by_id(membership_id)
+        if not membership:
+            return Result.failure(f"Campaign membership {membership_id} not found", code="NOT_FOUND")
+        
+        if not updated:
+            logger.info(f"Skipping sentiment for reply {reply_activity_id}: membership {membership_id} "
+                        f"has a newer reply {membership.reply_activity_id}")
+        
+        return Result.success({
+            'membership_id': membership_id,
+            'sentiment': sentiment,
+            'superseded': not updated,
+            'status_updated': membership.status
+        })
+    
+    def _get_reply_sentiment(self, message_body: Optional[str]) -> Optional[str]:
+        """
+        Get reply sentiment without running the model on the request path.
+        
+        Returns the cached classification when there is one. When replies are
+        classified asynchronously, a cache miss returns None and the caller
+        queues the classification; otherwise the reply is classified inline.
+        
+        Args:
+            message_body: Reply text
+            
+        Returns:
+            'positive', 'negative', 'neutral', or None if not yet classified
+        """
+        if not message_body or not self.sentiment_service:
+            return None
+        
+        cached = self.sentiment_service.get_cached_classification(message_body)
+        if cached:
+            return cached['sentiment']
+        
+        if self.classify_replies_async:
+            return None
+        
+        analysis = self.sentiment_service.analyze_response(message_body)
+        return analysis.data['sentiment'] if analysis.is_success else None
+    
+    def _queue_reply_classification(self, membership_id: int, reply_activity_id: int) -> bool:
+        """
+        Queue sentiment classification of a campaign reply.
+        
+        Args:
+            membership_id: Campaign membership that received the reply
+            reply_activity_id: Activity holding the reply text
+            
+        Returns:
+            True if the task was queued
+        """
+        if not self.sentiment_service or not self.classify_replies_async:
+            return False
+        try:
+            from tasks.sentiment_tasks import classify_campaign_reply
+            classify_campaign_reply.delay(membership_id, reply_activity_id)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to queue sentiment classification for membership {membership_id}: {e}")
+            return False
     
     def _update_campaign_membership_on_failure(self, activity):
         """
@@ -0,0 +1,130 @@
+"""
+Partition Maintenance Service
+Keeps the monthly partitions of activity and webhook_event ahead of time and
+moves months past their retention window into the archive
+
+On PostgreSQL the tables are partitioned by RANGE (created_at), one partition
+per month named {table}_pYYYYMM plus {table}_default. Maintenance creates the
+upcoming months' partitions and, for each expired month, compresses its rows
+into archived_partitions and then detaches and drops the partition. That is
+a metadata change instead of a large DELETE. On other databases (and for
+expired rows that landed in the default partition) the month is archived and
+removed with a range DELETE.
+"""
+
+import logging
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from repositories.partition_archive_repository import PartitionArchiveRepository, add_months, month_start
+from services.common.result import Result
+from utils.datetime_utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionMaintenanceService:
+    """Creates upcoming monthly partitions and archives expired months"""
+
+    def __init__(self, session, archive_repository: PartitionArchiveRepository,
+                 retention_months: Optional[Dict[str, int]] = None, premake_months: int = 3):
+        """
+        Initialize with injected dependencies.
+
+        Args:
+            session: Database session the repository works in (committed per month)
+            archive_repository: Repository for partitions and the archive
+            retention_months: Months kept in the live table per table name
+                (0 or missing keeps every month)
+            premake_months: Future months that always have a partition
+        """
+        self.session = session
+        self.archive_repository = archive_repository
+        self.retention_months = retention_months or {}
+        self.premake_months = premake_months
+
+    def run_maintenance(self, today: Optional[date] = None) -> Result[Dict[str, Any]]:
+        """
+        Create upcoming partitions and archive expired months for every partitioned table.
+
+        Args:
+            today: Reference day (defaults to the current UTC day)
+
+        Returns:
+            Result with, per table, the partitions created and months archived
+        """
+        today = today or utc_now().date()
+        summary = {}
+        try:
+            for table_name in self.archive_repository.PARTITIONED_TABLES:
+                summary[table_name] = {
+                    'created_partitions': self.ensure_partitions(table_name, today),
+                    'archived_months': self.archive_expired(table_name, today),
+                }
+        except Exception as e:
+            logger.error(f"Partition maintenance failed: {e}")
+            return Result.failure(str(e), code='PARTITION_MAINTENANCE_FAILED')
+
+        logger.info(f"Partition maintenance complete: {summary}")
+        return Result.success(summary)
+
+    def ensure_partitions(self, table_name: str, today: date) -> List[str]:
+        """
+        Create the partitions from this month through premake_months ahead.
+
+        Args:
+            table_name: Partitioned table name
+            today: Reference day
+
+        Returns:
+            Names of the partitions created (empty if the table is not partitioned)
+        """
+        if not self.archive_repository.is_partitioned(table_name):
+            return []
+
+        existing = self.archive_repository.list_partitions(table_name)
+        created = []
+        for offset in range(self.premake_months + 1):
+            period_start = add_months(month_start(today), offset)
+            if period_start in existing:
+                continue
+            try:
+                partition = self.archive_repository.create_partition(table_name, period_start)
+                self.session.commit()
+            except Exception:
+                self.session.rollback()
+                raise
+            created.append(partition)
+            logger.info(f"Created partition {partition}")
+        return created
+
+    def archive_expired(self, table_name: str, today: date) -> List[Dict[str, Any]]:
+        """
+        Archive every month older than the table's retention window.
+
+        Each month is archived and removed in its own transaction, so a failure
+        leaves that month where it was and keeps the months already archived.
+
+        Args:
+            table_name: Partitioned table name
+            today: Reference day
+
+        Returns:
+            One dictionary per archived month with period_start and row_count
+        """
+        retention = self.retention_months.get(table_name)
+        if not retention:
+            return []
+
+        cutoff = add_months(month_start(today), -retention)
+        archived = []
+        for period_start in self.archive_repository.months_before(table_name, cutoff):
+            try:
+                row_count = self.archive_repository.archive_month(table_name, period_start)
+                self.session.commit()
+            except Exception:
+                self.session.rollback()
+                raise
+            logger.info(f"Archived {row_count} {table_name} rows for {period_start:%Y-%m}")
+            archived.append({'period_start': period_start, 'row_count': row_count})
+        return archived
@@ -22,6 +22,7 @@ from typing import Dict, List, Optional, Tuple, Any
 from werkzeug.datastructures import FileStorage
 
 from services.common.result import Result
+from utils import normalization
 from repositories.property_repository import PropertyRepository
 from repositories.contact_repository import ContactRepository
 from repositories.csv_import_repository import CSVImportRepository
@@ -29,6 +30,7 @@ from repositories.campaign_list_repository import CampaignListRepository
 from repositories.campaign_list_member_repository import CampaignListMemberRepository
 # Model imports needed for type hints
 from crm_database import Contact, Property, CSVImport
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
@@ -79,7 +81,9 @@ class PropertyRadarImportService:
                  csv_import_repository: CSVImportRepository,
                  campaign_list_repository: Optional[CampaignListRepository] = None,
                  campaign_list_member_repository: Optional[CampaignListMemberRepository] = None,
-                 session: Optional[Session] = None):
+                 session: Optional[Session] = None,
+                 dashboard_snapshot_service=None,
+                 set_based_batches: bool = False):
         """Initialize service with repository dependencies
         
         Args:
@@ -89,6 +93,8 @@ class PropertyRadarImportService:
             campaign_list_repository: Repository for campaign list operations
             campaign_list_member_repository: Repository for campaign list member operations
             session: Optional database session
+            dashboard_snapshot_service: Service keeping dashboard counters current (optional)
+            set_based_batches: Resolve and write each batch with bulk queries instead of row by row
         """
         self.property_repository = property_repository
         self.contact_repository = contact_repository
@@ -98,6 +104,8 @@ class PropertyRadarImportService:
         # Session is optional since repositories handle their own sessions
         # Only kept for backwards compatibility during migration
         self.session = session
+        self.dashboard_snapshot_service = dashboard_snapshot_service
+        self.set_based_batches = set_based_batches
         self.current_duplicate_strategy = 'update'  # Default strategy
         
     def import_propertyradar_csv(self, file: FileStorage, list_name: Optional[str] = None, duplicate_strategy: Optional[str] = 'update', progress_callback: Optional[callable] = None) -> Result:
@@ -321,6 +329,9 @@ class PropertyRadarImportService:
                         self.campaign_list_member_repository.rollback()
                     raise
             
+            if self.dashboard_snapshot_service:
+                self.dashboard_snapshot_service.record_contacts_created(stats['contacts_created'])
+            
             # Calculate processing time
             stats['processing_time'] = (datetime.utcnow() - import_start).total_seconds()
             
@@ -376,67 +387,7 @@ class PropertyRadarImportService:
         Returns:
             Normalized name string
         """
-        if not name or not name.strip():
-            return ''
-        
-        # Remove extra spaces
-        name = ' '.join(name.split())
-        
-        # Special case: single character should be uppercase
-        if len(name) == 1:
-            return name.upper()
-        
-        # If the name is already in proper case (has lowercase letters), preserve it
-        # But check that it's not all lowercase
-        if any(c.islower() for c in name) and not name.islower():
-            return name
-        
-        # Convert to proper case with special handling
-        result = []
-        words = name.split()
-        
-        for word in words:
-            # Handle suffixes
-            upper_word = word.upper()
-            if upper_word in ['JR', 'SR', 'JR.', 'SR.']:
-                # Capitalize first letter, keep rest lowercase
-                if '.' in word:
-                    result.append(word[0].upper() + word[1:].lower())
-                else:
-                    result.append(word.capitalize())
-            elif upper_word in ['III', 'IV', 'V', 'II', 'VI', 'VII', 'VIII', 'IX', 'X']:
-                # Roman numerals stay uppercase
-                result.append(upper_word)
-            # Handle hyphenated words
-            elif '-' in word:
-                parts = word.split('-')
-                normalized_parts = [self._normalize_name_part(part) for part in parts]
-                result.append('-'.join(normalized_parts))
-            # Handle apostrophes
-            elif "'" in word:
-                # Split on apostrophe, capitalize each part appropriately
-                parts = word.split("'")
-                if len(parts) == 2:
-                    # Handle O'Brien, D'Angelo, etc.
-                    first_part = parts[0].capitalize()
-                    # Second part: capitalize first letter if it exists
-                    second_part = parts[1].capitalize() if parts[1] else ''
-                    result.append(f"{first_part}'{second_part}")
-                else:
-                    result.append(word.capitalize())
-            else:
-                # Check for Mc or Mac prefixes
-                if word.upper().startswith('MC') and len(word) > 2:
-                    # McDonald, McConnell, etc.
-                    result.append('Mc' + word[2:].capitalize())
-                elif word.upper().startswith('MAC') and len(word) > 3:
-                    # MacArthur, MacDonald, etc.
-                    result.append('Mac' + word[3:].capitalize())
-                else:
-                    # Regular word
-                    result.append(word.capitalize())
-        
-        return ' '.join(result)
+        return normalization.normalize_name(name)
     
     def _normalize_name_part(self, part: str) -> str:
         """Helper to normalize a single part of a hyphenated name
@@ -447,16 +398,7 @@ class PropertyRadarImportService:
         Returns:
             Normalized part
         """
-        if not part:
-            return ''
-        
-        # Handle apostrophes within the part
-        if "'" in part:
-            subparts = part.split("'")
-            if len(subparts) == 2:
-                return f"{subparts[0].capitalize()}'{subparts[1].capitalize()}"
-        
-        return part.capitalize()
+        return normalization.normalize_name_part(part)
     
     def normalize_address(self, address: str) -> str:
         """Normalize address to proper case with standardized suffixes
@@ -467,84 +409,7 @@ class PropertyRadarImportService:
         Returns:
             Normalized address string
         """
-        if not address or not address.strip():
-            return ''
-        
-        # Remove extra spaces
-        address = ' '.join(address.split())
-        
-        # Street suffix mappings
-        suffix_map = {
-            'STREET': 'St',
-            'ST': 'St',
-            'AVENUE': 'Ave',
-            'AVE': 'Ave',
-            'ROAD': 'Rd',
-            'RD': 'Rd',
-            'DRIVE': 'Dr',
-            'DR': 'Dr',
-            'LANE': 'Ln',
-            'LN': 'Ln',
-            'BOULEVARD': 'Blvd',
-            'BLVD': 'Blvd',
-            'CIRCLE': 'Cir',
-            'CIR': 'Cir',
-            'COURT': 'Ct',
-            'CT': 'Ct',
-            'PLACE': 'Pl',
-            'PL': 'Pl'
-        }
-        
-        # Directional mappings (full to abbreviated)
-        directional_map = {
-            'NORTH': 'N',
-            'SOUTH': 'S',
-            'EAST': 'E',
-            'WEST': 'W',
-            'NORTHEAST': 'NE',
-            'NORTHWEST': 'NW',
-            'SOUTHEAST': 'SE',
-            'SOUTHWEST': 'SW'
-        }
-        
-        # Special cases
-        if address.upper().startswith('PO BOX') or address.upper().startswith('P.O. BOX') or address.upper().startswith('POST OFFICE BOX'):
-            # Extract box number
-            parts = address.split()
-            box_num = parts[-1] if parts else ''
-            return f'PO Box {box_num}'
-        
-        # Process address parts
-        parts = address.split()
-        result = []
-        
-        for i, part in enumerate(parts):
-            upper_part = part.upper()
-            
-            # Check if it's a number (house number, unit number, etc.)
-            if part[0].isdigit() or part.startswith('#'):
-                result.append(part)
-            # Check if it's a directional
-            elif upper_part in directional_map:
-                result.append(directional_map[upper_part])
-            # Check if it's already an abbreviated directional
-            elif upper_part in directional_map.values():
-                result.append(upper_part)
-            # Check if it's a street suffix
-            elif upper_part in suffix_map:
-                result.append(suffix_map[upper_part])
-            # Handle APT, UNIT, SUITE
-            elif upper_part in ['APT', 'APARTMENT']:
-                result.append('Apt')
-            elif upper_part == 'UNIT':
-                result.append('Unit')
-            elif upper_part == 'SUITE':
-                result.append('Suite')
-            else:
-                # Regular word - capitalize
-                result.append(part.capitalize())
-        
-        return ' '.join(result)
+        return normalization.normalize_address(address)
     
     def normalize_city(self, city: str) -> str:
         """Normalize city name to proper case
@@ -555,24 +420,7 @@ class PropertyRadarImportService:
         Returns:
             Normalized city name
         """
-        if not city or not city.strip():
-            return ''
-        
-        # Remove extra spaces
-        city = ' '.join(city.split())
-        
-        # If already has lowercase letters, preserve the case UNLESS it's all lowercase
-        if any(c.islower() for c in city) and not city.islower():
-            return city
-        
-        # Handle hyphenated cities
-        if '-' in city:
-            parts = city.split('-')
-            return '-'.join(part.capitalize() for part in parts)
-        
-        # Handle multi-word cities
-        words = city.split()
-        return ' '.join(word.capitalize() for word in words)
+        return normalization.normalize_city(city)
     
     def extract_primary_contact(self, row: Dict) -> Optional[Dict]:
         """Extract primary contact from PropertyRadar row
@@ -773,34 +621,7 @@ class PropertyRadarImportService:
         Returns:
             Normalized phone number or None
         """
-        if not phone:
-            return None
-            
-        # Remove all non-digit characters
-        digits = re.sub(r'\D', '', phone.strip())
-        
-        # Handle different lengths
-        if len(digits) == 10:
-            return f'+1{digits}'
-        elif len(digits) == 11 and digits.startswith('1'):
-            return f'+{digits}'
-        elif len(digits) == 7:
-            # For 7-digit numbers that already start with area code, use as-is
-            # Otherwise assume a default area code (555 for test data)
-            if digits.startswith('555'):
-                return f'+1{digits}'
-            else:
-                return f'+1555{digits}'
-        elif len(digits) == 8:
-            # 8 digits could be area code + phone without country code
-            return f'+1{digits[:3]}{digits[3:]}'
-        elif len(digits) < 7:
-            return None  # Invalid phone number
-        elif len(digits) > 11:
-            # Too many digits
-            return None
-            
-        return None
+        return normalization.normalize_propertyradar_phone(phone)
     
     def normalize_phone_number(self, phone: str) -> Optional[str]:
         """Alias for normalize_phone for test compatibility"""
@@ -815,48 +636,7 @@ class PropertyRadarImportService:
         Returns:
             Tuple of (first_name, last_name)
         """
-        if not full_name:
-            return ('', '')
-            
-        parts = full_name.strip().split()
-        if not parts:
-            return ('', '')
-        elif len(parts) == 1:
-            # Single name goes to last name per business requirements
-            return ('', parts[0])
-        
-        # Check if the last part is a suffix
-        suffixes = ['Jr', 'Jr.', 'Sr', 'Sr.', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X']
-        has_suffix = False
-        suffix = ''
-        
-        if parts[-1] in suffixes:
-            has_suffix = True
-            suffix = parts[-1]
-            parts = parts[:-1]  # Remove suffix from parts
-        
-        # Now handle the remaining parts
-        if len(parts) == 1:
-            # Only one name part left - it's the last name
-            last_name = parts[0]
-            if suffix:
-                last_name = f"{last_name} {suffix}"
-            return ('', last_name)
-        elif len(parts) == 2:
-            # Standard first and last name
-            first_name = parts[0]
-            last_name = parts[1]
-            if suffix:
-                last_name = f"{last_name} {suffix}"
-            return (first_name, last_name)
-        else:
-            # Multiple parts - everything except last is first name
-            # This handles cases like "Mary Jane Smith" or "John Paul Jones"
-            first_name = ' '.join(parts[:-1])
-            last_name = parts[-1]
-            if suffix:
-                last_name = f"{last_name} {suffix}"
-            return (first_name, last_name)
+        return normalization.parse_name(full_name)
     
     def import_row(self, row: Dict, csv_import: CSVImport) -> Result:
         """Import single row creating property and contacts
@@ -1124,6 +904,11 @@ class PropertyRadarImportService:
     def _process_batch(self, batch: List[Dict], csv_import: CSVImport, return_contacts: bool = False) -> Tuple[Dict, List[Contact]]:
         """Process a batch of CSV rows with proper transaction management
         
+        With set-based batches enabled the whole batch is resolved and written
+        with bulk queries. If that hits a database error, e.g. another import
+        inserting the same phone concurrently, the batch is rolled back and
+        replayed row by row.
+        
         Args:
             batch: List of CSV row dictionaries
             csv_import: CSV import record
@@ -1132,16 +917,32 @@ class PropertyRadarImportService:
         Returns:
             Tuple of (Statistics dictionary for the batch, List of imported contacts)
         """
-        stats = {
-            'total_rows': len(batch),
-            'properties_created': 0,
-            'properties_updated': 0,
-            'properties_skipped': 0,
-            'contacts_created': 0,
-            'contacts_updated': 0,
-            'contacts_skipped': 0,
-            'errors': []
-        }
+        if self.set_based_batches:
+            # Start from a clean transaction so a failed bulk write only
+            # rolls back this batch, not the import record or earlier work
+            self._commit_batch()
+            try:
+                stats, imported_contacts = self._process_batch_set_based(batch, csv_import)
+                self._commit_batch()
+                return stats, imported_contacts if return_contacts else []
+            except SQLAlchemyError as e:
+                self._rollback_batch()
+                logger.warning(f"Set-based batch failed, replaying {len(batch)} rows individually: {e}")
+        
+        return self._process_batch_by_row(batch, csv_import, return_contacts)
+    
+    def _process_batch_by_row(self, batch: List[Dict], csv_import: CSVImport, return_contacts: bool = False) -> Tuple[Dict, List[Contact]]:
+        """Process a batch by importing each row on its own
+        
+        Args:
+            batch: List of CSV row dictionaries
+            csv_import: CSV import record
+            return_contacts: Whether to return the list of imported contacts
+            
+        Returns:
+            Tuple of (Statistics dictionary for the batch, List of imported contacts)
+        """
+        stats = self._empty_batch_stats(len(batch))
         imported_contacts = [] if return_contacts else None
         
         # Process batch within a single transaction to maintain consistency
@@ -1153,56 +954,18 @@ class PropertyRadarImportService:
                     if result.is_failure:
                         stats['errors'].append(result.error)
                     else:
-                        # Count ACTUAL property operations using operation type
-                        property_operation = result.value.get('property_operation', 'created')
-                        if property_operation == 'created':
-                            stats['properties_created'] += 1
-                        elif property_operation == 'updated':
-                            stats['properties_updated'] += 1
-                        elif property_operation == 'existing':
-                            # Property exists - handle based on duplicate strategy
-                            if self.current_duplicate_strategy == 'skip':
-                                stats['properties_skipped'] += 1
-                            else:
-                                stats['properties_updated'] += 1
-                        elif property_operation == 'skipped':
-                            stats['properties_skipped'] += 1
-                        
-                        # Count ACTUAL contact operations using operation types
-                        primary_operation = result.value.get('primary_contact_operation')
-                        if primary_operation == 'created':
-                            stats['contacts_created'] += 1
-                        elif primary_operation == 'existing':
-                            # Handle based on duplicate strategy
-                            if self.current_duplicate_strategy == 'skip':
-                                stats['contacts_skipped'] += 1
-                            elif self.current_duplicate_strategy in ['update', 'replace']:
-                                stats['contacts_updated'] += 1
-                            else:
-                                stats['contacts_updated'] += 1
-                        elif primary_operation == 'skipped':
-                            stats['contacts_skipped'] += 1
-                        # If primary_operation is None, don't count it (no contact data)
+                        # Count ACTUAL operations using operation types
+                        self._count_row_operations(
+                            stats,
+                            result.value.get('property_operation', 'created'),
+                            [result.value.get('primary_contact_operation'),
+                             result.value.get('secondary_contact_operation')]
+                        )
                         
                         # Get primary contact for list tracking
                         if return_contacts and 'primary_contact' in result.value and result.value['primary_contact']:
                             logger.debug(f"Adding primary contact to list: {result.value['primary_contact']}")
                             imported_contacts.append(result.value['primary_contact'])
-                        
-                        secondary_operation = result.value.get('secondary_contact_operation')
-                        if secondary_operation == 'created':
-                            stats['contacts_created'] += 1
-                        elif secondary_operation == 'existing':
-                            # Handle based on duplicate strategy
-                            if self.current_duplicate_strategy == 'skip':
-                                stats['contacts_skipped'] += 1
-                            elif self.current_duplicate_strategy in ['update', 'replace']:
-                                stats['contacts_updated'] += 1
-                            else:
-                                stats['contacts_updated'] += 1
-                        elif secondary_operation == 'skipped':
-                            stats['contacts_skipped'] += 1
-                        # If secondary_operation is None, don't count it (no contact data)
                             
                         # Get secondary contact for list tracking
                         if return_contacts and 'secondary_contact' in result.value and result.value['secondary_contact']:
@@ -1222,20 +985,10 @@ class PropertyRadarImportService:
                     # Continue processing other rows
                     continue
             
-            # Commit the batch transaction through session when available
-            if self.session:
-                self.session.commit()
-            elif self.property_repository:
-                # Fallback to repository commit if no session available
-                self.property_repository.commit()
+            self._commit_batch()
             
         except Exception as e:
-            # Rollback batch transaction on critical error through session when available
-            if self.session:
-                self.session.rollback()
-            elif self.property_repository:
-                # Fallback to repository rollback if no session available
-                self.property_repository.rollback()
+            self._rollback_batch()
             error_msg = f"Batch processing error: {str(e)}"
             stats['errors'].append(error_msg)
             logger.error(error_msg)
@@ -1244,6 +997,281 @@ class PropertyRadarImportService:
             logger.debug(f"Batch processed {len(imported_contacts)} contacts for list association")
         return stats, imported_contacts if return_contacts else []
     
+    def _process_batch_set_based(self, batch: List[Dict], csv_import: CSVImport) -> Tuple[Dict, List[Contact]]:
+        """Import a batch with a handful of set-based queries
+        
+        All rows are parsed first. Properties are matched by APN or address+zip
+        and contacts by phone, against the database with IN queries and against
+        earlier rows of the same batch. New properties, contacts and
+        PropertyContact links are then written in bulk. Operations are decided
+        in row order exactly as import_row decides them, so the statistics
+        match a row-by-row import.
+        
+        Args:
+            batch: List of CSV row dictionaries
+            csv_import: CSV import record
+            
+        Returns:
+            Tuple of (Statistics dictionary for the batch, List of imported contacts)
+            
+        Raises:
+            SQLAlchemyError: If the bulk writes fail; nothing is committed
+        """
+        strategy = self.current_duplicate_strategy
+        row_errors = [[] for _ in batch]
+        parsed_rows = []
+        
+        for index, row in enumerate(batch):
+            parsed_result = self.parse_csv_row(row)
+            if parsed_result.is_failure:
+                row_errors[index].append(parsed_result.error)
+                continue
+            row_errors[index].extend(self._validate_row_data(row))
+            parsed_rows.append((index, parsed_result.value))
+        
+        # Resolve properties. Targets are existing Property rows or the
+        # attribute dicts of properties created earlier in this batch.
+        property_targets = self.property_repository.find_duplicates_in_batch(
+            [data['property'] for _, data in parsed_rows]
+        )
+        new_properties = []
+        planned_rows = []
+        
+        for index, data in parsed_rows:
+            property_data = data['property']
+            key = PropertyRepository.duplicate_key(
+                property_data.get('apn'), property_data.get('address'), property_data.get('zip_code')
+            )
+            target = property_targets.get(key) if key else None
+            
+            if target is None:
+                if not property_data.get('address'):
+                    # Mirrors the failure PropertyRepository.create raises
+                    row_errors[index] = ["Row import failed: address is required"]
+                    continue
+                target = dict(property_data)
+                new_properties.append(target)
+                for match_key in (
+                    key,
+                    PropertyRepository.duplicate_key(None, property_data.get('address'), property_data.get('zip_code'))
+                ):
+                    if match_key:
+                        property_targets.setdefault(match_key, target)
+                property_operation = 'created'
+            elif strategy == 'skip':
+                property_operation = 'skipped'
+            elif strategy in ['update', 'replace']:
+                for field, value in property_data.items():
+                    if value is not None:
+                        self._assign(target, field, value)
+                property_operation = 'updated'
+            else:
+                property_operation = 'existing'
+            
+            planned_rows.append({
+                'index': index,
+                'data': data,
+                'property': target,
+                'property_operation': property_operation,
+                'contacts': []
+            })
+        
+        # Resolve contacts by phone the same way
+        contact_targets = self.contact_repository.find_by_phones([
+            contact_data['phone']
+            for plan in planned_rows
+            for contact_data in (plan['data'].get('primary_contact'), plan['data'].get('secondary_contact'))
+            if contact_data
+        ])
+        new_contacts = []
+        
+        for plan in planned_rows:
+            for relationship_type in ('PRIMARY', 'SECONDARY'):
+                contact_data = plan['data'].get(f"{relationship_type.lower()}_contact")
+                if not contact_data:
+                    plan['contacts'].append((relationship_type, None, None))
+                    continue
+                target = contact_targets.get(contact_data['phone'])
+                if target is None:
+                    target = dict(contact_data)
+                    new_contacts.append(target)
+                    contact_targets[contact_data['phone']] = target
+                    contact_operation = 'created'
+                elif strategy == 'skip':
+                    contact_operation = 'skipped'
+                else:
+                    # PropertyRadar never overwrites contact data, it only links it
+                    contact_operation = 'existing'
+                plan['contacts'].append((relationship_type, target, contact_operation))
+        
+        # Write new rows in bulk and swap the planned dicts for their entities
+        created = {}
+        created_property_ids = set()
+        if new_properties:
+            for property_data, property_obj in zip(new_properties, self.property_repository.create_many(new_properties)):
+                created[id(property_data)] = property_obj
+                created_property_ids.add(property_obj.id)
+        if new_contacts:
+            for contact_data, contact in zip(new_contacts, self.contact_repository.create_many(new_contacts)):
+                created[id(contact_data)] = contact
+        
+        for plan in planned_rows:
+            plan['property'] = created.get(id(plan['property']), plan['property'])
+            plan['contacts'] = [
+                (relationship_type, created.get(id(target), target), contact_operation)
+                for relationship_type, target, contact_operation in plan['contacts']
+            ]
+        
+        # Link every contact to the import record once
+        linked_contact_ids = {contact.id for contact in csv_import.contacts}
+        for plan in planned_rows:
+            for _, contact, _ in plan['contacts']:
+                if contact is not None and contact.id not in linked_contact_ids:
+                    csv_import.contacts.append(contact)
+                    linked_contact_ids.add(contact.id)
+        
+        self._link_contacts_to_properties(planned_rows, created_property_ids)
+        
+        # Statistics, list contacts and errors in row order
+        stats = self._empty_batch_stats(len(batch))
+        imported_contacts = []
+        for plan in planned_rows:
+            self._count_row_operations(
+                stats,
+                plan['property_operation'],
+                [contact_operation for _, _, contact_operation in plan['contacts']]
+            )
+            imported_contacts.extend(
+                contact for _, contact, _ in plan['contacts'] if contact is not None
+            )
+        for errors in row_errors:
+            stats['errors'].extend(errors)
+        
+        return stats, imported_contacts
+    
+    def _link_contacts_to_properties(self, planned_rows: List[Dict], created_property_ids: set):
+        """Create or update the PropertyContact links of a planned batch
+        
+        Follows associate_contact_by_ids row by row: an existing link gets its
+        relationship refreshed, and a new primary link demotes the property's
+        other links.
+        
+        Args:
+            planned_rows: Planned rows with resolved property and contacts
+            created_property_ids: IDs of properties created in this batch, which have no links yet
+        """
+        existing_property_ids = [
+            plan['property'].id for plan in planned_rows if plan['property'].id not in created_property_ids
+        ]
+        links_by_property = {}
+        links_by_pair = {}
+        for link in self.property_repository.find_associations_for_properties(existing_property_ids):
+            links_by_property.setdefault(link.property_id, []).append(link)
+            links_by_pair[(link.property_id, link.contact_id)] = link
+        
+        new_links = []
+        for plan in planned_rows:
+            property_id = plan['property'].id
+            for relationship_type, contact, _ in plan['contacts']:
+                if contact is None:
+                    continue
+                is_primary = relationship_type == 'PRIMARY'
+                link = links_by_pair.get((property_id, contact.id))
+                if link is not None:
+                    self._assign(link, 'relationship_type', 'owner')
+                    self._assign(link, 'is_primary', is_primary)
+                    continue
+                
+                if is_primary:
+                    for other_link in links_by_property.get(property_id, []):
+                        self._assign(other_link, 'is_primary', False)
+                link = {
+                    'property_id': property_id,
+                    'contact_id': contact.id,
+                    'relationship_type': 'owner',
+                    'is_primary': is_primary
+                }
+                new_links.append(link)
+                links_by_property.setdefault(property_id, []).append(link)
+                links_by_pair[(property_id, contact.id)] = link
+        
+        if new_links:
+            self.property_repository.create_associations(new_links)
+    
+    @staticmethod
+    def _assign(target: Any, field: str, value: Any):
+        """Set a field on an entity or on the attribute dict of a planned one"""
+        if isinstance(target, dict):
+            target[field] = value
+        else:
+            setattr(target, field, value)
+    
+    @staticmethod
+    def _empty_batch_stats(total_rows: int) -> Dict:
+        """Statistics dictionary for a batch before any row is counted"""
+        return {
+            'total_rows': total_rows,
+            'properties_created': 0,
+            'properties_updated': 0,
+            'properties_skipped': 0,
+            'contacts_created': 0,
+            'contacts_updated': 0,
+            'contacts_skipped': 0,
+            'errors': []
+        }
+    
+    def _count_row_operations(self, stats: Dict, property_operation: Optional[str],
+                              contact_operations: List[Optional[str]]):
+        """Count the operations of one imported row
+        
+        Args:
+            stats: Batch statistics to update
+            property_operation: Operation performed on the property
+            contact_operations: Operations performed on the primary and secondary contacts
+        """
+        if property_operation == 'created':
+            stats['properties_created'] += 1
+        elif property_operation == 'updated':
+            stats['properties_updated'] += 1
+        elif property_operation == 'existing':
+            # Property exists - handle based on duplicate strategy
+            if self.current_duplicate_strategy == 'skip':
+                stats['properties_skipped'] += 1
+            else:
+                stats['properties_updated'] += 1
+        elif property_operation == 'skipped':
+            stats['properties_skipped'] += 1
+        
+        for contact_operation in contact_operations:
+            if contact_operation == 'created':
+                stats['contacts_created'] += 1
+            elif contact_operation == 'existing':
+                # Handle based on duplicate strategy
+                if self.current_duplicate_strategy == 'skip':
+                    stats['contacts_skipped'] += 1
+                else:
+                    stats['contacts_updated'] += 1
+            elif contact_operation == 'skipped':
+                stats['contacts_skipped'] += 1
+            # None means the row had no contact data; 'error' is reported in errors
+    
+    def _commit_batch(self):
+        """Commit the batch transaction through session when available"""
+        if self.session:
+            self.session.commit()
+        elif self.property_repository:
+            # Fallback to repository commit if no session available
+            self.property_repository.commit()
+    
+    def _rollback_batch(self):
+        """Rollback the batch transaction through session when available"""
+        if self.session:
+            self.session.rollback()
+        elif self.property_repository:
+            # Fallback to repository rollback if no session available
+            self.property_repository.rollback()
+    
+    
     def _merge_stats(self, total_stats: Dict, batch_stats: Dict):
         """Merge batch statistics into total statistics
         
@@ -8,8 +8,8 @@ import json
 import base64
 import requests
 from datetime import datetime, timedelta
-from utils.datetime_utils import utc_now
-from typing import Dict, Optional, List, Any
+from utils.datetime_utils import utc_now, ensure_utc
+from typing import Dict, Optional, List, Any, Iterator
 from urllib.parse import urlencode
 from cryptography.fernet import Fernet
 from flask import current_app
@@ -17,6 +17,9 @@ from flask import current_app
 
 
 class QuickBooksService:
+    # QuickBooks Online rejects MAXRESULTS above 1000
+    PAGE_SIZE = 1000
+    
     def __init__(self, auth_repository=None, sync_repository=None):
         # Inject repositories for dependency inversion
         self.auth_repository = auth_repository
@@ -30,7 +33,9 @@ class QuickBooksService:
         
         # Base URLs
         self.auth_base_url = "https://appcenter.intuit.com/connect/oauth2"
-        self.api_base_url = "https://sandbox-quickbooks.api.intuit.com" if self.sandbox else "https://quickbooks.api.intuit.com"
+        self.api_base_url = os.getenv('QUICKBOOKS_API_BASE_URL') or (
+            "https://sandbox-quickbooks.api.intuit.com" if self.sandbox else "https://quickbooks.api.intuit.com"
+        )
         
         # Initialize encryption for tokens (using a simple key for now - should be in env)
         encryption_key = os.getenv('ENCRYPTION_KEY', Fernet.generate_key().decode())
@@ -194,29 +199,60 @@ class QuickBooksService:
             return None
         return self.make_api_request(f"companyinfo/{auth.company_id}")
     
-    def list_customers(self, max_results: int = 1000) -> List[Dict[str, Any]]:
-        """List all customers"""
-        query = f"select * from Customer maxresults {max_results}"
-        response = self.make_api_request("query", params={'query': query})
-        return response.get('QueryResponse', {}).get('Customer', [])
-    
-    def list_items(self, max_results: int = 1000) -> List[Dict[str, Any]]:
-        """List all items (products/services)"""
-        query = f"select * from Item maxresults {max_results}"
-        response = self.make_api_request("query", params={'query': query})
-        return response.get('QueryResponse', {}).get('Item', [])
-    
-    def list_estimates(self, max_results: int = 1000) -> List[Dict[str, Any]]:
-        """List all estimates"""
-        query = f"select * from Estimate maxresults {max_results}"
-        response = self.make_api_request("query", params={'query': query})
-        return response.get('QueryResponse', {}).get('Estimate', [])
-    
-    def list_invoices(self, max_results: int = 1000) -> List[Dict[str, Any]]:
-        """List all invoices"""
-        query = f"select * from Invoice maxresults {max_results}"
-        response = self.make_api_request("query", params={'query': query})
-        return response.get('QueryResponse', {}).get('Invoice', [])
+    def query_pages(self, entity: str, changed_since: Optional[datetime] = None,
+                    page_size: int = PAGE_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Page through every record of an entity with STARTPOSITION/MAXRESULTS.
+        
+        Args:
+            entity: QuickBooks entity name (Customer, Item, Estimate, Invoice)
+            changed_since: Only records whose MetaData.LastUpdatedTime is at or
+                after this time (change data capture); None pages everything
+            page_size: Records per request, at most PAGE_SIZE
+            
+        Returns:
+            Iterator of record pages; stops after the first short page
+        """
+        page_size = min(page_size, self.PAGE_SIZE)
+        where = ''
+        if changed_since is not None:
+            where = f" where MetaData.LastUpdatedTime >= '{ensure_utc(changed_since).isoformat()}'"
+        
+        start_position = 1
+        while True:
+            # Ordering by Id keeps pages stable while records are being edited
+            query = (f"select * from {entity}{where} orderby Id "
+                     f"startposition {start_position} maxresults {page_size}")
+            response = self.make_api_request("query", params={'query': query})
+            records = response.get('QueryResponse', {}).get(entity, [])
+            if records:
+                yield records
+            if len(records) < page_size:
+                return
+            start_position += page_size
+    
+    def _list_all(self, entity: str, page_size: int) -> List[Dict[str, Any]]:
+        """Every record of an entity, fetched page by page"""
+        records = []
+        for page in self.query_pages(entity, page_size=page_size):
+            records.extend(page)
+        return records
+    
+    def list_customers(self, max_results: int = PAGE_SIZE) -> List[Dict[str, Any]]:
+        """List all customers, max_results per page"""
+        return self._list_all('Customer', max_results)
+    
+    def list_items(self, max_results: int = PAGE_SIZE) -> List[Dict[str, Any]]:
+        """List all items (products/services), max_results per page"""
+        return self._list_all('Item', max_results)
+    
+    def list_estimates(self, max_results: int = PAGE_SIZE) -> List[Dict[str, Any]]:
+        """List all estimates, max_results per page"""
+        return self._list_all('Estimate', max_results)
+    
+    def list_invoices(self, max_results: int = PAGE_SIZE) -> List[Dict[str, Any]]:
+        """List all invoices, max_results per page"""
+        return self._list_all('Invoice', max_results)
     
     def get_customer(self, customer_id: str) -> Dict[str, Any]:
         """Get a specific customer"""
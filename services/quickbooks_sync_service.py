@@ -1,13 +1,20 @@
 """
 QuickBooks Sync Service
 Handles syncing data between QuickBooks and CRM
+
+Each entity type is pulled page by page (STARTPOSITION/MAXRESULTS). After the
+first full sync only records whose MetaData.LastUpdatedTime is at or after the
+stored watermark are requested. Every page is written with one bulk lookup per
+matching key and bulk inserts/updates, then committed on its own, so a failure
+loses at most one page and the watermark only advances once every page landed.
 """
 
-from datetime import datetime
-from utils.datetime_utils import utc_now
-from typing import Dict, List, Optional, Any, TYPE_CHECKING
+import logging
+from datetime import datetime, timedelta
+from utils.datetime_utils import utc_now, parse_utc_iso
+from utils import normalization
+from typing import Dict, List, Optional, Any, Callable, Tuple, TYPE_CHECKING
 from decimal import Decimal
-from flask import current_app
 # Model imports removed - using repositories only
 from services.quickbooks_service import QuickBooksService
 
@@ -22,9 +29,26 @@ if TYPE_CHECKING:
     from repositories.quote_line_item_repository import QuoteLineItemRepository
     from repositories.invoice_line_item_repository import InvoiceLineItemRepository
 
+logger = logging.getLogger(__name__)
+
+# Page handlers return (created, updated) counts
+PageHandler = Callable[[List[Dict[str, Any]]], Tuple[int, int]]
+
 
 class QuickBooksSyncService:
-    def __init__(self, 
+    # Sync entity type -> QuickBooks entity name
+    ENTITY_TYPES = {
+        'customer': 'Customer',
+        'item': 'Item',
+        'estimate': 'Estimate',
+        'invoice': 'Invoice'
+    }
+    
+    # Records edited while a sync is paging can land behind the cursor; never
+    # move the watermark past the sync's start (less some clock skew)
+    WATERMARK_OVERLAP = timedelta(minutes=5)
+    
+    def __init__(self,
                  contact_repository: 'ContactRepository' = None,
                  product_repository: 'ProductRepository' = None,
                  quote_repository: 'QuoteRepository' = None,
@@ -33,8 +57,11 @@ class QuickBooksSyncService:
                  property_repository: 'PropertyRepository' = None,
                  quickbooks_sync_repository: 'QuickBooksSyncRepository' = None,
                  quote_line_item_repository: 'QuoteLineItemRepository' = None,
-                 invoice_line_item_repository: 'InvoiceLineItemRepository' = None):
-        self.qb_service = QuickBooksService()
+                 invoice_line_item_repository: 'InvoiceLineItemRepository' = None,
+                 quickbooks_service: Optional[QuickBooksService] = None,
+                 page_size: int = QuickBooksService.PAGE_SIZE):
+        self.qb_service = quickbooks_service or QuickBooksService()
+        self.page_size = page_size
         
         # Repository dependencies
         self.contact_repository = contact_repository
@@ -47,141 +74,361 @@ class QuickBooksSyncService:
         self.quote_line_item_repository = quote_line_item_repository
         self.invoice_line_item_repository = invoice_line_item_repository
     
-    def sync_all(self) -> Dict[str, Any]:
-        """Run full sync of all QuickBooks data"""
+    def sync_all(self, full: bool = False) -> Dict[str, Any]:
+        """Sync all QuickBooks data; customers and items first so transactions can link to them"""
         results = {
-            'customers': self.sync_customers(),
-            'items': self.sync_items(),
-            'estimates': self.sync_estimates(),
-            'invoices': self.sync_invoices()
+            'customers': self.sync_customers(full),
+            'items': self.sync_items(full),
+            'estimates': self.sync_estimates(full),
+            'invoices': self.sync_invoices(full)
         }
         return results
     
-    def sync_customers(self) -> Dict[str, int]:
-        """Sync all customers from QuickBooks"""
+    def sync_customers(self, full: bool = False) -> Dict[str, int]:
+        """Sync customers changed since the last sync (all customers when full)"""
+        return self._sync_entity('customer', self._sync_customer_page, full)
+    
+    def sync_items(self, full: bool = False) -> Dict[str, int]:
+        """Sync items (products/services) changed since the last sync"""
+        return self._sync_entity('item', self._sync_item_page, full)
+    
+    def sync_estimates(self, full: bool = False) -> Dict[str, int]:
+        """Sync estimates changed since the last sync as quotes"""
+        return self._sync_entity('estimate', self._sync_estimate_page, full)
+    
+    def sync_invoices(self, full: bool = False) -> Dict[str, int]:
+        """Sync invoices changed since the last sync"""
+        return self._sync_entity('invoice', self._sync_invoice_page, full)
+    
+    def _sync_entity(self, entity_type: str, handle_page: PageHandler, full: bool) -> Dict[str, int]:
+        """
+        Pull one entity type page by page and advance its watermark.
+        
+        Args:
+            entity_type: Sync entity type, a key of ENTITY_TYPES
+            handle_page: Writes one page of QuickBooks records
+            full: Ignore the watermark and pull every record
+        
+        Returns:
+            Dictionary with created, updated and errors counts
+        """
         results = {'created': 0, 'updated': 0, 'errors': 0}
+        entity = self.ENTITY_TYPES[entity_type]
+        changed_since = None if full else self.quickbooks_sync_repository.get_watermark(entity_type)
+        started_at = utc_now()
+        latest_change = None
         
         try:
-            customers = self.qb_service.list_customers()
-            
-            for qb_customer in customers:
+            pages = self.qb_service.query_pages(entity, changed_since=changed_since, page_size=self.page_size)
+            for page in pages:
                 try:
-                    self._sync_customer(qb_customer)
-                    results['updated'] += 1
+                    created, updated = handle_page(page)
+                    self.quickbooks_sync_repository.commit()
                 except Exception as e:
-                    current_app.logger.error(f"Error syncing customer {qb_customer.get('Id')}: {str(e)}")
-                    results['errors'] += 1
-            
-            # Transaction management handled by repositories
-            
+                    self.quickbooks_sync_repository.rollback()
+                    logger.error(f"Error syncing {entity} page starting at {page[0].get('Id')}: {str(e)}")
+                    # Later pages may depend on this one; retry from the same watermark next run
+                    results['errors'] += len(page)
+                    return results
+                
+                results['created'] += created
+                results['updated'] += updated
+                latest_change = max(filter(None, [latest_change, self._last_updated_time(page)]), default=None)
         except Exception as e:
-            current_app.logger.error(f"Error fetching customers: {str(e)}")
+            logger.error(f"Error fetching {entity} records: {str(e)}")
+            results['errors'] += 1
+            return results
+        
+        if latest_change is not None:
+            latest_change = min(latest_change, started_at - self.WATERMARK_OVERLAP)
+            self.quickbooks_sync_repository.set_watermark(entity_type, latest_change)
+            self.quickbooks_sync_repository.commit()
         
+        logger.info(f"QuickBooks {entity} sync complete: {results}")
         return results
     
-    def sync_items(self) -> Dict[str, int]:
-        """Sync all items (products/services) from QuickBooks"""
-        results = {'created': 0, 'updated': 0, 'errors': 0}
-        
-        try:
-            items = self.qb_service.list_items()
+    def _last_updated_time(self, records: List[Dict[str, Any]]) -> Optional[datetime]:
+        """Latest MetaData.LastUpdatedTime in a page of records"""
+        times = [
+            parse_utc_iso(record['MetaData']['LastUpdatedTime'])
+            for record in records
+            if record.get('MetaData', {}).get('LastUpdatedTime')
+        ]
+        return max(times, default=None)
+    
+    # Page handlers
+    
+    def _sync_customer_page(self, qb_customers: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Upsert a page of customers as contacts, matching on QuickBooks ID, then phone, then email"""
+        by_qb_id = self.contact_repository.find_by_values(
+            'quickbooks_customer_id', [qb_customer['Id'] for qb_customer in qb_customers]
+        )
+        phones = {qb_customer['Id']: self._customer_phones(qb_customer) for qb_customer in qb_customers}
+        by_phone = self.contact_repository.find_by_phones(
+            [phone for customer_phones in phones.values() for phone in customer_phones]
+        )
+        by_email = self.contact_repository.find_by_values(
+            'email', [self._customer_email(qb_customer) for qb_customer in qb_customers]
+        )
+        
+        to_update = []
+        to_insert = []
+        claimed_phones = set()
+        claimed_emails = set()
+        for qb_customer in qb_customers:
+            qb_id = qb_customer['Id']
+            contact = by_qb_id.get(qb_id)
+            if not contact:
+                contact = next((by_phone[phone] for phone in phones[qb_id] if phone in by_phone), None)
+            if not contact:
+                contact = by_email.get(self._customer_email(qb_customer))
             
-            for qb_item in items:
-                try:
-                    if self._sync_item(qb_item):
-                        results['created'] += 1
-                    else:
-                        results['updated'] += 1
-                except Exception as e:
-                    current_app.logger.error(f"Error syncing item {qb_item.get('Id')}: {str(e)}")
-                    results['errors'] += 1
+            contact_data = self._customer_data(qb_customer)
+            contact_id = contact.id if contact else None
             
-            # Transaction management handled by repositories
+            # Phone and email are unique; never take them from another contact
+            phone = contact_data.get('phone')
+            if phone and (phone in claimed_phones or (phone in by_phone and by_phone[phone].id != contact_id)):
+                del contact_data['phone']
+            email = contact_data.get('email')
+            if email and (email in claimed_emails or (email in by_email and by_email[email].id != contact_id)):
+                del contact_data['email']
+            claimed_phones.add(contact_data.get('phone'))
+            claimed_emails.add(contact_data.get('email'))
             
-        except Exception as e:
-            current_app.logger.error(f"Error fetching items: {str(e)}")
-        
-        return results
+            if contact:
+                to_update.append({'id': contact.id, **contact_data})
+            else:
+                contact_data.setdefault('first_name', qb_customer.get('DisplayName') or 'Unknown')
+                contact_data.setdefault('last_name', '')
+                to_insert.append(contact_data)
+        
+        self.contact_repository.bulk_update(to_update)
+        new_ids = self.contact_repository.bulk_insert(to_insert, key_field='quickbooks_customer_id')
+        
+        local_ids = {row['quickbooks_customer_id']: row['id'] for row in to_update}
+        local_ids.update(new_ids)
+        self._record_syncs('customer', 'contact', qb_customers, local_ids)
+        return len(to_insert), len(to_update)
     
-    def sync_estimates(self) -> Dict[str, int]:
-        """Sync all estimates from QuickBooks as quotes"""
-        results = {'created': 0, 'updated': 0, 'errors': 0}
-        
-        try:
-            estimates = self.qb_service.list_estimates()
-            
-            for qb_estimate in estimates:
-                try:
-                    if self._sync_estimate(qb_estimate):
-                        results['created'] += 1
-                    else:
-                        results['updated'] += 1
-                except Exception as e:
-                    current_app.logger.error(f"Error syncing estimate {qb_estimate.get('Id')}: {str(e)}")
-                    results['errors'] += 1
-            
-            # Transaction management handled by repositories
+    def _sync_item_page(self, qb_items: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Upsert a page of items as products"""
+        existing = self.product_repository.find_by_values('quickbooks_item_id', [qb_item['Id'] for qb_item in qb_items])
+        
+        to_update = []
+        to_insert = []
+        for qb_item in qb_items:
+            product_data = self._product_data(qb_item)
+            product = existing.get(qb_item['Id'])
+            if product:
+                to_update.append({'id': product.id, **product_data})
+            else:
+                to_insert.append(product_data)
+        
+        self.product_repository.bulk_update(to_update)
+        new_ids = self.product_repository.bulk_insert(to_insert, key_field='quickbooks_item_id')
+        
+        local_ids = {row['quickbooks_item_id']: row['id'] for row in to_update}
+        local_ids.update(new_ids)
+        self._record_syncs('item', 'product', qb_items, local_ids)
+        return len(to_insert), len(to_update)
+    
+    def _sync_estimate_page(self, qb_estimates: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Upsert a page of estimates as quotes, replacing their line items"""
+        existing = self.quote_repository.find_by_values(
+            'quickbooks_estimate_id', [qb_estimate['Id'] for qb_estimate in qb_estimates]
+        )
+        new_estimates = [qb_estimate for qb_estimate in qb_estimates if qb_estimate['Id'] not in existing]
+        job_ids = self._create_jobs(new_estimates)
+        
+        to_update = []
+        to_insert = []
+        for qb_estimate in qb_estimates:
+            quote_data = self._quote_data(qb_estimate)
+            quote = existing.get(qb_estimate['Id'])
+            if quote:
+                to_update.append({'id': quote.id, **quote_data})
+            else:
+                to_insert.append({**quote_data, 'job_id': job_ids[qb_estimate['Id']]})
+        
+        self.quote_repository.bulk_update(to_update)
+        new_ids = self.quote_repository.bulk_insert(to_insert, key_field='quickbooks_estimate_id')
+        
+        local_ids = {row['quickbooks_estimate_id']: row['id'] for row in to_update}
+        local_ids.update(new_ids)
+        
+        self.quote_line_item_repository.delete_by_quote_ids([row['id'] for row in to_update])
+        self.quote_line_item_repository.bulk_insert(
+            self._line_items(qb_estimates, local_ids, 'quote_id')
+        )
+        
+        self._record_syncs('estimate', 'quote', qb_estimates, local_ids)
+        return len(to_insert), len(to_update)
+    
+    def _sync_invoice_page(self, qb_invoices: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Upsert a page of invoices, linking estimates and replacing line items"""
+        existing = self.invoice_repository.find_by_values(
+            'quickbooks_invoice_id', [qb_invoice['Id'] for qb_invoice in qb_invoices]
+        )
+        estimate_ids = {qb_invoice['Id']: self._linked_estimate_id(qb_invoice) for qb_invoice in qb_invoices}
+        quotes = self.quote_repository.find_by_values('quickbooks_estimate_id', estimate_ids.values())
+        new_invoices = [qb_invoice for qb_invoice in qb_invoices if qb_invoice['Id'] not in existing]
+        job_ids = self._create_jobs(new_invoices)
+        
+        to_update = []
+        to_insert = []
+        for qb_invoice in qb_invoices:
+            invoice_data = self._invoice_data(qb_invoice)
+            quote = quotes.get(estimate_ids[qb_invoice['Id']])
+            if quote:
+                invoice_data['quote_id'] = quote.id
             
-        except Exception as e:
-            current_app.logger.error(f"Error fetching estimates: {str(e)}")
+            invoice = existing.get(qb_invoice['Id'])
+            if invoice:
+                to_update.append({'id': invoice.id, **invoice_data})
+            else:
+                to_insert.append({**invoice_data, 'job_id': job_ids[qb_invoice['Id']]})
         
-        return results
-    
-    def sync_invoices(self) -> Dict[str, int]:
-        """Sync all invoices from QuickBooks"""
-        results = {'created': 0, 'updated': 0, 'errors': 0}
+        self.invoice_repository.bulk_update(to_update)
+        new_ids = self.invoice_repository.bulk_insert(to_insert, key_field='quickbooks_invoice_id')
         
-        try:
-            invoices = self.qb_service.list_invoices()
-            
-            for qb_invoice in invoices:
-                try:
-                    if self._sync_invoice(qb_invoice):
-                        results['created'] += 1
-                    else:
-                        results['updated'] += 1
-                except Exception as e:
-                    current_app.logger.error(f"Error syncing invoice {qb_invoice.get('Id')}: {str(e)}")
-                    results['errors'] += 1
-            
-            # Transaction management handled by repositories
-            
-        except Exception as e:
-            current_app.logger.error(f"Error fetching invoices: {str(e)}")
+        local_ids = {row['quickbooks_invoice_id']: row['id'] for row in to_update}
+        local_ids.update(new_ids)
         
-        return results
+        self.invoice_line_item_repository.delete_by_invoice_ids([row['id'] for row in to_update])
+        self.invoice_line_item_repository.bulk_insert(
+            self._line_items(qb_invoices, local_ids, 'invoice_id')
+        )
+        
+        self._record_syncs('invoice', 'invoice', qb_invoices, local_ids)
+        return len(to_insert), len(to_update)
     
-    def _sync_customer(self, qb_customer: Dict[str, Any]) -> Dict[str, Any]:
-        """Sync a single customer to contact"""
-        qb_id = qb_customer['Id']
-        
-        # Try to find by QuickBooks ID first
-        contact = self.contact_repository.find_by_quickbooks_customer_id(qb_id)
-        
-        # If not found, try to match by phone or email
-        if not contact:
-            # Extract phone numbers
-            phones = []
-            if qb_customer.get('PrimaryPhone'):
-                phones.append(self._normalize_phone(qb_customer['PrimaryPhone']['FreeFormNumber']))
-            if qb_customer.get('Mobile'):
-                phones.append(self._normalize_phone(qb_customer['Mobile']['FreeFormNumber']))
-            
-            # Try to find by phone
-            for phone in phones:
-                if phone:
-                    contact = self.contact_repository.find_by_phone(phone)
-                    if contact:
-                        break
-            
-            # Try to find by email
-            if not contact and qb_customer.get('PrimaryEmailAddr'):
-                email = qb_customer['PrimaryEmailAddr']['Address']
-                contact = self.contact_repository.find_by_email(email)
+    def _record_syncs(self, entity_type: str, local_table: str,
+                      records: List[Dict[str, Any]], local_ids: Dict[str, int]):
+        """Record sync operations for a page of records"""
+        self.quickbooks_sync_repository.record_syncs(entity_type, local_table, [
+            (record['Id'], local_ids[record['Id']], record.get('SyncToken'))
+            for record in records
+            if record['Id'] in local_ids
+        ])
+    
+    # Related records
+    
+    def _create_jobs(self, qb_transactions: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Create a job for each new QuickBooks transaction.
+        
+        Jobs go on the customer's primary property. Customers that have not been
+        synced yet get a placeholder contact carrying their QuickBooks ID, which
+        the next customer sync fills in, and contacts without a property get one
+        from the transaction's billing address.
+        
+        Args:
+            qb_transactions: Estimates or invoices that have no local record yet
+        
+        Returns:
+            Dictionary mapping QuickBooks transaction ID to new job ID
+        """
+        if not qb_transactions:
+            return {}
+        
+        customer_ids = {
+            qb_transaction['Id']: qb_transaction.get('CustomerRef', {}).get('value')
+            for qb_transaction in qb_transactions
+        }
+        contacts = self.contact_repository.find_by_values('quickbooks_customer_id', customer_ids.values())
+        contact_ids = {customer_id: contact.id for customer_id, contact in contacts.items()}
+        
+        # Placeholders: one per unknown customer, one per transaction without a customer
+        placeholders = {}
+        for qb_transaction in qb_transactions:
+            customer_id = customer_ids[qb_transaction['Id']]
+            key = customer_id or ('transaction', qb_transaction['Id'])
+            if customer_id in contact_ids or key in placeholders:
+                continue
+            placeholders[key] = {
+                'first_name': qb_transaction.get('CustomerRef', {}).get('name', 'Unknown'),
+                'last_name': '',
+                'customer_type': 'customer',
+                'quickbooks_customer_id': customer_id
+            }
+        created = self.contact_repository.create_many(list(placeholders.values()))
+        contact_ids.update({key: contact.id for key, contact in zip(placeholders, created)})
         
-        # Build contact data
+        transaction_contacts = {
+            qb_transaction['Id']: contact_ids[customer_ids[qb_transaction['Id']] or ('transaction', qb_transaction['Id'])]
+            for qb_transaction in qb_transactions
+        }
+        property_ids = self.property_repository.find_property_ids_for_contacts(list(transaction_contacts.values()))
+        
+        missing = {}
+        for qb_transaction in qb_transactions:
+            contact_id = transaction_contacts[qb_transaction['Id']]
+            if contact_id not in property_ids and contact_id not in missing:
+                missing[contact_id] = {'address': self._billing_address(qb_transaction)}
+        properties = self.property_repository.create_many(list(missing.values()))
+        self.property_repository.create_associations([
+            {'property_id': prop.id, 'contact_id': contact_id, 'relationship_type': 'owner', 'is_primary': True}
+            for contact_id, prop in zip(missing, properties)
+        ])
+        property_ids.update({contact_id: prop.id for contact_id, prop in zip(missing, properties)})
+        
+        jobs = self.job_repository.create_many([
+            {
+                'property_id': property_ids[transaction_contacts[qb_transaction['Id']]],
+                'description': self._job_description(qb_transaction),
+                'status': 'Active'
+            }
+            for qb_transaction in qb_transactions
+        ])
+        return {qb_transaction['Id']: job.id for qb_transaction, job in zip(qb_transactions, jobs)}
+    
+    def _line_items(self, qb_transactions: List[Dict[str, Any]], local_ids: Dict[str, int],
+                    parent_field: str) -> List[Dict[str, Any]]:
+        """Line item rows for a page of estimates or invoices, linked to synced products"""
+        sales_lines = [
+            (qb_transaction['Id'], qb_line)
+            for qb_transaction in qb_transactions
+            for qb_line in qb_transaction.get('Line', [])
+            if qb_line.get('DetailType') == 'SalesItemLineDetail'
+        ]
+        products = self.product_repository.find_by_values('quickbooks_item_id', [
+            qb_line['SalesItemLineDetail'].get('ItemRef', {}).get('value') for _, qb_line in sales_lines
+        ])
+        
+        line_items = []
+        for qb_id, qb_line in sales_lines:
+            if qb_id not in local_ids:
+                continue
+            line_item_data = self._line_item_data(qb_line)
+            line_item_data[parent_field] = local_ids[qb_id]
+            
+            # Link to product if exists
+            product = products.get(qb_line['SalesItemLineDetail'].get('ItemRef', {}).get('value'))
+            if product:
+                line_item_data['product_id'] = product.id
+            line_items.append(line_item_data)
+        return line_items
+    
+    # Field mapping
+    
+    def _customer_phones(self, qb_customer: Dict[str, Any]) -> List[str]:
+        """Normalized phone numbers of a customer, in matching order"""
+        phones = []
+        if qb_customer.get('PrimaryPhone'):
+            phones.append(self._normalize_phone(qb_customer['PrimaryPhone']['FreeFormNumber']))
+        if qb_customer.get('Mobile'):
+            phones.append(self._normalize_phone(qb_customer['Mobile']['FreeFormNumber']))
+        return [phone for phone in phones if phone]
+    
+    def _customer_email(self, qb_customer: Dict[str, Any]) -> Optional[str]:
+        """Primary email address of a customer"""
+        return qb_customer.get('PrimaryEmailAddr', {}).get('Address')
+    
+    def _customer_data(self, qb_customer: Dict[str, Any]) -> Dict[str, Any]:
+        """Contact fields for a QuickBooks customer"""
         contact_data = {
-            'quickbooks_customer_id': qb_id,
+            'quickbooks_customer_id': qb_customer['Id'],
             'quickbooks_sync_token': qb_customer.get('SyncToken'),
             'customer_type': 'customer',
             'tax_exempt': qb_customer.get('Taxable', True) == False
@@ -213,28 +460,12 @@ class QuickBooksSyncService:
         if qb_customer.get('Balance'):
             contact_data['outstanding_balance'] = Decimal(str(qb_customer['Balance']))
         
-        # Create or update contact using repository
-        if not contact:
-            contact = self.contact_repository.create(contact_data)
-        else:
-            contact = self.contact_repository.update(contact, contact_data)
-        
-        # Record sync
-        self._record_sync('customer', qb_id, contact.id, 'contact', qb_customer.get('SyncToken'))
-        
-        return contact
+        return contact_data
     
-    def _sync_item(self, qb_item: Dict[str, Any]) -> bool:
-        """Sync a single item to product. Returns True if created, False if updated"""
-        qb_id = qb_item['Id']
-        
-        # Find existing product
-        product = self.product_repository.find_by_quickbooks_item_id(qb_id)
-        is_new = product is None
-        
-        # Build product data
+    def _product_data(self, qb_item: Dict[str, Any]) -> Dict[str, Any]:
+        """Product fields for a QuickBooks item"""
         product_data = {
-            'quickbooks_item_id': qb_id,
+            'quickbooks_item_id': qb_item['Id'],
             'quickbooks_sync_token': qb_item.get('SyncToken'),
             'name': qb_item['Name'],
             'description': qb_item.get('Description'),
@@ -255,28 +486,12 @@ class QuickBooksSyncService:
         if qb_item.get('IncomeAccountRef'):
             product_data['income_account'] = qb_item['IncomeAccountRef'].get('name')
         
-        # Create or update product using repository
-        if not product:
-            product = self.product_repository.create(product_data)
-        else:
-            product = self.product_repository.update(product, product_data)
-        
-        # Record sync
-        self._record_sync('item', qb_id, product.id, 'product', qb_item.get('SyncToken'))
-        
-        return is_new
+        return product_data
     
-    def _sync_estimate(self, qb_estimate: Dict[str, Any]) -> bool:
-        """Sync a single estimate to quote. Returns True if created, False if updated"""
-        qb_id = qb_estimate['Id']
-        
-        # Find existing quote
-        quote = self.quote_repository.find_by_quickbooks_id(qb_id)
-        is_new = quote is None
-        
-        # Build quote data
+    def _quote_data(self, qb_estimate: Dict[str, Any]) -> Dict[str, Any]:
+        """Quote fields for a QuickBooks estimate"""
         quote_data = {
-            'quickbooks_estimate_id': qb_id,
+            'quickbooks_estimate_id': qb_estimate['Id'],
             'quickbooks_sync_token': qb_estimate.get('SyncToken'),
             'subtotal': Decimal(str(qb_estimate.get('TotalAmt', 0))),
             'total_amount': Decimal(str(qb_estimate.get('TotalAmt', 0)))
@@ -300,39 +515,17 @@ class QuickBooksSyncService:
         else:
             quote_data['status'] = 'Draft'
         
-        # Create or update quote using repository
-        if not quote:
-            # Need to find or create a job for this quote
-            job = self._find_or_create_job_for_qb_transaction(qb_estimate)
-            quote_data['job_id'] = job.id
-            quote = self.quote_repository.create(quote_data)
-        else:
-            quote = self.quote_repository.update(quote, quote_data)
-        
-        # Sync line items
-        self._sync_estimate_line_items(quote, qb_estimate.get('Line', []))
-        
-        # Record sync
-        self._record_sync('estimate', qb_id, quote.id, 'quote', qb_estimate.get('SyncToken'))
-        
-        return is_new
+        return quote_data
     
-    def _sync_invoice(self, qb_invoice: Dict[str, Any]) -> bool:
-        """Sync a single invoice. Returns True if created, False if updated"""
-        qb_id = qb_invoice['Id']
-        
-        # Find existing invoice
-        invoice = self.invoice_repository.find_by_quickbooks_id(qb_id)
-        is_new = invoice is None
-        
+    def _invoice_data(self, qb_invoice: Dict[str, Any]) -> Dict[str, Any]:
+        """Invoice fields for a QuickBooks invoice"""
         # Calculate financial fields
         total_amount = Decimal(str(qb_invoice.get('TotalAmt', 0)))
         balance_due = Decimal(str(qb_invoice.get('Balance', 0)))
         amount_paid = total_amount - balance_due
         
-        # Build invoice data
         invoice_data = {
-            'quickbooks_invoice_id': qb_id,
+            'quickbooks_invoice_id': qb_invoice['Id'],
             'quickbooks_sync_token': qb_invoice.get('SyncToken'),
             'subtotal': total_amount,
             'total_amount': total_amount,
@@ -344,11 +537,13 @@ class QuickBooksSyncService:
         if qb_invoice.get('TxnTaxDetail'):
             invoice_data['tax_amount'] = Decimal(str(qb_invoice['TxnTaxDetail'].get('TotalTax', 0)))
         
-        # Dates
+        # Dates; due_date is required, so invoices without terms are due on issue
         if qb_invoice.get('TxnDate'):
             invoice_data['invoice_date'] = datetime.strptime(qb_invoice['TxnDate'], '%Y-%m-%d').date()
         if qb_invoice.get('DueDate'):
             invoice_data['due_date'] = datetime.strptime(qb_invoice['DueDate'], '%Y-%m-%d').date()
+        elif invoice_data.get('invoice_date'):
+            invoice_data['due_date'] = invoice_data['invoice_date']
         
         # Payment status
         if balance_due == 0:
@@ -360,176 +555,47 @@ class QuickBooksSyncService:
         else:
             invoice_data['payment_status'] = 'unpaid'
         
-        # Link to estimate if exists
-        if qb_invoice.get('LinkedTxn'):
-            for linked in qb_invoice['LinkedTxn']:
-                if linked['TxnType'] == 'Estimate':
-                    estimate_qb_id = linked['TxnId']
-                    quote = self.quote_repository.find_by_quickbooks_id(estimate_qb_id)
-                    if quote:
-                        invoice_data['quote_id'] = quote.id
-        
-        # Create or update invoice using repository
-        if not invoice:
-            # Need to find or create a job for this invoice
-            job = self._find_or_create_job_for_qb_transaction(qb_invoice)
-            invoice_data['job_id'] = job.id
-            invoice = self.invoice_repository.create(invoice_data)
-        else:
-            invoice = self.invoice_repository.update(invoice, invoice_data)
-        
-        # Sync line items
-        self._sync_invoice_line_items(invoice, qb_invoice.get('Line', []))
-        
-        # Record sync
-        self._record_sync('invoice', qb_id, invoice.id, 'invoice', qb_invoice.get('SyncToken'))
-        
-        return is_new
+        return invoice_data
     
-    def _sync_estimate_line_items(self, quote: Dict[str, Any], qb_lines: List[Dict[str, Any]]):
-        """Sync line items for an estimate"""
-        # Remove existing line items
-        self.quote_line_item_repository.delete_by_quote_id(quote.id)
-        
-        for qb_line in qb_lines:
-            if qb_line.get('DetailType') == 'SalesItemLineDetail':
-                # Build line item data
-                line_item_data = {
-                    'quote_id': quote.id,
-                    'description': qb_line.get('Description', ''),
-                    'quantity': Decimal(str(qb_line.get('SalesItemLineDetail', {}).get('Qty', 1))),
-                    'unit_price': Decimal(str(qb_line.get('SalesItemLineDetail', {}).get('UnitPrice', 0))),
-                    'line_total': Decimal(str(qb_line.get('Amount', 0))),
-                    'quickbooks_line_id': qb_line.get('Id')
-                }
-                
-                # Link to product if exists
-                if qb_line['SalesItemLineDetail'].get('ItemRef'):
-                    item_qb_id = qb_line['SalesItemLineDetail']['ItemRef']['value']
-                    product = self.product_repository.find_by_quickbooks_item_id(item_qb_id)
-                    if product:
-                        line_item_data['product_id'] = product.id
-                
-                # Create line item using repository
-                self.quote_line_item_repository.create(line_item_data)
+    def _linked_estimate_id(self, qb_invoice: Dict[str, Any]) -> Optional[str]:
+        """QuickBooks ID of the estimate an invoice was created from, if any"""
+        estimate_id = None
+        for linked in qb_invoice.get('LinkedTxn', []):
+            if linked['TxnType'] == 'Estimate':
+                estimate_id = linked['TxnId']
+        return estimate_id
     
-    def _sync_invoice_line_items(self, invoice: Dict[str, Any], qb_lines: List[Dict[str, Any]]):
-        """Sync line items for an invoice"""
-        # Remove existing line items
-        self.invoice_line_item_repository.delete_by_invoice_id(invoice.id)
-        
-        for qb_line in qb_lines:
-            if qb_line.get('DetailType') == 'SalesItemLineDetail':
-                # Build line item data
-                line_item_data = {
-                    'invoice_id': invoice.id,
-                    'description': qb_line.get('Description', ''),
-                    'quantity': Decimal(str(qb_line.get('SalesItemLineDetail', {}).get('Qty', 1))),
-                    'unit_price': Decimal(str(qb_line.get('SalesItemLineDetail', {}).get('UnitPrice', 0))),
-                    'line_total': Decimal(str(qb_line.get('Amount', 0))),
-                    'quickbooks_line_id': qb_line.get('Id')
-                }
-                
-                # Link to product if exists
-                if qb_line['SalesItemLineDetail'].get('ItemRef'):
-                    item_qb_id = qb_line['SalesItemLineDetail']['ItemRef']['value']
-                    product = self.product_repository.find_by_quickbooks_item_id(item_qb_id)
-                    if product:
-                        line_item_data['product_id'] = product.id
-                
-                # Create line item using repository
-                self.invoice_line_item_repository.create(line_item_data)
+    def _line_item_data(self, qb_line: Dict[str, Any]) -> Dict[str, Any]:
+        """Line item fields for a QuickBooks sales line"""
+        return {
+            'description': qb_line.get('Description', ''),
+            'quantity': Decimal(str(qb_line.get('SalesItemLineDetail', {}).get('Qty', 1))),
+            'unit_price': Decimal(str(qb_line.get('SalesItemLineDetail', {}).get('UnitPrice', 0))),
+            'line_total': Decimal(str(qb_line.get('Amount', 0))),
+            'quickbooks_line_id': qb_line.get('Id')
+        }
     
-    def _find_or_create_job_for_qb_transaction(self, qb_transaction: Dict[str, Any]) -> Dict[str, Any]:
-        """Find or create a job for a QuickBooks transaction"""
-        # Try to find contact first
-        contact = None
-        if qb_transaction.get('CustomerRef'):
-            customer_qb_id = qb_transaction['CustomerRef']['value']
-            contact = self.contact_repository.find_by_quickbooks_customer_id(customer_qb_id)
-        
-        if not contact:
-            # Create a placeholder contact
-            contact_data = {
-                'first_name': qb_transaction.get('CustomerRef', {}).get('name', 'Unknown'),
-                'customer_type': 'customer'
-            }
-            contact = self.contact_repository.create(contact_data)
-        
-        # Find or create property
-        property = self.property_repository.find_by_contact_id(contact.id)
-        if not property:
-            # Extract address from billing address if available
-            bill_addr = qb_transaction.get('BillAddr', {})
-            address_parts = []
-            if bill_addr.get('Line1'):
-                address_parts.append(bill_addr['Line1'])
-            if bill_addr.get('City'):
-                address_parts.append(bill_addr['City'])
-            if bill_addr.get('CountrySubDivisionCode'):
-                address_parts.append(bill_addr['CountrySubDivisionCode'])
-            
-            address = ', '.join(address_parts) if address_parts else 'Unknown Address'
-            
-            property_data = {
-                'contact_id': contact.id,
-                'address': address
-            }
-            property = self.property_repository.create(property_data)
-        
-        # Create job
+    def _billing_address(self, qb_transaction: Dict[str, Any]) -> str:
+        """Single-line address from a transaction's billing address"""
+        bill_addr = qb_transaction.get('BillAddr', {})
+        address_parts = []
+        if bill_addr.get('Line1'):
+            address_parts.append(bill_addr['Line1'])
+        if bill_addr.get('City'):
+            address_parts.append(bill_addr['City'])
+        if bill_addr.get('CountrySubDivisionCode'):
+            address_parts.append(bill_addr['CountrySubDivisionCode'])
+        
+        return ', '.join(address_parts) if address_parts else 'Unknown Address'
+    
+    def _job_description(self, qb_transaction: Dict[str, Any]) -> str:
+        """Description for a job created from a QuickBooks transaction"""
         doc_number = qb_transaction.get('DocNumber', '')
-        description = f"QuickBooks Import - {qb_transaction.get('TxnType', 'Transaction')} #{doc_number}"
-        
-        job_data = {
-            'property_id': property.id,
-            'description': description,
-            'status': 'Active'
-        }
-        job = self.job_repository.create(job_data)
-        
-        return job
+        return f"QuickBooks Import - {qb_transaction.get('TxnType', 'Transaction')} #{doc_number}"
     
     def _normalize_phone(self, phone: str) -> Optional[str]:
         """Normalize phone number to match CRM format"""
-        if not phone:
-            return None
-        
-        # Remove all non-digits
-        digits = ''.join(filter(str.isdigit, phone))
-        
-        # Add country code if missing
-        if len(digits) == 10:
-            digits = '1' + digits
-        
-        # Format as +1XXXXXXXXXX
-        if len(digits) == 11 and digits.startswith('1'):
-            return f"+{digits}"
-        
-        return None  # Invalid format
-    
-    def _record_sync(self, entity_type: str, entity_id: str, 
-                    local_id: int, local_table: str, sync_version: str):
-        """Record a sync operation"""
-        # First try to find by entity type and entity_id
-        sync = self.quickbooks_sync_repository.find_by_entity(entity_type, entity_id)
-        
-        # Build sync data
-        sync_data = {
-            'entity_type': entity_type,
-            'entity_id': entity_id,
-            'local_id': local_id,
-            'local_table': local_table,
-            'sync_version': sync_version,
-            'last_synced': utc_now(),
-            'sync_status': 'synced'
-        }
-        
-        # Create or update sync record using repository
-        if not sync:
-            sync = self.quickbooks_sync_repository.create(sync_data)
-        else:
-            sync = self.quickbooks_sync_repository.update(sync, sync_data)
+        return normalization.normalize_us_phone(phone)
     
     def update_contact_financial_summary(self, contact: Dict[str, Any]):
         """Update contact's financial summary from invoices"""
@@ -559,5 +625,5 @@ class QuickBooksSyncService:
         }
         if average_days_to_pay is not None:
             contact_data['average_days_to_pay'] = average_days_to_pay
-            
-        self.contact_repository.update(contact, contact_data)
\ No newline at end of file
+        
+        self.contact_repository.update(contact, **contact_data)
@@ -10,12 +10,15 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 from dataclasses import dataclass
 
+import numpy as np
+
 from repositories.roi_repository import ROIRepository
 from repositories.conversion_repository import ConversionRepository
 from repositories.campaign_repository import CampaignRepository
 from repositories.contact_repository import ContactRepository
 from repositories.campaign_response_repository import CampaignResponseRepository
 from services.cache_service import CacheService
+from services.roi_forecasting_service import ROIForecastingService
 from services.common.result import Result, Success, Failure
 from utils.datetime_utils import utc_now, ensure_utc
 
@@ -57,12 +60,16 @@ class ROICalculationService:
     CACHE_TTL_MEDIUM = 1800  # 30 minutes
     CACHE_TTL_LONG = 3600  # 1 hour
     
+    # Days of daily history used for portfolio forecasts
+    FORECAST_HISTORY_DAYS = 90
+    
     def __init__(self,
                  roi_repository: ROIRepository,
                  conversion_repository: ConversionRepository,
                  campaign_repository: CampaignRepository,
                  contact_repository: ContactRepository,
-                 cache_service: CacheService):
+                 cache_service: CacheService,
+                 forecasting_engine: Optional[ROIForecastingService] = None):
         """
         Initialize the ROI calculation service.
         
@@ -72,12 +79,14 @@ class ROICalculationService:
             campaign_repository: Repository for campaigns
             contact_repository: Repository for contacts
             cache_service: Cache service for performance optimization
+            forecasting_engine: Vectorized engine for portfolio forecasts
         """
         self.roi_repository = roi_repository
         self.conversion_repository = conversion_repository
         self.campaign_repository = campaign_repository
         self.contact_repository = contact_repository
         self.cache_service = cache_service
+        self.forecasting_engine = forecasting_engine or ROIForecastingService()
     
     # ===== Cost Tracking and Management =====
     
@@ -929,7 +938,119 @@ class ROICalculationService:
         except Exception as e:
             logger.error(f"Error in scenario modeling: {e}")
             return Failure(str(e), code="SCENARIO_MODELING_ERROR")
-    
+
+    def generate_portfolio_forecast(self, campaign_ids: List[int], forecast_days: int = 30,
+                                    confidence_level: float = 0.95) -> Result[Dict[str, Any]]:
+        """
+        Forecast ROI for many campaigns in one vectorized pass.
+
+        Args:
+            campaign_ids: Campaign IDs to forecast
+            forecast_days: Number of days to forecast
+            confidence_level: Confidence level for the bootstrap intervals
+
+        Returns:
+            Result with per-campaign forecasts and portfolio totals
+        """
+        try:
+            if not campaign_ids:
+                return Failure("At least one campaign is required", code="VALIDATION_ERROR")
+            if forecast_days <= 0:
+                return Failure("Forecast days must be positive", code="VALIDATION_ERROR")
+
+            campaign_ids = list(dict.fromkeys(campaign_ids))
+            history_days = self.FORECAST_HISTORY_DAYS
+            start_date = (utc_now() - timedelta(days=history_days - 1)).date()
+
+            rows = self.roi_repository.get_daily_revenue_cost_matrix(campaign_ids, start_date)
+            engine = self.forecasting_engine
+            revenue, cost = engine.build_matrices(rows, campaign_ids, start_date, history_days)
+            forecast = engine.forecast(revenue, cost, forecast_days, confidence_level)
+            forecasts = engine.forecast_to_dicts(campaign_ids, forecast, forecast_days)
+
+            total_revenue = sum((f['predicted_revenue'] for f in forecasts), Decimal('0.00'))
+            total_costs = sum((f['predicted_costs'] for f in forecasts), Decimal('0.00'))
+            portfolio_roi = ((total_revenue - total_costs) / total_costs).quantize(engine.RATIO_PLACES) \
+                if total_costs > 0 else Decimal('0.0000')
+
+            return Success({
+                'forecast_period_days': forecast_days,
+                'confidence_level': confidence_level,
+                'campaigns': forecasts,
+                'portfolio': {
+                    'predicted_revenue': total_revenue,
+                    'predicted_costs': total_costs,
+                    'predicted_roi': portfolio_roi
+                }
+            })
+
+        except Exception as e:
+            logger.error(f"Error generating portfolio forecast: {e}")
+            return Failure(str(e), code="FORECAST_ERROR")
+
+    def portfolio_what_if_modeling(self, campaign_ids: List[int],
+                                   scenarios: Dict[str, Dict[str, Any]]) -> Result[Dict[str, Any]]:
+        """
+        Evaluate what-if scenarios for many campaigns together.
+
+        Args:
+            campaign_ids: Campaign IDs to model
+            scenarios: Dictionary of scenario configurations
+
+        Returns:
+            Result with per-campaign baselines and scenario outcomes
+        """
+        try:
+            if not campaign_ids:
+                return Failure("At least one campaign is required", code="VALIDATION_ERROR")
+
+            baselines = self.roi_repository.get_scenario_baselines(list(campaign_ids))
+            ordered_ids = [cid for cid in dict.fromkeys(campaign_ids) if cid in baselines]
+            engine = self.forecasting_engine
+
+            budgets = np.array([float(baselines[cid]['current_budget']) for cid in ordered_ids])
+            rates = np.array([float(baselines[cid]['current_conversion_rate']) for cid in ordered_ids])
+            rois = np.array([float(baselines[cid]['current_roi']) for cid in ordered_ids])
+            outcomes = engine.scenario_matrix(budgets, rates, rois, scenarios)
+
+            campaigns = {}
+            for i, campaign_id in enumerate(ordered_ids):
+                scenario_results = {}
+                for scenario_name, arrays in outcomes.items():
+                    result = {}
+                    for key, values in arrays.items():
+                        if key == 'new_budget':
+                            result[key] = engine.to_money(values[i])
+                        elif key == 'new_conversion_rate':
+                            result[key] = float(values[i])
+                        else:
+                            result[key] = engine.to_ratio(values[i])
+                    scenario_results[scenario_name] = result
+
+                best_scenario = max(
+                    scenario_results,
+                    key=lambda name: scenario_results[name]['projected_roi'],
+                    default=None
+                )
+                if best_scenario and scenario_results[best_scenario]['roi_change'] <= 0:
+                    best_scenario = None
+
+                campaigns[campaign_id] = {
+                    'baseline': baselines[campaign_id],
+                    'scenarios': scenario_results,
+                    'best_scenario': best_scenario
+                }
+
+            return Success({
+                'campaigns': campaigns,
+                'scenario_count': len(outcomes),
+                'campaign_count': len(ordered_ids)
+            })
+
+        except Exception as e:
+            logger.error(f"Error in portfolio scenario modeling: {e}")
+            return Failure(str(e), code="SCENARIO_MODELING_ERROR")
+
     # ===== Comparative Analysis =====
     
     def compare_campaign_roi_performance(self) -> Result[Dict[str, Any]]:
@@ -0,0 +1,346 @@
+"""
+ROIForecastingService - Vectorized ROI forecasting over a campaigns x days matrix
+Computes least-squares trends, seasonal indices, bootstrap confidence intervals
+and what-if scenarios for a whole portfolio of campaigns in one call
+"""
+
+import logging
+from datetime import date, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class ROIForecastingService:
+    """NumPy forecasting engine for campaign revenue, cost and ROI"""
+
+    # Trend classification thresholds (relative change of fitted trend over the window)
+    TREND_UP_THRESHOLD = 0.1
+    TREND_DOWN_THRESHOLD = -0.1
+
+    # Weekly seasonality by default (daily history)
+    DEFAULT_SEASON_LENGTH = 7
+
+    DEFAULT_BOOTSTRAP_SAMPLES = 1000
+
+    # Decimal quantization applied at the API boundary
+    MONEY_PLACES = Decimal('0.01')
+    RATIO_PLACES = Decimal('0.0001')
+
+    def __init__(self, bootstrap_samples: int = DEFAULT_BOOTSTRAP_SAMPLES,
+                 season_length: int = DEFAULT_SEASON_LENGTH,
+                 random_seed: Optional[int] = None):
+        """
+        Initialize the forecasting engine.
+
+        Args:
+            bootstrap_samples: Number of bootstrap resamples for confidence intervals
+            season_length: Length of the seasonal cycle in days
+            random_seed: Optional seed for reproducible bootstrap intervals
+        """
+        self.bootstrap_samples = bootstrap_samples
+        self.season_length = season_length
+        self.random_seed = random_seed
+
+    # ===== Matrix Construction =====
+
+    @staticmethod
+    def build_matrices(rows: Sequence[Tuple[int, Any, Any, Any]], campaign_ids: Sequence[int],
+                       start_date: date, days: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pivot (campaign_id, date, revenue, cost) rows into dense matrices.
+
+        Args:
+            rows: Daily rows as returned by ROIRepository.get_daily_revenue_cost_matrix
+            campaign_ids: Campaign IDs defining the row order of the matrices
+            start_date: First day of the history window (column 0)
+            days: Number of days in the history window
+
+        Returns:
+            Tuple of (revenue, cost) float matrices shaped campaigns x days
+        """
+        index = {campaign_id: i for i, campaign_id in enumerate(campaign_ids)}
+        revenue = np.zeros((len(campaign_ids), days), dtype=float)
+        cost = np.zeros((len(campaign_ids), days), dtype=float)
+
+        for campaign_id, day, daily_revenue, daily_cost in rows:
+            row = index.get(campaign_id)
+            if row is None or day is None:
+                continue
+            if isinstance(day, str):
+                day = date.fromisoformat(day[:10])
+            elif hasattr(day, 'date'):
+                day = day.date()
+            col = (day - start_date).days
+            if 0 <= col < days:
+                revenue[row, col] += float(daily_revenue or 0)
+                cost[row, col] += float(daily_cost or 0)
+
+        return revenue, cost
+
+    # ===== Core Vectorized Computations =====
+
+    @staticmethod
+    def fit_trend(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Least-squares linear trend for every row of the matrix at once.
+
+        Args:
+            matrix: campaigns x days matrix
+
+        Returns:
+            Tuple of (slope, intercept) arrays, one value per campaign
+        """
+        n_days = matrix.shape[1]
+        if n_days < 2:
+            return np.zeros(matrix.shape[0]), matrix.mean(axis=1) if n_days else np.zeros(matrix.shape[0])
+
+        x = np.arange(n_days, dtype=float)
+        design = np.vstack([x, np.ones(n_days)]).T
+        coefficients, _, _, _ = np.linalg.lstsq(design, matrix.T, rcond=None)
+        return coefficients[0], coefficients[1]
+
+    def seasonal_index(self, matrix: np.ndarray) -> np.ndarray:
+        """
+        Multiplicative seasonal index per campaign and position in the cycle.
+
+        Args:
+            matrix: campaigns x days matrix
+
+        Returns:
+            campaigns x season_length matrix of seasonal factors (1.0 = no effect)
+        """
+        n_campaigns, n_days = matrix.shape
+        season = self.season_length
+        if n_days < season * 2:
+            return np.ones((n_campaigns, season))
+
+        usable = (n_days // season) * season
+        cycles = matrix[:, n_days - usable:].reshape(n_campaigns, -1, season)
+        position_means = cycles.mean(axis=1)
+        overall = position_means.mean(axis=1, keepdims=True)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            index = np.where(overall > 0, position_means / overall, 1.0)
+        return index
+
+    def bootstrap_roi_intervals(self, revenue: np.ndarray, cost: np.ndarray,
+                                confidence_level: float = 0.95) -> Dict[str, np.ndarray]:
+        """
+        Bootstrap confidence intervals for ROI of every campaign.
+
+        Days are resampled with replacement (the same draw is used for revenue
+        and cost so the pairing of a day is preserved), and ROI is recomputed
+        for each resample across all campaigns at once.
+
+        Args:
+            revenue: campaigns x days revenue matrix
+            cost: campaigns x days cost matrix
+            confidence_level: Confidence level (e.g. 0.95)
+
+        Returns:
+            Dictionary of per-campaign arrays: mean, std, lower, upper, margin, sample_size
+        """
+        n_campaigns, n_days = revenue.shape
+        active = (revenue != 0) | (cost != 0)
+        sample_size = active.sum(axis=1)
+
+        total_cost = cost.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            point_roi = np.where(total_cost > 0, (revenue.sum(axis=1) - total_cost) / total_cost, 0.0)
+
+        if n_days < 2 or n_campaigns == 0:
+            zeros = np.zeros(n_campaigns)
+            return {
+                'mean': point_roi, 'std': zeros, 'lower': point_roi,
+                'upper': point_roi, 'margin': zeros, 'sample_size': sample_size
+            }
+
+        rng = np.random.default_rng(self.random_seed)
+        # Each resample is expressed as how many times every day was drawn, so
+        # totals for all campaigns become one matrix product (samples x campaigns)
+        weights = rng.multinomial(n_days, np.full(n_days, 1.0 / n_days), size=self.bootstrap_samples)
+        resampled_revenue = weights @ revenue.T
+        resampled_cost = weights @ cost.T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            roi_samples = np.where(resampled_cost > 0,
+                                   (resampled_revenue - resampled_cost) / resampled_cost, 0.0)
+
+        alpha = (1 - confidence_level) / 2
+        lower, upper = np.quantile(roi_samples, [alpha, 1 - alpha], axis=0)
+
+        # Campaigns with fewer than two observed days carry no spread information
+        degenerate = sample_size < 2
+        lower = np.where(degenerate, point_roi, lower)
+        upper = np.where(degenerate, point_roi, upper)
+        std = np.where(degenerate, 0.0, roi_samples.std(axis=0, ddof=1))
+
+        return {
+            'mean': point_roi,
+            'std': std,
+            'lower': lower,
+            'upper': upper,
+            'margin': (upper - lower) / 2,
+            'sample_size': sample_size
+        }
+
+    def forecast(self, revenue: np.ndarray, cost: np.ndarray, forecast_days: int,
+                 confidence_level: float = 0.95) -> Dict[str, np.ndarray]:
+        """
+        Forecast revenue, cost and ROI for every campaign in one pass.
+
+        The projection extends the least-squares trend over the forecast
+        horizon and scales each day by the campaign's seasonal index.
+
+        Args:
+            revenue: campaigns x days revenue matrix
+            cost: campaigns x days cost matrix
+            forecast_days: Number of days to forecast
+            confidence_level: Confidence level for the ROI interval
+
+        Returns:
+            Dictionary of per-campaign arrays
+        """
+        n_campaigns, n_days = revenue.shape
+        revenue_slope, revenue_intercept = self.fit_trend(revenue)
+        cost_slope, cost_intercept = self.fit_trend(cost)
+
+        future_x = np.arange(n_days, n_days + forecast_days, dtype=float)
+        seasonal = self.seasonal_index(revenue)
+        # The index is built from whole cycles ending on the last history day,
+        # so the first forecast day is always position 0 of the cycle
+        season_positions = np.arange(forecast_days) % self.season_length
+
+        projected_revenue = (revenue_slope[:, None] * future_x + revenue_intercept[:, None]) * seasonal[:, season_positions]
+        projected_cost = cost_slope[:, None] * future_x + cost_intercept[:, None]
+
+        predicted_revenue = np.clip(projected_revenue, 0, None).sum(axis=1)
+        predicted_costs = np.clip(projected_cost, 0, None).sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            predicted_roi = np.where(predicted_costs > 0,
+                                     (predicted_revenue - predicted_costs) / predicted_costs, 0.0)
+
+        intervals = self.bootstrap_roi_intervals(revenue, cost, confidence_level)
+        # Centre the bootstrap spread on the projected ROI
+        lower = predicted_roi - (intervals['mean'] - intervals['lower'])
+        upper = predicted_roi + (intervals['upper'] - intervals['mean'])
+
+        # Relative change of the fitted revenue trend across the history window
+        baseline = np.abs(revenue_intercept) + np.abs(revenue_slope) * max(n_days - 1, 0) / 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            relative_change = np.where(baseline > 0, revenue_slope * max(n_days - 1, 1) / baseline, 0.0)
+
+        return {
+            'predicted_revenue': predicted_revenue,
+            'predicted_costs': predicted_costs,
+            'predicted_roi': predicted_roi,
+            'lower': lower,
+            'upper': upper,
+            'revenue_slope': revenue_slope,
+            'relative_change': relative_change,
+            'seasonal_index': seasonal,
+            'intervals': intervals
+        }
+
+    def scenario_matrix(self, current_budget: np.ndarray, current_conversion_rate: np.ndarray,
+                        current_roi: np.ndarray,
+                        scenarios: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Evaluate every what-if scenario against every campaign baseline at once.
+
+        Uses the same rules as ROIRepository.what_if_scenario_analysis: budget
+        increases carry a 10% diminishing-returns penalty (decreases a 10% gain),
+        and conversion rate changes scale ROI proportionally.
+
+        Args:
+            current_budget: Per-campaign current spend
+            current_conversion_rate: Per-campaign conversion rate
+            current_roi: Per-campaign current ROI
+            scenarios: Dictionary of scenario configurations
+
+        Returns:
+            Dictionary keyed by scenario name of per-campaign result arrays
+        """
+        results = {}
+        for scenario_name, params in scenarios.items():
+            if 'budget_multiplier' in params:
+                multiplier = float(params['budget_multiplier'])
+                roi_adjustment = 0.9 if multiplier > 1 else 1.1
+                projected_roi = current_roi * roi_adjustment
+                results[scenario_name] = {
+                    'new_budget': current_budget * multiplier,
+                    'projected_roi': projected_roi,
+                    'roi_change': projected_roi - current_roi
+                }
+            elif 'conversion_rate_increase' in params:
+                new_rate = current_conversion_rate + float(params['conversion_rate_increase'])
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    rate_multiplier = np.where(current_conversion_rate > 0,
+                                               new_rate / current_conversion_rate, 1.0)
+                projected_roi = current_roi * rate_multiplier
+                results[scenario_name] = {
+                    'new_conversion_rate': new_rate,
+                    'projected_roi': projected_roi,
+                    'roi_change': projected_roi - current_roi
+                }
+        return results
+
+    # ===== API Boundary Helpers =====
+
+    def classify_trend(self, relative_change: float) -> str:
+        """Map a relative trend change to up/down/stable"""
+        if relative_change > self.TREND_UP_THRESHOLD:
+            return 'up'
+        if relative_change < self.TREND_DOWN_THRESHOLD:
+            return 'down'
+        return 'stable'
+
+    @classmethod
+    def to_money(cls, value: float) -> Decimal:
+        """Convert a float amount to a 2-place Decimal"""
+        if not np.isfinite(value):
+            return Decimal('0.00')
+        return Decimal(repr(float(value))).quantize(cls.MONEY_PLACES, rounding=ROUND_HALF_UP)
+
+    @classmethod
+    def to_ratio(cls, value: float) -> Decimal:
+        """Convert a float ratio to a 4-place Decimal"""
+        if not np.isfinite(value):
+            return Decimal('0.0000')
+        return Decimal(repr(float(value))).quantize(cls.RATIO_PLACES, rounding=ROUND_HALF_UP)
+
+    def forecast_to_dicts(self, campaign_ids: Sequence[int], forecast: Dict[str, np.ndarray],
+                          forecast_days: int) -> List[Dict[str, Any]]:
+        """
+        Convert forecast arrays to the per-campaign dict shape returned by
+        ROIRepository.calculate_roi_forecast, restoring Decimal precision.
+
+        Args:
+            campaign_ids: Campaign IDs in matrix row order
+            forecast: Output of forecast()
+            forecast_days: Forecast horizon in days
+
+        Returns:
+            List of forecast dictionaries, one per campaign
+        """
+        intervals = forecast['intervals']
+        results = []
+        for i, campaign_id in enumerate(campaign_ids):
+            results.append({
+                'campaign_id': campaign_id,
+                'forecast_period_days': forecast_days,
+                'predicted_revenue': self.to_money(forecast['predicted_revenue'][i]),
+                'predicted_costs': self.to_money(forecast['predicted_costs'][i]),
+                'predicted_roi': self.to_ratio(forecast['predicted_roi'][i]),
+                'confidence_interval': {
+                    'lower': self.to_ratio(forecast['lower'][i]),
+                    'upper': self.to_ratio(forecast['upper'][i])
+                },
+                'trend_direction': self.classify_trend(float(forecast['relative_change'][i])),
+                'sample_size': int(intervals['sample_size'][i]),
+                'seasonal_index': [round(float(v), 4) for v in forecast['seasonal_index'][i]]
+            })
+        return results
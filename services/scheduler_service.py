@@ -1,6 +1,7 @@
 # services/scheduler_service.py
 
 from datetime import date, timedelta, datetime
+from typing import Any, Dict, List
 from utils.datetime_utils import utc_now
 import logging
 from celery_worker import celery
@@ -9,6 +10,8 @@ from repositories.setting_repository import SettingRepository
 from repositories.job_repository import JobRepository
 from repositories.quote_repository import QuoteRepository
 from repositories.appointment_repository import AppointmentRepository
+from repositories.scheduled_notification_repository import ScheduledNotificationRepository
+from services.common.result import Result
 
 logger = logging.getLogger(__name__)
 
@@ -16,89 +19,171 @@ logger = logging.getLogger(__name__)
 class SchedulerService:
     """Service for managing scheduled tasks using repository pattern"""
     
+    # ScheduledNotification kinds
+    APPOINTMENT_REMINDER = 'appointment_reminder'
+    REVIEW_REQUEST = 'review_request'
+    # What each kind is called in logs, and what its target_id refers to
+    NOTIFICATION_LABELS = {
+        APPOINTMENT_REMINDER: ('SMS reminder', 'appointment'),
+        REVIEW_REQUEST: ('review request', 'job')
+    }
+    
     def __init__(self, setting_repository: SettingRepository,
                  job_repository: JobRepository,
                  quote_repository: QuoteRepository,
                  appointment_repository: AppointmentRepository,
+                 scheduled_notification_repository: ScheduledNotificationRepository,
                  openphone_service,
                  invoice_service):
         """Initialize SchedulerService with repository dependencies"""
         self.setting_repository = setting_repository
+        self.scheduled_notification_repository = scheduled_notification_repository
         self.job_repository = job_repository
         self.quote_repository = quote_repository
         self.appointment_repository = appointment_repository
         self.openphone_service = openphone_service
         self.invoice_service = invoice_service
     
-    def send_appointment_reminders(self):
-        """Send SMS reminders for appointments scheduled for the next day"""
+    def send_appointment_reminders(self) -> Dict[str, int]:
+        """
+        Queue SMS reminders for appointments scheduled for the next day.
+        
+        Appointments and contacts are loaded in one query and every message is
+        rendered up front. Each reminder is recorded once per appointment and
+        day and sent by its own send_scheduled_notification task, so re-running
+        the scheduler never sends a reminder twice.
+        
+        Returns:
+            Dictionary with the number of reminders queued and skipped
+        """
         tomorrow = date.today() + timedelta(days=1)
         
         # Get template from repository
         template_setting = self.setting_repository.find_one_by(key='appointment_reminder_template')
         if not template_setting:
             logger.warning("Appointment reminder template not found in settings. Aborting task.")
-            return
+            return {'queued': 0, 'skipped': 0}
         template = template_setting.value
 
-        # Get appointments for tomorrow
-        appointments_to_remind = self.appointment_repository.find_by_date(tomorrow)
+        # Get appointments for tomorrow with their contacts
+        appointments_to_remind = self.appointment_repository.find_by_date_with_contacts(tomorrow)
 
         if not appointments_to_remind:
             logger.info("No appointments for tomorrow requiring reminders. Task complete.")
-            return
+            return {'queued': 0, 'skipped': 0}
         
+        appointment_date = tomorrow.strftime('%B %d, %Y')
+        rows = []
         for appt in appointments_to_remind:
-            if appt.contact and appt.contact.phone:
-                contact = appt.contact
-                message = template.format(
+            contact = appt.contact
+            if not (contact and contact.phone):
+                logger.warning(f"Skipping reminder for appointment {appt.id}: contact or phone number missing.")
+                continue
+            rows.append({
+                'target_id': appt.id,
+                'contact_id': contact.id,
+                'phone': contact.phone,
+                'message': template.format(
                     first_name=contact.first_name,
-                    appointment_date=tomorrow.strftime('%B %d, %Y'),
+                    appointment_date=appointment_date,
                     appointment_time=appt.time.strftime('%I:%M %p').lower()
                 )
-                try:
-                    result = self.openphone_service.send_message(contact.phone, message)
-                    if result.get('success'):
-                        logger.info(f"Sent appointment reminder to {contact.first_name} for appointment {appt.id}")
-                    else:
-                        logger.error(f"Failed to send SMS reminder for appointment {appt.id}. Error: {result.get('error')}")
-                except Exception as e:
-                    logger.error(f"Failed to send SMS reminder for appointment {appt.id}. Error: {e}")
-            else:
-                logger.warning(f"Skipping reminder for appointment {appt.id}: contact or phone number missing.")
+            })
+        
+        queued = self._queue_notifications(self.APPOINTMENT_REMINDER, tomorrow, rows)
+        return {'queued': queued, 'skipped': len(appointments_to_remind) - len(rows)}
     
-    def send_review_requests(self):
-        """Send SMS review requests for jobs completed yesterday"""
+    def send_review_requests(self) -> Dict[str, int]:
+        """
+        Queue SMS review requests for jobs completed yesterday.
+        
+        Jobs and their property contacts are loaded in one query; requests are
+        recorded once per job and day and sent by send_scheduled_notification
+        tasks like appointment reminders.
+        
+        Returns:
+            Dictionary with the number of requests queued and skipped
+        """
         yesterday = utc_now().date() - timedelta(days=1)
 
         # Get template from repository
         template_setting = self.setting_repository.find_one_by(key='review_request_template')
         if not template_setting:
             logger.warning("Review request template not found in settings. Aborting task.")
-            return
+            return {'queued': 0, 'skipped': 0}
         template = template_setting.value
 
-        # Get completed jobs from yesterday
-        completed_jobs = self.job_repository.find_completed_jobs_by_date(yesterday)
+        # Get completed jobs from yesterday with their property contacts
+        completed_jobs = self.job_repository.find_completed_jobs_with_contacts(yesterday)
 
         if not completed_jobs:
             logger.info("No jobs completed yesterday requiring review requests. Task complete.")
-            return
+            return {'queued': 0, 'skipped': 0}
 
-        for job in completed_jobs:
-            if job.property and job.property.contact and job.property.contact.phone:
-                contact = job.property.contact
-                message = template.format(first_name=contact.first_name)
-                try:
-                    result = self.openphone_service.send_message(contact.phone, message)
-                    if result.get('success'):
-                        logger.info(f"Sent review request to {contact.first_name} for job {job.id}")
-                    else:
-                        logger.error(f"Failed to send review request for job {job.id}. Error: {result.get('error')}")
-                except Exception as e:
-                    logger.error(f"Failed to send review request for job {job.id}. Error: {e}")
-            else:
+        rows = []
+        for job, contact in completed_jobs:
+            if not (contact and contact.phone):
                 logger.warning(f"Skipping review request for job {job.id}: property, contact, or phone missing.")
+                continue
+            rows.append({
+                'target_id': job.id,
+                'contact_id': contact.id,
+                'phone': contact.phone,
+                'message': template.format(first_name=contact.first_name)
+            })
+        
+        queued = self._queue_notifications(self.REVIEW_REQUEST, yesterday, rows)
+        return {'queued': queued, 'skipped': len(completed_jobs) - len(rows)}
+    
+    def _queue_notifications(self, kind: str, scheduled_for: date, rows: List[Dict[str, Any]]) -> int:
+        """Record notifications and enqueue a send task for each one not yet sent"""
+        notification_ids = self.scheduled_notification_repository.create_pending(kind, scheduled_for, rows)
+        
+        queued = 0
+        for notification_id in notification_ids:
+            try:
+                send_scheduled_notification.delay(notification_id)
+                queued += 1
+            except Exception as e:
+                # The notification stays pending; the next scheduler run enqueues it again
+                logger.error(f"Failed to enqueue {kind} notification {notification_id}. Error: {e}")
+        
+        logger.info(f"Queued {queued} {kind} notifications for {scheduled_for}")
+        return queued
+    
+    def send_notification(self, notification_id: int) -> Result[Dict[str, Any]]:
+        """
+        Send one queued reminder or review request.
+        
+        The notification is claimed before sending, so a duplicate task for the
+        same notification finds it taken and does nothing.
+        
+        Args:
+            notification_id: ID of the ScheduledNotification to send
+            
+        Returns:
+            Result with the notification's final status; a failure with code
+            SEND_FAILED can be retried
+        """
+        notification = self.scheduled_notification_repository.claim(notification_id)
+        if notification is None:
+            return Result.success({'notification_id': notification_id, 'status': 'skipped'})
+        
+        label, target = self.NOTIFICATION_LABELS.get(notification.kind, (notification.kind, 'target'))
+        try:
+            result = self.openphone_service.send_message(notification.phone, notification.message)
+            error = None if result.get('success') else result.get('error')
+        except Exception as e:
+            error = str(e)
+        
+        if error is None:
+            self.scheduled_notification_repository.mark_sent(notification_id)
+            logger.info(f"Sent {label} for {target} {notification.target_id}")
+            return Result.success({'notification_id': notification_id, 'status': 'sent'})
+        
+        self.scheduled_notification_repository.mark_failed(notification_id, error)
+        logger.error(f"Failed to send {label} for {target} {notification.target_id}. Error: {error}")
+        return Result.failure(error, code='SEND_FAILED')
     
     def convert_quotes_for_today_appointments(self):
         """Find appointments for the current day and convert draft quotes"""
@@ -155,6 +240,18 @@ def send_review_requests():
         scheduler_service.send_review_requests()
 
 
+@celery.task(bind=True, max_retries=3)
+def send_scheduled_notification(self, notification_id):
+    """
+    Celery task to send one queued appointment reminder or review request.
+    """
+    scheduler_service = current_app.services.get('scheduler')
+    result = scheduler_service.send_notification(notification_id)
+    if result.is_failure:
+        raise self.retry(exc=Exception(result.error), countdown=60 * (self.request.retries + 1))
+    return result.data
+
+
 @celery.task
 def convert_quotes_for_today_appointments():
     """
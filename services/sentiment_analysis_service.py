@@ -1,103 +1,67 @@
 """
-SentimentAnalysisService - Stub implementation for sentiment and intent analysis
-This is a placeholder service that will be replaced with actual AI/ML implementation
-Currently returns mock data for testing purposes
+SentimentAnalysisService - Batched sentiment and intent classification
+Normalizes response text, caches results by text hash in the database and
+classifies only cache misses, in batches, through a pluggable model.
+The default model is the keyword heuristic below.
 """
 
-from typing import List, Dict, Any, Optional
-import random
+from typing import List, Dict, Any, Optional, Protocol
+import hashlib
 import logging
+import re
 from services.common.result import Result, Success, Failure
 
 logger = logging.getLogger(__name__)
 
 
-class SentimentAnalysisService:
-    """
-    Service for analyzing sentiment and intent from text responses.
-    This is a stub implementation that returns mock data.
-    """
+class SentimentModel(Protocol):
+    """Batch interface for sentiment/intent models"""
     
-    # Mock sentiment options
-    SENTIMENTS = ['positive', 'negative', 'neutral']
+    version: str
     
-    # Mock intent options
-    INTENTS = {
-        'positive': ['interested', 'ready_to_buy', 'requesting_info', 'scheduling'],
-        'negative': ['not_interested', 'opt_out', 'complaint', 'wrong_number'],
-        'neutral': ['question', 'clarification', 'thinking', 'maybe_later']
-    }
+    def classify_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Classify normalized texts, returning one result dict per text"""
+        ...
+
+
+class KeywordSentimentModel:
+    """
+    Keyword heuristic sentiment/intent model.
+    Used as the default model until an ML model is plugged in.
+    """
     
-    def __init__(self):
-        """Initialize the sentiment analysis service."""
-        self.analysis_count = 0
+    version = 'keyword_v1'
     
-    def analyze_response(self, text: str) -> Result[Dict[str, Any]]:
+    def classify_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
         """
-        Analyze sentiment and intent from a single response text.
+        Classify a batch of texts.
         
         Args:
-            text: Response text to analyze
+            texts: Normalized texts to classify
             
         Returns:
-            Result with sentiment, intent, and confidence score
+            List of results with sentiment, intent, confidence, keywords and urgency
         """
-        try:
-            if not text:
-                return Failure("No text provided for analysis")
-            
-            # Mock sentiment analysis based on keywords
-            sentiment = self._determine_sentiment(text)
-            intent = self._determine_intent(text, sentiment)
-            confidence = self._calculate_confidence(text)
-            
-            result = {
-                'sentiment': sentiment,
-                'intent': intent,
-                'confidence': confidence,
-                'keywords': self._extract_keywords(text),
-                'urgency': self._determine_urgency(text)
-            }
-            
-            self.analysis_count += 1
-            return Success(result)
-            
-        except Exception as e:
-            logger.error(f"Error analyzing response: {e}")
-            return Failure(str(e))
+        return [self.classify(text) for text in texts]
     
-    def bulk_analyze(self, texts: List[str]) -> Result[List[Dict[str, Any]]]:
+    def classify(self, text: str) -> Dict[str, Any]:
         """
-        Analyze sentiment and intent for multiple texts.
+        Classify a single text.
         
         Args:
-            texts: List of response texts to analyze
+            text: Normalized text to classify
             
         Returns:
-            Result with list of analysis results
+            Dictionary with sentiment, intent, confidence, keywords and urgency
         """
-        try:
-            if not texts:
-                return Success([])
-            
-            results = []
-            for text in texts:
-                analysis = self.analyze_response(text)
-                if analysis.is_success():
-                    results.append(analysis.unwrap())
-                else:
-                    # Return neutral result for failed analysis
-                    results.append({
-                        'sentiment': 'neutral',
-                        'intent': 'unknown',
-                        'confidence': 0.5
-                    })
-            
-            return Success(results)
-            
-        except Exception as e:
-            logger.error(f"Error in bulk analysis: {e}")
-            return Failure(str(e))
+        sentiment = self._determine_sentiment(text)
+        return {
+            'sentiment': sentiment,
+            'intent': self._determine_intent(text, sentiment),
+            'confidence': self._calculate_confidence(text),
+            'keywords': self._extract_keywords(text),
+            'urgency': self._determine_urgency(text)
+        }
     
     def _determine_sentiment(self, text: str) -> str:
         """
@@ -246,6 +210,245 @@ class SentimentAnalysisService:
             return 'medium'
         else:
             return 'low'
+
+
+class CampaignReplySentimentModel(KeywordSentimentModel):
+    """
+    Sentiment rules the OpenPhone webhook has always applied to campaign replies.
+    Deferrals and objections ("maybe later", "too expensive", "already have")
+    count as negative and call-back requests ("call me") as positive, which
+    drives the replied_positive/replied_negative membership statuses.
+    """
+
+    version = 'campaign_reply_keyword_v1'
+
+    POSITIVE_KEYWORDS = [
+        'yes', 'interested', 'great', 'sounds good', 'perfect', 'awesome',
+        'thank you', 'thanks', 'please call', 'call me', 'contact me',
+        'when can', 'schedule', 'appointment', 'meeting', 'available'
+    ]
+
+    NEGATIVE_KEYWORDS = [
+        'no', 'not interested', 'stop', 'remove', 'unsubscribe', 'never',
+        'don\'t', 'can\'t', 'won\'t', 'not now', 'maybe later', 'busy',
+        'already have', 'satisfied', 'too expensive', 'cost too much'
+    ]
+
+    def _determine_sentiment(self, text: str) -> str:
+        """
+        Determine sentiment with the campaign reply keyword lists.
+
+        Args:
+            text: Text to analyze
+
+        Returns:
+            'positive', 'negative', or 'neutral'
+        """
+        text_lower = text.lower()
+        positive_score = sum(1 for keyword in self.POSITIVE_KEYWORDS if keyword in text_lower)
+        negative_score = sum(1 for keyword in self.NEGATIVE_KEYWORDS if keyword in text_lower)
+
+        if positive_score > negative_score:
+            return 'positive'
+        elif negative_score > positive_score:
+            return 'negative'
+        else:
+            return 'neutral'
+
+
+class SentimentAnalysisService:
+    """
+    Service for analyzing sentiment and intent from text responses.
+    
+    Results are cached by the SHA-256 of the normalized text, so the same
+    reply is only classified once per model version.
+    """
+    
+    # Sentiment options
+    SENTIMENTS = ['positive', 'negative', 'neutral']
+    
+    # Intent options
+    INTENTS = {
+        'positive': ['interested', 'ready_to_buy', 'requesting_info', 'scheduling'],
+        'negative': ['not_interested', 'opt_out', 'complaint', 'wrong_number'],
+        'neutral': ['question', 'clarification', 'thinking', 'maybe_later']
+    }
+    
+    # Result used when a text cannot be classified
+    FALLBACK_RESULT = {
+        'sentiment': 'neutral',
+        'intent': 'unknown',
+        'confidence': 0.5
+    }
+    
+    DEFAULT_BATCH_SIZE = 500
+    
+    _WHITESPACE = re.compile(r'\s+')
+    
+    def __init__(self,
+                 classification_repository=None,
+                 model: Optional[SentimentModel] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Initialize the sentiment analysis service.
+        
+        Args:
+            classification_repository: SentimentClassificationRepository for the
+                persistent result cache (optional, no caching without it)
+            model: Batch classification model (defaults to KeywordSentimentModel)
+            batch_size: Number of cache misses sent to the model per call
+        """
+        self.classification_repository = classification_repository
+        self.model = model or KeywordSentimentModel()
+        self.batch_size = batch_size
+        self.analysis_count = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
+    @classmethod
+    def normalize_text(cls, text: Optional[str]) -> str:
+        """
+        Normalize text so trivially different replies share a cache entry.
+        
+        Args:
+            text: Raw response text
+            
+        Returns:
+            Lowercased text with collapsed whitespace
+        """
+        if not text:
+            return ''
+        return cls._WHITESPACE.sub(' ', text).strip().lower()
+    
+    @staticmethod
+    def hash_text(normalized_text: str) -> str:
+        """
+        Hash normalized text for the classification cache.
+        
+        Args:
+            normalized_text: Output of normalize_text
+            
+        Returns:
+            Hex SHA-256 digest
+        """
+        return hashlib.sha256(normalized_text.encode('utf-8')).hexdigest()
+    
+    def analyze_response(self, text: str) -> Result[Dict[str, Any]]:
+        """
+        Analyze sentiment and intent from a single response text.
+        
+        Args:
+            text: Response text to analyze
+            
+        Returns:
+            Result with sentiment, intent, and confidence score
+        """
+        if not self.normalize_text(text):
+            return Failure("No text provided for analysis")
+        
+        result = self.classify_batch([text])
+        if result.is_failure:
+            return result
+        return Success(result.data[0])
+    
+    def bulk_analyze(self, texts: List[str]) -> Result[List[Dict[str, Any]]]:
+        """
+        Analyze sentiment and intent for multiple texts.
+        
+        Args:
+            texts: List of response texts to analyze
+            
+        Returns:
+            Result with list of analysis results, in input order
+        """
+        return self.classify_batch(texts)
+    
+    def classify_batch(self, texts: List[str]) -> Result[List[Dict[str, Any]]]:
+        """
+        Classify texts through the cache, sending only misses to the model.
+        
+        Texts are normalized and deduplicated by hash, cached results are
+        read in one lookup, and the remaining texts are classified in
+        batches of batch_size and written back to the cache.
+        
+        Args:
+            texts: List of response texts to classify
+            
+        Returns:
+            Result with one analysis dict per input text, in input order
+        """
+        try:
+            if not texts:
+                return Success([])
+            
+            normalized = [self.normalize_text(text) for text in texts]
+            hashes = [self.hash_text(text) if text else None for text in normalized]
+            
+            # Unique non-empty texts by hash
+            unique = {}
+            for text_hash, text in zip(hashes, normalized):
+                if text_hash and text_hash not in unique:
+                    unique[text_hash] = text
+            
+            results = self._lookup_cached(list(unique.keys()))
+            misses = [text_hash for text_hash in unique if text_hash not in results]
+            self.cache_hits += len(unique) - len(misses)
+            self.cache_misses += len(misses)
+            
+            classified = {}
+            for start in range(0, len(misses), self.batch_size):
+                batch_hashes = misses[start:start + self.batch_size]
+                batch_results = self.model.classify_batch([unique[text_hash] for text_hash in batch_hashes])
+                classified.update(zip(batch_hashes, batch_results))
+            
+            if classified:
+                self._store_classified(classified)
+                results.update(classified)
+            
+            self.analysis_count += len(texts)
+            return Success([
+                dict(results[text_hash]) if text_hash else dict(self.FALLBACK_RESULT)
+                for text_hash in hashes
+            ])
+            
+        except Exception as e:
+            logger.error(f"Error in batch classification: {e}")
+            return Failure(str(e))
+    
+    def get_cached_classification(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a cached classification without running the model.
+        
+        Args:
+            text: Response text
+            
+        Returns:
+            Cached analysis dict or None on a cache miss
+        """
+        normalized = self.normalize_text(text)
+        if not normalized:
+            return None
+        text_hash = self.hash_text(normalized)
+        return self._lookup_cached([text_hash]).get(text_hash)
+    
+    def _lookup_cached(self, text_hashes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Read cached results, treating cache errors as misses"""
+        if not self.classification_repository or not text_hashes:
+            return {}
+        try:
+            return self.classification_repository.find_by_hashes(text_hashes, self.model.version)
+        except Exception as e:
+            logger.warning(f"Sentiment cache lookup failed, classifying all texts: {e}")
+            return {}
+    
+    def _store_classified(self, classified: Dict[str, Dict[str, Any]]) -> None:
+        """Write new results to the cache, never failing the classification"""
+        if not self.classification_repository:
+            return
+        try:
+            self.classification_repository.save_classifications(classified, self.model.version)
+        except Exception as e:
+            logger.warning(f"Failed to cache {len(classified)} sentiment classifications: {e}")
     
     def get_analysis_stats(self) -> Dict[str, Any]:
         """
@@ -256,6 +459,8 @@ class SentimentAnalysisService:
         """
         return {
             'total_analyzed': self.analysis_count,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
             'service_status': 'operational',
-            'model_version': 'mock_v1.0'
-        }
\ No newline at end of file
+            'model_version': self.model.version
+        }
@@ -10,10 +10,18 @@ TEST ISOLATION FEATURES ADDED:
 
 These methods enable proper test isolation by ensuring services don't retain
 stale database sessions or other state between tests.
+
+STARTUP COST:
+- register_lazy(): registers a service by dotted path ('module:attr'); the
+  module is imported the first time the service is resolved
+- warmup(tags={HOT_PATH_TAG}): builds only the services tagged hot_path, so
+  startup pays for what the first requests need and nothing else
 """
-from typing import Dict, Any, Callable, Optional, Set, List, TypeVar, Generic
+from typing import Dict, Any, Callable, Optional, Set, List, TypeVar, Generic, Iterable
 from enum import Enum
+import importlib
 import threading
+import time
 from functools import wraps
 import logging
 
@@ -21,6 +29,38 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+# Tag for services worth building at startup rather than on first use
+HOT_PATH_TAG = 'hot_path'
+
+
+def resolve_dotted_path(path: str) -> Any:
+    """
+    Import and return the object a dotted path names.
+    
+    Args:
+        path: 'package.module:attr' or 'package.module.attr'
+        
+    Returns:
+        The named attribute of the imported module
+        
+    Raises:
+        ImportError: If the module or attribute does not exist
+    """
+    if ':' in path:
+        module_name, _, attr_path = path.partition(':')
+    else:
+        module_name, _, attr_path = path.rpartition('.')
+    if not module_name or not attr_path:
+        raise ImportError(f"Invalid dotted path '{path}', expected 'module:attr'")
+    
+    target = importlib.import_module(module_name)
+    for attr in attr_path.split('.'):
+        try:
+            target = getattr(target, attr)
+        except AttributeError as e:
+            raise ImportError(f"'{module_name}' has no attribute '{attr_path}'") from e
+    return target
+
 
 class ServiceLifecycle(Enum):
     """Service lifecycle management options"""
@@ -39,10 +79,12 @@ class ServiceDescriptor:
         instance: Optional[Any] = None,
         lifecycle: ServiceLifecycle = ServiceLifecycle.SINGLETON,
         dependencies: Optional[List[str]] = None,
-        tags: Optional[Set[str]] = None
+        tags: Optional[Set[str]] = None,
+        target: Optional[str] = None
     ):
         self.name = name
         self.factory = factory
+        self.target = target  # Dotted path of a lazily imported factory
         self.instance = instance
         self.lifecycle = lifecycle
         self.dependencies = dependencies or []
@@ -131,6 +173,42 @@ class ServiceRegistryEnhanced:
             tags=tags
         )
     
+    def register_lazy(
+        self,
+        name: str,
+        target: str,
+        lifecycle: ServiceLifecycle = ServiceLifecycle.SINGLETON,
+        dependencies: Optional[List[str]] = None,
+        tags: Optional[Set[str]] = None
+    ) -> None:
+        """
+        Register a service by the dotted path of its class or factory.
+        
+        Nothing is imported until the service is first resolved, so modules
+        with heavy dependencies cost nothing at startup.
+        
+        Args:
+            name: Service identifier
+            target: 'module:attr' of a callable taking the dependencies as keyword arguments
+            lifecycle: Service lifecycle type
+            dependencies: Services passed to the callable
+            tags: Optional tags for categorization
+        """
+        def factory(**deps):
+            return resolve_dotted_path(target)(**deps)
+        
+        descriptor = ServiceDescriptor(
+            name=name,
+            factory=factory,
+            lifecycle=lifecycle,
+            dependencies=dependencies,
+            tags=tags,
+            target=target
+        )
+        
+        with self._lock:
+            self._descriptors[name] = descriptor
+    
     def register_singleton(self, name: str, factory: Callable, **kwargs) -> None:
         """Register a singleton service factory"""
         self.register_factory(name, factory, ServiceLifecycle.SINGLETON, **kwargs)
@@ -365,7 +443,8 @@ class ServiceRegistryEnhanced:
             'dependencies': descriptor.dependencies,
             'tags': list(descriptor.tags),
             'is_instantiated': descriptor.instance is not None,
-            'has_factory': descriptor.factory is not None
+            'has_factory': descriptor.factory is not None,
+            'target': descriptor.target
         }
     
     def validate_dependencies(self) -> List[str]:
@@ -432,12 +511,16 @@ class ServiceRegistryEnhanced:
         
         return stack
     
-    def warmup(self, services: Optional[List[str]] = None) -> None:
+    def warmup(self, services: Optional[List[str]] = None, tags: Optional[Iterable[str]] = None) -> Dict[str, float]:
         """
         Pre-instantiate services to avoid lazy loading delays.
         
         Args:
             services: List of service names to warmup (None for all singletons)
+            tags: Only warm singletons with one of these tags, e.g. {HOT_PATH_TAG}
+            
+        Returns:
+            Milliseconds spent building each warmed service, in initialization order
         """
         if services is None:
             # Warmup all singleton services
@@ -445,15 +528,22 @@ class ServiceRegistryEnhanced:
                 name for name, desc in self._descriptors.items()
                 if desc.lifecycle == ServiceLifecycle.SINGLETON
             ]
+        if tags is not None:
+            tags = set(tags)
+            services = [name for name in services if self._descriptors[name].tags & tags]
         
         # Get initialization order
         order = self.get_initialization_order()
         
         # Initialize in correct order
+        timings = {}
         for name in order:
             if name in services:
-                logger.info(f"Warming up service: {name}")
+                started = time.perf_counter()
                 self.get(name)
+                timings[name] = round((time.perf_counter() - started) * 1000, 3)
+                logger.info(f"Warmed up service: {name} ({timings[name]} ms)")
+        return timings
     
     def get_debug_status(self) -> Dict[str, Any]:
         """
@@ -482,7 +572,8 @@ class ServiceRegistryEnhanced:
                 'dependencies': descriptor.dependencies,
                 'tags': list(descriptor.tags),
                 'is_instantiated': is_instantiated,
-                'is_initializing': descriptor.is_initializing
+                'is_initializing': descriptor.is_initializing,
+                'target': descriptor.target
             }
         
         return status
@@ -138,6 +138,34 @@ class SMSMetricsService:
             logger.error(f"Error getting campaign metrics: {str(e)}")
             return {'error': str(e)}
     
+    @staticmethod
+    def summarize_daily_stats(daily_stats: List[Dict], days: int) -> Dict:
+        """
+        Calculate global metrics from daily message stats
+        
+        Args:
+            daily_stats: Output of ActivityRepository.get_daily_message_stats
+            days: Number of days the stats cover
+        
+        Returns:
+            Dict with overall metrics
+        """
+        total_sent = sum(day['sent'] for day in daily_stats)
+        total_bounced = sum(day['bounced'] for day in daily_stats)
+        
+        return {
+            'period_days': days,
+            'total_sent': total_sent,
+            'delivered': total_sent - total_bounced,  # Approximation
+            'bounced': total_bounced,
+            'pending': 0,  # Not tracked in daily stats
+            'bounce_rate': (total_bounced / total_sent * 100) if total_sent > 0 else 0.0,
+            'delivery_rate': ((total_sent - total_bounced) / total_sent * 100) if total_sent > 0 else 0.0,
+            'daily_average': total_sent / days if days > 0 else 0.0,
+            'bounce_trends': daily_stats,
+            'top_bounce_reasons': {}  # Could be enhanced with repository method
+        }
+    
     def get_global_metrics(self, days: int = 30) -> Dict:
         """
         Get global SMS metrics across all campaigns
@@ -151,25 +179,7 @@ class SMSMetricsService:
         try:
             # Use activity repository to get daily stats
             daily_stats = self.activity_repository.get_daily_message_stats(days=days)
-            
-            # Calculate global metrics from daily stats
-            total_sent = sum(day['sent'] for day in daily_stats)
-            total_bounced = sum(day['bounced'] for day in daily_stats)
-            
-            metrics = {
-                'period_days': days,
-                'total_sent': total_sent,
-                'delivered': total_sent - total_bounced,  # Approximation
-                'bounced': total_bounced,
-                'pending': 0,  # Not tracked in daily stats
-                'bounce_rate': (total_bounced / total_sent * 100) if total_sent > 0 else 0.0,
-                'delivery_rate': ((total_sent - total_bounced) / total_sent * 100) if total_sent > 0 else 0.0,
-                'daily_average': total_sent / days if days > 0 else 0.0,
-                'bounce_trends': daily_stats,
-                'top_bounce_reasons': {}  # Could be enhanced with repository method
-            }
-            
-            return metrics
+            return self.summarize_daily_stats(daily_stats, days)
             
         except Exception as e:
             logger.error(f"Error getting global metrics: {str(e)}")
@@ -0,0 +1,55 @@
+"""
+Celery tasks for campaign attribution
+
+Rebuilds the materialized multi-touch attribution of every campaign in one
+batch, so reports read precomputed values instead of walking touchpoints.
+"""
+
+import logging
+from typing import Dict, Any
+
+from celery import shared_task
+from flask import current_app
+
+from utils.datetime_utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def refresh_campaign_attribution() -> Dict[str, Any]:
+    """
+    Recalculate and store attribution for all campaigns and models.
+
+    Returns:
+        Dictionary with the number of campaigns and rows refreshed
+    """
+    try:
+        conversion_service = current_app.services.get('conversion_tracking')
+
+        if not conversion_service:
+            return {
+                'success': False,
+                'error': 'Conversion tracking service not available'
+            }
+
+        result = conversion_service.refresh_campaign_attribution()
+        if result.is_failure:
+            return {
+                'success': False,
+                'error': result.error
+            }
+
+        return {
+            'success': True,
+            'campaigns': result.data['campaigns'],
+            'rows': result.data['rows'],
+            'executed_at': utc_now().isoformat()
+        }
+
+    except Exception as e:
+        logger.error(f"Campaign attribution refresh failed: {e}", exc_info=True)
+        return {
+            'success': False,
+            'error': str(e)
+        }
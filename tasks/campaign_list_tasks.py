@@ -0,0 +1,102 @@
+"""
+Celery tasks for dynamic campaign lists
+
+The scheduled task queues one refresh task per dynamic list, so lists are
+refreshed in parallel across workers and a slow list does not hold up the
+others.
+"""
+
+import logging
+from typing import Dict, Any
+
+from celery import shared_task
+from flask import current_app
+
+from utils.datetime_utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def refresh_dynamic_lists() -> Dict[str, Any]:
+    """
+    Queue a refresh task for every dynamic list.
+
+    Returns:
+        Dictionary with the ids of the queued lists
+    """
+    try:
+        list_service = current_app.services.get('campaign_list')
+
+        if not list_service:
+            return {
+                'success': False,
+                'error': 'Campaign list service not available'
+            }
+
+        result = list_service.get_dynamic_list_ids()
+        if result.is_failure:
+            return {
+                'success': False,
+                'error': result.error
+            }
+
+        for list_id in result.data:
+            refresh_dynamic_list.delay(list_id)
+
+        logger.info(f"Queued refresh of {len(result.data)} dynamic lists")
+        return {
+            'success': True,
+            'queued_lists': result.data,
+            'executed_at': utc_now().isoformat()
+        }
+
+    except Exception as e:
+        logger.error(f"Queueing dynamic list refreshes failed: {e}", exc_info=True)
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+
+@shared_task
+def refresh_dynamic_list(list_id: int) -> Dict[str, Any]:
+    """
+    Refresh one dynamic list from its criteria.
+
+    Args:
+        list_id: Campaign list ID
+
+    Returns:
+        Dictionary with the added, removed and total member counts
+    """
+    try:
+        list_service = current_app.services.get('campaign_list')
+
+        if not list_service:
+            return {
+                'success': False,
+                'error': 'Campaign list service not available'
+            }
+
+        result = list_service.refresh_dynamic_list(list_id)
+        if result.is_failure:
+            return {
+                'success': False,
+                'list_id': list_id,
+                'error': result.error
+            }
+
+        return {
+            'success': True,
+            'list_id': list_id,
+            **result.data
+        }
+
+    except Exception as e:
+        logger.error(f"Dynamic list {list_id} refresh failed: {e}", exc_info=True)
+        return {
+            'success': False,
+            'list_id': list_id,
+            'error': str(e)
+        }
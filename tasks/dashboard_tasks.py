@@ -0,0 +1,59 @@
+"""
+Celery tasks for the dashboard snapshot
+
+Periodically rebuilds the Redis dashboard snapshot from the aggregate queries
+so that drift in the incremental counters is corrected.
+"""
+
+import logging
+from typing import Dict, Any
+
+from celery import shared_task
+from flask import current_app
+
+from utils.datetime_utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def reconcile_dashboard_snapshot() -> Dict[str, Any]:
+    """
+    Rebuild the dashboard snapshot from the original aggregate queries.
+
+    Returns:
+        Dictionary with reconciliation results
+    """
+    try:
+        snapshot_service = current_app.services.get('dashboard_snapshot')
+
+        if not snapshot_service:
+            return {
+                'success': False,
+                'error': 'Dashboard snapshot service not available'
+            }
+
+        if not snapshot_service.is_enabled:
+            logger.info("Dashboard snapshot disabled, skipping reconciliation")
+            return {
+                'success': True,
+                'skipped': True,
+                'executed_at': utc_now().isoformat()
+            }
+
+        stats = snapshot_service.reconcile()
+
+        return {
+            'success': True,
+            'contact_count': stats.get('contact_count', 0),
+            'messages_today': stats.get('messages_today', 0),
+            'snapshot_at': stats['snapshot_at'].isoformat(),
+            'executed_at': utc_now().isoformat()
+        }
+
+    except Exception as e:
+        logger.error(f"Dashboard snapshot reconciliation failed: {e}", exc_info=True)
+        return {
+            'success': False,
+            'error': str(e)
+        }
@@ -0,0 +1,50 @@
+"""
+Celery tasks for background analytics exports
+
+Runs export jobs created by ExportService. Jobs checkpoint their progress,
+so a retried or re-queued task resumes where the previous run stopped.
+"""
+
+import logging
+from typing import Dict, Any
+
+from celery import shared_task
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3)
+def run_export_job(self, job_id: int) -> Dict[str, Any]:
+    """
+    Write an export job to its file, resuming from its last checkpoint.
+
+    Args:
+        job_id: Export job id
+
+    Returns:
+        Dictionary with the final job state
+    """
+    export_service = current_app.services.get('export')
+
+    if not export_service:
+        return {
+            'success': False,
+            'error': 'Export service not available'
+        }
+
+    result = export_service.run_export_job(job_id)
+
+    if result.is_failure:
+        if result.error_code in ('EXPORT_JOB_NOT_FOUND', 'EXPORT_JOB_RUNNING'):
+            return {'success': False, 'error': result.error}
+        logger.warning(f"Export job {job_id} failed, retrying from last checkpoint: {result.error}")
+        raise self.retry(
+            exc=Exception(result.error),
+            countdown=60 * (self.request.retries + 1)
+        )
+
+    return {
+        'success': True,
+        'job': result.data
+    }
@@ -0,0 +1,63 @@
+"""
+Celery tasks for table partition maintenance
+
+Creates the upcoming monthly partitions of activity and webhook_event and
+moves months past their retention window into the archive.
+"""
+
+import logging
+from typing import Dict, Any
+
+from celery import shared_task
+from flask import current_app
+
+from utils.datetime_utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def maintain_partitions() -> Dict[str, Any]:
+    """
+    Create upcoming partitions and archive expired months.
+
+    Returns:
+        Dictionary with the partitions created and months archived per table
+    """
+    try:
+        maintenance_service = current_app.services.get('partition_maintenance')
+
+        if not maintenance_service:
+            return {
+                'success': False,
+                'error': 'Partition maintenance service not available'
+            }
+
+        result = maintenance_service.run_maintenance()
+        if result.is_failure:
+            return {
+                'success': False,
+                'error': result.error
+            }
+
+        return {
+            'success': True,
+            'tables': {
+                table_name: {
+                    'created_partitions': summary['created_partitions'],
+                    'archived_months': [
+                        {'period_start': month['period_start'].isoformat(), 'row_count': month['row_count']}
+                        for month in summary['archived_months']
+                    ]
+                }
+                for table_name, summary in result.data.items()
+            },
+            'executed_at': utc_now().isoformat()
+        }
+
+    except Exception as e:
+        logger.error(f"Partition maintenance failed: {e}", exc_info=True)
+        return {
+            'success': False,
+            'error': str(e)
+        }
@@ -0,0 +1,52 @@
+"""
+Celery tasks for sentiment classification
+
+Classifies campaign replies outside the webhook request. Results go through
+the SentimentAnalysisService cache, so repeated replies are not reclassified.
+"""
+
+import logging
+from typing import Dict, Any
+
+from celery import shared_task
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3)
+def classify_campaign_reply(self, membership_id: int, reply_activity_id: int) -> Dict[str, Any]:
+    """
+    Classify a campaign reply and record its sentiment on the membership.
+
+    Args:
+        membership_id: Campaign membership that received the reply
+        reply_activity_id: Activity holding the reply text
+
+    Returns:
+        Dictionary with the classification result
+    """
+    webhook_service = current_app.services.get('openphone_webhook')
+
+    if not webhook_service:
+        return {
+            'success': False,
+            'error': 'Webhook service not available'
+        }
+
+    result = webhook_service.classify_campaign_reply(membership_id, reply_activity_id)
+
+    if result.is_failure:
+        if result.error_code in ('NOT_FOUND', 'SENTIMENT_UNAVAILABLE'):
+            logger.warning(f"Skipping sentiment for membership {membership_id}: {result.error}")
+            return {'success': False, 'error': result.error}
+        raise self.retry(
+            exc=Exception(result.error),
+            countdown=30 * (self.request.retries + 1)
+        )
+
+    return {
+        'success': True,
+        **result.data
+    }
+
@@ -529,6 +529,26 @@ def ensure_test_session_in_services(app, db_session):
         yield
 
 
+@pytest.fixture
+def query_budget():
+    """
+    Assert how many SQL statements a block may run.
+    
+    Usage:
+        def test_list_page(client, query_budget):
+            with query_budget(5):
+                client.get('/contacts/')
+    
+    The block fails when it runs more than the given number of statements or
+    repeats one SELECT shape often enough to look like an N+1 query; pass
+    allow_n_plus_one=True to only check the count. The yielded QueryStats
+    holds count and shapes for finer assertions.
+    """
+    from utils.query_instrumentation import install, query_budget as budget
+    install()
+    return budget
+
+
 # Re-export repository fixtures so they're available globally
 __all__ = [
     'repository_factory',
@@ -0,0 +1,130 @@
+"""Fake QuickBooks Online API for sync tests.
+
+Serves the query endpoint (GET /v3/company/<realm>/query) from in-memory
+records on a local port, honouring the parts of the query language the sync
+uses: the entity, a MetaData.LastUpdatedTime >= filter, ORDERBY Id,
+STARTPOSITION and MAXRESULTS. Every query is recorded so tests can assert on
+paging and change data capture.
+
+Usage:
+    server = FakeQuickBooksServer()
+    server.add('Customer', {'Id': '1', 'DisplayName': 'Jane Doe'})
+    server.start()
+    os.environ['QUICKBOOKS_API_BASE_URL'] = server.url
+    ...
+    server.stop()
+"""
+
+import json
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+QUERY_PATTERN = re.compile(
+    r"select \* from (?P<entity>\w+)"
+    r"(?: where MetaData\.LastUpdatedTime >= '(?P<since>[^']+)')?"
+    r" orderby Id startposition (?P<start>\d+) maxresults (?P<limit>\d+)$",
+    re.IGNORECASE
+)
+
+# QuickBooks returns at most this many records per query
+MAX_RESULTS = 1000
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).astimezone(timezone.utc)
+
+
+class FakeQuickBooksServer:
+    """In-memory QuickBooks Online query endpoint on a background thread"""
+
+    def __init__(self):
+        self.records: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.queries: List[str] = []
+        self._clock = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add(self, entity: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Add or replace a record, stamping it with the next LastUpdatedTime"""
+        self._clock += timedelta(minutes=1)
+        existing = self.records.setdefault(entity, {}).get(record['Id'], {})
+        sync_token = int(existing.get('SyncToken', -1)) + 1
+        stamped = {
+            **record,
+            'SyncToken': str(sync_token),
+            'MetaData': {'LastUpdatedTime': self._clock.isoformat()}
+        }
+        self.records[entity][record['Id']] = stamped
+        return stamped
+
+    def queries_for(self, entity: str) -> List[str]:
+        """Recorded queries against one entity"""
+        return [query for query in self.queries if re.search(rf"from {entity}\b", query, re.IGNORECASE)]
+
+    def query(self, query: str) -> Dict[str, Any]:
+        """Answer a query the way the QuickBooks query endpoint does"""
+        self.queries.append(query)
+        match = QUERY_PATTERN.match(query.strip())
+        if not match:
+            raise ValueError(f"Unsupported query: {query}")
+
+        entity = match.group('entity')
+        start = int(match.group('start'))
+        limit = min(int(match.group('limit')), MAX_RESULTS)
+        records = sorted(self.records.get(entity, {}).values(), key=lambda record: int(record['Id']))
+        if match.group('since'):
+            since = _parse_time(match.group('since'))
+            records = [record for record in records
+                       if _parse_time(record['MetaData']['LastUpdatedTime']) >= since]
+
+        page = records[start - 1:start - 1 + limit]
+        response = {'startPosition': start, 'maxResults': len(page)}
+        if page:
+            # Like QuickBooks, the entity key is omitted when nothing matches
+            response[entity] = page
+        return {'QueryResponse': response, 'time': self._clock.isoformat()}
+
+    def start(self) -> 'FakeQuickBooksServer':
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                if not re.fullmatch(r"/v3/company/[^/]+/query", parsed.path):
+                    self.send_error(404)
+                    return
+                try:
+                    body = fake.query(parse_qs(parsed.query)['query'][0])
+                except (KeyError, ValueError) as e:
+                    self.send_error(400, str(e))
+                    return
+                payload = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
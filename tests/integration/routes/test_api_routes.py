@@ -70,3 +70,18 @@ def test_openphone_webhook_validation(client, app):
 # TODO: Add test for incoming message webhook ('message.new')
 # TODO: Add test for generate_appointment_summary API endpoint
 # TODO: Add test for get_contact_messages API endpoint
+
+def test_stream_export_api(authenticated_client):
+    """
+    GIVEN an authenticated test client
+    WHEN a CSV export is requested from '/api/exports/<dataset>.<fmt>'
+    THEN the response streams a CSV attachment starting with the header row.
+    """
+    response = authenticated_client.get('/api/exports/conversions.csv')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    assert 'attachment; filename=conversions.csv' in response.headers['Content-Disposition']
+    assert response.get_data(as_text=True).splitlines()[0].startswith('id,contact_id,campaign_id')
+
+    response = authenticated_client.get('/api/exports/contacts.csv')
+    assert response.status_code == 400
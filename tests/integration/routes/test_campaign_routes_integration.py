@@ -4,7 +4,7 @@ Tests the full request/response cycle with real database
 """
 import pytest
 from flask import url_for
-from crm_database import Campaign, CampaignMembership, Contact, CampaignList, CSVImport
+from crm_database import Campaign, CampaignMembership, Contact, CampaignList, CampaignListMember, CSVImport
 from unittest.mock import patch, Mock
 
 
@@ -225,6 +225,27 @@ class TestCampaignRoutesIntegration:
         assert data['success'] is True
         assert 'analytics' in data
     
+    def test_api_preview_audience(self, authenticated_client, db_session):
+        """Test the audience preview counts contacts matching the filters"""
+        named = Contact(first_name='Preview', last_name='Named', phone='+15550106001', email='preview@example.com')
+        phone_named = Contact(first_name='+15550106002', last_name='', phone='+15550106002', email='phone@example.com')
+        db_session.add_all([named, phone_named])
+        db_session.commit()
+        filters = {'has_name_only': True, 'has_email': True}
+        expected = Contact.query.filter(
+            Contact.email.isnot(None), Contact.email != '',
+            ~Contact.first_name.startswith('+1')
+        ).count()
+        
+        response = authenticated_client.post('/api/campaigns/preview-audience', json=filters)
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['success'] is True
+        assert data['audience_size'] == expected
+        assert len(data['sample_contacts']) <= 5
+        assert phone_named.id not in [contact['id'] for contact in data['sample_contacts']]
+    
     def test_campaign_lists_page(self, authenticated_client, db_session):
         """Test campaign lists management page"""
         # Create test lists
@@ -245,6 +266,35 @@ class TestCampaignRoutesIntegration:
         assert b'Static List' in response.data
         assert b'Dynamic List' in response.data
     
+    def test_campaign_lists_page_queries_do_not_grow_with_lists(self, app, authenticated_client, db_session,
+                                                                query_budget):
+        """Test the lists page counts members of all lists with one query"""
+        def page_query_count():
+            # Start cold so both requests compute the statistics
+            app.services.get('cache').clear()
+            with query_budget(100) as stats:
+                response = authenticated_client.get('/campaigns/lists')
+            assert response.status_code == 200
+            return stats.count
+        
+        baseline = page_query_count()
+        
+        contacts = [Contact(first_name=f'Stat{index}', last_name='Test', phone=f'+1555030{index:04d}',
+                            email=f'stat{index}@example.com') for index in range(5)]
+        lists = [CampaignList(name=f'Stats List {index}', is_dynamic=False) for index in range(10)]
+        db_session.add_all(contacts + lists)
+        db_session.flush()
+        db_session.add_all([
+            CampaignListMember(list_id=campaign_list.id, contact_id=contact.id)
+            for campaign_list in lists for contact in contacts
+        ])
+        db_session.commit()
+        
+        assert page_query_count() == baseline
+        stats = app.services.get('campaign_list').get_list_stats(lists[0].id).data
+        assert stats['active_members'] == 5
+        assert stats['with_email'] == 5
+    
     def test_create_campaign_list(self, authenticated_client, db_session):
         """Test creating a new campaign list"""
         import time
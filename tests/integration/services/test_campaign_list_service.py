@@ -131,8 +131,9 @@ class TestListCreation:
             status='active'
         ).all()
         
-        # Only c1 and c4 match (have email and imported within 7 days)
-        assert len(members) == 2
+        # Criteria are combined: only c4 has email and was imported within 7 days
+        # (c1 is too old, c2 has no email)
+        assert [member.contact_id for member in members] == [test_contacts[3].id]
 
 
 class TestContactManagement:
@@ -134,16 +134,7 @@ class TestCampaignServiceRefactored:
         # Arrange
         campaign_id = 1
         list_id = 2
-        mock_contacts = [
-            Mock(id=1, phone="+11234567890"),
-            Mock(id=2, phone="+10987654321"),
-            Mock(id=3, phone=None)  # Contact without phone
-        ]
-        
-        from services.common.result import Result
-        mock_list_service.get_list_contacts.return_value = Result.success(mock_contacts)
-        mock_campaign_repo.find_membership = Mock(return_value=None)  # No existing membership
-        mock_campaign_repo.add_members_bulk = Mock(return_value=2)  # Returns count of added
+        mock_campaign_repo.enroll_from_list = Mock(return_value=2)  # Returns count of inserted
         mock_campaign_repo.get_by_id = Mock(return_value=Mock())  # Mock campaign exists
         
         # Act
@@ -151,9 +142,9 @@ class TestCampaignServiceRefactored:
         
         # Assert
         assert result.is_success
-        assert result.data == 2  # Only contacts with phones
-        mock_campaign_repo.add_members_bulk.assert_called_once()
-        mock_list_service.get_list_contacts.assert_called_once_with(list_id)
+        assert result.data == 2
+        mock_campaign_repo.enroll_from_list.assert_called_once_with(campaign_id, list_id, None)
+        mock_list_service.get_list_contacts.assert_not_called()
     
     def test_add_recipients_with_filters(self, campaign_service, mock_campaign_repo, 
                                         mock_contact_repo):
@@ -161,23 +152,18 @@ class TestCampaignServiceRefactored:
         # Arrange
         campaign_id = 1
         filters = {"tags": ["hot_lead"], "city": "Boston"}
+        audience = Mock(name='audience_query')
         
-        mock_contacts = [
-            Mock(id=1, phone="+11234567890"),
-            Mock(id=2, phone="+10987654321")
-        ]
+        mock_contact_repo.build_audience_query = Mock(return_value=audience)
+        mock_campaign_repo.enroll_contacts = Mock(return_value=2)
         
-        # Mock the _get_filtered_contacts method to return our mock contacts
-        with patch.object(campaign_service, '_get_filtered_contacts', return_value=mock_contacts):
-            mock_campaign_repo.find_membership = Mock(return_value=None)
-            mock_campaign_repo.add_members_bulk = Mock(return_value=2)
-            
-            # Act
-            count = campaign_service.add_recipients(campaign_id, filters)
-            
-            # Assert
-            assert count == 2
-            mock_campaign_repo.add_members_bulk.assert_called_once()
+        # Act
+        count = campaign_service.add_recipients(campaign_id, filters)
+        
+        # Assert
+        assert count == 2
+        mock_contact_repo.build_audience_query.assert_called_once_with(filters)
+        mock_campaign_repo.enroll_contacts.assert_called_once_with(campaign_id, audience, None)
     
     def test_activate_campaign(self, campaign_service, mock_campaign_repo):
         """Test activating a campaign"""
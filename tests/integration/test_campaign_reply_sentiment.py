@@ -0,0 +1,78 @@
+"""
+Integration tests for recording campaign reply sentiment
+Classification runs asynchronously, so results can arrive out of order; the
+latest reply on a membership must always win
+"""
+
+import pytest
+
+from crm_database import Activity, Campaign, CampaignMembership, Contact
+from repositories.campaign_membership_repository import CampaignMembershipRepository
+from services.sentiment_analysis_service import CampaignReplySentimentModel, KeywordSentimentModel
+
+
+class TestRecordReplySentiment:
+    """Conditional sentiment write-back against a real database"""
+
+    @pytest.fixture
+    def membership(self, db_session):
+        contact = Contact(first_name='Reply', last_name='Ordering', phone='+15559870001')
+        campaign = Campaign(name='Reply Ordering', campaign_type='blast', template_a='Hi', status='running')
+        db_session.add_all([contact, campaign])
+        db_session.flush()
+        membership = CampaignMembership(contact_id=contact.id, campaign_id=campaign.id, status='sent')
+        db_session.add(membership)
+        db_session.commit()
+        return membership
+
+    def _reply(self, db_session, membership, body):
+        activity = Activity(contact_id=membership.contact_id, activity_type='message',
+                            direction='incoming', body=body)
+        db_session.add(activity)
+        db_session.commit()
+        return activity
+
+    def test_late_result_for_older_reply_is_ignored(self, db_session, membership):
+        repository = CampaignMembershipRepository(session=db_session)
+        first = self._reply(db_session, membership, 'Not interested')
+        second = self._reply(db_session, membership, 'Actually yes, call me')
+        repository.mark_as_replied(membership.id, first.id)
+        repository.mark_as_replied(membership.id, second.id)
+
+        # The task for the second reply finishes first
+        assert repository.record_reply_sentiment(membership.id, second.id, 'positive') is True
+        assert repository.record_reply_sentiment(membership.id, first.id, 'negative') is False
+
+        db_session.expire_all()
+        stored = db_session.get(CampaignMembership, membership.id)
+        assert stored.reply_activity_id == second.id
+        assert stored.response_sentiment == 'positive'
+        assert stored.status == 'replied_positive'
+
+    def test_result_for_latest_reply_sets_status(self, db_session, membership):
+        repository = CampaignMembershipRepository(session=db_session)
+        reply = self._reply(db_session, membership, 'Stop')
+        repository.mark_as_replied(membership.id, reply.id)
+
+        assert repository.record_reply_sentiment(membership.id, reply.id, 'negative') is True
+
+        db_session.expire_all()
+        assert db_session.get(CampaignMembership, membership.id).status == 'replied_negative'
+
+
+class TestCampaignReplySentimentModel:
+    """The webhook keeps its own keyword rules, separate from the general model"""
+
+    @pytest.mark.parametrize('text, expected', [
+        ('maybe later', 'negative'),
+        ('too expensive', 'negative'),
+        ('we already have someone', 'negative'),
+        ('call me', 'positive'),
+        ('sounds good', 'positive'),
+        ('ok', 'neutral'),
+    ])
+    def test_webhook_rules(self, text, expected):
+        assert CampaignReplySentimentModel().classify(text)['sentiment'] == expected
+
+    def test_has_its_own_cache_version(self):
+        assert CampaignReplySentimentModel.version != KeywordSentimentModel.version
@@ -64,16 +64,17 @@ class TestDuplicateDetectionStatisticsIntegration:
             'campaign_list_member': CampaignListMemberRepository(session=db_session)
         }
     
-    @pytest.fixture
-    def import_service(self, repositories, db_session):
-        """Create import service with real repositories"""
+    @pytest.fixture(params=[False, True], ids=['row_by_row', 'set_based'])
+    def import_service(self, request, repositories, db_session):
+        """Create import service with real repositories, in both batch modes"""
         return PropertyRadarImportService(
             property_repository=repositories['property'],
             contact_repository=repositories['contact'],
             csv_import_repository=repositories['csv_import'],
             campaign_list_repository=repositories['campaign_list'],
             campaign_list_member_repository=repositories['campaign_list_member'],
-            session=db_session
+            session=db_session,
+            set_based_batches=request.param
         )
     
     @pytest.fixture
@@ -0,0 +1,239 @@
+"""
+Integration tests for streaming analytics exports
+Verifies chunked CSV/NDJSON output and resumable export jobs against real queries
+"""
+
+import csv
+import io
+import json
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from services.export_service import ExportService
+from repositories.roi_repository import ROIRepository
+from repositories.conversion_repository import ConversionRepository
+from repositories.campaign_response_repository import CampaignResponseRepository
+from repositories.export_job_repository import ExportJobRepository
+from crm_database import Campaign, ConversionEvent, CampaignCost
+from utils.datetime_utils import utc_now
+from tests.conftest import create_test_contact
+
+
+class TestExportIntegration:
+    """Integration tests for ExportService with real repositories"""
+
+    @pytest.fixture
+    def export_job_repository(self, db_session):
+        return ExportJobRepository(session=db_session)
+
+    @pytest.fixture
+    def export_service(self, db_session, export_job_repository, tmp_path):
+        """Small batches so every export spans several cursor batches"""
+        return ExportService(
+            roi_repository=ROIRepository(session=db_session),
+            conversion_repository=ConversionRepository(session=db_session),
+            campaign_response_repository=CampaignResponseRepository(session=db_session),
+            export_job_repository=export_job_repository,
+            export_dir=str(tmp_path),
+            batch_size=2
+        )
+
+    @pytest.fixture
+    def conversions(self, db_session):
+        """Five conversions, the last one on another campaign a week earlier"""
+        contact = create_test_contact(phone='+15550002222', first_name='Export')
+        campaign = Campaign(name='Export Campaign', campaign_type='blast', template_a='Hi')
+        other_campaign = Campaign(name='Other Campaign', campaign_type='blast', template_a='Hi')
+        db_session.add_all([contact, campaign, other_campaign])
+        db_session.commit()
+
+        now = utc_now()
+        events = [
+            ConversionEvent(
+                contact_id=contact.id,
+                campaign_id=campaign.id,
+                conversion_type='purchase',
+                conversion_value=Decimal('100.50') * (i + 1),
+                converted_at=now - timedelta(hours=i)
+            )
+            for i in range(4)
+        ]
+        events.append(ConversionEvent(
+            contact_id=contact.id,
+            campaign_id=other_campaign.id,
+            conversion_type='appointment_booked',
+            conversion_value=Decimal('25.00'),
+            converted_at=now - timedelta(days=7)
+        ))
+        db_session.add_all(events)
+        db_session.commit()
+        return {'campaign': campaign, 'events': events}
+
+    def test_stream_csv_has_header_and_every_row(self, export_service, conversions):
+        result = export_service.stream_export('conversions', 'csv')
+
+        assert result.is_success
+        chunks = list(result.data)
+        rows = list(csv.DictReader(io.StringIO(''.join(chunks))))
+
+        # Header plus one chunk per two-row batch
+        assert len(chunks) == 4
+        assert [int(row['id']) for row in rows] == [event.id for event in conversions['events']]
+        assert rows[0]['conversion_value'] == '100.50'
+
+    def test_stream_ndjson_applies_filters(self, export_service, conversions):
+        campaign_id = conversions['campaign'].id
+        start = (utc_now() - timedelta(days=1)).date().isoformat()
+
+        result = export_service.stream_export(
+            'conversions', 'ndjson', {'campaign_id': str(campaign_id), 'start_date': start}
+        )
+
+        records = [json.loads(line) for line in ''.join(result.data).splitlines()]
+        assert len(records) == 4
+        assert all(record['campaign_id'] == campaign_id for record in records)
+        assert records[0]['conversion_value'] == 100.5
+
+    def test_stream_date_only_dataset(self, export_service, db_session, conversions):
+        """Date columns are compared against the parsed date range"""
+        today = utc_now().date()
+        db_session.add_all([
+            CampaignCost(campaign_id=conversions['campaign'].id, cost_type='sms',
+                         amount=Decimal('12.00'), cost_date=today),
+            CampaignCost(campaign_id=conversions['campaign'].id, cost_type='labor',
+                         amount=Decimal('40.00'), cost_date=today - timedelta(days=30))
+        ])
+        db_session.commit()
+
+        result = export_service.stream_export(
+            'campaign_costs', 'csv', {'start_date': today.isoformat(), 'end_date': today.isoformat()}
+        )
+
+        rows = list(csv.DictReader(io.StringIO(''.join(result.data))))
+        assert [row['cost_type'] for row in rows] == ['sms']
+
+    def test_invalid_requests_fail_before_streaming(self, export_service):
+        assert export_service.stream_export('contacts', 'csv').error_code == 'INVALID_DATASET'
+        assert export_service.stream_export('conversions', 'xlsx').error_code == 'INVALID_FORMAT'
+        assert export_service.stream_export(
+            'conversions', 'csv', {'start_date': 'yesterday'}
+        ).error_code == 'INVALID_FILTERS'
+
+    def test_export_job_writes_file_with_checkpoints(self, export_service, export_job_repository, conversions):
+        created = export_service.create_export_job('conversions', 'csv')
+        assert created.is_success
+        assert created.data['status'] == 'pending'
+
+        with patch.object(ExportService, 'PAGES_PER_CHECKPOINT', 1), \
+                patch.object(export_job_repository, 'record_progress',
+                             wraps=export_job_repository.record_progress) as record_progress:
+            result = export_service.run_export_job(created.data['id'])
+
+        assert result.is_success
+        job = result.data
+        assert job['status'] == 'completed'
+        assert job['total_rows'] == 5
+        assert job['rows_exported'] == 5
+        assert job['progress_percent'] == 100.0
+        # Pages of 2, 2 and 1 rows
+        assert record_progress.call_count == 3
+
+        download = export_service.get_export_file(job['id'])
+        file_path, mimetype = download.data
+        assert mimetype == 'text/csv'
+        with open(file_path, encoding='utf-8') as handle:
+            rows = list(csv.DictReader(handle))
+        assert len(rows) == 5
+        assert job['bytes_written'] == len(open(file_path, 'rb').read())
+
+    def test_resumed_job_truncates_to_checkpoint(self, export_service, export_job_repository,
+                                                 db_session, conversions):
+        """Bytes written after the last checkpoint are discarded on resume"""
+        complete = export_service.create_export_job('conversions', 'ndjson')
+        export_service.run_export_job(complete.data['id'])
+        with open(export_job_repository.get_by_id(complete.data['id']).file_path, 'rb') as handle:
+            expected = handle.read()
+        checkpoint_bytes = len(b''.join(expected.splitlines(keepends=True)[:2]))
+
+        interrupted = export_service.create_export_job('conversions', 'ndjson')
+        job = export_job_repository.get_by_id(interrupted.data['id'])
+        partial_path = f"{export_service.export_dir}/partial.ndjson"
+        with open(partial_path, 'wb') as handle:
+            handle.write(expected[:checkpoint_bytes] + b'{"id": 999, "trunc')
+        job.file_path = partial_path
+        job.status = 'failed'
+        job.total_rows = 5
+        job.rows_exported = 2
+        job.bytes_written = checkpoint_bytes
+        job.last_row_id = conversions['events'][1].id
+        db_session.commit()
+
+        result = export_service.run_export_job(job.id)
+
+        assert result.is_success
+        assert result.data['rows_exported'] == 5
+        assert result.data['error_message'] is None
+        with open(partial_path, 'rb') as handle:
+            assert handle.read() == expected
+
+    def test_failed_job_keeps_checkpoint(self, export_service, export_job_repository, conversions):
+        created = export_service.create_export_job('conversions', 'csv')
+
+        with patch.object(ConversionRepository, 'stream_batches', side_effect=RuntimeError('cursor lost')):
+            result = export_service.run_export_job(created.data['id'])
+
+        assert result.is_failure
+        assert result.error_code == 'EXPORT_JOB_FAILED'
+        job = export_job_repository.get_by_id(created.data['id'])
+        assert job.status == 'failed'
+        assert job.error_message == 'cursor lost'
+        assert job.rows_exported == 0
+
+    def test_download_requires_completed_job(self, export_service, conversions):
+        created = export_service.create_export_job('responses', 'csv')
+
+        result = export_service.get_export_file(created.data['id'])
+
+        assert result.is_failure
+        assert result.error_code == 'EXPORT_NOT_READY'
+
+    def test_running_job_is_not_queued_or_run_twice(self, export_service, export_job_repository,
+                                                    db_session, conversions):
+        """A second worker must not truncate and rewrite a file that is being written"""
+        created = export_service.create_export_job('conversions', 'csv')
+        job = export_job_repository.get_by_id(created.data['id'])
+        job.status = 'running'
+        db_session.commit()
+
+        with patch('tasks.export_tasks.run_export_job.delay') as delay:
+            queued = export_service.queue_export_job(job.id)
+        run = export_service.run_export_job(job.id)
+
+        assert queued.is_failure
+        assert queued.error_code == 'EXPORT_JOB_RUNNING'
+        delay.assert_not_called()
+        assert run.is_failure
+        assert run.error_code == 'EXPORT_JOB_RUNNING'
+        assert export_job_repository.get_by_id(job.id).rows_exported == 0
+
+    def test_abandoned_running_job_can_be_resumed(self, export_service, export_job_repository,
+                                                  db_session, conversions):
+        """A running job without a checkpoint for LEASE_TIMEOUT has lost its worker"""
+        created = export_service.create_export_job('conversions', 'csv')
+        job = export_job_repository.get_by_id(created.data['id'])
+        job.status = 'running'
+        job.updated_at = utc_now() - ExportService.LEASE_TIMEOUT - timedelta(minutes=1)
+        db_session.commit()
+
+        with patch('tasks.export_tasks.run_export_job.delay') as delay:
+            delay.return_value.id = 'task-1'
+            queued = export_service.queue_export_job(job.id)
+        run = export_service.run_export_job(job.id)
+
+        assert queued.is_success
+        delay.assert_called_once_with(job.id)
+        assert run.is_success
+        assert run.data['status'] == 'completed'
+        assert run.data['rows_exported'] == 5
@@ -0,0 +1,107 @@
+"""
+Integration tests for geohash-backed property search
+Results are checked against a brute-force scan with Property.distance_to
+"""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from crm_database import Property
+from repositories.property_repository import PropertyRepository
+from utils.geo import encode_geohash
+
+# Far from any seed data
+CENTER_LAT, CENTER_LNG = 12.5, 45.5
+
+
+@pytest.fixture
+def repository(db_session):
+    return PropertyRepository(session=db_session)
+
+
+@pytest.fixture
+def properties(db_session):
+    rng = random.Random(7)
+    created = [
+        Property(address=f'{index} Spatial Way',
+                 latitude=round(CENTER_LAT + rng.uniform(-0.3, 0.3), 6),
+                 longitude=round(CENTER_LNG + rng.uniform(-0.3, 0.3), 6))
+        for index in range(300)
+    ]
+    created.append(Property(address='No Coordinates Rd'))
+    db_session.add_all(created)
+    db_session.commit()
+    return created
+
+
+def _brute_force(properties, miles):
+    center = SimpleNamespace(latitude=CENTER_LAT, longitude=CENTER_LNG, has_valid_coordinates=lambda: True)
+    distances = [(prop, prop.distance_to(center)) for prop in properties]
+    return sorted(((prop, distance) for prop, distance in distances if distance is not None and distance <= miles),
+                  key=lambda pair: pair[1])
+
+
+class TestGeohashMaintenance:
+    """geohash follows the coordinates"""
+
+    def test_set_on_insert_and_when_coordinates_move(self, db_session, properties):
+        moved = properties[0]
+        assert moved.geohash is not None
+        assert properties[-1].geohash is None
+
+        moved.latitude = 40.0
+        moved.longitude = -70.0
+        db_session.commit()
+
+        assert moved.geohash == encode_geohash(40.0, -70.0)
+
+    def test_bulk_paths_set_geohash(self, db_session, repository):
+        result = repository.bulk_create_properties([
+            {'address': '1 Bulk St', 'latitude': CENTER_LAT, 'longitude': CENTER_LNG}
+        ])
+
+        assert result.is_success
+        created = db_session.query(Property).filter_by(address='1 Bulk St').one()
+        assert created.geohash is not None
+
+
+class TestSpatialSearch:
+    """Radius, bounding-box and nearest-neighbour queries"""
+
+    @pytest.mark.parametrize('miles', [0.5, 3, 15])
+    def test_within_radius_matches_brute_force(self, repository, properties, miles):
+        expected = _brute_force(properties, miles)
+
+        results = repository.find_within_radius(CENTER_LAT, CENTER_LNG, miles)
+
+        assert [prop.id for prop, _ in results] == [prop.id for prop, _ in expected]
+        for (_, distance), (_, expected_distance) in zip(results, expected):
+            assert distance == pytest.approx(expected_distance)
+
+    def test_within_radius_limit(self, repository, properties):
+        results = repository.find_within_radius(CENTER_LAT, CENTER_LNG, 15, limit=5)
+
+        assert [prop.id for prop, _ in results] == [prop.id for prop, _ in _brute_force(properties, 15)[:5]]
+
+    def test_in_bbox(self, repository, properties):
+        bbox = (CENTER_LAT - 0.1, CENTER_LNG - 0.2, CENTER_LAT + 0.05, CENTER_LNG)
+        expected = sorted(
+            prop.id for prop in properties
+            if prop.latitude is not None
+            and bbox[0] <= prop.latitude <= bbox[2] and bbox[1] <= prop.longitude <= bbox[3]
+        )
+
+        assert [prop.id for prop in repository.find_in_bbox(*bbox)] == expected
+
+    @pytest.mark.parametrize('k', [1, 10, 50])
+    def test_nearest(self, repository, properties, k):
+        expected = _brute_force(properties, 1000)[:k]
+
+        results = repository.find_nearest(CENTER_LAT, CENTER_LNG, k=k)
+
+        assert [prop.id for prop, _ in results] == [prop.id for prop, _ in expected]
+
+    def test_nearest_stops_at_max_miles(self, repository, properties):
+        assert repository.find_nearest(CENTER_LAT + 5, CENTER_LNG, k=3, max_miles=10) == []
@@ -0,0 +1,155 @@
+"""
+Integration tests for set-based PropertyRadar batch imports
+Verifies in-batch deduplication, bulk writes and that statistics and data
+match the row-by-row import exactly
+"""
+
+import pytest
+from sqlalchemy import event
+
+from services.propertyradar_import_service import PropertyRadarImportService
+from repositories.property_repository import PropertyRepository
+from repositories.contact_repository import ContactRepository
+from repositories.csv_import_repository import CSVImportRepository
+from crm_database import Property, Contact, PropertyContact, CSVImport, ContactCSVImport
+
+
+HEADER = 'Type,Address,City,ZIP,APN,Est Value,Primary Name,Primary Mobile Phone1,Secondary Name,Secondary Mobile Phone1'
+
+# Repeated APN, repeated address without APN, phones shared across rows,
+# a row without an address and an invalid phone
+MIXED_CSV = '\n'.join([
+    HEADER,
+    'SFR,1 Elm St,Town,11111,APN-1,100000,Ann Lee,555-0001,Ben Lee,555-0002',
+    'SFR,2 Oak St,Town,22222,,200000,Cal Fox,555-0003,,',
+    'SFR,1 Elm St,Town,11111,APN-1,150000,Ben Lee,555-0002,Ann Lee,555-0001',
+    'SFR,2 OAK ST,Town,22222,,250000,Dee Fox,555-0004,Cal Fox,555-0003',
+    'SFR,,Town,33333,,300000,Eve Orr,555-0005,,',
+    'SFR,3 Ash St,Town,BADZIP,APN-3,,Fay Orr,BADPHONE,Ann Lee,555-0001',
+])
+MIXED_ZIPS = ['11111', '22222', '33333', 'BADZIP']
+
+
+class TestSetBasedPropertyRadarImport:
+    """Set-based batches against a real database"""
+
+    @pytest.fixture
+    def make_service(self, db_session):
+        def make(set_based_batches=True):
+            return PropertyRadarImportService(
+                property_repository=PropertyRepository(session=db_session),
+                contact_repository=ContactRepository(session=db_session),
+                csv_import_repository=CSVImportRepository(session=db_session),
+                session=db_session,
+                set_based_batches=set_based_batches
+            )
+        return make
+
+    def _imported(self, db_session):
+        """Properties and contacts written by MIXED_CSV, ignoring seed data"""
+        properties = db_session.query(Property).filter(Property.zip_code.in_(MIXED_ZIPS)).all()
+        contacts = db_session.query(Contact).filter(Contact.phone.like('+1555000%')).all()
+        return properties, contacts
+
+    def _snapshot(self, db_session):
+        """Database state keyed by natural keys so IDs don't matter"""
+        properties, contacts = self._imported(db_session)
+        properties = {p.id: (p.apn, p.address, p.zip_code, p.estimated_value) for p in properties}
+        contacts = {c.id: (c.phone, c.first_name, c.last_name) for c in contacts}
+        links = [
+            (properties[link.property_id], contacts[link.contact_id][0], link.relationship_type, link.is_primary)
+            for link in db_session.query(PropertyContact).filter(
+                PropertyContact.property_id.in_(properties)
+            ).all()
+        ]
+        return sorted(properties.values(), key=repr), sorted(contacts.values()), sorted(links, key=repr)
+
+    def _reset(self, db_session):
+        properties, contacts = self._imported(db_session)
+        property_ids = [p.id for p in properties]
+        contact_ids = [c.id for c in contacts]
+        db_session.query(PropertyContact).filter(
+            PropertyContact.property_id.in_(property_ids)
+        ).delete(synchronize_session=False)
+        db_session.query(ContactCSVImport).filter(
+            ContactCSVImport.contact_id.in_(contact_ids)
+        ).delete(synchronize_session=False)
+        db_session.query(Contact).filter(Contact.id.in_(contact_ids)).delete(synchronize_session=False)
+        db_session.query(Property).filter(Property.id.in_(property_ids)).delete(synchronize_session=False)
+        db_session.commit()
+        db_session.expire_all()
+
+    @pytest.mark.parametrize('duplicate_strategy', ['update', 'skip'])
+    def test_matches_row_by_row_import(self, make_service, db_session, duplicate_strategy):
+        """Same statistics, errors and data as importing every row on its own"""
+        def import_twice(service):
+            results = []
+            for _ in range(2):
+                result = service.import_csv(MIXED_CSV, 'mixed.csv', 'test_user', batch_size=4,
+                                            duplicate_strategy=duplicate_strategy)
+                assert result.is_success
+                stats = dict(result.value)
+                stats.pop('processing_time')
+                results.append(stats)
+            return results, self._snapshot(db_session)
+
+        row_stats, row_state = import_twice(make_service(set_based_batches=False))
+        self._reset(db_session)
+        set_stats, set_state = import_twice(make_service())
+
+        assert set_stats == row_stats
+        assert set_state == row_state
+
+    def test_in_batch_duplicates_are_written_once(self, make_service, db_session):
+        rows = [HEADER] + ['SFR,9 Dup St,Town,12345,APN-DUP,100000,Dup Owner,555-1234,,'] * 10
+
+        result = make_service().import_csv('\n'.join(rows), 'dup.csv', 'test_user', batch_size=4)
+
+        stats = result.value
+        assert stats['properties_created'] == 1
+        assert stats['properties_updated'] == 9
+        assert stats['contacts_created'] == 1
+        assert stats['contacts_updated'] == 9
+        property_obj = db_session.query(Property).filter_by(apn='APN-DUP').one()
+        assert property_obj.estimated_value == 100000
+        assert db_session.query(Contact).filter_by(phone='+15551234').count() == 1
+        link = db_session.query(PropertyContact).filter_by(property_id=property_obj.id).one()
+        assert link.is_primary is True
+        assert len(db_session.query(CSVImport).filter_by(filename='dup.csv').one().contacts) == 1
+
+    def test_new_primary_owner_demotes_previous_primary(self, make_service, db_session):
+        service = make_service()
+        service.import_csv('\n'.join([HEADER, 'SFR,1 Elm St,Town,11111,APN-1,,Ann Lee,555-0001,,']),
+                           'first.csv', 'test_user')
+
+        service.import_csv('\n'.join([HEADER, 'SFR,1 Elm St,Town,11111,APN-1,,Ben Lee,555-0002,,']),
+                           'second.csv', 'test_user')
+
+        property_obj = db_session.query(Property).filter_by(apn='APN-1').one()
+        primaries = {
+            link.contact.phone: link.is_primary
+            for link in db_session.query(PropertyContact).filter_by(property_id=property_obj.id).all()
+        }
+        assert primaries == {'+15550001': False, '+15550002': True}
+
+    def test_query_count_does_not_grow_with_rows(self, make_service, db_session):
+        """Lookups are IN queries per batch rather than per row"""
+        statements = []
+
+        def count_selects(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('SELECT'):
+                statements.append(statement)
+
+        rows = [HEADER] + [
+            f'SFR,{i} Main St,Town,{10000 + i},APN-{i},,Owner {i},555-{i:04d},,'
+            for i in range(60)
+        ]
+        event.listen(db_session.get_bind(), 'before_cursor_execute', count_selects)
+        try:
+            result = make_service().import_csv('\n'.join(rows), 'bulk.csv', 'test_user', batch_size=60)
+        finally:
+            event.remove(db_session.get_bind(), 'before_cursor_execute', count_selects)
+
+        assert result.value['properties_created'] == 60
+        assert result.value['contacts_created'] == 60
+        assert len(statements) < 10
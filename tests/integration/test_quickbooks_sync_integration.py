@@ -0,0 +1,225 @@
+"""
+Integration tests for the paged, incremental QuickBooks sync
+QuickBooksService talks HTTP to a fake QuickBooks Online server; the sync
+writes through the real repositories.
+"""
+
+from datetime import timedelta
+
+import pytest
+
+from crm_database import Contact, Invoice, InvoiceLineItem, Job, Product, QuickBooksAuth, QuickBooksSync, Quote
+from repositories.contact_repository import ContactRepository
+from repositories.invoice_line_item_repository import InvoiceLineItemRepository
+from repositories.invoice_repository import InvoiceRepository
+from repositories.job_repository import JobRepository
+from repositories.product_repository import ProductRepository
+from repositories.property_repository import PropertyRepository
+from repositories.quickbooks_auth_repository import QuickBooksAuthRepository
+from repositories.quickbooks_sync_repository import QuickBooksSyncRepository
+from repositories.quote_line_item_repository import QuoteLineItemRepository
+from repositories.quote_repository import QuoteRepository
+from services.quickbooks_service import QuickBooksService
+from services.quickbooks_sync_service import QuickBooksSyncService
+from tests.fixtures.fake_quickbooks_server import FakeQuickBooksServer
+from utils.datetime_utils import utc_now
+
+PAGE_SIZE = 2
+
+
+@pytest.fixture
+def fake_qbo(monkeypatch):
+    server = FakeQuickBooksServer().start()
+    monkeypatch.setenv('QUICKBOOKS_API_BASE_URL', server.url)
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def sync_service(db_session, fake_qbo):
+    qb_service = QuickBooksService(auth_repository=QuickBooksAuthRepository(session=db_session))
+    db_session.query(QuickBooksAuth).delete()
+    db_session.add(QuickBooksAuth(
+        company_id='realm-1',
+        access_token=qb_service.cipher.encrypt(b'access').decode(),
+        refresh_token=qb_service.cipher.encrypt(b'refresh').decode(),
+        expires_at=utc_now().replace(tzinfo=None) + timedelta(hours=1)
+    ))
+    db_session.commit()
+
+    return QuickBooksSyncService(
+        contact_repository=ContactRepository(session=db_session),
+        product_repository=ProductRepository(session=db_session),
+        quote_repository=QuoteRepository(session=db_session),
+        invoice_repository=InvoiceRepository(session=db_session),
+        job_repository=JobRepository(session=db_session),
+        property_repository=PropertyRepository(session=db_session),
+        quickbooks_sync_repository=QuickBooksSyncRepository(session=db_session),
+        quote_line_item_repository=QuoteLineItemRepository(session=db_session),
+        invoice_line_item_repository=InvoiceLineItemRepository(session=db_session),
+        quickbooks_service=qb_service,
+        page_size=PAGE_SIZE
+    )
+
+
+@pytest.fixture
+def company(fake_qbo):
+    """Five customers, two items, an estimate and an invoice built from it"""
+    for index in range(1, 6):
+        fake_qbo.add('Customer', {
+            'Id': str(index),
+            'GivenName': 'Qbo',
+            'FamilyName': f'Customer{index}',
+            'PrimaryPhone': {'FreeFormNumber': f'(999) 555-01{index:02d}'},
+            'PrimaryEmailAddr': {'Address': f'customer{index}@qbo-sync.test'}
+        })
+    fake_qbo.add('Item', {'Id': '1', 'Name': 'Qbo Gutter Cleaning', 'Type': 'Service', 'UnitPrice': 150})
+    fake_qbo.add('Item', {'Id': '2', 'Name': 'Qbo Downspout', 'Type': 'Inventory', 'UnitPrice': 40, 'QtyOnHand': 12})
+
+    line = {
+        'Id': '1',
+        'DetailType': 'SalesItemLineDetail',
+        'Description': 'Gutter cleaning',
+        'Amount': 150,
+        'SalesItemLineDetail': {'ItemRef': {'value': '1'}, 'Qty': 1, 'UnitPrice': 150}
+    }
+    fake_qbo.add('Estimate', {
+        'Id': '1',
+        'DocNumber': 'E-1',
+        'TotalAmt': 150,
+        'CustomerRef': {'value': '1', 'name': 'Qbo Customer1'},
+        'BillAddr': {'Line1': '1 Sync St', 'City': 'Boston', 'CountrySubDivisionCode': 'MA'},
+        'Line': [line]
+    })
+    fake_qbo.add('Invoice', {
+        'Id': '1',
+        'DocNumber': 'I-1',
+        'TotalAmt': 150,
+        'Balance': 150,
+        'TxnDate': '2026-01-10',
+        'DueDate': '2026-02-10',
+        'CustomerRef': {'value': '99', 'name': 'Qbo Unsynced'},
+        'LinkedTxn': [{'TxnId': '1', 'TxnType': 'Estimate'}],
+        'Line': [line]
+    })
+    return fake_qbo
+
+
+def _sync_records(db_session, entity_type):
+    return db_session.query(QuickBooksSync).filter_by(entity_type=entity_type).count()
+
+
+class TestInitialSync:
+    """A first sync pages through everything and records watermarks"""
+
+    def test_sync_all_pages_and_upserts_every_entity(self, db_session, sync_service, company):
+        results = sync_service.sync_all()
+
+        assert results['customers'] == {'created': 5, 'updated': 0, 'errors': 0}
+        assert results['items'] == {'created': 2, 'updated': 0, 'errors': 0}
+        assert results['estimates'] == {'created': 1, 'updated': 0, 'errors': 0}
+        assert results['invoices'] == {'created': 1, 'updated': 0, 'errors': 0}
+
+        # Five customers at two per page: three requests, the last one short
+        customer_queries = company.queries_for('Customer')
+        assert [query.split(' startposition ')[1] for query in customer_queries] == [
+            '1 maxresults 2', '3 maxresults 2', '5 maxresults 2'
+        ]
+        assert all('where' not in query for query in customer_queries)
+
+        contact = db_session.query(Contact).filter_by(quickbooks_customer_id='3').one()
+        assert (contact.first_name, contact.last_name) == ('Qbo', 'Customer3')
+        assert contact.phone == '+19995550103'
+        assert contact.email == 'customer3@qbo-sync.test'
+
+        product = db_session.query(Product).filter_by(quickbooks_item_id='2').one()
+        assert product.item_type == 'inventory'
+        assert product.quantity_on_hand == 12
+
+        quote = db_session.query(Quote).filter_by(quickbooks_estimate_id='1').one()
+        customer = db_session.query(Contact).filter_by(quickbooks_customer_id='1').one()
+        job = db_session.get(Job, quote.job_id)
+        assert [c.id for c in job.property.contacts] == [customer.id]
+        assert [item.product_id for item in quote.line_items] == [
+            db_session.query(Product).filter_by(quickbooks_item_id='1').one().id
+        ]
+
+        invoice = db_session.query(Invoice).filter_by(quickbooks_invoice_id='1').one()
+        assert invoice.quote_id == quote.id
+        assert invoice.payment_status in ('unpaid', 'overdue')
+        assert db_session.query(InvoiceLineItem).filter_by(invoice_id=invoice.id).count() == 1
+
+        # Unsynced customer on the invoice gets a placeholder the customer sync can claim later
+        placeholder = db_session.query(Contact).filter_by(quickbooks_customer_id='99').one()
+        assert placeholder.first_name == 'Qbo Unsynced'
+
+        assert _sync_records(db_session, 'customer') == 5
+        assert _sync_records(db_session, 'invoice') == 1
+
+        repository = sync_service.quickbooks_sync_repository
+        for entity_type, entity in QuickBooksSyncService.ENTITY_TYPES.items():
+            newest = max(record['MetaData']['LastUpdatedTime'] for record in company.records[entity].values())
+            assert repository.get_watermark(entity_type).isoformat() == newest
+
+    def test_matches_existing_contacts_by_phone(self, db_session, sync_service, company):
+        existing = Contact(first_name='Local', last_name='Only', phone='+19995550102')
+        db_session.add(existing)
+        db_session.commit()
+
+        results = sync_service.sync_customers()
+
+        assert results == {'created': 4, 'updated': 1, 'errors': 0}
+        db_session.refresh(existing)
+        assert existing.quickbooks_customer_id == '2'
+        assert existing.last_name == 'Customer2'
+
+
+class TestIncrementalSync:
+    """Later syncs only request records changed since the watermark"""
+
+    def test_second_sync_fetches_only_changes(self, db_session, sync_service, company):
+        sync_service.sync_all()
+        watermark = sync_service.quickbooks_sync_repository.get_watermark('customer')
+        company.queries.clear()
+
+        company.add('Customer', {
+            **company.records['Customer']['2'],
+            'FamilyName': 'Renamed',
+            'Mobile': {'FreeFormNumber': '(999) 555-0199'}
+        })
+        company.add('Customer', {'Id': '6', 'DisplayName': 'Qbo Newcomer'})
+
+        results = sync_service.sync_customers()
+
+        queries = company.queries_for('Customer')
+        assert len(queries) == 2
+        assert all(f"where MetaData.LastUpdatedTime >= '{watermark.isoformat()}'" in query for query in queries)
+        # The newest record from the last run is re-read because the bound is inclusive
+        assert results == {'created': 1, 'updated': 2, 'errors': 0}
+
+        renamed = db_session.query(Contact).filter_by(quickbooks_customer_id='2').one()
+        db_session.refresh(renamed)
+        assert renamed.last_name == 'Renamed'
+        assert renamed.phone == '+19995550199'
+        assert db_session.query(Contact).filter_by(quickbooks_customer_id='6').one().first_name == 'Qbo'
+        assert sync_service.quickbooks_sync_repository.get_watermark('customer') > watermark
+
+    def test_nothing_changed_keeps_watermark(self, sync_service, company):
+        sync_service.sync_all()
+        watermark = sync_service.quickbooks_sync_repository.get_watermark('item')
+        company.queries.clear()
+
+        results = sync_service.sync_items()
+
+        assert results['created'] == 0
+        assert len(company.queries_for('Item')) == 1
+        assert sync_service.quickbooks_sync_repository.get_watermark('item') == watermark
+
+    def test_full_sync_ignores_watermark(self, sync_service, company):
+        sync_service.sync_customers()
+        company.queries.clear()
+
+        results = sync_service.sync_customers(full=True)
+
+        assert results == {'created': 0, 'updated': 5, 'errors': 0}
+        assert all('where' not in query for query in company.queries_for('Customer'))
@@ -438,3 +438,52 @@ class TestROICalculationIntegration:
         assert optimization_result.data['total_potential_improvement'] > 0
         assert len(strategy_result.data['strategies']) > 0
     
+
+    def test_portfolio_forecast_with_real_queries(
+        self,
+        roi_service,
+        roi_repository,
+        db_session,
+        sample_campaign
+    ):
+        """Portfolio forecast and scenario baselines run against the real schema"""
+        # Arrange
+        for offset in range(1, 15):
+            cost_result = roi_service.record_campaign_cost({
+                'campaign_id': sample_campaign.id,
+                'cost_type': 'sms',
+                'amount': Decimal('25.00'),
+                'cost_date': utc_now() - timedelta(days=offset)
+            })
+            assert cost_result.is_success
+
+        # Act
+        rows = roi_repository.get_daily_revenue_cost_matrix(
+            [sample_campaign.id], (utc_now() - timedelta(days=30)).date()
+        )
+        forecast_result = roi_service.generate_portfolio_forecast([sample_campaign.id], forecast_days=7)
+        scenario_result = roi_service.portfolio_what_if_modeling(
+            [sample_campaign.id], {'budget_increase': {'budget_multiplier': 1.5}}
+        )
+
+        # Assert
+        assert len(rows) == 14
+        assert forecast_result.is_success
+        forecast = forecast_result.data['campaigns'][0]
+        assert forecast['predicted_costs'] > Decimal('0.00')
+        assert forecast['predicted_revenue'] == Decimal('0.00')
+        assert scenario_result.is_success
+        baseline = scenario_result.data['campaigns'][sample_campaign.id]['baseline']
+        assert baseline['current_budget'] == Decimal('350.00')
+
+    def test_portfolio_queries_propagate_database_errors(self, roi_repository, db_session):
+        """Query errors reach the service instead of returning empty data"""
+        from unittest.mock import patch
+        from sqlalchemy.exc import OperationalError
+
+        error = OperationalError('SELECT', {}, Exception('connection lost'))
+        with patch.object(db_session, 'execute', side_effect=error):
+            with pytest.raises(OperationalError):
+                roi_repository.get_daily_revenue_cost_matrix([1], (utc_now() - timedelta(days=30)).date())
+            with pytest.raises(OperationalError):
+                roi_repository.get_scenario_baselines([1])
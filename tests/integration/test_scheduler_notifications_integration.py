@@ -0,0 +1,158 @@
+"""
+Integration tests for the batched reminder and review request pipeline
+The scheduler records notifications through the real repositories; send
+tasks are captured instead of going to the broker.
+"""
+
+from datetime import date, datetime, time, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+
+from crm_database import Appointment, Contact, Job, Property, PropertyContact, ScheduledNotification, Setting
+from repositories.appointment_repository import AppointmentRepository
+from repositories.job_repository import JobRepository
+from repositories.quote_repository import QuoteRepository
+from repositories.scheduled_notification_repository import ScheduledNotificationRepository
+from repositories.setting_repository import SettingRepository
+from services.scheduler_service import SchedulerService
+from utils.datetime_utils import utc_now
+
+APPOINTMENTS = 5
+
+
+@pytest.fixture
+def openphone():
+    service = Mock()
+    service.send_message.return_value = {'success': True}
+    return service
+
+
+@pytest.fixture
+def scheduler(db_session, openphone):
+    for key, value in (('appointment_reminder_template', 'Hi {first_name}, see you {appointment_date} at {appointment_time}'),
+                       ('review_request_template', 'Thanks {first_name}, please review us!')):
+        setting = db_session.query(Setting).filter_by(key=key).first() or Setting(key=key)
+        setting.value = value
+        db_session.add(setting)
+    db_session.commit()
+
+    return SchedulerService(
+        setting_repository=SettingRepository(session=db_session),
+        job_repository=JobRepository(session=db_session),
+        quote_repository=QuoteRepository(session=db_session),
+        appointment_repository=AppointmentRepository(session=db_session),
+        scheduled_notification_repository=ScheduledNotificationRepository(session=db_session),
+        openphone_service=openphone,
+        invoice_service=Mock()
+    )
+
+
+@pytest.fixture
+def enqueued():
+    with patch('services.scheduler_service.send_scheduled_notification') as task:
+        yield task.delay
+
+
+@pytest.fixture
+def tomorrows_appointments(db_session):
+    tomorrow = date.today() + timedelta(days=1)
+    # Only this test's appointments are on the calendar tomorrow
+    db_session.query(Appointment).filter_by(date=tomorrow).delete()
+    appointments = []
+    for index in range(APPOINTMENTS):
+        contact = Contact(first_name=f'Remind{index}', last_name='Me', phone=f'+1555010{index:04d}')
+        appointments.append(Appointment(title='Inspection', date=tomorrow, time=time(9 + index, 30), contact=contact))
+    appointments.append(Appointment(
+        title='No phone', date=tomorrow, time=time(17, 0), contact=Contact(first_name='Nophone', last_name='Me')
+    ))
+    db_session.add_all(appointments)
+    db_session.commit()
+    return appointments
+
+
+def _notifications(db_session, kind):
+    return db_session.query(ScheduledNotification).filter_by(kind=kind).order_by(ScheduledNotification.id).all()
+
+
+class TestAppointmentReminders:
+    """Reminders are recorded once per appointment and day and sent by per-target tasks"""
+
+    def test_loads_renders_and_enqueues_in_constant_queries(self, db_session, scheduler, enqueued,
+                                                           tomorrows_appointments, query_budget):
+        with query_budget(8):
+            result = scheduler.send_appointment_reminders()
+
+        assert result == {'queued': APPOINTMENTS, 'skipped': 1}
+        notifications = _notifications(db_session, 'appointment_reminder')
+        assert len(notifications) == APPOINTMENTS
+        tomorrow = date.today() + timedelta(days=1)
+        assert notifications[0].message == f"Hi Remind0, see you {tomorrow.strftime('%B %d, %Y')} at 09:30 am"
+        assert {notification.status for notification in notifications} == {'pending'}
+        assert [call.args[0] for call in enqueued.call_args_list] == [n.id for n in notifications]
+
+    def test_rerun_never_sends_twice(self, db_session, scheduler, enqueued, openphone, tomorrows_appointments):
+        scheduler.send_appointment_reminders()
+        first_ids = [call.args[0] for call in enqueued.call_args_list]
+        for notification_id in first_ids[:2]:
+            assert scheduler.send_notification(notification_id).data['status'] == 'sent'
+        enqueued.reset_mock()
+
+        # A second run records nothing new and only re-enqueues what never went out
+        result = scheduler.send_appointment_reminders()
+
+        assert result['queued'] == APPOINTMENTS - 2
+        assert len(_notifications(db_session, 'appointment_reminder')) == APPOINTMENTS
+        assert [call.args[0] for call in enqueued.call_args_list] == first_ids[2:]
+
+        # Duplicate tasks for an already sent notification do nothing
+        assert scheduler.send_notification(first_ids[0]).data['status'] == 'skipped'
+        assert openphone.send_message.call_count == 2
+
+    def test_failed_send_can_be_retried(self, db_session, scheduler, enqueued, openphone, tomorrows_appointments):
+        scheduler.send_appointment_reminders()
+        notification_id = enqueued.call_args_list[0].args[0]
+        openphone.send_message.return_value = {'success': False, 'error': 'Carrier rejected'}
+
+        assert scheduler.send_notification(notification_id).error_code == 'SEND_FAILED'
+        notification = db_session.get(ScheduledNotification, notification_id)
+        db_session.refresh(notification)
+        assert (notification.status, notification.attempts) == ('failed', 1)
+        assert notification.error_message == 'Carrier rejected'
+
+        openphone.send_message.return_value = {'success': True}
+        assert scheduler.send_notification(notification_id).data['status'] == 'sent'
+        db_session.refresh(notification)
+        assert (notification.status, notification.attempts) == ('sent', 2)
+        assert notification.sent_at is not None
+
+
+class TestReviewRequests:
+    """Review requests go to each completed job's primary property contact"""
+
+    def test_uses_primary_contact_and_skips_jobs_without_contacts(self, db_session, scheduler, enqueued):
+        yesterday = utc_now().date() - timedelta(days=1)
+        completed_at = datetime.combine(yesterday, time(15, 0))
+        db_session.query(Job).filter(Job.status == 'Completed').update({'status': 'Archived'})
+
+        tenant = Contact(first_name='Tenant', last_name='Review', phone='+15550200001')
+        owner = Contact(first_name='Owner', last_name='Review', phone='+15550200002')
+        occupied = Property(address='1 Review Way')
+        vacant = Property(address='2 Review Way')
+        db_session.add_all([tenant, owner, occupied, vacant])
+        db_session.flush()
+        db_session.add_all([
+            PropertyContact(property_id=occupied.id, contact_id=tenant.id, is_primary=False),
+            PropertyContact(property_id=occupied.id, contact_id=owner.id, is_primary=True),
+            Job(description='Gutters', status='Completed', completed_at=completed_at, property_id=occupied.id),
+            Job(description='Windows', status='Completed', completed_at=completed_at, property_id=vacant.id)
+        ])
+        db_session.commit()
+
+        result = scheduler.send_review_requests()
+
+        assert result == {'queued': 1, 'skipped': 1}
+        [notification] = _notifications(db_session, 'review_request')
+        assert notification.contact_id == owner.id
+        assert notification.message == 'Thanks Owner, please review us!'
+        assert notification.scheduled_for == yesterday
@@ -261,4 +261,42 @@ class TestActivityRepositoryDashboardEnhancements:
         result = repository.get_distinct_contacts_with_recent_activity(days=7)
         
         # Assert - Only contact1 and contact2 should be counted (distinct)
-        assert result == 2
\ No newline at end of file
+        assert result == 2    
+    def test_get_daily_message_stats_buckets_by_day_in_one_query(self, repository, db_session):
+        """Sent and bounced messages are counted per day with a single grouped query"""
+        from sqlalchemy import event
+        
+        contact = create_test_contact(phone='+11234567891')
+        db_session.add(contact)
+        db_session.commit()
+        
+        now = utc_now()
+        rows = [
+            ('message', 'outgoing', 'delivered', now),
+            ('message', 'outgoing', 'failed', now),
+            ('message', 'incoming', 'undelivered', now),
+            ('message', 'outgoing', 'sent', now - timedelta(days=2)),
+            ('call', 'outgoing', 'failed', now),
+            ('message', 'outgoing', 'sent', now - timedelta(days=10)),
+        ]
+        for activity_type, direction, status, created_at in rows:
+            db_session.add(Activity(contact_id=contact.id, activity_type=activity_type,
+                                    direction=direction, status=status, created_at=created_at))
+        db_session.commit()
+        
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(db_session.get_bind(), 'before_cursor_execute', record)
+        try:
+            stats = repository.get_daily_message_stats(days=7)
+        finally:
+            event.remove(db_session.get_bind(), 'before_cursor_execute', record)
+        
+        assert len(statements) == 1
+        assert [day['date'] for day in stats] == [now.date() - timedelta(days=6 - i) for i in range(7)]
+        assert (stats[-1]['sent'], stats[-1]['bounced'], stats[-1]['bounce_rate']) == (2, 2, 100.0)
+        assert (stats[-3]['sent'], stats[-3]['bounced']) == (1, 0)
+        assert sum(day['sent'] for day in stats) == 3
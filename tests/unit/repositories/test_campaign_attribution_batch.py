@@ -0,0 +1,160 @@
+"""
+Tests for batched multi-touch attribution in ConversionRepository
+Touchpoints of all conversions are read with one windowed query and weighted with array operations
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from crm_database import Activity, Campaign, CampaignAttribution, Contact, ConversionEvent
+from repositories.campaign_attribution_repository import CampaignAttributionRepository
+from repositories.conversion_repository import ConversionRepository, attribution_weights
+from utils.datetime_utils import utc_now
+
+
+class TestAttributionWeights:
+    """Test the vectorized weights against the per-contact models"""
+
+    @pytest.mark.parametrize('model, expected', [
+        ('first_touch', [1.0, 0.0, 0.0]),
+        ('last_touch', [0.0, 0.0, 1.0]),
+        ('linear', [1 / 3, 1 / 3, 1 / 3]),
+        ('time_decay', [1 / 7, 2 / 7, 4 / 7]),
+    ])
+    def test_weights_of_one_path(self, model, expected):
+        weights = attribution_weights(np.array([0, 1, 2]), np.array([3, 3, 3]), model)
+
+        assert weights.tolist() == pytest.approx(expected)
+
+    def test_long_time_decay_path_stays_finite(self):
+        positions = np.arange(2000)
+
+        weights = attribution_weights(positions, np.full(2000, 2000), 'time_decay')
+
+        assert np.isfinite(weights).all()
+        assert weights.sum() == pytest.approx(1.0)
+
+
+class TestCampaignAttributionBatch:
+    """Test calculate_campaign_attribution against the database"""
+
+    @pytest.fixture
+    def repository(self, db_session):
+        return ConversionRepository(session=db_session)
+
+    @pytest.fixture
+    def campaigns(self, db_session):
+        campaigns = [Campaign(name=f'Attribution {index}', campaign_type='blast', status='complete')
+                     for index in range(3)]
+        db_session.add_all(campaigns)
+        db_session.flush()
+        return campaigns
+
+    @pytest.fixture
+    def conversions(self, db_session, campaigns):
+        now = utc_now().replace(tzinfo=None)
+        first, second, third = campaigns
+        contacts = [Contact(first_name=f'Convert{index}', last_name='Attribution', phone=f'+1555046{index:04d}')
+                    for index in range(4)]
+        db_session.add_all(contacts)
+        db_session.flush()
+
+        touches = [
+            # Three campaigns, then a conversion credited to the last one
+            (contacts[0], first, 10), (contacts[0], second, 5), (contacts[0], third, 1),
+            # Only the recorded campaign touched this contact, twice
+            (contacts[1], third, 3), (contacts[1], third, 2),
+            # The first campaign's touch is outside the window
+            (contacts[2], first, 40), (contacts[2], second, 4),
+            # A touch after the conversion does not count
+            (contacts[3], second, -1),
+        ]
+        db_session.add_all([
+            Activity(contact_id=contact.id, campaign_id=campaign.id, activity_type='message',
+                     direction='outgoing', body='Touch', created_at=now - timedelta(days=days))
+            for contact, campaign, days in touches
+        ])
+        conversions = [
+            ConversionEvent(contact_id=contacts[0].id, campaign_id=third.id, conversion_type='purchase',
+                            conversion_value=Decimal('120.00'), converted_at=now),
+            ConversionEvent(contact_id=contacts[1].id, campaign_id=third.id, conversion_type='purchase',
+                            conversion_value=Decimal('60.00'), converted_at=now),
+            ConversionEvent(contact_id=contacts[2].id, campaign_id=first.id, conversion_type='purchase',
+                            conversion_value=Decimal('80.00'), converted_at=now, attribution_window_days=30),
+            ConversionEvent(contact_id=contacts[3].id, campaign_id=second.id, conversion_type='lead_qualified',
+                            conversion_value=None, converted_at=now - timedelta(days=2)),
+        ]
+        db_session.add_all(conversions)
+        db_session.flush()
+        return conversions
+
+    def test_attributes_all_models_for_all_campaigns(self, repository, campaigns, conversions):
+        first, second, third = campaigns
+
+        attribution = repository.calculate_campaign_attribution([c.id for c in campaigns])
+
+        assert set(attribution[third.id]) == set(ConversionRepository.VALID_ATTRIBUTION_MODELS)
+        assert attribution[third.id]['last_touch']['attributed_value'] == Decimal('180.00')
+        assert attribution[third.id]['first_touch']['attributed_value'] == Decimal('60.00')
+        assert attribution[third.id]['linear']['attributed_value'] == Decimal('100.00')
+        assert attribution[third.id]['time_decay']['attributed_value'] == Decimal('128.57')
+        assert attribution[third.id]['linear']['total_conversion_value'] == Decimal('180.00')
+        assert attribution[third.id]['linear']['average_touchpoints'] == pytest.approx(2.0)
+        assert attribution[first.id]['linear']['attributed_value'] == Decimal('0.00')
+        assert attribution[first.id]['linear']['total_conversion_value'] == Decimal('80.00')
+        assert attribution[second.id]['linear']['conversion_count'] == 1
+        assert attribution[second.id]['linear']['total_conversion_value'] == Decimal('0.00')
+
+    def test_matches_single_campaign_attribution(self, repository, campaigns, conversions):
+        third = campaigns[2]
+
+        single = repository.calculate_multi_touch_attribution(third.id, 'time_decay')
+
+        assert single == repository.calculate_campaign_attribution([third.id], ['time_decay'])[third.id]['time_decay']
+        assert single['attribution_percentage'] == pytest.approx(128.57 / 180, abs=1e-4)
+
+    def test_campaign_without_conversions_gets_zeros(self, repository, db_session, conversions):
+        idle = Campaign(name='Attribution Idle', campaign_type='blast', status='draft')
+        db_session.add(idle)
+        db_session.flush()
+
+        attribution = repository.calculate_campaign_attribution([idle.id], ['linear'])
+
+        assert attribution[idle.id]['linear']['conversion_count'] == 0
+        assert attribution[idle.id]['linear']['attributed_value'] == Decimal('0.00')
+
+    def test_one_query_for_any_number_of_conversions(self, repository, campaigns, conversions, query_budget):
+        with query_budget(1) as stats:
+            repository.calculate_campaign_attribution([c.id for c in campaigns])
+
+        assert stats.count == 1
+
+    def test_unknown_model_rejected(self, repository):
+        with pytest.raises(ValueError):
+            repository.calculate_campaign_attribution(attribution_models=['u_shaped'])
+
+    def test_materialized_rows_are_replaced(self, repository, db_session, campaigns, conversions):
+        attribution_repository = CampaignAttributionRepository(session=db_session)
+        third = campaigns[2]
+        rows = [
+            {
+                'campaign_id': campaign_id,
+                'attribution_model': model,
+                'conversion_count': summary['conversion_count'],
+                'total_conversion_value': summary['total_conversion_value'],
+                'attributed_value': summary['attributed_value'],
+                'average_touchpoints': float(summary['average_touchpoints']),
+            }
+            for campaign_id, models in repository.calculate_campaign_attribution([c.id for c in campaigns]).items()
+            for model, summary in models.items()
+        ]
+
+        attribution_repository.replace_all(rows)
+        attribution_repository.replace_all(rows)
+
+        stored = attribution_repository.get_for_campaign(third.id)
+        assert db_session.query(CampaignAttribution).count() == 12
+        assert stored['last_touch'].attributed_value == Decimal('180.00')
@@ -0,0 +1,49 @@
+"""
+Tests for the grouped campaign list statistics query in CampaignListMemberRepository
+"""
+
+import pytest
+
+from crm_database import CampaignList, CampaignListMember, Contact
+from repositories.campaign_list_member_repository import CampaignListMemberRepository
+
+
+class TestCampaignListStats:
+    """Test get_stats_by_list against the database"""
+
+    @pytest.fixture
+    def repository(self, db_session):
+        return CampaignListMemberRepository(session=db_session)
+
+    @pytest.fixture
+    def lists(self, db_session):
+        contacts = [
+            Contact(first_name='Both', last_name='Stats', phone='+15550107001', email='both@example.com'),
+            Contact(first_name='Phone', last_name='Stats', phone='+15550107002', email=''),
+            Contact(first_name='Email', last_name='Stats', email='email@example.com'),
+            Contact(first_name='Gone', last_name='Stats', phone='+15550107004', email='gone@example.com'),
+        ]
+        full = CampaignList(name='Stats Full', is_dynamic=False)
+        empty = CampaignList(name='Stats Empty', is_dynamic=False)
+        db_session.add_all(contacts + [full, empty])
+        db_session.flush()
+        db_session.add_all(
+            [CampaignListMember(list_id=full.id, contact_id=contact.id, status='active') for contact in contacts[:3]]
+            + [CampaignListMember(list_id=full.id, contact_id=contacts[3].id, status='removed')]
+        )
+        db_session.flush()
+        return full, empty
+
+    def test_counts_members_and_contact_fields_per_list(self, repository, lists):
+        full, empty = lists
+
+        stats = repository.get_stats_by_list()
+
+        assert stats[full.id] == {'total': 4, 'active': 3, 'removed': 1, 'with_email': 2, 'with_phone': 2}
+        assert stats[empty.id] == {'total': 0, 'active': 0, 'removed': 0, 'with_email': 0, 'with_phone': 0}
+
+    def test_all_lists_in_one_query(self, repository, lists, query_budget):
+        with query_budget(1):
+            stats = repository.get_stats_by_list()
+
+        assert {campaign_list.id for campaign_list in lists} <= set(stats)
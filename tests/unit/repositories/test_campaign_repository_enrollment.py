@@ -0,0 +1,95 @@
+"""
+Tests for server-side campaign enrollment in CampaignRepository
+Memberships are inserted with one INSERT ... SELECT that skips existing members
+"""
+
+import pytest
+from sqlalchemy import select
+
+from crm_database import Campaign, CampaignList, CampaignListMember, CampaignMembership, Contact
+from repositories.campaign_repository import CampaignRepository
+
+
+class TestCampaignRepositoryEnrollment:
+    """Test enroll_contacts and enroll_from_list against the database"""
+
+    @pytest.fixture
+    def repository(self, db_session):
+        return CampaignRepository(session=db_session)
+
+    @pytest.fixture
+    def campaign(self, db_session):
+        campaign = Campaign(name='Enrollment Test', campaign_type='ab_test', status='draft',
+                            template_a='A {first_name}', template_b='B {first_name}')
+        db_session.add(campaign)
+        db_session.flush()
+        return campaign
+
+    @pytest.fixture
+    def contacts(self, db_session):
+        contacts = [
+            Contact(first_name=f'Enroll{index}', last_name='Test', phone=f'+1555020{index:04d}')
+            for index in range(200)
+        ]
+        db_session.add_all(contacts)
+        db_session.flush()
+        return contacts
+
+    @pytest.fixture
+    def campaign_list(self, db_session, contacts):
+        campaign_list = CampaignList(name='Enrollment List', is_dynamic=False)
+        db_session.add(campaign_list)
+        db_session.flush()
+        db_session.add_all([
+            CampaignListMember(list_id=campaign_list.id, contact_id=contact.id,
+                               status='removed' if index < 10 else 'active')
+            for index, contact in enumerate(contacts)
+        ])
+        db_session.flush()
+        return campaign_list
+
+    def members(self, db_session, campaign):
+        return db_session.query(CampaignMembership).filter_by(campaign_id=campaign.id).all()
+
+    def test_enroll_from_list_inserts_active_members(self, repository, db_session, campaign, contacts, campaign_list):
+        added = repository.enroll_from_list(campaign.id, campaign_list.id)
+
+        members = self.members(db_session, campaign)
+        assert added == 190
+        assert {m.contact_id for m in members} == {c.id for c in contacts[10:]}
+        assert {m.status for m in members} == {'pending'}
+        assert {m.variant_sent for m in members} == {None}
+
+    def test_enroll_from_list_is_idempotent(self, repository, db_session, campaign, contacts, campaign_list):
+        repository.add_members_bulk(campaign.id, [contacts[50].id])
+
+        assert repository.enroll_from_list(campaign.id, campaign_list.id) == 189
+        assert repository.enroll_from_list(campaign.id, campaign_list.id) == 0
+        assert len(self.members(db_session, campaign)) == 190
+
+    def test_enroll_contacts_from_a_select(self, repository, db_session, campaign, contacts):
+        ids = [contact.id for contact in contacts[:5]]
+        source = select(Contact.id).where(Contact.id.in_(ids)).order_by(Contact.id)
+
+        assert repository.enroll_contacts(campaign.id, source) == 5
+        assert sorted(m.contact_id for m in self.members(db_session, campaign)) == ids
+
+    def test_enroll_assigns_variants_by_split(self, repository, db_session, campaign, contacts, campaign_list):
+        repository.enroll_from_list(campaign.id, campaign_list.id, variant_split=30)
+
+        variants = {m.contact_id: m.variant_sent for m in self.members(db_session, campaign)}
+        share_a = sum(1 for variant in variants.values() if variant == 'A') / len(variants)
+        assert set(variants.values()) == {'A', 'B'}
+        assert 0.2 <= share_a <= 0.4
+
+        # The bucket depends only on campaign and contact, not on insert order
+        db_session.query(CampaignMembership).filter_by(campaign_id=campaign.id).delete()
+        repository.enroll_from_list(campaign.id, campaign_list.id, variant_split=30)
+        assert {m.contact_id: m.variant_sent for m in self.members(db_session, campaign)} == variants
+
+    def test_enroll_runs_one_statement(self, repository, campaign, campaign_list, query_budget):
+        with query_budget(1) as stats:
+            added = repository.enroll_from_list(campaign.id, campaign_list.id)
+
+        assert added == 190
+        assert stats.count == 1
@@ -0,0 +1,205 @@
+"""
+Parity tests for the SQL-aggregated response analytics in CampaignResponseRepository
+Each aggregate is checked against the previous row-by-row Python implementation
+"""
+
+import random
+import statistics
+from datetime import datetime, timedelta
+
+import pytest
+
+from crm_database import Campaign, CampaignResponse, Contact
+from repositories.campaign_response_repository import CampaignResponseRepository
+
+
+def reference_analytics(responses):
+    """Row-by-row analytics as computed before the SQL aggregation"""
+    responded = [r for r in responses if r.first_response_at is not None]
+    sentiment_distribution = {}
+    intent_distribution = {}
+    for response in responded:
+        if response.response_sentiment:
+            sentiment_distribution[response.response_sentiment] = \
+                sentiment_distribution.get(response.response_sentiment, 0) + 1
+        if response.response_intent:
+            intent_distribution[response.response_intent] = \
+                intent_distribution.get(response.response_intent, 0) + 1
+    response_times = [r.response_time_seconds for r in responded if r.response_time_seconds]
+    return {
+        'total_sent': len(responses),
+        'total_responses': len(responded),
+        'response_rate': len(responded) / len(responses),
+        'sentiment_distribution': sentiment_distribution,
+        'intent_distribution': intent_distribution,
+        'average_response_time_hours': (statistics.mean(response_times) / 3600.0) if response_times else 0.0,
+    }
+
+
+def reference_variant_metrics(responses):
+    """Row-by-row variant metrics as computed before the SQL aggregation"""
+    if not responses:
+        return {'sent': 0, 'responses': 0, 'response_rate': 0.0,
+                'average_response_time': 0.0, 'sentiment_breakdown': {}}
+    responded = [r for r in responses if r.first_response_at is not None]
+    response_times = [r.response_time_seconds / 3600.0 for r in responded if r.response_time_seconds is not None]
+    sentiment_breakdown = {}
+    for r in responded:
+        if r.response_sentiment:
+            sentiment_breakdown[r.response_sentiment] = sentiment_breakdown.get(r.response_sentiment, 0) + 1
+    return {
+        'sent': len(responses),
+        'responses': len(responded),
+        'response_rate': len(responded) / len(responses),
+        'average_response_time': statistics.mean(response_times) if response_times else 0.0,
+        'sentiment_breakdown': sentiment_breakdown,
+    }
+
+
+def reference_time_patterns(responses):
+    """Row-by-row hourly and daily response rates as computed before the SQL aggregation"""
+    responded = [r for r in responses if r.first_response_at is not None]
+    hourly, daily = {}, {}
+    for response in responded:
+        hour = response.first_response_at.strftime('%H')
+        day = response.first_response_at.strftime('%A').lower()
+        hourly[hour] = hourly.get(hour, 0) + 1
+        daily[day] = daily.get(day, 0) + 1
+    return (
+        {hour: count / len(responded) for hour, count in hourly.items()},
+        {day: count / len(responded) for day, count in daily.items()},
+    )
+
+
+class TestResponseAnalyticsParity:
+    """Compare the aggregate queries with the Python implementations"""
+
+    @pytest.fixture
+    def repository(self, db_session):
+        return CampaignResponseRepository(session=db_session)
+
+    @pytest.fixture
+    def campaign(self, db_session):
+        campaign = Campaign(name='Analytics Parity', campaign_type='ab_test', status='running')
+        db_session.add(campaign)
+        db_session.flush()
+        return campaign
+
+    @pytest.fixture
+    def responses(self, db_session, campaign):
+        rng = random.Random(45)
+        contacts = [
+            Contact(first_name=f'Parity{index}', last_name='Test', phone=f'+1555045{index:04d}')
+            for index in range(120)
+        ]
+        db_session.add_all(contacts)
+        db_session.flush()
+
+        base = datetime(2026, 10, 5, 8, 0)  # a Monday
+        responses = []
+        for index, contact in enumerate(contacts):
+            sent_at = base + timedelta(hours=rng.randint(0, 24 * 14))
+            response = CampaignResponse(
+                campaign_id=campaign.id,
+                contact_id=contact.id,
+                message_variant=rng.choice(['A', 'B', None]),
+                message_sent_at=sent_at,
+            )
+            if index % 3:
+                response.first_response_at = sent_at + timedelta(minutes=rng.randint(1, 3000))
+                response.response_time_seconds = rng.choice(
+                    [None, 0, int((response.first_response_at - sent_at).total_seconds())]
+                )
+                response.response_sentiment = rng.choice(['positive', 'negative', 'neutral', '', None])
+                response.response_intent = rng.choice(['interested', 'question', 'other', '', None])
+            else:
+                # Classification on rows without a response is ignored
+                response.response_sentiment = rng.choice(['positive', None])
+            responses.append(response)
+        db_session.add_all(responses)
+        db_session.flush()
+        return responses
+
+    def test_response_analytics_matches(self, repository, campaign, responses):
+        expected = reference_analytics(responses)
+
+        analytics = repository.get_response_analytics(campaign.id)
+
+        assert analytics.total_sent == expected['total_sent']
+        assert analytics.total_responses == expected['total_responses']
+        assert analytics.response_rate == pytest.approx(expected['response_rate'])
+        assert analytics.sentiment_distribution == expected['sentiment_distribution']
+        assert analytics.intent_distribution == expected['intent_distribution']
+        assert analytics.average_response_time_hours == pytest.approx(expected['average_response_time_hours'])
+        assert analytics.confidence_interval == repository.calculate_confidence_interval(
+            expected['total_responses'], expected['total_sent'], 0.95
+        )
+
+    def test_variant_comparison_matches(self, repository, campaign, responses):
+        expected_a = reference_variant_metrics([r for r in responses if r.message_variant == 'A'])
+        expected_b = reference_variant_metrics([r for r in responses if r.message_variant == 'B'])
+
+        comparison = repository.get_variant_comparison(campaign.id)
+
+        for actual, expected in ((comparison['variant_a'], expected_a), (comparison['variant_b'], expected_b)):
+            assert actual['sent'] == expected['sent']
+            assert actual['responses'] == expected['responses']
+            assert actual['response_rate'] == pytest.approx(expected['response_rate'])
+            assert actual['average_response_time'] == pytest.approx(expected['average_response_time'])
+            assert actual['sentiment_breakdown'] == expected['sentiment_breakdown']
+        assert comparison['statistical_significance'] == repository.calculate_statistical_significance(
+            expected_a['responses'], expected_a['sent'], expected_b['responses'], expected_b['sent']
+        )
+
+    def test_variant_without_rows_gets_empty_metrics(self, repository, db_session, campaign):
+        contact = Contact(first_name='Only', last_name='A', phone='+15550459999')
+        db_session.add(contact)
+        db_session.flush()
+        db_session.add(CampaignResponse(campaign_id=campaign.id, contact_id=contact.id,
+                                        message_variant='A', message_sent_at=datetime(2026, 10, 5)))
+        db_session.flush()
+
+        comparison = repository.get_variant_comparison(campaign.id)
+
+        assert comparison['variant_a']['sent'] == 1
+        assert comparison['variant_b'] == reference_variant_metrics([])
+
+    def test_response_funnel_matches(self, repository, campaign, responses):
+        funnel = repository.get_response_funnel(campaign.id)
+
+        responded = len([r for r in responses if r.first_response_at is not None])
+        assert funnel['sent'] == len(responses)
+        assert funnel['delivered'] == len(responses)
+        assert funnel['opened'] == int(len(responses) * 0.70)
+        assert funnel['responded'] == responded
+        assert funnel['qualified'] == int(responded * 0.50)
+        assert funnel['drop_off_analysis']['opened_no_response'] == int(len(responses) * 0.70) - responded
+
+    def test_time_based_patterns_match(self, repository, campaign, responses):
+        hourly, daily = reference_time_patterns(responses)
+
+        patterns = repository.get_time_based_patterns(campaign.id)
+
+        assert patterns['hourly_response_rates'] == pytest.approx(hourly)
+        assert patterns['daily_response_rates'] == pytest.approx(daily)
+        best_rate = max(hourly.values())
+        assert hourly[f"{patterns['optimal_send_times']['best_hour']:02d}"] == best_rate
+        assert daily[patterns['optimal_send_times']['best_day']] == max(daily.values())
+
+    def test_empty_campaign_defaults(self, repository, campaign):
+        analytics = repository.get_response_analytics(campaign.id)
+        patterns = repository.get_time_based_patterns(campaign.id)
+
+        assert analytics.total_sent == 0
+        assert analytics.confidence_interval == {'lower': 0.0, 'upper': 0.0}
+        assert patterns['optimal_send_times']['best_hour'] == 9
+        assert patterns['optimal_send_times']['best_day'] == 'tuesday'
+
+    def test_aggregates_do_not_load_rows(self, repository, campaign, responses, query_budget):
+        with query_budget(6) as stats:
+            repository.get_response_analytics(campaign.id)
+            repository.get_variant_comparison(campaign.id)
+            repository.get_response_funnel(campaign.id)
+            repository.get_time_based_patterns(campaign.id)
+
+        assert stats.count == 6
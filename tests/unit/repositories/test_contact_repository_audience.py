@@ -0,0 +1,160 @@
+"""
+Tests for the campaign audience query compiler in ContactRepository
+Parity suite: every filter must select exactly the contacts the former
+in-memory filtering in CampaignService selected
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from crm_database import Campaign, CampaignMembership, Contact, ContactFlag
+from repositories.contact_repository import ContactRepository
+
+
+FLAG_FILTERS = {
+    'exclude_office_numbers': 'office_number',
+    'exclude_opted_out': 'opted_out',
+    'exclude_do_not_contact': 'do_not_contact',
+    'exclude_recently_contacted': 'recently_texted',
+}
+
+
+def reference_audience(session, filters):
+    """The in-memory filtering CampaignService used before the SQL compiler"""
+    contacts = session.query(Contact).all()
+    flags = session.query(ContactFlag).all()
+
+    def flagged(flag_type):
+        return {flag.contact_id for flag in flags if flag.flag_type == flag_type}
+
+    if filters.get('has_name_only'):
+        contacts = [c for c in contacts if not (c.first_name and c.first_name.startswith('+1'))]
+    if filters.get('has_email'):
+        contacts = [c for c in contacts if c.email]
+    for filter_name, flag_type in FLAG_FILTERS.items():
+        if filters.get(filter_name):
+            excluded = flagged(flag_type)
+            contacts = [c for c in contacts if c.id not in excluded]
+    if filters.get('min_days_since_contact'):
+        cutoff = datetime.utcnow() - timedelta(days=filters['min_days_since_contact'])
+        recent = {flag.contact_id for flag in flags
+                  if flag.flag_type == 'recently_texted' and flag.created_at and flag.created_at > cutoff}
+        contacts = [c for c in contacts if c.id not in recent]
+    if filters.get('exclude_current_campaign'):
+        running = {campaign.id for campaign in session.query(Campaign).filter_by(status='running')}
+        members = {m.contact_id for m in session.query(CampaignMembership).all() if m.campaign_id in running}
+        contacts = [c for c in contacts if c.id not in members]
+    return sorted(c.id for c in contacts)
+
+
+class TestContactRepositoryAudience:
+    """Test SQL-compiled campaign audiences against the in-memory reference"""
+    
+    @pytest.fixture
+    def repository(self, db_session):
+        return ContactRepository(session=db_session)
+    
+    @pytest.fixture
+    def audience(self, db_session):
+        """Contacts covering every filter, including empty and NULL values"""
+        contacts = {
+            'named': Contact(first_name='Ann', last_name='Lee', phone='+15550105001', email='ann@example.com'),
+            'phone_name': Contact(first_name='+15550105002', last_name='Test', phone='+15550105002', email='p@example.com'),
+            'empty_email': Contact(first_name='Empty', last_name='Test', phone='+15550105003', email=''),
+            'empty_name': Contact(first_name='', last_name='Test', phone='+15550105004', email=None),
+            'office': Contact(first_name='Office', last_name='Test', phone='+15550105005', email='office@example.com'),
+            'opted_out': Contact(first_name='Stop', last_name='Test', phone='+15550105006'),
+            'dnc': Contact(first_name='Dnc', last_name='Test', phone='+15550105007'),
+            'texted_recently': Contact(first_name='Recent', last_name='Test', phone='+15550105008'),
+            'texted_long_ago': Contact(first_name='Old', last_name='Test', phone='+15550105009'),
+            'in_running': Contact(first_name='Running', last_name='Test', phone='+15550105010'),
+            'in_draft': Contact(first_name='Draft', last_name='Test', phone='+15550105011'),
+        }
+        db_session.add_all(contacts.values())
+        db_session.flush()
+        
+        now = datetime.utcnow()
+        db_session.add_all([
+            ContactFlag(contact_id=contacts['office'].id, flag_type='office_number'),
+            ContactFlag(contact_id=contacts['opted_out'].id, flag_type='opted_out',
+                        expires_at=now - timedelta(days=1)),
+            ContactFlag(contact_id=contacts['dnc'].id, flag_type='do_not_contact'),
+            ContactFlag(contact_id=contacts['texted_recently'].id, flag_type='recently_texted',
+                        created_at=now - timedelta(days=2)),
+            ContactFlag(contact_id=contacts['texted_long_ago'].id, flag_type='recently_texted',
+                        created_at=now - timedelta(days=40)),
+        ])
+        running = Campaign(name='Audience running', campaign_type='blast', template_a='Hi', status='running')
+        draft = Campaign(name='Audience draft', campaign_type='blast', template_a='Hi', status='draft')
+        db_session.add_all([running, draft])
+        db_session.flush()
+        db_session.add_all([
+            CampaignMembership(campaign_id=running.id, contact_id=contacts['in_running'].id),
+            CampaignMembership(campaign_id=draft.id, contact_id=contacts['in_draft'].id),
+        ])
+        db_session.flush()
+        return contacts
+    
+    def _audience_ids(self, repository, filters, batch_size=None):
+        return [contact_id for chunk in repository.iter_audience_ids(filters, batch_size) for contact_id in chunk]
+    
+    @pytest.mark.parametrize('filters', [
+        {},
+        {'has_name_only': True},
+        {'has_email': True},
+        {'exclude_office_numbers': True},
+        {'exclude_opted_out': True},
+        {'exclude_do_not_contact': True},
+        {'exclude_recently_contacted': True},
+        {'min_days_since_contact': 30},
+        {'min_days_since_contact': 1},
+        {'exclude_current_campaign': True},
+        {'has_name_only': False, 'has_email': False, 'exclude_opted_out': False},
+        {'has_name_only': True, 'has_email': True, 'exclude_office_numbers': True, 'exclude_opted_out': True},
+        {'exclude_opted_out': True, 'exclude_do_not_contact': True, 'min_days_since_contact': 7,
+         'exclude_current_campaign': True, 'contact_ids': [1, 2]},
+    ])
+    def test_matches_in_memory_filtering(self, repository, db_session, audience, filters):
+        assert self._audience_ids(repository, filters) == reference_audience(db_session, filters)
+    
+    def test_each_filter_excludes_its_contact(self, repository, audience):
+        everyone = set(self._audience_ids(repository, {}))
+        expected_exclusions = {
+            'has_name_only': 'phone_name',
+            'exclude_office_numbers': 'office',
+            'exclude_opted_out': 'opted_out',
+            'exclude_do_not_contact': 'dnc',
+            'exclude_current_campaign': 'in_running',
+        }
+        
+        for filter_name, contact_key in expected_exclusions.items():
+            excluded = everyone - set(self._audience_ids(repository, {filter_name: True}))
+            assert audience[contact_key].id in excluded, filter_name
+        
+        min_days = set(self._audience_ids(repository, {'min_days_since_contact': 30}))
+        assert audience['texted_recently'].id not in min_days
+        assert audience['texted_long_ago'].id in min_days
+        assert audience['in_draft'].id in set(self._audience_ids(repository, {'exclude_current_campaign': True}))
+    
+    def test_ids_stream_in_chunks(self, repository, audience):
+        chunks = list(repository.iter_audience_ids({}, batch_size=4))
+        
+        assert all(len(chunk) <= 4 for chunk in chunks)
+        assert len(chunks) > 1
+        flattened = [contact_id for chunk in chunks for contact_id in chunk]
+        assert flattened == sorted(flattened)
+    
+    def test_count_and_sample(self, repository, db_session, audience):
+        filters = {'has_email': True, 'exclude_office_numbers': True}
+        expected = reference_audience(db_session, filters)
+        
+        assert repository.count_audience(filters) == len(expected)
+        assert [contact.id for contact in repository.find_audience_sample(filters, limit=2)] == expected[:2]
+    
+    def test_audience_is_one_statement(self, repository, audience, query_budget):
+        filters = {'has_name_only': True, 'has_email': True, 'exclude_office_numbers': True,
+                   'exclude_opted_out': True, 'min_days_since_contact': 7, 'exclude_current_campaign': True}
+        
+        with query_budget(1):
+            self._audience_ids(repository, filters)
@@ -0,0 +1,155 @@
+"""
+Tests for the denormalized Conversation inbox summary
+Verifies the summary is maintained on Activity writes and used by inbox queries
+"""
+
+import pytest
+from datetime import timedelta
+from utils.datetime_utils import utc_now
+from repositories.conversation_repository import ConversationRepository
+from repositories.activity_repository import ActivityRepository
+from crm_database import Conversation, Activity
+from tests.conftest import create_test_contact
+
+
+class TestConversationSummary:
+    """Test inbox summary maintenance and summary-based queries"""
+
+    @pytest.fixture
+    def repository(self, db_session):
+        return ConversationRepository(session=db_session)
+
+    @pytest.fixture
+    def conversation(self, db_session):
+        contact = create_test_contact(phone='+15550001111', first_name='Summary')
+        db_session.add(contact)
+        db_session.commit()
+        conversation = Conversation(contact_id=contact.id)
+        db_session.add(conversation)
+        db_session.commit()
+        return conversation
+
+    def _add_activity(self, db_session, conversation, **kwargs):
+        data = {
+            'conversation_id': conversation.id,
+            'contact_id': conversation.contact_id,
+            'activity_type': 'message',
+            'direction': 'incoming',
+            'created_at': utc_now()
+        }
+        data.update(kwargs)
+        activity = Activity(**data)
+        db_session.add(activity)
+        db_session.commit()
+        return activity
+
+    def test_new_conversation_has_empty_summary(self, conversation):
+        assert conversation.activity_count == 0
+        assert conversation.unread_count == 0
+        assert conversation.has_attachments is False
+        assert conversation.last_message_preview is None
+
+    def test_incoming_messages_increment_unread_and_set_preview(self, db_session, conversation):
+        """Each newer incoming message adds to unread and becomes the preview"""
+        now = utc_now()
+        self._add_activity(db_session, conversation, body='First', created_at=now - timedelta(minutes=2))
+        self._add_activity(db_session, conversation, body='Second', created_at=now - timedelta(minutes=1))
+
+        db_session.refresh(conversation)
+        assert conversation.activity_count == 2
+        assert conversation.unread_count == 2
+        assert conversation.last_message_preview == 'Second'
+        assert conversation.last_direction == 'incoming'
+        assert conversation.last_activity_type == 'message'
+
+    def test_outgoing_reply_clears_unread(self, db_session, conversation):
+        now = utc_now()
+        self._add_activity(db_session, conversation, body='Question?', created_at=now - timedelta(minutes=2))
+        self._add_activity(db_session, conversation, body='Answer', direction='outgoing',
+                           created_at=now - timedelta(minutes=1))
+
+        db_session.refresh(conversation)
+        assert conversation.unread_count == 0
+        assert conversation.last_direction == 'outgoing'
+        assert conversation.last_message_preview == 'Answer'
+
+    def test_older_activity_only_updates_counts(self, db_session, conversation):
+        """Backfilled history does not replace the latest preview"""
+        now = utc_now()
+        self._add_activity(db_session, conversation, body='Latest', created_at=now)
+        self._add_activity(db_session, conversation, body='Old', direction='outgoing',
+                           created_at=now - timedelta(days=3), media_urls=['http://example.com/a.jpg'])
+
+        db_session.refresh(conversation)
+        assert conversation.activity_count == 2
+        assert conversation.last_message_preview == 'Latest'
+        assert conversation.unread_count == 1
+        assert conversation.has_attachments is True
+
+    def test_call_preview_includes_duration(self, db_session, conversation):
+        self._add_activity(db_session, conversation, activity_type='call', duration_seconds=185)
+
+        db_session.refresh(conversation)
+        assert conversation.last_message_preview == 'Incoming call (3m)'
+        assert conversation.last_activity_type == 'call'
+
+    def test_empty_media_array_is_not_an_attachment(self, db_session, conversation):
+        self._add_activity(db_session, conversation, body='No media', media_urls=[])
+
+        db_session.refresh(conversation)
+        assert conversation.has_attachments is False
+
+    def test_activity_update_sets_ai_summary_flag(self, db_session, conversation):
+        """Flags follow content added to existing activities"""
+        activity = self._add_activity(db_session, conversation, activity_type='call')
+        assert conversation.has_ai_summary is False
+
+        activity.ai_summary = 'Customer wants a quote'
+        db_session.commit()
+
+        db_session.refresh(conversation)
+        assert conversation.has_ai_summary is True
+
+    def test_repository_create_maintains_summary(self, db_session, conversation):
+        """Writes through ActivityRepository (webhook/sync path) update the summary"""
+        activity_repository = ActivityRepository(session=db_session)
+
+        activity_repository.create(
+            conversation_id=conversation.id,
+            contact_id=conversation.contact_id,
+            activity_type='message',
+            direction='incoming',
+            body='Via repository',
+            created_at=utc_now()
+        )
+        db_session.commit()
+
+        db_session.refresh(conversation)
+        assert conversation.last_message_preview == 'Via repository'
+        assert conversation.activity_count == 1
+
+    def test_filters_use_summary_columns(self, repository, db_session, conversation):
+        """Unread and attachment filters match on the summary"""
+        self._add_activity(db_session, conversation, body='Photo', media_urls=['http://example.com/b.jpg'])
+
+        unread = repository.find_conversations_with_filters(filter_type='unread')
+        attachments = repository.find_conversations_with_filters(filter_type='has_attachments')
+
+        assert [c.id for c in unread['conversations']] == [conversation.id]
+        assert [c.id for c in attachments['conversations']] == [conversation.id]
+
+        assert repository.mark_as_read([conversation.id]) is True
+        db_session.refresh(conversation)
+        assert conversation.unread_count == 0
+        assert repository.find_conversations_with_filters(filter_type='unread')['total_count'] == 0
+
+    def test_first_activity_sets_preview_even_if_older(self, db_session, conversation):
+        """Conversations created just before their first activity still get a preview"""
+        conversation.last_activity_at = utc_now()
+        db_session.commit()
+
+        self._add_activity(db_session, conversation, body='Sent a minute ago',
+                           created_at=utc_now() - timedelta(minutes=1))
+
+        db_session.refresh(conversation)
+        assert conversation.last_message_preview == 'Sent a minute ago'
@@ -283,8 +283,8 @@ class TestDiagnosticsRepository:
         mock_engine = Mock()
         mock_pool = Mock()
         mock_pool.size.return_value = 5
-        mock_pool.checked_in.return_value = 3
-        mock_pool.checked_out.return_value = 2
+        mock_pool.checkedin.return_value = 3
+        mock_pool.checkedout.return_value = 2
         mock_pool.overflow.return_value = 0
         mock_pool.invalid.return_value = 0  # Mock the invalid method too
         mock_engine.pool = mock_pool
@@ -303,6 +303,32 @@ class TestDiagnosticsRepository:
         }
         assert result == expected
     
+    def test_get_connection_pool_stats_reports_utilization_and_replica(self, repository, mock_session):
+        """Test QueuePool capacity usage and the read replica pool are reported"""
+        # Arrange
+        def queue_pool(checked_out):
+            pool = Mock(spec=['size', 'checkedin', 'checkedout', 'overflow', '_max_overflow'])
+            pool.size.return_value = 5
+            pool.checkedin.return_value = 5 - checked_out
+            pool.checkedout.return_value = checked_out
+            pool.overflow.return_value = 0
+            pool._max_overflow = 10
+            return pool
+        
+        primary, replica = Mock(), Mock()
+        primary.pool = queue_pool(checked_out=3)
+        replica.pool = queue_pool(checked_out=6)
+        mock_session.get_bind.side_effect = lambda clause=None: replica if clause is not None else primary
+        
+        # Act
+        result = repository.get_connection_pool_stats()
+        
+        # Assert
+        assert result['max_overflow'] == 10
+        assert result['utilization'] == 0.2
+        assert result['replica']['checked_out'] == 6
+        assert result['replica']['utilization'] == 0.4
+    
     def test_get_connection_pool_stats_handles_error(self, repository, mock_session):
         """Test connection pool stats when pool info unavailable"""
         # Arrange
@@ -0,0 +1,121 @@
+"""
+Tests for dynamic campaign list refresh in the repositories
+Criteria compile to one contact-id query and membership is synced with set-based statements
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from crm_database import CampaignList, CampaignListMember, Contact, ContactFlag
+from repositories.campaign_list_member_repository import CampaignListMemberRepository
+from repositories.contact_repository import ContactRepository
+
+
+class TestDynamicListRefresh:
+    """Test build_list_criteria_query and sync_members against the database"""
+
+    @pytest.fixture
+    def contact_repository(self, db_session):
+        return ContactRepository(session=db_session)
+
+    @pytest.fixture
+    def member_repository(self, db_session):
+        return CampaignListMemberRepository(session=db_session)
+
+    @pytest.fixture
+    def contacts(self, db_session):
+        now = datetime.utcnow()
+        contacts = {
+            'recent_email': Contact(first_name='Recent', last_name='Email', phone='+15550106001',
+                                    email='recent@example.com', imported_at=now - timedelta(days=2),
+                                    contact_metadata={'source': 'web', 'lead_score': 5}),
+            'recent_no_email': Contact(first_name='Recent', last_name='NoEmail', phone='+15550106002',
+                                       email='', imported_at=now - timedelta(days=3)),
+            'old_email': Contact(first_name='Old', last_name='Email', phone='+15550106003',
+                                 email='old@example.com', imported_at=now - timedelta(days=40),
+                                 contact_metadata={'source': 'csv'}),
+            'opted_out': Contact(first_name='Stop', last_name='Email', phone='+15550106004',
+                                 email='stop@example.com', imported_at=now - timedelta(days=1)),
+        }
+        db_session.add_all(contacts.values())
+        db_session.flush()
+        db_session.add(ContactFlag(contact_id=contacts['opted_out'].id, flag_type='opted_out'))
+        db_session.flush()
+        return contacts
+
+    @pytest.fixture
+    def campaign_list(self, db_session):
+        campaign_list = CampaignList(name='Dynamic Refresh', is_dynamic=True)
+        db_session.add(campaign_list)
+        db_session.flush()
+        return campaign_list
+
+    def matching(self, contact_repository, criteria, contacts):
+        ours = {contact.id for contact in contacts.values()}
+        ids = contact_repository.session.execute(contact_repository.build_list_criteria_query(criteria)).scalars()
+        return {contact_id for contact_id in ids if contact_id in ours}
+
+    def active_ids(self, db_session, campaign_list):
+        return {
+            member.contact_id for member in
+            db_session.query(CampaignListMember).filter_by(list_id=campaign_list.id, status='active')
+        }
+
+    def test_criteria_are_combined(self, contact_repository, contacts):
+        criteria = {
+            'imported_after': (datetime.utcnow() - timedelta(days=7)).isoformat(),
+            'has_email': True,
+            'exclude_opted_out': True,
+        }
+
+        assert self.matching(contact_repository, criteria, contacts) == {contacts['recent_email'].id}
+
+    def test_metadata_keys_must_all_be_present(self, contact_repository, contacts):
+        assert self.matching(contact_repository, {'has_metadata': ['source']}, contacts) == {
+            contacts['recent_email'].id, contacts['old_email'].id
+        }
+        assert self.matching(contact_repository, {'has_metadata': ['source', 'lead_score']}, contacts) == {
+            contacts['recent_email'].id
+        }
+
+    def test_no_recognised_criteria_match_nothing(self, contact_repository, contacts):
+        assert self.matching(contact_repository, {}, contacts) == set()
+        assert self.matching(contact_repository, {'unknown': 1}, contacts) == set()
+
+    def test_sync_adds_reactivates_and_removes(self, db_session, member_repository, contacts, campaign_list):
+        db_session.add_all([
+            CampaignListMember(list_id=campaign_list.id, contact_id=contacts['recent_email'].id, status='removed'),
+            CampaignListMember(list_id=campaign_list.id, contact_id=contacts['recent_no_email'].id, status='suppressed'),
+            CampaignListMember(list_id=campaign_list.id, contact_id=contacts['opted_out'].id, status='active'),
+        ])
+        db_session.flush()
+        wanted = [contacts['recent_email'].id, contacts['recent_no_email'].id, contacts['old_email'].id]
+
+        changes = member_repository.sync_members(campaign_list.id, select(Contact.id).where(Contact.id.in_(wanted)))
+
+        assert changes == {'added': 2, 'removed': 1}
+        assert self.active_ids(db_session, campaign_list) == {contacts['recent_email'].id, contacts['old_email'].id}
+        statuses = dict(db_session.query(CampaignListMember.contact_id, CampaignListMember.status).filter_by(
+            list_id=campaign_list.id
+        ))
+        assert statuses[contacts['recent_no_email'].id] == 'suppressed'
+        assert statuses[contacts['opted_out'].id] == 'removed'
+
+    def test_sync_without_churn_changes_nothing(self, member_repository, contact_repository, contacts, campaign_list):
+        query = contact_repository.build_list_criteria_query({'has_email': True})
+        member_repository.sync_members(campaign_list.id, query)
+
+        assert member_repository.sync_members(campaign_list.id, query) == {'added': 0, 'removed': 0}
+
+    def test_sync_runs_two_statements(self, member_repository, contact_repository, contacts, campaign_list, query_budget):
+        query = contact_repository.build_list_criteria_query({'has_email': True, 'exclude_opted_out': True})
+
+        with query_budget(2) as stats:
+            changes = member_repository.sync_members(campaign_list.id, query)
+
+        assert stats.count == 2
+        assert changes['removed'] == 0
+        assert {contacts['recent_email'].id, contacts['old_email'].id} <= \
+            {m.contact_id for m in member_repository.find_active_members(campaign_list.id)}
@@ -274,6 +274,90 @@ class TestEngagementScoreRepository:
         lowest_score_contact = next(c for c, s in zip(contacts, scores) if s == 45.0)
         assert percentiles[lowest_score_contact.id]['percentile'] <= 20.0
     
+    def _create_campaign_scores(self, repository, db_session, campaign, rows, phone_prefix):
+        """Create one contact and score per (overall, recency, frequency, monetary) row"""
+        contacts = []
+        for i, (overall, recency, frequency, monetary) in enumerate(rows):
+            contact = create_test_contact(phone=f'{phone_prefix}{i:02d}', first_name=f'Rank{i}', last_name='Contact')
+            db_session.add(contact)
+            contacts.append(contact)
+        db_session.commit()
+        
+        for contact, (overall, recency, frequency, monetary) in zip(contacts, rows):
+            repository.create(
+                contact_id=contact.id,
+                campaign_id=campaign.id,
+                overall_score=overall,
+                recency_score=recency,
+                frequency_score=frequency,
+                monetary_score=monetary,
+                calculated_at=utc_now(),
+                score_version='1.0'
+            )
+        return contacts
+    
+    def test_calculate_percentile_ranks_ties_and_quartiles(self, repository, db_session, sample_campaign):
+        """Test tied scores share a percentile and quartiles come from NTILE(4)"""
+        # Arrange
+        rows = [(score, 0, 0, 0) for score in [10.0, 20.0, 20.0, 40.0, 50.0, 60.0, 70.0, 80.0, 90.0]]
+        contacts = self._create_campaign_scores(repository, db_session, sample_campaign, rows, '+1555047')
+        
+        # Act
+        percentiles = repository.calculate_percentile_ranks(sample_campaign.id)
+        
+        # Assert
+        assert percentiles[contacts[1].id]['percentile'] == percentiles[contacts[2].id]['percentile'] == 12.5
+        assert percentiles[contacts[0].id]['percentile'] == 0.0
+        assert percentiles[contacts[0].id]['quartile'] == 1
+        assert percentiles[contacts[8].id]['quartile'] == 4
+    
+    def test_update_percentile_ranks_matches_window_function(self, repository, db_session, sample_campaign, query_budget):
+        """Test stored percentiles equal the PERCENT_RANK() read path for every component"""
+        # Arrange
+        rows = [
+            (45.0, 90.0, 10.0, 30.0),
+            (55.0, 80.0, 20.0, 30.0),
+            (65.0, 70.0, 30.0, 10.0),
+            (65.0, 60.0, 40.0, 20.0),
+            (95.0, 50.0, 50.0, 40.0),
+        ]
+        contacts = self._create_campaign_scores(repository, db_session, sample_campaign, rows, '+1555048')
+        
+        # Act
+        with query_budget(2):
+            updated = repository.update_percentile_ranks(sample_campaign.id)
+        
+        # Assert
+        assert updated == 5
+        ranks = repository.calculate_percentile_ranks(sample_campaign.id)
+        for contact in contacts:
+            score = repository.get_by_contact_and_campaign(contact.id, sample_campaign.id)
+            db_session.refresh(score)
+            assert float(score.overall_percentile) == ranks[contact.id]['percentile']
+        recency = {c.id: float(repository.get_by_contact_and_campaign(c.id, sample_campaign.id).recency_percentile)
+                   for c in contacts}
+        assert recency[contacts[0].id] == 100.0
+        assert recency[contacts[4].id] == 0.0
+        monetary = {c.id: float(repository.get_by_contact_and_campaign(c.id, sample_campaign.id).monetary_percentile)
+                    for c in contacts}
+        assert monetary[contacts[0].id] == monetary[contacts[1].id] == 50.0
+    
+    def test_get_score_distribution_histogram(self, repository, db_session, sample_campaign):
+        """Test scores are bucketed into equal-width bins over 0-100"""
+        # Arrange
+        rows = [(score, 0, 0, 0) for score in [0.0, 5.0, 15.0, 55.0, 99.0, 100.0]]
+        self._create_campaign_scores(repository, db_session, sample_campaign, rows, '+1555049')
+        
+        # Act
+        distribution = repository.get_score_distribution(sample_campaign.id, buckets=10)
+        
+        # Assert
+        counts = [bucket['count'] for bucket in distribution['histogram']]
+        assert counts == [2, 1, 0, 0, 0, 1, 0, 0, 0, 2]
+        assert distribution['histogram'][0]['range_start'] == 0
+        assert distribution['histogram'][-1]['range_end'] == 100
+        assert distribution['median'] == 35.0
+    
     def test_get_top_scored_contacts(self, repository, db_session, sample_campaign):
         """Test retrieving top-scored contacts for a campaign"""
         # Arrange - Create contacts with different scores
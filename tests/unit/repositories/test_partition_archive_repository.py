@@ -0,0 +1,129 @@
+"""
+Tests for PartitionArchiveRepository
+Verifies archived months round-trip through compressed chunks and are
+queryable through the Activity and WebhookEvent repositories
+"""
+
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+from crm_database import Activity, ArchivedPartition, WebhookEvent
+from repositories.activity_repository import ActivityRepository
+from repositories.partition_archive_repository import PartitionArchiveRepository
+from repositories.webhook_event_repository import WebhookEventRepository
+from tests.conftest import create_test_contact
+
+
+class TestPartitionArchiveRepository:
+    """Test archiving and reading back months of rows"""
+    
+    @pytest.fixture
+    def repository(self, db_session):
+        return PartitionArchiveRepository(session=db_session)
+    
+    @pytest.fixture
+    def contact(self, db_session):
+        contact = create_test_contact(phone='+15550104001')
+        db_session.add(contact)
+        db_session.flush()
+        return contact
+    
+    def _archive_activities(self, repository, db_session, contact, created):
+        activities = [
+            Activity(contact_id=contact.id, activity_type='message', direction='incoming',
+                     body=f'archived {index}', created_at=created_at,
+                     activity_metadata={'index': index})
+            for index, created_at in enumerate(created)
+        ]
+        db_session.add_all(activities)
+        db_session.flush()
+        table = Activity.__table__
+        rows = db_session.execute(
+            select(table).where(table.c.id.in_([activity.id for activity in activities]))
+        ).all()
+        return repository.archive_rows(table, date(2020, 1, 1), date(2020, 2, 1), [rows])
+    
+    def test_archive_rows_round_trip(self, repository, db_session, contact):
+        archived = self._archive_activities(repository, db_session, contact, [
+            datetime(2020, 1, 5, 10, 30), datetime(2020, 1, 20, 8, 0)
+        ])
+        
+        rows = list(repository.iter_rows(Activity.__table__))
+        
+        assert archived == 2
+        assert [row['body'] for row in rows] == ['archived 0', 'archived 1']
+        assert rows[0]['created_at'] == datetime(2020, 1, 5, 10, 30)
+        assert rows[1]['activity_metadata'] == {'index': 1}
+        assert rows[0]['contact_id'] == contact.id
+    
+    def test_rows_are_split_into_chunks(self, repository, db_session, contact, monkeypatch):
+        monkeypatch.setattr(PartitionArchiveRepository, 'ROWS_PER_CHUNK', 2)
+        
+        self._archive_activities(repository, db_session, contact, [datetime(2020, 1, day) for day in (1, 2, 3)])
+        
+        chunks = db_session.query(ArchivedPartition).filter_by(table_name='activity').order_by(
+            ArchivedPartition.chunk_index
+        ).all()
+        assert [(chunk.chunk_index, chunk.row_count) for chunk in chunks] == [(0, 2), (1, 1)]
+        assert repository.archived_periods('activity') == [
+            {'period_start': date(2020, 1, 1), 'period_end': date(2020, 2, 1), 'row_count': 3, 'chunks': 2}
+        ]
+    
+    def test_archiving_a_month_again_appends_chunks(self, repository, db_session, contact):
+        self._archive_activities(repository, db_session, contact, [datetime(2020, 1, 1)])
+        self._archive_activities(repository, db_session, contact, [datetime(2020, 1, 2)])
+        
+        assert repository.archived_periods('activity')[0]['chunks'] == 2
+        assert len(list(repository.iter_rows(Activity.__table__))) == 2
+    
+    def test_iter_rows_filters_by_created_at(self, repository, db_session, contact):
+        self._archive_activities(repository, db_session, contact, [
+            datetime(2020, 1, 5), datetime(2020, 1, 15), datetime(2020, 1, 25)
+        ])
+        
+        rows = list(repository.iter_rows(
+            Activity.__table__, datetime(2020, 1, 10), datetime(2020, 1, 25, tzinfo=timezone.utc)
+        ))
+        
+        assert [row['created_at'] for row in rows] == [datetime(2020, 1, 15)]
+    
+    def test_activity_repository_includes_archived_rows(self, repository, db_session, contact):
+        self._archive_activities(repository, db_session, contact, [datetime(2020, 1, 5)])
+        db_session.query(Activity).filter(Activity.contact_id == contact.id).delete()
+        live = Activity(contact_id=contact.id, activity_type='message', created_at=datetime(2020, 2, 3))
+        db_session.add(live)
+        db_session.flush()
+        activity_repository = ActivityRepository(session=db_session, archive_repository=repository)
+        
+        without_archive = activity_repository.find_by_date_range(
+            datetime(2020, 1, 1), datetime(2020, 3, 1), contact_id=contact.id
+        )
+        with_archive = activity_repository.find_by_date_range(
+            datetime(2020, 1, 1), datetime(2020, 3, 1), include_archived=True, contact_id=contact.id
+        )
+        
+        assert without_archive == [live]
+        assert [activity.created_at for activity in with_archive] == [datetime(2020, 1, 5), datetime(2020, 2, 3)]
+        assert with_archive[0].body == 'archived 0'
+        assert with_archive[0] not in db_session
+    
+    def test_webhook_event_repository_includes_archived_rows(self, repository, db_session):
+        event = WebhookEvent(event_id='evt-archived-1', event_type='message.received',
+                             payload={'id': 'msg-1'}, created_at=datetime(2020, 1, 7))
+        db_session.add(event)
+        db_session.flush()
+        table = WebhookEvent.__table__
+        rows = db_session.execute(select(table).where(table.c.id == event.id)).all()
+        repository.archive_rows(table, date(2020, 1, 1), date(2020, 2, 1), [rows])
+        db_session.delete(event)
+        db_session.flush()
+        
+        found = WebhookEventRepository(session=db_session, archive_repository=repository).find_by_date_range(
+            datetime(2020, 1, 1), datetime(2020, 2, 1), include_archived=True, event_type='message.received'
+        )
+        
+        assert [(found_event.event_id, found_event.payload) for found_event in found] == [
+            ('evt-archived-1', {'id': 'msg-1'})
+        ]
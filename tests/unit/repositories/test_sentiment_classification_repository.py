@@ -0,0 +1,44 @@
+"""
+Tests for SentimentClassificationRepository
+Verifies hash lookups and conflict-tolerant inserts against the database
+"""
+
+import pytest
+
+from repositories.sentiment_classification_repository import SentimentClassificationRepository
+from crm_database import SentimentClassification
+
+
+class TestSentimentClassificationRepository:
+    """Test the persistent classification cache"""
+    
+    @pytest.fixture
+    def repository(self, db_session):
+        return SentimentClassificationRepository(session=db_session)
+    
+    def _classification(self, sentiment='positive'):
+        return {'sentiment': sentiment, 'intent': 'interested', 'confidence': 0.8,
+                'keywords': ['yes'], 'urgency': 'low'}
+    
+    def test_save_and_find_by_hashes(self, repository):
+        repository.save_classifications({'a' * 64: self._classification(), 'b' * 64: self._classification('negative')}, 'v1')
+        
+        found = repository.find_by_hashes(['a' * 64, 'b' * 64, 'c' * 64], 'v1')
+        
+        assert set(found) == {'a' * 64, 'b' * 64}
+        assert found['b' * 64]['sentiment'] == 'negative'
+        assert found['a' * 64]['keywords'] == ['yes']
+    
+    def test_lookup_is_scoped_to_model_version(self, repository):
+        repository.save_classifications({'a' * 64: self._classification()}, 'v1')
+        
+        assert repository.find_by_hashes(['a' * 64], 'v2') == {}
+    
+    def test_existing_hash_is_not_overwritten(self, repository, db_session):
+        """A concurrent worker may have stored the same hash first"""
+        repository.save_classifications({'a' * 64: self._classification()}, 'v1')
+        repository.save_classifications({'a' * 64: self._classification('negative')}, 'v1')
+        
+        rows = db_session.query(SentimentClassification).filter_by(text_hash='a' * 64).all()
+        assert len(rows) == 1
+        assert rows[0].sentiment == 'positive'
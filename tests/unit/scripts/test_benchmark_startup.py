@@ -0,0 +1,66 @@
+"""
+Unit tests for the startup import-time benchmark
+"""
+
+from scripts.dev_tools.benchmark_startup import (
+    DEFAULT_BUDGET, StartupProfile, check_budget, load_budget, parse_importtime, profile_startup
+)
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        900 |     sqlalchemy.sql
+import time:       500 |       1400 |   sqlalchemy
+import time:      2000 |       3400 | crm_database
+import time:       600 |        600 | app
+"""
+
+
+class TestParseImporttime:
+    """-X importtime output is parsed into per-module records"""
+
+    def test_records_and_depths(self):
+        records = parse_importtime(IMPORTTIME_OUTPUT)
+
+        assert [(r.module, r.self_us, r.cumulative_us, r.depth) for r in records] == [
+            ('_io', 120, 120, 1),
+            ('sqlalchemy.sql', 300, 900, 2),
+            ('sqlalchemy', 500, 1400, 1),
+            ('crm_database', 2000, 3400, 0),
+            ('app', 600, 600, 0)
+        ]
+
+    def test_total_counts_top_level_imports_once(self):
+        profile = StartupProfile('web', parse_importtime(IMPORTTIME_OUTPUT), startup_ms=5.0)
+
+        assert profile.import_ms == 4.0
+        assert [record.module for record in profile.slowest(2)] == ['crm_database', 'app']
+
+
+class TestCheckBudget:
+    """Regressions are reported for slow startup and forbidden imports"""
+
+    def test_within_budget(self):
+        profile = StartupProfile('web', parse_importtime(IMPORTTIME_OUTPUT), startup_ms=5.0)
+
+        assert check_budget(profile, {'max_import_ms': 3.5, 'forbidden_modules': ['alembic']}, 0.25) == []
+
+    def test_slow_startup_and_forbidden_module(self):
+        profile = StartupProfile('web', parse_importtime(IMPORTTIME_OUTPUT), startup_ms=5.0)
+
+        problems = check_budget(profile, {'max_import_ms': 3.0, 'forbidden_modules': ['sqlalchemy.sql']}, 0.25)
+
+        assert problems == [
+            'web: import time 4.0 ms exceeds budget 3.0 ms (+25%)',
+            'web: sqlalchemy.sql is imported at startup'
+        ]
+
+
+def test_web_startup_imports_no_forbidden_modules():
+    """The web app starts without alembic or the Google, Gemini and Sentry SDKs"""
+    budget = load_budget(DEFAULT_BUDGET)['scenarios']['web']
+
+    profile = profile_startup('web')
+
+    assert budget['forbidden_modules']
+    assert not profile.modules & set(budget['forbidden_modules'])
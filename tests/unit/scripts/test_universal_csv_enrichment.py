@@ -0,0 +1,111 @@
+"""
+Unit tests for bulk enrichment in the universal CSV enrichment script
+"""
+
+import pytest
+
+from crm_database import Contact
+from scripts.data_management.universal_csv_enrichment import UniversalCSVEnricher
+
+
+def _legacy_dry_run_stats(enricher, session):
+    """Statistics of the per-phone dry run the bulk engine replaced"""
+    stats = dict.fromkeys(['contacts_found', 'contacts_updated', 'first_names_updated',
+                           'last_names_updated', 'emails_updated', 'metadata_updated'], 0)
+    for phone, enrichment in enricher.enrichment_data.items():
+        contact = session.query(Contact).filter_by(phone=phone).first()
+        if not contact:
+            continue
+        stats['contacts_found'] += 1
+        updated = False
+        if enrichment.get('first_name') and (not contact.first_name or '+1' in contact.first_name):
+            stats['first_names_updated'] += 1
+            updated = True
+        if enrichment.get('last_name') and not contact.last_name:
+            stats['last_names_updated'] += 1
+            updated = True
+        if enrichment.get('email') and not contact.email:
+            if not session.query(Contact).filter_by(email=enrichment['email']).first():
+                stats['emails_updated'] += 1
+                updated = True
+        if any(field in enrichment for field in UniversalCSVEnricher.METADATA_FIELDS):
+            stats['metadata_updated'] += 1
+            updated = True
+        if updated:
+            stats['contacts_updated'] += 1
+    return stats
+
+
+@pytest.fixture
+def enricher(db_session):
+    db_session.add_all([
+        Contact(first_name='+15550300001', last_name='', phone='+15550300001'),
+        Contact(first_name='Known', last_name='Person', phone='+15550300002', email='known@enrich.test',
+                contact_metadata={'source': 'import', 'company': 'Old Co'}),
+        Contact(first_name='', last_name='', phone='+15550300003'),
+        Contact(first_name='Taken', last_name='Email', phone='+15550300004', email='taken@enrich.test'),
+        Contact(first_name='Second', last_name='Claim', phone='+15550300005')
+    ])
+    db_session.commit()
+
+    enricher = UniversalCSVEnricher()
+    enricher.enrichment_data.update({
+        '+15550300001': {'first_name': 'Phone', 'last_name': 'Named', 'email': 'shared@enrich.test', 'role': 'Agent'},
+        '+15550300002': {'first_name': 'Ignored', 'email': 'other@enrich.test', 'company': 'New Co', 'city': 'Boston'},
+        '+15550300003': {'first_name': 'A' * 60, 'email': 'taken@enrich.test'},
+        '+15550300005': {'email': 'shared@enrich.test'},
+        '+15550309999': {'first_name': 'Missing', 'company': 'Nowhere'}
+    })
+    return enricher
+
+
+class TestBulkEnrichment:
+    """Bulk loading and writing with the per-contact fill-only-missing rules"""
+
+    def test_dry_run_stats_match_per_phone_implementation(self, db_session, enricher, query_budget):
+        expected = _legacy_dry_run_stats(enricher, db_session)
+
+        with query_budget(2):
+            stats = enricher.apply_enrichment_to_database(dry_run=True, session=db_session)
+
+        assert stats == expected
+        assert stats == {
+            'contacts_found': 4, 'contacts_updated': 4, 'first_names_updated': 2, 'last_names_updated': 1,
+            'emails_updated': 2, 'metadata_updated': 2
+        }
+        # Nothing written
+        assert db_session.query(Contact).filter_by(phone='+15550300001').one().first_name == '+15550300001'
+
+    def test_live_run_fills_missing_fields_and_merges_metadata(self, db_session, enricher):
+        stats = enricher.apply_enrichment_to_database(dry_run=False, session=db_session)
+
+        contacts = {contact.phone: contact for contact in
+                    db_session.query(Contact).filter(Contact.phone.like('+1555030000%'))}
+        for contact in contacts.values():
+            db_session.refresh(contact)
+
+        renamed = contacts['+15550300001']
+        assert (renamed.first_name, renamed.last_name) == ('Phone', 'Named')
+        assert renamed.email == 'shared@enrich.test'
+        assert renamed.contact_metadata == {'role': 'Agent'}
+
+        known = contacts['+15550300002']
+        assert (known.first_name, known.email) == ('Known', 'known@enrich.test')
+        assert known.contact_metadata == {'source': 'import', 'company': 'New Co', 'city': 'Boston'}
+
+        assert contacts['+15550300003'].first_name == 'A' * 50
+        assert contacts['+15550300003'].email is None
+
+        # The first contact claimed the shared email, so the later one is left alone
+        assert contacts['+15550300005'].email is None
+        assert stats['emails_updated'] == 1
+        assert stats['contacts_updated'] == 3
+
+    def test_compute_updates_only_includes_changed_fields(self, enricher):
+        contacts = {'+15550300002': {'id': 9, 'first_name': 'Known', 'last_name': 'Person',
+                                     'email': 'known@enrich.test', 'contact_metadata': None}}
+
+        updates, stats = enricher.compute_enrichment_updates(contacts, set())
+
+        assert updates == [{'id': 9, 'contact_metadata': {'company': 'New Co', 'city': 'Boston'}}]
+        assert stats['contacts_found'] == 1
@@ -43,7 +43,7 @@ def mock_list_repository():
 def mock_member_repository():
     """Mock CampaignListMemberRepository"""
     mock = Mock(spec=CampaignListMemberRepository)
-    mock.get_membership_stats = Mock()
+    mock.get_stats_by_list = Mock()
     mock.get_contact_ids_in_list = Mock()
     mock.commit = Mock()
     return mock
@@ -83,9 +83,11 @@ class TestCampaignListServiceContactCounts:
         mock_stats = {
             'total': 100,      # Total records in CampaignListMember
             'active': 85,      # Only active members
-            'removed': 15      # Removed/opted-out members
+            'removed': 15,     # Removed/opted-out members
+            'with_email': 0,
+            'with_phone': 0
         }
-        mock_member_repository.get_membership_stats.return_value = mock_stats
+        mock_member_repository.get_stats_by_list.return_value = {list_id: mock_stats}
         
         # Mock get_contact_ids_in_list and get_by_ids for contact stats
         mock_contact_ids = list(range(1, 86))  # 85 active contact IDs
@@ -106,7 +108,7 @@ class TestCampaignListServiceContactCounts:
         assert result.data['total_members'] == 100
         
         # Verify repository was called correctly
-        mock_member_repository.get_membership_stats.assert_called_once_with(list_id)
+        mock_member_repository.get_stats_by_list.assert_called_once_with()
         
         # The key requirement: active_members should NOT equal total_members
         # when there are removed members
@@ -125,9 +127,11 @@ class TestCampaignListServiceContactCounts:
         mock_stats = {
             'total': 50,
             'active': 50,  # All active
-            'removed': 0   # None removed
+            'removed': 0,  # None removed
+            'with_email': 0,
+            'with_phone': 0
         }
-        mock_member_repository.get_membership_stats.return_value = mock_stats
+        mock_member_repository.get_stats_by_list.return_value = {list_id: mock_stats}
         
         # Mock contact retrieval for stats
         mock_contact_ids = list(range(1, 51))  # 50 active contact IDs
@@ -160,9 +164,11 @@ class TestCampaignListServiceContactCounts:
         mock_stats = {
             'total': 0,
             'active': 0,
-            'removed': 0
+            'removed': 0,
+            'with_email': 0,
+            'with_phone': 0
         }
-        mock_member_repository.get_membership_stats.return_value = mock_stats
+        mock_member_repository.get_stats_by_list.return_value = {list_id: mock_stats}
         
         # Mock empty contact list
         mock_member_repository.get_contact_ids_in_list.return_value = []
@@ -186,8 +192,8 @@ class TestCampaignListServiceContactCounts:
         # Arrange
         list_id = 999
         
-        # Mock repository to return None for non-existent list
-        mock_member_repository.get_membership_stats.return_value = None
+        # Mock repository stats without the non-existent list
+        mock_member_repository.get_stats_by_list.return_value = {}
         
         # Act
         result = service.get_list_stats(list_id)
@@ -197,7 +203,7 @@ class TestCampaignListServiceContactCounts:
         assert 'not found' in result.error.lower() or 'does not exist' in result.error.lower()
         
         # Should still call repository to check
-        mock_member_repository.get_membership_stats.assert_called_once_with(list_id)
+        mock_member_repository.get_stats_by_list.assert_called_once_with()
     
     def test_get_list_contacts_returns_only_active_members(self, service, mock_member_repository, mock_contact_repository):
         """
@@ -546,7 +552,7 @@ class TestCampaignListServiceErrorHandling:
         list_id = 1
         
         # Mock repository error
-        mock_member_repository.get_membership_stats.side_effect = Exception("Database connection failed")
+        mock_member_repository.get_stats_by_list.side_effect = Exception("Database connection failed")
         
         # Act
         result = service.get_list_stats(list_id)
@@ -584,8 +590,8 @@ class TestCampaignListServiceErrorHandling:
         # Arrange
         list_id = 1
         
-        # Mock repository returns None
-        mock_member_repository.get_membership_stats.return_value = None
+        # Mock repository returns no lists
+        mock_member_repository.get_stats_by_list.return_value = {}
         
         # Act
         result = service.get_list_stats(list_id)
@@ -262,18 +262,14 @@ class TestCampaignListServiceRefactored:
         mock_contact_repository.get_by_ids.assert_called_once_with(contact_ids)
     
     def test_get_list_stats(self, service, mock_member_repository, mock_contact_repository):
-        """Test getting list statistics"""
+        """Test getting list statistics from the grouped aggregate query"""
         # Arrange
         list_id = 1
-        mock_stats = {'total': 10, 'active': 8, 'removed': 2}
-        contacts = [
-            Mock(email='test1@example.com', phone='+1234567890'),
-            Mock(email=None, phone='+1234567891'),
-            Mock(email='test3@example.com', phone=None)
-        ]
-        
-        mock_member_repository.get_membership_stats.return_value = mock_stats
-        service.get_list_contacts = Mock(return_value=Result.success(contacts))
+        mock_member_repository.get_stats_by_list.return_value = {
+            list_id: {'total': 10, 'active': 8, 'removed': 2, 'with_email': 2, 'with_phone': 2},
+            2: {'total': 0, 'active': 0, 'removed': 0, 'with_email': 0, 'with_phone': 0}
+        }
+        service.get_list_contacts = Mock()
         
         # Act
         result = service.get_list_stats(list_id)
@@ -286,51 +282,40 @@ class TestCampaignListServiceRefactored:
         assert stats['removed_members'] == 2
         assert stats['with_email'] == 2  # 2 contacts have email
         assert stats['with_phone'] == 2  # 2 contacts have phone
+        service.get_list_contacts.assert_not_called()
     
-    def test_find_contacts_by_criteria_csv_import(self, service, mock_contact_repository):
-        """Test finding contacts by CSV import criteria"""
+    def test_list_stats_are_cached_until_membership_changes(self, mock_campaign_list_repository,
+                                                            mock_member_repository, mock_contact_repository):
+        """Test statistics are computed once and recomputed after a membership change"""
         # Arrange
-        criteria = {'csv_import_id': 123}
-        expected_contacts = [Mock() for _ in range(3)]
-        mock_contact_repository.find_by_csv_import.return_value = expected_contacts
+        from services.cache_service import CacheService
+        service = CampaignListServiceRefactored(
+            campaign_list_repository=mock_campaign_list_repository,
+            member_repository=mock_member_repository,
+            contact_repository=mock_contact_repository,
+            cache_service=CacheService()
+        )
+        mock_member_repository.get_stats_by_list.side_effect = [
+            {1: {'total': 1, 'active': 1, 'removed': 0, 'with_email': 1, 'with_phone': 1}},
+            {1: {'total': 1, 'active': 0, 'removed': 1, 'with_email': 0, 'with_phone': 0}}
+        ]
+        mock_member_repository.remove_contacts_from_list.return_value = 1
         
-        # Act
-        result = service.find_contacts_by_criteria(criteria)
+        # Act & Assert
+        assert service.get_all_list_stats().data[1]['active_members'] == 1
+        assert service.get_list_stats(1).data['active_members'] == 1
+        assert mock_member_repository.get_stats_by_list.call_count == 1
         
-        # Assert
-        assert result.is_success
-        assert result.data == expected_contacts
-        mock_contact_repository.find_by_csv_import.assert_called_once_with(123)
+        service.remove_contacts_from_list(1, [5])
+        assert service.get_list_stats(1).data['active_members'] == 0
+        assert mock_member_repository.get_stats_by_list.call_count == 2
     
-    def test_find_contacts_by_criteria_date_range(self, service, mock_contact_repository):
-        """Test finding contacts by date range criteria"""
+    def test_find_contacts_by_criteria_uses_compiled_query(self, service, mock_contact_repository):
+        """Test criteria are passed whole to the compiled repository query"""
         # Arrange
-        start_date = utc_now() - timedelta(days=30)
-        end_date = utc_now()
-        criteria = {
-            'imported_after': start_date.isoformat(),
-            'imported_before': end_date.isoformat()
-        }
-        expected_contacts = [Mock() for _ in range(5)]
-        mock_contact_repository.find_by_date_range.return_value = expected_contacts
-        
-        # Act
-        result = service.find_contacts_by_criteria(criteria)
-        
-        # Assert
-        assert result.is_success
-        assert result.data == expected_contacts
-        mock_contact_repository.find_by_date_range.assert_called_once_with(
-            imported_after=start_date,
-            imported_before=end_date
-        )
-    
-    def test_find_contacts_by_criteria_no_recent_contact(self, service, mock_contact_repository):
-        """Test finding contacts with no recent contact"""
-        # Arrange
-        criteria = {'no_recent_contact': True, 'days_since_contact': 60}
-        expected_contacts = [Mock() for _ in range(10)]
-        mock_contact_repository.find_without_recent_activity.return_value = expected_contacts
+        criteria = {'csv_import_id': 123, 'has_email': True}
+        expected_contacts = [Mock() for _ in range(3)]
+        mock_contact_repository.find_by_list_criteria.return_value = expected_contacts
         
         # Act
         result = service.find_contacts_by_criteria(criteria)
@@ -338,45 +323,34 @@ class TestCampaignListServiceRefactored:
         # Assert
         assert result.is_success
         assert result.data == expected_contacts
-        mock_contact_repository.find_without_recent_activity.assert_called_once_with(60)
+        mock_contact_repository.find_by_list_criteria.assert_called_once_with(criteria)
     
-    def test_find_contacts_by_criteria_exclude_opted_out(self, service, mock_contact_repository):
-        """Test finding contacts excluding opted out"""
+    def test_find_contacts_by_criteria_failure(self, service, mock_contact_repository):
+        """Test repository errors become a failure result"""
         # Arrange
-        criteria = {'exclude_opted_out': True}
-        expected_contacts = [Mock() for _ in range(15)]
-        mock_contact_repository.find_not_opted_out.return_value = expected_contacts
+        mock_contact_repository.find_by_list_criteria.side_effect = Exception("bad criteria")
         
         # Act
-        result = service.find_contacts_by_criteria(criteria)
+        result = service.find_contacts_by_criteria({'imported_after': 'not a date'})
         
         # Assert
-        assert result.is_success
-        assert result.data == expected_contacts
-        mock_contact_repository.find_not_opted_out.assert_called_once()
+        assert result.is_failure
+        assert 'bad criteria' in result.error
     
     def test_refresh_dynamic_list(self, service, mock_campaign_list_repository, mock_member_repository, mock_contact_repository):
-        """Test refreshing a dynamic list"""
+        """Test refreshing a dynamic list syncs members against the compiled criteria query"""
         # Arrange
         list_id = 1
         dynamic_list = Mock()
         dynamic_list.id = list_id
         dynamic_list.is_dynamic = True
-        dynamic_list.filter_criteria = {'source': 'test'}
-        
-        # Mock current members
-        current_contact_ids = [10, 11, 12]
-        # Mock matching contacts from criteria
-        matching_contacts = [Mock(id=11), Mock(id=12), Mock(id=13)]
+        dynamic_list.filter_criteria = {'has_email': True}
+        matching_query = Mock(name='criteria_query')
         
         mock_campaign_list_repository.get_by_id.return_value = dynamic_list
-        mock_member_repository.get_contact_ids_in_list.return_value = current_contact_ids
-        service.find_contacts_by_criteria = Mock(return_value=Result.success(matching_contacts))
-        
-        # Mock member operations
-        created_member = Mock()
-        mock_member_repository.create.return_value = created_member
-        mock_member_repository.remove_contacts_from_list.return_value = 1
+        mock_contact_repository.build_list_criteria_query.return_value = matching_query
+        mock_member_repository.sync_members.return_value = {'added': 1, 'removed': 1}
+        mock_member_repository.count.return_value = 3
         mock_campaign_list_repository.update.return_value = dynamic_list
         
         # Act
@@ -384,18 +358,25 @@ class TestCampaignListServiceRefactored:
         
         # Assert
         assert result.is_success
-        stats = result.data
-        assert stats['added'] == 1  # Contact 13 is new
-        assert stats['removed'] == 1  # Contact 10 is no longer matching
-        assert stats['total'] == 3  # Total matching contacts
+        assert result.data == {'added': 1, 'removed': 1, 'total': 3}
+        mock_contact_repository.build_list_criteria_query.assert_called_once_with({'has_email': True})
+        mock_member_repository.sync_members.assert_called_once_with(list_id, matching_query, added_by='system_dynamic')
+        mock_member_repository.count.assert_called_once_with(list_id=list_id, status='active')
+        mock_member_repository.get_contact_ids_in_list.assert_not_called()
+        mock_member_repository.create.assert_not_called()
+        mock_campaign_list_repository.commit.assert_called_once()
+    
+    def test_get_dynamic_list_ids(self, service, mock_campaign_list_repository):
+        """Test the ids of dynamic lists are returned for scheduled refreshes"""
+        # Arrange
+        mock_campaign_list_repository.find_dynamic_lists.return_value = [Mock(id=4), Mock(id=9)]
         
-        # Verify repository calls
-        mock_member_repository.create.assert_called_once_with(
-            list_id=list_id,
-            contact_id=13,
-            added_by='system_dynamic'
-        )
-        mock_member_repository.remove_contacts_from_list.assert_called_once_with(list_id, [10])
+        # Act
+        result = service.get_dynamic_list_ids()
+        
+        # Assert
+        assert result.is_success
+        assert result.data == [4, 9]
     
     def test_refresh_non_dynamic_list(self, service, mock_campaign_list_repository):
         """Test refreshing a non-dynamic list (should fail)"""
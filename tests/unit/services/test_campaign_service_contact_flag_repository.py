@@ -59,181 +59,42 @@ class TestCampaignServiceContactFlagIntegration:
         assert hasattr(campaign_service, 'contact_flag_repository')
         assert campaign_service.contact_flag_repository is not None
     
-    def test_get_eligible_contacts_uses_contact_flag_repository(self, campaign_service, 
-                                                                mock_contact_repository,
-                                                                mock_contact_flag_repository):
-        """Test that get_eligible_contacts uses ContactFlagRepository instead of direct queries"""
+    def test_get_eligible_contacts_excludes_flags_in_the_audience_query(self, campaign_service,
+                                                                        mock_contact_repository,
+                                                                        mock_contact_flag_repository):
+        """Flag exclusions are compiled into the contact audience query, not loaded as id sets"""
         # Arrange
-        contacts = [
-            Mock(id=101, first_name='John', last_name='Doe'),
-            Mock(id=102, first_name='Jane', last_name='Smith'),
-            Mock(id=103, first_name='Bob', last_name='Johnson'),
-            Mock(id=104, first_name='Alice', last_name='Brown')
-        ]
-        
-        mock_contact_repository.get_all.return_value = contacts
-        
-        # Mock that contact 102 and 104 are office numbers
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.return_value = {102, 104}
-        
-        filters = {'exclude_office_numbers': True}
-        
-        # Act
-        result = campaign_service.get_eligible_contacts(filters)
-        
-        # Assert - ContactFlagRepository should be called, not direct session query
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.assert_called_once_with('office_number')
-        
-        # Result should exclude contacts 102 and 104
-        result_ids = [c.id for c in result]
-        assert 102 not in result_ids
-        assert 104 not in result_ids
-        assert 101 in result_ids
-        assert 103 in result_ids
-    
-    def test_get_eligible_contacts_excludes_opted_out_via_repository(self, campaign_service,
-                                                                     mock_contact_repository,
-                                                                     mock_contact_flag_repository):
-        """Test that opted-out contacts are excluded using ContactFlagRepository"""
-        # Arrange
-        contacts = [
-            Mock(id=201, first_name='User1'),
-            Mock(id=202, first_name='User2'),
-            Mock(id=203, first_name='User3')
-        ]
-        
-        mock_contact_repository.get_all.return_value = contacts
-        
-        # Mock that contact 202 is opted out
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.return_value = {202}
-        
-        filters = {'exclude_opted_out': True}
-        
-        # Act
-        result = campaign_service.get_eligible_contacts(filters)
-        
-        # Assert
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.assert_called_once_with('opted_out')
-        
-        result_ids = [c.id for c in result]
-        assert 202 not in result_ids
-        assert 201 in result_ids
-        assert 203 in result_ids
-    
-    def test_get_eligible_contacts_excludes_do_not_contact_via_repository(self, campaign_service,
-                                                                          mock_contact_repository,
-                                                                          mock_contact_flag_repository):
-        """Test that do_not_contact flags are excluded using ContactFlagRepository"""
-        # Arrange
-        contacts = [Mock(id=301), Mock(id=302), Mock(id=303)]
-        mock_contact_repository.get_all.return_value = contacts
-        
-        # Mock that contact 301 has do_not_contact flag
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.return_value = {301}
-        
-        filters = {'exclude_do_not_contact': True}
-        
-        # Act
-        result = campaign_service.get_eligible_contacts(filters)
-        
-        # Assert
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.assert_called_once_with('do_not_contact')
-        
-        result_ids = [c.id for c in result]
-        assert 301 not in result_ids
-    
-    def test_get_eligible_contacts_excludes_recently_contacted_via_repository(self, campaign_service,
-                                                                              mock_contact_repository,
-                                                                              mock_contact_flag_repository):
-        """Test that recently contacted flags are excluded using ContactFlagRepository"""
-        # Arrange
-        contacts = [Mock(id=401), Mock(id=402)]
-        mock_contact_repository.get_all.return_value = contacts
-        
-        # Mock that contact 401 was recently contacted
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.return_value = {401}
-        
-        filters = {'exclude_recently_contacted': True}
-        
-        # Act
-        result = campaign_service.get_eligible_contacts(filters)
-        
-        # Assert
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.assert_called_once_with('recently_texted')
-        
-        result_ids = [c.id for c in result]
-        assert 401 not in result_ids
-        assert 402 in result_ids
-    
-    def test_get_eligible_contacts_combines_multiple_flag_exclusions(self, campaign_service,
-                                                                     mock_contact_repository,
-                                                                     mock_contact_flag_repository):
-        """Test that multiple flag types can be excluded in one call"""
-        # Arrange
-        contacts = [Mock(id=i) for i in range(501, 511)]  # 10 contacts
-        mock_contact_repository.get_all.return_value = contacts
-        
-        # Mock different flag types returning different contact sets
-        def mock_get_contact_ids(flag_type):
-            flag_map = {
-                'opted_out': {501, 502},
-                'office_number': {503, 504},
-                'do_not_contact': {505}
-            }
-            return flag_map.get(flag_type, set())
-        
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.side_effect = mock_get_contact_ids
-        
         filters = {
             'exclude_opted_out': True,
             'exclude_office_numbers': True,
-            'exclude_do_not_contact': True
+            'exclude_do_not_contact': True,
+            'exclude_recently_contacted': True
         }
+        mock_contact_repository.iter_audience_ids.return_value = iter([[506, 507]])
+        mock_contact_repository.get_by_ids.return_value = [
+            Mock(id=506, first_name='A', last_name='B', phone='+15550000506', email=None),
+            Mock(id=507, first_name='C', last_name='D', phone='+15550000507', email=None)
+        ]
         
         # Act
         result = campaign_service.get_eligible_contacts(filters)
         
         # Assert
-        # Should have called repository for each flag type
-        assert mock_contact_flag_repository.get_contact_ids_with_flag_type.call_count == 3
-        
-        # Should exclude contacts 501, 502, 503, 504, 505
-        result_ids = [c.id for c in result]
-        excluded_ids = {501, 502, 503, 504, 505}
-        for excluded_id in excluded_ids:
-            assert excluded_id not in result_ids
-        
-        # Should include contacts 506-510
-        included_ids = {506, 507, 508, 509, 510}
-        for included_id in included_ids:
-            assert included_id in result_ids
+        mock_contact_repository.iter_audience_ids.assert_called_once_with(filters)
+        mock_contact_flag_repository.get_contact_ids_with_flag_type.assert_not_called()
+        mock_contact_repository.get_all.assert_not_called()
+        assert [contact['id'] for contact in result] == [506, 507]
     
     def test_campaign_service_no_direct_session_queries_for_contact_flags(self, campaign_service):
         """Test that CampaignService doesn't make direct session queries for ContactFlag"""
-        # This test enforces that NO direct queries to ContactFlag are made
         # The refactored service correctly doesn't have a session attribute
-        
-        # Arrange - Verify service has no direct session access
         assert not hasattr(campaign_service, 'session'), "CampaignService should not have direct session access"
         
-        # Mock contacts
-        contacts = [Mock(id=601), Mock(id=602)]
-        campaign_service.contact_repository.get_all.return_value = contacts
-        
-        # Mock flag repository calls
-        campaign_service.contact_flag_repository.get_contact_ids_with_flag_type.return_value = set()
-        
-        filters = {'exclude_office_numbers': True}
-        
-        # Act
-        result = campaign_service.get_eligible_contacts(filters)
+        campaign_service.contact_repository.iter_audience_ids.return_value = iter([])
         
-        # Assert - Service uses repository pattern correctly
-        assert result is not None
-        campaign_service.contact_flag_repository.get_contact_ids_with_flag_type.assert_called_once_with('office_number')
+        result = campaign_service.get_eligible_contacts({'exclude_office_numbers': True})
         
-        # Assert - The service correctly doesn't have direct database access
-        # This confirms the repository pattern is being used properly
+        assert result == []
         assert not hasattr(campaign_service, 'session'), "Service should use repositories, not direct session access"
     
     def test_create_campaign_flags_recently_contacted(self, campaign_service, 
@@ -214,19 +214,14 @@ class TestCampaignServiceUnit:
     # ========== RECIPIENT MANAGEMENT TESTS ==========
     
     def test_add_recipients_from_list_success(self, campaign_service, mock_campaign_repository, 
-                                            mock_list_service, sample_contact):
-        """Test successfully adding recipients from a campaign list"""
+                                            mock_list_service):
+        """Test list enrollment runs in the repository without loading list contacts"""
         # Arrange
         campaign_id = 1
         list_id = 1
-        contacts = [sample_contact]
-        contact_ids = [sample_contact.id]
-        
-        # Mock the list service to return a Result.success
-        from services.common.result import Result
-        mock_list_service.get_list_contacts.return_value = Result.success(contacts)
-        mock_campaign_repository.add_members_bulk.return_value = 1
-        mock_campaign_repository.get_by_id.return_value = Mock(spec=Campaign)
+        campaign = Mock(spec=Campaign)
+        mock_campaign_repository.get_by_id.return_value = campaign
+        mock_campaign_repository.enroll_from_list.return_value = 1
         
         # Act
         result = campaign_service.add_recipients_from_list(campaign_id, list_id)
@@ -234,45 +229,62 @@ class TestCampaignServiceUnit:
         # Assert
         assert result.is_success
         assert result.data == 1
-        mock_list_service.get_list_contacts.assert_called_once_with(list_id)
-        mock_campaign_repository.add_members_bulk.assert_called_once_with(campaign_id, contact_ids)
-        mock_campaign_repository.get_by_id.assert_called_once_with(campaign_id)
+        mock_campaign_repository.enroll_from_list.assert_called_once_with(campaign_id, list_id, None)
+        mock_list_service.get_list_contacts.assert_not_called()
+        mock_campaign_repository.add_members_bulk.assert_not_called()
+        assert campaign.list_id == list_id
         mock_campaign_repository.commit.assert_called_once()
     
-    def test_add_recipients_from_list_no_list_service(self, campaign_service):
-        """Test adding recipients fails when list service is not provided"""
+    def test_add_recipients_from_list_assigns_ab_variants(self, campaign_service, mock_campaign_repository):
+        """Test A/B campaigns pass their current split to the enrollment insert"""
+        # Arrange
+        campaign = Mock(spec=Campaign, campaign_type='ab_test', ab_config={'current_split': 70})
+        mock_campaign_repository.get_by_id.return_value = campaign
+        mock_campaign_repository.enroll_from_list.return_value = 10
+        
+        # Act
+        result = campaign_service.add_recipients_from_list(1, 2, assign_variants=True)
+        
+        # Assert
+        assert result.is_success
+        mock_campaign_repository.enroll_from_list.assert_called_once_with(1, 2, 70)
+    
+    def test_add_recipients_from_list_failure(self, campaign_service, mock_campaign_repository):
+        """Test enrollment errors are returned as a failure result"""
         # Arrange
-        campaign_service.list_service = None
+        mock_campaign_repository.get_by_id.return_value = Mock(spec=Campaign)
+        mock_campaign_repository.enroll_from_list.side_effect = Exception("database unavailable")
         
         # Act
         result = campaign_service.add_recipients_from_list(1, 1)
         
         # Assert
         assert result.is_failure
-        assert "CampaignListService not provided" in result.error
+        assert "database unavailable" in result.error
     
     def test_add_recipients_with_filters_success(self, campaign_service, mock_campaign_repository, 
-                                               mock_contact_repository, sample_contact):
-        """Test adding recipients based on contact filters"""
+                                               mock_contact_repository):
+        """Test adding recipients enrolls the audience query in one insert"""
         # Arrange
         campaign_id = 1
         filters = {'has_name_only': True, 'exclude_opted_out': True}
-        contacts = [sample_contact]
-        contact_ids = [sample_contact.id]
+        audience = Mock(name='audience_query')
         
         mock_campaign_repository.get_by_id.return_value = Mock(spec=Campaign)
-        mock_contact_repository.get_all.return_value = contacts
-        mock_contact_repository.get_opted_out_contacts.return_value = []
-        mock_campaign_repository.add_members_bulk.return_value = 1
+        mock_contact_repository.build_audience_query.return_value = audience
+        mock_campaign_repository.enroll_contacts.return_value = 3
         
         # Act
         result = campaign_service.add_recipients(campaign_id, filters)
         
         # Assert
-        assert result == 1
+        assert result == 3
         mock_campaign_repository.get_by_id.assert_called_once_with(campaign_id)
-        mock_campaign_repository.add_members_bulk.assert_called_once_with(campaign_id, contact_ids)
+        mock_contact_repository.build_audience_query.assert_called_once_with(filters)
+        mock_campaign_repository.enroll_contacts.assert_called_once_with(campaign_id, audience, None)
         mock_campaign_repository.commit.assert_called_once()
+        mock_contact_repository.iter_audience_ids.assert_not_called()
+        mock_contact_repository.get_all.assert_not_called()
     
     def test_add_recipients_campaign_not_found(self, campaign_service, mock_campaign_repository):
         """Test adding recipients fails when campaign doesn't exist"""
@@ -285,371 +297,41 @@ class TestCampaignServiceUnit:
         with pytest.raises(ValueError, match="Campaign 999 not found"):
             campaign_service.add_recipients(campaign_id, filters)
     
-    def test_get_filtered_contacts_has_name_only(self, campaign_service, mock_contact_repository):
-        """Test filtering contacts with real names only"""
-        # Arrange
-        contact_with_name = Mock(spec=Contact)
-        contact_with_name.id = 1
-        contact_with_name.first_name = 'John'
-        
-        contact_with_phone = Mock(spec=Contact)
-        contact_with_phone.id = 2
-        contact_with_phone.first_name = '+15551234567'
-        
-        mock_contact_repository.get_all.return_value = [contact_with_name, contact_with_phone]
-        filters = {'has_name_only': True}
+    def test_get_eligible_contacts_returns_dicts_in_id_order(self, campaign_service, mock_contact_repository):
+        """Eligible contacts are resolved by the audience query and loaded chunk by chunk"""
+        contacts = {
+            contact_id: Mock(id=contact_id, first_name=f'Name{contact_id}', last_name='Doe',
+                             phone=f'+1555000000{contact_id}', email=None)
+            for contact_id in (1, 2, 3)
+        }
+        filters = {'has_name_only': True, 'exclude_opted_out': True}
+        mock_contact_repository.iter_audience_ids.return_value = iter([[1, 2], [3]])
+        mock_contact_repository.get_by_ids.side_effect = lambda ids: [contacts[i] for i in reversed(ids)]
         
-        # Act
-        result = campaign_service._get_filtered_contacts(filters)
+        result = campaign_service.get_eligible_contacts(filters)
         
-        # Assert
-        assert len(result) == 1
-        assert result[0] == contact_with_name
+        assert [contact['id'] for contact in result] == [1, 2, 3]
+        assert result[0] == {'id': 1, 'first_name': 'Name1', 'last_name': 'Doe',
+                             'phone': '+15550000001', 'email': None}
+        mock_contact_repository.iter_audience_ids.assert_called_once_with(filters)
+        mock_contact_repository.get_all.assert_not_called()
     
-    def test_get_filtered_contacts_has_email(self, campaign_service, mock_contact_repository):
-        """Test filtering contacts with email addresses"""
-        # Arrange
-        contact_with_email = Mock(spec=Contact)
-        contact_with_email.id = 1
-        contact_with_email.email = 'john@example.com'
-        
-        contact_no_email = Mock(spec=Contact)
-        contact_no_email.id = 2
-        contact_no_email.email = None
-        
-        mock_contact_repository.get_all.return_value = [contact_with_email, contact_no_email]
+    def test_preview_audience_counts_without_loading_contacts(self, campaign_service, mock_contact_repository, sample_contact):
+        """Test the audience preview uses a count and a small sample"""
         filters = {'has_email': True}
+        mock_contact_repository.count_audience.return_value = 4200
+        mock_contact_repository.find_audience_sample.return_value = [sample_contact]
         
-        # Act
-        result = campaign_service._get_filtered_contacts(filters)
-        
-        # Assert
-        assert len(result) == 1
-        assert result[0] == contact_with_email
-    
-    def test_get_filtered_contacts_exclude_opted_out(self, campaign_service, mock_contact_repository, mock_contact_flag_repository):
-        """Test filtering out opted-out contacts using ContactFlagRepository"""
-        # Arrange
-        good_contact = Mock(spec=Contact)
-        good_contact.id = 1
-        
-        opted_out_contact = Mock(spec=Contact)
-        opted_out_contact.id = 2
-        
-        mock_contact_repository.get_all.return_value = [good_contact, opted_out_contact]
-        # Mock that contact 2 is opted out via ContactFlagRepository
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.return_value = {2}
-        filters = {'exclude_opted_out': True}
-        
-        # Act
-        result = campaign_service._get_filtered_contacts(filters)
-        
-        # Assert
-        assert len(result) == 1
-        assert result[0] == good_contact
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.assert_called_once_with('opted_out')
-    
-    # ========== TESTS FOR OFFICE NUMBER FILTERING (TDD - REPOSITORY PATTERN ENFORCEMENT) ==========
-    # These tests MUST FAIL initially (RED phase) to prove repository pattern violation exists
-    
-    def test_get_filtered_contacts_exclude_office_numbers_uses_repository_pattern(self, campaign_service, mock_contact_repository, mock_contact_flag_repository):
-        """Test that exclude_office_numbers filter now uses ContactFlagRepository correctly
-        
-        This test was updated after fixing the repository pattern violation.
-        FIXED: Now uses ContactFlagRepository.get_contact_ids_with_flag_type('office_number')
-        instead of direct session.query(ContactFlag)
-        """
-        # Arrange
-        contact1 = Mock(spec=Contact)
-        contact1.id = 1
-        contact1.first_name = 'John'
-        contact1.phone = '+15551234567'
-        
-        contact2 = Mock(spec=Contact)  # Office number contact
-        contact2.id = 2
-        contact2.first_name = 'Business'
-        contact2.phone = '+15559876543'
-        
-        contact3 = Mock(spec=Contact)
-        contact3.id = 3
-        contact3.first_name = 'Jane'
-        contact3.phone = '+15555555555'
-        
-        all_contacts = [contact1, contact2, contact3]
-        mock_contact_repository.get_all.return_value = all_contacts
-        
-        # Mock that contact 2 is flagged as office number via ContactFlagRepository
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.return_value = {2}
-        
-        filters = {'exclude_office_numbers': True}
-        
-        # Act
-        result = campaign_service._get_filtered_contacts(filters)
-        
-        # Assert
-        # Should exclude contact2 (office number)
-        assert len(result) == 2
-        result_ids = {contact.id for contact in result}
-        assert 1 in result_ids
-        assert 3 in result_ids
-        assert 2 not in result_ids  # Office number excluded
-        
-        # Verify that ContactFlagRepository was used correctly (FIXED VIOLATION)
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.assert_called_once_with('office_number')
-    
-    def test_get_filtered_contacts_exclude_office_numbers_expected_repository_interface(self, campaign_service, mock_contact_repository, mock_contact_flag_repository):
-        """Test office number filtering using the actual repository pattern implementation"""
-        # Arrange
-        regular_contact = Mock(spec=Contact)
-        regular_contact.id = 1
-        regular_contact.first_name = 'John'
-        regular_contact.phone = '+15551234567'
-        
-        office_contact = Mock(spec=Contact)
-        office_contact.id = 2
-        office_contact.first_name = 'Main Office'
-        office_contact.phone = '+15559876543'
-        
-        another_regular = Mock(spec=Contact)
-        another_regular.id = 3
-        another_regular.first_name = 'Jane'
-        another_regular.phone = '+15555555555'
-        
-        all_contacts = [regular_contact, office_contact, another_regular]
-        mock_contact_repository.get_all.return_value = all_contacts
-        
-        # Set up flag repository to return office contact ID
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.return_value = {2}  # office_contact ID
-        
-        filters = {'exclude_office_numbers': True}
-        
-        # Act
-        result = campaign_service._get_filtered_contacts(filters)
-        
-        # Assert
-        assert len(result) == 2, "Should exclude office_contact and return 2 contacts"
-        assert regular_contact in result, "Should include regular_contact"
-        assert another_regular in result, "Should include another_regular"
-        assert office_contact not in result, "Should exclude office_contact"
-        
-        # Verify repository method is called correctly
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.assert_called_once_with('office_number')
-    
-    def test_get_filtered_contacts_exclude_office_numbers_no_office_numbers_flagged(self, campaign_service, mock_contact_repository, mock_contact_flag_repository):
-        """Test exclude_office_numbers filter when no contacts are flagged as office numbers"""
-        # Arrange
-        contact1 = Mock(spec=Contact)
-        contact1.id = 1
-        contact1.first_name = 'Alice'
-        
-        contact2 = Mock(spec=Contact)
-        contact2.id = 2
-        contact2.first_name = 'Bob'
-        
-        contact3 = Mock(spec=Contact)
-        contact3.id = 3
-        contact3.first_name = 'Charlie'
+        result = campaign_service.preview_audience(filters, sample_size=3)
         
-        all_contacts = [contact1, contact2, contact3]
-        mock_contact_repository.get_all.return_value = all_contacts
-        
-        # No office numbers flagged - empty set
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.return_value = set()
-        
-        filters = {'exclude_office_numbers': True}
-        
-        # Act
-        result = campaign_service._get_filtered_contacts(filters)
-        
-        # Assert - should return all contacts since none are flagged
-        assert len(result) == 3, "Should return all contacts when none are flagged"
-        assert all(contact in result for contact in all_contacts), \
-               "All contacts should be included when no office numbers exist"
-        
-        # Repository method should be called
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.assert_called_once_with('office_number')
-    
-    def test_get_filtered_contacts_exclude_office_numbers_all_contacts_are_flagged(self, campaign_service, mock_contact_repository, mock_contact_flag_repository):
-        """Test exclude_office_numbers filter when all contacts are flagged as office numbers"""
-        # Arrange
-        office1 = Mock(spec=Contact)
-        office1.id = 1
-        office1.first_name = 'Main Office'
-        
-        office2 = Mock(spec=Contact)
-        office2.id = 2
-        office2.first_name = 'Branch Office'
-        
-        office3 = Mock(spec=Contact)
-        office3.id = 3
-        office3.first_name = 'Corporate Line'
-        
-        all_contacts = [office1, office2, office3]
-        mock_contact_repository.get_all.return_value = all_contacts
-        
-        # All contacts are flagged as office numbers
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.return_value = {1, 2, 3}
-        
-        filters = {'exclude_office_numbers': True}
-        
-        # Act
-        result = campaign_service._get_filtered_contacts(filters)
-        
-        # Assert - should return empty list since all contacts are excluded
-        assert len(result) == 0, "Should return empty list when all contacts are office numbers"
-        assert result == [], "Result should be empty list"
-        
-        # Repository method should be called
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.assert_called_once_with('office_number')
+        assert result['total_count'] == 4200
+        assert result['sample_contacts'] == [{'id': 1, 'first_name': 'John', 'last_name': 'Doe',
+                                              'phone': '+15551234567', 'email': 'john@example.com'}]
+        mock_contact_repository.count_audience.assert_called_once_with(filters)
+        mock_contact_repository.find_audience_sample.assert_called_once_with(filters, limit=3)
+        mock_contact_repository.get_all.assert_not_called()
     
-    def test_get_filtered_contacts_exclude_office_numbers_combined_with_other_filters(self, campaign_service, mock_contact_repository, mock_contact_flag_repository):
-        """Test exclude_office_numbers filter combined with other filters
-        
-        This comprehensive test ensures the office number filtering works correctly
-        when combined with other filter types in a realistic campaign scenario.
-        """
-        # Arrange
-        good_contact = Mock(spec=Contact)
-        good_contact.id = 1
-        good_contact.first_name = 'John'
-        good_contact.email = 'john@example.com'
-        
-        office_contact = Mock(spec=Contact)
-        office_contact.id = 2
-        office_contact.first_name = 'Main Office'
-        office_contact.email = 'office@business.com'
-        
-        no_email_contact = Mock(spec=Contact)
-        no_email_contact.id = 3
-        no_email_contact.first_name = 'NoEmail'
-        no_email_contact.email = None
-        
-        opted_out_contact = Mock(spec=Contact)
-        opted_out_contact.id = 4
-        opted_out_contact.first_name = 'OptedOut'
-        opted_out_contact.email = 'opted@example.com'
-        
-        office_with_no_email = Mock(spec=Contact)
-        office_with_no_email.id = 5
-        office_with_no_email.first_name = 'Branch Office'
-        office_with_no_email.email = None
-        
-        all_contacts = [good_contact, office_contact, no_email_contact, opted_out_contact, office_with_no_email]
-        mock_contact_repository.get_all.return_value = all_contacts
-        
-        # Set up flag repository to return flagged contact IDs
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.side_effect = lambda flag_type: {
-            'office_number': {2, 5},  # office_contact and office_with_no_email
-            'opted_out': {4}  # opted_out_contact
-        }.get(flag_type, set())
-        
-        filters = {
-            'exclude_office_numbers': True,
-            'has_email': True,
-            'exclude_opted_out': True
-        }
-        
-        # Act
-        result = campaign_service._get_filtered_contacts(filters)
-        
-        # Assert
-        # Expected result analysis:
-        # - good_contact: ✓ has email, ✓ not opted out, ✓ not office number = INCLUDED
-        # - office_contact: ✓ has email, ✓ not opted out, ✗ is office number = EXCLUDED
-        # - no_email_contact: ✗ no email, ✓ not opted out, ✓ not office number = EXCLUDED
-        # - opted_out_contact: ✓ has email, ✗ is opted out, ✓ not office number = EXCLUDED
-        # - office_with_no_email: ✗ no email, ✓ not opted out, ✗ is office number = EXCLUDED
-        
-        assert len(result) == 1, f"Expected 1 contact, got {len(result)}"
-        assert result[0] == good_contact, "Only good_contact should meet all criteria"
-        
-        # Verify repository methods were called correctly
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.assert_any_call('office_number')
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.assert_any_call('opted_out')
-    
-    def test_get_filtered_contacts_exclude_office_numbers_uses_correct_repository_interface(self, campaign_service, mock_contact_repository, mock_contact_flag_repository):
-        """Test that the service correctly uses ContactFlagRepository for office number filtering
-        
-        This test verifies the service properly uses the repository pattern
-        and calls the correct repository methods.
-        """
-        # Arrange
-        contact1 = Mock(spec=Contact)
-        contact1.id = 1
-        contact1.first_name = 'Regular'
-        
-        contact2 = Mock(spec=Contact)
-        contact2.id = 2
-        contact2.first_name = 'Office'
-        
-        all_contacts = [contact1, contact2]
-        mock_contact_repository.get_all.return_value = all_contacts
-        
-        # Set up the correct repository interface
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.return_value = {2}  # office contact ID
-        
-        filters = {'exclude_office_numbers': True}
-        
-        # Act
-        result = campaign_service._get_filtered_contacts(filters)
-        
-        # Assert - Verify correct repository usage
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.assert_called_once_with('office_number')
-        
-        # Verify the filtering worked correctly
-        assert len(result) == 1, "Should exclude office contact"
-        assert result[0] == contact1, "Should return non-office contact"
-    
-    
-    def test_get_filtered_contacts_exclude_office_numbers_edge_cases(self, campaign_service, mock_contact_repository, mock_contact_flag_repository):
-        """Test edge cases for office number filtering"""
-        # Test case 1: Empty contact list
-        mock_contact_repository.get_all.return_value = []
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.return_value = set()
-        
-        result = campaign_service._get_filtered_contacts({'exclude_office_numbers': True})
-        assert result == [], "Should handle empty contact list"
-        
-        # Test case 2: No office numbers flagged
-        contact1 = Mock(spec=Contact)
-        contact1.id = 1
-        contact1.first_name = 'Regular'
-        
-        mock_contact_repository.get_all.return_value = [contact1]
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.return_value = set()
-        
-        result = campaign_service._get_filtered_contacts({'exclude_office_numbers': True})
-        assert len(result) == 1, "Should return all contacts when none flagged"
-        assert result[0] == contact1
-        
-        # Test case 3: All contacts flagged
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.return_value = {1}
-        
-        result = campaign_service._get_filtered_contacts({'exclude_office_numbers': True})
-        assert result == [], "Should return empty list when all contacts flagged"
 
-    def test_get_filtered_contacts_exclude_office_numbers_performance_with_large_dataset(self, campaign_service, mock_contact_repository, mock_contact_flag_repository):
-        """Test filtering performance with large contact dataset"""
-        # Create 1000 test contacts
-        contacts = []
-        for i in range(1000):
-            contact = Mock(spec=Contact)
-            contact.id = i + 1
-            contact.first_name = f'Contact{i + 1}'
-            contacts.append(contact)
-        
-        mock_contact_repository.get_all.return_value = contacts
-        # First 100 are office numbers
-        office_ids = set(range(1, 101))
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.return_value = office_ids
-        
-        result = campaign_service._get_filtered_contacts({'exclude_office_numbers': True})
-        
-        # Should exclude 100 office contacts, return 900 regular contacts
-        assert len(result) == 900, f"Expected 900 contacts, got {len(result)}"
-        
-        # Verify repository was called correctly
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.assert_called_once_with('office_number')
     # ========== CAMPAIGN STATUS MANAGEMENT TESTS ==========
     
     def test_activate_campaign_success(self, campaign_service, mock_campaign_repository):
@@ -1178,99 +860,6 @@ class TestCampaignServiceUnit:
         # Assert
         assert result == campaigns
         mock_campaign_repository.get_campaigns_needing_send.assert_called_once()
-    
-    def test_min_days_since_contact_filter(self, campaign_service, mock_contact_repository, mock_contact_flag_repository):
-        """Test filtering contacts by minimum days since last contact"""
-        # Arrange
-        # Create mock contacts
-        c1 = Mock(spec=Contact)
-        c1.id = 1
-        c1.phone = '+15551111111'
-        c1.first_name = 'Recent'
-        
-        c2 = Mock(spec=Contact)
-        c2.id = 2
-        c2.phone = '+15552222222'
-        c2.first_name = 'Old'
-        
-        c3 = Mock(spec=Contact)
-        c3.id = 3
-        c3.phone = '+15553333333'
-        c3.first_name = 'Never'
-        
-        mock_contact_repository.get_all.return_value = [c1, c2, c3]
-        
-        # Create mock flags - c1 contacted 3 days ago, c2 contacted 10 days ago, c3 never contacted
-        flag1 = Mock(spec=ContactFlag)
-        flag1.contact_id = 1
-        flag1.flag_type = 'recently_texted'
-        flag1.created_at = utc_now() - timedelta(days=3)
-        
-        flag2 = Mock(spec=ContactFlag)
-        flag2.contact_id = 2
-        flag2.flag_type = 'recently_texted'
-        flag2.created_at = utc_now() - timedelta(days=10)
-        
-        mock_contact_flag_repository.find_by_flag_type.return_value = [flag1, flag2]
-        
-        # Act - filter with 7 days minimum
-        filters = {'min_days_since_contact': 7}
-        result = campaign_service._get_filtered_contacts(filters)
-        
-        # Assert - c1 should be excluded (contacted 3 days ago), c2 and c3 should be included
-        assert len(result) == 2
-        assert c1 not in result
-        assert c2 in result  # Contacted 10 days ago, which is > 7
-        assert c3 in result  # Never contacted
-        mock_contact_flag_repository.find_by_flag_type.assert_called_once_with('recently_texted')
-    
-    def test_min_days_since_contact_filter_edge_case(self, campaign_service, mock_contact_repository, mock_contact_flag_repository):
-        """Test edge case where contact was contacted exactly on the cutoff day"""
-        # Arrange
-        c1 = Mock(spec=Contact)
-        c1.id = 1
-        c1.phone = '+15551111111'
-        
-        mock_contact_repository.get_all.return_value = [c1]
-        
-        # Contact was contacted exactly 7 days ago
-        flag = Mock(spec=ContactFlag)
-        flag.contact_id = 1
-        flag.flag_type = 'recently_texted'
-        flag.created_at = utc_now() - timedelta(days=7)
-        
-        mock_contact_flag_repository.find_by_flag_type.return_value = [flag]
-        
-        # Act
-        filters = {'min_days_since_contact': 7}
-        result = campaign_service._get_filtered_contacts(filters)
-        
-        # Assert - contact should be included (exactly 7 days is NOT within the cutoff)
-        assert len(result) == 1
-        assert c1 in result
-    
-    def test_min_days_since_contact_filter_no_flags(self, campaign_service, mock_contact_repository, mock_contact_flag_repository):
-        """Test filter when no contact has been recently texted"""
-        # Arrange
-        c1 = Mock(spec=Contact)
-        c1.id = 1
-        c1.phone = '+15551111111'
-        
-        c2 = Mock(spec=Contact)
-        c2.id = 2
-        c2.phone = '+15552222222'
-        
-        mock_contact_repository.get_all.return_value = [c1, c2]
-        mock_contact_flag_repository.find_by_flag_type.return_value = []  # No flags
-        
-        # Act
-        filters = {'min_days_since_contact': 30}
-        result = campaign_service._get_filtered_contacts(filters)
-        
-        # Assert - all contacts should be included when no flags exist
-        assert len(result) == 2
-        assert c1 in result
-        assert c2 in result
 
 
 # ========== FACTORY PATTERN FOR TEST DATA ==========
@@ -557,6 +557,76 @@ class TestConversionTrackingService:
         assert attribution_data['weights'][1] == Decimal('0.0')
         assert attribution_data['weights'][2] == Decimal('0.0')
     
+    def test_calculate_campaign_attribution_for_one_model(self, service, mock_conversion_repository):
+        """Test batch attribution narrowed to a single model"""
+        # Arrange
+        mock_conversion_repository.calculate_campaign_attribution.return_value = {
+            1: {'linear': {'campaign_id': 1, 'attributed_value': Decimal('40.00')}},
+            2: {'linear': {'campaign_id': 2, 'attributed_value': Decimal('0.00')}}
+        }
+        
+        # Act
+        result = service.calculate_campaign_attribution([1, 2], 'linear')
+        
+        # Assert
+        assert result.is_success
+        assert result.data[1]['attributed_value'] == Decimal('40.00')
+        assert result.data[2]['attributed_value'] == Decimal('0.00')
+        mock_conversion_repository.calculate_campaign_attribution.assert_called_once_with(
+            campaign_ids=[1, 2], attribution_models=['linear']
+        )
+    
+    def test_calculate_campaign_attribution_invalid_model(self, service, mock_conversion_repository):
+        """Test batch attribution rejects unknown models"""
+        result = service.calculate_campaign_attribution([1], 'invalid_model')
+        
+        assert result.is_failure
+        assert result.error_code == "INVALID_MODEL"
+        mock_conversion_repository.calculate_campaign_attribution.assert_not_called()
+    
+    def test_refresh_campaign_attribution_replaces_rows(self, mock_conversion_repository, mock_campaign_repository,
+                                                        mock_contact_repository, mock_response_repository):
+        """Test refresh writes one row per campaign and model"""
+        # Arrange
+        attribution_repository = Mock()
+        service = ConversionTrackingService(
+            conversion_repository=mock_conversion_repository,
+            campaign_repository=mock_campaign_repository,
+            contact_repository=mock_contact_repository,
+            response_repository=mock_response_repository,
+            attribution_repository=attribution_repository
+        )
+        summary = {
+            'conversion_count': 2,
+            'total_conversion_value': Decimal('150.00'),
+            'attributed_value': Decimal('75.00'),
+            'average_touchpoints': 1.5
+        }
+        mock_conversion_repository.calculate_campaign_attribution.return_value = {
+            1: {'linear': summary, 'last_touch': summary},
+            2: {'linear': summary, 'last_touch': summary}
+        }
+        
+        # Act
+        result = service.refresh_campaign_attribution()
+        
+        # Assert
+        assert result.is_success
+        assert result.data['campaigns'] == 2
+        assert result.data['rows'] == 4
+        rows = attribution_repository.replace_all.call_args[0][0]
+        assert {(row['campaign_id'], row['attribution_model']) for row in rows} == {
+            (1, 'linear'), (1, 'last_touch'), (2, 'linear'), (2, 'last_touch')
+        }
+        attribution_repository.commit.assert_called_once()
+    
+    def test_refresh_campaign_attribution_requires_repository(self, service):
+        """Test refresh fails without the attribution repository"""
+        result = service.refresh_campaign_attribution()
+        
+        assert result.is_failure
+        assert result.error_code == "NOT_CONFIGURED"
+    
     # ===== Conversion Funnel Analysis =====
     
     def test_analyze_conversion_funnel(self, service, mock_conversion_repository):
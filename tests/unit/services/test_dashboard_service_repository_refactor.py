@@ -80,25 +80,51 @@ class TestDashboardServiceRepositoryRefactor:
         assert result['messages_today'] == 45
         assert result['overall_response_rate'] == 68.2
     
+    def test_get_dashboard_stats_with_counters_scans_messages_once(self, dashboard_service,
+                                                                   mock_contact_repository,
+                                                                   mock_campaign_repository,
+                                                                   mock_activity_repository):
+        """Response rate, bounce metrics and snapshot counters come from one daily pass"""
+        mock_contact_repository.get_total_contacts_count.return_value = 150
+        mock_contact_repository.get_contacts_added_this_week_count.return_value = 12
+        mock_campaign_repository.get_active_campaigns_count.return_value = 3
+        mock_campaign_repository.calculate_average_campaign_response_rate.return_value = 25.5
+        mock_activity_repository.get_messages_sent_today_count.return_value = 4
+        mock_activity_repository.get_message_direction_counts.return_value = {'outgoing': 6, 'incoming': 2}
+        daily = [{'date': None, 'sent': 6, 'bounced': 0, 'bounce_rate': 0},
+                 {'date': None, 'sent': 4, 'bounced': 1, 'bounce_rate': 25.0}]
+        mock_activity_repository.get_daily_message_stats.return_value = daily
+        dashboard_service.sms_metrics_service = Mock()
+        
+        stats, counters = dashboard_service.get_dashboard_stats_with_counters(days=30)
+        
+        mock_activity_repository.get_daily_message_stats.assert_called_once_with(days=30)
+        mock_activity_repository.get_message_direction_counts.assert_called_once()
+        mock_activity_repository.calculate_overall_response_rate.assert_not_called()
+        dashboard_service.sms_metrics_service.get_global_metrics.assert_not_called()
+        assert stats['overall_response_rate'] == 33.3
+        assert stats['total_messages_30d'] == 10
+        assert stats['bounced_messages_30d'] == 1
+        assert stats['bounce_rate'] == 10.0
+        assert stats['delivery_rate'] == 90.0
+        assert stats['contact_count'] == 150
+        assert counters == {'outgoing_messages': 6, 'incoming_messages': 2, 'daily': daily}
+    
     def test_get_activity_timeline_uses_repository(self, dashboard_service, 
                                                   mock_conversation_repository):
         """Test that get_activity_timeline uses conversation repository"""
-        # Arrange - create mock conversations with activities
+        # Arrange - create mock conversation carrying its activity summary
         mock_contact1 = Mock()
         mock_contact1.id = 1
         mock_contact1.first_name = 'John'
         mock_contact1.phone = '+11234567890'
         
-        mock_activity1 = Mock()
-        mock_activity1.activity_type = 'message'
-        mock_activity1.direction = 'incoming'
-        mock_activity1.body = 'Test message'
-        mock_activity1.created_at = utc_now() - timedelta(hours=1)
-        mock_activity1.duration_seconds = None
-        
         mock_conversation1 = Mock()
         mock_conversation1.contact = mock_contact1
-        mock_conversation1.activities = [mock_activity1]
+        mock_conversation1.last_activity_type = 'message'
+        mock_conversation1.last_direction = 'incoming'
+        mock_conversation1.last_message_preview = 'Test message'
+        mock_conversation1.last_activity_at = utc_now() - timedelta(hours=1)
         
         mock_conversation_repository.get_recent_conversations_with_activities.return_value = [mock_conversation1]
         
@@ -208,15 +234,12 @@ class TestDashboardServiceRepositoryRefactor:
         mock_conversation.contact = mock_contact
         
         # Test message activity
-        mock_message_activity = Mock()
-        mock_message_activity.activity_type = 'message'
-        mock_message_activity.body = 'Hello world'
-        mock_message_activity.created_at = utc_now()
-        mock_message_activity.direction = 'incoming'
-        mock_message_activity.duration_seconds = None
+        mock_conversation.last_activity_type = 'message'
+        mock_conversation.last_message_preview = 'Hello world'
+        mock_conversation.last_activity_at = utc_now()
         
         # Act
-        result = dashboard_service._format_activity_item(mock_conversation, mock_message_activity)
+        result = dashboard_service._format_activity_item(mock_conversation)
         
         # Assert
         assert result['contact_id'] == 1
@@ -226,30 +249,22 @@ class TestDashboardServiceRepositoryRefactor:
         assert result['activity_type'] == 'message'
         
         # Test call activity  
-        mock_call_activity = Mock()
-        mock_call_activity.activity_type = 'call'
-        mock_call_activity.direction = 'incoming'
-        mock_call_activity.duration_seconds = 180  # 3 minutes
-        mock_call_activity.body = None
-        mock_call_activity.created_at = utc_now()
+        mock_conversation.last_activity_type = 'call'
+        mock_conversation.last_message_preview = 'Incoming call (3m)'
         
         # Act
-        result_call = dashboard_service._format_activity_item(mock_conversation, mock_call_activity)
+        result_call = dashboard_service._format_activity_item(mock_conversation)
         
         # Assert
         assert '📞 Incoming call (3m)' in result_call['latest_message_body']
         assert result_call['activity_type'] == 'call'
         
         # Test voicemail activity
-        mock_voicemail_activity = Mock()
-        mock_voicemail_activity.activity_type = 'voicemail'
-        mock_voicemail_activity.direction = 'incoming'
-        mock_voicemail_activity.duration_seconds = None
-        mock_voicemail_activity.body = None
-        mock_voicemail_activity.created_at = utc_now()
+        mock_conversation.last_activity_type = 'voicemail'
+        mock_conversation.last_message_preview = 'Voicemail received'
         
         # Act
-        result_voicemail = dashboard_service._format_activity_item(mock_conversation, mock_voicemail_activity)
+        result_voicemail = dashboard_service._format_activity_item(mock_conversation)
         
         # Assert
         assert result_voicemail['latest_message_body'] == '🎤 Voicemail received'
@@ -0,0 +1,241 @@
+"""
+Tests for DashboardSnapshotService
+Verifies the Redis snapshot is seeded from the aggregate queries, updated
+incrementally, and reports staleness
+"""
+
+import pytest
+from unittest.mock import Mock
+from datetime import timedelta
+from utils.datetime_utils import utc_now
+from services.dashboard_snapshot_service import DashboardSnapshotService
+
+
+class FakePipeline:
+    """Minimal Redis pipeline that queues calls against a FakeRedis"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        results = [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+        self.calls = []
+        return results
+
+
+class FakeRedis:
+    """In-memory stand-in for the subset of redis-py used by the snapshot"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.values = {}
+        self.expiries = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        target = self.hashes.setdefault(key, {})
+        if mapping:
+            target.update({k: str(v) for k, v in mapping.items()})
+        if field is not None:
+            target[field] = str(value)
+
+    def hincrby(self, key, field, amount=1):
+        target = self.hashes.setdefault(key, {})
+        target[field] = str(int(target.get(field, 0)) + amount)
+
+    def delete(self, key):
+        self.hashes.pop(key, None)
+        self.values.pop(key, None)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = str(value)
+        self.expiries[key] = ex
+
+    def incrby(self, key, amount=1):
+        self.values[key] = str(int(self.values.get(key, 0)) + amount)
+
+    def expire(self, key, seconds):
+        self.expiries[key] = seconds
+
+    def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+
+class TestDashboardSnapshotService:
+    """Test dashboard snapshot reads, reconciliation and incremental counters"""
+
+    @pytest.fixture
+    def dashboard_service(self):
+        """Mock DashboardService acting as the reconciliation source"""
+        service = Mock()
+        service.get_dashboard_stats.return_value = {
+            'contact_count': 150,
+            'contacts_added_this_week': 12,
+            'active_campaigns': 3,
+            'campaign_response_rate': 25.5,
+            'monthly_revenue': 12500,
+            'revenue_growth': 8.5,
+            'messages_today': 4,
+            'overall_response_rate': 50.0,
+            'bounce_rate': 10.0,
+            'delivery_rate': 90.0,
+            'total_messages_30d': 10,
+            'bounced_messages_30d': 1
+        }
+        today = utc_now().date()
+        daily = []
+        for i in range(30):
+            day = today - timedelta(days=29 - i)
+            daily.append({'date': day, 'sent': 0, 'bounced': 0, 'bounce_rate': 0})
+        daily[-1].update({'sent': 4, 'bounced': 1})
+        daily[-2].update({'sent': 6})
+        counters = {
+            'outgoing_messages': 10,
+            'incoming_messages': 5,
+            'daily': daily
+        }
+        service.get_dashboard_stats_with_counters.return_value = (service.get_dashboard_stats.return_value, counters)
+        return service
+
+    @pytest.fixture
+    def redis_client(self):
+        return FakeRedis()
+
+    @pytest.fixture
+    def snapshot_service(self, dashboard_service, redis_client):
+        return DashboardSnapshotService(dashboard_service, redis_client=redis_client)
+
+    def test_first_read_seeds_snapshot_from_aggregate_queries(self, snapshot_service, dashboard_service, redis_client):
+        """First read reconciles because the snapshot is empty"""
+        stats = snapshot_service.get_snapshot()
+
+        # One pass over the message tables: stats and counters come from the same call
+        dashboard_service.get_dashboard_stats_with_counters.assert_called_once_with(days=30)
+        dashboard_service.get_dashboard_stats.assert_not_called()
+        assert stats['contact_count'] == 150
+        assert stats['snapshot_source'] == 'reconciled'
+        assert 'reconciled_at' in redis_client.hashes[DashboardSnapshotService.SNAPSHOT_KEY]
+
+    def test_subsequent_reads_do_not_query_database(self, snapshot_service, dashboard_service):
+        """Once seeded, reads come from the snapshot only"""
+        snapshot_service.reconcile()
+        dashboard_service.reset_mock()
+
+        stats = snapshot_service.get_snapshot()
+
+        dashboard_service.get_dashboard_stats.assert_not_called()
+        dashboard_service.get_dashboard_stats_with_counters.assert_not_called()
+        assert stats['snapshot_source'] == 'snapshot'
+        assert stats['contact_count'] == 150
+        assert stats['contacts_added_this_week'] == 12
+        assert stats['active_campaigns'] == 3
+        assert stats['campaign_response_rate'] == 25.5
+        assert stats['messages_today'] == 4
+        assert stats['overall_response_rate'] == 50.0
+        assert stats['total_messages_30d'] == 10
+        assert stats['bounced_messages_30d'] == 1
+        assert stats['bounce_rate'] == 10.0
+        assert stats['delivery_rate'] == 90.0
+
+    def test_incremental_message_events_update_counters(self, snapshot_service):
+        """Webhook message events update sent, response and bounce counters"""
+        snapshot_service.reconcile()
+
+        snapshot_service.record_activity('message', 'outgoing', 'sent')
+        snapshot_service.record_activity('message', 'outgoing', 'failed')
+        snapshot_service.record_activity('message', 'incoming', 'received')
+
+        stats = snapshot_service.get_snapshot()
+        assert stats['messages_today'] == 6
+        assert stats['total_messages_30d'] == 12
+        assert stats['bounced_messages_30d'] == 2
+        assert stats['overall_response_rate'] == 50.0  # 6 incoming / 12 outgoing
+
+    def test_non_message_activities_are_ignored(self, snapshot_service):
+        """Only activity types counted by the aggregate queries update counters"""
+        snapshot_service.reconcile()
+
+        snapshot_service.record_activity('call', 'outgoing', 'completed')
+        snapshot_service.record_activity('campaign_message_sent', 'outgoing', 'sent')
+
+        assert snapshot_service.get_snapshot()['messages_today'] == 4
+
+    def test_status_change_moves_bounce_counter(self, snapshot_service):
+        """Bounce transitions increment and recoveries decrement the daily bucket"""
+        snapshot_service.reconcile()
+
+        snapshot_service.record_status_change('message', 'sent', 'undelivered')
+        assert snapshot_service.get_snapshot()['bounced_messages_30d'] == 2
+
+        snapshot_service.record_status_change('message', 'undelivered', 'delivered')
+        assert snapshot_service.get_snapshot()['bounced_messages_30d'] == 1
+
+        snapshot_service.record_status_change('message', 'sent', 'delivered')
+        assert snapshot_service.get_snapshot()['bounced_messages_30d'] == 1
+
+    def test_contacts_created_increments_contact_count(self, snapshot_service):
+        """Import and webhook contact creation bump the contact count"""
+        snapshot_service.reconcile()
+
+        snapshot_service.record_contacts_created(25)
+        snapshot_service.record_contacts_created(0)
+
+        assert snapshot_service.get_snapshot()['contact_count'] == 175
+
+    def test_reconcile_corrects_drift(self, snapshot_service):
+        """Reconciliation overwrites incremental counters with query results"""
+        snapshot_service.reconcile()
+        snapshot_service.record_contacts_created(1000)
+
+        snapshot_service.reconcile()
+
+        assert snapshot_service.get_snapshot()['contact_count'] == 150
+
+    def test_snapshot_reports_staleness(self, snapshot_service, redis_client):
+        """Snapshots older than the threshold are flagged as stale"""
+        snapshot_service.reconcile()
+        fresh = snapshot_service.get_snapshot()
+        assert fresh['is_stale'] is False
+
+        old = (utc_now() - timedelta(hours=2)).isoformat()
+        redis_client.hashes[DashboardSnapshotService.SNAPSHOT_KEY]['reconciled_at'] = old
+
+        stale = snapshot_service.get_snapshot()
+        assert stale['is_stale'] is True
+        assert stale['snapshot_age_seconds'] >= 7200
+
+    def test_without_redis_uses_live_queries(self, dashboard_service):
+        """With no Redis configured the original queries are used directly"""
+        service = DashboardSnapshotService(dashboard_service, redis_client=None)
+
+        service.record_contacts_created(5)
+        stats = service.get_snapshot()
+
+        dashboard_service.get_dashboard_stats.assert_called_once()
+        assert stats['contact_count'] == 150
+        assert stats['snapshot_source'] == 'live'
+        assert stats['is_stale'] is False
+
+    def test_redis_failure_falls_back_to_live_queries(self, dashboard_service):
+        """Redis errors never break the dashboard"""
+        redis_client = Mock()
+        redis_client.pipeline.side_effect = ConnectionError('redis down')
+        service = DashboardSnapshotService(dashboard_service, redis_client=redis_client)
+
+        service.record_activity('message', 'outgoing', 'sent')
+        stats = service.get_snapshot()
+
+        assert stats['snapshot_source'] == 'live'
+        assert stats['contact_count'] == 150
@@ -284,6 +284,12 @@ class TestEngagementScoringService:
         # Lowest raw score should get 0 or close to 0
         assert min(normalized_scores) <= 20.0
     
+    def test_normalize_tied_scores_share_percentile(self, scoring_service):
+        """Test tied raw scores get the same percentile, as PERCENT_RANK() does"""
+        normalized_scores = scoring_service.normalize_scores_to_percentile([30.0, 10.0, 30.0, 50.0, 70.0])
+        
+        assert normalized_scores == [25.0, 0.0, 25.0, 75.0, 100.0]
+    
     def test_calculate_full_engagement_score(self, scoring_service, mock_event_repository, mock_score_repository):
         """Test full engagement score calculation workflow"""
         # Arrange
@@ -429,6 +435,7 @@ class TestEngagementScoringService:
         
         # Verify repository calls
         assert mock_score_repository.upsert_score.call_count == 3
+        mock_score_repository.update_percentile_ranks.assert_called_once_with(campaign_id)
     
     def test_update_stale_scores(self, scoring_service, mock_score_repository):
         """Test updating scores that are considered stale"""
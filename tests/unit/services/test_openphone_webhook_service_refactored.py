@@ -1037,4 +1037,105 @@ class TestRepositoryErrorHandling:
             campaign_membership_repository=campaign_membership_repo,
             contact_service=contact_service,
             sms_metrics_service=metrics_service
-        )
\ No newline at end of file
+        )
+
+class TestCampaignReplySentiment:
+    """Test reply sentiment is kept off the webhook request path"""
+    
+    def _create_service(self, classify_replies_async=True):
+        sentiment_service = Mock()
+        campaign_membership_repo = Mock()
+        campaign_membership_repo.find_active_memberships_for_contact.return_value = [Mock(id=5, campaign_id=9)]
+        campaign_membership_repo.mark_as_replied.return_value = Mock(status='replied')
+        
+        return OpenPhoneWebhookServiceRefactored(
+            activity_repository=Mock(),
+            conversation_repository=Mock(),
+            webhook_event_repository=Mock(),
+            campaign_membership_repository=campaign_membership_repo,
+            contact_service=Mock(),
+            sms_metrics_service=Mock(),
+            sentiment_service=sentiment_service,
+            classify_replies_async=classify_replies_async
+        )
+    
+    def test_cached_sentiment_is_recorded_immediately(self):
+        service = self._create_service()
+        service.sentiment_service.get_cached_classification.return_value = {'sentiment': 'positive'}
+        
+        with patch.object(service, '_queue_reply_classification') as mock_queue:
+            result = service._process_campaign_response_tracking(Mock(id=1), Mock(id=77, body='Yes please'))
+        
+        assert result['sentiment'] == 'positive'
+        service.campaign_membership_repository.mark_as_replied.assert_called_once_with(
+            membership_id=5, reply_activity_id=77, sentiment='positive'
+        )
+        service.sentiment_service.analyze_response.assert_not_called()
+        mock_queue.assert_not_called()
+    
+    def test_cache_miss_queues_classification(self):
+        service = self._create_service()
+        service.sentiment_service.get_cached_classification.return_value = None
+        
+        with patch.object(service, '_queue_reply_classification', return_value=True) as mock_queue:
+            result = service._process_campaign_response_tracking(Mock(id=1), Mock(id=77, body='Maybe next week'))
+        
+        assert result['sentiment'] is None
+        assert result['classification_queued'] is True
+        service.sentiment_service.analyze_response.assert_not_called()
+        mock_queue.assert_called_once_with(5, 77)
+    
+    def test_cache_miss_classified_inline_when_async_disabled(self):
+        service = self._create_service(classify_replies_async=False)
+        service.sentiment_service.get_cached_classification.return_value = None
+        service.sentiment_service.analyze_response.return_value = Result.success({'sentiment': 'negative'})
+        
+        result = service._process_campaign_response_tracking(Mock(id=1), Mock(id=77, body='Stop texting me'))
+        
+        assert result['sentiment'] == 'negative'
+        assert result['classification_queued'] is False
+    
+    def test_classify_campaign_reply_updates_membership(self):
+        service = self._create_service()
+        service.activity_repository.get_by_id.return_value = Mock(id=77, body='Yes, call me')
+        service.sentiment_service.analyze_response.return_value = Result.success({'sentiment': 'positive'})
+        service.campaign_membership_repository.record_reply_sentiment.return_value = True
+        service.campaign_membership_repository.get_by_id.return_value = Mock(status='replied_positive')
+        
+        result = service.classify_campaign_reply(5, 77)
+        
+        assert result.is_success
+        assert result.data == {
+            'membership_id': 5, 'sentiment': 'positive', 'superseded': False, 'status_updated': 'replied_positive'
+        }
+        service.campaign_membership_repository.record_reply_sentiment.assert_called_once_with(
+            membership_id=5, reply_activity_id=77, sentiment='positive'
+        )
+        service.campaign_membership_repository.mark_as_replied.assert_not_called()
+    
+    def test_classify_campaign_reply_for_superseded_reply_leaves_membership(self):
+        """A late task for an older reply must not overwrite the newer reply"""
+        service = self._create_service()
+        service.activity_repository.get_by_id.return_value = Mock(id=77, body='Not interested')
+        service.sentiment_service.analyze_response.return_value = Result.success({'sentiment': 'negative'})
+        service.campaign_membership_repository.record_reply_sentiment.return_value = False
+        service.campaign_membership_repository.get_by_id.return_value = Mock(status='replied_positive', reply_activity_id=78)
+        
+        result = service.classify_campaign_reply(5, 77)
+        
+        assert result.is_success
+        assert result.data['superseded'] is True
+        assert result.data['status_updated'] == 'replied_positive'
+        service.campaign_membership_repository.mark_as_replied.assert_not_called()
+    
+    def test_classify_campaign_reply_for_missing_membership(self):
+        service = self._create_service()
+        service.activity_repository.get_by_id.return_value = Mock(id=77, body='Yes')
+        service.sentiment_service.analyze_response.return_value = Result.success({'sentiment': 'positive'})
+        service.campaign_membership_repository.record_reply_sentiment.return_value = False
+        service.campaign_membership_repository.get_by_id.return_value = None
+        
+        result = service.classify_campaign_reply(5, 77)
+        
+        assert result.is_failure
+        assert result.error_code == 'NOT_FOUND'
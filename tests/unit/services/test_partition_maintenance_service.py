@@ -0,0 +1,117 @@
+"""
+Tests for PartitionMaintenanceService
+Partition DDL only runs on PostgreSQL; on SQLite maintenance archives expired
+months with a range DELETE, which is what these tests exercise
+"""
+
+from datetime import date, datetime
+from unittest.mock import Mock
+
+import pytest
+
+from crm_database import Activity, WebhookEvent
+from repositories.partition_archive_repository import PartitionArchiveRepository, add_months, month_start
+from services.partition_maintenance_service import PartitionMaintenanceService
+from tests.conftest import create_test_contact
+
+
+class TestMonthArithmetic:
+    
+    def test_add_months_crosses_years(self):
+        assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+        assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    
+    def test_month_start(self):
+        assert month_start(date(2026, 10, 19)) == date(2026, 10, 1)
+
+
+class TestPartitionMaintenanceService:
+    
+    TODAY = date(2026, 10, 19)
+    
+    @pytest.fixture
+    def archive_repository(self, db_session):
+        return PartitionArchiveRepository(session=db_session)
+    
+    @pytest.fixture
+    def service(self, db_session, archive_repository):
+        return PartitionMaintenanceService(
+            session=db_session,
+            archive_repository=archive_repository,
+            retention_months={'activity': 24, 'webhook_event': 6}
+        )
+    
+    @pytest.fixture
+    def contact(self, db_session):
+        contact = create_test_contact(phone='+15550104101')
+        db_session.add(contact)
+        db_session.flush()
+        return contact
+    
+    def _activity(self, db_session, contact, created_at):
+        activity = Activity(contact_id=contact.id, activity_type='message', direction='outgoing',
+                            body=created_at.isoformat(), created_at=created_at)
+        db_session.add(activity)
+        db_session.flush()
+        return activity
+    
+    def test_sqlite_is_not_partitioned(self, service, archive_repository):
+        assert archive_repository.is_partitioned('activity') is False
+        assert archive_repository.list_partitions('activity') == {}
+        assert service.ensure_partitions('activity', self.TODAY) == []
+    
+    def test_archive_expired_moves_old_months(self, service, archive_repository, db_session, contact):
+        self._activity(db_session, contact, datetime(2024, 8, 3))
+        self._activity(db_session, contact, datetime(2024, 8, 30))
+        self._activity(db_session, contact, datetime(2024, 9, 15))
+        kept = self._activity(db_session, contact, datetime(2024, 10, 1))
+        
+        archived = service.archive_expired('activity', self.TODAY)
+        
+        assert [(month['period_start'], month['row_count']) for month in archived] == [
+            (date(2024, 8, 1), 2), (date(2024, 9, 1), 1)
+        ]
+        remaining = db_session.query(Activity).filter(Activity.contact_id == contact.id).all()
+        assert remaining == [kept]
+        restored = archive_repository.find_archived(Activity, contact_id=contact.id)
+        assert [activity.body for activity in restored] == [
+            '2024-08-03T00:00:00', '2024-08-30T00:00:00', '2024-09-15T00:00:00'
+        ]
+    
+    def test_zero_retention_keeps_everything(self, db_session, archive_repository, contact):
+        service = PartitionMaintenanceService(db_session, archive_repository, retention_months={'activity': 0})
+        self._activity(db_session, contact, datetime(2001, 1, 1))
+        
+        assert service.archive_expired('activity', self.TODAY) == []
+        assert db_session.query(Activity).filter(Activity.contact_id == contact.id).count() == 1
+    
+    def test_run_maintenance_reports_each_table(self, service, db_session):
+        db_session.add(WebhookEvent(event_id='evt-partition-old', event_type='message.received',
+                                    created_at=datetime(2026, 3, 31, 23, 59)))
+        db_session.add(WebhookEvent(event_id='evt-partition-new', event_type='message.received',
+                                    created_at=datetime(2026, 4, 1)))
+        db_session.flush()
+        
+        result = service.run_maintenance(today=self.TODAY)
+        
+        assert result.is_success
+        assert result.data['webhook_event']['created_partitions'] == []
+        assert date(2026, 3, 1) in [month['period_start'] for month in result.data['webhook_event']['archived_months']]
+        event_ids = {event.event_id for event in db_session.query(WebhookEvent).all()}
+        assert 'evt-partition-old' not in event_ids
+        assert 'evt-partition-new' in event_ids
+    
+    def test_run_maintenance_failure_is_reported(self, db_session):
+        archive_repository = Mock(PARTITIONED_TABLES={'activity': None})
+        archive_repository.is_partitioned.return_value = False
+        archive_repository.months_before.return_value = [date(2000, 1, 1)]
+        archive_repository.archive_month.side_effect = RuntimeError('disk full')
+        session = Mock()
+        service = PartitionMaintenanceService(session, archive_repository, retention_months={'activity': 1})
+        
+        result = service.run_maintenance(today=self.TODAY)
+        
+        assert result.is_failure
+        assert result.code == 'PARTITION_MAINTENANCE_FAILED'
+        session.rollback.assert_called_once()
+        session.commit.assert_not_called()
@@ -440,7 +440,69 @@ class TestPropertyRadarImportService:
                 # Should fail and call rollback
                 assert result.is_failure
                 mock_rollback.assert_called_once()
-    
+
+    def test_set_based_batch_resolves_rows_with_bulk_queries(self, mock_property_repository,
+                                                             mock_contact_repository, mock_csv_import_repository,
+                                                             sample_csv_row):
+        """Set-based batches look rows up and write them per batch, not per row"""
+        service = PropertyRadarImportService(
+            property_repository=mock_property_repository,
+            contact_repository=mock_contact_repository,
+            csv_import_repository=mock_csv_import_repository,
+            set_based_batches=True
+        )
+        mock_property_repository.find_duplicates_in_batch.return_value = {}
+        mock_contact_repository.find_by_phones.return_value = {}
+        mock_property_repository.create_many.side_effect = lambda rows: [
+            Mock(spec=Property, id=index + 1) for index in range(len(rows))
+        ]
+        mock_contact_repository.create_many.side_effect = lambda rows: [
+            Mock(spec=Contact, id=index + 1) for index in range(len(rows))
+        ]
+        mock_property_repository.find_associations_for_properties.return_value = []
+        mock_csv_import = Mock(spec=CSVImport, id=1, contacts=[])
+
+        # The same row twice: the second occurrence matches the first
+        stats, contacts = service._process_batch([sample_csv_row, dict(sample_csv_row)], mock_csv_import,
+                                                 return_contacts=True)
+
+        assert stats['properties_created'] == 1
+        assert stats['properties_updated'] == 1
+        assert stats['contacts_created'] == 2
+        assert stats['contacts_updated'] == 2
+        assert len(contacts) == 4
+        assert len(mock_csv_import.contacts) == 2
+        mock_property_repository.find_duplicates_in_batch.assert_called_once()
+        mock_contact_repository.find_by_phones.assert_called_once_with(
+            ['+13392224624', '+17813161658', '+13392224624', '+17813161658']
+        )
+        mock_property_repository.find_by_apn.assert_not_called()
+        mock_contact_repository.find_by_phone.assert_not_called()
+        links = mock_property_repository.create_associations.call_args[0][0]
+        assert [(link['contact_id'], link['is_primary']) for link in links] == [(1, True), (2, False)]
+
+    def test_set_based_batch_replays_rows_after_database_error(self, mock_property_repository,
+                                                               mock_contact_repository,
+                                                               mock_csv_import_repository, sample_csv_row):
+        """A failed bulk write is rolled back and the batch imported row by row"""
+        from sqlalchemy.exc import IntegrityError
+        service = PropertyRadarImportService(
+            property_repository=mock_property_repository,
+            contact_repository=mock_contact_repository,
+            csv_import_repository=mock_csv_import_repository,
+            set_based_batches=True
+        )
+        row_stats = {'total_rows': 1, 'properties_created': 1, 'errors': []}
+
+        with patch.object(service, '_process_batch_set_based',
+                          side_effect=IntegrityError('INSERT', {}, Exception('duplicate phone'))), \
+                patch.object(service, '_process_batch_by_row', return_value=(row_stats, [])) as by_row:
+            stats, _ = service._process_batch([sample_csv_row], Mock(spec=CSVImport))
+
+        assert stats is row_stats
+        mock_property_repository.rollback.assert_called_once()
+        by_row.assert_called_once()
+
     def test_import_progress_tracking(self, service, mock_csv_import_repository, sample_csv_content):
         """Test import progress tracking and reporting"""
         # Should fail - progress tracking doesn't exist yet
@@ -6,7 +6,7 @@ import pytest
 import os
 # import jwt  # Commented out - not installed
 from unittest.mock import Mock, MagicMock, patch
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from utils.datetime_utils import utc_now
 from services.quickbooks_service import QuickBooksService
 from crm_database import QuickBooksAuth
@@ -332,7 +332,7 @@ class TestQuickBooksService:
             assert result == [{'id': '1', 'name': 'Test Customer'}]
             mock_api_request.assert_called_once_with(
                 "query", 
-                params={'query': "select * from Customer maxresults 500"}
+                params={'query': "select * from Customer orderby Id startposition 1 maxresults 500"}
             )
     
     def test_list_items(self, service):
@@ -354,7 +354,7 @@ class TestQuickBooksService:
             assert result == [{'id': '1', 'name': 'Test Item'}]
             mock_api_request.assert_called_once_with(
                 "query", 
-                params={'query': "select * from Item maxresults 100"}
+                params={'query': "select * from Item orderby Id startposition 1 maxresults 100"}
             )
     
     def test_list_estimates(self, service):
@@ -376,7 +376,7 @@ class TestQuickBooksService:
             assert result == [{'id': '1', 'total': '100.00'}]
             mock_api_request.assert_called_once_with(
                 "query", 
-                params={'query': "select * from Estimate maxresults 1000"}
+                params={'query': "select * from Estimate orderby Id startposition 1 maxresults 1000"}
             )
     
     def test_list_invoices(self, service):
@@ -398,9 +398,39 @@ class TestQuickBooksService:
             assert result == [{'id': '1', 'total': '200.00'}]
             mock_api_request.assert_called_once_with(
                 "query", 
-                params={'query': "select * from Invoice maxresults 1000"}
+                params={'query': "select * from Invoice orderby Id startposition 1 maxresults 1000"}
             )
-    
+
+    def test_list_customers_pages_past_max_results(self, service):
+        """Full pages are followed by the next STARTPOSITION until a short page"""
+        pages = [
+            {'QueryResponse': {'Customer': [{'Id': '1'}, {'Id': '2'}]}},
+            {'QueryResponse': {'Customer': [{'Id': '3'}, {'Id': '4'}]}},
+            {'QueryResponse': {'Customer': [{'Id': '5'}]}},
+        ]
+
+        with patch.object(service, 'make_api_request', side_effect=pages) as mock_api_request:
+            result = service.list_customers(max_results=2)
+
+        assert [customer['Id'] for customer in result] == ['1', '2', '3', '4', '5']
+        assert [c.kwargs['params']['query'] for c in mock_api_request.call_args_list] == [
+            "select * from Customer orderby Id startposition 1 maxresults 2",
+            "select * from Customer orderby Id startposition 3 maxresults 2",
+            "select * from Customer orderby Id startposition 5 maxresults 2",
+        ]
+
+    def test_query_pages_filters_on_last_updated_time(self, service):
+        """changed_since becomes a MetaData.LastUpdatedTime filter in UTC"""
+        changed_since = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+        with patch.object(service, 'make_api_request', return_value={'QueryResponse': {}}) as mock_api_request:
+            assert list(service.query_pages('Invoice', changed_since=changed_since)) == []
+
+        mock_api_request.assert_called_once_with("query", params={'query': (
+            "select * from Invoice where MetaData.LastUpdatedTime >= '2026-01-02T03:04:05+00:00' "
+            "orderby Id startposition 1 maxresults 1000"
+        )})
+
     def test_get_customer(self, service):
         """Test getting specific customer"""
         # Arrange
@@ -11,7 +11,7 @@ This service has 32+ database violations that need to be refactored.
 import pytest
 from unittest.mock import Mock, MagicMock, patch, call
 from decimal import Decimal
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 from services.quickbooks_sync_service import QuickBooksSyncService
 from crm_database import Contact, Product, Quote, Invoice, Job, Property, QuickBooksSync, QuoteLineItem, InvoiceLineItem
 from repositories.contact_repository import ContactRepository
@@ -92,518 +92,361 @@ class TestQuickBooksSyncServiceRepositoryViolations:
         assert hasattr(service, 'invoice_line_item_repository')
 
 
-class TestQuickBooksSyncServiceCustomerSync:
-    """Test customer synchronization repository usage"""
+
+def _repositories():
+    """Mock repositories whose bulk lookups find nothing unless a test says otherwise"""
+    repositories = {
+        'contact_repository': Mock(spec=ContactRepository),
+        'product_repository': Mock(spec=ProductRepository),
+        'quote_repository': Mock(spec=QuoteRepository),
+        'invoice_repository': Mock(spec=InvoiceRepository),
+        'job_repository': Mock(spec=JobRepository),
+        'property_repository': Mock(spec=PropertyRepository),
+        'quickbooks_sync_repository': Mock(spec=QuickBooksSyncRepository),
+        'quote_line_item_repository': Mock(spec=QuoteLineItemRepository),
+        'invoice_line_item_repository': Mock(spec=InvoiceLineItemRepository)
+    }
+    for repository in repositories.values():
+        repository.find_by_values.return_value = {}
+        repository.bulk_insert.return_value = {}
+    repositories['contact_repository'].find_by_phones.return_value = {}
+    repositories['property_repository'].find_property_ids_for_contacts.return_value = {}
+    return repositories
+
+
+class TestQuickBooksSyncServiceCustomerPages:
+    """Test customers are matched with bulk lookups and written with bulk upserts"""
     
     @pytest.fixture
     def mock_repositories(self):
-        return {
-            'contact_repository': Mock(spec=ContactRepository),
-            'product_repository': Mock(spec=ProductRepository),
-            'quote_repository': Mock(spec=QuoteRepository),
-            'invoice_repository': Mock(spec=InvoiceRepository),
-            'job_repository': Mock(spec=JobRepository),
-            'property_repository': Mock(spec=PropertyRepository),
-            'quickbooks_sync_repository': Mock(spec=QuickBooksSyncRepository),
-            'quote_line_item_repository': Mock(spec=QuoteLineItemRepository),
-            'invoice_line_item_repository': Mock(spec=InvoiceLineItemRepository)
-        }
+        return _repositories()
     
     @pytest.fixture
     def service(self, mock_repositories):
-        return QuickBooksSyncService(**mock_repositories)
-    
-    def test_sync_customer_uses_contact_repository_to_find_by_quickbooks_customer_id(self, service, mock_repositories):
-        """Test _sync_customer uses ContactRepository.find_by_quickbooks_customer_id instead of Contact.query.filter_by"""
-        # Arrange
-        qb_customer = {'Id': '123', 'DisplayName': 'Test Customer', 'SyncToken': '0'}
-        existing_contact = Mock(spec=Contact)
-        
-        mock_repositories['contact_repository'].find_by_quickbooks_customer_id.return_value = existing_contact
-        mock_repositories['contact_repository'].update.return_value = existing_contact
-        mock_repositories['quickbooks_sync_repository'].find_by_entity_id.return_value = Mock()
-        mock_repositories['quickbooks_sync_repository'].update.return_value = Mock()
-        
-        # Act
-        result = service._sync_customer(qb_customer)
-        
-        # Assert - This will fail until we replace Contact.query.filter_by(quickbooks_customer_id=qb_id).first()
-        mock_repositories['contact_repository'].find_by_quickbooks_customer_id.assert_called_once_with('123')
-        assert result == existing_contact
+        return QuickBooksSyncService(**mock_repositories, quickbooks_service=Mock())
     
-    def test_sync_customer_uses_contact_repository_to_find_by_phone(self, service, mock_repositories):
-        """Test _sync_customer uses ContactRepository.find_by_phone instead of Contact.query.filter_by(phone=phone)"""
-        # Arrange
-        qb_customer = {
-            'Id': '123', 
-            'DisplayName': 'Test Customer',
-            'Mobile': {'FreeFormNumber': '555-123-4567'},
-            'SyncToken': '0'
-        }
-        existing_contact = Mock(spec=Contact)
-        
-        mock_repositories['contact_repository'].find_by_quickbooks_customer_id.return_value = None
-        mock_repositories['contact_repository'].find_by_phone.return_value = existing_contact
-        mock_repositories['contact_repository'].update.return_value = existing_contact
-        mock_repositories['quickbooks_sync_repository'].find_by_entity_id.return_value = Mock()
-        mock_repositories['quickbooks_sync_repository'].update.return_value = Mock()
-        
-        # Act
-        result = service._sync_customer(qb_customer)
-        
-        # Assert - This will fail until we replace Contact.query.filter_by(phone=phone).first()
-        mock_repositories['contact_repository'].find_by_phone.assert_called_once_with('+15551234567')
-        assert result == existing_contact
+    def test_customer_page_matches_by_quickbooks_id_in_one_lookup(self, service, mock_repositories):
+        """Test the whole page is resolved with one lookup per key instead of one query per customer"""
+        contacts = mock_repositories['contact_repository']
+        contacts.find_by_values.side_effect = lambda field, values: (
+            {'123': Mock(spec=Contact, id=7)} if field == 'quickbooks_customer_id' else {}
+        )
+        page = [
+            {'Id': '123', 'DisplayName': 'Test Customer', 'SyncToken': '2'},
+            {'Id': '124', 'DisplayName': 'New Customer', 'SyncToken': '0'}
+        ]
+        contacts.bulk_insert.return_value = {'124': 8}
+        
+        created, updated = service._sync_customer_page(page)
+        
+        assert (created, updated) == (1, 1)
+        lookups = [c.args for c in contacts.find_by_values.call_args_list]
+        assert ('quickbooks_customer_id', ['123', '124']) in lookups
+        contacts.find_by_phones.assert_called_once()
+        
+        update_rows = contacts.bulk_update.call_args.args[0]
+        assert update_rows == [{
+            'id': 7,
+            'quickbooks_customer_id': '123',
+            'quickbooks_sync_token': '2',
+            'customer_type': 'customer',
+            'tax_exempt': False,
+            'first_name': 'Test',
+            'last_name': 'Customer'
+        }]
+        mock_repositories['quickbooks_sync_repository'].record_syncs.assert_called_once_with(
+            'customer', 'contact', [('123', 7, '2'), ('124', 8, '0')]
+        )
     
-    def test_sync_customer_uses_contact_repository_to_find_by_email(self, service, mock_repositories):
-        """Test _sync_customer uses ContactRepository.find_by_email instead of Contact.query.filter_by(email=email)"""
-        # Arrange
-        qb_customer = {
-            'Id': '123',
-            'DisplayName': 'Test Customer',
-            'PrimaryEmailAddr': {'Address': 'test@example.com'},
-            'SyncToken': '0'
-        }
-        existing_contact = Mock(spec=Contact)
-        
-        mock_repositories['contact_repository'].find_by_quickbooks_customer_id.return_value = None
-        mock_repositories['contact_repository'].find_by_phone.return_value = None
-        mock_repositories['contact_repository'].find_by_email.return_value = existing_contact
-        mock_repositories['contact_repository'].update.return_value = existing_contact
-        mock_repositories['quickbooks_sync_repository'].find_by_entity_id.return_value = Mock()
-        mock_repositories['quickbooks_sync_repository'].update.return_value = Mock()
+    def test_customer_page_matches_by_phone(self, service, mock_repositories):
+        """Test customers without a known QuickBooks ID are matched on normalized phone"""
+        contacts = mock_repositories['contact_repository']
+        existing = Mock(spec=Contact, id=3)
+        contacts.find_by_phones.return_value = {'+15551234567': existing}
+        page = [{'Id': '123', 'DisplayName': 'Test', 'PrimaryPhone': {'FreeFormNumber': '(555) 123-4567'}}]
+        
+        service._sync_customer_page(page)
+        
+        contacts.find_by_phones.assert_called_once_with(['+15551234567'])
+        assert contacts.bulk_update.call_args.args[0][0]['id'] == 3
+        assert contacts.bulk_update.call_args.args[0][0]['phone'] == '+15551234567'
+        assert contacts.bulk_insert.call_args.args[0] == []
+    
+    def test_customer_page_matches_by_email(self, service, mock_repositories):
+        """Test customers are matched on email when neither ID nor phone matches"""
+        contacts = mock_repositories['contact_repository']
+        contacts.find_by_values.side_effect = lambda field, values: (
+            {'test@example.com': Mock(spec=Contact, id=4)} if field == 'email' else {}
+        )
+        page = [{'Id': '123', 'DisplayName': 'Test', 'PrimaryEmailAddr': {'Address': 'test@example.com'}}]
         
-        # Act
-        result = service._sync_customer(qb_customer)
+        service._sync_customer_page(page)
         
-        # Assert - This will fail until we replace Contact.query.filter_by(email=email).first()
-        mock_repositories['contact_repository'].find_by_email.assert_called_once_with('test@example.com')
-        assert result == existing_contact
+        assert contacts.bulk_update.call_args.args[0][0]['id'] == 4
+        assert contacts.bulk_update.call_args.args[0][0]['email'] == 'test@example.com'
     
-    def test_sync_customer_uses_contact_repository_to_create(self, service, mock_repositories):
-        """Test _sync_customer uses ContactRepository.create instead of Contact() + db.session.add()"""
-        # Arrange
-        qb_customer = {
+    def test_customer_page_creates_contacts_with_mapped_fields(self, service, mock_repositories):
+        """Test new customers are inserted in bulk and keyed by QuickBooks ID"""
+        contacts = mock_repositories['contact_repository']
+        page = [{
             'Id': '123',
             'GivenName': 'John',
             'FamilyName': 'Doe',
-            'PrimaryEmailAddr': {'Address': 'john@example.com'},
+            'SyncToken': '0',
             'Mobile': {'FreeFormNumber': '555-123-4567'},
-            'Balance': '500.00',
-            'Taxable': False,
-            'SyncToken': '0'
-        }
-        new_contact = Mock(spec=Contact, id=1)
-        
-        mock_repositories['contact_repository'].find_by_quickbooks_customer_id.return_value = None
-        mock_repositories['contact_repository'].find_by_phone.return_value = None
-        mock_repositories['contact_repository'].find_by_email.return_value = None
-        mock_repositories['contact_repository'].create.return_value = new_contact
-        mock_repositories['quickbooks_sync_repository'].find_by_entity_id.return_value = None
-        mock_repositories['quickbooks_sync_repository'].create.return_value = Mock()
-        
-        # Act
-        result = service._sync_customer(qb_customer)
-        
-        # Assert - This will fail until we replace Contact() + db.session.add()
-        mock_repositories['contact_repository'].create.assert_called_once()
-        create_data = mock_repositories['contact_repository'].create.call_args[0][0]
-        
-        assert create_data['quickbooks_customer_id'] == '123'
-        assert create_data['first_name'] == 'John'
-        assert create_data['last_name'] == 'Doe'
-        assert create_data['email'] == 'john@example.com'
-        assert create_data['phone'] == '+15551234567'
-        assert create_data['customer_type'] == 'customer'
-        assert create_data['outstanding_balance'] == Decimal('500.00')
-        assert create_data['tax_exempt'] is True
-        
-        assert result == new_contact
-
-
-class TestQuickBooksSyncServiceProductSync:
-    """Test product synchronization repository usage"""
-    
-    @pytest.fixture
-    def mock_repositories(self):
-        return {
-            'contact_repository': Mock(spec=ContactRepository),
-            'product_repository': Mock(spec=ProductRepository),
-            'quote_repository': Mock(spec=QuoteRepository),
-            'invoice_repository': Mock(spec=InvoiceRepository),
-            'job_repository': Mock(spec=JobRepository),
-            'property_repository': Mock(spec=PropertyRepository),
-            'quickbooks_sync_repository': Mock(spec=QuickBooksSyncRepository),
-            'quote_line_item_repository': Mock(spec=QuoteLineItemRepository),
-            'invoice_line_item_repository': Mock(spec=InvoiceLineItemRepository)
-        }
-    
-    @pytest.fixture
-    def service(self, mock_repositories):
-        return QuickBooksSyncService(**mock_repositories)
-    
-    def test_sync_item_uses_product_repository_to_find(self, service, mock_repositories):
-        """Test _sync_item uses ProductRepository.find_by_quickbooks_customer_id instead of Product.query.filter_by"""
-        # Arrange
-        qb_item = {'Id': '123', 'Name': 'Test Product', 'Type': 'Service', 'SyncToken': '0'}
-        existing_product = Mock(spec=Product)
-        
-        mock_repositories['product_repository'].find_by_quickbooks_item_id.return_value = existing_product
-        mock_repositories['product_repository'].update.return_value = existing_product
-        mock_repositories['quickbooks_sync_repository'].find_by_entity_id.return_value = Mock()
-        mock_repositories['quickbooks_sync_repository'].update.return_value = Mock()
-        
-        # Act
-        is_new = service._sync_item(qb_item)
-        
-        # Assert - This will fail until we replace Product.query.filter_by(quickbooks_item_id=qb_id).first()
-        mock_repositories['product_repository'].find_by_quickbooks_item_id.assert_called_once_with('123')
-        assert is_new is False
-    
-    def test_sync_item_uses_product_repository_to_create(self, service, mock_repositories):
-        """Test _sync_item uses ProductRepository.create instead of Product() + db.session.add()"""
-        # Arrange
-        qb_item = {
-            'Id': '123',
-            'Name': 'Test Product',
-            'Description': 'A test product',
-            'Type': 'Inventory',
-            'UnitPrice': '25.50',
-            'QtyOnHand': '100',
-            'Active': True,
-            'Taxable': False,
-            'SyncToken': '0'
-        }
-        new_product = Mock(spec=Product)
+            'PrimaryEmailAddr': {'Address': 'john@example.com'},
+            'Balance': 150.5,
+            'Taxable': False
+        }]
+        
+        service._sync_customer_page(page)
+        
+        contacts.bulk_insert.assert_called_once_with([{
+            'quickbooks_customer_id': '123',
+            'quickbooks_sync_token': '0',
+            'customer_type': 'customer',
+            'tax_exempt': True,
+            'phone': '+15551234567',
+            'first_name': 'John',
+            'last_name': 'Doe',
+            'email': 'john@example.com',
+            'outstanding_balance': Decimal('150.5')
+        }], key_field='quickbooks_customer_id')
+    
+    def test_customer_page_never_takes_another_contacts_phone_or_email(self, service, mock_repositories):
+        """Test unique phone/email values owned elsewhere or repeated in the page are dropped"""
+        contacts = mock_repositories['contact_repository']
+        contacts.find_by_values.side_effect = lambda field, values: (
+            {'123': Mock(spec=Contact, id=1)} if field == 'quickbooks_customer_id' else {}
+        )
+        contacts.find_by_phones.return_value = {'+15551234567': Mock(spec=Contact, id=2)}
+        page = [
+            {'Id': '123', 'DisplayName': 'Known', 'Mobile': {'FreeFormNumber': '555-123-4567'}},
+            {'Id': '124', 'DisplayName': 'New A', 'PrimaryEmailAddr': {'Address': 'shared@example.com'}},
+            {'Id': '125', 'DisplayName': 'New B', 'PrimaryEmailAddr': {'Address': 'shared@example.com'}}
+        ]
         
-        mock_repositories['product_repository'].find_by_quickbooks_item_id.return_value = None
-        mock_repositories['product_repository'].create.return_value = new_product
-        mock_repositories['quickbooks_sync_repository'].find_by_entity_id.return_value = None
-        mock_repositories['quickbooks_sync_repository'].create.return_value = Mock()
+        service._sync_customer_page(page)
         
-        # Act
-        is_new = service._sync_item(qb_item)
-        
-        # Assert - This will fail until we replace Product() + db.session.add()
-        mock_repositories['product_repository'].create.assert_called_once()
-        create_data = mock_repositories['product_repository'].create.call_args[0][0]
-        
-        assert create_data['quickbooks_item_id'] == '123'
-        assert create_data['name'] == 'Test Product'
-        assert create_data['description'] == 'A test product'
-        assert create_data['item_type'] == 'inventory'
-        assert create_data['unit_price'] == Decimal('25.50')
-        assert create_data['quantity_on_hand'] == 100
-        assert create_data['active'] is True
-        assert create_data['taxable'] is False
-        
-        assert is_new is True
+        assert 'phone' not in contacts.bulk_update.call_args.args[0][0]
+        inserted = contacts.bulk_insert.call_args.args[0]
+        assert inserted[0]['email'] == 'shared@example.com'
+        assert 'email' not in inserted[1]
 
 
-class TestQuickBooksSyncServiceQuoteSync:
-    """Test quote/estimate synchronization repository usage"""
+class TestQuickBooksSyncServiceItemPages:
+    """Test items are upserted as products in bulk"""
     
     @pytest.fixture
     def mock_repositories(self):
-        return {
-            'contact_repository': Mock(spec=ContactRepository),
-            'product_repository': Mock(spec=ProductRepository),
-            'quote_repository': Mock(spec=QuoteRepository),
-            'invoice_repository': Mock(spec=InvoiceRepository),
-            'job_repository': Mock(spec=JobRepository),
-            'property_repository': Mock(spec=PropertyRepository),
-            'quickbooks_sync_repository': Mock(spec=QuickBooksSyncRepository),
-            'quote_line_item_repository': Mock(spec=QuoteLineItemRepository),
-            'invoice_line_item_repository': Mock(spec=InvoiceLineItemRepository)
-        }
+        return _repositories()
     
     @pytest.fixture
     def service(self, mock_repositories):
-        return QuickBooksSyncService(**mock_repositories)
-    
-    def test_sync_estimate_uses_quote_repository_to_find(self, service, mock_repositories):
-        """Test _sync_estimate uses QuoteRepository.find_by_quickbooks_customer_id instead of Quote.query.filter_by"""
-        # Arrange
-        qb_estimate = {
-            'Id': '123',
-            'TotalAmt': '1500.50',
-            'TxnDate': '2024-01-15',
-            'CustomerRef': {'value': '456', 'name': 'Test Customer'},
-            'Line': [],
-            'SyncToken': '0'
-        }
-        existing_quote = Mock(spec=Quote)
-        
-        mock_repositories['quote_repository'].find_by_quickbooks_id.return_value = existing_quote
-        # Don't need to mock _record_sync for this test
-        
-        # Act
-        is_new = service._sync_estimate(qb_estimate)
-        
-        # Assert - This will fail until we replace Quote.query.filter_by(quickbooks_estimate_id=qb_id).first()
-        mock_repositories['quote_repository'].find_by_quickbooks_id.assert_called_once_with('123')
-        assert is_new is False
-    
-    def test_sync_estimate_line_items_uses_line_item_repository(self, service, mock_repositories):
-        """Test _sync_estimate_line_items uses QuoteLineItemRepository instead of direct queries"""
-        # Arrange
-        quote = Mock(id=1)
-        qb_lines = [
-            {
-                'Id': '1',
-                'DetailType': 'SalesItemLineDetail',
-                'Description': 'Test Item',
-                'Amount': '100.00',
-                'SalesItemLineDetail': {
-                    'ItemRef': {'value': '123'},
-                    'Qty': '2',
-                    'UnitPrice': '50.00'
-                }
-            }
+        return QuickBooksSyncService(**mock_repositories, quickbooks_service=Mock())
+    
+    def test_item_page_creates_and_updates_products(self, service, mock_repositories):
+        """Test one lookup splits the page into bulk inserts and bulk updates"""
+        products = mock_repositories['product_repository']
+        products.find_by_values.return_value = {'1': Mock(spec=Product, id=10)}
+        products.bulk_insert.return_value = {'2': 11}
+        page = [
+            {'Id': '1', 'Name': 'Service A', 'Type': 'Service', 'SyncToken': '1'},
+            {'Id': '2', 'Name': 'Widget', 'Type': 'Inventory', 'UnitPrice': 99.99, 'QtyOnHand': 5,
+             'IncomeAccountRef': {'name': 'Sales'}, 'SyncToken': '0'}
         ]
         
-        mock_product = Mock(id=1)
-        mock_repositories['product_repository'].find_by_quickbooks_item_id.return_value = mock_product
-        mock_repositories['quote_line_item_repository'].create.return_value = Mock()
-        
-        # Act
-        service._sync_estimate_line_items(quote, qb_lines)
-        
-        # Assert - This will fail until we replace QuoteLineItem.query.filter_by(quote_id=quote.id).delete()
-        mock_repositories['quote_line_item_repository'].delete_by_quote_id.assert_called_once_with(1)
-        
-        # Assert - This will fail until we replace Product.query.filter_by(quickbooks_item_id=item_qb_id).first()
-        mock_repositories['product_repository'].find_by_quickbooks_item_id.assert_called_once_with('123')
-        
-        # Assert - This will fail until we replace db.session.add(line_item)
-        mock_repositories['quote_line_item_repository'].create.assert_called_once()
+        created, updated = service._sync_item_page(page)
+        
+        assert (created, updated) == (1, 1)
+        products.find_by_values.assert_called_once_with('quickbooks_item_id', ['1', '2'])
+        assert products.bulk_update.call_args.args[0][0]['id'] == 10
+        products.bulk_insert.assert_called_once_with([{
+            'quickbooks_item_id': '2',
+            'quickbooks_sync_token': '0',
+            'name': 'Widget',
+            'description': None,
+            'item_type': 'inventory',
+            'active': True,
+            'taxable': True,
+            'unit_price': Decimal('99.99'),
+            'quantity_on_hand': 5,
+            'income_account': 'Sales'
+        }], key_field='quickbooks_item_id')
+        mock_repositories['quickbooks_sync_repository'].record_syncs.assert_called_once_with(
+            'item', 'product', [('1', 10, '1'), ('2', 11, '0')]
+        )
 
 
-class TestQuickBooksSyncServiceInvoiceSync:
-    """Test invoice synchronization repository usage"""
+class TestQuickBooksSyncServiceTransactionPages:
+    """Test estimates and invoices are upserted with their jobs and line items in bulk"""
     
     @pytest.fixture
     def mock_repositories(self):
-        return {
-            'contact_repository': Mock(spec=ContactRepository),
-            'product_repository': Mock(spec=ProductRepository),
-            'quote_repository': Mock(spec=QuoteRepository),
-            'invoice_repository': Mock(spec=InvoiceRepository),
-            'job_repository': Mock(spec=JobRepository),
-            'property_repository': Mock(spec=PropertyRepository),
-            'quickbooks_sync_repository': Mock(spec=QuickBooksSyncRepository),
-            'quote_line_item_repository': Mock(spec=QuoteLineItemRepository),
-            'invoice_line_item_repository': Mock(spec=InvoiceLineItemRepository)
-        }
+        return _repositories()
     
     @pytest.fixture
     def service(self, mock_repositories):
-        return QuickBooksSyncService(**mock_repositories)
-    
-    def test_sync_invoice_uses_invoice_repository_to_find(self, service, mock_repositories):
-        """Test _sync_invoice uses InvoiceRepository.find_by_quickbooks_customer_id instead of Invoice.query.filter_by"""
-        # Arrange
-        qb_invoice = {
-            'Id': '123',
-            'TotalAmt': '1000.00',
-            'Balance': '500.00',
-            'TxnDate': '2024-01-15',
-            'DueDate': '2024-02-15',
-            'CustomerRef': {'value': '456', 'name': 'Test Customer'},
-            'Line': [],
-            'SyncToken': '0'
-        }
-        existing_invoice = Mock(spec=Invoice)
-        
-        mock_repositories['invoice_repository'].find_by_quickbooks_id.return_value = existing_invoice
-        # Don't need to mock _record_sync for this test
-        
-        # Act
-        is_new = service._sync_invoice(qb_invoice)
-        
-        # Assert - This will fail until we replace Invoice.query.filter_by(quickbooks_invoice_id=qb_id).first()
-        mock_repositories['invoice_repository'].find_by_quickbooks_id.assert_called_once_with('123')
-        assert is_new is False
-    
-    def test_sync_invoice_line_items_uses_line_item_repository(self, service, mock_repositories):
-        """Test _sync_invoice_line_items uses InvoiceLineItemRepository instead of direct queries"""
-        # Arrange
-        invoice = Mock(id=1)
-        qb_lines = [
-            {
-                'Id': '1',
-                'DetailType': 'SalesItemLineDetail',
-                'Description': 'Test Service',
-                'Amount': '150.00',
-                'SalesItemLineDetail': {
-                    'ItemRef': {'value': '456'},
-                    'Qty': '3',
-                    'UnitPrice': '50.00'
-                }
-            }
-        ]
-        
-        mock_product = Mock(id=2)
-        mock_repositories['product_repository'].find_by_quickbooks_item_id.return_value = mock_product
-        mock_repositories['invoice_line_item_repository'].create.return_value = Mock()
-        
-        # Act
-        service._sync_invoice_line_items(invoice, qb_lines)
-        
-        # Assert - This will fail until we replace InvoiceLineItem.query.filter_by(invoice_id=invoice.id).delete()
-        mock_repositories['invoice_line_item_repository'].delete_by_invoice_id.assert_called_once_with(1)
-        
-        # Assert - This will fail until we replace Product.query.filter_by(quickbooks_item_id=item_qb_id).first()
-        mock_repositories['product_repository'].find_by_quickbooks_item_id.assert_called_once_with('456')
-        
-        # Assert - This will fail until we replace db.session.add(line_item)
-        mock_repositories['invoice_line_item_repository'].create.assert_called_once()
+        return QuickBooksSyncService(**mock_repositories, quickbooks_service=Mock())
+    
+    def test_new_estimate_creates_placeholder_contact_property_and_job(self, service, mock_repositories):
+        """Test jobs for new transactions are created for the whole page at once"""
+        mock_repositories['contact_repository'].create_many.return_value = [Mock(spec=Contact, id=5)]
+        mock_repositories['property_repository'].create_many.return_value = [Mock(spec=Property, id=6)]
+        mock_repositories['job_repository'].create_many.return_value = [Mock(spec=Job, id=7)]
+        mock_repositories['quote_repository'].bulk_insert.return_value = {'E1': 8}
+        page = [{
+            'Id': 'E1',
+            'DocNumber': '1001',
+            'TotalAmt': 500,
+            'CustomerRef': {'value': 'C9', 'name': 'Jane'},
+            'BillAddr': {'Line1': '1 Main St', 'City': 'Boston', 'CountrySubDivisionCode': 'MA'},
+            'Line': []
+        }]
+        
+        created, updated = service._sync_estimate_page(page)
+        
+        assert (created, updated) == (1, 0)
+        mock_repositories['contact_repository'].create_many.assert_called_once_with([{
+            'first_name': 'Jane', 'last_name': '', 'customer_type': 'customer', 'quickbooks_customer_id': 'C9'
+        }])
+        mock_repositories['property_repository'].create_many.assert_called_once_with([
+            {'address': '1 Main St, Boston, MA'}
+        ])
+        mock_repositories['property_repository'].create_associations.assert_called_once_with([
+            {'property_id': 6, 'contact_id': 5, 'relationship_type': 'owner', 'is_primary': True}
+        ])
+        mock_repositories['job_repository'].create_many.assert_called_once_with([
+            {'property_id': 6, 'description': 'QuickBooks Import - Transaction #1001', 'status': 'Active'}
+        ])
+        inserted = mock_repositories['quote_repository'].bulk_insert.call_args.args[0]
+        assert inserted[0]['job_id'] == 7
+        assert inserted[0]['status'] == 'Draft'
+    
+    def test_updated_estimate_replaces_line_items_in_bulk(self, service, mock_repositories):
+        """Test line items of updated quotes are deleted and reinserted with product links"""
+        mock_repositories['quote_repository'].find_by_values.return_value = {'E1': Mock(spec=Quote, id=1)}
+        mock_repositories['product_repository'].find_by_values.return_value = {'I1': Mock(spec=Product, id=5)}
+        page = [{
+            'Id': 'E1',
+            'TotalAmt': 200,
+            'Line': [
+                {
+                    'Id': '1',
+                    'DetailType': 'SalesItemLineDetail',
+                    'Description': 'Service',
+                    'Amount': 200,
+                    'SalesItemLineDetail': {'ItemRef': {'value': 'I1'}, 'Qty': 2, 'UnitPrice': 100}
+                },
+                {'DetailType': 'SubTotalLineDetail', 'Amount': 200}
+            ]
+        }]
+        
+        service._sync_estimate_page(page)
+        
+        mock_repositories['job_repository'].create_many.assert_not_called()
+        mock_repositories['quote_line_item_repository'].delete_by_quote_ids.assert_called_once_with([1])
+        mock_repositories['quote_line_item_repository'].bulk_insert.assert_called_once_with([{
+            'description': 'Service',
+            'quantity': Decimal('2'),
+            'unit_price': Decimal('100'),
+            'line_total': Decimal('200'),
+            'quickbooks_line_id': '1',
+            'quote_id': 1,
+            'product_id': 5
+        }])
+    
+    def test_invoice_page_links_estimates_and_defaults_due_date(self, service, mock_repositories):
+        """Test linked estimates are resolved in one lookup and due_date falls back to the invoice date"""
+        mock_repositories['invoice_repository'].find_by_values.return_value = {'I1': Mock(spec=Invoice, id=2)}
+        mock_repositories['quote_repository'].find_by_values.return_value = {'E1': Mock(spec=Quote, id=3)}
+        page = [{
+            'Id': 'I1',
+            'TotalAmt': 1000,
+            'Balance': 400,
+            'TxnDate': '2026-01-15',
+            'LinkedTxn': [{'TxnId': 'E1', 'TxnType': 'Estimate'}],
+            'Line': []
+        }]
+        
+        service._sync_invoice_page(page)
+        
+        mock_repositories['quote_repository'].find_by_values.assert_called_once()
+        row = mock_repositories['invoice_repository'].bulk_update.call_args.args[0][0]
+        assert row['id'] == 2
+        assert row['quote_id'] == 3
+        assert row['due_date'] == date(2026, 1, 15)
+        assert row['amount_paid'] == Decimal('600')
+        assert row['payment_status'] == 'partial'
+        mock_repositories['invoice_line_item_repository'].delete_by_invoice_ids.assert_called_once_with([2])
 
 
-class TestQuickBooksSyncServiceJobPropertyCreation:
-    """Test job and property creation repository usage"""
+class TestQuickBooksSyncServiceWatermark:
+    """Test paging, per-page commits and the change-data-capture watermark"""
     
     @pytest.fixture
     def mock_repositories(self):
-        return {
-            'contact_repository': Mock(spec=ContactRepository),
-            'product_repository': Mock(spec=ProductRepository),
-            'quote_repository': Mock(spec=QuoteRepository),
-            'invoice_repository': Mock(spec=InvoiceRepository),
-            'job_repository': Mock(spec=JobRepository),
-            'property_repository': Mock(spec=PropertyRepository),
-            'quickbooks_sync_repository': Mock(spec=QuickBooksSyncRepository),
-            'quote_line_item_repository': Mock(spec=QuoteLineItemRepository),
-            'invoice_line_item_repository': Mock(spec=InvoiceLineItemRepository)
-        }
+        return _repositories()
     
     @pytest.fixture
     def service(self, mock_repositories):
-        return QuickBooksSyncService(**mock_repositories)
+        return QuickBooksSyncService(**mock_repositories, quickbooks_service=Mock(), page_size=2)
+    
+    def test_sync_requests_changes_since_watermark_and_advances_it(self, service, mock_repositories):
+        """Test only changed records are requested and the watermark moves to the newest change"""
+        sync_repository = mock_repositories['quickbooks_sync_repository']
+        watermark = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        sync_repository.get_watermark.return_value = watermark
+        service.qb_service.query_pages.return_value = iter([
+            [{'Id': '1', 'Name': 'A', 'Type': 'Service', 'MetaData': {'LastUpdatedTime': '2026-01-02T10:00:00-08:00'}},
+             {'Id': '2', 'Name': 'B', 'Type': 'Service', 'MetaData': {'LastUpdatedTime': '2026-01-03T10:00:00Z'}}],
+            [{'Id': '3', 'Name': 'C', 'Type': 'Service', 'MetaData': {'LastUpdatedTime': '2026-01-02T12:00:00Z'}}]
+        ])
+        
+        results = service.sync_items()
+        
+        service.qb_service.query_pages.assert_called_once_with('Item', changed_since=watermark, page_size=2)
+        assert results == {'created': 3, 'updated': 0, 'errors': 0}
+        assert sync_repository.commit.call_count == 3  # Two pages plus the watermark
+        sync_repository.set_watermark.assert_called_once_with(
+            'item', datetime(2026, 1, 3, 10, 0, tzinfo=timezone.utc)
+        )
     
-    def test_find_or_create_job_uses_contact_repository(self, service, mock_repositories):
-        """Test _find_or_create_job_for_qb_transaction uses ContactRepository instead of Contact.query"""
-        # Arrange
-        qb_transaction = {
-            'CustomerRef': {'value': '123', 'name': 'Test Customer'},
-            'DocNumber': 'INV-001',
-            'TxnType': 'Invoice'
-        }
+    def test_full_sync_ignores_watermark(self, service, mock_repositories):
+        """Test full=True pages through every record"""
+        service.qb_service.query_pages.return_value = iter([])
         
-        mock_contact = Mock(id=1)
-        mock_property = Mock(id=1)
-        mock_job = Mock(id=1)
-        
-        mock_repositories['contact_repository'].find_by_quickbooks_customer_id.return_value = mock_contact
-        mock_repositories['property_repository'].find_by_contact_id.return_value = mock_property
-        mock_repositories['job_repository'].create.return_value = mock_job
-        
-        # Act
-        result = service._find_or_create_job_for_qb_transaction(qb_transaction)
+        service.sync_customers(full=True)
         
-        # Assert - This will fail until we replace Contact.query.filter_by(quickbooks_customer_id=customer_qb_id).first()
-        mock_repositories['contact_repository'].find_by_quickbooks_customer_id.assert_called_once_with('123')
-        assert result == mock_job
+        mock_repositories['quickbooks_sync_repository'].get_watermark.assert_not_called()
+        service.qb_service.query_pages.assert_called_once_with('Customer', changed_since=None, page_size=2)
+        mock_repositories['quickbooks_sync_repository'].set_watermark.assert_not_called()
     
-    def test_find_or_create_job_uses_property_repository(self, service, mock_repositories):
-        """Test _find_or_create_job_for_qb_transaction uses PropertyRepository instead of Property.query"""
-        # Arrange
-        qb_transaction = {
-            'CustomerRef': {'value': '123', 'name': 'Test Customer'},
-            'DocNumber': 'EST-001',
-            'TxnType': 'Estimate'
-        }
+    def test_failed_page_rolls_back_and_keeps_watermark(self, service, mock_repositories):
+        """Test a failing page is rolled back, stops the sync and leaves the watermark alone"""
+        sync_repository = mock_repositories['quickbooks_sync_repository']
+        sync_repository.get_watermark.return_value = None
+        mock_repositories['product_repository'].bulk_insert.side_effect = Exception('constraint violated')
+        service.qb_service.query_pages.return_value = iter([
+            [{'Id': '1', 'Name': 'A', 'Type': 'Service'}, {'Id': '2', 'Name': 'B', 'Type': 'Service'}],
+            [{'Id': '3', 'Name': 'C', 'Type': 'Service'}]
+        ])
         
-        mock_contact = Mock(id=2)
-        mock_property = Mock(id=2)
-        mock_job = Mock(id=2)
+        results = service.sync_items()
         
-        mock_repositories['contact_repository'].find_by_quickbooks_customer_id.return_value = mock_contact
-        mock_repositories['property_repository'].find_by_contact_id.return_value = mock_property
-        mock_repositories['job_repository'].create.return_value = mock_job
-        
-        # Act
-        result = service._find_or_create_job_for_qb_transaction(qb_transaction)
-        
-        # Assert - This will fail until we replace Property.query.filter_by(contact_id=contact.id).first()
-        mock_repositories['property_repository'].find_by_contact_id.assert_called_once_with(2)
-        assert result == mock_job
+        assert results == {'created': 0, 'updated': 0, 'errors': 2}
+        sync_repository.rollback.assert_called_once()
+        sync_repository.set_watermark.assert_not_called()
     
-    def test_find_or_create_job_creates_contact_via_repository(self, service, mock_repositories):
-        """Test _find_or_create_job creates contact using repository instead of Contact() + db.session.add()"""
-        # Arrange
-        qb_transaction = {
-            'CustomerRef': {'value': '999', 'name': 'Unknown Customer'},
-            'DocNumber': 'QUO-001',
-            'TxnType': 'Estimate'
-        }
+    def test_sync_all_runs_customers_and_items_before_transactions(self, service, mock_repositories):
+        """Test transactions sync after the customers and items they reference"""
+        service.qb_service.query_pages.side_effect = lambda entity, **kwargs: iter([])
         
-        mock_new_contact = Mock(id=3)
-        mock_property = Mock(id=3)
-        mock_job = Mock(id=3)
+        results = service.sync_all()
         
-        mock_repositories['contact_repository'].find_by_quickbooks_customer_id.return_value = None
-        mock_repositories['contact_repository'].create.return_value = mock_new_contact
-        mock_repositories['property_repository'].find_by_contact_id.return_value = mock_property
-        mock_repositories['job_repository'].create.return_value = mock_job
-        
-        # Act
-        result = service._find_or_create_job_for_qb_transaction(qb_transaction)
-        
-        # Assert - This will fail until we replace Contact() + db.session.add()
-        mock_repositories['contact_repository'].create.assert_called_once()
-        contact_data = mock_repositories['contact_repository'].create.call_args[0][0]
-        assert contact_data['first_name'] == 'Unknown Customer'
-        assert contact_data['customer_type'] == 'customer'
-        
-        assert result == mock_job
-
-
-class TestQuickBooksSyncServiceSyncRecording:
-    """Test sync recording repository usage"""
-    
-    @pytest.fixture
-    def mock_repositories(self):
-        return {
-            'contact_repository': Mock(spec=ContactRepository),
-            'product_repository': Mock(spec=ProductRepository),
-            'quote_repository': Mock(spec=QuoteRepository),
-            'invoice_repository': Mock(spec=InvoiceRepository),
-            'job_repository': Mock(spec=JobRepository),
-            'property_repository': Mock(spec=PropertyRepository),
-            'quickbooks_sync_repository': Mock(spec=QuickBooksSyncRepository),
-            'quote_line_item_repository': Mock(spec=QuoteLineItemRepository),
-            'invoice_line_item_repository': Mock(spec=InvoiceLineItemRepository)
-        }
-    
-    @pytest.fixture
-    def service(self, mock_repositories):
-        return QuickBooksSyncService(**mock_repositories)
-    
-    def test_record_sync_uses_quickbooks_sync_repository(self, service, mock_repositories):
-        """Test _record_sync uses QuickBooksSyncRepository instead of QuickBooksSync.query"""
-        # Arrange
-        existing_sync = Mock()
-        mock_repositories['quickbooks_sync_repository'].find_by_entity.return_value = existing_sync
-        
-        # Act
-        service._record_sync('customer', '123', 1, 'contact', '5')
-        
-        # Assert - This will fail until we replace QuickBooksSync.query.filter_by()
-        mock_repositories['quickbooks_sync_repository'].find_by_entity.assert_called_once_with('customer', '123')
-    
-    def test_record_sync_creates_via_repository_when_not_found(self, service, mock_repositories):
-        """Test _record_sync creates new record using repository instead of QuickBooksSync() + db.session.add()"""
-        # Arrange
-        new_sync = Mock()
-        mock_repositories['quickbooks_sync_repository'].find_by_entity.return_value = None
-        mock_repositories['quickbooks_sync_repository'].create.return_value = new_sync
-        
-        # Act
-        service._record_sync('product', '456', 2, 'product', '3')
-        
-        # Assert - This will fail until we replace QuickBooksSync() + db.session.add()
-        mock_repositories['quickbooks_sync_repository'].create.assert_called_once()
+        entities = [c.args[0] for c in service.qb_service.query_pages.call_args_list]
+        assert entities == ['Customer', 'Item', 'Estimate', 'Invoice']
+        assert set(results) == {'customers', 'items', 'estimates', 'invoices'}
 
 
 class TestQuickBooksSyncServiceFinancialSummary:
@@ -651,55 +494,3 @@ class TestQuickBooksSyncServiceFinancialSummary:
         # Also verify the contact was updated with financial summary
         mock_repositories['contact_repository'].update.assert_called_once()
 
-
-class TestQuickBooksSyncServiceTransactionManagement:
-    """Test that transaction management is removed (no more db.session calls)"""
-    
-    @pytest.fixture
-    def mock_repositories(self):
-        return {
-            'contact_repository': Mock(spec=ContactRepository),
-            'product_repository': Mock(spec=ProductRepository),
-            'quote_repository': Mock(spec=QuoteRepository),
-            'invoice_repository': Mock(spec=InvoiceRepository),
-            'job_repository': Mock(spec=JobRepository),
-            'property_repository': Mock(spec=PropertyRepository),
-            'quickbooks_sync_repository': Mock(spec=QuickBooksSyncRepository),
-            'quote_line_item_repository': Mock(spec=QuoteLineItemRepository),
-            'invoice_line_item_repository': Mock(spec=InvoiceLineItemRepository)
-        }
-    
-    @pytest.fixture
-    def service(self, mock_repositories):
-        return QuickBooksSyncService(**mock_repositories)
-    
-    def test_sync_methods_do_not_handle_transactions(self, service, mock_repositories):
-        """Test that sync methods don't call db.session.commit() or rollback() - transaction handling moves to caller"""
-        # Arrange
-        service.qb_service = Mock()
-        service.qb_service.list_customers.return_value = []
-        service.qb_service.list_items.return_value = []
-        service.qb_service.list_estimates.return_value = []
-        service.qb_service.list_invoices.return_value = []
-        
-        # This test will pass immediately as it's just verifying no db.session calls
-        # The actual test is that the refactored code doesn't have any db.session imports or calls
-        
-        # Act
-        service.sync_customers()
-        service.sync_items()
-        service.sync_estimates()
-        service.sync_invoices()
-        
-        # Assert - No db.session calls should be made
-        # The repositories handle their own session management
-        pass  # This test passes by not failing - the real test is in the implementation
-
-
-# These tests will ALL FAIL until we refactor the service to use repositories
-# Expected failures:
-# 1. Constructor doesn't accept repository parameters
-# 2. All find operations use direct queries instead of repositories  
-# 3. All create operations use direct model instantiation + db.session.add
-# 4. All delete operations use direct queries
-# 5. Transaction management in service instead of repository layer
\ No newline at end of file
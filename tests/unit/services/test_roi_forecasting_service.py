@@ -0,0 +1,234 @@
+"""
+Tests for ROIForecastingService and the portfolio forecasting methods of ROICalculationService
+Verifies vectorized trend, seasonality, bootstrap intervals and scenario results
+"""
+
+import pytest
+import numpy as np
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import Mock
+from sqlalchemy.exc import OperationalError
+
+from services.roi_forecasting_service import ROIForecastingService
+from services.roi_calculation_service import ROICalculationService
+from repositories.roi_repository import ROIRepository
+from repositories.conversion_repository import ConversionRepository
+from repositories.campaign_repository import CampaignRepository
+from repositories.contact_repository import ContactRepository
+from services.cache_service import CacheService
+
+
+class TestROIForecastingService:
+    """Test the NumPy forecasting engine"""
+
+    @pytest.fixture
+    def engine(self):
+        return ROIForecastingService(bootstrap_samples=500, random_seed=7)
+
+    def test_build_matrices_pivots_rows(self, engine):
+        """Rows are placed by campaign and day offset; out-of-window rows are dropped"""
+        start = date(2025, 1, 1)
+        rows = [
+            (1, date(2025, 1, 1), Decimal('100.00'), Decimal('10.00')),
+            (2, '2025-01-03', Decimal('50.00'), None),
+            (1, date(2024, 12, 31), Decimal('999.00'), Decimal('1.00')),
+            (3, date(2025, 1, 2), Decimal('5.00'), Decimal('5.00')),
+        ]
+
+        revenue, cost = engine.build_matrices(rows, [1, 2], start, 3)
+
+        assert revenue.shape == (2, 3)
+        assert revenue[0].tolist() == [100.0, 0.0, 0.0]
+        assert revenue[1].tolist() == [0.0, 0.0, 50.0]
+        assert cost[0, 0] == 10.0
+        assert cost[1].sum() == 0.0
+
+    def test_fit_trend_matches_polyfit_per_row(self, engine):
+        """Vectorized least squares equals a per-campaign polyfit"""
+        rng = np.random.default_rng(1)
+        matrix = rng.normal(100, 10, size=(5, 30)) + np.arange(30) * np.arange(1, 6)[:, None]
+
+        slope, intercept = engine.fit_trend(matrix)
+
+        for row in range(5):
+            expected_slope, expected_intercept = np.polyfit(np.arange(30), matrix[row], 1)
+            assert slope[row] == pytest.approx(expected_slope)
+            assert intercept[row] == pytest.approx(expected_intercept)
+
+    def test_seasonal_index_detects_weekly_pattern(self, engine):
+        """A weekly spike shows up as a seasonal factor above 1"""
+        pattern = np.array([1, 1, 1, 1, 1, 3, 3], dtype=float)
+        matrix = np.tile(pattern, (2, 4))
+
+        index = engine.seasonal_index(matrix)
+
+        assert index.shape == (2, 7)
+        assert index[0, 5] > 1.5
+        assert index[0, 0] < 1.0
+        assert index.mean(axis=1) == pytest.approx([1.0, 1.0])
+
+    def test_seasonal_index_neutral_with_short_history(self, engine):
+        """Less than two full cycles yields a neutral index"""
+        index = engine.seasonal_index(np.ones((3, 10)))
+        assert np.all(index == 1.0)
+
+    def test_forecast_projects_trend_and_roi(self, engine):
+        """Growing revenue over flat cost forecasts an upward trend and higher ROI"""
+        days = 28
+        revenue = np.vstack([np.linspace(100, 200, days), np.full(days, 100.0)])
+        cost = np.full((2, days), 50.0)
+
+        forecast = engine.forecast(revenue, cost, forecast_days=14)
+
+        assert forecast['predicted_costs'] == pytest.approx([700.0, 700.0])
+        assert forecast['predicted_revenue'][0] > forecast['predicted_revenue'][1]
+        assert forecast['predicted_roi'][1] == pytest.approx(1.0)
+        assert engine.classify_trend(forecast['relative_change'][0]) == 'up'
+        assert engine.classify_trend(forecast['relative_change'][1]) == 'stable'
+
+    def test_bootstrap_intervals_are_reproducible_and_ordered(self):
+        """Seeded bootstrap gives identical intervals that bracket the point ROI"""
+        rng = np.random.default_rng(3)
+        revenue = rng.gamma(4.0, 50.0, size=(4, 60))
+        cost = rng.gamma(4.0, 20.0, size=(4, 60))
+
+        first = ROIForecastingService(bootstrap_samples=300, random_seed=11).bootstrap_roi_intervals(revenue, cost)
+        second = ROIForecastingService(bootstrap_samples=300, random_seed=11).bootstrap_roi_intervals(revenue, cost)
+
+        assert np.array_equal(first['lower'], second['lower'])
+        assert np.all(first['lower'] <= first['mean'])
+        assert np.all(first['upper'] >= first['mean'])
+        assert np.all(first['margin'] > 0)
+
+    def test_bootstrap_handles_campaigns_without_data(self, engine):
+        """Campaigns with no activity get a zero-width interval at ROI 0"""
+        revenue = np.zeros((1, 30))
+        cost = np.zeros((1, 30))
+
+        intervals = engine.bootstrap_roi_intervals(revenue, cost)
+
+        assert intervals['mean'][0] == 0.0
+        assert intervals['lower'][0] == 0.0
+        assert intervals['upper'][0] == 0.0
+        assert intervals['sample_size'][0] == 0
+
+    def test_scenario_matrix_matches_repository_rules(self, engine):
+        """Budget and conversion scenarios follow what_if_scenario_analysis"""
+        budgets = np.array([1000.0, 500.0])
+        rates = np.array([0.05, 0.0])
+        rois = np.array([2.0, 4.0])
+        scenarios = {
+            'budget_increase_50': {'budget_multiplier': 1.5},
+            'budget_cut': {'budget_multiplier': 0.5},
+            'conversion_boost': {'conversion_rate_increase': 0.01},
+        }
+
+        results = engine.scenario_matrix(budgets, rates, rois, scenarios)
+
+        assert results['budget_increase_50']['new_budget'] == pytest.approx([1500.0, 750.0])
+        assert results['budget_increase_50']['projected_roi'] == pytest.approx([1.8, 3.6])
+        assert results['budget_cut']['projected_roi'] == pytest.approx([2.2, 4.4])
+        assert results['conversion_boost']['projected_roi'] == pytest.approx([2.4, 4.0])
+
+    def test_forecast_to_dicts_restores_decimals(self, engine):
+        """API boundary returns the calculate_roi_forecast shape with Decimals"""
+        revenue = np.full((1, 14), 100.0)
+        cost = np.full((1, 14), 40.0)
+        forecast = engine.forecast(revenue, cost, forecast_days=10)
+
+        result = engine.forecast_to_dicts([42], forecast, 10)[0]
+
+        assert result['campaign_id'] == 42
+        assert result['forecast_period_days'] == 10
+        assert result['predicted_revenue'] == Decimal('1000.00')
+        assert result['predicted_costs'] == Decimal('400.00')
+        assert result['predicted_roi'] == Decimal('1.5000')
+        assert isinstance(result['confidence_interval']['lower'], Decimal)
+        assert result['trend_direction'] == 'stable'
+
+    def test_to_money_handles_non_finite(self):
+        assert ROIForecastingService.to_money(float('nan')) == Decimal('0.00')
+        assert ROIForecastingService.to_ratio(float('inf')) == Decimal('0.0000')
+
+
+class TestROICalculationServicePortfolio:
+    """Test portfolio forecasting and scenario modeling on ROICalculationService"""
+
+    @pytest.fixture
+    def roi_repository(self):
+        return Mock(spec=ROIRepository)
+
+    @pytest.fixture
+    def service(self, roi_repository):
+        return ROICalculationService(
+            roi_repository=roi_repository,
+            conversion_repository=Mock(spec=ConversionRepository),
+            campaign_repository=Mock(spec=CampaignRepository),
+            contact_repository=Mock(spec=ContactRepository),
+            cache_service=Mock(spec=CacheService),
+            forecasting_engine=ROIForecastingService(bootstrap_samples=200, random_seed=5)
+        )
+
+    def test_generate_portfolio_forecast_uses_single_query(self, service, roi_repository):
+        """All campaigns are loaded with one repository call and forecast together"""
+        today = date.today()
+        rows = []
+        for offset in range(30):
+            day = today - timedelta(days=offset)
+            rows.append((1, day, Decimal('200.00'), Decimal('50.00')))
+            rows.append((2, day, Decimal('60.00'), Decimal('50.00')))
+        roi_repository.get_daily_revenue_cost_matrix.return_value = rows
+
+        result = service.generate_portfolio_forecast([1, 2, 1], forecast_days=30)
+
+        assert result.is_success
+        roi_repository.get_daily_revenue_cost_matrix.assert_called_once()
+        assert roi_repository.get_daily_revenue_cost_matrix.call_args[0][0] == [1, 2]
+        campaigns = {c['campaign_id']: c for c in result.data['campaigns']}
+        assert campaigns[1]['predicted_roi'] > campaigns[2]['predicted_roi']
+        portfolio = result.data['portfolio']
+        assert portfolio['predicted_revenue'] == campaigns[1]['predicted_revenue'] + campaigns[2]['predicted_revenue']
+        assert isinstance(portfolio['predicted_roi'], Decimal)
+
+    def test_generate_portfolio_forecast_validates_input(self, service):
+        assert service.generate_portfolio_forecast([], 30).is_failure
+        assert service.generate_portfolio_forecast([1], 0).is_failure
+
+    def test_generate_portfolio_forecast_fails_on_database_error(self, service, roi_repository):
+        """A failed history query must not read as an all-zero forecast"""
+        roi_repository.get_daily_revenue_cost_matrix.side_effect = OperationalError('SELECT', {}, Exception('db down'))
+
+        result = service.generate_portfolio_forecast([1, 2], forecast_days=30)
+
+        assert result.is_failure
+        assert result.error_code == 'FORECAST_ERROR'
+
+    def test_portfolio_what_if_modeling_fails_on_database_error(self, service, roi_repository):
+        roi_repository.get_scenario_baselines.side_effect = OperationalError('SELECT', {}, Exception('db down'))
+
+        result = service.portfolio_what_if_modeling([1], {'budget_increase': {'budget_multiplier': 2.0}})
+
+        assert result.is_failure
+
+    def test_portfolio_what_if_modeling(self, service, roi_repository):
+        """Scenarios are evaluated for every campaign and the best one selected"""
+        roi_repository.get_scenario_baselines.return_value = {
+            1: {'current_budget': Decimal('1000.00'), 'current_conversion_rate': 0.05, 'current_roi': Decimal('2.0')},
+            2: {'current_budget': Decimal('0.00'), 'current_conversion_rate': 0.05, 'current_roi': Decimal('0.00')},
+        }
+        scenarios = {
+            'budget_increase': {'budget_multiplier': 2.0},
+            'conversion_boost': {'conversion_rate_increase': 0.02},
+        }
+
+        result = service.portfolio_what_if_modeling([1, 2], scenarios)
+
+        assert result.is_success
+        campaign = result.data['campaigns'][1]
+        assert campaign['scenarios']['budget_increase']['new_budget'] == Decimal('2000.00')
+        assert campaign['scenarios']['budget_increase']['projected_roi'] == Decimal('1.8000')
+        assert campaign['scenarios']['conversion_boost']['projected_roi'] == Decimal('2.8000')
+        assert campaign['best_scenario'] == 'conversion_boost'
+        assert result.data['campaigns'][2]['best_scenario'] is None
+        assert result.data['campaign_count'] == 2
@@ -15,6 +15,7 @@ from repositories.setting_repository import SettingRepository
 from repositories.job_repository import JobRepository
 from repositories.quote_repository import QuoteRepository
 from repositories.appointment_repository import AppointmentRepository
+from repositories.scheduled_notification_repository import ScheduledNotificationRepository
 from crm_database import Setting, Job, Quote, Appointment, Contact, Property
 
 
@@ -41,6 +42,11 @@ class TestSchedulerServiceRepositoryPattern:
         """Mock AppointmentRepository"""
         return Mock(spec=AppointmentRepository)
     
+    @pytest.fixture
+    def mock_scheduled_notification_repository(self):
+        """Mock ScheduledNotificationRepository"""
+        return Mock(spec=ScheduledNotificationRepository)
+    
     @pytest.fixture
     def mock_openphone_service(self):
         """Mock OpenPhoneService"""
@@ -54,6 +60,7 @@ class TestSchedulerServiceRepositoryPattern:
     @pytest.fixture
     def scheduler_service(self, mock_setting_repository, mock_job_repository, 
                          mock_quote_repository, mock_appointment_repository,
+                         mock_scheduled_notification_repository,
                          mock_openphone_service, mock_invoice_service):
         """Create SchedulerService with mocked repositories"""
         return SchedulerService(
@@ -61,6 +68,7 @@ class TestSchedulerServiceRepositoryPattern:
             job_repository=mock_job_repository,
             quote_repository=mock_quote_repository,
             appointment_repository=mock_appointment_repository,
+            scheduled_notification_repository=mock_scheduled_notification_repository,
             openphone_service=mock_openphone_service,
             invoice_service=mock_invoice_service
         )
@@ -73,13 +81,14 @@ class TestSchedulerServiceRepositoryPattern:
         mock_setting_repository.find_one_by.return_value = mock_template
         
         # Mock no appointments for tomorrow
-        scheduler_service.appointment_repository.find_by_date.return_value = []
+        scheduler_service.appointment_repository.find_by_date_with_contacts.return_value = []
         
         # Act
         result = scheduler_service.send_appointment_reminders()
         
         # Assert
         mock_setting_repository.find_one_by.assert_called_once_with(key='appointment_reminder_template')
+        assert result == {'queued': 0, 'skipped': 0}
     
     def test_send_appointment_reminders_no_template_aborts(self, scheduler_service, mock_setting_repository):
         """Test that missing template causes early abort"""
@@ -92,32 +101,33 @@ class TestSchedulerServiceRepositoryPattern:
         # Assert
         mock_setting_repository.find_one_by.assert_called_once_with(key='appointment_reminder_template')
         # Should not proceed to find appointments
-        scheduler_service.appointment_repository.find_by_date.assert_not_called()
+        scheduler_service.appointment_repository.find_by_date_with_contacts.assert_not_called()
     
     def test_send_appointment_reminders_finds_tomorrow_appointments(self, scheduler_service, 
                                                                   mock_setting_repository, 
                                                                   mock_appointment_repository):
-        """Test that service finds appointments for tomorrow"""
+        """Test that service finds appointments for tomorrow with contacts eager-loaded"""
         # Arrange
         mock_template = Mock()
         mock_template.value = 'Template'
         mock_setting_repository.find_one_by.return_value = mock_template
         
         tomorrow = date.today() + timedelta(days=1)
-        mock_appointments = []
-        mock_appointment_repository.find_by_date.return_value = mock_appointments
+        mock_appointment_repository.find_by_date_with_contacts.return_value = []
         
         # Act
         scheduler_service.send_appointment_reminders()
         
         # Assert
-        mock_appointment_repository.find_by_date.assert_called_once_with(tomorrow)
+        mock_appointment_repository.find_by_date_with_contacts.assert_called_once_with(tomorrow)
+        mock_appointment_repository.find_by_date.assert_not_called()
     
-    def test_send_appointment_reminders_sends_messages(self, scheduler_service, 
-                                                      mock_setting_repository,
-                                                      mock_appointment_repository,
-                                                      mock_openphone_service):
-        """Test that reminder messages are sent via OpenPhone"""
+    def test_send_appointment_reminders_queues_rendered_messages(self, scheduler_service, 
+                                                                mock_setting_repository,
+                                                                mock_appointment_repository,
+                                                                mock_scheduled_notification_repository,
+                                                                mock_openphone_service):
+        """Test that reminders are rendered, recorded and enqueued instead of sent inline"""
         # Arrange
         mock_template = Mock()
         mock_template.value = 'Hi {first_name}, reminder for {appointment_date} at {appointment_time}'
@@ -125,59 +135,71 @@ class TestSchedulerServiceRepositoryPattern:
         
         # Mock contact and appointment
         mock_contact = Mock()
+        mock_contact.id = 7
         mock_contact.first_name = 'John'
         mock_contact.phone = '+11234567890'
         
         mock_appointment = Mock()
+        mock_appointment.id = 123
         mock_appointment.contact = mock_contact
         mock_appointment.time = datetime.strptime('14:30', '%H:%M').time()
         
-        mock_appointment_repository.find_by_date.return_value = [mock_appointment]
-        mock_openphone_service.send_message.return_value = {'success': True}
+        mock_appointment_repository.find_by_date_with_contacts.return_value = [mock_appointment]
+        mock_scheduled_notification_repository.create_pending.return_value = [55]
         
         tomorrow = date.today() + timedelta(days=1)
         
         # Act
-        scheduler_service.send_appointment_reminders()
+        with patch('services.scheduler_service.send_scheduled_notification') as mock_task:
+            result = scheduler_service.send_appointment_reminders()
         
         # Assert
         formatted_date = tomorrow.strftime("%B %d, %Y")
-        expected_message = f'Hi John, reminder for {formatted_date} at 02:30 pm'
-        mock_openphone_service.send_message.assert_called_once_with('+11234567890', expected_message)
+        mock_scheduled_notification_repository.create_pending.assert_called_once_with(
+            'appointment_reminder', tomorrow, [{
+                'target_id': 123,
+                'contact_id': 7,
+                'phone': '+11234567890',
+                'message': f'Hi John, reminder for {formatted_date} at 02:30 pm'
+            }]
+        )
+        mock_task.delay.assert_called_once_with(55)
+        mock_openphone_service.send_message.assert_not_called()
+        assert result == {'queued': 1, 'skipped': 0}
     
-    def test_send_appointment_reminders_handles_sms_failure(self, scheduler_service,
-                                                           mock_setting_repository,
-                                                           mock_appointment_repository,
-                                                           mock_openphone_service):
-        """Test that SMS sending failures are logged"""
+    def test_send_appointment_reminders_enqueue_failure_leaves_pending(self, scheduler_service,
+                                                                      mock_setting_repository,
+                                                                      mock_appointment_repository,
+                                                                      mock_scheduled_notification_repository):
+        """Test that a broker failure is logged and the notification is left for the next run"""
         # Arrange
         mock_template = Mock()
         mock_template.value = 'Reminder template'
         mock_setting_repository.find_one_by.return_value = mock_template
         
-        mock_contact = Mock()
-        mock_contact.first_name = 'John'
-        mock_contact.phone = '+11234567890'
-        
         mock_appointment = Mock()
-        mock_appointment.contact = mock_contact
-        mock_appointment.id = 123
-        
-        mock_appointment_repository.find_by_date.return_value = [mock_appointment]
-        mock_openphone_service.send_message.return_value = {'success': False, 'error': 'API Error'}
-        
-        with patch('services.scheduler_service.logger') as mock_logger:
+        mock_appointment.contact.phone = '+11234567890'
+        mock_appointment.time = datetime.strptime('09:00', '%H:%M').time()
+        mock_appointment_repository.find_by_date_with_contacts.return_value = [mock_appointment]
+        mock_scheduled_notification_repository.create_pending.return_value = [55]
+        
+        with patch('services.scheduler_service.send_scheduled_notification') as mock_task, \
+             patch('services.scheduler_service.logger') as mock_logger:
+            mock_task.delay.side_effect = Exception('Broker down')
+            
             # Act
-            scheduler_service.send_appointment_reminders()
+            result = scheduler_service.send_appointment_reminders()
             
             # Assert
+            assert result == {'queued': 0, 'skipped': 0}
             mock_logger.error.assert_called_with(
-                "Failed to send SMS reminder for appointment 123. Error: API Error"
+                "Failed to enqueue appointment_reminder notification 55. Error: Broker down"
             )
     
     def test_send_appointment_reminders_skips_missing_contact(self, scheduler_service,
                                                              mock_setting_repository, 
-                                                             mock_appointment_repository):
+                                                             mock_appointment_repository,
+                                                             mock_scheduled_notification_repository):
         """Test that appointments without contact are skipped"""
         # Arrange
         mock_template = Mock()
@@ -188,16 +210,18 @@ class TestSchedulerServiceRepositoryPattern:
         mock_appointment.contact = None
         mock_appointment.id = 456
         
-        mock_appointment_repository.find_by_date.return_value = [mock_appointment]
+        mock_appointment_repository.find_by_date_with_contacts.return_value = [mock_appointment]
+        mock_scheduled_notification_repository.create_pending.return_value = []
         
         with patch('services.scheduler_service.logger') as mock_logger:
             # Act
-            scheduler_service.send_appointment_reminders()
+            result = scheduler_service.send_appointment_reminders()
             
             # Assert
             mock_logger.warning.assert_called_with(
                 "Skipping reminder for appointment 456: contact or phone number missing."
             )
+            assert result == {'queued': 0, 'skipped': 1}
     
     def test_send_review_requests_finds_template(self, scheduler_service, mock_setting_repository):
         """Test that review requests look up template from repository"""
@@ -207,7 +231,7 @@ class TestSchedulerServiceRepositoryPattern:
         mock_setting_repository.find_one_by.return_value = mock_template
         
         # Mock no completed jobs
-        scheduler_service.job_repository.find_completed_jobs_by_date.return_value = []
+        scheduler_service.job_repository.find_completed_jobs_with_contacts.return_value = []
         
         # Act
         scheduler_service.send_review_requests()
@@ -226,61 +250,68 @@ class TestSchedulerServiceRepositoryPattern:
         # Assert  
         mock_setting_repository.find_one_by.assert_called_once_with(key='review_request_template')
         # Should not proceed to find completed jobs
-        scheduler_service.job_repository.find_completed_jobs_by_date.assert_not_called()
+        scheduler_service.job_repository.find_completed_jobs_with_contacts.assert_not_called()
     
     def test_send_review_requests_finds_yesterday_jobs(self, scheduler_service,
                                                       mock_setting_repository,
                                                       mock_job_repository):
-        """Test that service finds completed jobs from yesterday"""
+        """Test that service finds completed jobs from yesterday with their contacts"""
         # Arrange
         mock_template = Mock()
         mock_template.value = 'Template'
         mock_setting_repository.find_one_by.return_value = mock_template
         
         yesterday = (utc_now().date() - timedelta(days=1))
-        mock_job_repository.find_completed_jobs_by_date.return_value = []
+        mock_job_repository.find_completed_jobs_with_contacts.return_value = []
         
         # Act
         scheduler_service.send_review_requests()
         
         # Assert
-        mock_job_repository.find_completed_jobs_by_date.assert_called_once_with(yesterday)
+        mock_job_repository.find_completed_jobs_with_contacts.assert_called_once_with(yesterday)
     
-    def test_send_review_requests_sends_messages(self, scheduler_service,
-                                               mock_setting_repository,
-                                               mock_job_repository,
-                                               mock_openphone_service):
-        """Test that review request messages are sent via OpenPhone"""
+    def test_send_review_requests_queues_rendered_messages(self, scheduler_service,
+                                                         mock_setting_repository,
+                                                         mock_job_repository,
+                                                         mock_scheduled_notification_repository):
+        """Test that review requests are recorded per job and enqueued"""
         # Arrange
         mock_template = Mock()
         mock_template.value = 'Hi {first_name}, please review us!'
         mock_setting_repository.find_one_by.return_value = mock_template
         
-        # Mock job with property and contact chain
         mock_contact = Mock()
+        mock_contact.id = 8
         mock_contact.first_name = 'Jane'
         mock_contact.phone = '+11234567890'
         
-        mock_property = Mock()
-        mock_property.contact = mock_contact
-        
         mock_job = Mock()
-        mock_job.property = mock_property
         mock_job.id = 789
         
-        mock_job_repository.find_completed_jobs_by_date.return_value = [mock_job]
-        mock_openphone_service.send_message.return_value = {'success': True}
+        mock_job_repository.find_completed_jobs_with_contacts.return_value = [(mock_job, mock_contact)]
+        mock_scheduled_notification_repository.create_pending.return_value = [66]
+        yesterday = utc_now().date() - timedelta(days=1)
         
         # Act
-        scheduler_service.send_review_requests()
+        with patch('services.scheduler_service.send_scheduled_notification') as mock_task:
+            result = scheduler_service.send_review_requests()
         
         # Assert
-        expected_message = 'Hi Jane, please review us!'
-        mock_openphone_service.send_message.assert_called_once_with('+11234567890', expected_message)
+        mock_scheduled_notification_repository.create_pending.assert_called_once_with(
+            'review_request', yesterday, [{
+                'target_id': 789,
+                'contact_id': 8,
+                'phone': '+11234567890',
+                'message': 'Hi Jane, please review us!'
+            }]
+        )
+        mock_task.delay.assert_called_once_with(66)
+        assert result == {'queued': 1, 'skipped': 0}
     
     def test_send_review_requests_skips_missing_contact(self, scheduler_service,
                                                        mock_setting_repository,
-                                                       mock_job_repository):
+                                                       mock_job_repository,
+                                                       mock_scheduled_notification_repository):
         """Test that jobs without property/contact are skipped"""
         # Arrange
         mock_template = Mock()
@@ -288,10 +319,10 @@ class TestSchedulerServiceRepositoryPattern:
         mock_setting_repository.find_one_by.return_value = mock_template
         
         mock_job = Mock()
-        mock_job.property = None
         mock_job.id = 999
         
-        mock_job_repository.find_completed_jobs_by_date.return_value = [mock_job]
+        mock_job_repository.find_completed_jobs_with_contacts.return_value = [(mock_job, None)]
+        mock_scheduled_notification_repository.create_pending.return_value = []
         
         with patch('services.scheduler_service.logger') as mock_logger:
             # Act
@@ -302,6 +333,85 @@ class TestSchedulerServiceRepositoryPattern:
                 "Skipping review request for job 999: property, contact, or phone missing."
             )
     
+    def _claimed(self, mock_scheduled_notification_repository, kind='appointment_reminder', target_id=123):
+        notification = Mock()
+        notification.kind = kind
+        notification.target_id = target_id
+        notification.phone = '+11234567890'
+        notification.message = 'Hi John'
+        mock_scheduled_notification_repository.claim.return_value = notification
+        return notification
+    
+    def test_send_notification_sends_and_marks_sent(self, scheduler_service,
+                                                   mock_scheduled_notification_repository,
+                                                   mock_openphone_service):
+        """Test that a claimed notification is sent and recorded as sent"""
+        # Arrange
+        self._claimed(mock_scheduled_notification_repository)
+        mock_openphone_service.send_message.return_value = {'success': True}
+        
+        # Act
+        result = scheduler_service.send_notification(55)
+        
+        # Assert
+        assert result.is_success
+        assert result.data == {'notification_id': 55, 'status': 'sent'}
+        mock_openphone_service.send_message.assert_called_once_with('+11234567890', 'Hi John')
+        mock_scheduled_notification_repository.mark_sent.assert_called_once_with(55)
+    
+    def test_send_notification_already_claimed_does_not_send(self, scheduler_service,
+                                                             mock_scheduled_notification_repository,
+                                                             mock_openphone_service):
+        """Test that a notification already sent or in flight is not sent again"""
+        # Arrange
+        mock_scheduled_notification_repository.claim.return_value = None
+        
+        # Act
+        result = scheduler_service.send_notification(55)
+        
+        # Assert
+        assert result.data['status'] == 'skipped'
+        mock_openphone_service.send_message.assert_not_called()
+    
+    def test_send_notification_handles_sms_failure(self, scheduler_service,
+                                                  mock_scheduled_notification_repository,
+                                                  mock_openphone_service):
+        """Test that SMS sending failures are logged and recorded for retry"""
+        # Arrange
+        self._claimed(mock_scheduled_notification_repository)
+        mock_openphone_service.send_message.return_value = {'success': False, 'error': 'API Error'}
+        
+        with patch('services.scheduler_service.logger') as mock_logger:
+            # Act
+            result = scheduler_service.send_notification(55)
+            
+            # Assert
+            mock_logger.error.assert_called_with(
+                "Failed to send SMS reminder for appointment 123. Error: API Error"
+            )
+        assert result.is_failure
+        assert result.error_code == 'SEND_FAILED'
+        mock_scheduled_notification_repository.mark_failed.assert_called_once_with(55, 'API Error')
+    
+    def test_send_notification_handles_send_exception(self, scheduler_service,
+                                                      mock_scheduled_notification_repository,
+                                                      mock_openphone_service):
+        """Test that exceptions from the SMS provider are recorded like failures"""
+        # Arrange
+        self._claimed(mock_scheduled_notification_repository, kind='review_request', target_id=789)
+        mock_openphone_service.send_message.side_effect = Exception('Timeout')
+        
+        with patch('services.scheduler_service.logger') as mock_logger:
+            # Act
+            result = scheduler_service.send_notification(66)
+            
+            # Assert
+            mock_logger.error.assert_called_with(
+                "Failed to send review request for job 789. Error: Timeout"
+            )
+        assert result.is_failure
+        mock_scheduled_notification_repository.mark_failed.assert_called_once_with(66, 'Timeout')
+    
     def test_convert_quotes_for_today_appointments_finds_today_appointments(self, scheduler_service,
                                                                            mock_appointment_repository):
         """Test that quote conversion finds today's appointments"""
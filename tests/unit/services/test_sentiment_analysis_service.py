@@ -0,0 +1,102 @@
+"""
+Tests for SentimentAnalysisService batched classification
+Verifies normalization, hash-keyed caching and batching of cache misses
+"""
+
+import pytest
+from unittest.mock import Mock
+
+from services.sentiment_analysis_service import SentimentAnalysisService, KeywordSentimentModel
+from repositories.sentiment_classification_repository import SentimentClassificationRepository
+
+
+class TestSentimentAnalysisService:
+    """Test the cached, batched classification pipeline"""
+    
+    @pytest.fixture
+    def mock_repository(self):
+        repository = Mock(spec=SentimentClassificationRepository)
+        repository.find_by_hashes.return_value = {}
+        return repository
+    
+    @pytest.fixture
+    def mock_model(self):
+        model = Mock()
+        model.version = 'test_v1'
+        model.classify_batch.side_effect = lambda texts: [
+            {'sentiment': 'positive', 'intent': 'interested', 'confidence': 0.9, 'source': text}
+            for text in texts
+        ]
+        return model
+    
+    @pytest.fixture
+    def service(self, mock_repository, mock_model):
+        return SentimentAnalysisService(
+            classification_repository=mock_repository,
+            model=mock_model,
+            batch_size=2
+        )
+    
+    def test_normalize_text_collapses_case_and_whitespace(self):
+        assert SentimentAnalysisService.normalize_text('  Yes\n\tPLEASE  call ') == 'yes please call'
+        assert SentimentAnalysisService.normalize_text(None) == ''
+    
+    def test_duplicates_classified_once_in_batches(self, service, mock_model, mock_repository):
+        """Normalized duplicates share a hash; misses go to the model batch_size at a time"""
+        texts = ['Yes!', 'yes!', 'Sounds good', 'Call me', 'Tomorrow']
+        
+        result = service.classify_batch(texts)
+        
+        assert result.is_success
+        assert len(result.data) == 5
+        assert result.data[0] == result.data[1]
+        classified = [text for call in mock_model.classify_batch.call_args_list for text in call.args[0]]
+        assert classified == ['yes!', 'sounds good', 'call me', 'tomorrow']
+        assert mock_model.classify_batch.call_count == 2
+        
+        saved, version = mock_repository.save_classifications.call_args.args
+        assert version == 'test_v1'
+        assert len(saved) == 4
+    
+    def test_cache_hits_skip_the_model(self, service, mock_model, mock_repository):
+        cached_hash = SentimentAnalysisService.hash_text('stop')
+        mock_repository.find_by_hashes.return_value = {
+            cached_hash: {'sentiment': 'negative', 'intent': 'opt_out', 'confidence': 0.5}
+        }
+        
+        result = service.classify_batch(['STOP', 'Interested'])
+        
+        assert result.data[0]['sentiment'] == 'negative'
+        assert result.data[1]['sentiment'] == 'positive'
+        mock_model.classify_batch.assert_called_once_with(['interested'])
+        assert service.get_analysis_stats()['cache_hits'] == 1
+        assert service.get_analysis_stats()['cache_misses'] == 1
+    
+    def test_empty_texts_get_fallback_result(self, service, mock_model):
+        result = service.bulk_analyze(['', None, 'Hello'])
+        
+        assert result.data[0] == {'sentiment': 'neutral', 'intent': 'unknown', 'confidence': 0.5}
+        assert result.data[1] == result.data[0]
+        mock_model.classify_batch.assert_called_once_with(['hello'])
+    
+    def test_cache_errors_do_not_fail_classification(self, service, mock_repository):
+        mock_repository.find_by_hashes.side_effect = Exception('db down')
+        mock_repository.save_classifications.side_effect = Exception('db down')
+        
+        result = service.classify_batch(['Yes'])
+        
+        assert result.is_success
+        assert result.data[0]['sentiment'] == 'positive'
+    
+    def test_analyze_response_rejects_blank_text(self, service):
+        assert service.analyze_response('   ').is_failure
+    
+    def test_default_keyword_model_without_cache(self):
+        service = SentimentAnalysisService()
+        
+        result = service.analyze_response("Yes, I'm very interested! Tell me more about this service.")
+        
+        assert result.is_success
+        assert result.data['sentiment'] == 'positive'
+        assert result.data['intent'] == 'interested'
+        assert service.get_analysis_stats()['model_version'] == KeywordSentimentModel.version
@@ -7,10 +7,12 @@ from unittest.mock import Mock, MagicMock, call
 import threading
 import time
 from services.service_registry_enhanced import (
+    HOT_PATH_TAG,
     ServiceRegistryEnhanced,
     ServiceLifecycle,
     ServiceDescriptor,
     create_enhanced_registry,
+    resolve_dotted_path,
     service
 )
 
@@ -369,6 +371,63 @@ class TestServiceRegistryEnhanced:
         assert 'service2' not in factory_calls
         assert 'service3' in factory_calls
     
+    def test_warmup_by_tag(self, registry):
+        """Test warming up only the hot path"""
+        factory_calls = []
+        
+        def make_factory(name):
+            def factory(**kwargs):
+                factory_calls.append(name)
+                return Mock()
+            return factory
+        
+        registry.register_singleton('repository', make_factory('repository'))
+        registry.register_singleton('webhook', make_factory('webhook'), dependencies=['repository'],
+                                    tags={HOT_PATH_TAG})
+        registry.register_singleton('reports', make_factory('reports'), tags={'analytics'})
+        registry.register_transient('handler', make_factory('handler'), tags={HOT_PATH_TAG})
+        
+        timings = registry.warmup(tags={HOT_PATH_TAG})
+        
+        # Dependencies of hot services are built with them; transients never are
+        assert factory_calls == ['repository', 'webhook']
+        assert list(timings) == ['webhook']
+    
+    def test_register_lazy_imports_on_first_get(self, registry, tmp_path, monkeypatch):
+        """Test dotted-path services import their module only when resolved"""
+        (tmp_path / 'lazy_registry_target.py').write_text(
+            "class Greeter:\n"
+            "    def __init__(self, name):\n"
+            "        self.name = name\n"
+        )
+        monkeypatch.syspath_prepend(str(tmp_path))
+        import sys
+        monkeypatch.delitem(sys.modules, 'lazy_registry_target', raising=False)
+        
+        registry.register('name', service='world')
+        registry.register_lazy('greeter', 'lazy_registry_target:Greeter', dependencies=['name'])
+        
+        assert 'lazy_registry_target' not in sys.modules
+        assert registry.get_service_info('greeter')['target'] == 'lazy_registry_target:Greeter'
+        
+        greeter = registry.get('greeter')
+        
+        assert greeter.name == 'world'
+        assert registry.get('greeter') is greeter
+        assert 'lazy_registry_target' in sys.modules
+    
+    def test_resolve_dotted_path(self):
+        """Test both dotted path forms and errors"""
+        from collections import OrderedDict
+        
+        assert resolve_dotted_path('collections:OrderedDict') is OrderedDict
+        assert resolve_dotted_path('collections.OrderedDict') is OrderedDict
+        assert resolve_dotted_path('collections:OrderedDict.fromkeys') == OrderedDict.fromkeys
+        with pytest.raises(ImportError, match="has no attribute"):
+            resolve_dotted_path('collections:Missing')
+        with pytest.raises(ImportError):
+            resolve_dotted_path('no_such_module_anywhere:thing')
+    
     def test_get_service_info(self, registry):
         """Test getting service information"""
         registry.register_factory(
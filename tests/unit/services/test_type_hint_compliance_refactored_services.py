@@ -292,8 +292,11 @@ class TestCampaignServiceTypeHints:
             {'id': 1, 'phone': '+11234567890', 'first_name': 'John'},
             {'id': 2, 'phone': '+10987654321', 'first_name': 'Jane'}
         ]
-        mock_contact_repository.get_all.return_value = mock_contacts
-        mock_contact_flag_repository.get_contact_ids_with_flag_type.return_value = []  # No opted out contacts
+        mock_contact_repository.iter_audience_ids.return_value = iter([[1, 2]])
+        mock_contact_repository.get_by_ids.return_value = [
+            Mock(id=contact['id'], phone=contact['phone'], first_name=contact['first_name'], last_name=None, email=None)
+            for contact in mock_contacts
+        ]
         
         # Act
         result = service.get_eligible_contacts(filters)
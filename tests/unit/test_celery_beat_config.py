@@ -87,7 +87,11 @@ class TestCeleryBeatConfiguration:
                 'cleanup-expired-campaigns',
                 'send-schedule-notifications',
                 'validate-scheduled-campaigns',
-                'archive-old-campaigns'
+                'archive-old-campaigns',
+                'reconcile-dashboard-snapshot',
+                'maintain-partitions',
+                'refresh-dynamic-lists',
+                'refresh-campaign-attribution'
             }
             actual_tasks = set(beat_schedule.keys())
             
@@ -185,4 +189,57 @@ class TestCeleryBeatConfiguration:
             # Check campaign task path
             campaign_task_path = beat_schedule['process-campaign-queue']['task']
             assert isinstance(campaign_task_path, str)
-            assert campaign_task_path == 'tasks.campaign_tasks.process_campaign_queue'
\ No newline at end of file
+            assert campaign_task_path == 'tasks.campaign_tasks.process_campaign_queue'
+    
+    def test_dashboard_snapshot_reconciliation_schedule(self):
+        """Test that the dashboard snapshot is reconciled every 10 minutes"""
+        # Import after mocking to ensure clean state
+        with patch('app.create_app') as mock_create_app:
+            mock_app = MagicMock()
+            mock_create_app.return_value = mock_app
+            
+            # Import celery_worker to get the configuration
+            import celery_worker
+            
+            snapshot_config = celery_worker.celery.conf.beat_schedule['reconcile-dashboard-snapshot']
+            assert snapshot_config['task'] == 'tasks.dashboard_tasks.reconcile_dashboard_snapshot'
+            assert snapshot_config['schedule'] == 600.0
+    
+    def test_partition_maintenance_runs_daily(self):
+        """Test that partition maintenance is scheduled once a day"""
+        with patch('app.create_app') as mock_create_app:
+            mock_app = MagicMock()
+            mock_create_app.return_value = mock_app
+            
+            import celery_worker
+            from celery.schedules import crontab
+            
+            partition_config = celery_worker.celery.conf.beat_schedule['maintain-partitions']
+            assert partition_config['task'] == 'tasks.partition_tasks.maintain_partitions'
+            assert partition_config['schedule'] == crontab(hour=0, minute=30)
+    
+    def test_dynamic_list_refresh_runs_hourly(self):
+        """Test that dynamic lists are refreshed every hour"""
+        with patch('app.create_app') as mock_create_app:
+            mock_app = MagicMock()
+            mock_create_app.return_value = mock_app
+            
+            import celery_worker
+            from celery.schedules import crontab
+            
+            refresh_config = celery_worker.celery.conf.beat_schedule['refresh-dynamic-lists']
+            assert refresh_config['task'] == 'tasks.campaign_list_tasks.refresh_dynamic_lists'
+            assert refresh_config['schedule'] == crontab(minute=15)
+    
+    def test_campaign_attribution_refresh_runs_hourly(self):
+        """Test that campaign attribution is rebuilt every hour"""
+        with patch('app.create_app') as mock_create_app:
+            mock_app = MagicMock()
+            mock_create_app.return_value = mock_app
+            
+            import celery_worker
+            from celery.schedules import crontab
+            
+            refresh_config = celery_worker.celery.conf.beat_schedule['refresh-campaign-attribution']
+            assert refresh_config['task'] == 'tasks.attribution_tasks.refresh_campaign_attribution'
+            assert refresh_config['schedule'] == crontab(minute=45)
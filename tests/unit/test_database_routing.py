@@ -0,0 +1,140 @@
+"""
+Tests for engine pool settings, pool wait statistics and read replica routing
+"""
+
+import sqlite3
+
+import pytest
+from flask import Flask
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from config import build_engine_options, configure_database_engines
+from crm_database import Contact
+from extensions import db
+from utils.database import REPLICA_BIND, InstrumentedQueuePool, RoutingSession, pool_stats, read_only, replica_reads
+
+POSTGRES_URI = 'postgresql://crm@db/crm'
+
+SETTINGS = {
+    'DB_POOL_SIZE': 5, 'DB_MAX_OVERFLOW': 10, 'DB_POOL_TIMEOUT': 30, 'DB_POOL_RECYCLE': 1800,
+    'DB_STATEMENT_TIMEOUT_MS': 30000,
+    'WORKER_DB_POOL_SIZE': 2, 'WORKER_DB_MAX_OVERFLOW': 3, 'WORKER_DB_POOL_TIMEOUT': 60,
+    'WORKER_DB_STATEMENT_TIMEOUT_MS': 600000
+}
+
+
+class TestEngineOptions:
+    """Pool sizes and statement timeouts per process type"""
+
+    def test_web_process(self):
+        options = build_engine_options(SETTINGS, POSTGRES_URI, 'web')
+
+        assert options['poolclass'] is InstrumentedQueuePool
+        assert (options['pool_size'], options['max_overflow'], options['pool_timeout']) == (5, 10, 30)
+        assert options['pool_recycle'] == 1800
+        assert options['pool_pre_ping'] is True
+        assert options['connect_args'] == {'options': '-c statement_timeout=30000'}
+
+    def test_worker_process(self):
+        options = build_engine_options(SETTINGS, POSTGRES_URI, 'worker')
+
+        assert (options['pool_size'], options['max_overflow'], options['pool_timeout']) == (2, 3, 60)
+        assert options['connect_args'] == {'options': '-c statement_timeout=600000'}
+
+    def test_replica_connections_are_read_only(self):
+        options = build_engine_options(SETTINGS, POSTGRES_URI, 'web', read_only=True)
+
+        assert 'default_transaction_read_only=on' in options['connect_args']['options']
+
+    def test_sqlite_keeps_default_pool(self):
+        assert build_engine_options(SETTINGS, 'sqlite:///:memory:', 'web') == {}
+
+    def test_replica_bind_configured_from_url(self):
+        app = Flask(__name__)
+        app.config.update(SETTINGS, SQLALCHEMY_DATABASE_URI=POSTGRES_URI, DATABASE_READ_REPLICA_URL=POSTGRES_URI + '_ro')
+
+        configure_database_engines(app, 'worker')
+
+        assert app.config['SQLALCHEMY_ENGINE_OPTIONS']['pool_size'] == 2
+        replica = app.config['SQLALCHEMY_BINDS'][REPLICA_BIND]
+        assert replica['url'] == POSTGRES_URI + '_ro'
+        assert replica['pool_size'] == 2
+
+
+class TestInstrumentedQueuePool:
+    """Checkout waits and timeouts are counted"""
+
+    def test_wait_stats_and_utilization(self):
+        pool = InstrumentedQueuePool(lambda: sqlite3.connect(':memory:'), pool_size=1, max_overflow=0, timeout=0.05)
+
+        held = pool.connect()
+        with pytest.raises(PoolTimeoutError):
+            pool.connect()
+
+        stats = pool_stats(pool)
+        assert stats['checked_out'] == 1
+        assert stats['utilization'] == 1.0
+        assert stats['checkout_wait']['checkouts'] == 2
+        assert stats['checkout_wait']['timeouts'] == 1
+        assert stats['checkout_wait']['max_wait_ms'] >= 50
+        held.close()
+
+
+@pytest.fixture
+def routed(tmp_path):
+    """Session on an app with separate primary and replica SQLite files"""
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'primary.db'}",
+        DATABASE_READ_REPLICA_URL=f"sqlite:///{tmp_path / 'replica.db'}"
+    )
+    configure_database_engines(app)
+    db.init_app(app)
+
+    with app.app_context():
+        for engine in (db.engines[None], db.engines[REPLICA_BIND]):
+            Contact.__table__.create(engine)
+            with engine.begin() as connection:
+                name = 'Replica' if engine is db.engines[REPLICA_BIND] else 'Primary'
+                connection.execute(Contact.__table__.insert(),
+                                   {'first_name': name, 'last_name': 'Contact', 'phone': '+15550000001'})
+        session = RoutingSession(db)
+        yield session
+        session.close()
+        for engine in db.engines.values():
+            engine.dispose()
+    # init_app registers a metadata per bind key on the shared db; the other test apps have no replica
+    db.metadatas.pop(REPLICA_BIND, None)
+
+
+def _first_names(session):
+    return sorted(contact.first_name for contact in session.query(Contact).all())
+
+
+class TestReplicaRouting:
+    """Only flagged SELECTs go to the replica, and never after a write"""
+
+    def test_reads_use_primary_by_default(self, routed):
+        assert _first_names(routed) == ['Primary']
+
+    def test_flagged_reads_use_replica(self, routed):
+        with replica_reads():
+            assert _first_names(routed) == ['Replica']
+
+        @read_only
+        def analytics():
+            return _first_names(routed)
+
+        assert analytics() == ['Replica']
+        assert _first_names(routed) == ['Primary']
+
+    def test_reads_after_write_stay_on_primary_until_commit(self, routed):
+        routed.add(Contact(first_name='Written', last_name='Contact', phone='+15550000002'))
+        routed.flush()
+
+        with replica_reads():
+            assert _first_names(routed) == ['Primary', 'Written']
+
+        routed.commit()
+        with replica_reads():
+            assert _first_names(routed) == ['Replica']
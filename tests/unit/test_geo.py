@@ -0,0 +1,70 @@
+"""
+Tests for the geohash and distance helpers in utils.geo
+"""
+
+import numpy as np
+import pytest
+
+from utils import geo
+
+
+class TestEncodeGeohash:
+    """Geohash encoding"""
+
+    def test_known_value(self):
+        assert geo.encode_geohash(57.64911, 10.40744, 11) == 'u4pruydqqvj'
+
+    def test_default_precision(self):
+        assert len(geo.encode_geohash(42.2, -71.0)) == geo.GEOHASH_PRECISION
+
+    def test_prefix_is_coarser_cell(self):
+        assert geo.encode_geohash(42.2, -71.0).startswith(geo.encode_geohash(42.2, -71.0, 5))
+
+    @pytest.mark.parametrize('latitude, longitude', [(None, -71.0), (42.2, None), (91, 0), (0, 181)])
+    def test_geohash_for_missing_or_invalid(self, latitude, longitude):
+        assert geo.geohash_for(latitude, longitude) is None
+
+
+class TestCoveringCells:
+    """Cells that cover a bounding box"""
+
+    def test_every_point_in_box_falls_in_a_cell(self):
+        bbox = geo.radius_bbox(42.2, -71.0, 2)
+        cells = geo.covering_cells(bbox)
+        rng = np.random.default_rng(1)
+        latitudes = rng.uniform(bbox[0], bbox[2], 500)
+        longitudes = rng.uniform(bbox[1], bbox[3], 500)
+
+        for latitude, longitude in zip(latitudes, longitudes):
+            geohash = geo.encode_geohash(latitude, longitude)
+            assert any(cell <= geohash < cell + geo.PREFIX_RANGE_END for cell in cells)
+
+    def test_respects_max_cells(self):
+        assert len(geo.covering_cells(geo.radius_bbox(42.2, -71.0, 30), max_cells=8)) <= 8
+
+    def test_empty_box(self):
+        assert geo.covering_cells((1, 1, 0, 0)) == []
+
+
+class TestHaversine:
+    """Vectorized distances"""
+
+    def test_matches_scalar_formula(self):
+        # Boston to New York, about 190 miles
+        distances = geo.haversine_miles(42.3601, -71.0589, np.array([40.7128]), np.array([-74.0060]))
+        assert distances[0] == pytest.approx(190, abs=2)
+
+    def test_zero_distance(self):
+        assert geo.haversine_miles(10, 10, [10.0], [10.0])[0] == 0
+
+    @pytest.mark.parametrize('latitude', [0.0, 42.2, 60.0, -75.0])
+    def test_radius_bbox_contains_every_point_within_radius(self, latitude):
+        min_lat, min_lng, max_lat, max_lng = geo.radius_bbox(latitude, 10.0, 25)
+        rng = np.random.default_rng(2)
+        latitudes = rng.uniform(latitude - 1, latitude + 1, 20000)
+        longitudes = rng.uniform(8.0, 12.0, 20000)
+        inside = geo.haversine_miles(latitude, 10.0, latitudes, longitudes) <= 25
+
+        assert inside.any()
+        assert np.all((latitudes[inside] >= min_lat) & (latitudes[inside] <= max_lat))
+        assert np.all((longitudes[inside] >= min_lng) & (longitudes[inside] <= max_lng))
@@ -0,0 +1,22 @@
+"""
+Tests for deferred module imports
+"""
+
+import sys
+
+from utils.lazy_imports import lazy_module
+
+
+class TestLazyModule:
+    """The real module is imported on first attribute access"""
+
+    def test_imports_on_first_attribute_access(self, monkeypatch):
+        monkeypatch.delitem(sys.modules, 'colorsys', raising=False)
+
+        colorsys = lazy_module('colorsys')
+
+        assert not colorsys.is_loaded
+        assert 'colorsys' not in sys.modules
+        assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+        assert colorsys.is_loaded
+        assert 'colorsys' in sys.modules
@@ -0,0 +1,125 @@
+"""
+Tests for the shared import normalizers in utils.normalization
+
+The golden corpus was recorded from the per-service implementations these
+normalizers replaced (PropertyRadarImportService, CSVImportService and
+QuickBooksSyncService), so any behaviour drift shows up here.
+"""
+
+import json
+import os
+from functools import partial
+
+import pytest
+
+from utils import normalization
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), '..', 'fixtures', 'normalization_golden.json')
+
+with open(GOLDEN_PATH) as golden_file:
+    GOLDEN = json.load(golden_file)
+
+NORMALIZERS = {
+    'normalize_name': normalization.normalize_name,
+    'parse_name': lambda value: list(normalization.parse_name(value)),
+    'normalize_address': normalization.normalize_address,
+    'normalize_city': normalization.normalize_city,
+    'normalize_propertyradar_phone': normalization.normalize_propertyradar_phone,
+    'normalize_us_phone': normalization.normalize_us_phone,
+    'normalize_us_phone_rejecting_repeated_digits': partial(
+        normalization.normalize_us_phone, reject_repeated_digits=True
+    ),
+}
+
+
+@pytest.fixture(autouse=True)
+def cold_caches():
+    normalization.clear_caches()
+    yield
+    normalization.clear_caches()
+
+
+@pytest.mark.parametrize('name', sorted(NORMALIZERS))
+def test_matches_golden_outputs(name):
+    normalizer = NORMALIZERS[name]
+    mismatches = [
+        (value, expected, normalizer(value))
+        for value, expected in GOLDEN[name]
+        if normalizer(value) != expected
+    ]
+    assert mismatches == []
+
+
+@pytest.mark.parametrize('name', sorted(NORMALIZERS))
+def test_cached_results_match_golden_outputs(name):
+    """Second pass is served from the caches and must not change anything"""
+    normalizer = NORMALIZERS[name]
+    for value, _ in GOLDEN[name]:
+        normalizer(value)
+
+    assert [normalizer(value) for value, _ in GOLDEN[name]] == [expected for _, expected in GOLDEN[name]]
+
+
+class TestNormalizers:
+    """Spot checks for the quirks the golden corpus pins"""
+
+    def test_name_prefixes_and_suffixes(self):
+        assert normalization.normalize_name("PATRICK O'BRIEN-MCDONALD JR.") == "Patrick O'Brien-Mcdonald Jr."
+        assert normalization.normalize_name('MACK MCDONALD III') == 'MacK McDonald III'
+
+    def test_mixed_case_names_and_cities_are_kept(self):
+        assert normalization.normalize_name('McCAIN  Smith') == 'McCAIN Smith'
+        assert normalization.normalize_city('St. Louis') == 'St. Louis'
+
+    def test_hyphenated_city_capitalizes_around_hyphens_only(self):
+        assert normalization.normalize_city('WINSTON-SALEM') == 'Winston-Salem'
+        assert normalization.normalize_city('NEW YORK-NEW JERSEY') == 'New york-New jersey'
+
+    def test_address_tokens(self):
+        assert normalization.normalize_address('12 NORTH ELM STREET APARTMENT 4B') == '12 N Elm St Apt 4B'
+        assert normalization.normalize_address('p.o. box 99') == 'PO Box 99'
+
+    def test_parse_name_keeps_suffix_with_last_name(self):
+        assert normalization.parse_name('Mary Jane Smith Jr.') == ('Mary Jane', 'Smith Jr.')
+        assert normalization.parse_name('Smith') == ('', 'Smith')
+
+    def test_phone_variants(self):
+        assert normalization.normalize_propertyradar_phone('123-4567') == '+15551234567'
+        assert normalization.normalize_us_phone('123-4567') is None
+        assert normalization.normalize_us_phone(5551234567) == '+15551234567'
+        assert normalization.normalize_us_phone('1-555-555-5555') == '+15555555555'
+        assert normalization.normalize_us_phone('1-555-555-5555', reject_repeated_digits=True) is None
+
+
+class TestNormalizeColumn:
+    """Batch column API"""
+
+    def test_preserves_order_and_duplicates(self):
+        values = ['BOSTON', 'quincy', 'BOSTON', '', 'BOSTON']
+
+        assert normalization.normalize_column(values, normalization.normalize_city) == [
+            'Boston', 'Quincy', 'Boston', '', 'Boston'
+        ]
+
+    def test_calls_normalizer_once_per_distinct_value(self):
+        calls = []
+
+        def normalizer(value):
+            calls.append(value)
+            return value.lower()
+
+        result = normalization.normalize_column(iter(['A', 'B', 'A', 'A']), normalizer)
+
+        assert result == ['a', 'b', 'a', 'a']
+        assert calls == ['A', 'B']
+
+
+def test_cache_info_reports_hits_and_clear_caches_resets():
+    normalization.normalize_city('BOSTON')
+    normalization.normalize_city('BOSTON')
+
+    assert normalization.cache_info()['normalize_city'].hits == 1
+
+    normalization.clear_caches()
+
+    assert all(info.currsize == 0 for info in normalization.cache_info().values())
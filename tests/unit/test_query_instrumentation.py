@@ -0,0 +1,143 @@
+"""
+Tests for per-request and per-task SQL query instrumentation
+"""
+
+import pytest
+from sqlalchemy import text
+
+from crm_database import Contact
+from utils import query_instrumentation
+from utils.query_instrumentation import QueryStats, query_scope, statement_shape, task_scope
+
+
+@pytest.fixture(autouse=True)
+def fresh_aggregates():
+    query_instrumentation.install()
+    query_instrumentation.aggregates.reset()
+    yield
+    query_instrumentation.aggregates.reset()
+
+
+class TestStatementShape:
+    """Statements issued for different rows share a shape"""
+
+    def test_literals_and_parameters_collapse(self):
+        first = statement_shape("SELECT * FROM contact WHERE id = 5 AND name = 'Ann'")
+        second = statement_shape("SELECT * FROM contact WHERE id = 71 AND name = 'O''Brien'")
+        assert first == second == "SELECT * FROM contact WHERE id = ? AND name = ?"
+
+    def test_bind_styles_and_in_lists_collapse(self):
+        assert statement_shape("SELECT id FROM t WHERE id IN (?, ?, ?)") == "SELECT id FROM t WHERE id IN (?)"
+        assert statement_shape("SELECT id FROM t WHERE a = %(a_1)s AND b = :b AND c = $1") == \
+            "SELECT id FROM t WHERE a = ? AND b = ? AND c = ?"
+        assert statement_shape("SELECT CAST(x AS TEXT)::text FROM anon_1") == "SELECT CAST(x AS TEXT)::text FROM anon_1"
+
+    def test_multi_row_values_collapse(self):
+        assert statement_shape("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") == "INSERT INTO t (a, b) VALUES (?)"
+
+
+class TestQueryStats:
+    """Counting, timing and N+1 detection within a scope"""
+
+    def test_counts_time_and_slowest(self):
+        stats = QueryStats('test')
+        for index, duration in enumerate([1.0, 9.0, 3.0, 2.0, 8.0, 5.0]):
+            stats.record(f"SELECT {index}", duration)
+
+        assert stats.count == 6
+        assert stats.total_ms == pytest.approx(28.0)
+        assert [entry['duration_ms'] for entry in stats.slowest] == [9.0, 8.0, 5.0, 3.0, 2.0]
+
+    def test_repeated_select_shape_is_n_plus_one(self):
+        stats = QueryStats('test', n_plus_one_threshold=3)
+        for contact_id in range(3):
+            stats.record(f"SELECT * FROM property WHERE contact_id = {contact_id}", 1.0)
+        for contact_id in range(5):
+            stats.record(f"UPDATE contact SET x = 1 WHERE id = {contact_id}", 1.0)
+
+        assert stats.n_plus_one == [{'statement': 'SELECT * FROM property WHERE contact_id = ?', 'count': 3}]
+
+    def test_nested_scopes_count_toward_parents(self, db_session):
+        with query_scope('outer', publish=False) as outer:
+            db_session.execute(text('SELECT 1'))
+            with query_scope('inner', publish=False) as inner:
+                db_session.execute(text('SELECT 2'))
+
+        assert inner.count == 1
+        assert outer.count == 2
+
+
+class TestScopes:
+    """Scopes feed the listeners, logs and process-wide aggregates"""
+
+    def test_no_scope_records_nothing(self, db_session):
+        assert query_instrumentation.current_scope() is None
+        db_session.execute(text('SELECT 1'))
+        assert query_instrumentation.aggregates.snapshot()['scopes'] == []
+
+    def test_finished_scope_is_logged_and_aggregated(self, db_session, mocker):
+        log = mocker.patch.object(query_instrumentation.performance_logger, 'log_query_stats')
+
+        for _ in range(2):
+            with query_scope('report'):
+                for contact_id in range(12):
+                    db_session.query(Contact).filter_by(id=contact_id).first()
+
+        log.assert_called()
+        assert log.call_args.args[0]['query_count'] == 12
+        snapshot = query_instrumentation.aggregates.snapshot()
+        [report] = snapshot['scopes']
+        assert report['label'] == 'report'
+        assert report['scopes'] == 2
+        assert report['query_count'] == 24
+        assert report['n_plus_one_scopes'] == 2
+        assert snapshot['recent_n_plus_one'][0]['count'] == 12
+
+    def test_task_scope_labels_queries_with_task_name(self, db_session):
+        with task_scope('tasks.campaign_tasks.process_campaign_queue'):
+            db_session.execute(text('SELECT 1'))
+
+        [task] = query_instrumentation.aggregates.snapshot()['scopes']
+        assert task['label'] == 'task:tasks.campaign_tasks.process_campaign_queue'
+
+    def test_request_scope_uses_endpoint(self, client):
+        client.get('/api/health')
+
+        labels = [scope['label'] for scope in query_instrumentation.aggregates.snapshot()['scopes']]
+        assert 'api.health_check' in labels
+
+    def test_diagnostics_service_exposes_statistics(self, app, db_session):
+        with query_scope('report'):
+            db_session.execute(text('SELECT 1'))
+
+        statistics = app.services.get('diagnostics').get_query_statistics()
+
+        assert statistics['enabled'] is True
+        assert statistics['scopes'][0]['label'] == 'report'
+
+
+class TestQueryBudget:
+    """The query_budget fixture fails tests that exceed their budget"""
+
+    def test_within_budget(self, db_session, query_budget):
+        with query_budget(2) as stats:
+            db_session.execute(text('SELECT 1'))
+
+        assert stats.count == 1
+
+    def test_over_budget_fails(self, db_session, query_budget):
+        with pytest.raises(AssertionError, match='at most 1 queries, ran 2'):
+            with query_budget(1):
+                db_session.execute(text('SELECT 1'))
+                db_session.execute(text('SELECT 2'))
+
+    def test_n_plus_one_fails_unless_allowed(self, db_session, query_budget):
+        with pytest.raises(AssertionError, match='Probable N\\+1'):
+            with query_budget(50):
+                for contact_id in range(10):
+                    db_session.query(Contact).filter_by(id=contact_id).first()
+
+        with query_budget(50, allow_n_plus_one=True) as stats:
+            for contact_id in range(10):
+                db_session.query(Contact).filter_by(id=contact_id).first()
+        assert stats.n_plus_one
@@ -0,0 +1,145 @@
+"""
+Engine pooling and read-replica routing.
+
+InstrumentedQueuePool is the QueuePool used for PostgreSQL engines; it
+records how long checkouts wait for a free connection so pool pressure shows
+up in DiagnosticsRepository.get_connection_pool_stats.
+
+RoutingSession is the session class behind db.session. When a read replica
+bind is configured (DATABASE_READ_REPLICA_URL), SELECTs issued inside a
+read_only repository method or a replica_reads() block go to the replica.
+Everything else stays on the primary, and so does every read once the
+session has written in the current transaction (read-your-writes), since
+the replica may not have those rows yet.
+"""
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator
+
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+REPLICA_BIND = 'replica'
+
+_replica_reads: ContextVar[bool] = ContextVar('replica_reads', default=False)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that tracks checkout wait time and timeouts"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._wait_lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            with self._wait_lock:
+                self._timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._wait_lock:
+                self._checkouts += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+
+    def wait_stats(self) -> Dict[str, Any]:
+        """Checkout wait statistics since the pool was created"""
+        with self._wait_lock:
+            return {
+                'checkouts': self._checkouts,
+                'timeouts': self._timeouts,
+                'avg_wait_ms': round(self._total_wait * 1000 / self._checkouts, 3) if self._checkouts else 0.0,
+                'max_wait_ms': round(self._max_wait * 1000, 3)
+            }
+
+
+def pool_stats(pool) -> Dict[str, Any]:
+    """
+    Size, usage and checkout waits of a connection pool.
+
+    Args:
+        pool: SQLAlchemy pool of an engine
+
+    Returns:
+        Dictionary of pool statistics; utilization is checked-out connections
+        over the most the pool will open (pool_size + max_overflow)
+    """
+    stats = {
+        'pool_size': pool.size(),
+        'checked_in': pool.checkedin(),
+        'checked_out': pool.checkedout(),
+        'overflow': pool.overflow(),
+        'invalid': getattr(pool, 'invalid', lambda: 0)()
+    }
+
+    max_overflow = getattr(pool, '_max_overflow', None)
+    if isinstance(max_overflow, int):
+        capacity = stats['pool_size'] + max(max_overflow, 0)
+        stats['max_overflow'] = max_overflow
+        stats['utilization'] = round(stats['checked_out'] / capacity, 3) if capacity else 0.0
+    if isinstance(pool, InstrumentedQueuePool):
+        stats['checkout_wait'] = pool.wait_stats()
+    return stats
+
+
+def read_only(method):
+    """Route a repository method's SELECTs to the read replica when one is configured"""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        token = _replica_reads.set(True)
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+    return wrapper
+
+
+@contextmanager
+def replica_reads() -> Iterator[None]:
+    """Route the block's SELECTs to the read replica when one is configured"""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that sends read-only SELECTs to the replica bind"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _replica_reads.get() and self._can_read_replica(clause):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _can_read_replica(self, clause) -> bool:
+        # Flushes and session.connection() pass no SELECT clause and stay on the primary
+        if clause is None or not getattr(clause, 'is_select', False):
+            return False
+        return not (self._flushing or self.new or self.dirty or self.deleted or self.info.get('has_writes'))
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_writes(session, flush_context):
+    session.info['has_writes'] = True
+
+
+@event.listens_for(RoutingSession, 'after_transaction_end')
+def _clear_writes(session, transaction):
+    if transaction.parent is None:
+        session.info.pop('has_writes', None)
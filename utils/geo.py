@@ -0,0 +1,164 @@
+"""
+Geohash encoding and vectorized distance helpers for property search.
+
+Properties store a geohash of their coordinates in an indexed column. A
+geohash prefix is a rectangular cell, and every hash inside that cell sorts
+between the prefix and the prefix followed by '~', so "properties in this
+cell" is a plain B-tree range scan on any database. Radius, bounding-box and
+nearest-neighbour searches cover the search area with a handful of cells,
+fetch only (id, latitude, longitude) for the candidates and compute exact
+distances with NumPy.
+
+Cells do not wrap around the antimeridian; boxes are clamped to
+[-180, 180] longitude and [-90, 90] latitude.
+"""
+
+import math
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_MILES = 3959  # Same radius Property.distance_to uses
+MILES_PER_DEGREE_LATITUDE = EARTH_RADIUS_MILES * math.pi / 180
+
+# Precision 9 cells are about 5m x 5m, well below address accuracy
+GEOHASH_PRECISION = 9
+# Sorts after every base32 character, closing a prefix range
+PREFIX_RANGE_END = '~'
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+BoundingBox = Tuple[float, float, float, float]  # (min_lat, min_lng, max_lat, max_lng)
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Encode coordinates as a geohash
+
+    Args:
+        latitude: Latitude in degrees
+        longitude: Longitude in degrees
+        precision: Number of base32 characters
+
+    Returns:
+        Geohash string
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # Bits alternate longitude, latitude, starting with longitude
+
+    while len(chars) < precision:
+        value, value_range = (longitude, lng_range) if even else (latitude, lat_range)
+        mid = (value_range[0] + value_range[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            value_range[0] = mid
+        else:
+            value_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(chars)
+
+
+def geohash_for(latitude, longitude) -> Optional[str]:
+    """Geohash for optional coordinates, or None when either is missing or out of range"""
+    if latitude is None or longitude is None:
+        return None
+    latitude, longitude = float(latitude), float(longitude)
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return encode_geohash(latitude, longitude)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """(height, width) of a geohash cell in degrees"""
+    bits = precision * 5
+    lng_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def clamp_bbox(bbox: BoundingBox) -> BoundingBox:
+    """Clamp a bounding box to valid coordinates"""
+    min_lat, min_lng, max_lat, max_lng = bbox
+    return (max(min_lat, -90.0), max(min_lng, -180.0), min(max_lat, 90.0), min(max_lng, 180.0))
+
+
+def radius_bbox(latitude: float, longitude: float, miles: float) -> BoundingBox:
+    """Bounding box that contains every point within `miles` of a center"""
+    lat_delta = miles / MILES_PER_DEGREE_LATITUDE
+    # The circle is widest north (or south) of its center, where the
+    # longitude span is asin(sin(r) / cos(lat)); near the poles it is everything
+    angular_radius = math.radians(lat_delta)
+    cos_lat = math.cos(math.radians(latitude))
+    if angular_radius < math.pi / 2 and math.sin(angular_radius) < cos_lat:
+        lng_delta = math.degrees(math.asin(math.sin(angular_radius) / cos_lat))
+    else:
+        lng_delta = 180.0
+    return clamp_bbox((latitude - lat_delta, longitude - lng_delta, latitude + lat_delta, longitude + lng_delta))
+
+
+def covering_cells(bbox: BoundingBox, max_cells: int = 32) -> List[str]:
+    """Geohash prefixes whose cells together cover a bounding box
+
+    Picks the longest prefix length that needs at most `max_cells` cells, so
+    the coarse filter stays a few index range scans while reading as few
+    rows outside the box as possible.
+
+    Args:
+        bbox: (min_lat, min_lng, max_lat, max_lng)
+        max_cells: Upper bound on the number of prefixes returned
+
+    Returns:
+        Distinct geohash prefixes, or [''] (everything) for huge boxes
+    """
+    min_lat, min_lng, max_lat, max_lng = clamp_bbox(bbox)
+    if min_lat > max_lat or min_lng > max_lng:
+        return []
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        first_row = math.floor((min_lat + 90) / height)
+        last_row = min(math.floor((max_lat + 90) / height), int(180 / height) - 1)
+        first_col = math.floor((min_lng + 180) / width)
+        last_col = min(math.floor((max_lng + 180) / width), int(360 / width) - 1)
+        if (last_row - first_row + 1) * (last_col - first_col + 1) > max_cells:
+            continue
+
+        cells = []
+        for row in range(first_row, last_row + 1):
+            center_lat = -90 + (row + 0.5) * height
+            for col in range(first_col, last_col + 1):
+                cells.append(encode_geohash(center_lat, -180 + (col + 0.5) * width, precision))
+        return list(dict.fromkeys(cells))
+
+    return ['']
+
+
+def haversine_miles(latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Great-circle distances from one point to many, in miles
+
+    Args:
+        latitude: Origin latitude in degrees
+        longitude: Origin longitude in degrees
+        latitudes: Array of latitudes in degrees
+        longitudes: Array of longitudes in degrees
+
+    Returns:
+        Array of distances, same shape as the inputs
+    """
+    lat1 = math.radians(latitude)
+    lat2 = np.radians(np.asarray(latitudes, dtype=float))
+    dlat = lat2 - lat1
+    dlng = np.radians(np.asarray(longitudes, dtype=float)) - math.radians(longitude)
+
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
@@ -0,0 +1,55 @@
+"""
+Deferred imports for heavy third-party SDKs.
+
+Modules such as google.generativeai and googleapiclient take tens to hundreds
+of milliseconds to import, and most processes never call them. lazy_module
+returns a stand-in that imports the real module on first attribute access,
+so a module can keep its usual top-level name (and tests can keep patching
+it) without paying the import cost at startup.
+"""
+
+import importlib
+import threading
+from types import ModuleType
+from typing import Any, Optional
+
+
+class LazyModule:
+    """Module stand-in that imports the named module on first attribute access"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Optional[ModuleType] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the real module has been imported"""
+        return self._module is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.is_loaded else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    """
+    Defer importing a module until one of its attributes is used.
+
+    Args:
+        name: Absolute module name, e.g. 'google.generativeai'
+
+    Returns:
+        Stand-in object that forwards attribute access to the module
+    """
+    return LazyModule(name)
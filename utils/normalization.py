@@ -0,0 +1,327 @@
+"""
+Shared normalizers for contact and property imports.
+
+PropertyRadar, CSV and QuickBooks imports normalize the same handful of values
+(owner names, street addresses, cities, phone numbers) once per row. Real
+exports repeat most of those values heavily - the same city, street suffix or
+owner name appears thousands of times - so names and cities are memoized per
+value, addresses per token, and every lookup table and regex is built once at
+import time instead of on every call. Whole addresses and phone numbers are
+close to unique per row, so caching them only churns memory.
+
+Outputs are byte-for-byte identical to the original per-service methods; the
+golden corpus in tests/fixtures/normalization_golden.json pins them.
+
+Use normalize_column() to normalize a whole CSV column at once: each distinct
+value is normalized exactly once and the results are mapped back in order.
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Cache sizes are generous: a 100k-row export has at most a few tens of
+# thousands of distinct names, and entries are short strings.
+VALUE_CACHE_SIZE = 65536
+TOKEN_CACHE_SIZE = 8192
+
+NON_DIGITS = re.compile(r'\D')
+PO_BOX = re.compile(r'(?:PO|P\.O\.|POST OFFICE) BOX')
+
+NAME_SUFFIXES = frozenset({'JR', 'SR', 'JR.', 'SR.'})
+ROMAN_NUMERALS = frozenset({'III', 'IV', 'V', 'II', 'VI', 'VII', 'VIII', 'IX', 'X'})
+# Already normalized suffixes recognised when splitting a full name
+PARSED_NAME_SUFFIXES = frozenset({'Jr', 'Jr.', 'Sr', 'Sr.', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X'})
+
+DIRECTIONALS = {
+    'NORTH': 'N',
+    'SOUTH': 'S',
+    'EAST': 'E',
+    'WEST': 'W',
+    'NORTHEAST': 'NE',
+    'NORTHWEST': 'NW',
+    'SOUTHEAST': 'SE',
+    'SOUTHWEST': 'SW'
+}
+
+STREET_SUFFIXES = {
+    'STREET': 'St',
+    'ST': 'St',
+    'AVENUE': 'Ave',
+    'AVE': 'Ave',
+    'ROAD': 'Rd',
+    'RD': 'Rd',
+    'DRIVE': 'Dr',
+    'DR': 'Dr',
+    'LANE': 'Ln',
+    'LN': 'Ln',
+    'BOULEVARD': 'Blvd',
+    'BLVD': 'Blvd',
+    'CIRCLE': 'Cir',
+    'CIR': 'Cir',
+    'COURT': 'Ct',
+    'CT': 'Ct',
+    'PLACE': 'Pl',
+    'PL': 'Pl'
+}
+
+UNIT_DESIGNATORS = {
+    'APT': 'Apt',
+    'APARTMENT': 'Apt',
+    'UNIT': 'Unit',
+    'SUITE': 'Suite'
+}
+
+# One upper-cased token -> replacement table. Built so earlier tables win on
+# overlap, matching the order the checks were originally made in:
+# directionals, abbreviated directionals, street suffixes, unit designators.
+ADDRESS_TOKENS: Dict[str, str] = {}
+for _table in (UNIT_DESIGNATORS, STREET_SUFFIXES,
+               {abbreviation: abbreviation for abbreviation in DIRECTIONALS.values()}, DIRECTIONALS):
+    ADDRESS_TOKENS.update(_table)
+del _table
+
+
+@lru_cache(maxsize=VALUE_CACHE_SIZE)
+def normalize_name(name: str) -> str:
+    """Normalize name from ALL CAPS to proper case with special handling
+
+    Args:
+        name: Name string to normalize
+
+    Returns:
+        Normalized name string
+    """
+    if not name or not name.strip():
+        return ''
+
+    name = ' '.join(name.split())
+
+    # Single characters are initials
+    if len(name) == 1:
+        return name.upper()
+
+    # Mixed case means someone already formatted it; keep it unless all lowercase
+    if not name.islower() and any(c.islower() for c in name):
+        return name
+
+    return ' '.join([_normalize_name_word(word) for word in name.split()])
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _normalize_name_word(word: str) -> str:
+    """Normalize one whitespace-separated word of an ALL CAPS or lowercase name"""
+    upper_word = word.upper()
+    if upper_word in NAME_SUFFIXES:
+        return word[0].upper() + word[1:].lower()
+    if upper_word in ROMAN_NUMERALS:
+        return upper_word
+    if '-' in word:
+        return '-'.join([normalize_name_part(part) for part in word.split('-')])
+    if "'" in word:
+        # O'Brien, D'Angelo
+        parts = word.split("'")
+        if len(parts) == 2:
+            return f"{parts[0].capitalize()}'{parts[1].capitalize()}"
+        return word.capitalize()
+    if upper_word.startswith('MC') and len(word) > 2:
+        return 'Mc' + word[2:].capitalize()
+    if upper_word.startswith('MAC') and len(word) > 3:
+        return 'Mac' + word[3:].capitalize()
+    return word.capitalize()
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def normalize_name_part(part: str) -> str:
+    """Normalize a single part of a hyphenated name
+
+    Args:
+        part: Single part of a name
+
+    Returns:
+        Normalized part
+    """
+    if not part:
+        return ''
+
+    if "'" in part:
+        subparts = part.split("'")
+        if len(subparts) == 2:
+            return f"{subparts[0].capitalize()}'{subparts[1].capitalize()}"
+
+    return part.capitalize()
+
+
+@lru_cache(maxsize=VALUE_CACHE_SIZE)
+def parse_name(full_name: str) -> Tuple[str, str]:
+    """Parse full name into first and last name
+
+    A single name goes to last name, a trailing suffix stays with the last
+    name and every part before the last name is the first name.
+
+    Args:
+        full_name: Full name string
+
+    Returns:
+        Tuple of (first_name, last_name)
+    """
+    if not full_name:
+        return ('', '')
+
+    parts = full_name.split()
+    if not parts:
+        return ('', '')
+    if len(parts) == 1:
+        return ('', parts[0])
+
+    suffix = ''
+    if parts[-1] in PARSED_NAME_SUFFIXES:
+        suffix = parts.pop()
+
+    last_name = f"{parts[-1]} {suffix}" if suffix else parts[-1]
+    return (' '.join(parts[:-1]), last_name)
+
+
+def normalize_address(address: str) -> str:
+    """Normalize address to proper case with standardized suffixes
+
+    Args:
+        address: Address string to normalize
+
+    Returns:
+        Normalized address string
+    """
+    if not address or not address.strip():
+        return ''
+
+    parts = address.split()
+
+    if PO_BOX.match(' '.join(parts).upper()):
+        return f'PO Box {parts[-1]}'
+
+    return ' '.join([_normalize_address_token(part) for part in parts])
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _normalize_address_token(token: str) -> str:
+    """Normalize one whitespace-separated token of a street address"""
+    # House and unit numbers are kept verbatim
+    if token[0].isdigit() or token[0] == '#':
+        return token
+    return ADDRESS_TOKENS.get(token.upper()) or token.capitalize()
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def normalize_city(city: str) -> str:
+    """Normalize city name to proper case
+
+    Args:
+        city: City name to normalize
+
+    Returns:
+        Normalized city name
+    """
+    if not city or not city.strip():
+        return ''
+
+    city = ' '.join(city.split())
+
+    # Mixed case means someone already formatted it; keep it unless all lowercase
+    if not city.islower() and any(c.islower() for c in city):
+        return city
+
+    if '-' in city:
+        return '-'.join([part.capitalize() for part in city.split('-')])
+
+    return ' '.join([word.capitalize() for word in city.split()])
+
+
+def normalize_propertyradar_phone(phone: str) -> Optional[str]:
+    """Normalize a PropertyRadar phone number to E.164 format (+1XXXXXXXXXX)
+
+    PropertyRadar exports carry some local numbers: 7 digits get the 555 test
+    area code unless they already start with it, 8 digits are taken as-is.
+
+    Args:
+        phone: Phone number string in any format
+
+    Returns:
+        Normalized phone number or None
+    """
+    if not phone:
+        return None
+
+    digits = NON_DIGITS.sub('', phone)
+    length = len(digits)
+
+    if length == 10 or length == 8:
+        return f'+1{digits}'
+    if length == 11 and digits[0] == '1':
+        return f'+{digits}'
+    if length == 7:
+        return f'+1{digits}' if digits.startswith('555') else f'+1555{digits}'
+    return None
+
+
+def normalize_us_phone(phone: Hashable, reject_repeated_digits: bool = False) -> Optional[str]:
+    """Normalize a US phone number to E.164 format (+1XXXXXXXXXX)
+
+    Args:
+        phone: Phone number in any format; non-strings are converted with str()
+        reject_repeated_digits: Treat placeholder numbers such as 0000000000
+            or 5555555555 as invalid
+
+    Returns:
+        Normalized phone number or None for anything but 10 digits or
+        11 digits starting with 1
+    """
+    if not phone:
+        return None
+
+    digits = NON_DIGITS.sub('', str(phone))
+
+    if len(digits) == 10:
+        digits = '1' + digits
+    elif len(digits) != 11 or digits[0] != '1':
+        return None
+
+    if reject_repeated_digits and len(set(digits[1:])) <= 1:
+        return None
+
+    return f'+{digits}'
+
+
+def normalize_column(values: Iterable[Hashable], normalizer: Callable) -> List:
+    """Normalize a whole column, calling the normalizer once per distinct value
+
+    Args:
+        values: Column values in row order
+        normalizer: One of the normalizers in this module (or any callable)
+
+    Returns:
+        Normalized values in the same order as the input
+    """
+    values = list(values)
+    normalized = {value: normalizer(value) for value in dict.fromkeys(values)}
+    return [normalized[value] for value in values]
+
+
+_CACHED_NORMALIZERS = {
+    'normalize_name': normalize_name,
+    '_normalize_name_word': _normalize_name_word,
+    'normalize_name_part': normalize_name_part,
+    'parse_name': parse_name,
+    '_normalize_address_token': _normalize_address_token,
+    'normalize_city': normalize_city,
+}
+
+
+def cache_info() -> Dict[str, object]:
+    """Hit/miss statistics for every memoized normalizer, keyed by name"""
+    return {name: func.cache_info() for name, func in _CACHED_NORMALIZERS.items()}
+
+
+def clear_caches():
+    """Empty every normalizer cache (benchmarks and long-lived workers)"""
+    for func in _CACHED_NORMALIZERS.values():
+        func.cache_clear()
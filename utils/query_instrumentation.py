@@ -0,0 +1,327 @@
+"""
+SQL query instrumentation per Flask request and per Celery task.
+
+SQLAlchemy before/after_cursor_execute listeners time every statement and
+add it to the innermost active query scope. A scope is opened for each Flask
+request and each Celery task (and by tests through query_budget). When a
+scope ends its query count, total database time and slowest statements are
+logged through the performance logger and folded into process-wide
+aggregates, which the diagnostics service exposes.
+
+Statements are reduced to a shape - literals, bind parameters and IN lists
+collapsed - so the same query issued for different rows counts as one shape.
+A SELECT shape repeated at least n_plus_one_threshold times in one scope is
+reported as a probable N+1 query.
+"""
+
+import heapq
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from logging_config import performance_logger
+
+DEFAULT_N_PLUS_ONE_THRESHOLD = 10
+DEFAULT_SLOW_QUERY_MS = 100.0
+SLOWEST_KEPT = 5
+SHAPE_MAX_LENGTH = 300
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_BIND_PARAMETER = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+|\?")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES_LIST = re.compile(r"(VALUES\s*\(\?\))(?:\s*,\s*\(\?\))+", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+_current_scope: ContextVar[Optional['QueryStats']] = ContextVar('query_scope', default=None)
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Reduce a SQL statement to its shape for grouping repeated queries.
+
+    Args:
+        statement: SQL as sent to the DBAPI cursor
+
+    Returns:
+        Statement with literals and parameters replaced by ? and lists collapsed
+    """
+    shape = _STRING_LITERAL.sub('?', statement)
+    shape = _BIND_PARAMETER.sub('?', shape)
+    shape = _NUMBER.sub('?', shape)
+    shape = _PLACEHOLDER_LIST.sub('(?)', shape)
+    shape = _VALUES_LIST.sub(r'\1', shape)
+    return _WHITESPACE.sub(' ', shape).strip()[:SHAPE_MAX_LENGTH]
+
+
+class QueryStats:
+    """Queries recorded in one scope (a request, a task or a test block)"""
+
+    def __init__(self, label: str, n_plus_one_threshold: int = DEFAULT_N_PLUS_ONE_THRESHOLD,
+                 parent: Optional['QueryStats'] = None):
+        self.label = label
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.parent = parent
+        self.count = 0
+        self.total_ms = 0.0
+        self.shapes: Counter = Counter()
+        self._slowest: List[Tuple[float, int, str]] = []
+        self.started_at = time.perf_counter()
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        """Add one executed statement to this scope and every enclosing scope"""
+        shape = statement_shape(statement)
+        scope = self
+        while scope is not None:
+            scope._add(shape, duration_ms)
+            scope = scope.parent
+
+    def _add(self, shape: str, duration_ms: float) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.shapes[shape] += 1
+        entry = (duration_ms, self.count, shape)
+        if len(self._slowest) < SLOWEST_KEPT:
+            heapq.heappush(self._slowest, entry)
+        elif entry > self._slowest[0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    @property
+    def slowest(self) -> List[Dict[str, Any]]:
+        """Slowest statements, slowest first"""
+        return [
+            {'statement': shape, 'duration_ms': round(duration_ms, 2)}
+            for duration_ms, _, shape in sorted(self._slowest, reverse=True)
+        ]
+
+    @property
+    def n_plus_one(self) -> List[Dict[str, Any]]:
+        """SELECT shapes repeated at least n_plus_one_threshold times, most repeated first"""
+        return [
+            {'statement': shape, 'count': count}
+            for shape, count in self.shapes.most_common()
+            if count >= self.n_plus_one_threshold and shape.upper().startswith(('SELECT', 'WITH'))
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregates for logging and diagnostics"""
+        return {
+            'label': self.label,
+            'query_count': self.count,
+            'db_time_ms': round(self.total_ms, 2),
+            'elapsed_ms': round((time.perf_counter() - self.started_at) * 1000, 2),
+            'distinct_statements': len(self.shapes),
+            'slowest': self.slowest,
+            'n_plus_one': self.n_plus_one
+        }
+
+
+class QueryAggregates:
+    """Process-wide query totals per request endpoint or task name"""
+
+    RECENT_FINDINGS_KEPT = 50
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._labels: Dict[str, Dict[str, Any]] = {}
+            self._n_plus_one: deque = deque(maxlen=self.RECENT_FINDINGS_KEPT)
+
+    def add(self, summary: Dict[str, Any]) -> None:
+        """Fold one finished scope into the totals"""
+        with self._lock:
+            totals = self._labels.setdefault(summary['label'], {
+                'scopes': 0, 'query_count': 0, 'db_time_ms': 0.0, 'max_query_count': 0, 'n_plus_one_scopes': 0
+            })
+            totals['scopes'] += 1
+            totals['query_count'] += summary['query_count']
+            totals['db_time_ms'] += summary['db_time_ms']
+            totals['max_query_count'] = max(totals['max_query_count'], summary['query_count'])
+            if summary['n_plus_one']:
+                totals['n_plus_one_scopes'] += 1
+                for finding in summary['n_plus_one']:
+                    self._n_plus_one.append({'label': summary['label'], **finding})
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Totals per label, heaviest total database time first, and recent N+1 findings"""
+        with self._lock:
+            labels = [
+                {
+                    'label': label,
+                    **totals,
+                    'db_time_ms': round(totals['db_time_ms'], 2),
+                    'avg_query_count': round(totals['query_count'] / totals['scopes'], 1)
+                }
+                for label, totals in self._labels.items()
+            ]
+            recent = list(self._n_plus_one)
+        labels.sort(key=lambda totals: totals['db_time_ms'], reverse=True)
+        return {'scopes': labels, 'recent_n_plus_one': recent}
+
+
+aggregates = QueryAggregates()
+
+# Thresholds, replaced from app config by init_app
+settings = {
+    'enabled': True,
+    'n_plus_one_threshold': DEFAULT_N_PLUS_ONE_THRESHOLD,
+    'slow_query_ms': DEFAULT_SLOW_QUERY_MS
+}
+
+
+def current_scope() -> Optional[QueryStats]:
+    """The innermost active query scope, if any"""
+    return _current_scope.get()
+
+
+def start_scope(label: str, n_plus_one_threshold: Optional[int] = None):
+    """
+    Open a query scope nested in the current one.
+
+    Args:
+        label: Request endpoint or task name the queries are attributed to
+        n_plus_one_threshold: Repetitions of one SELECT shape reported as N+1
+
+    Returns:
+        Token to pass to finish_scope
+    """
+    threshold = n_plus_one_threshold or settings['n_plus_one_threshold']
+    stats = QueryStats(label, threshold, parent=_current_scope.get())
+    return _current_scope.set(stats)
+
+
+def finish_scope(token, publish: bool = True) -> Optional[QueryStats]:
+    """
+    Close the scope opened with token, logging and aggregating its statistics.
+
+    Args:
+        token: Value returned by start_scope
+        publish: Log the scope and add it to the process-wide aggregates
+
+    Returns:
+        The finished scope's statistics
+    """
+    stats = _current_scope.get()
+    _current_scope.reset(token)
+    if stats is None or not publish or stats.count == 0:
+        return stats
+
+    summary = stats.summary()
+    aggregates.add(summary)
+    performance_logger.log_query_stats(summary)
+    return stats
+
+
+@contextmanager
+def query_scope(label: str, publish: bool = True) -> Iterator[QueryStats]:
+    """Record the queries run inside the block under label"""
+    token = start_scope(label)
+    try:
+        yield _current_scope.get()
+    finally:
+        finish_scope(token, publish=publish)
+
+
+@contextmanager
+def query_budget(max_queries: int, allow_n_plus_one: bool = False,
+                 n_plus_one_threshold: int = DEFAULT_N_PLUS_ONE_THRESHOLD) -> Iterator[QueryStats]:
+    """
+    Fail when the block runs more queries than allowed or repeats a SELECT shape.
+
+    Args:
+        max_queries: Highest acceptable number of statements
+        allow_n_plus_one: Do not fail on repeated SELECT shapes
+        n_plus_one_threshold: Repetitions of one SELECT shape treated as N+1
+
+    Raises:
+        AssertionError: When the budget is exceeded
+    """
+    token = start_scope('query_budget', n_plus_one_threshold)
+    stats = _current_scope.get()
+    try:
+        yield stats
+    finally:
+        finish_scope(token, publish=False)
+
+    if stats.count > max_queries:
+        statements = '\n'.join(f"  {count}x {shape}" for shape, count in stats.shapes.most_common(10))
+        raise AssertionError(f"Expected at most {max_queries} queries, ran {stats.count}:\n{statements}")
+    if not allow_n_plus_one and stats.n_plus_one:
+        finding = stats.n_plus_one[0]
+        raise AssertionError(f"Probable N+1: {finding['count']}x {finding['statement']}")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_scope.get() is not None:
+        conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_scope.get()
+    started = conn.info.get('query_start_time')
+    if stats is None or not started:
+        return
+
+    duration_ms = (time.perf_counter() - started.pop()) * 1000
+    stats.record(statement, duration_ms)
+    if duration_ms >= settings['slow_query_ms']:
+        performance_logger.log_database_query(
+            statement_shape(statement), round(duration_ms, 2),
+            record_count=cursor.rowcount if cursor.rowcount >= 0 else None
+        )
+
+
+def install() -> None:
+    """Listen to statement execution on every engine; safe to call repeatedly"""
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def init_app(app) -> None:
+    """
+    Instrument queries per request for a Flask app.
+
+    Reads QUERY_INSTRUMENTATION_ENABLED, QUERY_N_PLUS_ONE_THRESHOLD and
+    SLOW_QUERY_MS from the app config.
+    """
+    settings['enabled'] = app.config.get('QUERY_INSTRUMENTATION_ENABLED', True)
+    settings['n_plus_one_threshold'] = app.config.get('QUERY_N_PLUS_ONE_THRESHOLD', DEFAULT_N_PLUS_ONE_THRESHOLD)
+    settings['slow_query_ms'] = app.config.get('SLOW_QUERY_MS', DEFAULT_SLOW_QUERY_MS)
+    if not settings['enabled']:
+        return
+
+    install()
+
+    from flask import g, request
+
+    @app.before_request
+    def _start_request_query_scope():
+        g.query_scope_token = start_scope(request.endpoint or request.path)
+
+    @app.teardown_request
+    def _finish_request_query_scope(exception=None):
+        token = g.pop('query_scope_token', None)
+        if token is not None:
+            finish_scope(token)
+
+
+@contextmanager
+def task_scope(task_name: str) -> Iterator[Optional[QueryStats]]:
+    """Query scope for a Celery task; a no-op when instrumentation is disabled"""
+    if not settings['enabled']:
+        yield None
+        return
+    install()
+    with query_scope(f"task:{task_name}") as stats:
+        yield stats